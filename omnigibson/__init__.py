@@ -1,7 +1,6 @@
 import logging
 import os
 
-import yaml
 import builtins
 
 # TODO: Need to fix somehow -- omnigibson gets imported first BEFORE we can actually modify the macros
@@ -11,64 +10,84 @@ builtins.ISAAC_LAUNCHED_FROM_JUPYTER = (
     os.getenv("ISAAC_JUPYTER_KERNEL") is not None
 )  # We set this in the kernel.json file
 
-# Always enable nest_asyncio because MaterialPrim calls asyncio.run()
-import nest_asyncio
-nest_asyncio.apply()
-
 __version__ = "0.0.5"
 
 logging.getLogger().setLevel(logging.INFO)
 
-with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "global_config.yaml")) as f:
-    global_config = yaml.load(f, Loader=yaml.FullLoader)
-
-# can override assets_path and dataset_path from environment variable
-if "OMNIGIBSON_ASSETS_PATH" in os.environ:
-    assets_path = os.environ["OMNIGIBSON_ASSETS_PATH"]
-else:
-    assets_path = global_config["assets_path"]
-assets_path = os.path.expanduser(assets_path)
-
-if "GIBSON_DATASET_PATH" in os.environ:
-    g_dataset_path = os.environ["GIBSON_DATASET_PATH"]
-else:
-    g_dataset_path = global_config["g_dataset_path"]
-g_dataset_path = os.path.expanduser(g_dataset_path)
-
-if "OMNIGIBSON_DATASET_PATH" in os.environ:
-    og_dataset_path = os.environ["OMNIGIBSON_DATASET_PATH"]
-else:
-    og_dataset_path = global_config["og_dataset_path"]
-og_dataset_path = os.path.expanduser(og_dataset_path)
-
-if "OMNIGIBSON_KEY_PATH" in os.environ:
-    key_path = os.environ["OMNIGIBSON_KEY_PATH"]
-else:
-    key_path = global_config["key_path"]
-key_path = os.path.expanduser(key_path)
-
 root_path = os.path.dirname(os.path.realpath(__file__))
 
-if not os.path.isabs(assets_path):
-    assets_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), assets_path)
-if not os.path.isabs(g_dataset_path):
-    g_dataset_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), g_dataset_path)
-if not os.path.isabs(og_dataset_path):
-    og_dataset_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), og_dataset_path)
-if not os.path.isabs(key_path):
-    key_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), key_path)
-
-logging.info("Importing OmniGibson (omnigibson module)")
-logging.info("Assets path: {}".format(assets_path))
-logging.info("Gibson Dataset path: {}".format(g_dataset_path))
-logging.info("OmniGibson Dataset path: {}".format(og_dataset_path))
-logging.info("OmniGibson Key path: {}".format(key_path))
-
 example_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "examples")
 example_config_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "configs")
 
-logging.info("Example path: {}".format(example_path))
-logging.info("Example config path: {}".format(example_config_path))
+# Maps each asset / dataset path to the environment variable overriding its value in global_config.yaml. These paths
+# (and global_config itself) are only resolved upon first access, see __getattr__ below
+_PATH_ENV_VARS = {
+    "assets_path": "OMNIGIBSON_ASSETS_PATH",
+    "g_dataset_path": "GIBSON_DATASET_PATH",
+    "og_dataset_path": "OMNIGIBSON_DATASET_PATH",
+    "key_path": "OMNIGIBSON_KEY_PATH",
+}
+
+
+def _load_paths():
+    """
+    Reads global_config.yaml and resolves the asset / dataset paths, which can be overridden from environment variables
+
+    Returns:
+        dict: Maps "global_config" and each of _PATH_ENV_VARS to its value
+    """
+    import yaml
+    with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "global_config.yaml")) as f:
+        global_config = yaml.load(f, Loader=yaml.FullLoader)
+
+    paths = dict()
+    for name, env_var in _PATH_ENV_VARS.items():
+        # can override assets_path and dataset_path from environment variable
+        path = os.path.expanduser(os.environ[env_var] if env_var in os.environ else global_config[name])
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.realpath(__file__)), path)
+        paths[name] = path
+
+    logging.info("Importing OmniGibson (omnigibson module)")
+    logging.info("Assets path: {}".format(paths["assets_path"]))
+    logging.info("Gibson Dataset path: {}".format(paths["g_dataset_path"]))
+    logging.info("OmniGibson Dataset path: {}".format(paths["og_dataset_path"]))
+    logging.info("OmniGibson Key path: {}".format(paths["key_path"]))
+    logging.info("Example path: {}".format(example_path))
+    logging.info("Example config path: {}".format(example_config_path))
+
+    return dict(global_config=global_config, **paths)
+
+
+# Classes and registries accessible directly from the main omnigibson import, mapped to the module they are imported
+# from upon first access. Note that robot_base also adds the "proprio" modality to ALL_SENSOR_MODALITIES
+_LAZY_ATTRIBUTES = {
+    "Environment": "omnigibson.envs.env_base",
+    "REGISTERED_SCENES": "omnigibson.scenes.scene_base",
+    "REGISTERED_OBJECTS": "omnigibson.objects.object_base",
+    "REGISTERED_ROBOTS": "omnigibson.robots.robot_base",
+    "REGISTERED_CONTROLLERS": "omnigibson.controllers.controller_base",
+    "REGISTERED_TASKS": "omnigibson.tasks.task_base",
+    "ALL_SENSOR_MODALITIES": "omnigibson.robots.robot_base",
+}
+
+
+def __getattr__(name):
+    # Lazily resolves the paths and global config upon first access (PEP 562), caching them as module attributes
+    if name == "global_config" or name in _PATH_ENV_VARS:
+        globals().update(_load_paths())
+        return globals()[name]
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | {"global_config"} | set(_PATH_ENV_VARS) | set(_LAZY_ATTRIBUTES))
+
 
 # whether to enable debugging mode for object sampling
 debug_sampling = False
@@ -76,13 +95,6 @@ debug_sampling = False
 # Initialize global variables
 app = None  # (this is a singleton so it's okay that it's global)
 sim = None  # (this is a singleton so it's okay that it's global)
-Environment = None
-REGISTERED_SCENES = None
-REGISTERED_OBJECTS = None
-REGISTERED_ROBOTS = None
-REGISTERED_CONTROLLERS = None
-REGISTERED_TASKS = None
-ALL_SENSOR_MODALITIES = None
 
 
 # Helper functions for starting omnigibson
@@ -92,6 +104,10 @@ def print_save_usd_warning(_):
 
 def create_app():
     global app
+    # Always enable nest_asyncio because MaterialPrim calls asyncio.run()
+    import nest_asyncio
+    nest_asyncio.apply()
+
     from omni.isaac.kit import SimulationApp
     app = SimulationApp({"headless": gm.HEADLESS})
     import omni
@@ -119,29 +135,26 @@ def create_sim():
 
 
 def start():
-    global app, sim, Environment, REGISTERED_SCENES, REGISTERED_OBJECTS, REGISTERED_ROBOTS, REGISTERED_CONTROLLERS, \
-        REGISTERED_TASKS, ALL_SENSOR_MODALITIES
+    """
+    Launches omniverse and creates the simulator. Environment and the class registries (e.g.: REGISTERED_ROBOTS) are
+    imported upon first access as attributes of the main omnigibson import
+
+    Returns:
+        2-tuple:
+            - SimulationApp: Omniverse application
+            - Simulator: Simulator singleton
+    """
+    global app, sim
 
     # First create the app, then create the sim
     app = create_app()
     sim = create_sim()
-
-    # Import any remaining items we want to access directly from the main omnigibson import
-    from omnigibson.envs import Environment
-    from omnigibson.scenes import REGISTERED_SCENES
-    from omnigibson.objects import REGISTERED_OBJECTS
-    from omnigibson.robots import REGISTERED_ROBOTS
-    from omnigibson.controllers import REGISTERED_CONTROLLERS
-    from omnigibson.tasks import REGISTERED_TASKS
-    from omnigibson.sensors import ALL_SENSOR_MODALITIES
-    return app, sim, Environment, REGISTERED_SCENES, REGISTERED_OBJECTS, REGISTERED_ROBOTS, REGISTERED_CONTROLLERS, \
-        REGISTERED_TASKS, ALL_SENSOR_MODALITIES
+    return app, sim
 
 
 # Automatically start omnigibson's omniverse backend unless explicitly told not to
 if not (os.getenv("OMNIGIBSON_NO_OMNIVERSE", 'False').lower() in {'true', '1', 't'}):
-    app, sim, Environment, REGISTERED_SCENES, REGISTERED_OBJECTS, REGISTERED_ROBOTS, REGISTERED_CONTROLLERS, \
-        REGISTERED_TASKS, ALL_SENSOR_MODALITIES = start()
+    app, sim = start()
 
 
 def shutdown():
@@ -8,13 +8,18 @@ from omnigibson.controllers.controller_base import (
     ManipulationController,
     GripperController,
 )
-from omnigibson.controllers.dd_controller import DifferentialDriveController
-from omnigibson.controllers.ik_controller import InverseKinematicsController
-from omnigibson.controllers.joint_controller import JointController
-from omnigibson.controllers.multi_finger_gripper_controller import MultiFingerGripperController
-from omnigibson.controllers.null_joint_controller import NullJointController
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
 from omnigibson.utils.python_utils import assert_valid_key
 
+# Controllers are imported upon first access, or upon first lookup of their registries
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".dd_controller": ["DifferentialDriveController"],
+    ".ik_controller": ["InverseKinematicsController"],
+    ".joint_controller": ["JointController"],
+    ".multi_finger_gripper_controller": ["MultiFingerGripperController"],
+    ".null_joint_controller": ["NullJointController"],
+})
+
 
 def create_controller(name, **kwargs):
     """
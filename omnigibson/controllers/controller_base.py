@@ -1,30 +1,28 @@
-from collections import Iterable
+from collections.abc import Iterable
 from enum import IntEnum
 
 import numpy as np
 
 from omnigibson.utils.python_utils import classproperty, assert_valid_key, Serializable, Registerable, Recreatable
+from omnigibson.utils.lazy_import_utils import LazyRegistry
 
 # Global dicts that will contain mappings
-REGISTERED_CONTROLLERS = dict()
-REGISTERED_LOCOMOTION_CONTROLLERS = dict()
-REGISTERED_MANIPULATION_CONTROLLERS = dict()
-REGISTERED_GRIPPER_CONTROLLERS = dict()
+REGISTERED_CONTROLLERS = LazyRegistry(package_name="omnigibson.controllers")
+REGISTERED_LOCOMOTION_CONTROLLERS = LazyRegistry(package_name="omnigibson.controllers")
+REGISTERED_MANIPULATION_CONTROLLERS = LazyRegistry(package_name="omnigibson.controllers")
+REGISTERED_GRIPPER_CONTROLLERS = LazyRegistry(package_name="omnigibson.controllers")
 
 
 def register_locomotion_controller(cls):
-    if cls.__name__ not in REGISTERED_LOCOMOTION_CONTROLLERS:
-        REGISTERED_LOCOMOTION_CONTROLLERS[cls.__name__] = cls
+    REGISTERED_LOCOMOTION_CONTROLLERS.setdefault(cls.__name__, cls)
 
 
 def register_manipulation_controller(cls):
-    if cls.__name__ not in REGISTERED_MANIPULATION_CONTROLLERS:
-        REGISTERED_MANIPULATION_CONTROLLERS[cls.__name__] = cls
+    REGISTERED_MANIPULATION_CONTROLLERS.setdefault(cls.__name__, cls)
 
 
 def register_gripper_controller(cls):
-    if cls.__name__ not in REGISTERED_GRIPPER_CONTROLLERS:
-        REGISTERED_GRIPPER_CONTROLLERS[cls.__name__] = cls
+    REGISTERED_GRIPPER_CONTROLLERS.setdefault(cls.__name__, cls)
 
 
 class IsGraspingState(IntEnum):
@@ -1 +1,6 @@
-from omnigibson.envs.env_base import Environment
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".env_base": ["Environment"],
+    "omnigibson.utils.vec_env_utils": ["VectorEnvironment"],
+})
@@ -1,3 +1,8 @@
-from omnigibson.maps.map_base import BaseMap
-from omnigibson.maps.traversable_map import TraversableMap
-from omnigibson.maps.segmentation_map import SegmentationMap
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+# Maps are imported upon first access, so that e.g.: BaseMap can be used without importing cv2 / PIL
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".map_base": ["BaseMap"],
+    ".traversable_map": ["TraversableMap"],
+    ".segmentation_map": ["SegmentationMap"],
+})
@@ -1,17 +1,109 @@
+import hashlib
 import logging
 import os
 
 import numpy as np
 
-from PIL import Image
-
 import omnigibson as og
+from omnigibson.macros import create_module_macros
 from omnigibson.maps.map_base import BaseMap
+from omnigibson.utils.lazy_import_utils import lazy_import
+
+# Only imported upon loading a map
+Image = lazy_import("PIL.Image")
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Version of the on-disk room index cache format. Bump this whenever the cached contents change
+m.ROOM_INDEX_CACHE_VERSION = 1
+
+
+def build_label_index(label_map):
+    """
+    Groups the pixels of @label_map by label with a single stable sort, so that the pixels of each label can be
+    retrieved (or sampled from) without scanning the entire map. Label 0 (room boundaries) is ignored
+
+    Args:
+        label_map ((H, W)-array): Map of non-negative integer labels
+
+    Returns:
+        3-tuple:
+            - n-array: (K,) sorted unique non-zero labels in @label_map
+            - n-array: (K + 1,) offsets, such that the pixels with label labels[k] are pixels[offsets[k]:offsets[k+1]]
+            - n-array: (P,) flat indices of all non-zero pixels, sorted by label and then in raster order
+    """
+    flat = label_map.reshape(-1)
+    counts = np.bincount(flat)
+    pixels = np.argsort(flat, kind="stable")[counts[0]:].astype(np.int32)
+    labels = np.flatnonzero(counts[1:]) + 1
+    offsets = np.concatenate([[0], np.cumsum(counts[labels])]).astype(np.int64)
+    return labels, offsets, pixels
+
+
+def get_room_index_cache_key(img_ins, img_sem):
+    """
+    Args:
+        img_ins ((H, W)-array): Room instance segmentation map
+        img_sem ((H, W)-array): Room semantic segmentation map
+
+    Returns:
+        str: Hash uniquely identifying the room index of @img_ins and @img_sem
+    """
+    hasher = hashlib.sha1()
+    hasher.update(np.array([m.ROOM_INDEX_CACHE_VERSION, *img_ins.shape]).tobytes())
+    for img in (img_ins, img_sem):
+        hasher.update(str(img.dtype).encode())
+        hasher.update(np.ascontiguousarray(img).tobytes())
+    return hasher.hexdigest()
+
+
+def load_room_index(img_ins, img_sem, cache_dir=None):
+    """
+    Builds the room index of a pair of room segmentation maps, loading it from (and saving it to) an on-disk cache if
+    @cache_dir is specified
+
+    Args:
+        img_ins ((H, W)-array): Room instance segmentation map
+        img_sem ((H, W)-array): Room semantic segmentation map
+        cache_dir (None or str): If specified, directory holding cached room indices
+
+    Returns:
+        dict: Room index, mapping "ins_ids" / "ins_offsets" / "ins_pixels" to build_label_index(@img_ins),
+            "sem_ids" / "sem_offsets" / "sem_pixels" to build_label_index(@img_sem), and "ins_sem_ids" to the semantic
+            id of the first pixel (in raster order) of each room instance
+    """
+    cache_file = None if cache_dir is None else \
+        os.path.join(cache_dir, f"floor_room_index_0_{get_room_index_cache_key(img_ins, img_sem)}.npz")
+
+    if cache_file is not None and os.path.isfile(cache_file):
+        with np.load(cache_file) as cached:
+            if int(cached["version"]) == m.ROOM_INDEX_CACHE_VERSION:
+                return {key: cached[key] for key in cached.files if key != "version"}
+
+    room_index = dict()
+    for prefix, img in (("ins", img_ins), ("sem", img_sem)):
+        ids, offsets, pixels = build_label_index(img)
+        room_index[f"{prefix}_ids"], room_index[f"{prefix}_offsets"], room_index[f"{prefix}_pixels"] = \
+            ids, offsets, pixels
+    room_index["ins_sem_ids"] = img_sem.reshape(-1)[room_index["ins_pixels"][room_index["ins_offsets"][:-1]]]
+
+    if cache_file is not None:
+        try:
+            np.savez(cache_file, version=np.array(m.ROOM_INDEX_CACHE_VERSION), **room_index)
+        except OSError as e:
+            logging.warning(f"Could not save room index cache to {cache_file}: {e}")
+
+    return room_index
 
 
 class SegmentationMap(BaseMap):
     """
     Segmentation map for computing connectivity within the scene
+
+    The pixels of each room instance and room type are indexed once at load time (and cached next to the layout
+    images), so that sampling a random point in a room is O(1) and point lookups can be batched.
     """
 
     def __init__(
@@ -39,6 +131,11 @@ class SegmentationMap(BaseMap):
         self.room_sem_name_to_ins_name = None
         self.room_ins_map = None
         self.room_sem_map = None
+        self._room_index = None
+        self._ins_id_to_idx = None
+        self._sem_id_to_idx = None
+        self._ins_id_to_name_lut = None
+        self._sem_id_to_name_lut = None
 
         # Run super call
         super().__init__(map_resolution=map_resolution)
@@ -63,14 +160,10 @@ class SegmentationMap(BaseMap):
         with open(room_categories, "r") as fp:
             room_cats = [line.rstrip() for line in fp.readlines()]
 
+        # Index the pixels of each room instance and type. The sem id of each ins id is the one of its first pixel
+        room_index = load_room_index(img_ins, img_sem, cache_dir=layout_dir)
         sem_id_to_ins_id = {}
-        unique_ins_ids = np.unique(img_ins)
-        unique_ins_ids = np.delete(unique_ins_ids, 0)
-        for ins_id in unique_ins_ids:
-            # find one pixel for each ins id
-            x, y = np.where(img_ins == ins_id)
-            # retrieve the correspounding sem id
-            sem_id = img_sem[x[0], y[0]]
+        for ins_id, sem_id in zip(room_index["ins_ids"].tolist(), room_index["ins_sem_ids"].tolist()):
             if sem_id not in sem_id_to_ins_id:
                 sem_id_to_ins_id[sem_id] = []
             sem_id_to_ins_id[sem_id].append(ins_id)
@@ -96,9 +189,63 @@ class SegmentationMap(BaseMap):
         self.room_sem_name_to_ins_name = room_sem_name_to_ins_name
         self.room_ins_map = img_ins
         self.room_sem_map = img_sem
+        self._room_index = room_index
+        self._ins_id_to_idx = {ins_id: i for i, ins_id in enumerate(room_index["ins_ids"].tolist())}
+        self._sem_id_to_idx = {sem_id: i for i, sem_id in enumerate(room_index["sem_ids"].tolist())}
+
+        # Lookup tables from ids to names, where ids without a name (e.g.: room boundaries) map to None
+        self._ins_id_to_name_lut = np.full(int(img_ins.max()) + 1, None, dtype=object)
+        for ins_id, ins_name in self.room_ins_id_to_ins_name.items():
+            self._ins_id_to_name_lut[ins_id] = ins_name
+        self._sem_id_to_name_lut = np.full(int(img_sem.max()) + 1, None, dtype=object)
+        for sem_id, sem_name in self.room_sem_id_to_sem_name.items():
+            self._sem_id_to_name_lut[sem_id] = sem_name
 
         return map_size
 
+    def _sample_point(self, prefix, idx):
+        """
+        Samples a random point in O(1) from the pixels of a single room in the room index
+
+        Args:
+            prefix (str): Either "ins" or "sem", for sampling from a room instance or room type, respectively
+            idx (int): Index of the room instance or room type in the room index
+
+        Returns:
+            2-tuple:
+                - int: floor number. This is always 0
+                - 3-array: (x,y,z) randomly sampled point
+        """
+        offsets, pixels = self._room_index[f"{prefix}_offsets"], self._room_index[f"{prefix}_pixels"]
+        pixel = pixels[np.random.randint(offsets[idx], offsets[idx + 1])]
+        random_point_map = np.array(divmod(int(pixel), self.room_ins_map.shape[1]))
+
+        x, y = self.map_to_world(random_point_map)
+        # assume only 1 floor
+        floor = 0
+        z = self.floor_heights[floor]
+        return floor, np.array([x, y, z])
+
+    def _get_names_by_points(self, xy, seg_map, id_to_name_lut):
+        """
+        Looks up the names of the rooms containing one or more points
+
+        Args:
+            xy (2-array or (N, 2)-array): 2D location(s) in world reference frame (in metric space)
+            seg_map ((H, W)-array): Segmentation map to look up
+            id_to_name_lut (n-array): Maps each id in @seg_map to its name, or None
+
+        Returns:
+            None or str, or list of (None or str): Name of the room containing each point, or None if the point is not
+                on the room segmentation map. A single value is returned if @xy is a single point
+        """
+        xy = np.asarray(xy)
+        map_xy = self.world_to_map(xy.reshape(-1, 2))
+        in_map = np.all((map_xy >= 0) & (map_xy < seg_map.shape), axis=1)
+        names = np.full(len(map_xy), None, dtype=object)
+        names[in_map] = id_to_name_lut[seg_map[map_xy[in_map, 0], map_xy[in_map, 1]]]
+        return names[0] if xy.ndim == 1 else names.tolist()
+
     def get_random_point_by_room_type(self, room_type):
         """
         Sample a random point on the given a specific room type @room_type.
@@ -116,14 +263,7 @@ class SegmentationMap(BaseMap):
             return None, None
 
         sem_id = self.room_sem_name_to_sem_id[room_type]
-        valid_idx = np.array(np.where(self.room_sem_map == sem_id))
-        random_point_map = valid_idx[:, np.random.randint(valid_idx.shape[1])]
-
-        x, y = self.map_to_world(random_point_map)
-        # assume only 1 floor
-        floor = 0
-        z = self.floor_heights[floor]
-        return floor, np.array([x, y, z])
+        return self._sample_point("sem", self._sem_id_to_idx[sem_id])
 
     def get_random_point_by_room_instance(self, room_instance):
         """
@@ -142,51 +282,30 @@ class SegmentationMap(BaseMap):
             return None, None
 
         ins_id = self.room_ins_name_to_ins_id[room_instance]
-        valid_idx = np.array(np.where(self.room_ins_map == ins_id))
-        random_point_map = valid_idx[:, np.random.randint(valid_idx.shape[1])]
-
-        x, y = self.map_to_world(random_point_map)
-        # assume only 1 floor
-        floor = 0
-        z = self.floor_heights[floor]
-        return floor, np.array([x, y, z])
+        return self._sample_point("ins", self._ins_id_to_idx[ins_id])
 
     def get_room_type_by_point(self, xy):
         """
-        Return the room type given a point
+        Return the room type given a point, or the room types given multiple points
 
         Args:
-            xy (2-array): 2D location in world reference frame (in metric space)
+            xy (2-array or (N, 2)-array): 2D location(s) in world reference frame (in metric space)
 
         Returns:
-            None or str: room type that this point is in or None, if this point is not on the room segmentation map
+            None or str, or list of (None or str): room type that each point is in or None, if the point is not on the
+                room segmentation map. A single value is returned if @xy is a single point
         """
-        x, y = self.world_to_map(xy)
-        if x < 0 or x >= self.room_sem_map.shape[0] or y < 0 or y >= self.room_sem_map.shape[1]:
-            return None
-        sem_id = self.room_sem_map[x, y]
-        # room boundary
-        if sem_id == 0:
-            return None
-        else:
-            return self.room_sem_id_to_sem_name[sem_id]
+        return self._get_names_by_points(xy, self.room_sem_map, self._sem_id_to_name_lut)
 
     def get_room_instance_by_point(self, xy):
         """
-        Return the room type given a point
+        Return the room instance given a point, or the room instances given multiple points
 
         Args:
-            xy (2-array): 2D location in world reference frame (in metric space)
+            xy (2-array or (N, 2)-array): 2D location(s) in world reference frame (in metric space)
 
         Returns:
-            None or str: room instance that this point is in or None, if this point is not on the room segmentation map
+            None or str, or list of (None or str): room instance that each point is in or None, if the point is not on
+                the room segmentation map. A single value is returned if @xy is a single point
         """
-        x, y = self.world_to_map(xy)
-        if x < 0 or x >= self.room_ins_map.shape[0] or y < 0 or y >= self.room_ins_map.shape[1]:
-            return None
-        ins_id = self.room_ins_map[x, y]
-        # room boundary
-        if ins_id == 0:
-            return None
-        else:
-            return self.room_ins_id_to_ins_name[ins_id]
+        return self._get_names_by_points(xy, self.room_ins_map, self._ins_id_to_name_lut)
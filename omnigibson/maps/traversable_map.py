@@ -1,15 +1,15 @@
 import logging
 import os
-import pickle
-import sys
 
-import cv2
-import networkx as nx
 import numpy as np
-from PIL import Image
 
 from omnigibson.maps.map_base import BaseMap
-import omnigibson.utils.transform_utils as T
+from omnigibson.utils.lazy_import_utils import lazy_import
+from omnigibson.utils.trav_graph_utils import TraversabilityGraph
+
+# Only imported upon loading a map
+cv2 = lazy_import("cv2")
+Image = lazy_import("PIL.Image")
 
 
 class TraversableMap(BaseMap):
@@ -72,6 +72,7 @@ class TraversableMap(BaseMap):
 
         self.floor_heights = floor_heights
         self.floor_map = []
+        self.floor_graph = []
         map_size = None
         for floor in range(len(self.floor_heights)):
             if self.trav_map_with_objects:
@@ -104,69 +105,37 @@ class TraversableMap(BaseMap):
 
             # We search for the largest connected areas
             if self.build_graph:
-                # Directly set map siz
-                self.floor_graph = self.build_trav_graph(map_size, maps_path, floor, trav_map)
+                self.floor_graph.append(self.build_trav_graph(map_size, maps_path, floor, trav_map))
 
             self.floor_map.append(trav_map)
 
         return map_size
 
-    # TODO: refactor into C++ for speedup
     @staticmethod
     def build_trav_graph(map_size, maps_path, floor, trav_map):
         """
-        Build traversibility graph and only take the largest connected component
+        Build traversibility graph and only take the largest connected component. The graph is cached in
+        @maps_path, keyed by a hash of @trav_map
 
         Args:
             map_size (int): Size of the map being generated
             maps_path (str): Path to the folder containing the traversability maps
             floor (int): floor number
             trav_map ((H, W)-array): traversability map in image form
+
+        Returns:
+            TraversabilityGraph: Traversability graph over the largest connected component of @trav_map
         """
-        floor_graph = []
-        graph_file = os.path.join(
-            maps_path, "floor_trav_{}_py{}{}.p".format(floor, sys.version_info.major, sys.version_info.minor)
-        )
-        if os.path.isfile(graph_file):
-            logging.info("Loading traversable graph")
-            with open(graph_file, "rb") as pfile:
-                g = pickle.load(pfile)
-        else:
-            logging.info("Building traversable graph")
-            g = nx.Graph()
-            for i in range(map_size):
-                for j in range(map_size):
-                    if trav_map[i, j] == 0:
-                        continue
-                    g.add_node((i, j))
-                    # 8-connected graph
-                    neighbors = [(i - 1, j - 1), (i, j - 1), (i + 1, j - 1), (i - 1, j)]
-                    for n in neighbors:
-                        if (
-                            0 <= n[0] < map_size
-                            and 0 <= n[1] < map_size
-                            and trav_map[n[0], n[1]] > 0
-                        ):
-                            g.add_edge(n, (i, j), weight=T.l2_distance(n, (i, j)))
-
-            # only take the largest connected component
-            largest_cc = max(nx.connected_components(g), key=len)
-            g = g.subgraph(largest_cc).copy()
-            with open(graph_file, "wb") as pfile:
-                pickle.dump(g, pfile)
-
-        floor_graph.append(g)
+        assert trav_map.shape == (map_size, map_size), "trav map does not match the map size"
+        g = TraversabilityGraph.from_trav_map(trav_map, cache_dir=maps_path, cache_prefix=f"floor_trav_{floor}")
 
         # update trav_map accordingly
         # This overwrites the traversability map loaded before
         # It sets everything to zero, then only sets to one the points where we have graph nodes
-        # Dangerous! if the traversability graph is not computed from the loaded map but from a file, it could overwrite
-        # it silently.
         trav_map[:, :] = 0
-        for node in g.nodes:
-            trav_map[node[0], node[1]] = 255
+        trav_map[g.mask] = 255
 
-        return floor_graph
+        return g
 
     @property
     def n_floors(self):
@@ -205,15 +174,15 @@ class TraversableMap(BaseMap):
             floor: floor number
             world_xy: 2D location in world reference frame (metric)
         """
-        map_xy = tuple(self.world_to_map(world_xy))
+        map_xy = self.world_to_map(world_xy)
         g = self.floor_graph[floor]
         return g.has_node(map_xy)
 
     def get_shortest_path(self, floor, source_world, target_world, entire_path=False):
         """
         Get the shortest path from one point to another point.
-        If any of the given point is not in the graph, add it to the graph and
-        create an edge between it to its closest node.
+        If any of the given point is not in the graph, it is connected to its closest node
+        with a straight segment, without modifying the graph.
 
         Args:
             floor (int): floor number
@@ -227,22 +196,10 @@ class TraversableMap(BaseMap):
                 - float: geodesic distance of the path
         """
         assert self.build_graph, "cannot get shortest path without building the graph"
-        source_map = tuple(self.world_to_map(source_world))
-        target_map = tuple(self.world_to_map(target_world))
-
-        g = self.floor_graph[floor]
-
-        if not g.has_node(target_map):
-            nodes = np.array(g.nodes)
-            closest_node = tuple(nodes[np.argmin(np.linalg.norm(nodes - target_map, axis=1))])
-            g.add_edge(closest_node, target_map, weight=T.l2_distance(closest_node, target_map))
-
-        if not g.has_node(source_map):
-            nodes = np.array(g.nodes)
-            closest_node = tuple(nodes[np.argmin(np.linalg.norm(nodes - source_map, axis=1))])
-            g.add_edge(closest_node, source_map, weight=T.l2_distance(closest_node, source_map))
+        source_map = self.world_to_map(source_world)
+        target_map = self.world_to_map(target_world)
 
-        path_map = np.array(nx.astar_path(g, source_map, target_map, heuristic=T.l2_distance))
+        path_map = self.floor_graph[floor].get_shortest_path(source_map, target_map)
 
         path_world = self.map_to_world(path_map)
         geodesic_distance = np.sum(np.linalg.norm(path_world[1:] - path_world[:-1], axis=1))
@@ -256,3 +213,36 @@ class TraversableMap(BaseMap):
                 path_world = np.concatenate((path_world, remaining_waypoints), axis=0)
 
         return path_world, geodesic_distance
+
+    def get_geodesic_distance(self, floor, source_world, target_world):
+        """
+        Get the geodesic distance from one point to another point, without computing the path itself.
+        If any of the given point is not in the graph, it is connected to its closest node
+        with a straight segment, without modifying the graph.
+
+        Args:
+            floor (int): floor number
+            source_world (2-array): (x,y) 2D source location in world reference frame (metric)
+            target_world (2-array): (x,y) 2D target location in world reference frame (metric)
+
+        Returns:
+            float: geodesic distance between @source_world and @target_world
+        """
+        return float(self.get_geodesic_distances(floor, source_world, target_world)[0])
+
+    def get_geodesic_distances(self, floor, sources_world, targets_world):
+        """
+        Batched version of get_geodesic_distance(). Queries sharing the same target are answered together
+
+        Args:
+            floor (int): floor number
+            sources_world ((N, 2)-array): (x,y) 2D source locations in world reference frame (metric)
+            targets_world ((N, 2)-array): (x,y) 2D target locations in world reference frame (metric)
+
+        Returns:
+            n-array: (N,) geodesic distance between each source and target
+        """
+        assert self.build_graph, "cannot get geodesic distance without building the graph"
+        sources_map = self.world_to_map(np.reshape(sources_world, (-1, 2)))
+        targets_map = self.world_to_map(np.reshape(targets_world, (-1, 2)))
+        return self.floor_graph[floor].get_geodesic_distances(sources_map, targets_map) * self.map_resolution
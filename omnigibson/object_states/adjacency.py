@@ -6,7 +6,7 @@ import omnigibson as og
 from omnigibson.macros import create_module_macros
 from omnigibson.object_states.aabb import AABB
 from omnigibson.object_states.object_state_base import AbsoluteObjectState
-from omnigibson.utils.sampling_utils import raytest_batch
+from omnigibson.utils.raycast_utils import raycast_batch
 
 
 # Create settings for this module
@@ -91,7 +91,7 @@ def compute_adjacencies(obj, axes, max_distance):
     ray_endpoints = ray_starts + (directions * max_distance)
 
     # Cast time.
-    ray_results = raytest_batch(
+    ray_results = raycast_batch(
         ray_starts,
         ray_endpoints,
         only_closest=False,
@@ -102,16 +102,19 @@ def compute_adjacencies(obj, axes, max_distance):
     # Add the results to the appropriate lists
     # For now, we keep our result in the dimensionality of (direction, hit_object_order).
     # We convert the hit link into unique objects encountered
-    objs_by_direction = []
-    for results in ray_results:
-        unique_objs = set()
-        for result in results:
-            # Check if the inferred hit object is not None, we add it to our set
-            obj_prim_path = "/".join(result["rigidBody"].split("/")[:-1])
-            obj = og.sim.scene.object_registry("prim_path", obj_prim_path, None)
-            if obj is not None:
-                unique_objs.add(obj)
-        objs_by_direction.append(unique_objs)
+    # Hits are deduplicated per (direction, rigid body) before resolving any prim paths
+    objs_by_direction = [set() for _ in range(len(directions))]
+    ray_body_pairs = np.unique(np.stack([ray_results.ray_indices, ray_results.rigid_body_ids], axis=1), axis=0)
+    link_resolver = og.sim.scene.link_resolver
+    if ray_results.interner is link_resolver.interner:
+        hit_objs, _ = link_resolver.resolve_ids(ray_body_pairs[:, 1])
+    else:
+        hit_objs = [link_resolver.resolve_path(ray_results.interner.get_path(body_id))[0]
+                    for body_id in ray_body_pairs[:, 1]]
+    for ray_idx, obj in zip(ray_body_pairs[:, 0], hit_objs):
+        # Check if the inferred hit object is not None, we add it to our set
+        if obj is not None:
+            objs_by_direction[ray_idx].add(obj)
 
     # Reshape so that these have the following indices:
     # (axis_idx, direction-one-or-zero, hit_idx)
@@ -12,13 +12,11 @@ class ContactBodies(AbsoluteObjectState):
             bodies.update({contact.body0, contact.body1})
         bodies -= set(self.obj.link_prim_paths)
         rigid_prims = set()
+        link_resolver = og.sim.scene.link_resolver
         for body in bodies:
-            tokens = body.split("/")
-            obj_prim_path = "/".join(tokens[:-1])
-            link_name = tokens[-1]
-            obj = og.sim.scene.object_registry("prim_path", obj_prim_path)
-            if obj is not None:
-                rigid_prims.add(obj.links[link_name])
+            _, link = link_resolver.resolve_path(body)
+            if link is not None:
+                rigid_prims.add(link)
         # Ignore_objs should either be None or tuple (CANNOT be list because we need to hash these inputs)
         assert ignore_objs is None or isinstance(ignore_objs, tuple), \
             "ignore_objs must either be None or a tuple of objects to ignore!"
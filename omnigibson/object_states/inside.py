@@ -5,7 +5,7 @@ from omnigibson.object_states.aabb import AABB
 from omnigibson.object_states.adjacency import HorizontalAdjacency, VerticalAdjacency, flatten_planes
 from omnigibson.object_states.kinematics import KinematicsMixin
 from omnigibson.object_states.object_state_base import BooleanState, RelativeObjectState
-from omnigibson.utils.object_state_utils import sample_kinematics
+from omnigibson.utils.object_state_utils import create_sampling_snapshot, sample_kinematics
 from omnigibson.utils.usd_utils import BoundingBoxAPI
 
 
@@ -18,7 +18,7 @@ class Inside(KinematicsMixin, RelativeObjectState, BooleanState):
         if not new_value:
             raise NotImplementedError("Inside does not support set_value(False)")
 
-        state = self._simulator.dump_state(serialized=False)
+        snapshot = create_sampling_snapshot(objA=self.obj, objB=other)
 
         for _ in range(10):
             sampling_success = sample_kinematics(
@@ -33,7 +33,7 @@ class Inside(KinematicsMixin, RelativeObjectState, BooleanState):
             if sampling_success:
                 break
             else:
-                self._simulator.load_state(state, serialized=False)
+                snapshot.restore()
 
         return sampling_success
 
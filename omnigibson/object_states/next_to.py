@@ -1,11 +1,37 @@
 import numpy as np
 
+import omnigibson as og
 from omnigibson.object_states.aabb import AABB
 from omnigibson.object_states.adjacency import HorizontalAdjacency, flatten_planes
 from omnigibson.object_states.kinematics import KinematicsMixin
 from omnigibson.object_states.object_state_base import BooleanState, RelativeObjectState
 
 
+def _aabbs_within_next_to_distance(objA_aabb, objB_aabb):
+    """
+    Args:
+        objA_aabb (2-tuple): (lower, upper) corners of the first object's AABB
+        objB_aabb (2-tuple): (lower, upper) corners of the second object's AABB
+
+    Returns:
+        bool: Whether the distance between both AABBs is at most a sixth of their average side length, which is
+            required for both objects to be next to each other
+    """
+    objA_lower, objA_upper = objA_aabb
+    objB_lower, objB_upper = objB_aabb
+    distance_vec = []
+    for dim in range(3):
+        glb = max(objA_lower[dim], objB_lower[dim])
+        lub = min(objA_upper[dim], objB_upper[dim])
+        distance_vec.append(max(0, glb - lub))
+    distance = np.linalg.norm(np.array(distance_vec))
+    objA_dims = objA_upper - objA_lower
+    objB_dims = objB_upper - objB_lower
+    avg_aabb_length = np.mean(objA_dims + objB_dims)
+
+    return distance <= avg_aabb_length * (1.0 / 6.0)
+
+
 class NextTo(KinematicsMixin, RelativeObjectState, BooleanState):
     @staticmethod
     def get_dependencies():
@@ -21,23 +47,19 @@ class NextTo(KinematicsMixin, RelativeObjectState, BooleanState):
         assert AABB in objA_states
         assert AABB in objB_states
 
-        objA_aabb = objA_states[AABB].get_value()
-        objB_aabb = objB_states[AABB].get_value()
-
-        objA_lower, objA_upper = objA_aabb
-        objB_lower, objB_upper = objB_aabb
-        distance_vec = []
-        for dim in range(3):
-            glb = max(objA_lower[dim], objB_lower[dim])
-            lub = min(objA_upper[dim], objB_upper[dim])
-            distance_vec.append(max(0, glb - lub))
-        distance = np.linalg.norm(np.array(distance_vec))
-        objA_dims = objA_upper - objA_lower
-        objB_dims = objB_upper - objB_lower
-        avg_aabb_length = np.mean(objA_dims + objB_dims)
+        # The AABBs in the scene's spatial index contain the objects' AABBs, so they are never farther apart, and
+        # their average side length is never shorter. Hence, if they are too far apart, so are the objects' AABBs,
+        # which need not be computed.
+        scene = og.sim.scene
+        if scene.spatial_index_is_up_to_date:
+            objA_indexed_aabb = scene.get_indexed_aabb(self.obj)
+            objB_indexed_aabb = scene.get_indexed_aabb(other)
+            if objA_indexed_aabb is not None and objB_indexed_aabb is not None and \
+                    not _aabbs_within_next_to_distance(objA_indexed_aabb, objB_indexed_aabb):
+                return False
 
         # If the distance is longer than acceptable, return False.
-        if distance > avg_aabb_length * (1.0 / 6.0):
+        if not _aabbs_within_next_to_distance(objA_states[AABB].get_value(), objB_states[AABB].get_value()):
             return False
 
         # Otherwise, check if the other object shows up in the adjacency list.
@@ -5,7 +5,7 @@ from omnigibson.object_states.kinematics import KinematicsMixin
 from omnigibson.object_states.adjacency import VerticalAdjacency
 from omnigibson.object_states.object_state_base import BooleanState, RelativeObjectState
 from omnigibson.object_states.touching import Touching
-from omnigibson.utils.object_state_utils import sample_kinematics
+from omnigibson.utils.object_state_utils import create_sampling_snapshot, sample_kinematics
 
 
 class OnTop(KinematicsMixin, RelativeObjectState, BooleanState):
@@ -17,7 +17,7 @@ class OnTop(KinematicsMixin, RelativeObjectState, BooleanState):
         if not new_value:
             raise NotImplementedError("OnTop does not support set_value(False)")
 
-        state = self._simulator.dump_state(serialized=False)
+        snapshot = create_sampling_snapshot(objA=self.obj, objB=other)
 
         for _ in range(10):
             sampling_success = sample_kinematics(
@@ -32,7 +32,7 @@ class OnTop(KinematicsMixin, RelativeObjectState, BooleanState):
             if sampling_success:
                 break
             else:
-                self._simulator.load_state(state, serialized=False)
+                snapshot.restore()
 
         return sampling_success
 
@@ -5,7 +5,7 @@ from omnigibson.object_states.inside import Inside
 from omnigibson.object_states.object_state_base import AbsoluteObjectState
 from omnigibson.object_states.aabb import AABB
 from omnigibson.object_states.update_state_mixin import UpdateStateMixin
-import omnigibson.utils.transform_utils as T
+import omnigibson.utils.thermal_utils as TU
 import omnigibson as og
 
 
@@ -44,54 +44,110 @@ class Temperature(AbsoluteObjectState, UpdateStateMixin):
         return True
 
     def _update(self):
+        self.batch_update([self])
+
+    @classmethod
+    def batch_update(cls, states):
         # Avoid circular import
         from omnigibson.object_states.on_fire import OnFire
 
-        # Start at the current temperature.
-        new_temperature = self.value
+        if len(states) == 0:
+            return
 
-        # Find all heat source objects.
-        affected_by_heat_source = False
-        heat_source_objs = og.sim.scene.get_objects_with_state_recursive(HeatSourceOrSink)
-        for obj2 in heat_source_objs:
-            # Only external heat sources will affect the temperature.
-            if obj2 == self.obj:
-                continue
+        # Gather the temperatures and positions of all heated objects.
+        objs = [state.obj for state in states]
+        obj_idxs = {obj: i for i, obj in enumerate(objs)}
+        temperatures = np.array([state.value for state in states], dtype=float)
+        aabbs = np.array([obj.states[AABB].get_value() for obj in objs], dtype=float).reshape(-1, 2, 3)
+        positions = aabbs.mean(axis=1)
 
+        # Gather all heat sources. Sources without a heat source position are stored with a NaN position, and only
+        # affect objects that are inside of them.
+        heat_sources, source_positions, source_aabbs = [], [], []
+        for obj2 in og.sim.scene.get_objects_with_state_recursive(HeatSourceOrSink):
             heat_source = obj2.states.get(OnFire, obj2.states.get(HeatSourceOrSink, None))
             assert heat_source is not None, "Unknown HeatSourceOrSink subclass"
-            heat_source_state = heat_source.get_value()
-            if heat_source_state:
-                heat_source_position = heat_source.get_link_position()
-                # If the object is on fire and there is no heat source position annotation, we use the AABB center
-                if OnFire in obj2.states and heat_source_position is None:
-                    aabb_lower, aabb_upper = obj2.states[AABB].get_value()
-                    heat_source_position = (aabb_lower + aabb_upper) / 2.0
-                # The heat source is on and there is a heat source position, we check distance.
-                # If not, we check whether we are inside it or not.
-                if heat_source_position is not None:
-                    aabb_lower, aabb_upper = self.obj.states[AABB].get_value()
-                    position = (aabb_lower + aabb_upper) / 2.0
-                    # Compute distance to heat source from our position.
-                    dist = T.l2_distance(heat_source_position, position)
-                    if dist > heat_source.distance_threshold:
-                        continue
+            heat_source_position = heat_source.get_link_position()
+            aabb = None
+            # If the object is on fire and there is no heat source position annotation, we use the AABB center
+            if OnFire in obj2.states and heat_source_position is None:
+                aabb_lower, aabb_upper = obj2.states[AABB].get_value()
+                heat_source_position = (aabb_lower + aabb_upper) / 2.0
+            elif heat_source_position is None:
+                aabb = obj2.states[AABB].get_value()
+            heat_sources.append(heat_source)
+            source_positions.append(np.full(3, np.nan) if heat_source_position is None else heat_source_position)
+            source_aabbs.append(np.full((2, 3), np.nan) if aabb is None else aabb)
+
+        source_positions = np.array(source_positions, dtype=float).reshape(-1, 3)
+        source_aabbs = np.array(source_aabbs, dtype=float).reshape(-1, 2, 3)
+        source_owner_idxs = np.array([obj_idxs.get(heat_source.obj, -1) for heat_source in heat_sources], dtype=int)
+        source_distance_thresholds = \
+            np.array([heat_source.distance_threshold for heat_source in heat_sources], dtype=float)
+        source_temperatures = np.array([heat_source.temperature for heat_source in heat_sources], dtype=float)
+        source_heating_rates = np.array([heat_source.heating_rate for heat_source in heat_sources], dtype=float)
+        active = np.zeros(len(heat_sources), dtype=bool)
+
+        # If the scene's spatial index is up to date, only objects near each heat source are candidates for being
+        # affected by it. An affected object's AABB center lies within the heat source's distance threshold (or its
+        # AABB), so one of its links' indexed AABBs is within range as well, up to the object's AABB half-diagonal.
+        candidates = np.ones((len(objs), len(heat_sources)), dtype=bool)
+        scene = og.sim.scene
+        if scene.spatial_index_is_up_to_date and len(heat_sources) > 0:
+            candidates[:] = False
+            margin = np.max(np.linalg.norm(aabbs[:, 1] - aabbs[:, 0], axis=-1)) / 2.0
+            for j in range(len(heat_sources)):
+                if np.any(np.isnan(source_positions[j])):
+                    nearby_objs = scene.get_objects_in_aabb(source_aabbs[j, 0] - margin, source_aabbs[j, 1] + margin)
                 else:
-                    if not self.obj.states[Inside].get_value(obj2):
-                        continue
-
-                new_temperature += (
-                    (heat_source.temperature - self.value) * heat_source.heating_rate * self._simulator.get_rendering_dt()
-                )
-                affected_by_heat_source = True
-
-        # Apply temperature decay if not affected by any heat source.
-        if not affected_by_heat_source:
-            new_temperature += (
-                (m.DEFAULT_TEMPERATURE - self.value) * m.TEMPERATURE_DECAY_SPEED * self._simulator.get_rendering_dt()
+                    nearby_objs = scene.get_objects_within_radius(
+                        source_positions[j], source_distance_thresholds[j] + margin)
+                candidates[[obj_idxs[obj] for obj in nearby_objs if obj in obj_idxs], j] = True
+
+        def update(start, stop):
+            # Only active heat sources affect the objects in @states[start:stop]. Inside requires the object's AABB
+            # center to lie within the heat source's AABB, so we only need to run the full Inside check for the pairs
+            # passing that test.
+            owner_idxs = source_owner_idxs - start
+            inside_mask = TU.points_in_aabbs(positions[start:stop], source_aabbs[:, 0], source_aabbs[:, 1])
+            inside_mask &= candidates[start:stop] & active[None]
+            inside_mask &= owner_idxs[None] != np.arange(stop - start)[:, None]
+            for i, j in zip(*np.nonzero(inside_mask)):
+                inside_mask[i, j] = objs[start + i].states[Inside].get_value(heat_sources[j].obj)
+
+            affected = TU.compute_heat_source_contacts(
+                positions=positions[start:stop],
+                source_positions=source_positions,
+                source_distance_thresholds=source_distance_thresholds,
+                source_owner_idxs=owner_idxs,
+                inside_mask=inside_mask,
+            )
+            new_temperatures = TU.compute_temperatures(
+                temperatures=temperatures[start:stop],
+                affected=affected & candidates[start:stop] & active[None],
+                source_temperatures=source_temperatures,
+                source_heating_rates=source_heating_rates,
+                dt=og.sim.get_rendering_dt(),
+                ambient_temperature=m.DEFAULT_TEMPERATURE,
+                decay_speed=m.TEMPERATURE_DECAY_SPEED,
             )
 
-        self.value = new_temperature
+            # Write the results back to the individual states.
+            for state, new_temperature in zip(states[start:stop], new_temperatures):
+                state.value = float(new_temperature)
+
+        # Heat source activity is evaluated in the same order as when updating one object at a time: the first time
+        # an object other than the heat source's owner is updated, after which it is cached for the rest of the step.
+        # Hence, only heat sources owned by the first object see its updated temperature (e.g.: it just caught fire),
+        # and all other heat sources are evaluated before any temperature changes.
+        owned_by_first = source_owner_idxs == 0
+        for j in np.nonzero(~owned_by_first)[0]:
+            active[j] = heat_sources[j].get_value()
+        update(0, 1)
+        if len(states) > 1:
+            for j in np.nonzero(owned_by_first)[0]:
+                active[j] = heat_sources[j].get_value()
+            update(1, len(states))
 
     @property
     def state_size(self):
@@ -4,7 +4,7 @@ import omnigibson
 from omnigibson.object_states.adjacency import VerticalAdjacency
 from omnigibson.object_states.kinematics import KinematicsMixin
 from omnigibson.object_states.object_state_base import BooleanState, RelativeObjectState
-from omnigibson.utils.object_state_utils import sample_kinematics
+from omnigibson.utils.object_state_utils import create_sampling_snapshot, sample_kinematics
 
 
 class Under(KinematicsMixin, RelativeObjectState, BooleanState):
@@ -16,7 +16,7 @@ class Under(KinematicsMixin, RelativeObjectState, BooleanState):
         if not new_value:
             raise NotImplementedError("Under does not support set_value(False)")
 
-        state = self._simulator.dump_state(serialized=False)
+        snapshot = create_sampling_snapshot(objA=self.obj, objB=other)
 
         for _ in range(10):
             sampling_success = sample_kinematics("under", self.obj, other)
@@ -29,7 +29,7 @@ class Under(KinematicsMixin, RelativeObjectState, BooleanState):
             if sampling_success:
                 break
             else:
-                self._simulator.load_state(state, serialized=False)
+                snapshot.restore()
 
         return sampling_success
 
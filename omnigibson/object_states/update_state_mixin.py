@@ -11,6 +11,19 @@ class UpdateStateMixin:
         assert self._initialized, "Cannot update uninitialized state."
         return self._update()
 
+    @classmethod
+    def batch_update(cls, states):
+        """
+        Updates all the given object states of this type. This function will be called once for every simulator step,
+        with all initialized states of this type in the scene. By default, this simply calls update() on each state,
+        but subclasses may override it to update all states at once, e.g.: in a single vectorized pass
+
+        Args:
+            states (list of UpdateStateMixin): states of this type to update
+        """
+        for state in states:
+            state.update()
+
     def _update(self):
         """
         This function will be called once for every simulator step. Must be implemented by subclass.
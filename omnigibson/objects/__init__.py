@@ -1,8 +1,12 @@
-from omnigibson.objects.object_base import REGISTERED_OBJECTS, BaseObject
-from omnigibson.objects.controllable_object import ControllableObject
-from omnigibson.objects.dataset_object import DatasetObject
-from omnigibson.objects.light_object import LightObject
-from omnigibson.objects.primitive_object import PrimitiveObject
-from omnigibson.objects.stateful_object import StatefulObject
-from omnigibson.objects.usd_object import USDObject
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
 
+# Objects are imported upon first access, or upon first lookup of REGISTERED_OBJECTS
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".object_base": ["REGISTERED_OBJECTS", "BaseObject"],
+    ".controllable_object": ["ControllableObject"],
+    ".dataset_object": ["DatasetObject"],
+    ".light_object": ["LightObject"],
+    ".primitive_object": ["PrimitiveObject"],
+    ".stateful_object": ["StatefulObject"],
+    ".usd_object": ["USDObject"],
+})
@@ -3,15 +3,16 @@ from copy import deepcopy
 import numpy as np
 import logging
 import gym
-from collections import Iterable
+from omni.isaac.dynamic_control import _dynamic_control
 from omnigibson.objects.object_base import BaseObject
 from omnigibson.controllers import create_controller
 from omnigibson.controllers.controller_base import ControlType
+from omnigibson.utils.control_deployment_utils import ControlDeploymentMixin
 from omnigibson.utils.python_utils import assert_valid_key, merge_nested_dicts
 from omnigibson.utils.constants import PrimType
 
 
-class ControllableObject(BaseObject):
+class ControllableObject(BaseObject, ControlDeploymentMixin):
     """
     Simple class that extends object functionality for controlling joints -- this assumes that at least some joints
     are motorized (i.e.: non-zero low-level simulator joint motor gains) and intended to be controlled,
@@ -82,10 +83,22 @@ class ControllableObject(BaseObject):
 
         # Store internal placeholders that will be filled in later
         self._dof_to_joints = None          # dict that will map DOF indices to JointPrims
+        self._dof_to_articulation_idx = None    # array mapping DOF indices to articulation DOF indices
         self._last_action = None
         self._controllers = None
         self.dof_names_ordered = None
 
+        # Preallocated buffers for converting actions into controls, filled in when controllers are loaded
+        self._controller_action_slices = None   # dict mapping controller names to their slice of the action vector
+        self._control_buffer = None             # (n_dof,) control values
+        self._control_type_buffer = None        # (n_dof,) default control types
+        self._uncontrolled_dof_idx = None       # DOF indices not controlled by any controller
+
+        # Cached grouping of DOFs by control type, used for deploying control, and the control types it corresponds to
+        self._control_groups = None
+        self._control_groups_types = None
+        self._effort_joint_groups = None
+
         # Run super init
         super().__init__(
             prim_path=prim_path,
@@ -114,6 +127,10 @@ class ControllableObject(BaseObject):
                 self._dof_to_joints[idx] = joint
                 idx += 1
 
+        # Map DOF indices to articulation DOF indices, if the mapping is known
+        self._dof_to_articulation_idx = None if self._joint_dof_idxs is None or self.n_dof == 0 else \
+            np.concatenate([self._joint_dof_idxs[joint_name] for joint_name in self._joints.keys()])
+
         # Update the reset joint pos
         if self._reset_joint_pos is None:
             self._reset_joint_pos = self.default_joint_pos
@@ -171,12 +188,31 @@ class ControllableObject(BaseObject):
             # Create the controller
             self._controllers[name] = create_controller(**cfg)
 
+        # Preallocate the buffers used to convert actions into controls
+        self._controller_action_slices = dict()
+        idx = 0
+        for name, controller in self._controllers.items():
+            self._controller_action_slices[name] = slice(idx, idx + controller.command_dim)
+            idx += controller.command_dim
+        self._control_buffer = np.zeros(self.n_dof)
+        # By default, the control type is effort and the control value is 0 - 0 effort means no control.
+        self._control_type_buffer = np.array([ControlType.EFFORT] * self.n_dof)
+        controlled = np.zeros(self.n_dof, dtype=bool)
+        for controller in self._controllers.values():
+            self._control_type_buffer[controller.dof_idx] = controller.control_type
+            controlled[controller.dof_idx] = True
+        self._uncontrolled_dof_idx = np.flatnonzero(~controlled)
+
         self._update_controller_mode()
 
     def _update_controller_mode(self):
         """
         Helper function to force the joints to use the internal specified control mode and gains
         """
+        # Joint control modes are about to be (re-)set, so the cached control groups must be re-validated
+        self._control_groups = None
+        self._control_groups_types = None
+
         # Update the control modes of each joint based on the outputted control from the controllers
         for name in self._controllers:
             for dof in self._controllers[name].dof_idx:
@@ -319,125 +355,28 @@ class ControllableObject(BaseObject):
 
         Returns:
             2-tuple:
-                - n-array: raw control signals to send to the object's joints
+                - n-array: raw control signals to send to the object's joints. Note that this is a preallocated
+                    buffer which is overwritten on the next call
                 - list: control types for each joint
         """
-        # First, loop over all controllers, and calculate the computed control
-        control = dict()
-        idx = 0
-
         # Compose control_dict
         control_dict = self.get_control_dict()
 
+        # Loop over all controllers, and write the computed control directly into the control buffer
+        u_vec = self._control_buffer
+        # By default, the control type is effort and the control value is 0 - 0 effort means no control.
+        u_vec[self._uncontrolled_dof_idx] = 0.0
         for name, controller in self._controllers.items():
             # Set command, then take a controller step
-            controller.update_command(command=action[idx : idx + controller.command_dim])
-            control[name] = {
-                "value": controller.step(control_dict=control_dict),
-                "type": controller.control_type,
-            }
-            # Update idx
-            idx += controller.command_dim
-
-        # Compose controls
-        u_vec = np.zeros(self.n_dof)
-        # By default, the control type is effort and the control value is 0 (np.zeros) - 0 effort means no control.
-        u_type_vec = np.array([ControlType.EFFORT] * self.n_dof)
-        for group, ctrl in control.items():
-            idx = self._controllers[group].dof_idx
-            u_vec[idx] = ctrl["value"]
-            u_type_vec[idx] = ctrl["type"]
+            controller.update_command(command=action[self._controller_action_slices[name]])
+            u_vec[controller.dof_idx] = controller.step(control_dict=control_dict)
 
         # Return control
-        return u_vec, u_type_vec
-
-    def deploy_control(self, control, control_type, indices=None, normalized=False):
-        """
-        Deploys control signals @control with corresponding @control_type on this entity.
-
-        Note: This is DIFFERENT than self.set_joint_positions/velocities/efforts, because in this case we are only
-            setting target values (i.e.: we subject this entity to physical dynamics in order to reach the desired
-            @control setpoints), compared to set_joint_XXXX which manually sets the actual state of the joints.
-
-            This function is intended to be used with motorized entities, e.g.: robot agents or machines (e.g.: a
-            conveyor belt) to simulation physical control of these entities.
-
-            In contrast, use set_joint_XXXX for simulation-specific logic, such as simulator resetting or "magic"
-            action implementations.
+        return u_vec, self._control_type_buffer.copy()
 
-        Args:
-            control (k- or n-array): control signals to deploy. This should be n-DOF length if all joints are being set,
-                or k-length (k < n) if specific indices are being set. In this case, the length of @control must
-                be the same length as @indices!
-            control_type (k- or n-array): control types for each DOF. Each entry should be one of ControlType.
-                 This should be n-DOF length if all joints are being set, or k-length (k < n) if specific
-                 indices are being set. In this case, the length of @control must be the same length as @indices!
-            indices (None or k-array): If specified, should be k (k < n) length array of specific DOF controls to deploy.
-                Default is None, which assumes that all joints are being set.
-            normalized (bool or array of bool): Whether the inputted joint controls should be interpreted as normalized
-                values. A single bool can be specified for the entire @control, or an array can be specified for
-                individual values. Default is False, corresponding to all @control assumed to be not normalized
-        """
-        # Run sanity check
-        if indices is None:
-            assert len(control) == len(control_type) == self.n_dof, (
-                "Control signals, control types, and number of DOF should all be the same!"
-                "Got {}, {}, and {} respectively.".format(len(control), len(control_type), self.n_dof)
-            )
-            # Set indices manually so that we're standardized
-            indices = np.arange(self.n_dof)
-        else:
-            assert len(control) == len(control_type) == len(indices), (
-                "Control signals, control types, and indices should all be the same!"
-                "Got {}, {}, and {} respectively.".format(len(control), len(control_type), len(indices))
-            )
-
-        # Standardize normalized input
-        n_indices = len(indices)
-        normalized = normalized if isinstance(normalized, Iterable) else [normalized] * n_indices
-
-        # Loop through controls and deploy
-        # We have to use delicate logic to account for the edge cases where a single joint may contain > 1 DOF
-        # (e.g.: spherical joint)
-        cur_indices_idx = 0
-        while cur_indices_idx != n_indices:
-            # Grab the current DOF index we're controlling and find the corresponding joint
-            joint = self._dof_to_joints[indices[cur_indices_idx]]
-            cur_ctrl_idx = indices[cur_indices_idx]
-            joint_dof = joint.n_dof
-            if joint_dof > 1:
-                # Run additional sanity checks since the joint has more than one DOF to make sure our controls,
-                # control types, and indices all match as expected
-
-                # Make sure the indices are mapped correctly
-                assert indices[cur_indices_idx + joint_dof] == cur_ctrl_idx + joint_dof, \
-                    "Got mismatched control indices for a single joint!"
-                # Check to make sure all joints, control_types, and normalized as all the same over n-DOF for the joint
-                for group_name, group in zip(
-                        ("joints", "control_types", "normalized"),
-                        (self._dof_to_joints, control_type, normalized),
-                ):
-                    assert len({group[indices[cur_indices_idx + i]] for i in range(joint_dof)}) == 1, \
-                        f"Not all {group_name} were the same when trying to deploy control for a single joint!"
-                # Assuming this all passes, we grab the control subvector, type, and normalized value accordingly
-                ctrl = control[cur_ctrl_idx: cur_ctrl_idx + joint_dof]
-            else:
-                # Grab specific control. No need to do checks since this is a single value
-                ctrl = control[cur_ctrl_idx]
-
-            # Deploy control based on type
-            ctrl_type, norm = control_type[cur_ctrl_idx], normalized[cur_ctrl_idx]       # In multi-DOF joint case all values were already checked to be the same
-            if ctrl_type == ControlType.EFFORT:
-                joint.set_effort(ctrl, normalized=norm)
-            elif ctrl_type == ControlType.VELOCITY:
-                joint.set_vel(ctrl, normalized=norm, target=True)
-            elif ctrl_type == ControlType.POSITION:
-                joint.set_pos(ctrl, normalized=norm, target=True)
-            else:
-                raise ValueError("Invalid control type specified: {}".format(ctrl_type))
-
-            # Finally, increment the current index based on how many DOFs were just controlled
-            cur_indices_idx += joint_dof
+    @property
+    def _articulation_handle_valid(self):
+        return self._handle is not None and self._handle != _dynamic_control.INVALID_HANDLE
 
     def get_control_dict(self):
         """
@@ -17,6 +17,8 @@ from omnigibson.utils.constants import AVERAGE_CATEGORY_SPECS, DEFAULT_JOINT_FRI
 import omnigibson.utils.transform_utils as T
 from omnigibson.utils.usd_utils import BoundingBoxAPI
 from omnigibson.utils.asset_utils import decrypt_file
+from omnigibson.utils.asset_cache_utils import get_decrypted_asset_cache, m as asset_cache_macros
+from omnigibson.utils.scene_loading_utils import get_height_map_path
 from omnigibson.utils.constants import PrimType
 from omnigibson.macros import gm, create_module_macros
 
@@ -106,6 +108,7 @@ class DatasetObject(USDObject):
 
         # Info that will be filled in at runtime
         self.supporting_surfaces = None             # Dictionary mapping link names to surfaces represented by links
+        self._preloaded_height_maps = None          # Height map images read ahead of loading, mapped by their paths
 
         # Make sure only one of bounding_box and scale are specified
         if bounding_box is not None and scale is not None:
@@ -147,6 +150,17 @@ class DatasetObject(USDObject):
             **kwargs,
         )
 
+    def set_preloaded_height_maps(self, height_maps):
+        """
+        Sets supporting surface height maps that were read ahead of loading this object (e.g.: on a worker while
+        loading a scene), so that they are not read again from disk once this object is loaded
+
+        Args:
+            height_maps (None or dict): Maps the path of each height map to its image, as returned by
+                omnigibson.utils.scene_loading_utils.read_height_maps()
+        """
+        self._preloaded_height_maps = height_maps
+
     def load_supporting_surfaces(self):
         # Initialize dict of supporting surface info
         self.supporting_surfaces = {}
@@ -158,19 +172,21 @@ class DatasetObject(USDObject):
 
         # TODO: Integrate images directly into usd file?
         # We loop over all the predicates and corresponding supported links in our heights info
-        usd_dir = os.path.dirname(self._usd_path)
+        preloaded = dict() if self._preloaded_height_maps is None else self._preloaded_height_maps
         for predicate, links in heights_info.items():
             height_maps = {}
             for link_name, heights in links.items():
                 height_maps[link_name] = []
                 for i, z_value in enumerate(heights):
                     # Get boolean birds-eye view xy-mask image for this surface
-                    img_fname = os.path.join(usd_dir, "../misc", "height_maps_per_link", predicate, link_name, f"{i}.png")
-                    xy_map = cv2.imread(img_fname, 0)
+                    img_fname = get_height_map_path(self._usd_path, predicate, link_name, i)
+                    xy_map = preloaded[img_fname] if img_fname in preloaded else cv2.imread(img_fname, 0)
                     # Add this map to the supporting surfaces for this link and predicate combination
                     height_maps[link_name].append((z_value, xy_map))
             # Add this heights map to the overall supporting surfaces
             self.supporting_surfaces[predicate] = height_maps
+        # The preloaded images are now referenced by the supporting surfaces
+        self._preloaded_height_maps = None
 
     def sample_orientation(self):
         """
@@ -212,7 +228,15 @@ class DatasetObject(USDObject):
                 joint.friction = friction
 
     def _load(self, simulator=None):
-        if gm.USE_ENCRYPTED_ASSETS:
+        if gm.USE_ENCRYPTED_ASSETS and asset_cache_macros.ENABLED:
+            # Load the decrypted asset from the cache, which only decrypts it upon the first load of this model
+            original_usd_path = self._usd_path
+            encrypted_filename = original_usd_path.replace(".usd", ".encrypted.usd")
+            self._usd_path = get_decrypted_asset_cache().get(encrypted_filename, key_path=og.key_path, suffix=".usd")
+            prim = super()._load(simulator=simulator)
+            self._usd_path = original_usd_path
+            return prim
+        elif gm.USE_ENCRYPTED_ASSETS:
             # Create a temporary file to store the decrytped asset, load it, and then delete it.
             with tempfile.NamedTemporaryFile(suffix=".usd") as fp:
                 original_usd_path = self._usd_path
@@ -253,7 +277,8 @@ class DatasetObject(USDObject):
         super()._post_load()
 
         if gm.USE_ENCRYPTED_ASSETS:
-            # The loaded USD is from an already-deleted temporary file, so the asset paths for texture maps are wrong.
+            # The loaded USD is from an already-deleted temporary file or from the decrypted asset cache, so the asset
+            # paths for texture maps are wrong.
             # We explicitly provide the root_path to update all the asset paths: the asset paths are relative to the
             # original USD folder, i.e. <category>/<model>/usd.
             root_path = os.path.dirname(self._usd_path)
@@ -11,12 +11,13 @@ from pxr import UsdPhysics, PhysxSchema
 from omnigibson.utils.usd_utils import create_joint, CollisionAPI
 from omnigibson.prims.entity_prim import EntityPrim
 from omnigibson.utils.python_utils import Registerable, classproperty
+from omnigibson.utils.lazy_import_utils import LazyRegistry
 from omnigibson.utils.constants import PrimType, CLASS_NAME_TO_CLASS_ID
 
 from omni.isaac.core.utils.semantics import add_update_semantics
 
 # Global dicts that will contain mappings
-REGISTERED_OBJECTS = dict()
+REGISTERED_OBJECTS = LazyRegistry(package_name="omnigibson.objects")
 
 # Create settings for this module
 m = create_module_macros(module_path=__file__)
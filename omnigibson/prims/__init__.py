@@ -1,7 +1,11 @@
-from omnigibson.prims.prim_base import BasePrim
-from omnigibson.prims.cloth_prim import ClothPrim
-from omnigibson.prims.entity_prim import EntityPrim
-from omnigibson.prims.geom_prim import GeomPrim, VisualGeomPrim, CollisionGeomPrim, CollisionVisualGeomPrim
-from omnigibson.prims.joint_prim import JointPrim
-from omnigibson.prims.rigid_prim import RigidPrim
-from omnigibson.prims.xform_prim import XFormPrim
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".prim_base": ["BasePrim"],
+    ".cloth_prim": ["ClothPrim"],
+    ".entity_prim": ["EntityPrim"],
+    ".geom_prim": ["GeomPrim", "VisualGeomPrim", "CollisionGeomPrim", "CollisionVisualGeomPrim"],
+    ".joint_prim": ["JointPrim"],
+    ".rigid_prim": ["RigidPrim"],
+    ".xform_prim": ["XFormPrim"],
+})
@@ -15,12 +15,20 @@ from omnigibson.prims.cloth_prim import ClothPrim
 from omnigibson.prims.joint_prim import JointPrim
 from omnigibson.prims.rigid_prim import RigidPrim
 from omnigibson.prims.xform_prim import XFormPrim
-from omnigibson.utils.sim_utils import check_collision
+from omnigibson.utils.physics_state_utils import ArticulationStateMixin
+from omnigibson.utils.sim_utils import check_collision, mark_physics_state_dirty
 from omnigibson.utils.constants import PrimType, GEOM_TYPES
-from omnigibson.macros import gm
+from omnigibson.macros import gm, create_module_macros
 
 
-class EntityPrim(XFormPrim):
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether to share a single per-step snapshot of each articulation's physical state among all consumers
+m.CACHE_ARTICULATION_STATES = True
+
+
+class EntityPrim(XFormPrim, ArticulationStateMixin):
     """
     Provides high level functions to deal with an articulation prim and its attributes/ properties. Note that this
     type of prim cannot be created from scratch, and assumes there is already a pre-existing prim tree that should
@@ -38,6 +46,8 @@ class EntityPrim(XFormPrim):
                     Default is True.
         """
 
+    _ALL_DOF_STATES = _dynamic_control.STATE_ALL
+
     def __init__(
         self,
         prim_path,
@@ -54,6 +64,13 @@ class EntityPrim(XFormPrim):
         self._links = None
         self._joints = None
         self._visual_only = None
+        self._joint_dof_idxs = None             # Maps joint name to the indices of its DOFs in the articulation
+
+        # Per-step snapshot of this articulation's physical state, the physics state key it was taken at, and the
+        # (possibly externally owned) array backing it
+        self._articulation_state = None
+        self._articulation_state_key = None
+        self._articulation_state_buffer = None
 
         # This needs to be initialized to be used for _load() of PrimitiveObject
         self._prim_type = load_config["prim_type"] if "prim_type" in load_config else PrimType.RIGID
@@ -172,6 +189,7 @@ class EntityPrim(XFormPrim):
 
         # Initialize joints dictionary
         self._joints = dict()
+        self._joint_dof_idxs = dict()
         self.update_handles()
 
         # Handle case separately based on whether the handle is valid (i.e.: whether we are actually articulated or not)
@@ -205,6 +223,15 @@ class EntityPrim(XFormPrim):
                         )
                         joint.initialize()
                         self._joints[joint_name] = joint
+
+                # Map each joint's DOFs to their indices in the articulation's DOF arrays, if all of them are known
+                dof_handle_to_idx = {info.handle: info.index for info in self._dofs_infos.values()}
+                for joint_name, joint in self._joints.items():
+                    if not all(dof_handle in dof_handle_to_idx for dof_handle in joint._dof_handles):
+                        self._joint_dof_idxs = None
+                        break
+                    self._joint_dof_idxs[joint_name] = np.array(
+                        [dof_handle_to_idx[dof_handle] for dof_handle in joint._dof_handles], dtype=int)
         else:
             # TODO: May need to extend to clusters of rigid bodies, that aren't exactly joined
             # We assume this object contains a single rigid body
@@ -220,6 +247,11 @@ class EntityPrim(XFormPrim):
         # Store values internally
         self._n_dof = n_dof
 
+        # The articulation state layout may have changed, so we drop any pre-existing snapshot
+        self._articulation_state = None
+        self._articulation_state_key = None
+        self._articulation_state_buffer = None
+
     @property
     def prim_type(self):
         """
@@ -442,6 +474,9 @@ class EntityPrim(XFormPrim):
         if normalized:
             positions = self._denormalize_positions(positions=positions, indices=indices)
 
+        # Any shared articulation state snapshot is about to be stale
+        mark_physics_state_dirty(prim_path=self.prim_path)
+
         # Grab current DOF states
         dof_states = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_POS)
 
@@ -486,6 +521,9 @@ class EntityPrim(XFormPrim):
         if normalized:
             velocities = self._denormalize_velocities(velocities=velocities, indices=indices)
 
+        # Any shared articulation state snapshot is about to be stale
+        mark_physics_state_dirty()
+
         # Grab current DOF states
         dof_states = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_VEL)
 
@@ -526,6 +564,9 @@ class EntityPrim(XFormPrim):
         if normalized:
             efforts = self._denormalize_efforts(efforts=efforts, indices=indices)
 
+        # Any shared articulation state snapshot is about to be stale
+        mark_physics_state_dirty()
+
         # Grab current DOF states
         dof_states = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_EFFORT)
 
@@ -666,6 +707,24 @@ class EntityPrim(XFormPrim):
                 joint.initialize()
             joint.update_handles()
 
+        # Any pre-existing snapshot was taken with the old handles
+        self.invalidate_articulation_state()
+
+    @property
+    def _articulation_state_accessible(self):
+        """
+        Returns:
+            bool: Whether this entity's root link and DOF states can be read directly from the physics backend, in which
+                case they can be bundled into a single shared articulation state snapshot
+        """
+        return m.CACHE_ARTICULATION_STATES and self._prim_type != PrimType.CLOTH and \
+            self._root_handle is not None and self._root_handle != _dynamic_control.INVALID_HANDLE and \
+            self._dc is not None and self._dc.is_simulating()
+
+    @property
+    def _dof_states_accessible(self):
+        return self._n_dof > 0 and self._handle is not None and self._handle != _dynamic_control.INVALID_HANDLE
+
     def get_joint_positions(self, normalized=False):
         """
         Grabs this entity's joint positions
@@ -680,7 +739,10 @@ class EntityPrim(XFormPrim):
         assert self._handle is not None, "handles are not initialized yet!"
         assert self.n_joints > 0, "Tried to call method not intended for entity prim with no joints!"
 
-        joint_positions = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_POS)["pos"]
+        if self._articulation_state_accessible:
+            joint_positions = self.get_articulation_state().joint_positions.copy()
+        else:
+            joint_positions = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_POS)["pos"]
 
         # Possibly normalize values when returning
         return self._normalize_positions(positions=joint_positions) if normalized else joint_positions
@@ -699,7 +761,10 @@ class EntityPrim(XFormPrim):
         assert self._handle is not None, "handles are not initialized yet!"
         assert self.n_joints > 0, "Tried to call method not intended for entity prim with no joints!"
 
-        joint_velocities = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_VEL)["vel"]
+        if self._articulation_state_accessible:
+            joint_velocities = self.get_articulation_state().joint_velocities.copy()
+        else:
+            joint_velocities = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_VEL)["vel"]
 
         # Possibly normalize values when returning
         return self._normalize_velocities(velocities=joint_velocities) if normalized else joint_velocities
@@ -718,7 +783,10 @@ class EntityPrim(XFormPrim):
         assert self._handle is not None, "handles are not initialized yet!"
         assert self.n_joints > 0, "Tried to call method not intended for entity prim with no joints!"
 
-        joint_efforts = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_EFFORT)["effort"]
+        if self._articulation_state_accessible:
+            joint_efforts = self.get_articulation_state().joint_efforts.copy()
+        else:
+            joint_efforts = self._dc.get_articulation_dof_states(self._handle, _dynamic_control.STATE_EFFORT)["effort"]
 
         # Possibly normalize values when returning
         return self._normalize_efforts(efforts=joint_efforts) if normalized else joint_efforts
@@ -739,6 +807,8 @@ class EntityPrim(XFormPrim):
         Returns:
             velocity (np.ndarray): linear velocity to set the rigid prim to, in the world frame. Shape (3,).
         """
+        if self._articulation_state_accessible:
+            return self.get_articulation_state().root_linear_velocity.copy()
         return self.root_link.get_linear_velocity()
 
     def set_angular_velocity(self, velocity):
@@ -756,9 +826,12 @@ class EntityPrim(XFormPrim):
         Returns:
             velocity (np.ndarray): angular velocity to set the rigid prim to, in the world frame. Shape (3,).
         """
+        if self._articulation_state_accessible:
+            return self.get_articulation_state().root_angular_velocity.copy()
         return self.root_link.get_angular_velocity()
 
     def set_position_orientation(self, position=None, orientation=None):
+        mark_physics_state_dirty(prim_path=self.prim_path)
         current_position, current_orientation = self.get_position_orientation()
         if position is None:
             position = current_position
@@ -789,6 +862,9 @@ class EntityPrim(XFormPrim):
         else:
             if self._root_handle is not None and self._root_handle != _dynamic_control.INVALID_HANDLE and \
                     self._dc is not None and self._dc.is_simulating():
+                if m.CACHE_ARTICULATION_STATES:
+                    articulation_state = self.get_articulation_state()
+                    return articulation_state.root_position.copy(), articulation_state.root_orientation.copy()
                 pose = self._dc.get_rigid_body_pose(self._root_handle)
                 return np.asarray(pose.p), np.asarray(pose.r)
             else:
@@ -1201,6 +1277,9 @@ class EntityPrim(XFormPrim):
 
     def _dump_state(self):
         # We don't call super, instead, this state is simply the root link state and all joint states
+        if self._articulation_state_accessible and self._joint_dof_idxs is not None and \
+                isinstance(self.root_link, RigidPrim) and not self.root_link.kinematic_only:
+            return self._dump_state_from_articulation_state()
         state = dict(root_link=self.root_link._dump_state())
         joint_state = dict()
         for prim_name, prim in self._joints.items():
@@ -1209,6 +1288,41 @@ class EntityPrim(XFormPrim):
 
         return state
 
+    def _dump_state_from_articulation_state(self):
+        """
+        Dumps this entity's state from its shared articulation state snapshot, fetching all DOF targets at once instead
+        of querying every link and DOF separately. Produces the same state as the per-prim dump in _dump_state()
+
+        Returns:
+            dict: Keyword-mapped state of this entity
+        """
+        articulation_state = self.get_articulation_state()
+        state = dict(root_link=dict(
+            pos=articulation_state.root_position.copy(),
+            ori=articulation_state.root_orientation.copy(),
+            lin_vel=articulation_state.root_linear_velocity.copy(),
+            ang_vel=articulation_state.root_angular_velocity.copy(),
+        ))
+        if self._n_dof > 0:
+            target_pos = np.array(self._dc.get_articulation_dof_position_targets(self._handle), dtype=float)
+            target_vel = np.array(self._dc.get_articulation_dof_velocity_targets(self._handle), dtype=float)
+        joint_state = dict()
+        for joint_name, joint in self._joints.items():
+            if not joint.articulated:
+                joint_state[joint_name] = joint._dump_state()
+                continue
+            idxs = self._joint_dof_idxs[joint_name]
+            joint_state[joint_name] = dict(
+                pos=articulation_state.joint_positions[idxs],
+                vel=articulation_state.joint_velocities[idxs],
+                effort=articulation_state.joint_efforts[idxs],
+                target_pos=target_pos[idxs],
+                target_vel=target_vel[idxs],
+            )
+        state["joints"] = joint_state
+
+        return state
+
     def _load_state(self, state):
         # Load base link state and joint states
         self.root_link._load_state(state=state["root_link"])
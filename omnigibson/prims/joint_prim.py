@@ -18,6 +18,7 @@ from omnigibson.prims.prim_base import BasePrim
 from omnigibson.utils.usd_utils import create_joint
 from omnigibson.utils.constants import JointType
 from omnigibson.utils.python_utils import assert_valid_key
+from omnigibson.utils.sim_utils import mark_physics_state_dirty
 import omnigibson.utils.transform_utils as T
 from omnigibson.controllers.controller_base import ControlType
 
@@ -735,6 +736,7 @@ class JointPrim(BasePrim):
             pos = self._denormalize_pos(pos)
 
         # Set the DOF(s) in this joint
+        mark_physics_state_dirty(prim_path=self.prim_path)
         for dof_handle, p in zip(self._dof_handles, pos):
             if not target:
                 self._dc.set_dof_position(dof_handle, p)
@@ -767,6 +769,7 @@ class JointPrim(BasePrim):
             vel = self._denormalize_vel(vel)
 
         # Set the DOF(s) in this joint
+        mark_physics_state_dirty()
         for dof_handle, v in zip(self._dof_handles, vel):
             if not target:
                 self._dc.set_dof_velocity(dof_handle, v)
@@ -795,6 +798,7 @@ class JointPrim(BasePrim):
             effort = self._denormalize_effort(effort)
 
         # Set the DOF(s) in this joint
+        mark_physics_state_dirty()
         for dof_handle, e in zip(self._dof_handles, effort):
             self._dc.set_dof_effort(dof_handle, e)
 
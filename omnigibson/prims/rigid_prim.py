@@ -9,7 +9,8 @@ from omnigibson.macros import gm, create_module_macros
 from omnigibson.prims.xform_prim import XFormPrim
 from omnigibson.prims.geom_prim import CollisionGeomPrim, VisualGeomPrim
 from omnigibson.utils.constants import GEOM_TYPES
-from omnigibson.utils.sim_utils import CsRawData
+from omnigibson.utils.sim_utils import CsRawData, mark_physics_state_dirty
+from omnigibson.utils.link_resolver_utils import decode_contact_body_name
 from omnigibson.utils.usd_utils import mesh_prim_to_trimesh_mesh
 
 # Import omni sensor based on type
@@ -223,10 +224,11 @@ class RigidPrim(XFormPrim):
                 # contact sensor handles and dynamic articulation handles are not comparable
                 # every prim has a cs to convert (cs) handle to prim path (decode_body_name)
                 # but not every prim (e.g. groundPlane) has a dc to convert prim path to (dc) handle (get_rigid_body)
-                # so simpler to convert both handles (int) to prim paths (str) for comparison
+                # so simpler to convert both handles (int) to prim paths (str) for comparison. Decoded names are
+                # memoized, so each body is only decoded once
                 c = [*c] # CsRawData enforces body0 and body1 types to be ints, but we want strings
-                c[2] = self._cs.decode_body_name(c[2])
-                c[3] = self._cs.decode_body_name(c[3])
+                c[2] = decode_contact_body_name(self._cs, c[2])
+                c[3] = decode_contact_body_name(self._cs, c[3])
                 contacts.append(CsRawData(*c))
         return contacts
 
@@ -237,6 +239,7 @@ class RigidPrim(XFormPrim):
         Args:
             velocity (np.ndarray): linear velocity to set the rigid prim to. Shape (3,).
         """
+        mark_physics_state_dirty()
         if self.dc_is_accessible:
             self._dc.set_rigid_body_linear_velocity(self._handle, velocity)
         else:
@@ -261,6 +264,7 @@ class RigidPrim(XFormPrim):
         Args:
             velocity (np.ndarray): angular velocity to set the rigid prim to. Shape (3,).
         """
+        mark_physics_state_dirty()
         if self.dc_is_accessible:
             self._dc.set_rigid_body_angular_velocity(self._handle, velocity)
         else:
@@ -278,6 +282,7 @@ class RigidPrim(XFormPrim):
             return np.array(self._rigid_api.GetAngularVelocityAttr().Get())
 
     def set_position_orientation(self, position=None, orientation=None):
+        mark_physics_state_dirty(prim_path=self.prim_path)
         if self.dc_is_accessible:
             current_position, current_orientation = self.get_position_orientation()
             if position is None:
@@ -301,6 +306,7 @@ class RigidPrim(XFormPrim):
         return np.array(pos), np.array(ori)
 
     def set_local_pose(self, translation=None, orientation=None):
+        mark_physics_state_dirty(prim_path=self.prim_path)
         if self.dc_is_accessible:
             current_translation, current_orientation = self.get_local_pose()
             translation = current_translation if translation is None else translation
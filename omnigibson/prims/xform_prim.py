@@ -13,6 +13,7 @@ from omnigibson.prims.prim_base import BasePrim
 from omnigibson.prims.material_prim import MaterialPrim
 from omnigibson.utils.transform_utils import quat2mat, mat2euler
 from omnigibson.utils.usd_utils import BoundingBoxAPI
+from omnigibson.utils.sim_utils import mark_physics_state_dirty
 from scipy.spatial.transform import Rotation as R
 
 
@@ -153,6 +154,7 @@ class XFormPrim(BasePrim):
             orientation (None or 4-array): if specified, (x,y,z,w) quaternion orientation in the world frame.
                 Default is None, which means left unchanged.
         """
+        mark_physics_state_dirty(prim_path=self.prim_path)
         current_position, current_orientation = self.get_position_orientation()
         position = current_position if position is None else np.array(position, dtype=float)
         orientation = current_orientation if orientation is None else np.array(orientation, dtype=float)
@@ -263,6 +265,7 @@ class XFormPrim(BasePrim):
             orientation (None or 4-array): if specified, (x,y,z,w) quaternion orientation in the local frame of the prim
                 (with respect to its parent prim). Default is None, which means left unchanged.
         """
+        mark_physics_state_dirty(prim_path=self.prim_path)
         properties = self.prim.GetPropertyNames()
         if translation is not None:
             translation = Gf.Vec3d(*np.array(translation, dtype=float))
@@ -316,6 +319,7 @@ class XFormPrim(BasePrim):
             scale (float or np.ndarray): scale to be applied to the prim's dimensions. shape is (3, ).
                                           Defaults to None, which means left unchanged.
         """
+        mark_physics_state_dirty(prim_path=self.prim_path)
         scale = np.array(scale, dtype=float) if isinstance(scale, Iterable) else np.ones(3) * scale
         scale = Gf.Vec3d(*scale)
         properties = self.prim.GetPropertyNames()
@@ -387,6 +391,17 @@ class XFormPrim(BasePrim):
         self._collision_filter_api.GetFilteredPairsRel().AddTarget(prim.prim_path)
         prim._collision_filter_api.GetFilteredPairsRel().AddTarget(self._prim_path)
 
+    def has_filtered_collision_pair(self, prim):
+        """
+        Args:
+            prim (XFormPrim): Another prim
+
+        Returns:
+            bool: Whether a collision filter pair with @prim exists
+        """
+        targets = self._collision_filter_api.GetFilteredPairsRel().GetTargets()
+        return any(str(target) == prim.prim_path for target in targets)
+
     def remove_filtered_collision_pair(self, prim):
         """
         Removes a collision filter pair with another prim
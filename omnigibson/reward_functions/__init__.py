@@ -1,5 +1,10 @@
 from omnigibson.reward_functions.reward_function_base import BaseRewardFunction, REGISTERED_REWARD_FUNCTIONS
-from omnigibson.reward_functions.collision_reward import CollisionReward
-from omnigibson.reward_functions.point_goal_reward import PointGoalReward
-from omnigibson.reward_functions.potential_reward import PotentialReward
-from omnigibson.reward_functions.reaching_goal_reward import ReachingGoalReward
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+# Reward functions are imported upon first access, or upon first lookup of REGISTERED_REWARD_FUNCTIONS
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".collision_reward": ["CollisionReward"],
+    ".point_goal_reward": ["PointGoalReward"],
+    ".potential_reward": ["PotentialReward"],
+    ".reaching_goal_reward": ["ReachingGoalReward"],
+})
@@ -1,8 +1,9 @@
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
 from omnigibson.utils.python_utils import classproperty, Registerable
+from omnigibson.utils.lazy_import_utils import LazyRegistry
 
-REGISTERED_REWARD_FUNCTIONS = dict()
+REGISTERED_REWARD_FUNCTIONS = LazyRegistry(package_name="omnigibson.reward_functions")
 
 
 class BaseRewardFunction(Registerable, metaclass=ABCMeta):
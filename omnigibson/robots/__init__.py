@@ -1,11 +1,16 @@
-from omnigibson.robots.active_camera_robot import ActiveCameraRobot
-from omnigibson.robots.freight import Freight
-from omnigibson.robots.husky import Husky
-from omnigibson.robots.locobot import Locobot
-from omnigibson.robots.locomotion_robot import LocomotionRobot
-from omnigibson.robots.manipulation_robot import ManipulationRobot
-from omnigibson.robots.robot_base import REGISTERED_ROBOTS, BaseRobot
-from omnigibson.robots.turtlebot import Turtlebot
-from omnigibson.robots.fetch import Fetch
-from omnigibson.robots.tiago import Tiago
-from omnigibson.robots.two_wheel_robot import TwoWheelRobot
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+# Robots are imported upon first access, or upon first lookup of REGISTERED_ROBOTS
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".active_camera_robot": ["ActiveCameraRobot"],
+    ".freight": ["Freight"],
+    ".husky": ["Husky"],
+    ".locobot": ["Locobot"],
+    ".locomotion_robot": ["LocomotionRobot"],
+    ".manipulation_robot": ["ManipulationRobot"],
+    ".robot_base": ["REGISTERED_ROBOTS", "BaseRobot"],
+    ".turtlebot": ["Turtlebot"],
+    ".fetch": ["Fetch"],
+    ".tiago": ["Tiago"],
+    ".two_wheel_robot": ["TwoWheelRobot"],
+})
@@ -7,13 +7,15 @@ from omnigibson.sensors import create_sensor, SENSOR_PRIMS_TO_SENSOR_CLS, ALL_SE
 from omnigibson.objects.usd_object import USDObject
 from omnigibson.objects.controllable_object import ControllableObject
 from omnigibson.utils.gym_utils import GymObservable
+from omnigibson.utils.obs_pipeline_utils import CompositeObservationFrame
 from omnigibson.utils.python_utils import classproperty
+from omnigibson.utils.lazy_import_utils import LazyRegistry
 from omnigibson.utils.vision_utils import segmentation_to_rgb
 from omnigibson.utils.constants import PrimType
 from pxr import PhysxSchema
 
 # Global dicts that will contain mappings
-REGISTERED_ROBOTS = dict()
+REGISTERED_ROBOTS = LazyRegistry(package_name="omnigibson.robots")
 
 # Add proprio sensor modality to ALL_SENSOR_MODALITIES
 ALL_SENSOR_MODALITIES.add("proprio")
@@ -192,6 +194,14 @@ class BaseRobot(USDObject, ControllableObject, GymObservable):
         # Validate this robot configuration
         self._validate_configuration()
 
+    def reset(self):
+        # Run super first
+        super().reset()
+
+        # Reset all sensors
+        for sensor in self._sensors.values():
+            sensor.reset()
+
     def _validate_configuration(self):
         """
         Run any needed sanity checks to make sure this robot was created correctly.
@@ -238,6 +248,24 @@ class BaseRobot(USDObject, ControllableObject, GymObservable):
 
         return obs_dict
 
+    def get_obs_async(self):
+        """
+        Grabs all observations from the robot asynchronously. Sensors supporting asynchronous observations (e.g.:
+        vision sensors) snapshot their raw buffers right away and process them on a worker pool, so that the
+        simulation can be stepped before the returned handle is awaited
+
+        Returns:
+            CompositeObservationFrame: Handle whose result() is the same keyword-mapped dictionary as get_obs()
+        """
+        frames = {sensor_name: sensor.get_obs_async() for sensor_name, sensor in self._sensors.items()}
+
+        # Have to handle proprio separately since it's not an actual sensor
+        obs = dict()
+        if "proprio" in self._obs_modalities:
+            obs["proprio"] = self.get_proprioception()
+
+        return CompositeObservationFrame(frames=frames, obs=obs)
+
     def get_proprioception(self):
         """
         Returns:
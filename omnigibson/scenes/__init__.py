@@ -1,4 +1,9 @@
-from omnigibson.scenes.scene_base import Scene, REGISTERED_SCENES
-from omnigibson.scenes.traversable_scene import TraversableScene
-from omnigibson.scenes.static_traversable_scene import StaticTraversableScene
-from omnigibson.scenes.interactive_traversable_scene import InteractiveTraversableScene
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+# Scenes are imported upon first access, or upon first lookup of REGISTERED_SCENES
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".scene_base": ["Scene", "REGISTERED_SCENES"],
+    ".traversable_scene": ["TraversableScene"],
+    ".static_traversable_scene": ["StaticTraversableScene"],
+    ".interactive_traversable_scene": ["InteractiveTraversableScene"],
+})
@@ -1,20 +1,35 @@
 import json
+import time
 from abc import ABC
-from itertools import combinations
+from functools import partial
 from omni.isaac.core.objects.ground_plane import GroundPlane
 import numpy as np
 import omnigibson as og
 from omnigibson.prims.xform_prim import XFormPrim
+from omnigibson.utils.physics_state_utils import ArticulationStateBuffer
 from omnigibson.utils.python_utils import classproperty, Serializable, Registerable, Recreatable, \
     create_object_from_init_info
 from omnigibson.utils.registry_utils import SerializableRegistry
+from omnigibson.utils.lazy_import_utils import LazyRegistry
+from omnigibson.utils.spatial_utils import SpatialIndex, m as spatial_macros
+from omnigibson.utils.sim_utils import get_physics_state_key, pop_moved_prim_paths
+from omnigibson.utils.snapshot_utils import is_awake
+from omnigibson.utils.link_resolver_utils import RigidLinkResolver
+from omnigibson.utils.raycast_utils import MeshRaycastBackend
+from omnigibson.utils.usd_utils import CollisionAPI
+from omnigibson.utils.collision_group_utils import update_fixed_base_collision_group
+from omnigibson.utils.scene_loading_utils import SceneLoadingPipeline, prepare_object, m as scene_loading_macros
+from omnigibson.utils.asset_cache_utils import m as asset_cache_macros
+from omnigibson.macros import gm
+import omnigibson.utils.batch_transform_utils as BT
 from omnigibson.objects.object_base import BaseObject
 from omnigibson.objects.stateful_object import StatefulObject
+from omnigibson.objects.dataset_object import DatasetObject
 from omnigibson.systems import SYSTEMS_REGISTRY
 from omnigibson.robots.robot_base import m as robot_macros
 
 # Global dicts that will contain mappings
-REGISTERED_SCENES = dict()
+REGISTERED_SCENES = LazyRegistry(package_name="omnigibson.scenes")
 
 
 class Scene(Serializable, Registerable, Recreatable, ABC):
@@ -43,9 +58,18 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         self._loaded = False                    # Whether this scene exists in the stage or not
         self._initialized = False               # Whether this scene has its internal handles / info initialized or not (occurs AFTER and INDEPENDENTLY from loading!)
         self._registry = None
+        self._spatial_index = None
+        self._link_local_aabbs = None           # Maps link prim path to its AABB corners in the link frame
+        self._indexed_objs = None               # Objects whose links are in the spatial index
+        self._awake_objs = None                 # Objects that were awake at the last spatial index refresh
+        self._spatial_index_key = None          # Physics state key at the last spatial index refresh
+        self._link_resolver = None
+        self._raycast_backend = None
+        self._articulation_state_buffer = None  # Scene-wide buffer of articulation state snapshots
         self._world_prim = None
         self._initial_state = None
         self._objects_info = None                       # Information associated with this scene
+        self._loading_results = None                    # Loaded / failed objects and timings of the scene file load
         self._use_floor_plane = use_floor_plane
         self._floor_plane_visible = floor_plane_visible
         self._floor_plane_color = floor_plane_color
@@ -62,6 +86,44 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         """
         return self._registry
 
+    @property
+    def spatial_index(self):
+        """
+        Returns:
+            SpatialIndex: Spatial index over all initialized objects' links, keyed by link prim path and owned by
+                the corresponding object. Only populated if spatial_utils.m.USE_SCENE_INDEX is set, in which case it
+                is refreshed every simulator step via update_spatial_index()
+        """
+        return self._spatial_index
+
+    @property
+    def spatial_index_is_up_to_date(self):
+        """
+        Returns:
+            bool: Whether the spatial index is in use and reflects the current physical state, i.e.: it was refreshed
+                after physics was last stepped, and no prim was explicitly moved since
+        """
+        return spatial_macros.USE_SCENE_INDEX and self._spatial_index_key == get_physics_state_key()
+
+    @property
+    def link_resolver(self):
+        """
+        Returns:
+            RigidLinkResolver: Resolver mapping PhysX body identifiers of all registered objects' links to their
+                corresponding (object, link) tuples
+        """
+        return self._link_resolver
+
+    @property
+    def raycast_backend(self):
+        """
+        Returns:
+            MeshRaycastBackend: Raycast backend over the collision meshes of all initialized objects' links. Only
+                populated if raycast_utils.m.USE_MESH_BACKEND is set, in which case it is refreshed every simulator
+                step via update_raycast_backend()
+        """
+        return self._raycast_backend
+
     @property
     def object_registry(self):
         """
@@ -85,7 +147,7 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         Get the objects in the scene.
 
         Returns:
-            list of BaseObject: Standalone object(s) that are currently in this scene
+            tuple of BaseObject: Standalone object(s) that are currently in this scene
         """
         return self.object_registry.objects
 
@@ -105,7 +167,7 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         Systems in the scene
 
         Returns:
-            list of BaseSystem: System(s) that are available to use in this scene
+            tuple of BaseSystem: System(s) that are available to use in this scene
         """
         return self.system_registry.objects
 
@@ -135,6 +197,15 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
     def initialized(self):
         return self._initialized
 
+    @property
+    def loading_results(self):
+        """
+        Returns:
+            None or dict: Results of loading the objects of this scene's scene file, if any, with the names of the
+                loaded and failed objects and the time spent in each loading phase. See SceneLoadingPipeline.run()
+        """
+        return self._loading_results
+
     def _load(self, simulator):
         """
         Load the scene into simulator
@@ -153,33 +224,53 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         (information stored in the world prim's CustomData)
         """
         # Grab objects info from the scene file
+        start = time.perf_counter()
         with open(self.scene_file, "r") as f:
             scene_info = json.load(f)
         init_info = scene_info["objects_info"]["init_info"]
         init_state = scene_info["state"]["object_registry"]
+        parse_time = time.perf_counter() - start
 
-        # Iterate over all scene info, and instantiate object classes linked to the objects found on the stage
-        # accordingly
-        for obj_name, obj_info in init_info.items():
-            # Check whether we should load the object or not
-            if not self._should_load_object(obj_info=obj_info):
-                continue
+        # Check whether we should load each object or not
+        objects_info = [(obj_name, obj_info) for obj_name, obj_info in init_info.items()
+                        if self._should_load_object(obj_info=obj_info)]
+
+        def import_object(obj_name, prepared):
             # Create object class instance
-            obj = create_object_from_init_info(obj_info)
+            obj = create_object_from_init_info(prepared["init_info"])
+            if isinstance(obj, DatasetObject):
+                obj.set_preloaded_height_maps(prepared["height_maps"])
             # Import into the simulator
             simulator.import_object(obj)
-            # Set the init pose accordingly
-            obj.set_position_orientation(
-                position=init_state[obj_name]["root_link"]["pos"],
-                orientation=init_state[obj_name]["root_link"]["ori"],
-            )
+            try:
+                # Set the init pose accordingly
+                obj.set_position_orientation(
+                    position=init_state[obj_name]["root_link"]["pos"],
+                    orientation=init_state[obj_name]["root_link"]["ori"],
+                )
+            except Exception:
+                # Don't leave a partially imported object in the scene
+                simulator.remove_object(obj)
+                raise
+
+        # Prepare objects (asset resolution, decryption, height maps) on workers, and import them in order on this
+        # thread, which is the only one allowed to modify the stage
+        prepare_fn = partial(
+            prepare_object,
+            dataset_path=og.og_dataset_path,
+            key_path=og.key_path,
+            use_asset_cache=gm.USE_ENCRYPTED_ASSETS and asset_cache_macros.ENABLED,
+        )
+        pipeline = SceneLoadingPipeline(
+            prepare_fn=prepare_fn,
+            n_workers=None if scene_loading_macros.ENABLED else 0,
+        )
+        self._loading_results = pipeline.run(objects_info=objects_info, import_fn=import_object)
+        self._loading_results["timings"]["parse"] = parse_time
 
         # disable collision between the fixed links of the fixed objects
-        fixed_objs = self.object_registry("fixed_base", True, default_val=[])
-        if len(fixed_objs) > 1:
-            # We iterate over all pairwise combinations of fixed objects
-            for obj_a, obj_b in combinations(fixed_objs, 2):
-                obj_a.root_link.add_filtered_collision_pair(obj_b.root_link)
+        for obj in self.object_registry("fixed_base", True, default_val=[]):
+            self.update_fixed_base_collision_group(obj)
 
     def _should_load_object(self, obj_info):
         """
@@ -214,6 +305,18 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         # Create the registry for tracking all objects in the scene
         self._registry = self._create_registry()
 
+        # Create the spatial index for tracking where all objects' links are in the scene
+        self._spatial_index = SpatialIndex()
+        self._link_local_aabbs = dict()
+        self._indexed_objs = set()
+        self._awake_objs = set()
+
+        # Create the resolver for mapping PhysX body identifiers back to objects' links
+        self._link_resolver = RigidLinkResolver()
+
+        # Create the CPU raycast backend over all objects' collision meshes
+        self._raycast_backend = MeshRaycastBackend()
+
         # Store world prim and load the scene into the simulator
         self._world_prim = simulator.world_prim
         self._load(simulator)
@@ -251,6 +354,13 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         # Must clear all systems
         self.clear_systems()
 
+        # Clear the link resolver, since none of the objects' links will be valid anymore
+        if self._link_resolver is not None:
+            self._link_resolver.clear()
+        if self._raycast_backend is not None:
+            self._raycast_backend.clear()
+        self._articulation_state_buffer = None
+
     def _initialize(self):
         """
         Initializes state of this scene and sets up any references necessary post-loading. Should be implemented by
@@ -351,6 +461,158 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
             states = next_states
         return objs
 
+    def update_spatial_index(self):
+        """
+        Refreshes the spatial index from the current link poses. Only the links of objects that may have moved since
+        the last refresh are refreshed, i.e.: objects that are not indexed yet, objects that are awake or were awake at
+        the last refresh (they may have come to rest in between), and objects with an explicitly moved prim (see
+        sim_utils.mark_physics_state_dirty()). Each link's AABB is computed once (when the link is first seen) and
+        cached in the link frame, and subsequently only transformed by the link's current pose, so that the indexed
+        AABBs are conservative bounds of the true ones.
+        """
+        # Map the explicitly moved prims (objects, or links and joints nested under an object's prim) to their objects
+        moved_objs = set()
+        for prim_path in pop_moved_prim_paths():
+            while prim_path != "":
+                obj = self.object_registry("prim_path", prim_path)
+                if obj is not None:
+                    moved_objs.add(obj)
+                    break
+                prim_path = prim_path.rpartition("/")[0]
+
+        awake_objs = set()
+        link_paths, positions, orientations, new_links = [], [], [], []
+        for obj in self.objects:
+            if not obj.initialized:
+                continue
+            if is_awake(obj):
+                awake_objs.add(obj)
+            elif obj in self._indexed_objs and obj not in self._awake_objs and obj not in moved_objs:
+                continue
+            self._indexed_objs.add(obj)
+            for link in obj.links.values():
+                link_paths.append(link.prim_path)
+                pos, quat = link.get_position_orientation()
+                positions.append(pos)
+                orientations.append(quat)
+                if link.prim_path not in self._link_local_aabbs:
+                    new_links.append((obj, link, len(link_paths) - 1))
+
+        self._awake_objs = awake_objs
+        self._spatial_index_key = get_physics_state_key()
+        if len(link_paths) == 0:
+            return
+        positions, orientations = np.array(positions), np.array(orientations)
+
+        # Cache the local AABB corners of any links we haven't seen before
+        for obj, link, idx in new_links:
+            lower, upper = link.aabb
+            corners = np.array(np.meshgrid(*zip(lower, upper), indexing="ij")).reshape(3, 8).T
+            inv_pos, inv_quat = BT.pose_inv(positions[idx], orientations[idx])
+            self._link_local_aabbs[link.prim_path] = BT.quat_apply(inv_quat, corners) + inv_pos
+
+        # Transform all local AABB corners to the world frame at once and re-bound them
+        local_corners = np.array([self._link_local_aabbs[link_path] for link_path in link_paths])
+        world_corners = BT.quat_apply(orientations[:, None, :], local_corners) + positions[:, None, :]
+        lowers, uppers = world_corners.min(axis=1), world_corners.max(axis=1)
+
+        for obj, link, idx in new_links:
+            self._spatial_index.add(key=link.prim_path, lower=lowers[idx], upper=uppers[idx], owner=obj)
+        self._spatial_index.update(keys=link_paths, lowers=lowers, uppers=uppers)
+
+    def update_raycast_backend(self):
+        """
+        Adds the collision meshes of all newly initialized objects' links to the raycast backend. The poses of links
+        that were already added are refit lazily by the backend itself, whenever rays are cast after the physical
+        state of the simulation has changed
+        """
+        for obj in self.objects:
+            if not obj.initialized:
+                continue
+            for link in obj.links.values():
+                if not self._raycast_backend.has_rigid_body(link.prim_path):
+                    self._raycast_backend.add_rigid_prim(link)
+
+    def update_articulation_states(self):
+        """
+        Refreshes the articulation state snapshots of all initialized objects, which are stored in a single
+        preallocated scene-wide array (one contiguous slice per object, see ArticulationState for the layout of each
+        slice). The array is only reallocated when the set of initialized objects changes.
+
+        Returns:
+            2-tuple:
+                - n-array: Read-only view of the flat array holding all objects' articulation state snapshots
+                - ArticulationStateBuffer: Buffer owning the array, which maps each object to its slice
+        """
+        objs = [obj for obj in self.objects if obj.initialized]
+        if self._articulation_state_buffer is None or not self._articulation_state_buffer.is_valid(prims=objs):
+            self._articulation_state_buffer = ArticulationStateBuffer(prims=objs)
+        return self._articulation_state_buffer.update(), self._articulation_state_buffer
+
+    def get_objects_in_aabb(self, lower, upper):
+        """
+        Get the objects with at least one link whose AABB overlaps the query AABB, using the spatial index
+
+        Args:
+            lower (3-array): (x,y,z) lower corner of the query AABB
+            upper (3-array): (x,y,z) upper corner of the query AABB
+
+        Returns:
+            list of BaseObject: Objects overlapping the query AABB
+        """
+        return self._spatial_index.get_owners(self._spatial_index.query_aabb(lower, upper)[0])
+
+    def get_indexed_aabb(self, obj):
+        """
+        Get the union of the AABBs of all of @obj's links in the spatial index, which bounds @obj's true AABB
+
+        Args:
+            obj (BaseObject): Object to look up
+
+        Returns:
+            None or 2-tuple: (lower, upper) corners of the bounding AABB, or None if not all of @obj's links are in
+                the spatial index
+        """
+        if obj not in self._indexed_objs:
+            return None
+        aabbs = np.array([self._spatial_index.get_aabb(link_path) for link_path in obj.link_prim_paths])
+        return aabbs[:, 0].min(axis=0), aabbs[:, 1].max(axis=0)
+
+    def get_objects_within_radius(self, position, radius):
+        """
+        Get the objects with at least one link whose AABB is within @radius of @position, using the spatial index
+
+        Args:
+            position (3-array): (x,y,z) query position
+            radius (float): Query radius
+
+        Returns:
+            list of BaseObject: Objects within range of @position
+        """
+        return self._spatial_index.get_owners(self._spatial_index.query_radius(position, radius)[0])
+
+    def get_nearest_objects(self, position, k):
+        """
+        Get the (up to) @k objects whose links' AABBs are closest to @position, using the spatial index
+
+        Args:
+            position (3-array): (x,y,z) query position
+            k (int): Number of objects to find
+
+        Returns:
+            list of BaseObject: Nearest objects, sorted by distance
+        """
+        # Query k links and deduplicate down to objects, doubling the no. of links until k objects are found or all
+        # links were queried
+        n_total = len(self._spatial_index)
+        n_links = min(k, n_total)
+        while True:
+            keys = self._spatial_index.query_knn(position, n_links)[0][0]
+            objs = self._spatial_index.get_owners(keys)
+            if len(objs) >= k or n_links >= n_total:
+                return objs[:k]
+            n_links = min(2 * n_links, n_total)
+
     def _add_object(self, obj):
         """
         Add an object to the scene's internal object tracking mechanisms.
@@ -391,6 +653,7 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         # Add this object to our registry based on its type, if we want to register it
         if register:
             self.object_registry.add(obj)
+            self._link_resolver.add_object(obj)
 
             # Run any additional scene-specific logic with the created object
             self._add_object(obj)
@@ -408,9 +671,59 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         # Remove from the appropriate registry
         self.object_registry.remove(obj)
 
+        # Remove from the collision group of fixed objects
+        update_fixed_base_collision_group(
+            registry=CollisionAPI.get_collision_group_registry(),
+            root_link_path=obj.root_link.prim_path,
+            fixed_base=False,
+        )
+
+        # Remove from the link resolver, the spatial index and the raycast backend
+        self._link_resolver.remove_object(obj)
+        self._spatial_index.remove_owner(obj)
+        self._indexed_objs.discard(obj)
+        self._awake_objs.discard(obj)
+        self._raycast_backend.remove_rigid_bodies(obj.link_prim_paths)
+        for link_path in obj.link_prim_paths:
+            self._link_local_aabbs.pop(link_path, None)
+
         # Remove from omni stage
         obj.remove(simulator=simulator)
 
+    def update_fixed_base_collision_group(self, obj):
+        """
+        Adds @obj's root link to the shared collision group of the root links of fixed objects, which do not collide
+        with each other, if it has a fixed base. This replaces filtering collisions between every pair of fixed
+        objects, which takes a quadratic no. of relationships. Called for the fixed objects loaded from the scene file
+        only, so objects imported afterwards (e.g.: robots) still collide with them unless this is called for them
+
+        Args:
+            obj (BaseObject): Object in this scene
+        """
+        update_fixed_base_collision_group(
+            registry=CollisionAPI.get_collision_group_registry(),
+            root_link_path=obj.root_link.prim_path,
+            fixed_base=obj.fixed_base,
+        )
+
+    def is_collision_filtered(self, obj_a, obj_b, link_a_name=None, link_b_name=None):
+        """
+        Checks whether collisions between links of two objects are filtered, either by collision groups or by
+        filtered pairs
+
+        Args:
+            obj_a (BaseObject): First object
+            obj_b (BaseObject): Second object
+            link_a_name (None or str): Name of the link of @obj_a to check. Default is its root link
+            link_b_name (None or str): Name of the link of @obj_b to check. Default is its root link
+
+        Returns:
+            bool: Whether collisions between the two links are filtered
+        """
+        link_a = obj_a.root_link if link_a_name is None else obj_a.links[link_a_name]
+        link_b = obj_b.root_link if link_b_name is None else obj_b.links[link_b_name]
+        return CollisionAPI.is_collision_filtered(link_a, link_b)
+
     def reset(self):
         """
         Resets this scene
@@ -496,6 +809,20 @@ class Scene(Serializable, Registerable, Recreatable, ABC):
         """
         raise NotImplementedError()
 
+    def get_geodesic_distance(self, floor, source_world, target_world):
+        """
+        Get the geodesic distance from one point to another point, without computing the path itself.
+
+        Args:
+            floor (int): floor number
+            source_world (2-array): (x,y) 2D source location in world reference frame (metric)
+            target_world (2-array): (x,y) 2D target location in world reference frame (metric)
+
+        Returns:
+            float: geodesic distance between @source_world and @target_world
+        """
+        raise NotImplementedError()
+
     def get_floor_height(self, floor=0):
         """
         Get the height of the given floor. Default is 0.0, since we only have a single floor
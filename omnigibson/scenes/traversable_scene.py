@@ -85,3 +85,12 @@ class TraversableScene(Scene):
             target_world=target_world,
             entire_path=entire_path,
         )
+
+    def get_geodesic_distance(self, floor, source_world, target_world):
+        assert self._trav_map.build_graph, "cannot get geodesic distance without building the graph"
+
+        return self._trav_map.get_geodesic_distance(
+            floor=floor,
+            source_world=source_world,
+            target_world=target_world,
+        )
@@ -1,15 +1,13 @@
-import cv2
 import numpy as np
-from collections import Iterable
-
-from transforms3d.quaternions import quat2mat
+from collections import Iterable, deque
 
 from omni.kit.commands import execute
 from omni.isaac.range_sensor import _range_sensor
 
 from omnigibson.sensors.sensor_base import BaseSensor
-from omnigibson.utils.constants import OccupancyGridState
+from omnigibson.utils.occupancy_grid_utils import OccupancyGridRasterizer, get_beam_directions
 from omnigibson.utils.python_utils import classproperty
+import omnigibson.utils.transform_utils as T
 
 
 class ScanSensor(BaseSensor):
@@ -47,6 +45,9 @@ class ScanSensor(BaseSensor):
         occupancy_grid_local_link (None or XFormPrim): XForm prim that represents the "origin" of any generated
             occupancy grid, e.g.: if this scan sensor is attached to a robot, then this should possibly be the base link
             for that robot. If None is specified, then this will default to this own sensor's frame as the origin.
+        occupancy_grid_n_scans (int): Number of most recent scans to accumulate into the occupancy grid. Past scans
+            are stored in the world frame and re-projected into the current frame of @occupancy_grid_local_link, so
+            that the grid rolls with it. The current scan always takes precedence over past ones
     """
     def __init__(
         self,
@@ -74,6 +75,7 @@ class ScanSensor(BaseSensor):
         occupancy_grid_range=5.0,
         occupancy_grid_inner_radius=0.5,
         occupancy_grid_local_link=None,
+        occupancy_grid_n_scans=1,
     ):
         # Store settings
         self.occupancy_grid_resolution = occupancy_grid_resolution
@@ -81,9 +83,18 @@ class ScanSensor(BaseSensor):
         self.occupancy_grid_inner_radius = int(occupancy_grid_inner_radius * occupancy_grid_resolution
                                                 / occupancy_grid_range)
         self.occupancy_grid_local_link = self if occupancy_grid_local_link is None else occupancy_grid_local_link
+        self._occupancy_grid_rasterizer = OccupancyGridRasterizer(
+            resolution=occupancy_grid_resolution,
+            grid_range=occupancy_grid_range,
+            inner_radius=self.occupancy_grid_inner_radius,
+        )
+        # Most recent scans, stored as (grid origin, scan hits) in the world frame
+        self._scan_history = deque(maxlen=occupancy_grid_n_scans)
 
         # Create variables that will be filled in at runtime
         self._rs = None                 # Range sensor interface, analagous to others, e.g.: dynamic control interface
+        self._attribute_cache = dict()  # Maps lidar attribute names to their values, refreshed whenever they are set
+        self._beam_directions = None    # Cached unit vector of each beam, refreshed whenever the fov / resolution is set
 
         # Create load config from inputs
         load_config = dict() if load_config is None else load_config
@@ -166,65 +177,75 @@ class ScanSensor(BaseSensor):
         assert "occupancy_grid" in self._modalities, "Occupancy grid is not enabled for this range sensor!"
         assert self.n_vertical_rays == 1, "Occupancy grid is only valid for a 1D range sensor (n_vertical_rays = 1)!"
 
-        # Grab vector of corresponding angles for each scan line
-        angles = np.arange(
-            -np.radians(self.horizontal_fov / 2),
-            np.radians(self.horizontal_fov / 2),
-            np.radians(self.horizontal_resolution),
-        )
-
-        # Convert into 3D unit vectors for each angle
-        unit_vector_laser = np.array([[np.cos(ang), np.sin(ang), 0.0] for ang in angles])
-
-        # Scale unit vectors by corresponding laser scan distnaces
+        # Grab the (cached) unit vector of each scan line, and scale it by the corresponding laser scan distances
+        if self._beam_directions is None:
+            self._beam_directions = get_beam_directions(
+                horizontal_fov=self.horizontal_fov,
+                horizontal_resolution=self.horizontal_resolution,
+            )
         assert ((scan >= 0.0) & (scan <= 1.0)).all(), "scan out of valid range [0, 1]"
-        scan_laser = unit_vector_laser * (scan * (self.max_range - self.min_range) + self.min_range)
+        min_range, max_range = self.min_range, self.max_range
+        scan_laser = self._beam_directions * (scan * (max_range - min_range) + min_range)
 
         # Convert scans from laser frame to world frame
         pos, ori = self.get_position_orientation()
-        scan_world = quat2mat(ori).dot(scan_laser.T).T + pos
+        scan_world = T.quat2mat(ori).dot(scan_laser.T).T + pos
 
-        # Convert scans from world frame to local base frame
+        # Convert scans from world frame to local base frame, where the grid's origin is the base frame's origin
         base_pos, base_ori = self.occupancy_grid_local_link.get_position_orientation()
-        scan_local = quat2mat(base_ori).T.dot((scan_world - base_pos).T).T
-        scan_local = scan_local[:, :2]
-        scan_local = np.concatenate([np.array([[0, 0]]), scan_local, np.array([[0, 0]])], axis=0)
-
-        # flip y axis
-        scan_local[:, 1] *= -1
-
-        # Initialize occupancy grid -- default is unknown values
-        occupancy_grid = np.zeros((self.occupancy_grid_resolution, self.occupancy_grid_resolution)).astype(np.uint8)
-        occupancy_grid.fill(int(OccupancyGridState.UNKNOWN * 2.0))
-
-        # Convert local scans into the corresponding OG square it should belong to (note now all values are > 0, since
-        # OG ranges from [0, resolution] x [0, resolution])
-        scan_local_in_map = scan_local / self.occupancy_grid_range * self.occupancy_grid_resolution + \
-                            (self.occupancy_grid_resolution / 2)
-        scan_local_in_map = scan_local_in_map.reshape((1, -1, 1, 2)).astype(np.int32)
-
-        # For each scan hit,
-        for i in range(scan_local_in_map.shape[1]):
-            cv2.circle(
-                img=occupancy_grid,
-                center=(scan_local_in_map[0, i, 0, 0], scan_local_in_map[0, i, 0, 1]),
-                radius=2,
-                color=int(OccupancyGridState.OBSTACLES * 2.0),
-                thickness=-1,
-            )
-        cv2.fillPoly(
-            img=occupancy_grid, pts=scan_local_in_map, color=int(OccupancyGridState.FREESPACE * 2.0), lineType=1
-        )
-        cv2.circle(
-            img=occupancy_grid,
-            center=(self.occupancy_grid_resolution // 2, self.occupancy_grid_resolution // 2),
-            radius=self.occupancy_grid_inner_radius,
-            color=int(OccupancyGridState.FREESPACE * 2.0),
-            thickness=-1,
-        )
+        self._scan_history.append((np.array(base_pos), scan_world))
+        base_rot_inv = T.quat2mat(base_ori).T
+        scans_local = [
+            (np.zeros(2) if i == len(self._scan_history) - 1 else base_rot_inv.dot(origin_world - base_pos)[:2],
+             base_rot_inv.dot((hits_world - base_pos).T).T[:, :2])
+            for i, (origin_world, hits_world) in enumerate(self._scan_history)
+        ]
+
+        # Rasterize all scans into the occupancy grid
+        occupancy_grid = self._occupancy_grid_rasterizer.rasterize(scans=scans_local)
 
         return occupancy_grid[:, :, None].astype(np.float32) / 2.0
 
+    def clear_occupancy_grid_history(self):
+        """
+        Clears all past scans accumulated into the occupancy grid, e.g.: when the sensor is teleported
+        """
+        self._scan_history.clear()
+
+    def reset(self):
+        # Run super first
+        super().reset()
+
+        # Past scans do not carry over to the next episode
+        self.clear_occupancy_grid_history()
+
+    def _get_cached_attribute(self, attr):
+        """
+        Gets lidar attribute @attr, only reading it from the prim if it has not been read or set before
+
+        Args:
+            attr (str): Name of the attribute to get
+
+        Returns:
+            any: Value of the attribute
+        """
+        if attr not in self._attribute_cache:
+            self._attribute_cache[attr] = self.get_attribute(attr)
+        return self._attribute_cache[attr]
+
+    def _set_cached_attribute(self, attr, val):
+        """
+        Sets lidar attribute @attr and refreshes its cached value
+
+        Args:
+            attr (str): Name of the attribute to set
+            val (any): Value to set
+        """
+        self.set_attribute(attr, val)
+        self._attribute_cache[attr] = self.get_attribute(attr)
+        if attr in {"horizontalFov", "horizontalResolution"}:
+            self._beam_directions = None
+
     def _get_obs(self):
         # Run super first to grab any upstream obs
         obs = super()._get_obs()
@@ -266,7 +287,7 @@ class ScanSensor(BaseSensor):
         Returns:
             float: minimum range for this range sensor, in meters
         """
-        return self.get_attribute("minRange")
+        return self._get_cached_attribute("minRange")
 
     @min_range.setter
     def min_range(self, val):
@@ -276,7 +297,7 @@ class ScanSensor(BaseSensor):
         Args:
             val (float): minimum range for this range sensor, in meters
         """
-        self.set_attribute("minRange", val)
+        self._set_cached_attribute("minRange", val)
 
     @property
     def max_range(self):
@@ -286,7 +307,7 @@ class ScanSensor(BaseSensor):
         Returns:
             float: maximum range for this range sensor, in meters
         """
-        return self.get_attribute("maxRange")
+        return self._get_cached_attribute("maxRange")
 
     @max_range.setter
     def max_range(self, val):
@@ -296,7 +317,7 @@ class ScanSensor(BaseSensor):
         Args:
             val (float): maximum range for this range sensor, in meters
         """
-        self.set_attribute("maxRange", val)
+        self._set_cached_attribute("maxRange", val)
 
     @property
     def draw_lines(self):
@@ -346,7 +367,7 @@ class ScanSensor(BaseSensor):
         Returns:
             float: horizontal field of view for this range sensor
         """
-        return self.get_attribute("horizontalFov")
+        return self._get_cached_attribute("horizontalFov")
 
     @horizontal_fov.setter
     def horizontal_fov(self, fov):
@@ -356,7 +377,7 @@ class ScanSensor(BaseSensor):
         Args:
             fov (float): horizontal field of view to set
         """
-        self.set_attribute("horizontalFov", fov)
+        self._set_cached_attribute("horizontalFov", fov)
 
     @property
     def horizontal_resolution(self):
@@ -366,7 +387,7 @@ class ScanSensor(BaseSensor):
         Returns:
             float: horizontal resolution for this range sensor, in degrees
         """
-        return self.get_attribute("horizontalResolution")
+        return self._get_cached_attribute("horizontalResolution")
 
     @horizontal_resolution.setter
     def horizontal_resolution(self, resolution):
@@ -376,7 +397,7 @@ class ScanSensor(BaseSensor):
         Args:
             resolution (float): horizontal resolution to set, in degrees
         """
-        self.set_attribute("horizontalResolution", resolution)
+        self._set_cached_attribute("horizontalResolution", resolution)
 
     @property
     def vertical_fov(self):
@@ -386,7 +407,7 @@ class ScanSensor(BaseSensor):
         Returns:
             float: vertical field of view for this range sensor
         """
-        return self.get_attribute("verticalFov")
+        return self._get_cached_attribute("verticalFov")
 
     @vertical_fov.setter
     def vertical_fov(self, fov):
@@ -396,7 +417,7 @@ class ScanSensor(BaseSensor):
         Args:
             fov (float): vertical field of view to set
         """
-        self.set_attribute("verticalFov", fov)
+        self._set_cached_attribute("verticalFov", fov)
 
     @property
     def vertical_resolution(self):
@@ -406,7 +427,7 @@ class ScanSensor(BaseSensor):
         Returns:
             float: vertical resolution for this range sensor, in degrees
         """
-        return self.get_attribute("verticalResolution")
+        return self._get_cached_attribute("verticalResolution")
 
     @vertical_resolution.setter
     def vertical_resolution(self, resolution):
@@ -416,7 +437,7 @@ class ScanSensor(BaseSensor):
         Args:
             resolution (float): vertical resolution to set, in degrees
         """
-        self.set_attribute("verticalResolution", resolution)
+        self._set_cached_attribute("verticalResolution", resolution)
 
     @property
     def yaw_offset(self):
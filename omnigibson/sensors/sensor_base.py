@@ -2,6 +2,7 @@ from abc import ABCMeta
 from omnigibson.prims.xform_prim import XFormPrim
 from omnigibson.utils.python_utils import classproperty, assert_valid_key, Registerable
 from omnigibson.utils.gym_utils import GymObservable
+from omnigibson.utils.obs_pipeline_utils import ObservationFrame
 from gym.spaces import Space
 
 
@@ -82,6 +83,23 @@ class BaseSensor(XFormPrim, GymObservable, Registerable, metaclass=ABCMeta):
 
         return obs
 
+    def reset(self):
+        """
+        Resets this sensor's internal state, e.g.: at the start of a new episode. By default, this is a no-op. Should
+        be extended by subclasses that keep state in between readings
+        """
+        pass
+
+    def get_obs_async(self):
+        """
+        Get sensor reading asynchronously. By default, the reading is grabbed synchronously and wrapped into an
+        already completed frame. Should be extended by subclasses that can process their readings asynchronously
+
+        Returns:
+            ObservationFrame: Handle to the sensor reading, whose result() is the same as get_obs()
+        """
+        return ObservationFrame.from_obs(obs=self.get_obs())
+
     def _get_obs(self):
         """
         Get sensor reading. Should generally be extended by subclass.
@@ -1,10 +1,14 @@
 import numpy as np
+import numpy.lib.recfunctions as rfn
 import time
 import gym
+from concurrent.futures import ThreadPoolExecutor
 
 import omnigibson as og
 from omnigibson.sensors.sensor_base import BaseSensor
 from omnigibson.utils.constants import MAX_CLASS_COUNT, MAX_INSTANCE_COUNT, MAX_VIEWER_SIZE, VALID_OMNI_CHARS
+from omnigibson.utils.obs_pipeline_utils import AsyncObservationPipeline, FunctionRawBufferSource, ModalityProcessor, \
+    ObservationFrame, copy_into
 from omnigibson.utils.python_utils import assert_valid_key, classproperty
 from omnigibson.utils.sim_utils import set_carb_setting
 from omnigibson.utils.ui_utils import dock_window
@@ -22,7 +26,7 @@ ext_manager = og.app.app.get_extension_manager()
 ext_manager.set_extension_enabled("omni.syntheticdata", True)
 
 # Continue with omni synethic data imports afterwards
-from omni.syntheticdata import sensors as sensors_util
+from omni.syntheticdata import helpers, sensors as sensors_util
 import omni.syntheticdata._syntheticdata as sd
 sensor_types = sd.SensorType
 
@@ -98,6 +102,9 @@ class VisionSensor(BaseSensor):
     # Persistent dictionary of sensors, mapped from prim_path to sensor
     SENSORS = dict()
 
+    # Worker pool shared by the asynchronous observation pipelines of all vision sensors, created lazily
+    _OBS_EXECUTOR = None
+
     def __init__(
         self,
         prim_path,
@@ -119,6 +126,7 @@ class VisionSensor(BaseSensor):
         # Create variables that will be filled in later at runtime
         self._sd = None             # synthetic data interface
         self._viewport = None       # Viewport from which to grab data
+        self._obs_pipeline = None   # Asynchronous observation pipeline, created lazily
 
         # Run super method
         super().__init__(
@@ -238,12 +246,142 @@ class VisionSensor(BaseSensor):
 
         return obs
 
+    def _get_raw_obs(self, modalities):
+        """
+        Grabs the raw observations of @modalities from this sensor's viewport for get_obs_async(). Must be called on
+        the main thread, after rendering. Only the raw annotator data is fetched here: any parsing is deferred to
+        _parse_raw_obs(), so that it can run on worker threads
+
+        Args:
+            modalities (list of str): Modalities to grab
+
+        Returns:
+            dict: Keyword-mapped raw observations. Modalities requiring instance mappings to be parsed map to
+                (raw data, instance mappings) tuples
+        """
+        obs = dict()
+        instance_mappings = None
+        for modality in modalities:
+            obs[modality] = self._SENSOR_HELPERS[modality](viewport=self._viewport.viewport_api)
+            if modality in {"seg_instance", "bbox_3d"}:
+                # Instance mappings are read from the stage, so they must be grabbed on the main thread as well
+                if instance_mappings is None:
+                    instance_mappings = helpers.get_instance_mappings()
+                obs[modality] = (obs[modality], instance_mappings)
+
+        return obs
+
+    @staticmethod
+    def _parse_raw_obs(modality, raw):
+        """
+        Parses the raw observation of a single modality, as returned by _get_raw_obs(). Does not access the viewport or
+        the stage, so it is safe to call from worker threads
+
+        Args:
+            modality (str): Modality of the observation
+            raw (any): Raw observation
+
+        Returns:
+            any: Parsed observation, equivalent to the one returned by the modality's sensor helper with parsed=True
+        """
+        if modality == "seg_instance":
+            instance_data, instance_mappings = raw
+            if len(instance_mappings) == 0:
+                return instance_data
+            # Map every instance id to the unique id of the (first) semantic instance containing it
+            instances = [(mapping[0], mapping[4]) for mapping in instance_mappings][::-1]
+            max_id = max(int(instance_data.max(initial=0)), max(int(np.max(ids)) for _, ids in instances))
+            lut = np.zeros(max_id + 1, dtype=np.uint32)
+            for unique_id, ids in instances:
+                lut[np.array(ids)] = unique_id
+            return np.take(lut, instance_data)
+        elif modality == "bbox_3d":
+            bbox_data, instance_mappings = raw
+            bbox_data = helpers.reduce_bboxes_3d(bbox_data, instance_mappings)
+            corners = np.zeros(len(bbox_data), dtype=[("corners", np.float32, (8, 3))])
+            corners["corners"] = helpers.get_bbox_3d_corners(bbox_data)
+            return rfn.merge_arrays([bbox_data, corners], flatten=True)
+        return raw
+
+    def get_obs_async(self):
+        """
+        Snapshots the raw buffers of all modalities right away, and post-processes them (e.g.: applying noise) on a
+        worker pool shared by all vision sensors, writing into double-buffered output arrays. This allows stepping
+        the simulation while the previous frame is still being processed.
+
+        Returns:
+            ObservationFrame: Handle to the observations, whose result() has the same contents as get_obs(). Its
+                arrays stay valid until two more frames have been requested from this sensor
+        """
+        if not self._enabled:
+            return ObservationFrame.from_obs(obs=dict())
+
+        assert self.initialized, "Cannot grab vision observations without first initializing this VisionSensor!"
+        if self._obs_pipeline is None:
+            if VisionSensor._OBS_EXECUTOR is None:
+                VisionSensor._OBS_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="vision_sensor_obs")
+            obs_space_mapping = self._obs_space_mapping
+            processors = dict()
+            for modality in self._modalities:
+                space = obs_space_mapping[modality]
+                shape, dtype = (space[0], space[3]) if isinstance(space, tuple) else (None, None)
+                processors[modality] = ModalityProcessor(
+                    fcn=lambda raw, out, modality=modality: self._process_raw_obs(modality=modality, raw=raw, out=out),
+                    shape=shape,
+                    dtype=dtype,
+                )
+            self._obs_pipeline = AsyncObservationPipeline(
+                source=FunctionRawBufferSource(fcn=self._get_raw_obs),
+                processors=processors,
+                executor=VisionSensor._OBS_EXECUTOR,
+            )
+
+        return self._obs_pipeline.submit(modalities=list(self._modalities))
+
+    def _process_raw_obs(self, modality, raw, out):
+        """
+        Parses and post-processes the raw observation of a single modality. Called from worker threads
+
+        Args:
+            modality (str): Modality of the observation
+            raw (any): Raw observation, as returned by _get_raw_obs()
+            out (None or n-array): Preallocated output array to write the observation to, if its shape is fixed
+
+        Returns:
+            any: Processed observation
+        """
+        obs = copy_into(raw=self._parse_raw_obs(modality=modality, raw=raw), out=out)
+        if self._noise is not None and modality not in self.no_noise_modalities:
+            obs = copy_into(raw=self._noise(obs), out=out)
+        return obs
+
+    @property
+    def obs_pipeline_stats(self):
+        """
+        Returns:
+            None or 2-tuple: If asynchronous observations have been requested, (per-modality, per-frame) latency
+                histograms of this sensor's observation pipeline, where per-modality histograms are keyword-mapped
+                LatencyHistogram instances, otherwise None
+        """
+        return None if self._obs_pipeline is None else \
+            (self._obs_pipeline.latencies, self._obs_pipeline.frame_latencies)
+
+    def _reset_obs_pipeline(self):
+        """
+        Waits for any in-flight asynchronous observations and discards the observation pipeline, so that it gets
+        recreated with up-to-date modalities and image dimensions
+        """
+        if self._obs_pipeline is not None:
+            self._obs_pipeline.shutdown()
+            self._obs_pipeline = None
+
     def add_modality(self, modality):
         # Check if we already have this modality (if so, no need to initialize it explicitly)
         should_initialize = modality not in self._modalities
 
         # Run super
         super().add_modality(modality=modality)
+        self._reset_obs_pipeline()
 
         # We also need to initialize this new modality
         if should_initialize:
@@ -255,7 +393,15 @@ class VisionSensor(BaseSensor):
         xform_orient_op = self.get_attribute("xformOp:rotateXYZ")
         return np.array(xform_translate_op), euler2quat(np.array(xform_orient_op))
 
+    def remove_modality(self, modality):
+        # Run super, and make sure the observation pipeline is regenerated
+        super().remove_modality(modality=modality)
+        self._reset_obs_pipeline()
+
     def remove(self, simulator=None):
+        # Wait for any in-flight observations
+        self._reset_obs_pipeline()
+
         # Remove from global sensors dictionary
         self.SENSORS.pop(self._prim_path)
 
@@ -302,6 +448,7 @@ class VisionSensor(BaseSensor):
             height (int): Image height of this sensor, in pixels
         """
         width, _ = self._viewport.viewport_api.get_texture_resolution()
+        self._reset_obs_pipeline()
         self._viewport.viewport_api.set_texture_resolution((width, height))
         # Requires 3 updates to propagate changes
         for i in range(3):
@@ -324,6 +471,7 @@ class VisionSensor(BaseSensor):
             width (int): Image width of this sensor, in pixels
         """
         _, height = self._viewport.viewport_api.get_texture_resolution()
+        self._reset_obs_pipeline()
         self._viewport.viewport_api.set_texture_resolution((width, height))
         # Requires 3 updates to propagate changes
         for i in range(3):
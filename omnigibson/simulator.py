@@ -1,5 +1,3 @@
-from collections import defaultdict
-import itertools
 import logging
 import contextlib
 import os
@@ -15,7 +13,7 @@ from omni.isaac.core.utils.prims import is_prim_ancestral, get_prim_type_name, i
 from omni.isaac.core.utils.stage import open_stage
 from omni.isaac.dynamic_control import _dynamic_control
 import omni.kit.loop._loop as omni_loop
-from pxr import Usd, Gf, UsdGeom, Sdf, UsdPhysics, PhysxSchema, PhysicsSchemaTools, UsdUtils
+from pxr import Usd, Gf, UsdGeom, Sdf, UsdPhysics, PhysxSchema, UsdUtils
 from omni.isaac.core.loggers import DataLogger
 from omni.physx import get_physx_interface, get_physx_simulation_interface, get_physx_scene_query_interface
 
@@ -23,7 +21,11 @@ import omnigibson as og
 from omnigibson.macros import gm, create_module_macros
 from omnigibson.utils.constants import LightingMode
 from omnigibson.utils.config_utils import NumpyEncoder
+from omnigibson.utils.profiling_utils import PROFILER
+from omnigibson.utils.raycast_utils import m as raycast_macros
+from omnigibson.utils.spatial_utils import m as spatial_macros
 from omnigibson.utils.python_utils import clear as clear_pu, create_object_from_init_info, Serializable
+from omnigibson.utils.sim_utils import mark_physics_state_dirty
 from omnigibson.utils.usd_utils import clear as clear_uu, BoundingBoxAPI, FlatcacheAPI
 from omnigibson.utils.ui_utils import CameraMover, disclaimer
 from omnigibson.scenes import Scene
@@ -33,7 +35,7 @@ from omnigibson.object_states.contact_subscribed_state_mixin import ContactSubsc
 from omnigibson.object_states.factory import get_states_by_dependency_order
 from omnigibson.object_states.update_state_mixin import UpdateStateMixin
 from omnigibson.sensors.vision_sensor import VisionSensor
-from omnigibson.transition_rules import DEFAULT_RULES
+from omnigibson.transition_rules import DEFAULT_RULES, TransitionRuleEngine
 
 
 # Create settings for this module
@@ -117,8 +119,9 @@ class Simulator(SimulationContext, Serializable):
         self.object_state_types_requiring_update = \
             [state for state in self.object_state_types if issubclass(state, UpdateStateMixin)]
 
-        # Set of all non-Omniverse transition rules to apply.
+        # Set of all non-Omniverse transition rules to apply, and the engine matching them against the scene objects.
         self._transition_rules = DEFAULT_RULES
+        self._transition_rule_engine = TransitionRuleEngine(rules=self._transition_rules)
 
         # Toggle simulator state once so that downstream omni features can be used without bugs
         # e.g.: particle sampling, which for some reason requires sim.play() to be called at least once
@@ -333,6 +336,10 @@ class Simulator(SimulationContext, Serializable):
         # Load the object in omniverse by adding it to the scene
         self.scene.add_object(obj, self, register=register, _is_call_from_simulator=True)
 
+        # Track registered objects so that transition rules can be matched against them
+        if register:
+            self._transition_rule_engine.add_object(obj)
+
         # Lastly, additionally add this object automatically to be initialized as soon as another simulator step occurs
         # if requested
         if auto_initialize:
@@ -345,6 +352,10 @@ class Simulator(SimulationContext, Serializable):
         Args:
             obj (BaseObject): a non-robot object to load
         """
+        self._transition_rule_engine.remove_object(obj)
+        # Make sure we don't try to initialize the object if it was removed before the next simulator step
+        if obj in self._objects_to_initialize:
+            self._objects_to_initialize.remove(obj)
         self._scene.remove_object(obj, simulator=self)
         self.app.update()
 
@@ -355,12 +366,23 @@ class Simulator(SimulationContext, Serializable):
         assert not self.is_stopped(), f"Simulator must not be stopped in order to run non physics step!"
         # Check to see if any objects should be initialized (only done IF we're playing)
         if len(self._objects_to_initialize) > 0 and self.is_playing():
-            for obj in self._objects_to_initialize:
-                obj.initialize()
-            self._objects_to_initialize = []
-            # Also update the scene registry
-            # TODO: A better place to put this perhaps?
-            self._scene.object_registry.update(keys="root_handle")
+            with PROFILER.timer("initialize_objects"):
+                for obj in self._objects_to_initialize:
+                    obj.initialize()
+                self._objects_to_initialize = []
+                # Also update the scene registry
+                # TODO: A better place to put this perhaps?
+                self._scene.object_registry.update(keys="root_handle")
+
+        # Refresh the scene's spatial index from the latest link poses, if it is being used
+        if spatial_macros.USE_SCENE_INDEX:
+            with PROFILER.timer("spatial_index"):
+                self._scene.update_spatial_index()
+
+        # Add any newly initialized objects to the scene's mesh raycast backend, if it is being used
+        if raycast_macros.USE_MESH_BACKEND:
+            with PROFILER.timer("raycast_backend"):
+                self._scene.update_raycast_backend()
 
         # Propagate states if the feature is enabled
         if gm.ENABLE_OBJECT_STATES:
@@ -368,27 +390,35 @@ class Simulator(SimulationContext, Serializable):
             # Cache values from all of the micro and macro particle systems.
             # This is used to store system-wide state which can be queried
             # by the object state system.
-            for system in self.scene.systems:
-                system.cache()
+            with PROFILER.timer("system_cache"):
+                for system in self.scene.systems:
+                    with PROFILER.timer(system.name):
+                        system.cache()
 
             # Step the object states in global topological order (if the scene exists).
             if self.scene is not None:
-                for state_type in self.object_state_types_requiring_update:
-                    for obj in self.scene.get_objects_with_state(state_type):
-                        # Only update objects that have been initialized so far
-                        if obj.initialized:
-                            obj.states[state_type].update()
+                with PROFILER.timer("object_states"):
+                    for state_type in self.object_state_types_requiring_update:
+                        with PROFILER.timer(state_type.__name__):
+                            # Only update objects that have been initialized so far
+                            state_type.batch_update(
+                                [obj.states[state_type] for obj in self.scene.get_objects_with_state(state_type)
+                                 if obj.initialized]
+                            )
 
             # Perform system level updates to the micro and macro particle systems.
             # This allows for the states to handle changes in response to changes
             # induced by the object state system.
-            for system in self.scene.systems:
-                system.update()
+            with PROFILER.timer("system_update"):
+                for system in self.scene.systems:
+                    with PROFILER.timer(system.name):
+                        system.update()
 
-            for obj in self.scene.objects:
-                # Only update visuals for objects that have been initialized so far
-                if isinstance(obj, StatefulObject) and obj.initialized:
-                    obj.update_visuals()
+            with PROFILER.timer("update_visuals"):
+                for obj in self.scene.objects:
+                    # Only update visuals for objects that have been initialized so far
+                    if isinstance(obj, StatefulObject) and obj.initialized:
+                        obj.update_visuals()
 
     def _omni_update_step(self):
         """
@@ -401,59 +431,8 @@ class Simulator(SimulationContext, Serializable):
         """
         Applies all internal non-Omniverse transition rules.
         """
-        # Create a dict from rule to filter to objects we care about.
-        obj_dict = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-        for obj in self.scene.objects:
-            for rule in self._transition_rules:
-                for fname, f in rule.individual_filters.items():
-                    if f(obj):
-                        obj_dict[rule]["individual"][fname].append(obj)
-                for fname, f in rule.group_filters.items():
-                    if f(obj):
-                        obj_dict[rule]["group"][fname].append(obj)
-
-        # For each rule, create a subset of the dict and apply it if applicable.
-        added_obj_attrs = []
-        removed_objs = []
-        for rule in self._transition_rules:
-            # Skip any rule that has no objects
-            if rule not in obj_dict:
-                continue
-            # Skip any rule that has no group filters if it requires group filters
-            group_f_objs = dict()
-            if rule.requires_group_filters:
-                group_f_objs = obj_dict[rule]["group"]
-                if len(group_f_objs) == 0:
-                    continue
-
-            # Skip any rule that is missing an individual filter if it requires individual filters
-            if rule.requires_individual_filters:
-                individual_f_objs = obj_dict[rule]["individual"]
-                if not all(fname in individual_f_objs for fname in rule.individual_filters.keys()):
-                    continue
-                # Get all cartesian cross product over all individual filter objects, and then attempt the transition rule.
-                # If objects are to be added / removed, the transition function is
-                # expected to return an instance of TransitionResults containing
-                # information about those objects.
-                # TODO: Consider optimizing itertools.product.
-                # TODO: Track what needs to be added / removed at the Scene object level.
-                # Comments from a PR on possible changes:
-                # - Addition / removal tracking on the Scene object.
-                # - Check if the objects are still in the scene in each step.
-                for obj_tuple in itertools.product(*list(individual_f_objs.values())):
-                    individual_objects = {fname: obj for fname, obj in zip(individual_f_objs.keys(), obj_tuple)}
-                    did_transition, transition_output = rule.process(individual_objects=individual_objects, group_objects=group_f_objs)
-                    if transition_output is not None:
-                        # Transition output is a TransitionResults object
-                        added_obj_attrs.extend(transition_output.add)
-                        removed_objs.extend(transition_output.remove)
-            else:
-                # We try the transition rule once, since there's no cartesian cross product of combinations from the
-                # individual filters we need to handle
-                did_transition, transition_output = rule.process(individual_objects=dict(), group_objects=group_f_objs)
-                if transition_output is not None:
-                    added_obj_attrs.extend(transition_output.add)
-                    removed_objs.extend(transition_output.remove)
+        # Match all rules against the current scene objects and process them
+        added_obj_attrs, removed_objs = self._transition_rule_engine.step()
 
         # Process all transition results.
         if len(removed_objs) > 0:
@@ -493,6 +472,10 @@ class Simulator(SimulationContext, Serializable):
             with self.slowed(dt=1e-3):
                 super().play()
 
+            # Playing steps physics and re-creates the physics views, so any per-step physical state snapshots are
+            # now stale
+            mark_physics_state_dirty()
+
             # Update all object handles
             if self.scene is not None and self.scene.initialized:
                 for obj in self.scene.objects:
@@ -516,6 +499,7 @@ class Simulator(SimulationContext, Serializable):
     def stop(self):
         if not self.is_stopped():
             super().stop()
+            mark_physics_state_dirty()
 
         # If we're using flatcache, we also need to reset its API
         if gm.ENABLE_FLATCACHE:
@@ -533,6 +517,15 @@ class Simulator(SimulationContext, Serializable):
         assert n_physics_timesteps_per_render.is_integer(), "render_timestep must be a multiple of physics_timestep"
         return int(n_physics_timesteps_per_render)
 
+    @property
+    def profiler(self):
+        """
+        Returns:
+            Profiler: Profiler instrumenting the phases of each simulator step. Disabled by default; call
+                profiler.enable() to start collecting statistics
+        """
+        return PROFILER
+
     def step(self, render=True, force_playing=False):
         """
         Step the simulation at self.render_timestep
@@ -542,23 +535,31 @@ class Simulator(SimulationContext, Serializable):
             force_playing (bool): If True, will force physics to propagate (i.e.: set simulation, if paused / stopped,
                 to "play" mode)
         """
-        # Possibly force playing
-        if force_playing and not self.is_playing():
-            self.play()
-
-        if render:
-            super().step(render=True)
-        else:
-            for i in range(self.n_physics_timesteps_per_render):
-                super().step(render=False)
-
-        # Additionally run non physics things if we have a valid scene
-        if self._scene is not None:
-            self._omni_update_step()
-            if self.is_playing():
-                self._non_physics_step()
-                if gm.ENABLE_TRANSITION_RULES:
-                    self._transition_rule_step()
+        with PROFILER.timer("step"):
+            # Possibly force playing
+            if force_playing and not self.is_playing():
+                self.play()
+
+            with PROFILER.timer("physics"):
+                if render:
+                    super().step(render=True)
+                else:
+                    for i in range(self.n_physics_timesteps_per_render):
+                        super().step(render=False)
+
+            # Physics has been propagated, so any per-step physical state snapshots are now stale
+            mark_physics_state_dirty()
+
+            # Additionally run non physics things if we have a valid scene
+            if self._scene is not None:
+                with PROFILER.timer("omni_update"):
+                    self._omni_update_step()
+                if self.is_playing():
+                    with PROFILER.timer("non_physics"):
+                        self._non_physics_step()
+                    if gm.ENABLE_TRANSITION_RULES:
+                        with PROFILER.timer("transition_rules"):
+                            self._transition_rule_step()
 
         # TODO (eric): After stage changes (e.g. pose, texture change), it will take two super().step(render=True) for
         #  the result to propagate to the rendering. We could have called super().render() here but it will introduce
@@ -569,6 +570,7 @@ class Simulator(SimulationContext, Serializable):
         Step the physics a single step.
         """
         self._physics_context._step(current_time=self.current_time)
+        mark_physics_state_dirty()
 
     def _on_contact(self, contact_headers, contact_data):
         """
@@ -576,12 +578,11 @@ class Simulator(SimulationContext, Serializable):
         For each of the pair of objects in each contact, we invoke the on_contact function for each of its states
         that subclass ContactSubscribedStateMixin. These states update based on contact events.
         """
+        link_resolver = self._scene.link_resolver
         for contact_header in contact_headers:
-            actor0 = str(PhysicsSchemaTools.intToSdfPath(contact_header.actor0))
-            actor1 = str(PhysicsSchemaTools.intToSdfPath(contact_header.actor1))
-            # actor0/1 are prim paths for links that are in contact. Find the corresponding objects.
-            actor0_obj = self._scene.object_registry("prim_path", "/".join(actor0.split("/")[:-1]))
-            actor1_obj = self._scene.object_registry("prim_path", "/".join(actor1.split("/")[:-1]))
+            # actor0/1 are integer handles for links that are in contact. Find the corresponding objects.
+            actor0_obj, _ = link_resolver.resolve_handle(contact_header.actor0)
+            actor1_obj, _ = link_resolver.resolve_handle(contact_header.actor1)
             if actor0_obj is None or actor1_obj is None or not actor0_obj.initialized or not actor1_obj.initialized:
                 continue
 
@@ -709,6 +710,14 @@ class Simulator(SimulationContext, Serializable):
         """
         return self._scene
 
+    @property
+    def transition_rule_engine(self):
+        """
+        Returns:
+            TransitionRuleEngine: Engine matching the non-Omniverse transition rules against the current scene objects
+        """
+        return self._transition_rule_engine
+
     @property
     def viewer_camera(self):
         """
@@ -744,6 +753,7 @@ class Simulator(SimulationContext, Serializable):
         if self._scene is not None:
             self.scene.clear()
         self._scene = None
+        self._transition_rule_engine.clear()
 
         # Clear all vision sensors and remove the viewer camera
         VisionSensor.clear()
@@ -2,7 +2,6 @@ import logging
 import os
 import matplotlib.pyplot as plt
 import omni
-from omni.isaac.core.utils.prims import get_prim_at_path
 
 import omnigibson as og
 import omnigibson.objects
@@ -12,23 +11,39 @@ from omnigibson.systems.particle_system_base import BaseParticleSystem
 from omnigibson.utils.constants import SemanticClass
 from omnigibson.utils.python_utils import classproperty, subclass_factory
 from omnigibson.utils.sampling_utils import sample_cuboid_on_object_symmetric_bimodal_distribution
-import omnigibson.utils.transform_utils as T
+from omnigibson.utils.particle_storage_utils import MacroParticleStorage
+import omnigibson.utils.batch_transform_utils as BT
 from omnigibson.utils.usd_utils import FlatcacheAPI
 from omnigibson.prims.geom_prim import VisualGeomPrim
+from omnigibson.prims.xform_prim import XFormPrim
 import numpy as np
+from pxr import Sdf, UsdGeom, Vt
 
 
 class MacroParticleSystem(BaseParticleSystem):
     """
     Global system for modeling "macro" level particles, e.g.: dirt, dust, etc.
+
+    Particles are not individual prims. Instead, their poses, scales and attachment links are stored in contiguous
+    arrays (see MacroParticleStorage), and all particles are rendered through a single point instancer whose prototype
+    is a copy of the particle template.
     """
     # Template object to use -- this should be some instance of BasePrim. This will be the
     # object that symbolizes a single particle, and will be duplicated to generate the particle system.
     # Note that this object is NOT part of the actual particle system itself!
     particle_object = None
 
-    # dict, array of particle objects, mapped by their prim names
-    particles = None
+    # MacroParticleStorage, array-backed storage of all particles
+    _particles = None
+
+    # UsdGeom.PointInstancer rendering all particles
+    _particle_instancer = None
+
+    # Whether the particles have been modified since the point instancer was last updated
+    _particle_instancer_dirty = None
+
+    # Transforms of the links all particles were attached to when the point instancer was last updated
+    _particle_instancer_link_transforms = None
 
     # Scaling factor to sample from when generating a new particle
     min_scale = None              # (x,y,z) scaling
@@ -46,7 +61,9 @@ class MacroParticleSystem(BaseParticleSystem):
         super().initialize(simulator=simulator)
 
         # Initialize mutable class variables so they don't automatically get overridden by children classes
-        cls.particles = dict()
+        cls._particles = MacroParticleStorage()
+        cls._particle_instancer_dirty = False
+        cls._particle_instancer_link_transforms = None
         cls.min_scale = np.ones(3)
         cls.max_scale = np.ones(3)
         cls.max_particle_idn = -1
@@ -58,6 +75,9 @@ class MacroParticleSystem(BaseParticleSystem):
         # Class particle objet is assumed to be the first and only visual mesh belonging to the root link
         cls.set_particle_template_object(obj=list(particle_template.root_link.visual_meshes.values())[0])
 
+        # Create the point instancer rendering all particles
+        cls._create_particle_instancer()
+
     @classmethod
     def _create_particle_template(cls):
         """
@@ -71,19 +91,89 @@ class MacroParticleSystem(BaseParticleSystem):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def _create_particle_instancer(cls):
+        """
+        Creates the point instancer rendering all particles of this system, using a copy of the particle template as
+        its only prototype
+        """
+        instancer_path = f"/World/{cls.name}/particles"
+        prototype_path = f"{instancer_path}/prototype"
+        cls._particle_instancer = UsdGeom.PointInstancer.Define(cls.simulator.stage, instancer_path)
+        omni.kit.commands.execute("CopyPrim", path_from=cls.particle_object.prim_path, path_to=prototype_path)
+
+        # Particle poses and scales are set in the world frame, so the prototype itself should not be transformed
+        prototype = XFormPrim(prim_path=prototype_path, name=f"{cls.name}_prototype")
+        prototype.set_local_pose(translation=np.zeros(3), orientation=np.array([0, 0, 0, 1.0]))
+        prototype.scale = np.ones(3)
+        prototype.visible = True
+        cls._particle_instancer.GetPrototypesRel().AddTarget(Sdf.Path(prototype_path))
+        cls._particle_instancer_dirty = True
+        cls._update_particle_instancer()
+
+    @classmethod
+    def _update_particle_instancer(cls):
+        """
+        Writes the current world poses and scales of all particles to the point instancer, unless no particle was
+        modified and none of the links they are attached to moved since it was last updated
+        """
+        link_transforms = cls._particles.get_link_transforms(cls._particles.link_ids)
+        prev_link_transforms = cls._particle_instancer_link_transforms
+        if not cls._particle_instancer_dirty and prev_link_transforms is not None and \
+                all(np.array_equal(new, prev) for new, prev in zip(link_transforms, prev_link_transforms)):
+            return
+
+        positions, orientations, scales = cls._particles.get_world_transforms(link_transforms=link_transforms)
+        if cls._particle_instancer_dirty:
+            proto_indices = np.zeros(cls.n_particles, dtype=np.int32)
+            cls._particle_instancer.GetProtoIndicesAttr().Set(Vt.IntArray.FromNumpy(proto_indices))
+        cls._particle_instancer.GetPositionsAttr().Set(Vt.Vec3fArray.FromNumpy(positions.astype(np.float32)))
+        # Swap w position, since Quath takes (w,x,y,z) half precision values
+        cls._particle_instancer.GetOrientationsAttr().Set(
+            Vt.QuathArray.FromNumpy(orientations[:, [3, 0, 1, 2]].astype(np.float16)))
+        cls._particle_instancer.GetScalesAttr().Set(Vt.Vec3fArray.FromNumpy(scales.astype(np.float32)))
+        cls._particle_instancer_link_transforms = link_transforms
+        cls._particle_instancer_dirty = False
+
+    @classmethod
+    def update(cls):
+        # Run super first
+        super().update()
+
+        # Particles follow the links they are attached to, so their world poses need to be updated every step
+        if cls._particle_instancer is not None and (cls.n_particles > 0 or cls._particle_instancer_dirty):
+            cls._update_particle_instancer()
+
     @classmethod
     def reset(cls):
         # Reset all internal variables
         cls.remove_all_particles()
         cls.max_particle_idn = -1
 
+    @classmethod
+    def clear(cls):
+        # Run super method first
+        super().clear()
+
+        # The point instancer is removed along with the stage
+        cls._particle_instancer = None
+        cls._particle_instancer_link_transforms = None
+
     @classproperty
     def n_particles(cls):
         """
         Returns:
             int: Number of active particles in this system
         """
-        return len(cls.particles)
+        return 0 if cls._particles is None else cls._particles.n_particles
+
+    @classproperty
+    def particle_idns(cls):
+        """
+        Returns:
+            n-array: Unique identification number of each active particle in this system
+        """
+        return np.array(cls._particles.idns)
 
     @classproperty
     def particle_name_prefix(cls):
@@ -101,13 +191,28 @@ class MacroParticleSystem(BaseParticleSystem):
         state_size = 10 * cls.n_particles + 2
         return state_size if cls.particle_object is None else state_size + 10
 
+    @classmethod
+    def _get_particle_state_idxs(cls, state=None):
+        """
+        Grabs the indices of the particles, in the order in which their poses and scales are dumped / loaded
+
+        Args:
+            state (None or dict): If specified, the state being loaded. Otherwise, the state is being dumped
+
+        Returns:
+            n-array: Particle indices, in state order
+        """
+        return np.arange(cls.n_particles)
+
     @classmethod
     def _dump_state(cls):
+        idxs = cls._get_particle_state_idxs()
         return dict(
             max_particle_idn=cls.max_particle_idn,
             n_particles=cls.n_particles,
-            poses=[particle.get_local_pose() for particle in cls.particles.values()],
-            scales=[particle.scale for particle in cls.particles.values()],
+            positions=cls._particles.positions[idxs],
+            orientations=cls._particles.orientations[idxs],
+            scales=cls._particles.scales[idxs],
             template_pose=cls.particle_object.get_local_pose() if cls.particle_object is not None else None,
             template_scale=cls.particle_object.scale if cls.particle_object is not None else None,
         )
@@ -127,9 +232,10 @@ class MacroParticleSystem(BaseParticleSystem):
         cls.max_particle_idn = state["max_particle_idn"]
 
         # Load the poses and scales
-        for particle, pose, scale in zip(cls.particles.values(), state["poses"], state["scales"]):
-            particle.set_local_pose(*pose)
-            particle.scale = scale
+        idxs = cls._get_particle_state_idxs(state=state)
+        cls._particles.set_local_poses(idxs, positions=state["positions"], orientations=state["orientations"])
+        cls._particles.set_scales(idxs, scales=state["scales"])
+        cls._particle_instancer_dirty = True
 
         # Load template pose and scale if it exists
         if state["template_pose"] is not None:
@@ -142,8 +248,8 @@ class MacroParticleSystem(BaseParticleSystem):
         states_flat = [
             [state["max_particle_idn"]],
             [state["n_particles"]],
-            *[np.concatenate(pose) for pose in state["poses"]],
-            *state["scales"]
+            np.concatenate([state["positions"], state["orientations"]], axis=1).flatten(),
+            np.asarray(state["scales"]).flatten(),
         ]
 
         # Optionally add template pose and scale if it's not None
@@ -160,18 +266,12 @@ class MacroParticleSystem(BaseParticleSystem):
         n_particles = int(state[1])
         state_dict["n_particles"] = n_particles
 
-        poses, scales = [], []
         pose_offset_idx = 2                                 # This is where the pose info begins in the flattened array
         scale_offset_idx = n_particles * 7 + pose_offset_idx  # This is where the scale info begins in the flattened array
-        for i in range(n_particles):
-            poses.append([
-                state[7*i + pose_offset_idx: 7*i + pose_offset_idx + 3],
-                state[7*i + pose_offset_idx + 3: 7*(i+1) + pose_offset_idx]
-            ])      # pos, ori
-            scales.append(state[3*i + scale_offset_idx : 3*(i + 1) + scale_offset_idx])      # scale
-
-        state_dict["poses"] = poses
-        state_dict["scales"] = scales
+        poses = state[pose_offset_idx:scale_offset_idx].reshape(n_particles, 7)
+        state_dict["positions"] = poses[:, :3]
+        state_dict["orientations"] = poses[:, 3:]
+        state_dict["scales"] = state[scale_offset_idx:scale_offset_idx + n_particles * 3].reshape(n_particles, 3)
 
         # Update idx -- two from max_n_particles and n_particles + 10*n_particles for pose + scale
         idx = 2 + n_particles * 10
@@ -229,47 +329,81 @@ class MacroParticleSystem(BaseParticleSystem):
         """
         Removes all particles and deletes them from the simulator
         """
-        # Use list explicitly to prevent mid-loop mutation of dict
-        for particle_name in list(cls.particles.keys()):
-            cls.remove_particle(name=particle_name)
+        cls.remove_particles(idxs=np.arange(cls.n_particles))
 
     @classmethod
-    def add_particle(cls, prim_path, idn=None, scale=None, position=None, orientation=None):
+    def add_particles(cls, positions=None, orientations=None, scales=None, idns=None, links=None, group=None):
         """
-        Adds a particle to this system.
+        Adds particles to this system.
 
         Args:
-            prim_path (str): Absolute path to the newly created particle, minus the name for this particle
-            idn (None or int): If specified, should be unique identifier to assign to this particle. If not, will
-                automatically generate a new unique one
-            scale (None or 3-array): Relative (x,y,z) scale of the particle, if any. If not specified, will
-                automatically be sampled based on cls.min_scale and cls.max_scale
-            position (None or 3-array): Global (x,y,z) position to set this particle to, if any
-            orientation (None or 4-array): Global (x,y,z,w) quaternion orientation to set this particle to, if any
+            positions (None or np.array): (n_particles, 3) shaped array specifying per-particle global (x,y,z)
+                positions. If not specified, @idns must be specified, and all particles will be placed at the origin
+                of the links they are attached to
+            orientations (None or np.array): (n_particles, 4) shaped array specifying per-particle global (x,y,z,w)
+                quaternion orientations. If not specified, all will be set to canonical orientation (0, 0, 0, 1)
+            scales (None or np.array): (n_particles, 3) shaped array specifying per-particle relative (x,y,z) scales. If
+                not specified, will automatically be sampled based on cls.min_scale and cls.max_scale
+            idns (None or list of int): If specified, should be unique identifiers to assign to these particles. If not,
+                will automatically generate new unique ones
+            links (None or list of None or RigidPrim): If specified, the link each particle is attached to, i.e.: whose
+                motion it should follow. None means the particle is not attached to any link
+            group (None or str): If specified, name of the group the particles belong to
 
         Returns:
-            XFormPrim: Newly created particle instance, which is added internally as well
+            np.array: (n_particles,) indices of the newly created particles
         """
-        # Generate the new particle
-        name = cls.particle_idn2name(idn=cls.get_next_particle_unique_idn() if idn is None else idn)
-        # Make sure name doesn't already exist
-        assert name not in cls.particles.keys(), f"Cannot create particle with name {name} because it already exists!"
-        new_particle = cls._load_new_particle(prim_path=f"{prim_path}/{name}", name=name)
-
-        # Sample the scale and also make sure the particle is visible
-        new_particle.scale *= np.random.uniform(cls.min_scale, cls.max_scale) if scale is None else scale
-        new_particle.visible = True
+        assert positions is not None or idns is not None, "Either positions or idns must be specified!"
+        n_particles = len(positions) if positions is not None else len(idns)
+        if idns is None:
+            start_idn = cls.get_next_particle_unique_idn()
+            idns = np.arange(start_idn, start_idn + n_particles)
 
-        # Set the pose
-        new_particle.set_position_orientation(position=position, orientation=orientation)
+        # Sample the scales, which are relative to the particle template's scale
+        if scales is None:
+            scales = np.random.uniform(cls.min_scale, cls.max_scale, (n_particles, 3))
+        scales = cls.particle_object.scale * np.asarray(scales).reshape(n_particles, 3)
+
+        # Convert the global poses into the frames of the links the particles are attached to
+        if positions is None:
+            local_positions, local_orientations = np.zeros((n_particles, 3)), None
+        else:
+            if orientations is None:
+                orientations = np.zeros((n_particles, 4))
+                orientations[:, -1] = 1.0
+            link_ids = np.full(n_particles, -1) if links is None else cls._particles.get_link_ids(links)
+            local_positions, local_orientations = cls._particles.world_to_local(
+                link_ids,
+                np.asarray(positions).reshape(n_particles, 3),
+                np.asarray(orientations).reshape(n_particles, 4),
+            )
 
-        # Track this particle as well
-        cls.particles[new_particle.name] = new_particle
+        idxs = cls._particles.add(
+            idns=idns,
+            positions=local_positions,
+            orientations=local_orientations,
+            scales=scales,
+            group=group,
+            links=links,
+        )
+        cls._particle_instancer_dirty = True
 
         # Increment idn counter
-        cls.max_particle_idn += 1
+        cls.max_particle_idn += n_particles
+
+        return idxs
+
+    @classmethod
+    def remove_particles(cls, idxs):
+        """
+        Removes particles from this system
 
-        return new_particle
+        Args:
+            idxs (np.array): Indices of the particles to remove
+        """
+        if len(idxs) > 0:
+            cls._particles.remove(idxs)
+            cls._particle_instancer_dirty = True
 
     @classmethod
     def remove_particle(cls, name):
@@ -279,25 +413,73 @@ class MacroParticleSystem(BaseParticleSystem):
         Args:
             name (str): Name of the particle to remove
         """
-        assert name in cls.particles, f"Got invalid name for particle to remove {name}"
+        cls.remove_particles(idxs=cls._particles.get_indices([cls.particle_name2idn(name=name)]))
+
+    @classmethod
+    def get_particles_position_orientation(cls, idxs=None):
+        """
+        Computes particles' global positions and orientations. This automatically takes into account the relative
+        pose w.r.t. their parent links and the global poses of those parent links.
 
-        particle = cls.particles.pop(name)
-        particle.remove(simulator=cls.simulator)
+        Args:
+            idxs (None or np.array): Indices of the particles to query. If None, all particles are queried
+
+        Returns:
+            2-tuple:
+                - (n, 3)-array: (x,y,z) positions in the world frame
+                - (n, 4)-array: (x,y,z,w) quaternion orientations in the world frame
+        """
+        return cls._particles.get_world_poses(idxs=idxs)
 
     @classmethod
-    def _load_new_particle(cls, prim_path, name):
+    def get_particle_position_orientation(cls, name):
         """
-        Loads a new particle into the current stage, leveraging @cls.particle_object as a template for the new particle
-        to load. This function should be implemented by any subclasses.
+        Compute particle's global position and orientation. This automatically takes into account the relative
+        pose w.r.t. its parent link and the global pose of that parent link.
 
         Args:
-            prim_path (str): The absolute stage path at which to create the new particle
-            name (str): The name to assign to this new particle at the path
+            name (str): Name of the particle to query
 
         Returns:
-            XFormPrim: Loaded particle
+            2-tuple:
+                - 3-array: (x,y,z) position in the world frame
+                - 4-array: (x,y,z,w) quaternion orientation in the world frame
         """
-        raise NotImplementedError()
+        positions, orientations = cls.get_particles_position_orientation(
+            idxs=cls._particles.get_indices([cls.particle_name2idn(name=name)]))
+        return positions[0], orientations[0]
+
+    @classmethod
+    def set_particles_position_orientation(cls, idxs, positions=None, orientations=None):
+        """
+        Sets particles' global positions and / or orientations. Particles keep following the links they are attached to
+
+        Args:
+            idxs (np.array): Indices of the particles to modify
+            positions (None or np.array): (n, 3) (x,y,z) positions in the world frame. If None, positions are unchanged
+            orientations (None or np.array): (n, 4) (x,y,z,w) quaternion orientations in the world frame. If None,
+                orientations are unchanged
+        """
+        current_positions, current_orientations = cls.get_particles_position_orientation(idxs=idxs)
+        local_positions, local_orientations = cls._particles.world_to_local(
+            cls._particles.link_ids[idxs],
+            current_positions if positions is None else positions,
+            current_orientations if orientations is None else orientations,
+        )
+        cls._particles.set_local_poses(idxs, positions=local_positions, orientations=local_orientations)
+        cls._particle_instancer_dirty = True
+
+    @classmethod
+    def set_particles_scale(cls, idxs, scales):
+        """
+        Sets particles' (x,y,z) scales in the frames of the links they are attached to
+
+        Args:
+            idxs (np.array): Indices of the particles to modify
+            scales (np.array): (n, 3) (x,y,z) scales
+        """
+        cls._particles.set_scales(idxs, scales=scales)
+        cls._particle_instancer_dirty = True
 
     @classmethod
     def particle_name2idn(cls, name):
@@ -343,16 +525,9 @@ class VisualParticleSystem(MacroParticleSystem):
     """
     Particle system class that additionally includes sampling utilities for placing particles on specific objects
     """
-    # Maps group name to the particles associated with it
-    # This is an ordered dict of ordered dict (nested ordered dict maps particle names to particle instance)
-    _group_particles = None
-
     # Maps group name to the parent object (the object with particles attached to it) of the group
     _group_objects = None
 
-    # Maps particle name to dict of {obj, link}
-    _particles_info = None
-
     # Default behavior for this class -- whether to clip generated particles halfway into objects when sampling
     # their locations on the surface of the given object
     _CLIP_INTO_OBJECTS = False
@@ -374,9 +549,7 @@ class VisualParticleSystem(MacroParticleSystem):
         super().initialize(simulator=simulator)
 
         # Initialize mutable class variables so they don't automatically get overridden by children classes
-        cls._group_particles = dict()
         cls._group_objects = dict()
-        cls._particles_info = dict()
 
     @classproperty
     def groups(cls):
@@ -384,7 +557,7 @@ class VisualParticleSystem(MacroParticleSystem):
         Returns:
             set of str: Current attachment particle group names
         """
-        return set(cls._group_particles.keys())
+        return set(cls._group_objects.keys())
 
     @classproperty
     def state_size(cls):
@@ -393,20 +566,7 @@ class VisualParticleSystem(MacroParticleSystem):
 
         # Additionally, we have n_groups (1), with m_particles for each group (n), attached_obj_uuids (n), and
         # particle ids and corresponding link info for each particle (m * 2)
-        return state_size + 1 + 2 * len(cls._group_particles) + \
-               sum(2 * cls.num_group_particles(group) for group in cls.groups)
-
-    @classmethod
-    def _load_new_particle(cls, prim_path, name):
-        # We copy the template prim and generate the new object if the prim doesn't already exist, otherwise we
-        # reference the pre-existing one
-        if not get_prim_at_path(prim_path):
-            omni.kit.commands.execute(
-                "CopyPrim",
-                path_from=cls.particle_object.prim_path,
-                path_to=prim_path,
-            )
-        return VisualGeomPrim(prim_path=prim_path, name=name)
+        return state_size + 1 + 2 * len(cls._group_objects) + 2 * cls.n_particles
 
     @classmethod
     def set_particle_template_object(cls, obj):
@@ -417,35 +577,15 @@ class VisualParticleSystem(MacroParticleSystem):
         # Run super method
         super().set_particle_template_object(obj=obj)
 
-    @classmethod
-    def remove_all_particles(cls):
-        # Run super method first
-        super().remove_all_particles()
-
     @classmethod
     def clear(cls):
         # Run super method first
         super().clear()
 
         # Clear all groups as well
-        cls._group_particles = dict()
         cls._group_objects = dict()
-        cls._particles_info = dict()
-
-    @classmethod
-    def remove_particle(cls, name):
-        """
-        Remove particle with name @name from both the simulator and internal state
-
-        Args:
-            name (str): Name of the particle to remove
-        """
-        # Run super first
-        super().remove_particle(name=name)
-
-        # Remove this particle from its respective group as well
-        cls._group_particles[cls._particles_info[name]["obj"].name].pop(name)
-        cls._particles_info.pop(name)
+        if cls._particles is not None:
+            cls._particles.clear()
 
     @classmethod
     def remove_all_group_particles(cls, group):
@@ -458,8 +598,7 @@ class VisualParticleSystem(MacroParticleSystem):
         # Make sure the group exists
         cls._validate_group(group=group)
         # Remove all particles from the group
-        for particle_name in list(cls._group_particles[group].keys()):
-            cls.remove_particle(name=particle_name)
+        cls.remove_particles(idxs=cls._particles.get_group_indices(group))
 
     @classmethod
     def num_group_particles(cls, group):
@@ -475,7 +614,7 @@ class VisualParticleSystem(MacroParticleSystem):
         """
         # Make sure the group exists
         cls._validate_group(group=group)
-        return len(cls._group_particles[group])
+        return len(cls._particles.get_group_indices(group))
 
     @classmethod
     def get_group_name(cls, obj):
@@ -511,7 +650,7 @@ class VisualParticleSystem(MacroParticleSystem):
             f"Cannot create new attachment group because group with name {group} already exists!"
 
         # Create the group
-        cls._group_particles[group] = dict()
+        cls._particles.add_group(group)
         cls._group_objects[group] = obj
 
         return group
@@ -532,12 +671,10 @@ class VisualParticleSystem(MacroParticleSystem):
         # Make sure the group exists
         cls._validate_group(group=group)
 
-        # Remove all particles from the group
-        cls.remove_all_group_particles(group=group)
-
-        # Remove the actual groups
-        cls._group_particles.pop(group)
+        # Remove the actual group, along with all of its particles
+        cls._particles.remove_group(group)
         cls._group_objects.pop(group)
+        cls._particle_instancer_dirty = True
 
         return group
 
@@ -622,41 +759,31 @@ class VisualParticleSystem(MacroParticleSystem):
         if orientations is None:
             orientations = np.zeros((n_particles, 4))
             orientations[:, -1] = 1.0
-        link_prim_paths = [obj.root_link.prim_path] * n_particles if link_prim_paths is None else link_prim_paths
+        links = [obj.root_link] * n_particles if link_prim_paths is None else \
+            [obj.links[link_prim_path.split("/")[-1]] for link_prim_path in link_prim_paths]
 
         if scales is None:
             scales = cls.sample_scales(group=group, n=n_particles)
-        bbox_extents_local = [(cls.particle_object.aabb_extent * scale).tolist() for scale in scales]
 
         # If we're using flatcache, we need to update the object's pose on the USD manually
         if gm.ENABLE_FLATCACHE:
             FlatcacheAPI.sync_raw_object_transforms_in_usd(prim=obj)
 
-        # Generate particles
-        z_up = np.zeros((3, 1))
-        z_up[-1] = 1.0
-        for position, orientation, scale, bbox_extent_local, link_prim_path in \
-                zip(positions, orientations, scales, bbox_extents_local, link_prim_paths):
-            link_name = link_prim_path.split("/")[-1]
-            link = obj.links[link_name]
-            # Possibly shift the particle slightly away from the object if we're not clipping into objects
-            if cls._CLIP_INTO_OBJECTS:
-                # Shift the particle halfway down
-                base_to_center = bbox_extent_local[2] / 2.0
-                normal = (T.quat2mat(orientation) @ z_up).flatten()
-                position -= normal * base_to_center
-
-            # Create particle
-            particle = cls.add_particle(
-                prim_path=link_prim_path,
-                position=position,
-                orientation=orientation,
-                scale=scale,
-            )
-
-            # Add to group
-            cls._group_particles[group][particle.name] = particle
-            cls._particles_info[particle.name] = dict(obj=cls._group_objects[group], link=link)
+        # Possibly shift the particles slightly away from the object if we're not clipping into objects
+        if cls._CLIP_INTO_OBJECTS:
+            # Shift the particles halfway down along their normals
+            base_to_center = (cls.particle_object.aabb_extent * scales)[:, 2:] / 2.0
+            normals = BT.quat_apply(orientations, np.tile([0, 0, 1.0], (n_particles, 1)))
+            positions = positions - normals * base_to_center
+
+        # Create particles
+        cls.add_particles(
+            positions=positions,
+            orientations=orientations,
+            scales=scales,
+            links=links,
+            group=group,
+        )
 
     @classmethod
     def generate_group_particles_on_object(cls, group, n_particles=None, min_particles_for_success=1):
@@ -692,7 +819,7 @@ class VisualParticleSystem(MacroParticleSystem):
         # For sampling particle positions, we need the global bbox extents, NOT the local extents
         # which is what we would get naively if we directly use @scales
         avg_scale = np.cbrt(np.product(obj.scale))
-        bbox_extents_global = [(cls.particle_object.aabb_extent * scale * avg_scale).tolist() for scale in scales]
+        bbox_extents_global = (cls.particle_object.aabb_extent * scales * avg_scale).tolist()
 
         # Sample locations for all particles
         # TODO: Does simulation need to play at this point in time? Answer: yes
@@ -726,33 +853,12 @@ class VisualParticleSystem(MacroParticleSystem):
                 group=group,
                 positions=np.array(positions),
                 orientations=np.array(orientations),
-                scales=np.array(scales),
+                scales=np.array(particle_scales),
                 link_prim_paths=link_prim_paths,
             )
 
         return success
 
-    @classmethod
-    def get_particle_position_orientation(cls, name):
-        """
-        Compute particle's global position and orientation. This automatically takes into account the relative
-        pose w.r.t. its parent link and the global pose of that parent link.
-
-        Returns:
-            2-tuple:
-                - 3-array: (x,y,z) position in the world frame
-                - 4-array: (x,y,z,w) quaternion orientation in the world frame
-        """
-        # First, get local pose, scale it by the parent link's scale, and then convert into a matrix
-        particle = cls.particles[name]
-        parent_link = cls._particles_info[name]["link"]
-        local_pos, local_quat = particle.get_local_pose()
-        local_mat = T.pose2mat((parent_link.scale * local_pos, local_quat))
-        link_tf = T.pose2mat(parent_link.get_position_orientation())
-
-        # Multiply the local pose by the link's global transform, then return as pos, quat tuple
-        return T.mat2pose(link_tf @ local_mat)
-
     @classmethod
     def _validate_group(cls, group):
         """
@@ -762,9 +868,15 @@ class VisualParticleSystem(MacroParticleSystem):
         Args:
             group (str): Name of the group to check for
         """
-        if group not in cls.groups:
+        if group not in cls._group_objects:
             raise ValueError(f"Particle attachment group {group} does not exist!")
 
+    @classmethod
+    def _get_particle_state_idxs(cls, state=None):
+        # Particles are dumped / loaded group by group, in the order of the groups in the state
+        groups = cls._group_objects.keys() if state is None else state["groups"].keys()
+        return np.concatenate([cls._particles.get_group_indices(group) for group in groups] + [np.zeros(0, dtype=int)])
+
     @classmethod
     def _sync_particle_groups(cls, group_objects, particle_idns, particle_attached_link_names):
         """
@@ -782,48 +894,31 @@ class VisualParticleSystem(MacroParticleSystem):
         """
         # We have to be careful here -- some particle groups may have been deleted / are mismatched, so we need
         # to update accordingly, potentially deleting stale groups and creating new groups as needed
-        name_to_info_mapping = {obj.name: {
-            "n_particles": len(p_idns),
-            "particle_idns": p_idns,
-            "link_names": link_names,
+        desired_groups = {
+            obj.name: (obj, np.asarray(p_idns, dtype=int), [obj.links[link_name] for link_name in link_names])
+            for obj, p_idns, link_names in zip(group_objects, particle_idns, particle_attached_link_names)
+            if obj is not None
         }
-            for obj, p_idns, link_names in
-            zip(group_objects, particle_idns, particle_attached_link_names) if obj is not None}
-
-        current_group_names = cls.groups
-        desired_group_names = set(obj.name for obj in group_objects if obj is not None)
-        groups_to_delete = current_group_names - desired_group_names
-        groups_to_create = desired_group_names - current_group_names
-        common_groups = current_group_names.intersection(desired_group_names)
-
-        # Sanity check the common groups, we will recreate any where there is a mismatch
-        for name in common_groups:
-            info = name_to_info_mapping[name]
-            if cls.num_group_particles(group=name) != info["n_particles"]:
-                logging.debug(f"Got mismatch in particle group {name} when syncing, "
-                                f"deleting and recreating group now.")
-                # Add this group to both the delete and creation pile
-                groups_to_delete.add(name)
-                groups_to_create.add(name)
 
         # Delete any groups we no longer want
-        for name in groups_to_delete:
+        for name in cls.groups - set(desired_groups.keys()):
             cls.remove_attachment_group(group=name)
 
-        # Create any groups we don't already have
-        for name in groups_to_create:
-            obj = cls.simulator.scene.object_registry("name", name)
-            info = name_to_info_mapping[name]
-            cls.create_attachment_group(obj=obj)
+        for name, (obj, idns, links) in desired_groups.items():
+            # Sanity check the common groups, we will recreate any where there is a mismatch
+            if name in cls.groups:
+                idxs = cls._particles.get_group_indices(name)
+                if np.array_equal(cls._particles.idns[idxs], idns) and \
+                        np.array_equal(cls._particles.link_ids[idxs], cls._particles.get_link_ids(links)):
+                    continue
+                logging.debug(f"Got mismatch in particle group {name} when syncing, "
+                              f"deleting and recreating group now.")
+                cls.remove_attachment_group(group=name)
 
-            for particle_idn, link_name in zip(info["particle_idns"], info["link_names"]):
-                # Create the necessary particles
-                particle = cls.add_particle(
-                    prim_path=f"{obj.prim_path}/{link_name}",
-                    idn=int(particle_idn),
-                )
-                cls._group_particles[name][particle.name] = particle
-                cls._particles_info[particle.name] = dict(obj=obj, link=obj.links[link_name])
+            # Create the group and its particles. Their poses and scales are set when loading the state
+            cls.create_attachment_group(obj=obj)
+            if len(idns) > 0:
+                cls.add_particles(idns=idns, links=links, group=name)
 
     @classmethod
     def create(cls, particle_name, n_particles_per_group, create_particle_template, min_scale=None, max_scale=None, **kwargs):
@@ -897,15 +992,17 @@ class VisualParticleSystem(MacroParticleSystem):
 
         # Add in per-group information
         groups_dict = dict()
-        for group_name, group_particles in cls._group_particles.items():
+        idns, link_ids, links = cls._particles.idns, cls._particles.link_ids, cls._particles.links
+        for group_name, group_obj in cls._group_objects.items():
+            idxs = cls._particles.get_group_indices(group_name)
             groups_dict[group_name] = dict(
-                particle_attached_obj_uuid=cls._group_objects[group_name].uuid,
-                n_particles=cls.num_group_particles(group=group_name),
-                particle_idns=[cls.particle_name2idn(name=name) for name in group_particles.keys()],
-                particle_attached_link_names=[cls._particles_info[name]["link"].prim_path.split("/")[-1] for name in group_particles.keys()],
+                particle_attached_obj_uuid=group_obj.uuid,
+                n_particles=len(idxs),
+                particle_idns=idns[idxs].tolist(),
+                particle_attached_link_names=[links[link_id].prim_path.split("/")[-1] for link_id in link_ids[idxs]],
             )
 
-        state["n_groups"] = len(cls._group_particles)
+        state["n_groups"] = len(cls._group_objects)
         state["groups"] = groups_dict
 
         return state
@@ -1,8 +1,12 @@
 from omnigibson.tasks.task_base import REGISTERED_TASKS
-from omnigibson.tasks.dummy_task import DummyTask
-from omnigibson.tasks.point_navigation_task import PointNavigationTask
-from omnigibson.tasks.point_navigation_obstacle_task import PointNavigationStaticObstacleTask, \
-    PointNavigationDynamicObstacleTask
-from omnigibson.tasks.point_reaching_task import PointReachingTask
-from omnigibson.tasks.furniture_closing_task import FurnitureClosingTask
-from omnigibson.tasks.behavior_task import BehaviorTask
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+# Tasks are imported upon first access, or upon first lookup of REGISTERED_TASKS
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".dummy_task": ["DummyTask"],
+    ".point_navigation_task": ["PointNavigationTask"],
+    ".point_navigation_obstacle_task": ["PointNavigationStaticObstacleTask", "PointNavigationDynamicObstacleTask"],
+    ".point_reaching_task": ["PointReachingTask"],
+    ".furniture_closing_task": ["FurnitureClosingTask"],
+    ".behavior_task": ["BehaviorTask"],
+})
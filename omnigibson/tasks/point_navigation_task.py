@@ -227,7 +227,9 @@ class PointNavigationTask(BaseTask):
             for _ in range(max_trials):
                 _, goal_pos = env.scene.get_random_point(floor=self._floor)
                 if env.scene.trav_map.build_graph:
-                    _, dist = env.scene.get_shortest_path(self._floor, initial_pos[:2], goal_pos[:2], entire_path=False)
+                    # The graph is undirected, so we query from the goal to the initial position: all trials then
+                    # share the shortest path tree rooted at the initial position
+                    dist = env.scene.get_geodesic_distance(self._floor, goal_pos[:2], initial_pos[:2])
                 else:
                     dist = T.l2_distance(initial_pos, goal_pos)
                 # If a path range is specified, make sure distance is valid
@@ -255,8 +257,8 @@ class PointNavigationTask(BaseTask):
         Returns:
             float: geodesic distance to the target position
         """
-        _, geodesic_dist = self.get_shortest_path_to_goal(env=env)
-        return geodesic_dist
+        start_xy_pos = env.robots[self._robot_idn].get_position()[:2]
+        return env.scene.get_geodesic_distance(self._floor, start_xy_pos, self._goal_pos[:2])
 
     def _get_l2_potential(self, env):
         """
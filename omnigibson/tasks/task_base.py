@@ -2,10 +2,11 @@ from abc import ABCMeta, abstractmethod
 from copy import deepcopy
 import numpy as np
 from omnigibson.utils.python_utils import classproperty, Registerable
+from omnigibson.utils.lazy_import_utils import LazyRegistry
 from omnigibson.utils.gym_utils import GymObservable
 
 
-REGISTERED_TASKS = dict()
+REGISTERED_TASKS = LazyRegistry(package_name="omnigibson.tasks")
 
 
 class BaseTask(GymObservable, Registerable, metaclass=ABCMeta):
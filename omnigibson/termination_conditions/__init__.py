@@ -1,8 +1,13 @@
 from omnigibson.termination_conditions.termination_condition_base import REGISTERED_TERMINATION_CONDITIONS, \
     REGISTERED_SUCCESS_CONDITIONS, REGISTERED_FAILURE_CONDITIONS, BaseTerminationCondition
-from omnigibson.termination_conditions.falling import Falling
-from omnigibson.termination_conditions.max_collision import MaxCollision
-from omnigibson.termination_conditions.point_goal import PointGoal
-from omnigibson.termination_conditions.predicate_goal import PredicateGoal
-from omnigibson.termination_conditions.reaching_goal import ReachingGoal
-from omnigibson.termination_conditions.timeout import Timeout
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+# Termination conditions are imported upon first access, or upon first lookup of their registries
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".falling": ["Falling"],
+    ".max_collision": ["MaxCollision"],
+    ".point_goal": ["PointGoal"],
+    ".predicate_goal": ["PredicateGoal"],
+    ".reaching_goal": ["ReachingGoal"],
+    ".timeout": ["Timeout"],
+})
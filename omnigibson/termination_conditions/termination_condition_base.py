@@ -1,19 +1,18 @@
 from abc import ABCMeta, abstractmethod
 from omnigibson.utils.python_utils import classproperty, Registerable
+from omnigibson.utils.lazy_import_utils import LazyRegistry
 
-REGISTERED_TERMINATION_CONDITIONS = dict()
-REGISTERED_SUCCESS_CONDITIONS = dict()
-REGISTERED_FAILURE_CONDITIONS = dict()
+REGISTERED_TERMINATION_CONDITIONS = LazyRegistry(package_name="omnigibson.termination_conditions")
+REGISTERED_SUCCESS_CONDITIONS = LazyRegistry(package_name="omnigibson.termination_conditions")
+REGISTERED_FAILURE_CONDITIONS = LazyRegistry(package_name="omnigibson.termination_conditions")
 
 
 def register_success_condition(cls):
-    if cls.__name__ not in REGISTERED_SUCCESS_CONDITIONS:
-        REGISTERED_SUCCESS_CONDITIONS[cls.__name__] = cls
+    REGISTERED_SUCCESS_CONDITIONS.setdefault(cls.__name__, cls)
 
 
 def register_failure_condition(cls):
-    if cls.__name__ not in REGISTERED_FAILURE_CONDITIONS:
-        REGISTERED_FAILURE_CONDITIONS[cls.__name__] = cls
+    REGISTERED_FAILURE_CONDITIONS.setdefault(cls.__name__, cls)
 
 
 class BaseTerminationCondition(Registerable, metaclass=ABCMeta):
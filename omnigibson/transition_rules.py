@@ -1,247 +1,23 @@
-from abc import ABCMeta, abstractmethod
-from collections import namedtuple
 from omnigibson.systems import *
 from omnigibson.objects.dataset_object import DatasetObject
 from omnigibson.object_states import *
 import omnigibson.utils.transform_utils as T
+from omnigibson.utils.transition_rule_utils import (
+    ObjectAttrs,
+    TransitionResults,
+    BaseFilter,
+    CategoryFilter,
+    StateFilter,
+    AbilityFilter,
+    OrFilter,
+    AndFilter,
+    BaseTransitionRule,
+    GenericTransitionRule,
+    TransitionRuleEngine,
+)
 from omnigibson.utils.usd_utils import BoundingBoxAPI
 
 
-# Tuple of attributes of objects created in transitions.
-_attrs_fields = ["category", "model", "name", "scale", "obj", "pos", "orn"]
-ObjectAttrs = namedtuple(
-    "ObjectAttrs", _attrs_fields, defaults=(None,) * len(_attrs_fields))
-
-# Tuple of lists of objects to be added or removed returned from transitions.
-TransitionResults = namedtuple(
-    "TransitionResults", ["add", "remove"], defaults=([], []))
-
-
-class BaseFilter(metaclass=ABCMeta):
-    """Defines a filter to apply to objects."""
-    # Class global variable for maintaining cached state
-    # Maps tuple of unique filter inputs to cached output value (T / F)
-    state = None
-
-    @classmethod
-    def __new__(cls, *args, **kwargs):
-        """
-        Initializes the cached state for this filter if it doesn't already exist
-        """
-        if cls.state is None:
-            cls.state = dict()
-
-        return super(BaseFilter, cls).__new__(cls)
-
-    @classmethod
-    def update(cls):
-        """
-        Updates the internal state by checking the filter status on all filter inputs
-        """
-        raise NotImplementedError()
-
-    @abstractmethod
-    def __call__(self, obj):
-        """Returns true if the given object passes the filter."""
-        return False
-
-
-class CategoryFilter(BaseFilter):
-    """Filter for object categories."""
-
-    def __init__(self, category):
-        self.category = category
-
-    def __call__(self, obj):
-        return obj.category == self.category
-
-
-class StateFilter(BaseFilter):
-    """Filter for object states."""
-
-    def __init__(self, state_type, state_value):
-        self.state_type = state_type
-        self.state_value = state_value
-
-    def __call__(self, obj):
-        if self.state_type not in obj.states:
-            return False
-        return obj.states[self.state_type].get_value() == self.state_value
-
-
-class AbilityFilter(BaseFilter):
-    """Filter for object abilities."""
-
-    def __init__(self, ability):
-        self.ability = ability
-
-    def __call__(self, obj):
-        return self.ability in obj._abilities
-
-
-class OrFilter(BaseFilter):
-    """Logical-or of a set of filters."""
-
-    def __init__(self, filters):
-        self.filters = filters
-
-    def __call__(self, obj):
-        return any(f(obj) for f in self.filters)
-
-
-class AndFilter(BaseFilter):
-    """Logical-and of a set of filters."""
-
-    def __init__(self, filters):
-        self.filters = filters
-
-    def __call__(self, obj):
-        return all(f(obj) for f in self.filters)
-
-
-class BaseTransitionRule(metaclass=ABCMeta):
-    """
-    Defines a set of categories of objects and how to transition their states.
-    """
-
-    @abstractmethod
-    def __init__(self, individual_filters=None, group_filters=None):
-        """
-        TransitionRule ctor.
-
-        Args:
-            individual_filters (None or dict): Individual object filters that this filter cares about.
-                For each name, filter key-value pair, the global transition rule step will produce tuples of valid
-                filtered objects such that the cross product over all individual filter outputs occur.
-                For example, if the individual filters are:
-
-                    {"apple": CategoryFilter("apple"), "knife": CategoryFilter("knife")},
-
-                the transition rule step will produce all 2-tuples of valid (apple, knife) combinations:
-
-                    {"apple": apple_i, "knife": knife_j}
-
-                based on the current instances of each object type in the scene and pass them to @self.condition as the
-                @individual_objects entry.
-                If None is specified, then no filter will be applied
-
-            group_filters (None or dict): Group object filters that this filter cares about. For each name, filter
-                key-value pair, the global transition rule step will produce a single dictionary of valid filtered
-                objects.
-                For example, if the group filters are:
-
-                    {"apple": CategoryFilter("apple"), "knife": CategoryFilter("knife")},
-
-                the transition rule step will produce the following dictionary:
-
-                    {"apple": [apple0, apple1, ...], "knife": [knife0, knife1, ...]}
-
-                based on the current instances of each object type in the scene and pass them to @self.condition
-                as the @group_objects entry.
-                If None is specified, then no filter will be applied
-        """
-        # Make sure at least one set of filters is specified -- in general, there should never be a rule
-        # where no filter is specified
-        assert not (individual_filters is None and group_filters is None),\
-            "At least one of individual_filters or group_filters must be specified!"
-
-        # Store the filters
-        self.individual_filters = dict() if individual_filters is None else individual_filters
-        self.group_filters = dict() if group_filters is None else group_filters
-
-    def process(self, individual_objects, group_objects):
-        """
-        Processes this transition rule at the current simulator step. If @condition evaluates to True, then
-        @transition will be executed.
-
-        Args:
-            individual_objects (dict): Dictionary mapping corresponding keys from @individual_filters to individual
-                object instances where the filter is satisfied. Note: if @self.individual_filters is None or no values
-                satisfy the filter, then this will be an empty dictionary
-            group_objects (dict): Dictionary mapping corresponding keys from @group_filters to a list of individual
-                object instances where the filter is satisfied. Note: if @self.group_filters is None or no values
-                satisfy the filter, then this will be an empty dictionary
-
-        Returns:
-            2-tuple:
-                - bool: Whether @self.condition is met
-                - None or TransitionResults: Output from @self.transition (None if it was never executed)
-        """
-        should_transition = self.condition(individual_objects=individual_objects, group_objects=group_objects)
-        return should_transition, \
-            self.transition(individual_objects=individual_objects, group_objects=group_objects) \
-            if should_transition else None
-
-    @property
-    def requires_individual_filters(self):
-        """
-        Returns:
-            bool: Whether this transition rule requires any specific filters
-        """
-        return len(self.individual_filters) > 0
-
-    @property
-    def requires_group_filters(self):
-        """
-        Returns:
-            bool: Whether this transition rule requires any group filters
-        """
-        return len(self.group_filters) > 0
-
-    @abstractmethod
-    def condition(self, individual_objects, group_objects):
-        """
-        Returns True if the rule applies to the object tuple.
-
-        Args:
-            individual_objects (dict): Dictionary mapping corresponding keys from @individual_filters to individual
-                object instances where the filter is satisfied. Note: if @self.individual_filters is None or no values
-                satisfy the filter, then this will be an empty dictionary
-            group_objects (dict): Dictionary mapping corresponding keys from @group_filters to a list of individual
-                object instances where the filter is satisfied. Note: if @self.group_filters is None or no values
-                satisfy the filter, then this will be an empty dictionary
-
-        Returns:
-            bool: Whether the condition is met or not
-        """
-        pass
-
-    @abstractmethod
-    def transition(self, individual_objects, group_objects):
-        """
-        Rule to apply for each set of objects satisfying the condition.
-
-        Args:
-            individual_objects (dict): Dictionary mapping corresponding keys from @individual_filters to individual
-                object instances where the filter is satisfied. Note: if @self.individual_filters is None or no values
-                satisfy the filter, then this will be an empty dictionary
-            group_objects (dict): Dictionary mapping corresponding keys from @group_filters to a list of individual
-                object instances where the filter is satisfied. Note: if @self.group_filters is None or no values
-                satisfy the filter, then this will be an empty dictionary
-
-        Returns:
-            TransitionResults: results from the executed transition
-        """
-        pass
-
-
-class GenericTransitionRule(BaseTransitionRule):
-    """
-    A generic transition rule template used typically for simple rules.
-    """
-
-    def __init__(self, individual_filters, group_filters, condition_fn, transition_fn):
-        super(GenericTransitionRule, self).__init__(individual_filters, group_filters)
-        self.condition_fn = condition_fn
-        self.transition_fn = transition_fn
-
-    def condition(self, individual_objects, group_objects):
-        return self.condition_fn(individual_objects, group_objects)
-
-    def transition(self, individual_objects, group_objects):
-        return self.transition_fn(individual_objects, group_objects)
-
-
 class SlicingRule(BaseTransitionRule):
     """
     Transition rule to apply to sliced / slicer object pairs.
@@ -254,6 +30,22 @@ class SlicingRule(BaseTransitionRule):
         # Run super
         super().__init__(individual_filters=individual_filters)
 
+    def get_candidate_tuples(self, individual_candidates):
+        # Only sliceable objects in contact with a slicer can ever be sliced, so instead of pairing every slicer with
+        # every sliceable object, we only pair each slicer with the sliceable objects it currently touches
+        link_to_idx = None
+        sliceable_objs = individual_candidates["sliceable"]
+        for slicer_obj in individual_candidates["slicer"]:
+            if slicer_obj.states[Slicer].get_link_position() is None:
+                continue
+            contact_list = slicer_obj.states[ContactBodies].get_value()
+            if len(contact_list) == 0:
+                continue
+            if link_to_idx is None:
+                link_to_idx = {link: i for i, obj in enumerate(sliceable_objs) for link in obj.links.values()}
+            for i in sorted({link_to_idx[link] for link in contact_list if link in link_to_idx}):
+                yield {"sliceable": sliceable_objs[i], "slicer": slicer_obj}
+
     def condition(self, individual_objects, group_objects):
         slicer_obj, sliced_obj = individual_objects["slicer"], individual_objects["sliceable"]
         slicer_position = slicer_obj.states[Slicer].get_link_position()
@@ -516,6 +308,13 @@ class BlenderRule(BaseTransitionRule):
         # Call super method
         super().__init__(individual_filters=individual_filters, group_filters=group_filters)
 
+    def get_candidate_tuples(self, individual_candidates):
+        # Blending requires all of the required fluids to exist, independently of the blender, so no blender needs to
+        # be processed until then
+        if any(len(system.particle_instancers) == 0 for system in self.particle_requirements.keys()):
+            return
+        yield from super().get_candidate_tuples(individual_candidates)
+
     def condition(self, individual_objects, group_objects):
         # TODO: Check blender if both toggled on and lid is closed!
 
@@ -573,6 +372,7 @@ class BlenderRule(BaseTransitionRule):
         return t_results
 
 
+
 """See the following example for writing simple rules.
 
   GenericTransitionRule(
@@ -0,0 +1,348 @@
+"""
+Content-addressed, on-disk cache of decrypted assets, so that each encrypted asset is only decrypted once across
+object instances, environment resets and processes. Entries are keyed by the hash of the encrypted file and the
+fingerprint of the key it is decrypted with, and the least recently used entries are evicted once the cache exceeds
+its size limit. Entries are written atomically (temporary file + rename) under per-entry file locks, so that multiple
+processes can safely share the same cache directory.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from omnigibson.macros import create_module_macros
+
+try:
+    import fcntl
+except ImportError:
+    # No file locks (e.g.: on Windows) -- entries are still written atomically, but concurrent misses of the same entry
+    # may all decrypt it
+    fcntl = None
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether DatasetObjects load encrypted assets through the decrypted asset cache, instead of decrypting them into a
+# fresh temporary file every time. Opt-in (e.g.: OMNIGIBSON_ASSET_CACHE=1), since decrypted assets then persist on disk
+m.ENABLED = os.getenv("OMNIGIBSON_ASSET_CACHE", "False").lower() in {"true", "1", "t"}
+
+# Directory holding the cache. Created with owner-only permissions
+m.CACHE_DIR = os.getenv(
+    "OMNIGIBSON_ASSET_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "omnigibson", "decrypted_assets"))
+
+# Max total size of the cached entries, in bytes, beyond which the least recently used entries are evicted
+m.MAX_SIZE = 4 * 1024 ** 3
+
+# Entries used within this many seconds are never evicted, so that they are not deleted while being loaded
+m.EVICTION_GRACE_PERIOD = 60.0
+
+# Chunk size for hashing encrypted files, in bytes
+m.HASH_CHUNK_SIZE = 1024 ** 2
+
+# Version of the cache format, included in all entry keys. Bump this whenever the cached contents change
+m.CACHE_VERSION = 1
+
+_LOCK_DIR = "locks"
+_TMP_PREFIX = ".tmp-"
+
+
+def fernet_decrypt(encrypted, key):
+    """
+    Args:
+        encrypted (bytes): Fernet-encrypted contents
+        key (bytes): Fernet key
+
+    Returns:
+        bytes: Decrypted contents
+    """
+    from cryptography.fernet import Fernet
+    return Fernet(key).decrypt(encrypted)
+
+
+def get_key_fingerprint(key):
+    """
+    Args:
+        key (bytes): Encryption key
+
+    Returns:
+        str: Fingerprint identifying @key, without revealing it
+    """
+    return hashlib.sha256(b"omnigibson-asset-key:" + key).hexdigest()[:16]
+
+
+class DecryptedAssetCache:
+    """
+    On-disk LRU cache of decrypted assets, shared by all processes using the same cache directory
+    """
+
+    def __init__(self, cache_dir=None, max_size=None, decrypt_fn=fernet_decrypt):
+        """
+        Args:
+            cache_dir (None or str): Directory holding the cache. Default is m.CACHE_DIR
+            max_size (None or int): Max total size of the cached entries, in bytes. Default is m.MAX_SIZE
+            decrypt_fn (function): Function decrypting the contents of an encrypted file, called as
+                decrypt_fn(encrypted, key) and returning the decrypted bytes
+        """
+        self.cache_dir = os.path.abspath(os.path.expanduser(m.CACHE_DIR if cache_dir is None else cache_dir))
+        self.max_size = m.MAX_SIZE if max_size is None else max_size
+        self.decrypt_fn = decrypt_fn
+
+        # Digests of encrypted files, memoized by their path, stat and key fingerprint so that they are only hashed
+        # once per process unless modified
+        self._digests = dict()
+        self._keys = dict()
+        # Only guards the counters -- concurrent lookups of the same entry are serialized by its file lock, so that
+        # distinct entries can be decrypted in parallel by multiple threads
+        self._lock = threading.Lock()
+        self._ensure_dir(self.cache_dir)
+        self._ensure_dir(os.path.join(self.cache_dir, _LOCK_DIR))
+        self.reset_stats()
+
+    @staticmethod
+    def _ensure_dir(path):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        stat = os.stat(path)
+        if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+            raise PermissionError(f"Asset cache directory {path} is not owned by the current user!")
+        if stat.st_mode & 0o077:
+            # Decrypted assets must not be readable by other users
+            os.chmod(path, 0o700)
+
+    def reset_stats(self):
+        """
+        Resets the hit / miss / byte counters of this cache
+        """
+        self._stats = dict(hits=0, misses=0, bytes_read=0, bytes_decrypted=0, evictions=0, bytes_evicted=0,
+                           hash_time=0.0, decrypt_time=0.0)
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict: Counters of this cache (within the current process):
+                - hits / misses: No. of lookups served from / added to the cache
+                - bytes_read: Total size of the entries served from the cache
+                - bytes_decrypted: Total size of the entries decrypted and added to the cache
+                - evictions / bytes_evicted: No. and total size of evicted entries
+                - hash_time / decrypt_time: Total time spent hashing encrypted files and decrypting them, in seconds
+                - hit_rate: Fraction of lookups served from the cache
+        """
+        n_lookups = self._stats["hits"] + self._stats["misses"]
+        return dict(self._stats, hit_rate=self._stats["hits"] / n_lookups if n_lookups > 0 else 0.0)
+
+    def _read_key(self, key_path):
+        stat = os.stat(key_path)
+        cache_key = (key_path, stat.st_mtime_ns, stat.st_size)
+        key = self._keys.get(cache_key, None)
+        if key is None:
+            with open(key_path, "rb") as f:
+                key = f.read()
+            self._keys[cache_key] = key
+        return key
+
+    def get_digest(self, encrypted_path, key):
+        """
+        Args:
+            encrypted_path (str): Path to the encrypted file
+            key (bytes): Key @encrypted_path is decrypted with
+
+        Returns:
+            str: Content-addressed key of the decrypted @encrypted_path, i.e.: the hash of its encrypted contents and
+                the fingerprint of @key
+        """
+        stat = os.stat(encrypted_path)
+        fingerprint = get_key_fingerprint(key)
+        memo_key = (os.path.realpath(encrypted_path), stat.st_ino, stat.st_size, stat.st_mtime_ns, fingerprint)
+        digest = self._digests.get(memo_key, None)
+        if digest is None:
+            start = time.perf_counter()
+            hasher = hashlib.sha256(f"v{m.CACHE_VERSION}:{fingerprint}:".encode())
+            with open(encrypted_path, "rb") as f:
+                for chunk in iter(lambda: f.read(m.HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._digests[memo_key] = digest
+            with self._lock:
+                self._stats["hash_time"] += time.perf_counter() - start
+        return digest
+
+    def get_entry_path(self, digest, suffix=""):
+        """
+        Args:
+            digest (str): Key of the entry, see get_digest()
+            suffix (str): File extension of the entry, e.g.: ".usd"
+
+        Returns:
+            str: Path to the (possibly not yet cached) decrypted entry
+        """
+        return os.path.join(self.cache_dir, f"{digest}{suffix}")
+
+    @contextmanager
+    def _file_lock(self, name):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, _LOCK_DIR, f"{name}.lock"), "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _hit(self, path):
+        # Refresh the entry's modification time, which orders entries for LRU eviction
+        try:
+            os.utime(path)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime
+            return False
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["bytes_read"] += size
+        return True
+
+    def get(self, encrypted_path, key=None, key_path=None, suffix=None):
+        """
+        Looks up the decrypted contents of @encrypted_path, decrypting and caching them upon a miss
+
+        Args:
+            encrypted_path (str): Path to the encrypted file
+            key (None or bytes): Key to decrypt @encrypted_path with. Either this or @key_path must be specified
+            key_path (None or str): Path to the file holding the key to decrypt @encrypted_path with
+            suffix (None or str): File extension of the decrypted file. Default is the extension of @encrypted_path,
+                e.g.: ".usd"
+
+        Returns:
+            str: Path to the decrypted file within the cache. It should be treated as read-only, and is guaranteed
+                not to be evicted for m.EVICTION_GRACE_PERIOD seconds
+        """
+        assert (key is None) != (key_path is None), "Exactly one of key or key_path must be specified!"
+        key = self._read_key(key_path) if key is None else key
+        suffix = os.path.splitext(encrypted_path)[1] if suffix is None else suffix
+        digest = self.get_digest(encrypted_path, key)
+        path = self.get_entry_path(digest, suffix=suffix)
+        if os.path.exists(path) and self._hit(path):
+            return path
+
+        with self._file_lock(digest):
+            # Another process or thread may have added the entry while we were waiting for the lock
+            if os.path.exists(path) and self._hit(path):
+                return path
+            start = time.perf_counter()
+            with open(encrypted_path, "rb") as f:
+                decrypted = self.decrypt_fn(f.read(), key)
+            self._write_atomic(path, decrypted)
+            with self._lock:
+                self._stats["decrypt_time"] += time.perf_counter() - start
+                self._stats["misses"] += 1
+                self._stats["bytes_decrypted"] += len(decrypted)
+
+        if self.max_size is not None and self.size > self.max_size:
+            self.evict(protected={path})
+        return path
+
+    def _write_atomic(self, path, contents):
+        # mkstemp creates the file with owner-only permissions
+        fd, tmp_path = tempfile.mkstemp(prefix=_TMP_PREFIX, dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(contents)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _list_entries(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(_TMP_PREFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    @property
+    def size(self):
+        """
+        Returns:
+            int: Total size of all cached entries, in bytes
+        """
+        return sum(size for _, size, _ in self._list_entries())
+
+    @property
+    def n_entries(self):
+        """
+        Returns:
+            int: No. of cached entries
+        """
+        return len(self._list_entries())
+
+    def evict(self, max_size=None, protected=None, grace_period=None):
+        """
+        Evicts the least recently used entries until the cache fits within @max_size
+
+        Args:
+            max_size (None or int): Max total size of the cached entries after eviction, in bytes. Default is the
+                size limit of this cache
+            protected (None or set of str): Paths of entries that should not be evicted
+            grace_period (None or float): Entries used within this many seconds are not evicted. Default is
+                m.EVICTION_GRACE_PERIOD
+
+        Returns:
+            int: Total size of the evicted entries, in bytes
+        """
+        max_size = self.max_size if max_size is None else max_size
+        grace_period = m.EVICTION_GRACE_PERIOD if grace_period is None else grace_period
+        protected = set() if protected is None else protected
+        evicted = 0
+        with self._file_lock("evict"):
+            entries = sorted(self._list_entries())
+            total = sum(size for _, size, _ in entries)
+            now = time.time()
+            for mtime, size, path in entries:
+                if total <= max_size:
+                    break
+                if path in protected or now - mtime < grace_period:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                total -= size
+                evicted += size
+                with self._lock:
+                    self._stats["evictions"] += 1
+                    self._stats["bytes_evicted"] += size
+        if total > max_size:
+            logging.warning(f"Decrypted asset cache holds {total} bytes after eviction, over its limit of {max_size} "
+                            f"bytes, since its remaining entries were recently used.")
+        return evicted
+
+    def clear(self):
+        """
+        Removes all cached entries
+        """
+        self.evict(max_size=0, grace_period=0.0)
+
+
+_CACHE = None
+
+
+def get_decrypted_asset_cache():
+    """
+    Returns:
+        DecryptedAssetCache: Global decrypted asset cache at m.CACHE_DIR, created upon first call
+    """
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = DecryptedAssetCache()
+    return _CACHE
@@ -1,5 +1,4 @@
 import argparse
-import json
 import logging
 import os
 import subprocess
@@ -10,6 +9,7 @@ from collections import defaultdict
 import yaml
 
 import omnigibson as og
+from omnigibson.utils.dataset_index_utils import clear_dataset_indices, get_dataset_index
 
 if os.name == "nt":
     import win32api
@@ -37,10 +37,9 @@ def get_og_avg_category_specs():
     Returns:
         dict: Average category specifications for all object categories
     """
-    avg_obj_dim_file = os.path.join(og.og_dataset_path, "metadata", "avg_category_specs.json")
-    if os.path.exists(avg_obj_dim_file):
-        with open(avg_obj_dim_file) as f:
-            return json.load(f)
+    avg_category_specs = get_dataset_index().avg_category_specs
+    if avg_category_specs is not None:
+        return dict(avg_category_specs)
     else:
         logging.warning(
             "Requested average specs of the object categories in the OmniGibson Dataset of objects, but the "
@@ -72,12 +71,10 @@ def get_og_category_ids():
     Returns:
         str: file path to the scene name
     """
-    og_dataset_path = og.og_dataset_path
-    og_categories_files = os.path.join(og_dataset_path, "metadata", "categories.txt")
-    name_to_id = {}
-    with open(og_categories_files, "r") as fp:
-        for i, l in enumerate(fp.readlines()):
-            name_to_id[l.rstrip()] = i
+    category_ids = get_dataset_index().category_ids
+    if category_ids is None:
+        raise FileNotFoundError(os.path.join(og.og_dataset_path, "metadata", "categories.txt"))
+    name_to_id = {name: i for i, name in enumerate(category_ids)}
     return defaultdict(lambda: 255, name_to_id)
 
 
@@ -123,10 +120,7 @@ def get_og_category_path(category_name):
     Returns:
         str: file path to the object category
     """
-    og_dataset_path = og.og_dataset_path
-    og_categories_path = os.path.join(og_dataset_path, "objects")
-    assert category_name in os.listdir(og_categories_path), "Category {} does not exist".format(category_name)
-    return os.path.join(og_categories_path, category_name)
+    return get_dataset_index().get_category_path(category_name)
 
 
 def get_og_model_path(category_name, model_name):
@@ -140,43 +134,34 @@ def get_og_model_path(category_name, model_name):
     Returns:
         str: file path to the object model
     """
-    og_category_path = get_og_category_path(category_name)
-    assert model_name in os.listdir(og_category_path), "Model {} from category {} does not exist".format(
-        model_name, category_name
-    )
-    return os.path.join(og_category_path, model_name)
+    get_og_category_path(category_name)
+    return get_dataset_index().get_model_path(category_name, model_name)
 
 
 def get_object_models_of_category(category_name, filter_method=None):
     """
     Get OmniGibson all object models of a given category
 
-    # TODO: Make this less ugly -- filter_method is a single hard-coded check
-
     Args:
         category_name (str): object category
-        filter_method (str): Method to use for filtering object models
+        filter_method (str): Method to use for filtering object models. Valid options are:
+            None: all models of the category
+            "sliceable_part": only models without object parts, i.e.: the parts of sliced objects
+            "sliceable_whole": only models with object parts, i.e.: whole sliceable objects
 
     Returns:
         list: all object models of a given category
     """
-    models = []
-    og_category_path = get_og_category_path(category_name)
-    for model_name in os.listdir(og_category_path):
-        if filter_method is None:
-            models.append(model_name)
-        elif filter_method in ["sliceable_part", "sliceable_whole"]:
-            model_path = get_og_model_path(category_name, model_name)
-            metadata_json = os.path.join(model_path, "misc", "metadata.json")
-            with open(metadata_json) as f:
-                metadata = json.load(f)
-            if (filter_method == "sliceable_part" and "object_parts" not in metadata) or (
-                filter_method == "sliceable_whole" and "object_parts" in metadata
-            ):
-                models.append(model_name)
-        else:
-            raise Exception("Unknown filter method: {}".format(filter_method))
-    return models
+    index = get_dataset_index()
+    get_og_category_path(category_name)
+    if filter_method is None:
+        return index.get_models(category_name)
+    elif filter_method == "sliceable_part":
+        return [model for _, model in index.find_models(categories=category_name, lacks_fields=["object_parts"])]
+    elif filter_method == "sliceable_whole":
+        return [model for _, model in index.find_models(categories=category_name, has_fields=["object_parts"])]
+    else:
+        raise Exception("Unknown filter method: {}".format(filter_method))
 
 
 def get_all_object_categories():
@@ -186,11 +171,7 @@ def get_all_object_categories():
     Returns:
         list: all object categories
     """
-    og_dataset_path = og.og_dataset_path
-    og_categories_path = os.path.join(og_dataset_path, "objects")
-
-    categories = sorted([f for f in os.listdir(og_categories_path) if not folder_is_hidden(f)])
-    return categories
+    return get_dataset_index().categories
 
 
 def get_all_object_models():
@@ -200,19 +181,8 @@ def get_all_object_models():
     Returns:
         list: all object model paths
     """
-    og_dataset_path = og.og_dataset_path
-    og_categories_path = os.path.join(og_dataset_path, "objects")
-
-    categories = os.listdir(og_categories_path)
-    categories = [item for item in categories if os.path.isdir(os.path.join(og_categories_path, item))]
-    models = []
-    for category in categories:
-        category_models = os.listdir(os.path.join(og_categories_path, category))
-        category_models = [
-            item for item in category_models if os.path.isdir(os.path.join(og_categories_path, category, item))
-        ]
-        models.extend([os.path.join(og_categories_path, category, item) for item in category_models])
-    return models
+    index = get_dataset_index()
+    return [index.get_model_path(category, model) for category, model in index.find_models()]
 
 
 def get_og_assets_version():
@@ -352,6 +322,8 @@ def download_og_dataset():
         assert subprocess.call(["wget", "-c", "--no-check-certificate", "--retry-connrefused", "--tries=5", "--timeout=5", path, "-O", tmp_file]) == 0, "Dataset download failed."
         assert subprocess.call(["tar", "-zxf", tmp_file, "--strip-components=1", "--directory", og.og_dataset_path]) == 0, "Dataset extraction failed."
         # These datasets come as folders; in these folder there are scenes, so --strip-components are needed.
+        # Any dataset index built before the download is outdated
+        clear_dataset_indices()
 
 
 def change_data_path():
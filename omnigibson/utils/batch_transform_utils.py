@@ -0,0 +1,761 @@
+"""
+Batched counterparts of the functions in omnigibson.utils.transform_utils.
+
+Every function here accepts arbitrary leading batch dimensions, e.g.: quaternions of shape (..., 4), positions of shape
+(..., 3) and rotation matrices of shape (..., 3, 3), and broadcasts across them following numpy's rules. Pose
+composition is computed directly on (position, quaternion) pairs without going through intermediate 4x4 matrices or
+scipy Rotation objects. Outputs are float64 unless stated otherwise.
+
+If numba is installed, the hottest kernels (quaternion multiplication, vector rotation and pose composition) are JIT
+compiled; otherwise, the pure-numpy implementations are used. This can be toggled at runtime via macros
+utils.batch_transform_utils.ENABLE_NUMBA.
+
+NOTE: convention for quaternions is (x, y, z, w)
+"""
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether to use numba-compiled kernels when numba is available
+m.ENABLE_NUMBA = True
+
+# Minimum (flattened) batch size for which the numba kernels are used. Smaller batches are dominated by dispatch overhead
+m.NUMBA_MIN_BATCH_SIZE = 64
+
+EPS = np.finfo(float).eps * 4.0
+
+
+def _as_float(arr):
+    return np.asarray(arr, dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Numpy kernels. These operate on arrays with arbitrary (broadcastable) leading dimensions.
+
+def _quat_multiply_np(q1, q0):
+    x0, y0, z0, w0 = np.moveaxis(q0, -1, 0)
+    x1, y1, z1, w1 = np.moveaxis(q1, -1, 0)
+    return np.stack(
+        (
+            x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0,
+            -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0,
+            x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0,
+            -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0,
+        ),
+        axis=-1,
+    )
+
+
+def _quat_apply_np(quat, vec):
+    # v' = v + 2w (u x v) + 2 u x (u x v), where q = (u, w)
+    u, w = quat[..., :3], quat[..., 3:]
+    uv = np.cross(u, vec)
+    return vec + 2.0 * (w * uv + np.cross(u, uv))
+
+
+def _pose_transform_np(pos1, quat1, pos0, quat0):
+    return pos1 + _quat_apply_np(quat1, pos0), _quat_multiply_np(quat1, quat0)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Numba kernels. These operate on flattened, contiguous (N, k) arrays.
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=False)
+    def _quat_multiply_nb(q1, q0):
+        out = np.empty_like(q0)
+        for i in range(q0.shape[0]):
+            x0, y0, z0, w0 = q0[i, 0], q0[i, 1], q0[i, 2], q0[i, 3]
+            x1, y1, z1, w1 = q1[i, 0], q1[i, 1], q1[i, 2], q1[i, 3]
+            out[i, 0] = x1 * w0 + y1 * z0 - z1 * y0 + w1 * x0
+            out[i, 1] = -x1 * z0 + y1 * w0 + z1 * x0 + w1 * y0
+            out[i, 2] = x1 * y0 - y1 * x0 + z1 * w0 + w1 * z0
+            out[i, 3] = -x1 * x0 - y1 * y0 - z1 * z0 + w1 * w0
+        return out
+
+    @numba.njit(cache=True, fastmath=False)
+    def _quat_apply_nb(quat, vec):
+        out = np.empty_like(vec)
+        for i in range(vec.shape[0]):
+            ux, uy, uz, w = quat[i, 0], quat[i, 1], quat[i, 2], quat[i, 3]
+            vx, vy, vz = vec[i, 0], vec[i, 1], vec[i, 2]
+            # uv = u x v
+            uvx = uy * vz - uz * vy
+            uvy = uz * vx - ux * vz
+            uvz = ux * vy - uy * vx
+            # uuv = u x uv
+            uuvx = uy * uvz - uz * uvy
+            uuvy = uz * uvx - ux * uvz
+            uuvz = ux * uvy - uy * uvx
+            out[i, 0] = vx + 2.0 * (w * uvx + uuvx)
+            out[i, 1] = vy + 2.0 * (w * uvy + uuvy)
+            out[i, 2] = vz + 2.0 * (w * uvz + uuvz)
+        return out
+
+    @numba.njit(cache=True, fastmath=False)
+    def _pose_transform_nb(pos1, quat1, pos0, quat0):
+        return pos1 + _quat_apply_nb(quat1, pos0), _quat_multiply_nb(quat1, quat0)
+
+
+def numba_enabled():
+    """
+    Returns:
+        bool: Whether numba-compiled kernels are available and enabled
+    """
+    return numba is not None and m.ENABLE_NUMBA
+
+
+def _dispatch(np_kernel, nb_kernel_name, arrays, trailing_dims):
+    """
+    Runs either the numpy or numba version of a kernel on @arrays, broadcasting their leading dimensions
+
+    Args:
+        np_kernel (function): Numpy kernel operating on broadcastable arrays
+        nb_kernel_name (str): Name of the corresponding numba kernel operating on flattened (N, k) arrays
+        arrays (list of array): Input arrays
+        trailing_dims (list of int): Size of the trailing (non-batch) dimension of each array in @arrays
+
+    Returns:
+        array or tuple of array: Output(s) of the kernel
+    """
+    arrays = [_as_float(arr) for arr in arrays]
+    batch_shape = np.broadcast_shapes(*(arr.shape[:-1] for arr in arrays))
+    n = int(np.prod(batch_shape))
+    if not numba_enabled() or n < m.NUMBA_MIN_BATCH_SIZE:
+        return np_kernel(*arrays)
+    flat = [np.ascontiguousarray(np.broadcast_to(arr, batch_shape + (dim,)).reshape(n, dim))
+            for arr, dim in zip(arrays, trailing_dims)]
+    out = globals()[nb_kernel_name](*flat)
+    if isinstance(out, tuple):
+        return tuple(o.reshape(batch_shape + o.shape[-1:]) for o in out)
+    return out.reshape(batch_shape + out.shape[-1:])
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Public API
+
+def convert_quat(q, to="xyzw"):
+    """
+    Converts quaternion from one convention to another.
+    The convention to convert TO is specified as an optional argument.
+    If to == 'xyzw', then the input is in 'wxyz' format, and vice-versa.
+
+    Args:
+        q (np.array): (..., 4) quaternions
+        to (str): either 'xyzw' or 'wxyz', determining which convention to convert to.
+
+    Returns:
+        np.array: (..., 4) converted quaternions
+    """
+    q = np.asarray(q)
+    if to == "xyzw":
+        return q[..., [1, 2, 3, 0]]
+    if to == "wxyz":
+        return q[..., [3, 0, 1, 2]]
+    raise Exception("convert_quat: choose a valid `to` argument (xyzw or wxyz)")
+
+
+def quat_multiply(quaternion1, quaternion0):
+    """
+    Return multiplication of two batches of quaternions (q1 * q0).
+
+    Args:
+        quaternion1 (np.array): (..., 4) (x,y,z,w) quaternions
+        quaternion0 (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) multiplied quaternions
+    """
+    return _dispatch(_quat_multiply_np, "_quat_multiply_nb", (quaternion1, quaternion0), (4, 4))
+
+
+def quat_conjugate(quaternion):
+    """
+    Return conjugate of quaternions.
+
+    Args:
+        quaternion (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternion conjugates
+    """
+    conj = _as_float(quaternion).copy()
+    conj[..., :3] *= -1.0
+    return conj
+
+
+def quat_inverse(quaternion):
+    """
+    Return inverse of quaternions.
+
+    Args:
+        quaternion (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternion inverses
+    """
+    quaternion = _as_float(quaternion)
+    return quat_conjugate(quaternion) / np.sum(quaternion * quaternion, axis=-1, keepdims=True)
+
+
+def quat_distance(quaternion1, quaternion0):
+    """
+    Returns distance between two batches of quaternions, such that distance * quaternion0 = quaternion1
+
+    Args:
+        quaternion1 (np.array): (..., 4) (x,y,z,w) quaternions
+        quaternion0 (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternion distances
+    """
+    return quat_multiply(quaternion1, quat_inverse(quaternion0))
+
+
+def quat_apply(quaternion, vec):
+    """
+    Rotates vectors @vec by quaternions @quaternion.
+
+    Args:
+        quaternion (np.array): (..., 4) (x,y,z,w) unit quaternions
+        vec (np.array): (..., 3) (x,y,z) vectors to rotate
+
+    Returns:
+        np.array: (..., 3) rotated vectors
+    """
+    return _dispatch(_quat_apply_np, "_quat_apply_nb", (quaternion, vec), (4, 3))
+
+
+def quat_slerp(quat0, quat1, fraction, shortestpath=True):
+    """
+    Return spherical linear interpolation between two batches of quaternions. Matches
+    transform_utils.quat_slerp for each element of the batch.
+
+    Args:
+        quat0 (np.array): (..., 4) (x,y,z,w) quaternion startpoints
+        quat1 (np.array): (..., 4) (x,y,z,w) quaternion endpoints
+        fraction (float or np.array): fraction(s) of interpolation to calculate, broadcastable to the batch shape
+        shortestpath (bool): If True, will calculate the shortest path
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) interpolated quaternions
+    """
+    q0 = unit_vector(quat0)
+    q1 = unit_vector(quat1)
+    q0, q1 = np.broadcast_arrays(q0, q1)
+    q1_orig = q1
+    fraction = np.broadcast_to(_as_float(fraction), q0.shape[:-1])[..., None]
+    d = np.sum(q0 * q1, axis=-1, keepdims=True)
+    if shortestpath:
+        # invert rotation
+        flip = d < 0.0
+        d = np.where(flip, -d, d)
+        q1 = np.where(flip, -q1, q1)
+    angle = np.arccos(np.clip(d, -1, 1))
+    # Degenerate cases fall back to q0, as in transform_utils.quat_slerp
+    degenerate = (np.abs(np.abs(d) - 1.0) < EPS) | (np.abs(angle) < EPS)
+    isin = 1.0 / np.where(degenerate, 1.0, np.sin(angle))
+    out = q0 * np.sin((1.0 - fraction) * angle) * isin + q1 * np.sin(fraction * angle) * isin
+    out = np.where(degenerate, q0, out)
+    out = np.where(fraction == 0.0, q0, out)
+    out = np.where(fraction == 1.0, q1_orig, out)
+    return out
+
+
+def random_quat(rand=None, shape=()):
+    """
+    Return uniform random unit quaternions.
+
+    Args:
+        rand (None or np.array): If specified, (..., 3) independent random variables that are uniformly distributed
+            between 0 and 1, one triplet per quaternion
+        shape (tuple): Batch shape of the quaternions to sample. Only used if @rand is None
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) random quaternions
+    """
+    rand = np.random.rand(*shape, 3) if rand is None else _as_float(rand)
+    assert rand.shape[-1] == 3
+    r1 = np.sqrt(1.0 - rand[..., 0])
+    r2 = np.sqrt(rand[..., 0])
+    t1 = 2.0 * np.pi * rand[..., 1]
+    t2 = 2.0 * np.pi * rand[..., 2]
+    return np.stack((np.sin(t1) * r1, np.cos(t1) * r1, np.sin(t2) * r2, np.cos(t2) * r2), axis=-1)
+
+
+def quat2mat(quaternion):
+    """
+    Converts given quaternions to rotation matrices.
+
+    Args:
+        quaternion (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 3, 3) rotation matrices
+    """
+    q = unit_vector(quaternion)
+    x, y, z, w = np.moveaxis(q, -1, 0)
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    mat = np.stack(
+        (
+            1.0 - 2.0 * (yy + zz), 2.0 * (xy - wz), 2.0 * (xz + wy),
+            2.0 * (xy + wz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz - wx),
+            2.0 * (xz - wy), 2.0 * (yz + wx), 1.0 - 2.0 * (xx + yy),
+        ),
+        axis=-1,
+    )
+    return mat.reshape(mat.shape[:-1] + (3, 3))
+
+
+def mat2quat(rmat):
+    """
+    Converts given rotation matrices to quaternions. Uses the same branch selection as scipy's Rotation.from_matrix,
+    so results are consistent with transform_utils.mat2quat.
+
+    Args:
+        rmat (np.array): (..., 3, 3) rotation matrices. (..., 4, 4) homogeneous matrices are also accepted
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternions
+    """
+    M = _as_float(rmat)[..., :3, :3]
+    batch_shape = M.shape[:-2]
+    M = M.reshape(-1, 3, 3)
+    n = len(M)
+    diag = np.diagonal(M, axis1=-2, axis2=-1)
+    trace = diag.sum(axis=-1)
+    choice = np.argmax(np.concatenate([diag, trace[:, None]], axis=-1), axis=-1)
+    quat = np.empty((n, 4))
+
+    # Case where the trace is largest
+    t = choice == 3
+    quat[t, 0] = M[t, 2, 1] - M[t, 1, 2]
+    quat[t, 1] = M[t, 0, 2] - M[t, 2, 0]
+    quat[t, 2] = M[t, 1, 0] - M[t, 0, 1]
+    quat[t, 3] = 1.0 + trace[t]
+
+    # Cases where one of the diagonal elements is largest
+    for i in range(3):
+        j, k = (i + 1) % 3, (i + 2) % 3
+        c = choice == i
+        quat[c, i] = 1.0 - trace[c] + 2.0 * M[c, i, i]
+        quat[c, j] = M[c, j, i] + M[c, i, j]
+        quat[c, k] = M[c, k, i] + M[c, i, k]
+        quat[c, 3] = M[c, k, j] - M[c, j, k]
+
+    quat /= np.linalg.norm(quat, axis=-1, keepdims=True)
+    return quat.reshape(batch_shape + (4,))
+
+
+def vec2quat(vec, up=(0, 0, 1.0)):
+    """
+    Converts 3d-direction vectors @vec to quaternion orientations with respect to direction vectors @up
+
+    Args:
+        vec (np.array): (..., 3) (x,y,z) direction vectors (possibly non-normalized)
+        up (np.array): (..., 3) (x,y,z) direction vectors representing the canonical up direction (possibly
+            non-normalized)
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternions
+    """
+    # Take cross product of @up and @vec to get @s_n, and then cross @vec and @s_n to get @u_n
+    # Then compose the 3x3 rotation matrices with columns (vec_n, s_n, u_n) and convert into quaternions. Unlike
+    # transform_utils.vec2quat, @s_n is normalized, so that the matrices are rotations even if @vec and @up are not
+    # orthogonal
+    vec_n = unit_vector(vec)
+    up_n = unit_vector(up)
+    s_n = unit_vector(np.cross(up_n, vec_n))
+    u_n = np.cross(vec_n, s_n)
+    vec_n, s_n, u_n = np.broadcast_arrays(vec_n, s_n, u_n)
+    return mat2quat(np.stack((vec_n, s_n, u_n), axis=-1))
+
+
+def pose2mat(pos, quat):
+    """
+    Converts poses to homogeneous matrices.
+
+    Args:
+        pos (np.array): (..., 3) (x,y,z) positions
+        quat (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 4, 4) homogeneous matrices
+    """
+    rot = quat2mat(quat)
+    pos = _as_float(pos)
+    batch_shape = np.broadcast_shapes(rot.shape[:-2], pos.shape[:-1])
+    mat = np.zeros(batch_shape + (4, 4))
+    mat[..., :3, :3] = rot
+    mat[..., :3, 3] = pos
+    mat[..., 3, 3] = 1.0
+    return mat
+
+
+def mat2pose(hmat):
+    """
+    Converts homogeneous 4x4 matrices into poses.
+
+    Args:
+        hmat (np.array): (..., 4, 4) homogeneous matrices
+
+    Returns:
+        2-tuple:
+            - (np.array) (..., 3) (x,y,z) positions
+            - (np.array) (..., 4) (x,y,z,w) quaternions
+    """
+    hmat = _as_float(hmat)
+    return hmat[..., :3, 3].copy(), mat2quat(hmat[..., :3, :3])
+
+
+def make_pose(translation, rotation):
+    """
+    Makes homogeneous pose matrices from translation vectors and rotation matrices.
+
+    Args:
+        translation (np.array): (..., 3) (x,y,z) translations
+        rotation (np.array): (..., 3, 3) rotation matrices
+
+    Returns:
+        np.array: (..., 4, 4) homogeneous matrices
+    """
+    translation, rotation = _as_float(translation), _as_float(rotation)
+    batch_shape = np.broadcast_shapes(translation.shape[:-1], rotation.shape[:-2])
+    pose = np.zeros(batch_shape + (4, 4))
+    pose[..., :3, :3] = rotation
+    pose[..., :3, 3] = translation
+    pose[..., 3, 3] = 1.0
+    return pose
+
+
+def pose_inv(pos, quat):
+    """
+    Computes the inverse of poses (pos, quat) corresponding to frame B in frame A, i.e.: returns the poses of
+    frame A in frame B.
+
+    Args:
+        pos (np.array): (..., 3) (x,y,z) positions
+        quat (np.array): (..., 4) (x,y,z,w) unit quaternions
+
+    Returns:
+        2-tuple:
+            - (np.array) (..., 3) (x,y,z) inverted positions
+            - (np.array) (..., 4) (x,y,z,w) inverted quaternions
+    """
+    quat_inv = quat_conjugate(quat)
+    return -quat_apply(quat_inv, pos), quat_inv
+
+
+def pose_transform(pos1, quat1, pos0, quat0):
+    """
+    Conducts forward transform from poses (pos0, quat0) to poses (pos1, quat1):
+
+    pose1 @ pose0, NOT pose0 @ pose1
+
+    Args:
+        pos1 (np.array): (..., 3) (x,y,z) positions to transform
+        quat1 (np.array): (..., 4) (x,y,z,w) unit quaternions to transform
+        pos0 (np.array): (..., 3) (x,y,z) initial positions
+        quat0 (np.array): (..., 4) (x,y,z,w) initial unit quaternions
+
+    Returns:
+        2-tuple:
+            - (np.array) (..., 3) (x,y,z) composed positions
+            - (np.array) (..., 4) (x,y,z,w) composed quaternions
+    """
+    return _dispatch(_pose_transform_np, "_pose_transform_nb", (pos1, quat1, pos0, quat0), (3, 4, 3, 4))
+
+
+def relative_pose_transform(pos1, quat1, pos0, quat0):
+    """
+    Computes relative forward transforms from poses (pos0, quat0) to poses (pos1, quat1), i.e.: solves:
+
+    pose1 = pose0 @ transform
+
+    Args:
+        pos1 (np.array): (..., 3) (x,y,z) positions
+        quat1 (np.array): (..., 4) (x,y,z,w) unit quaternions
+        pos0 (np.array): (..., 3) (x,y,z) initial positions
+        quat0 (np.array): (..., 4) (x,y,z,w) initial unit quaternions
+
+    Returns:
+        2-tuple:
+            - (np.array) (..., 3) (x,y,z) relative positions
+            - (np.array) (..., 4) (x,y,z,w) relative quaternions
+    """
+    inv_pos0, inv_quat0 = pose_inv(pos0, quat0)
+    return pose_transform(inv_pos0, inv_quat0, pos1, quat1)
+
+
+def pose_in_A_to_pose_in_B(pose_A, pose_A_in_B):
+    """
+    Converts homogeneous matrices corresponding to points C in frames A to homogeneous matrices corresponding to the
+    same points C in frames B.
+
+    Args:
+        pose_A (np.array): (..., 4, 4) matrices corresponding to the poses of C in frames A
+        pose_A_in_B (np.array): (..., 4, 4) matrices corresponding to the poses of A in frames B
+
+    Returns:
+        np.array: (..., 4, 4) matrices corresponding to the poses of C in frames B
+    """
+    return np.matmul(_as_float(pose_A_in_B), _as_float(pose_A))
+
+
+def _rotate(rot, vec):
+    # Applies rotation matrices (..., 3, 3) to vectors (..., 3)
+    return np.einsum("...ij,...j->...i", rot, vec)
+
+
+def vel_in_A_to_vel_in_B(vel_A, ang_vel_A, pose_A_in_B):
+    """
+    Converts linear and angular velocities of points in frames A to the equivalent in frames B.
+
+    Args:
+        vel_A (np.array): (..., 3) (vx,vy,vz) linear velocities in A
+        ang_vel_A (np.array): (..., 3) (wx,wy,wz) angular velocities in A
+        pose_A_in_B (np.array): (..., 4, 4) matrices corresponding to the poses of A in frames B
+
+    Returns:
+        2-tuple:
+            - (np.array) (..., 3) (vx,vy,vz) linear velocities in frames B
+            - (np.array) (..., 3) (wx,wy,wz) angular velocities in frames B
+    """
+    pose_A_in_B = _as_float(pose_A_in_B)
+    pos_A_in_B, rot_A_in_B = pose_A_in_B[..., :3, 3], pose_A_in_B[..., :3, :3]
+    ang_vel_B = _rotate(rot_A_in_B, _as_float(ang_vel_A))
+    vel_B = _rotate(rot_A_in_B, _as_float(vel_A)) + np.cross(pos_A_in_B, ang_vel_B)
+    return vel_B, ang_vel_B
+
+
+def force_in_A_to_force_in_B(force_A, torque_A, pose_A_in_B):
+    """
+    Converts linear and rotational forces at points in frames A to the equivalent in frames B.
+
+    Args:
+        force_A (np.array): (..., 3) (fx,fy,fz) linear forces in A
+        torque_A (np.array): (..., 3) (tx,ty,tz) rotational forces (moments) in A
+        pose_A_in_B (np.array): (..., 4, 4) matrices corresponding to the poses of A in frames B
+
+    Returns:
+        2-tuple:
+            - (np.array) (..., 3) (fx,fy,fz) linear forces in frames B
+            - (np.array) (..., 3) (tx,ty,tz) moments in frames B
+    """
+    pose_A_in_B, force_A = _as_float(pose_A_in_B), _as_float(force_A)
+    pos_A_in_B = pose_A_in_B[..., :3, 3]
+    rot_A_in_B_inv = np.swapaxes(pose_A_in_B[..., :3, :3], -1, -2)
+    force_B = _rotate(rot_A_in_B_inv, force_A)
+    torque_B = _rotate(rot_A_in_B_inv, _as_float(torque_A) - np.cross(pos_A_in_B, force_A))
+    return force_B, torque_B
+
+
+def quat2axisangle(quat):
+    """
+    Converts quaternions to axis-angle format.
+    Returns unit vector directions scaled by their angles in radians.
+
+    Args:
+        quat (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 3) (ax,ay,az) axis-angle exponential coordinates
+    """
+    quat = unit_vector(quat)
+    # Use the representative with non-negative w so that angles lie in [0, pi]
+    quat = np.where(quat[..., 3:] < 0, -quat, quat)
+    sin_half = np.linalg.norm(quat[..., :3], axis=-1, keepdims=True)
+    angle = 2.0 * np.arctan2(sin_half, quat[..., 3:])
+    # Use the small-angle approximation angle / sin(angle / 2) ~= 2 near zero
+    small = sin_half < EPS
+    scale = np.where(small, 2.0, angle / np.where(small, 1.0, sin_half))
+    return quat[..., :3] * scale
+
+
+def axisangle2quat(vec):
+    """
+    Converts scaled axis-angles to quaternions.
+
+    Args:
+        vec (np.array): (..., 3) (ax,ay,az) axis-angle exponential coordinates
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternions
+    """
+    vec = _as_float(vec)
+    angle = np.linalg.norm(vec, axis=-1, keepdims=True)
+    # handle zero-rotation case
+    small = angle < EPS
+    scale = np.where(small, 0.5, np.sin(0.5 * angle) / np.where(small, 1.0, angle))
+    return np.concatenate([vec * scale, np.cos(0.5 * angle)], axis=-1)
+
+
+def euler2quat(euler):
+    """
+    Converts extrinsic xyz euler angles into quaternions
+
+    Args:
+        euler (np.array): (..., 3) (r,p,y) angles
+
+    Returns:
+        np.array: (..., 4) (x,y,z,w) quaternions
+    """
+    half = 0.5 * _as_float(euler)
+    cr, cp, cy = np.moveaxis(np.cos(half), -1, 0)
+    sr, sp, sy = np.moveaxis(np.sin(half), -1, 0)
+    return np.stack(
+        (
+            sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy,
+            cr * cp * sy - sr * sp * cy,
+            cr * cp * cy + sr * sp * sy,
+        ),
+        axis=-1,
+    )
+
+
+def euler2mat(euler):
+    """
+    Converts extrinsic xyz euler angles into rotation matrices
+
+    Args:
+        euler (np.array): (..., 3) (r,p,y) angles
+
+    Returns:
+        np.array: (..., 3, 3) rotation matrices
+    """
+    return quat2mat(euler2quat(euler))
+
+
+def quat2euler(quat):
+    """
+    Converts quaternions into extrinsic xyz euler angles
+
+    Args:
+        quat (np.array): (..., 4) (x,y,z,w) quaternions
+
+    Returns:
+        np.array: (..., 3) (r,p,y) angles
+    """
+    return mat2euler(quat2mat(quat))
+
+
+def mat2euler(rmat):
+    """
+    Converts rotation matrices into extrinsic xyz euler angles in radian
+
+    Args:
+        rmat (np.array): (..., 3, 3) rotation matrices
+
+    Returns:
+        np.array: (..., 3) (r,p,y) angles
+    """
+    M = _as_float(rmat)[..., :3, :3]
+    pitch = np.arcsin(np.clip(-M[..., 2, 0], -1.0, 1.0))
+    # Away from gimbal lock, roll and yaw are uniquely defined
+    roll = np.arctan2(M[..., 2, 1], M[..., 2, 2])
+    yaw = np.arctan2(M[..., 1, 0], M[..., 0, 0])
+    # At gimbal lock, set roll to zero and fold everything into yaw
+    locked = np.abs(np.abs(M[..., 2, 0]) - 1.0) < 1e-7
+    roll = np.where(locked, 0.0, roll)
+    yaw = np.where(locked, np.arctan2(-M[..., 0, 1], M[..., 1, 1]), yaw)
+    return np.stack((roll, pitch, yaw), axis=-1)
+
+
+def unit_vector(data, axis=-1):
+    """
+    Returns ndarray normalized by length, i.e. eucledian norm, along axis.
+
+    Args:
+        data (np.array): data to normalize
+        axis (int): axis along which to normalize
+
+    Returns:
+        np.array: normalized data
+    """
+    data = _as_float(data)
+    return data / np.linalg.norm(data, axis=axis, keepdims=True)
+
+
+def l2_distance(v1, v2):
+    """
+    Returns the L2 distances between batches of vectors v1 and v2.
+
+    Args:
+        v1 (np.array): (..., k) vectors
+        v2 (np.array): (..., k) vectors
+
+    Returns:
+        np.array: (...) distances
+    """
+    return np.linalg.norm(_as_float(v1) - _as_float(v2), axis=-1)
+
+
+def get_orientation_error(target_orn, current_orn):
+    """
+    Returns the differences between two batches of quaternion orientations as 3 DOF numpy arrays.
+    For use in an impedance controller / task-space PD controller.
+
+    Args:
+        target_orn (np.array): (..., 4) (x, y, z, w) desired quaternion orientations
+        current_orn (np.array): (..., 4) (x, y, z, w) current quaternion orientations
+
+    Returns:
+        np.array: (..., 3) (ax,ay,az) current orientation errors, corresponding to (target_orn - current_orn)
+    """
+    cx, cy, cz, cw = np.moveaxis(_as_float(current_orn), -1, 0)
+    tx, ty, tz, tw = np.moveaxis(_as_float(target_orn), -1, 0)
+    return 2.0 * np.stack(
+        (
+            -cx * tw + cw * tx - cz * ty + cy * tz,
+            -cy * tw + cz * tx + cw * ty - cx * tz,
+            -cz * tw - cy * tx + cx * ty + cw * tz,
+        ),
+        axis=-1,
+    )
+
+
+def get_pose_error(target_pose, current_pose):
+    """
+    Computes the errors corresponding to target poses - current poses as 6-dim vectors.
+    The first 3 components correspond to translational errors while the last 3 components
+    correspond to the rotational errors.
+
+    Args:
+        target_pose (np.array): (..., 4, 4) homogeneous matrices for the target poses
+        current_pose (np.array): (..., 4, 4) homogeneous matrices for the current poses
+
+    Returns:
+        np.array: (..., 6) pose errors
+    """
+    target_pose, current_pose = _as_float(target_pose), _as_float(current_pose)
+    pos_err = target_pose[..., :3, 3] - current_pose[..., :3, 3]
+    # Sum of the cross products between the corresponding columns of the current and target rotation matrices
+    rot_err = 0.5 * np.sum(
+        np.cross(current_pose[..., :3, :3], target_pose[..., :3, :3], axisa=-2, axisb=-2, axisc=-1), axis=-2)
+    pos_err, rot_err = np.broadcast_arrays(pos_err, rot_err)
+    return np.concatenate((pos_err, rot_err), axis=-1)
+
+
+def matrix_inverse(matrix):
+    """
+    Computes the inverses of a batch of matrices.
+
+    Args:
+        matrix (np.array): (..., k, k) matrices
+
+    Returns:
+        np.array: (..., k, k) matrix inverses
+    """
+    return np.linalg.inv(_as_float(matrix))
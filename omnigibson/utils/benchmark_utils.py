@@ -0,0 +1,402 @@
+"""
+Lightweight framework for declarative, repeatable benchmarks. Each BenchmarkCase times a function over the cartesian
+product of its parameters (e.g.: object counts or sensor resolutions), with warmup and repetition control. Results are
+written to JSON together with metadata about the environment they were collected in, and can be compared against a
+stored baseline with per-case tolerances to catch performance regressions.
+
+Cases run on one of two backends: "mock" cases only exercise pure-Python / numpy code paths with mocked scene objects,
+and run headless on any machine, while "omni" cases require omniverse and a launched simulator.
+"""
+import itertools
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Default no. of untimed warmup runs and timed repetitions of each case
+m.DEFAULT_WARMUP = 1
+m.DEFAULT_REPEAT = 5
+
+# Default max relative slowdown with respect to the baseline before a case is considered to have regressed
+m.DEFAULT_TOLERANCE = 0.25
+
+# Statistic of the repetition times compared against the baseline
+m.COMPARISON_STATISTIC = "median"
+
+# Environment metadata that must match between results and a baseline for their times to be comparable
+m.COMPARABLE_METADATA_KEYS = ("machine", "processor", "cpu_count", "python", "packages")
+
+# Valid backends of benchmark cases
+BACKENDS = {"mock", "omni"}
+
+
+class BenchmarkCase:
+    """
+    Declarative benchmark, timing @fcn once per combination of its parameters. For each combination, @setup is called
+    with the parameters as keyword arguments, and its return value is passed to every (untimed) warmup run and (timed)
+    repetition of @fcn, after which it is passed to @teardown.
+    """
+
+    def __init__(
+        self,
+        name,
+        fcn,
+        setup=None,
+        teardown=None,
+        params=None,
+        backend="mock",
+        warmup=None,
+        repeat=None,
+        number=1,
+        tolerance=None,
+        description=None,
+    ):
+        """
+        Args:
+            name (str): Unique name of this case
+            fcn (function): Function to time, called as fcn(state) where state is the return value of @setup. If it
+                returns a dict, its numerical entries (from the last repetition) are stored as extra metrics
+            setup (None or function): Function called as setup(**params) before timing each parameter combination,
+                returning the state passed to @fcn. Raising ImportError skips the combination
+            teardown (None or function): Function called as teardown(state) after timing each parameter combination
+            params (None or dict): Maps each parameter name to the list of values to benchmark
+            backend (str): Backend required by this case. Valid options are {"mock", "omni"}
+            warmup (None or int): No. of untimed runs before timing. Default is m.DEFAULT_WARMUP
+            repeat (None or int): No. of timed repetitions. Default is m.DEFAULT_REPEAT
+            number (int): No. of calls of @fcn per repetition, whose mean is recorded as the repetition's time. Useful
+                to time very short functions
+            tolerance (None or float): If specified, max relative slowdown with respect to the baseline of this
+                case, overriding the default tolerance
+            description (None or str): Human-readable description of what this case measures
+        """
+        assert backend in BACKENDS, f"Invalid backend: {backend}, valid options are: {BACKENDS}"
+        self.name = name
+        self.fcn = fcn
+        self.setup = setup
+        self.teardown = teardown
+        self.params = dict() if params is None else params
+        self.backend = backend
+        self.warmup = warmup
+        self.repeat = repeat
+        self.number = number
+        self.tolerance = tolerance
+        self.description = description
+
+    def get_id(self, params):
+        """
+        Args:
+            params (dict): Value of each parameter of this case
+
+        Returns:
+            str: Unique id of this case with parameters @params, e.g.: "registry_lookup[n_objs=100]"
+        """
+        if len(params) == 0:
+            return self.name
+        return f"{self.name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+    def expand(self):
+        """
+        Returns:
+            list of 2-tuple: (id, params) of each combination of this case's parameters, in order
+        """
+        names = list(self.params.keys())
+        return [(self.get_id(dict(zip(names, values))), dict(zip(names, values)))
+                for values in itertools.product(*(self.params[name] for name in names))]
+
+
+def get_backend_availability(backend):
+    """
+    Args:
+        backend (str): Backend to check. Valid options are {"mock", "omni"}
+
+    Returns:
+        2-tuple:
+            - bool: Whether cases requiring @backend can be run in the current process
+            - None or str: Reason why @backend is unavailable, if so
+    """
+    if backend == "mock":
+        return True, None
+    import omnigibson as og
+    if og.sim is None:
+        return False, "omniverse is not launched (e.g.: OMNIGIBSON_NO_OMNIVERSE is set or omni is not installed)"
+    return True, None
+
+
+def _get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def get_environment_metadata():
+    """
+    Returns:
+        dict: Metadata about the machine and software environment benchmarks are run in, to be stored with results
+    """
+    import omnigibson as og
+    packages = dict()
+    for package in ("numpy", "scipy", "numba", "networkx", "trimesh", "cv2"):
+        module = sys.modules.get(package, None)
+        if module is None:
+            try:
+                module = __import__(package)
+            except ImportError:
+                continue
+        packages[package] = getattr(module, "__version__", None)
+    return dict(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        hostname=socket.gethostname(),
+        platform=platform.platform(),
+        machine=platform.machine(),
+        processor=platform.processor(),
+        cpu_count=os.cpu_count(),
+        python=sys.version.split()[0],
+        omnigibson=og.__version__,
+        git_commit=_get_git_commit(),
+        packages=packages,
+        backends=sorted(backend for backend in BACKENDS if get_backend_availability(backend)[0]),
+    )
+
+
+def _summarize(times):
+    times = np.asarray(times, dtype=float)
+    return dict(
+        mean=float(np.mean(times)),
+        median=float(np.median(times)),
+        std=float(np.std(times)),
+        min=float(np.min(times)),
+        max=float(np.max(times)),
+    )
+
+
+def run_case(case, params, warmup=None, repeat=None):
+    """
+    Times @case with parameters @params
+
+    Args:
+        case (BenchmarkCase): Case to run
+        params (dict): Value of each parameter of @case
+        warmup (None or int): If specified, overrides the no. of warmup runs of @case
+        repeat (None or int): If specified, overrides the no. of timed repetitions of @case
+
+    Returns:
+        dict: Result of the case, with its status ("ok", "skipped" or "error"), the reason it was skipped or errored,
+            the time of each repetition (in seconds) and their summary statistics, and any extra metrics
+    """
+    warmup = warmup if warmup is not None else (case.warmup if case.warmup is not None else m.DEFAULT_WARMUP)
+    repeat = repeat if repeat is not None else (case.repeat if case.repeat is not None else m.DEFAULT_REPEAT)
+    result = dict(name=case.name, params=params, backend=case.backend, status="ok", reason=None, warmup=warmup,
+                  repeat=repeat, number=case.number, tolerance=case.tolerance, times=[], metrics=dict())
+
+    available, reason = get_backend_availability(case.backend)
+    if not available:
+        result.update(status="skipped", reason=reason)
+        return result
+
+    try:
+        state = case.setup(**params) if case.setup is not None else None
+    except ImportError as e:
+        result.update(status="skipped", reason=f"Missing dependency: {e}")
+        return result
+    except Exception:
+        result.update(status="error", reason=traceback.format_exc())
+        return result
+
+    try:
+        for _ in range(warmup):
+            case.fcn(state)
+        output = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(case.number):
+                output = case.fcn(state)
+            result["times"].append((time.perf_counter() - start) / case.number)
+        if isinstance(output, dict):
+            result["metrics"] = {key: float(value) for key, value in output.items() if np.isscalar(value)}
+        result.update(_summarize(result["times"]))
+    except Exception:
+        result.update(status="error", reason=traceback.format_exc())
+    finally:
+        if case.teardown is not None:
+            case.teardown(state)
+
+    return result
+
+
+def run_benchmarks(cases, backends=None, name_filter=None, warmup=None, repeat=None, verbose=True):
+    """
+    Runs all parameter combinations of all @cases
+
+    Args:
+        cases (list of BenchmarkCase): Cases to run
+        backends (None or iterable of str): If specified, only cases requiring one of these backends are run
+        name_filter (None or str): If specified, regex that case ids must match (with re.search) to be run
+        warmup (None or int): If specified, overrides the no. of warmup runs of all cases
+        repeat (None or int): If specified, overrides the no. of timed repetitions of all cases
+        verbose (bool): Whether to print each result as soon as it is collected
+
+    Returns:
+        dict: Benchmark results, with keys "metadata" (see get_environment_metadata()) and "results" (mapping each
+            case id to its result, see run_case())
+    """
+    assert len({case.name for case in cases}) == len(cases), "Benchmark case names must be unique!"
+    results = dict()
+    for case in cases:
+        if backends is not None and case.backend not in backends:
+            continue
+        for case_id, params in case.expand():
+            if name_filter is not None and re.search(name_filter, case_id) is None:
+                continue
+            results[case_id] = run_case(case, params, warmup=warmup, repeat=repeat)
+            if verbose:
+                print(format_results({case_id: results[case_id]}, header=len(results) == 1), flush=True)
+    return dict(metadata=get_environment_metadata(), results=results)
+
+
+def save_results(results, fpath):
+    """
+    Args:
+        results (dict): Benchmark results, as returned by run_benchmarks()
+        fpath (str): Path of the JSON file to write
+    """
+    dirpath = os.path.dirname(os.path.abspath(fpath))
+    os.makedirs(dirpath, exist_ok=True)
+    with open(fpath, "w") as f:
+        json.dump(results, f, indent=4)
+
+
+def load_results(fpath):
+    """
+    Args:
+        fpath (str): Path of a JSON file written by save_results()
+
+    Returns:
+        dict: Loaded benchmark results
+    """
+    with open(fpath, "r") as f:
+        return json.load(f)
+
+
+def get_metadata_mismatches(metadata, baseline_metadata, keys=None):
+    """
+    Args:
+        metadata (dict): Environment metadata of benchmark results, see get_environment_metadata()
+        baseline_metadata (dict): Environment metadata of baseline benchmark results
+        keys (None or list of str): Metadata keys to compare. Default is m.COMPARABLE_METADATA_KEYS
+
+    Returns:
+        dict: Maps each key in @keys whose value differs between @metadata and @baseline_metadata to its (current,
+            baseline) values. If empty, times of both results are comparable
+    """
+    keys = m.COMPARABLE_METADATA_KEYS if keys is None else keys
+    return {key: (metadata.get(key, None), baseline_metadata.get(key, None)) for key in keys
+            if metadata.get(key, None) != baseline_metadata.get(key, None)}
+
+
+def compare_to_baseline(results, baseline, tolerance=None, tolerances=None, statistic=None):
+    """
+    Compares benchmark results against baseline results
+
+    Args:
+        results (dict): Benchmark results, as returned by run_benchmarks()
+        baseline (dict): Baseline benchmark results, e.g.: as loaded by load_results()
+        tolerance (None or float): Max relative slowdown before a case is considered to have regressed, and min
+            relative speedup before it is considered to have improved. Default is m.DEFAULT_TOLERANCE
+        tolerances (None or dict): Maps case names (or ids) to tolerances overriding @tolerance
+        statistic (None or str): Statistic of the repetition times to compare, e.g.: "median", "mean" or "min".
+            Default is m.COMPARISON_STATISTIC
+
+    Returns:
+        list of dict: Comparison of each case id in either @results or @baseline, with its status: "ok", "regression",
+            "improvement", "new" (not in the baseline), "missing" (not successfully run, but in the baseline) or
+            "skipped" (neither run successfully nor in the baseline), the compared times and their ratio
+    """
+    tolerance = m.DEFAULT_TOLERANCE if tolerance is None else tolerance
+    tolerances = dict() if tolerances is None else tolerances
+    statistic = m.COMPARISON_STATISTIC if statistic is None else statistic
+    current, reference = results["results"], baseline["results"]
+
+    comparisons = []
+    for case_id in list(current.keys()) + [case_id for case_id in reference.keys() if case_id not in current]:
+        result, baseline_result = current.get(case_id, None), reference.get(case_id, None)
+        ok = result is not None and result["status"] == "ok"
+        baseline_ok = baseline_result is not None and baseline_result["status"] == "ok"
+        comparison = dict(id=case_id, current=result[statistic] if ok else None,
+                          baseline=baseline_result[statistic] if baseline_ok else None, ratio=None)
+        if ok and baseline_ok:
+            name = result["name"]
+            case_tolerance = tolerances.get(case_id, tolerances.get(name, result.get("tolerance", None)))
+            case_tolerance = tolerance if case_tolerance is None else case_tolerance
+            comparison["ratio"] = comparison["current"] / max(comparison["baseline"], 1e-12)
+            if comparison["ratio"] > 1.0 + case_tolerance:
+                comparison["status"] = "regression"
+            elif comparison["ratio"] < 1.0 / (1.0 + case_tolerance):
+                comparison["status"] = "improvement"
+            else:
+                comparison["status"] = "ok"
+        elif ok:
+            comparison["status"] = "new"
+        elif baseline_ok:
+            comparison["status"] = "missing"
+        else:
+            comparison["status"] = "skipped"
+        comparisons.append(comparison)
+
+    return comparisons
+
+
+def format_results(results, header=True):
+    """
+    Args:
+        results (dict): Maps case ids to their results, e.g.: the "results" entry of run_benchmarks()' output
+        header (bool): Whether to include a header line
+
+    Returns:
+        str: Human-readable table of @results, with times in milliseconds
+    """
+    lines = [f"{'case':<60} {'status':>8} {'median (ms)':>12} {'min (ms)':>10} {'std (ms)':>10}  metrics"] \
+        if header else []
+    for case_id, result in results.items():
+        if result["status"] != "ok":
+            reason = (result["reason"] or "").strip().splitlines()
+            lines.append(f"{case_id:<60} {result['status']:>8}  {reason[-1] if len(reason) > 0 else ''}")
+            continue
+        metrics = ", ".join(f"{key}={value:.4g}" for key, value in result["metrics"].items())
+        lines.append(f"{case_id:<60} {result['status']:>8} {result['median'] * 1e3:>12.4f} "
+                     f"{result['min'] * 1e3:>10.4f} {result['std'] * 1e3:>10.4f}  {metrics}")
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons):
+    """
+    Args:
+        comparisons (list of dict): Comparisons, as returned by compare_to_baseline()
+
+    Returns:
+        str: Human-readable table of @comparisons, with times in milliseconds
+    """
+    lines = [f"{'case':<60} {'status':>12} {'baseline (ms)':>14} {'current (ms)':>13} {'ratio':>7}"]
+    for c in comparisons:
+        baseline = f"{c['baseline'] * 1e3:>14.4f}" if c["baseline"] is not None else f"{'-':>14}"
+        current = f"{c['current'] * 1e3:>13.4f}" if c["current"] is not None else f"{'-':>13}"
+        ratio = f"{c['ratio']:>7.2f}" if c["ratio"] is not None else f"{'-':>7}"
+        lines.append(f"{c['id']:<60} {c['status']:>12} {baseline} {current} {ratio}")
+    return "\n".join(lines)
@@ -0,0 +1,248 @@
+"""
+Bookkeeping of collision groups, i.e.: named sets of prims whose collisions are filtered at the group level, so that
+filtering collisions among n prims takes O(n) relationship targets instead of the O(n^2) of pairwise filters. Groups,
+their members and which groups collide with each other are tracked incrementally, and mirrored to a backend that
+authors them (e.g.: as UsdPhysics.CollisionGroup prims, see omnigibson.utils.usd_utils.CollisionAPI).
+"""
+from itertools import combinations
+
+
+# Collision group holding the root links of all fixed-base objects of a scene, which do not collide with each other
+FIXED_BASE_COLLISION_GROUP = "fixed_base_root_links"
+
+
+class CollisionGroupRegistry:
+    """
+    Registry of collision groups. All groups collide with each other (and themselves) unless filtered, and prims that
+    do not belong to any group collide with everything. Each group member includes all of its nested prims.
+    """
+
+    def __init__(self, backend=None, invert_filter=True):
+        """
+        Args:
+            backend (None or object): If specified, backend authoring the groups, with methods:
+                - define_group(name): Creates the group @name
+                - undefine_group(name): Removes the group @name
+                - add_member(name, prim_path) / remove_member(name, prim_path): (Un-)includes @prim_path in @name
+                - add_filtered_group(name, other) / remove_filtered_group(name, other): Adds / removes @other as a
+                    target of the filtered groups relationship of @name
+            invert_filter (bool): Whether the physics scene inverts collision group filtering, in which case the
+                filtered groups of a group are the groups it collides with, rather than the ones it does not collide
+                with. Must match the physics scene setting (see Simulator._set_physics_engine_settings())
+        """
+        self.backend = backend
+        self.invert_filter = invert_filter
+        self._members = dict()              # Maps each group to the set of its member prim paths
+        self._prim_groups = dict()          # Maps each member prim path to the set of its groups
+        self._filtered = set()              # Group pairs (as sorted 2-tuples) whose collisions are filtered
+
+    @property
+    def groups(self):
+        """
+        Returns:
+            list of str: Names of all groups
+        """
+        return list(self._members)
+
+    def has_group(self, name):
+        """
+        Args:
+            name (str): Name of the group
+
+        Returns:
+            bool: Whether the group @name exists
+        """
+        return name in self._members
+
+    def get_members(self, name):
+        """
+        Args:
+            name (str): Name of the group
+
+        Returns:
+            set of str: Prim paths of all members of @name
+        """
+        return set(self._members[name])
+
+    @staticmethod
+    def _pair(name_a, name_b):
+        return (name_a, name_b) if name_a <= name_b else (name_b, name_a)
+
+    def _has_target(self, name_a, name_b):
+        # Whether @name_b is a filtered groups target of @name_a (and vice versa)
+        return (self._pair(name_a, name_b) in self._filtered) != self.invert_filter
+
+    def _set_target(self, name_a, name_b, present):
+        if self.backend is None:
+            return
+        fcn = self.backend.add_filtered_group if present else self.backend.remove_filtered_group
+        # Author both directions, so that the result does not depend on how the physics engine combines them
+        fcn(name_a, name_b)
+        if name_a != name_b:
+            fcn(name_b, name_a)
+
+    def create_group(self, name, filter_self=False):
+        """
+        Creates a new collision group, colliding with all other groups
+
+        Args:
+            name (str): Name of the group
+            filter_self (bool): Whether the members of the group should not collide with each other
+        """
+        assert name not in self._members, f"Collision group {name} already exists!"
+        self._members[name] = set()
+        if self.backend is not None:
+            self.backend.define_group(name)
+        if filter_self:
+            self._filtered.add((name, name))
+        # With inverted filtering, colliding with the other groups requires explicit targets
+        for other in self._members:
+            if self._has_target(name, other):
+                self._set_target(name, other, True)
+
+    def remove_group(self, name):
+        """
+        Removes the collision group @name. Its members collide with everything again, unless they belong to other
+        groups
+
+        Args:
+            name (str): Name of the group
+        """
+        for prim_path in self._members.pop(name):
+            self._prim_groups[prim_path].discard(name)
+            if len(self._prim_groups[prim_path]) == 0:
+                self._prim_groups.pop(prim_path)
+        if self.backend is not None:
+            # Remove the targets of the other groups pointing to this one
+            for other in self._members:
+                if self._has_target(name, other):
+                    self.backend.remove_filtered_group(other, name)
+            self.backend.undefine_group(name)
+        self._filtered = {pair for pair in self._filtered if name not in pair}
+
+    def add_member(self, name, prim_path):
+        """
+        Args:
+            name (str): Name of the group
+            prim_path (str): Prim to include (with all of its nested prims) in the group @name
+        """
+        members = self._members[name]
+        if prim_path in members:
+            return
+        members.add(prim_path)
+        self._prim_groups.setdefault(prim_path, set()).add(name)
+        if self.backend is not None:
+            self.backend.add_member(name, prim_path)
+
+    def remove_member(self, name, prim_path):
+        """
+        Args:
+            name (str): Name of the group
+            prim_path (str): Prim to remove from the group @name. No-op if it is not a member
+        """
+        members = self._members.get(name, set())
+        if prim_path not in members:
+            return
+        members.remove(prim_path)
+        self._prim_groups[prim_path].discard(name)
+        if len(self._prim_groups[prim_path]) == 0:
+            self._prim_groups.pop(prim_path)
+        if self.backend is not None:
+            self.backend.remove_member(name, prim_path)
+
+    def set_groups_filtered(self, name_a, name_b, filtered):
+        """
+        Sets whether the members of group @name_a collide with the members of group @name_b
+
+        Args:
+            name_a (str): Name of the first group
+            name_b (str): Name of the second group, which may be @name_a itself
+            filtered (bool): Whether collisions between the two groups should be filtered
+        """
+        assert name_a in self._members and name_b in self._members, \
+            f"Collision groups {name_a} and {name_b} must both exist!"
+        pair = self._pair(name_a, name_b)
+        if (pair in self._filtered) == filtered:
+            return
+        if filtered:
+            self._filtered.add(pair)
+        else:
+            self._filtered.remove(pair)
+        self._set_target(name_a, name_b, self._has_target(name_a, name_b))
+
+    def are_groups_filtered(self, name_a, name_b):
+        """
+        Args:
+            name_a (str): Name of the first group
+            name_b (str): Name of the second group
+
+        Returns:
+            bool: Whether collisions between the members of the two groups are filtered
+        """
+        return self._pair(name_a, name_b) in self._filtered
+
+    def get_prim_groups(self, prim_path):
+        """
+        Args:
+            prim_path (str): Prim path, e.g.: of a link or one of its collision meshes
+
+        Returns:
+            set of str: All groups @prim_path belongs to, directly or through one of its ancestors
+        """
+        groups = set()
+        path = prim_path
+        while path:
+            groups.update(self._prim_groups.get(path, ()))
+            path = path.rsplit("/", 1)[0]
+        return groups
+
+    def is_filtered(self, prim_path_a, prim_path_b):
+        """
+        Args:
+            prim_path_a (str): First prim path
+            prim_path_b (str): Second prim path
+
+        Returns:
+            bool: Whether collisions between the two prims are filtered by their collision groups
+        """
+        groups_b = self.get_prim_groups(prim_path_b)
+        return any(self._pair(group_a, group_b) in self._filtered
+                   for group_a in self.get_prim_groups(prim_path_a) for group_b in groups_b)
+
+    @property
+    def n_relationship_targets(self):
+        """
+        Returns:
+            int: Total no. of relationship targets authored for all groups, i.e.: members and filtered groups
+                (counting both directions)
+        """
+        n_members = sum(len(members) for members in self._members.values())
+        pairs = [(name, name) for name in self._members] + list(combinations(self._members, 2))
+        n_filter_targets = sum(1 if name_a == name_b else 2 for name_a, name_b in pairs
+                               if self._has_target(name_a, name_b))
+        return n_members + n_filter_targets
+
+    def clear(self):
+        """
+        Removes all groups
+        """
+        for name in list(self._members):
+            self.remove_group(name)
+
+
+def update_fixed_base_collision_group(registry, root_link_path, fixed_base):
+    """
+    Adds (or removes) the root link of an object to (or from) the shared collision group of fixed-base root links,
+    whose members do not collide with each other
+
+    Args:
+        registry (CollisionGroupRegistry): Registry holding the group
+        root_link_path (str): Prim path of the object's root link
+        fixed_base (bool): Whether the object has (still) a fixed base and is in the scene
+    """
+    if fixed_base:
+        if not registry.has_group(FIXED_BASE_COLLISION_GROUP):
+            registry.create_group(FIXED_BASE_COLLISION_GROUP, filter_self=True)
+        registry.add_member(FIXED_BASE_COLLISION_GROUP, root_link_path)
+    else:
+        registry.remove_member(FIXED_BASE_COLLISION_GROUP, root_link_path)
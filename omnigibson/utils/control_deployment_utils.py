@@ -0,0 +1,225 @@
+"""
+Deployment of low-level control signals on articulated objects, either joint by joint or with one articulation-wide
+call per control type.
+
+Nothing in this module depends on omni: the dynamic control interface is only accessed through the objects' own
+handles, so that both deployment paths can be compared headless.
+"""
+from collections.abc import Iterable
+
+import numpy as np
+
+from omnigibson.controllers.controller_base import ControlType
+from omnigibson.macros import create_module_macros
+from omnigibson.utils.physics_state_utils import mark_physics_state_dirty
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether to deploy full (non-indexed, non-normalized) control vectors with one articulation-wide call per control
+# type, instead of dispatching every joint separately
+m.VECTORIZE_CONTROL = True
+
+
+class ControlDeploymentMixin:
+    """
+    Adds control deployment to an articulated object. Inheriting classes must set the following attributes:
+
+        _dc: dynamic control interface
+        _handle: articulation handle
+        _joints (dict): maps joint names to joints, in DOF order
+        _dof_to_joints (dict): maps DOF indices to their joints
+        _dof_to_articulation_idx (None or n-array): maps DOF indices to articulation DOF indices, if known
+        _control_groups, _control_groups_types, _effort_joint_groups: initially None
+
+    and implement n_dof and _articulation_handle_valid.
+    """
+
+    @property
+    def _articulation_handle_valid(self):
+        """
+        Returns:
+            bool: Whether this object's articulation handle is valid, i.e.: control can be deployed on the whole
+                articulation at once
+        """
+        raise NotImplementedError()
+
+    def deploy_control(self, control, control_type, indices=None, normalized=False):
+        """
+        Deploys control signals @control with corresponding @control_type on this entity.
+
+        Note: This is DIFFERENT than self.set_joint_positions/velocities/efforts, because in this case we are only
+            setting target values (i.e.: we subject this entity to physical dynamics in order to reach the desired
+            @control setpoints), compared to set_joint_XXXX which manually sets the actual state of the joints.
+
+            This function is intended to be used with motorized entities, e.g.: robot agents or machines (e.g.: a
+            conveyor belt) to simulation physical control of these entities.
+
+            In contrast, use set_joint_XXXX for simulation-specific logic, such as simulator resetting or "magic"
+            action implementations.
+
+        Args:
+            control (k- or n-array): control signals to deploy. This should be n-DOF length if all joints are being set,
+                or k-length (k < n) if specific indices are being set. In this case, the length of @control must
+                be the same length as @indices!
+            control_type (k- or n-array): control types for each DOF. Each entry should be one of ControlType.
+                 This should be n-DOF length if all joints are being set, or k-length (k < n) if specific
+                 indices are being set. In this case, the length of @control must be the same length as @indices!
+            indices (None or k-array): If specified, should be k (k < n) length array of specific DOF controls to deploy.
+                Default is None, which assumes that all joints are being set.
+            normalized (bool or array of bool): Whether the inputted joint controls should be interpreted as normalized
+                values. A single bool can be specified for the entire @control, or an array can be specified for
+                individual values. Default is False, corresponding to all @control assumed to be not normalized
+        """
+        # Run sanity check
+        deploy_all = indices is None
+        if deploy_all:
+            assert len(control) == len(control_type) == self.n_dof, (
+                "Control signals, control types, and number of DOF should all be the same!"
+                "Got {}, {}, and {} respectively.".format(len(control), len(control_type), self.n_dof)
+            )
+            # Set indices manually so that we're standardized
+            indices = np.arange(self.n_dof)
+        else:
+            assert len(control) == len(control_type) == len(indices), (
+                "Control signals, control types, and indices should all be the same!"
+                "Got {}, {}, and {} respectively.".format(len(control), len(control_type), len(indices))
+            )
+
+        # Possibly deploy all controls at once
+        if deploy_all and m.VECTORIZE_CONTROL and not np.any(normalized) and \
+                self._dof_to_articulation_idx is not None and self._articulation_handle_valid:
+            self._deploy_control_vectorized(control=control, control_type=control_type)
+            return
+
+        # Standardize normalized input
+        n_indices = len(indices)
+        normalized = normalized if isinstance(normalized, Iterable) else [normalized] * n_indices
+
+        # Loop through controls and deploy
+        # We have to use delicate logic to account for the edge cases where a single joint may contain > 1 DOF
+        # (e.g.: spherical joint)
+        cur_indices_idx = 0
+        while cur_indices_idx != n_indices:
+            # Grab the current DOF index we're controlling and find the corresponding joint
+            joint = self._dof_to_joints[indices[cur_indices_idx]]
+            cur_ctrl_idx = indices[cur_indices_idx]
+            joint_dof = joint.n_dof
+            if joint_dof > 1:
+                # Run additional sanity checks since the joint has more than one DOF to make sure our controls,
+                # control types, and indices all match as expected
+
+                # Make sure the indices are mapped correctly
+                assert indices[cur_indices_idx + joint_dof] == cur_ctrl_idx + joint_dof, \
+                    "Got mismatched control indices for a single joint!"
+                # Check to make sure all joints, control_types, and normalized as all the same over n-DOF for the joint
+                for group_name, group in zip(
+                        ("joints", "control_types", "normalized"),
+                        (self._dof_to_joints, control_type, normalized),
+                ):
+                    assert len({group[indices[cur_indices_idx + i]] for i in range(joint_dof)}) == 1, \
+                        f"Not all {group_name} were the same when trying to deploy control for a single joint!"
+                # Assuming this all passes, we grab the control subvector, type, and normalized value accordingly
+                ctrl = control[cur_ctrl_idx: cur_ctrl_idx + joint_dof]
+            else:
+                # Grab specific control. No need to do checks since this is a single value
+                ctrl = control[cur_ctrl_idx]
+
+            # Deploy control based on type
+            ctrl_type, norm = control_type[cur_ctrl_idx], normalized[cur_ctrl_idx]       # In multi-DOF joint case all values were already checked to be the same
+            if ctrl_type == ControlType.EFFORT:
+                joint.set_effort(ctrl, normalized=norm)
+            elif ctrl_type == ControlType.VELOCITY:
+                joint.set_vel(ctrl, normalized=norm, target=True)
+            elif ctrl_type == ControlType.POSITION:
+                joint.set_pos(ctrl, normalized=norm, target=True)
+            else:
+                raise ValueError("Invalid control type specified: {}".format(ctrl_type))
+
+            # Finally, increment the current index based on how many DOFs were just controlled
+            cur_indices_idx += joint_dof
+
+    def _get_control_groups(self, control_type):
+        """
+        Groups all DOFs by their control type. The grouping is cached and only recomputed when @control_type changes,
+        at which point it is also validated against the joints' control modes.
+
+        Args:
+            control_type (n-array): control types for each DOF. Each entry should be one of ControlType
+
+        Returns:
+            dict: Maps each ControlType to a 2-tuple of (DOF indices, corresponding articulation DOF indices). The
+                effort-controlled joints and their DOF indices are also cached in self._effort_joint_groups
+        """
+        if self._control_groups is not None and np.array_equal(control_type, self._control_groups_types):
+            return self._control_groups
+
+        control_type = np.array(control_type)
+        for ctrl_type in control_type:
+            if ctrl_type not in ControlType.VALID_TYPES:
+                raise ValueError("Invalid control type specified: {}".format(ctrl_type))
+
+        # Make sure every joint is controlled with a single control type matching its control mode
+        idx = 0
+        for joint in self._joints.values():
+            joint_types = set(control_type[idx: idx + joint.n_dof])
+            assert len(joint_types) == 1, \
+                "Not all control_types were the same when trying to deploy control for a single joint!"
+            joint_type = joint_types.pop()
+            assert joint_type == ControlType.EFFORT or joint_type == joint.control_type, \
+                f"Trying to set joint target for joint {joint.name}, but control type does not match its control mode!"
+            idx += joint.n_dof
+
+        self._control_groups = dict()
+        for ctrl_type in ControlType.VALID_TYPES:
+            dof_idx = np.flatnonzero(control_type == ctrl_type)
+            self._control_groups[ctrl_type] = (dof_idx, self._dof_to_articulation_idx[dof_idx])
+        self._control_groups_types = control_type
+
+        # Map each effort-controlled joint to its DOF indices
+        self._effort_joint_groups = []
+        idx = 0
+        for joint in self._joints.values():
+            if control_type[idx] == ControlType.EFFORT:
+                self._effort_joint_groups.append((joint, np.arange(idx, idx + joint.n_dof)))
+            idx += joint.n_dof
+
+        return self._control_groups
+
+    def _deploy_control_vectorized(self, control, control_type):
+        """
+        Deploys the full n-DOF length, non-normalized control signals @control with corresponding @control_type on
+        this entity, pushing each group of DOFs sharing the same control type to the articulation with a single call.
+        Produces the same targets and efforts as deploying each joint separately.
+
+        Only the DOFs of each group are written to. Position and velocity groups not covering all DOFs read back the
+        current targets of the other DOFs, which are written back unchanged. This does not hold for efforts, since the
+        articulation only exposes the measured efforts, which would be applied as commands to the other DOFs. Effort
+        groups not covering all DOFs are therefore deployed joint by joint instead.
+
+        Args:
+            control (n-array): control signals to deploy for all DOFs
+            control_type (n-array): control types for all DOFs. Each entry should be one of ControlType
+        """
+        groups = self._get_control_groups(control_type=control_type)
+        mark_physics_state_dirty()
+        for ctrl_type, get_values, set_values in (
+            (ControlType.POSITION,
+             self._dc.get_articulation_dof_position_targets, self._dc.set_articulation_dof_position_targets),
+            (ControlType.VELOCITY,
+             self._dc.get_articulation_dof_velocity_targets, self._dc.set_articulation_dof_velocity_targets),
+            (ControlType.EFFORT, self._dc.get_articulation_dof_efforts, self._dc.set_articulation_dof_efforts),
+        ):
+            dof_idx, articulation_idx = groups[ctrl_type]
+            if len(dof_idx) == 0:
+                continue
+            if ctrl_type == ControlType.EFFORT and len(dof_idx) < self.n_dof:
+                for joint, joint_dof_idx in self._effort_joint_groups:
+                    joint.set_effort(control[joint_dof_idx])
+                continue
+            # Only the DOFs in this group are overwritten, so we start from the current values of all the other ones
+            values = np.empty(self.n_dof, dtype=np.float32) if len(dof_idx) == self.n_dof else \
+                np.array(get_values(self._handle), dtype=np.float32)
+            values[articulation_idx] = control[dof_idx]
+            set_values(self._handle, values)
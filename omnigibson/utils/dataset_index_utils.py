@@ -0,0 +1,471 @@
+"""
+Persistent index of the object categories, models, per-model metadata and average category specs of the OmniGibson
+dataset, so that discovering assets does not list directories and read metadata files on every query (which is
+especially slow on network filesystems). The index is built once by scanning the dataset, stored as a versioned,
+compressed file, and validated upon loading against the modification times of the dataset's directories.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Version of the on-disk index format. Bump this whenever the indexed contents change
+m.INDEX_VERSION = 1
+
+# Directory holding the on-disk indices, one per dataset path
+m.CACHE_DIR = os.getenv(
+    "OMNIGIBSON_DATASET_INDEX_DIR", os.path.join(os.path.expanduser("~"), ".cache", "omnigibson", "dataset_index"))
+
+# How stored indices are validated against the dataset. Valid options are:
+#   "directories": modification times of the objects directory, each category directory and the metadata files.
+#       Detects added / removed categories and models with a few stats per category
+#   "files": additionally, modification times of each model directory and metadata file. Also detects edited
+#       per-model metadata, at the cost of a few stats per model
+m.VALIDATION_MODE = "directories"
+
+VALIDATION_MODES = {"directories", "files"}
+
+
+def _is_hidden(name):
+    return name.startswith(".")
+
+
+def _stat_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatasetIndex:
+    """
+    In-memory index of the object categories and models of a dataset, with O(1) lookups by category and model, and
+    precomputed filters by ability and metadata field
+    """
+
+    def __init__(self, dataset_path, data, category_abilities_fn=None):
+        """
+        Args:
+            dataset_path (str): Absolute path to the dataset
+            data (dict): Indexed contents, as built by DatasetIndex.scan()
+            category_abilities_fn (None or function): Function returning the abilities of a category, called as
+                category_abilities_fn(category) and returning an iterable of ability names. Default uses the BDDL
+                object taxonomy if it can be imported, otherwise no category has any ability
+        """
+        self.dataset_path = dataset_path
+        self._data = data
+        self._categories = data["categories"]
+        self._category_abilities_fn = category_abilities_fn
+        self._ability_categories = dict()
+        self._field_models = None
+
+        # Sorted names and paths, built once
+        self._category_names = sorted(self._categories)
+        self._model_names = {category: sorted(info["models"]) for category, info in self._categories.items()}
+        self._objects_path = os.path.join(dataset_path, "objects")
+
+    # --- Building, saving and loading ---
+
+    @staticmethod
+    def get_signature(dataset_path, categories=None, validation_mode=None):
+        """
+        Args:
+            dataset_path (str): Absolute path to the dataset
+            categories (None or dict): If specified, maps each indexed category to its indexed models, whose
+                directories are checked. Otherwise, the category and model directories are listed from disk
+            validation_mode (None or str): Validation mode, see m.VALIDATION_MODE. Default is m.VALIDATION_MODE
+
+        Returns:
+            str: Signature of the current state of the dataset on disk, changing whenever the dataset is modified
+        """
+        validation_mode = m.VALIDATION_MODE if validation_mode is None else validation_mode
+        assert validation_mode in VALIDATION_MODES, \
+            f"Invalid validation mode: {validation_mode}, valid options are: {VALIDATION_MODES}"
+        objects_path = os.path.join(dataset_path, "objects")
+        if categories is None:
+            categories = {category: DatasetIndex._list_dirs(os.path.join(objects_path, category))
+                          for category in DatasetIndex._list_dirs(objects_path)}
+        hasher = hashlib.sha256(f"v{m.INDEX_VERSION}:{validation_mode}".encode())
+        paths = [objects_path,
+                 os.path.join(dataset_path, "metadata", "avg_category_specs.json"),
+                 os.path.join(dataset_path, "metadata", "categories.txt")]
+        for category in sorted(categories):
+            category_path = os.path.join(objects_path, category)
+            paths.append(category_path)
+            if validation_mode == "files":
+                for model in sorted(categories[category]):
+                    model_path = os.path.join(category_path, model)
+                    paths += [model_path, os.path.join(model_path, "misc", "metadata.json")]
+        for path in paths:
+            hasher.update(f"{path}:{_stat_signature(path)};".encode())
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _list_dirs(path):
+        if not os.path.isdir(path):
+            return []
+        with os.scandir(path) as it:
+            return sorted(entry.name for entry in it if not _is_hidden(entry.name) and entry.is_dir())
+
+    @staticmethod
+    def scan(dataset_path):
+        """
+        Scans the dataset at @dataset_path, reading all of its metadata
+
+        Args:
+            dataset_path (str): Absolute path to the dataset
+
+        Returns:
+            dict: Indexed contents of the dataset
+        """
+        objects_path = os.path.join(dataset_path, "objects")
+        categories = dict()
+        for category in DatasetIndex._list_dirs(objects_path):
+            category_path = os.path.join(objects_path, category)
+            models = dict()
+            for model in DatasetIndex._list_dirs(category_path):
+                model_path = os.path.join(category_path, model)
+                metadata = None
+                metadata_path = os.path.join(model_path, "misc", "metadata.json")
+                if os.path.exists(metadata_path):
+                    with open(metadata_path, "r") as f:
+                        metadata = json.load(f)
+                usd_dir = os.path.join(model_path, "usd")
+                usd_files = sorted(name for name in os.listdir(usd_dir) if name.endswith(".usd")) \
+                    if os.path.isdir(usd_dir) else []
+                models[model] = dict(metadata=metadata, usd_files=usd_files)
+            categories[category] = dict(models=models)
+
+        avg_category_specs = None
+        avg_specs_path = os.path.join(dataset_path, "metadata", "avg_category_specs.json")
+        if os.path.exists(avg_specs_path):
+            with open(avg_specs_path, "r") as f:
+                avg_category_specs = json.load(f)
+
+        category_ids = None
+        category_ids_path = os.path.join(dataset_path, "metadata", "categories.txt")
+        if os.path.exists(category_ids_path):
+            with open(category_ids_path, "r") as f:
+                category_ids = [line.rstrip() for line in f.readlines()]
+
+        return dict(categories=categories, avg_category_specs=avg_category_specs, category_ids=category_ids)
+
+    @staticmethod
+    def get_index_path(dataset_path, cache_dir=None):
+        """
+        Args:
+            dataset_path (str): Absolute path to the dataset
+            cache_dir (None or str): Directory holding the on-disk indices. Default is m.CACHE_DIR
+
+        Returns:
+            str: Path to the on-disk index of the dataset at @dataset_path
+        """
+        cache_dir = m.CACHE_DIR if cache_dir is None else cache_dir
+        key = hashlib.sha256(os.path.realpath(dataset_path).encode()).hexdigest()[:16]
+        return os.path.join(os.path.expanduser(cache_dir), f"dataset_index_{key}.json.gz")
+
+    @classmethod
+    def load(cls, dataset_path, cache_dir=None, validation_mode=None, rebuild=False, category_abilities_fn=None):
+        """
+        Loads the index of the dataset at @dataset_path from disk if it is still valid, otherwise (re-)builds it by
+        scanning the dataset and stores it
+
+        Args:
+            dataset_path (str): Path to the dataset
+            cache_dir (None or str): Directory holding the on-disk indices. Default is m.CACHE_DIR
+            validation_mode (None or str): Validation mode, see m.VALIDATION_MODE. Default is m.VALIDATION_MODE
+            rebuild (bool): Whether to rebuild the index even if the stored one is valid
+            category_abilities_fn (None or function): See DatasetIndex.__init__
+
+        Returns:
+            DatasetIndex: Index of the dataset at @dataset_path
+        """
+        dataset_path = os.path.abspath(os.path.expanduser(dataset_path))
+        index_path = cls.get_index_path(dataset_path, cache_dir=cache_dir)
+        validation_mode = m.VALIDATION_MODE if validation_mode is None else validation_mode
+
+        if not rebuild and os.path.exists(index_path):
+            try:
+                with gzip.open(index_path, "rt") as f:
+                    stored = json.load(f)
+                if stored["version"] == m.INDEX_VERSION and stored["validation_mode"] == validation_mode and \
+                        stored["signature"] == cls.get_signature(
+                            dataset_path, categories={category: info["models"] for category, info in
+                                                      stored["data"]["categories"].items()},
+                            validation_mode=validation_mode):
+                    return cls(dataset_path, stored["data"], category_abilities_fn=category_abilities_fn)
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Failed to load dataset index from {index_path}, rebuilding it: {e}")
+
+        start = time.perf_counter()
+        data = cls.scan(dataset_path)
+        signature = cls.get_signature(
+            dataset_path, categories={category: info["models"] for category, info in data["categories"].items()},
+            validation_mode=validation_mode)
+        index = cls(dataset_path, data, category_abilities_fn=category_abilities_fn)
+        # Only store indices of existing datasets
+        if os.path.isdir(os.path.join(dataset_path, "objects")):
+            try:
+                index.save(index_path, signature=signature, validation_mode=validation_mode)
+            except OSError as e:
+                logging.warning(f"Could not save dataset index to {index_path}: {e}")
+        logging.info(f"Built dataset index of {dataset_path} with {len(data['categories'])} categories and "
+                     f"{index.n_models} models in {time.perf_counter() - start:.2f}s")
+        return index
+
+    def save(self, index_path, signature, validation_mode):
+        """
+        Atomically writes this index to @index_path
+
+        Args:
+            index_path (str): Path to write the index to
+            signature (str): Signature of the dataset this index was built from, see DatasetIndex.get_signature()
+            validation_mode (str): Validation mode @signature was computed with
+        """
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(index_path))
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt") as f:
+                json.dump(dict(version=m.INDEX_VERSION, dataset_path=self.dataset_path, signature=signature,
+                               validation_mode=validation_mode, data=self._data), f, separators=(",", ":"))
+            os.replace(tmp_path, index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # --- Queries ---
+
+    @property
+    def categories(self):
+        """
+        Returns:
+            list of str: All object categories, sorted
+        """
+        return list(self._category_names)
+
+    @property
+    def n_models(self):
+        """
+        Returns:
+            int: Total no. of object models
+        """
+        return sum(len(models) for models in self._model_names.values())
+
+    @property
+    def avg_category_specs(self):
+        """
+        Returns:
+            None or dict: Average specs (e.g.: dimensions and mass) of each category, or None if the dataset does not
+                provide them
+        """
+        return self._data["avg_category_specs"]
+
+    @property
+    def category_ids(self):
+        """
+        Returns:
+            None or list of str: Category names in the order of their ids, or None if the dataset does not provide
+                them
+        """
+        return self._data["category_ids"]
+
+    def has_category(self, category):
+        """
+        Args:
+            category (str): Object category
+
+        Returns:
+            bool: Whether @category exists
+        """
+        return category in self._categories
+
+    def has_model(self, category, model):
+        """
+        Args:
+            category (str): Object category
+            model (str): Object model
+
+        Returns:
+            bool: Whether @model of @category exists
+        """
+        info = self._categories.get(category, None)
+        return info is not None and model in info["models"]
+
+    def get_models(self, category):
+        """
+        Args:
+            category (str): Object category
+
+        Returns:
+            list of str: All models of @category, sorted
+        """
+        assert category in self._categories, f"Category {category} does not exist"
+        return list(self._model_names[category])
+
+    def get_category_path(self, category):
+        """
+        Args:
+            category (str): Object category
+
+        Returns:
+            str: Path to the directory of @category
+        """
+        assert category in self._categories, f"Category {category} does not exist"
+        return os.path.join(self._objects_path, category)
+
+    def get_model_path(self, category, model):
+        """
+        Args:
+            category (str): Object category
+            model (str): Object model
+
+        Returns:
+            str: Path to the directory of @model of @category
+        """
+        assert self.has_model(category, model), f"Model {model} from category {category} does not exist"
+        return os.path.join(self._objects_path, category, model)
+
+    def get_usd_files(self, category, model):
+        """
+        Args:
+            category (str): Object category
+            model (str): Object model
+
+        Returns:
+            list of str: Names of the USD files (e.g.: "<model>.encrypted.usd") within the usd directory of @model
+        """
+        assert self.has_model(category, model), f"Model {model} from category {category} does not exist"
+        return list(self._categories[category]["models"][model]["usd_files"])
+
+    def get_model_metadata(self, category, model):
+        """
+        Args:
+            category (str): Object category
+            model (str): Object model
+
+        Returns:
+            None or dict: Contents of misc/metadata.json of @model, if it exists. Should not be modified
+        """
+        assert self.has_model(category, model), f"Model {model} from category {category} does not exist"
+        return self._categories[category]["models"][model]["metadata"]
+
+    def get_categories_with_ability(self, ability):
+        """
+        Args:
+            ability (str): Object ability, e.g.: "sliceable"
+
+        Returns:
+            set of str: All categories with @ability. Computed once per ability
+        """
+        categories = self._ability_categories.get(ability, None)
+        if categories is None:
+            abilities_fn = self._get_category_abilities_fn()
+            categories = {category for category in self._category_names if ability in abilities_fn(category)}
+            self._ability_categories[ability] = categories
+        return categories
+
+    def _get_category_abilities_fn(self):
+        if self._category_abilities_fn is None:
+            try:
+                from bddl.object_taxonomy import ObjectTaxonomy
+                taxonomy = ObjectTaxonomy()
+
+                def category_abilities_fn(category):
+                    taxonomy_class = taxonomy.get_class_name_from_igibson_category(category)
+                    return dict() if taxonomy_class is None else taxonomy.get_abilities(taxonomy_class)
+            except ImportError:
+                logging.warning("BDDL could not be imported - no category has any ability in the dataset index.")
+
+                def category_abilities_fn(category):
+                    return dict()
+            self._category_abilities_fn = category_abilities_fn
+        return self._category_abilities_fn
+
+    def _get_field_models(self):
+        # Maps each top-level metadata field to the (category, model) pairs whose metadata has it, built once
+        if self._field_models is None:
+            self._field_models = dict()
+            for category in self._category_names:
+                for model, info in self._categories[category]["models"].items():
+                    for field in (info["metadata"] or dict()):
+                        self._field_models.setdefault(field, set()).add((category, model))
+        return self._field_models
+
+    def find_models(self, categories=None, ability=None, has_fields=None, lacks_fields=None, filter_fn=None):
+        """
+        Finds all models matching the given filters
+
+        Args:
+            categories (None or str or list of str): If specified, only models of these categories are considered
+            ability (None or str): If specified, only models of categories with this ability are considered
+            has_fields (None or list of str): If specified, only models whose metadata has all of these top-level
+                fields are considered
+            lacks_fields (None or list of str): If specified, only models whose metadata has none of these top-level
+                fields are considered
+            filter_fn (None or function): If specified, only models for which filter_fn(category, model, metadata)
+                returns True are considered
+
+        Returns:
+            list of 2-tuple: (category, model) of each matching model, sorted
+        """
+        if categories is None:
+            categories = self._category_names
+        elif isinstance(categories, str):
+            categories = [categories]
+        categories = [category for category in categories if category in self._categories]
+        if ability is not None:
+            ability_categories = self.get_categories_with_ability(ability)
+            categories = [category for category in categories if category in ability_categories]
+
+        field_models = self._get_field_models() if has_fields or lacks_fields else None
+        matches = []
+        for category in categories:
+            for model in self._model_names[category]:
+                key = (category, model)
+                if has_fields and not all(key in field_models.get(field, ()) for field in has_fields):
+                    continue
+                if lacks_fields and any(key in field_models.get(field, ()) for field in lacks_fields):
+                    continue
+                if filter_fn is not None and \
+                        not filter_fn(category, model, self._categories[category]["models"][model]["metadata"]):
+                    continue
+                matches.append(key)
+        return matches
+
+
+_INDICES = dict()
+
+
+def get_dataset_index(dataset_path=None):
+    """
+    Args:
+        dataset_path (None or str): Path to the dataset. Default is the OmniGibson dataset, i.e.: og.og_dataset_path
+
+    Returns:
+        DatasetIndex: Index of the dataset at @dataset_path, loaded (or built) upon the first call for each dataset
+    """
+    if dataset_path is None:
+        import omnigibson as og
+        dataset_path = og.og_dataset_path
+    index = _INDICES.get(dataset_path, None)
+    if index is None:
+        index = _INDICES[dataset_path] = DatasetIndex.load(dataset_path)
+    return index
+
+
+def clear_dataset_indices():
+    """
+    Drops all in-memory dataset indices, so that they are reloaded (and revalidated) upon their next use
+    """
+    _INDICES.clear()
@@ -3,7 +3,10 @@ A set of helper utility functions for dealing with 3D geometry
 """
 import numpy as np
 import omnigibson.utils.transform_utils as T
+from omnigibson.utils.sim_utils import get_physics_state_key
 from omnigibson.utils.usd_utils import mesh_prim_to_trimesh_mesh
+from omnigibson.utils.volume_checker_utils import ContainerVolume, PointsInVolumeChecker, \
+    check_points_in_half_spaces, get_convex_hull_half_spaces
 
 
 def get_particle_positions_in_frame(pos, quat, scale, particle_positions):
@@ -193,18 +196,49 @@ def check_points_in_convex_hull_mesh(mesh_face_centroids, mesh_face_normals, pos
         particle_positions=particle_positions,
     )
     # For every mesh point / normal and particle position pair, we check whether it is "inside" (i.e.: the point lies
-    # BEHIND the normal plane -- this is easily done by taking the dot product with the vector from the point to the
-    # particle position with the normal, and validating that the value is < 0)
-    D, _ = mesh_face_centroids.shape
-    N, _ = particle_positions.shape
-    mesh_points = np.tile(mesh_face_centroids.reshape(1, D, 3), (N, 1, 1))
-    mesh_normals = np.tile(mesh_face_normals.reshape(1, D, 3), (N, 1, 1))
-    particle_positions = np.tile(particle_positions.reshape(N, 1, 3), (1, D, 1))
-    # All arrays are now (N, D, 3) shape -- efficient for batching
-    in_range = ((particle_positions - mesh_points) * mesh_normals).sum(axis=-1) < 0         # shape (N, D)
-    # All D normals must be satisfied for a single point to be considered inside the hull
-    in_range = in_range.sum(axis=-1) == D
-    return in_range
+    # BEHIND the normal plane -- this is done by checking that the dot product of the particle position with the normal
+    # is smaller than that of the mesh point with the normal). Points are checked in chunks to bound memory usage
+    normals, offsets = get_convex_hull_half_spaces(face_centroids=mesh_face_centroids, face_normals=mesh_face_normals)
+    return check_points_in_half_spaces(normals=normals, offsets=offsets, points=particle_positions)
+
+
+def compile_container_volume(mesh_prim):
+    """
+    Reads the parameters of container volume mesh prim @mesh_prim once, compiling them into a ContainerVolume
+
+    Args:
+        mesh_prim (Usd.Prim): Visual-only mesh of type {Sphere, Cylinder, Cone, Cube, Mesh} composing the volume
+
+    Returns:
+        ContainerVolume: Compiled volume, expressed in the frame of @mesh_prim's parent link
+    """
+    mesh_type = mesh_prim.GetTypeName()
+    orient = mesh_prim.GetAttribute("xformOp:orient").Get()
+    kwargs = dict(
+        volume_type=mesh_type,
+        pos=np.array(mesh_prim.GetAttribute("xformOp:translate").Get()),
+        quat=np.array([*orient.imaginary, orient.real]),
+        scale=np.array(mesh_prim.GetAttribute("xformOp:scale").Get()),
+    )
+    if mesh_type == "Mesh":
+        # For efficiency, we pre-compute the mesh using trimesh and find its corresponding half-spaces
+        trimesh_mesh = mesh_prim_to_trimesh_mesh(mesh_prim)
+        kwargs["half_spaces"] = get_convex_hull_half_spaces(
+            face_centroids=trimesh_mesh.vertices[trimesh_mesh.faces].mean(axis=1),
+            face_normals=trimesh_mesh.face_normals,
+        )
+        kwargs["vertices"] = np.array(trimesh_mesh.vertices)
+        kwargs["raw_volume"] = trimesh_mesh.volume if trimesh_mesh.is_volume else trimesh_mesh.convex_hull.volume
+    elif mesh_type == "Sphere":
+        kwargs["size"] = mesh_prim.GetAttribute("radius").Get()
+    elif mesh_type in {"Cylinder", "Cone"}:
+        kwargs["size"] = np.array([mesh_prim.GetAttribute("radius").Get(), mesh_prim.GetAttribute("height").Get()])
+    elif mesh_type == "Cube":
+        kwargs["size"] = mesh_prim.GetAttribute("size").Get()
+    else:
+        raise ValueError(f"Cannot create volume checker function for mesh of type: {mesh_type}")
+
+    return ContainerVolume(**kwargs)
 
 
 def generate_points_in_volume_checker_function(obj, volume_link, use_visual_meshes=True, mesh_name_prefixes=None):
@@ -229,7 +263,7 @@ def generate_points_in_volume_checker_function(obj, volume_link, use_visual_mesh
 
     Returns:
         2-tuple:
-            - function: Function with signature:
+            - PointsInVolumeChecker: Callable with signature:
 
                 in_range = check_in_volumes(particle_positions)
 
@@ -256,109 +290,19 @@ def generate_points_in_volume_checker_function(obj, volume_link, use_visual_mesh
     # Iterate through all visual meshes and keep track of any that are prefixed with container
     container_meshes = []
     meshes = volume_link.visual_meshes if use_visual_meshes else volume_link.collision_meshes
-    for container_mesh_name, container_mesh in volume_link.visual_meshes.items():
+    for container_mesh_name, container_mesh in meshes.items():
         if mesh_name_prefixes is None or mesh_name_prefixes in container_mesh_name:
             container_meshes.append(container_mesh.prim)
 
-    # Programmatically define the volume checker functions based on each container found
-    volume_checker_fcns = []
-    volume_calc_fcns = []
-    for sub_container_mesh in container_meshes:
-        mesh_type = sub_container_mesh.GetTypeName()
-        if mesh_type == "Mesh":
-            # For efficiency, we pre-compute the mesh using trimesh and find its corresponding faces and normals
-            trimesh_mesh = mesh_prim_to_trimesh_mesh(sub_container_mesh)
-            face_centroids = trimesh_mesh.vertices[trimesh_mesh.faces].mean(axis=1)
-            face_normals = trimesh_mesh.face_normals
-
-            # This function assumes that:
-            # 1. @particle_positions are in the local container_link frame
-            # 2. the @check_points_in_[...] function will convert them into the local @mesh frame
-            fcn = lambda mesh, particle_positions: check_points_in_convex_hull_mesh(
-                mesh_face_centroids=face_centroids,
-                mesh_face_normals=face_normals,
-                pos=np.array(mesh.GetAttribute("xformOp:translate").Get()),
-                quat=np.array([*(mesh.GetAttribute("xformOp:orient").Get().imaginary), mesh.GetAttribute("xformOp:orient").Get().real]),
-                scale=np.array(mesh.GetAttribute("xformOp:scale").Get()),
-                particle_positions=particle_positions,
-            )
-            vol_fcn = lambda mesh: trimesh_mesh.volume if trimesh_mesh.is_volume else trimesh_mesh.convex_hull.volume
-        elif mesh_type == "Sphere":
-            fcn = lambda mesh, particle_positions: check_points_in_sphere(
-                size=mesh.GetAttribute("radius").Get(),
-                pos=np.array(mesh.GetAttribute("xformOp:translate").Get()),
-                quat=np.array([*(mesh.GetAttribute("xformOp:orient").Get().imaginary), mesh.GetAttribute("xformOp:orient").Get().real]),
-                scale=np.array(mesh.GetAttribute("xformOp:scale").Get()),
-                particle_positions=particle_positions,
-            )
-            vol_fcn = lambda mesh: 4 / 3 * np.pi * (mesh.GetAttribute("radius").Get() ** 3)
-        elif mesh_type == "Cylinder":
-            fcn = lambda mesh, particle_positions: check_points_in_cylinder(
-                size=[mesh.GetAttribute("radius").Get(), mesh.GetAttribute("height").Get()],
-                pos=np.array(mesh.GetAttribute("xformOp:translate").Get()),
-                quat=np.array([*(mesh.GetAttribute("xformOp:orient").Get().imaginary), mesh.GetAttribute("xformOp:orient").Get().real]),
-                scale=np.array(mesh.GetAttribute("xformOp:scale").Get()),
-                particle_positions=particle_positions,
-            )
-            vol_fcn = lambda mesh: np.pi * (mesh.GetAttribute("radius").Get() ** 2) * mesh.GetAttribute("height").Get()
-        elif mesh_type == "Cone":
-            fcn = lambda mesh, particle_positions: check_points_in_cone(
-                size=[mesh.GetAttribute("radius").Get(), mesh.GetAttribute("height").Get()],
-                pos=np.array(mesh.GetAttribute("xformOp:translate").Get()),
-                quat=np.array([*(mesh.GetAttribute("xformOp:orient").Get().imaginary), mesh.GetAttribute("xformOp:orient").Get().real]),
-                scale=np.array(mesh.GetAttribute("xformOp:scale").Get()),
-                particle_positions=particle_positions,
-            )
-            vol_fcn = lambda mesh: np.pi * (mesh.GetAttribute("radius").Get() ** 2) * mesh.GetAttribute("height").Get() / 3.0
-        elif mesh_type == "Cube":
-            fcn = lambda mesh, particle_positions: check_points_in_cube(
-                size=mesh.GetAttribute("size").Get(),
-                pos=np.array(mesh.GetAttribute("xformOp:translate").Get()),
-                quat=np.array([*(mesh.GetAttribute("xformOp:orient").Get().imaginary), mesh.GetAttribute("xformOp:orient").Get().real]),
-                scale=np.array(mesh.GetAttribute("xformOp:scale").Get()),
-                particle_positions=particle_positions,
-            )
-            vol_fcn = lambda mesh: mesh.GetAttribute("size").Get() ** 3
-        else:
-            raise ValueError(f"Cannot create volume checker function for mesh of type: {mesh_type}")
-
-        volume_checker_fcns.append(fcn)
-        volume_calc_fcns.append(vol_fcn)
-
-    # Define the actual volume checker function
-    def check_points_in_volumes(particle_positions):
-        # Algo
-        # 1. Particles in global frame --> particles in volume link frame (including scaling)
-        # 2. For each volume checker function, apply volume checking
-        # 3. Aggregate across all functions with OR condition (any volume satisfied for that point)
-        ######
-
-        n_particles = len(particle_positions)
-        # Get pose of origin (global frame) in frame of volume link
-        # NOTE: This assumes there is no relative scaling between obj and volume link
-        volume_link_pos, volume_link_quat = volume_link.get_position_orientation()
-        particle_positions = get_particle_positions_in_frame(
-            pos=volume_link_pos,
-            quat=volume_link_quat,
-            scale=obj.scale,
-            particle_positions=particle_positions,
-        )
-
-        in_volumes = np.zeros(n_particles).astype(bool)
-        for checker_fcn, mesh in zip(volume_checker_fcns, container_meshes):
-            in_volumes |= checker_fcn(mesh, particle_positions)
-
-        return in_volumes
-
-    # Define the actual volume calculator function
-    def calculate_volume():
-        # Aggregate values across all subvolumes
-        # NOTE: Assumes all volumes are strictly disjointed (becuase we sum over all subvolumes to calculate
-        # total raw volume)
-        # TODO: Is there a way we can explicitly check if disjointed?
-        vols = [calc_fcn(mesh) * np.product(mesh.GetAttribute("xformOp:scale").Get())
-                for calc_fcn, mesh in zip(volume_calc_fcns, container_meshes)]
-        # Aggregate over all volumes and scale by the link's global scale
-        return np.sum(vols) * np.product(volume_link.get_world_scale())
+    # Compile each container's parameters once. The checker caches the volume link's transform for as long as the
+    # physical state of the simulation does not change
+    # NOTE: This assumes there is no relative scaling between obj and volume link
+    checker = PointsInVolumeChecker(
+        volumes=[compile_container_volume(mesh_prim=mesh) for mesh in container_meshes],
+        get_link_pose=volume_link.get_position_orientation,
+        get_link_scale=lambda: obj.scale,
+        get_volume_scale=volume_link.get_world_scale,
+        get_cache_key=get_physics_state_key,
+    )
 
-    return check_points_in_volumes, calculate_volume
+    return checker, checker.calculate_volume
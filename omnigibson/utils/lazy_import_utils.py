@@ -0,0 +1,226 @@
+"""
+A set of utility functions and classes for deferring imports until they are first needed, so that tools only using a
+small part of OmniGibson (e.g.: maps, transforms or configs) do not pay for importing the rest of it, as well as for
+reporting which modules dominate the import time of a given module
+"""
+import importlib
+import re
+import sys
+import time
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module that is only imported upon first attribute access, e.g.:
+
+        cv2 = LazyModule("cv2")
+        ...
+        cv2.resize(...)  # cv2 is imported here
+
+    Accessed attributes are cached on the placeholder itself, so that subsequent accesses cost a plain attribute lookup
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Absolute name of the module to import, e.g.: "scipy.spatial.transform"
+        """
+        super().__init__(name)
+        self._lazy_module = None
+
+    def _load(self):
+        if self._lazy_module is None:
+            self._lazy_module = importlib.import_module(self.__name__)
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found on the placeholder itself
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        value = getattr(self._load(), attr)
+        setattr(self, attr, value)
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        return f"<LazyModule {self.__name__} ({'loaded' if self._lazy_module is not None else 'not loaded'})>"
+
+
+def lazy_import(name):
+    """
+    Args:
+        name (str): Absolute name of the module to import, e.g.: "PIL.Image"
+
+    Returns:
+        module or LazyModule: The module itself if it is already imported, otherwise a placeholder importing it upon
+            first attribute access. Note that a missing module only raises an ImportError upon first access
+    """
+    return sys.modules[name] if name in sys.modules else LazyModule(name)
+
+
+def attach_lazy_attributes(package_name, attributes):
+    """
+    Lazily exposes the attributes of a package's modules as attributes of the package itself (PEP 562). Each
+    module is only imported the first time one of its attributes is accessed on the package, e.g.: from within
+    a package's __init__.py:
+
+        __getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+            ".map_base": ["BaseMap"],
+            ".traversable_map": ["TraversableMap"],
+        })
+
+    Args:
+        package_name (str): Absolute name of the package, i.e.: __name__ of its __init__.py
+        attributes (dict): Maps the name of each module to the list of its attributes to expose. Names starting with
+            "." are relative to the package, e.g.: ".map_base"
+
+    Returns:
+        3-tuple:
+            - function: Module-level __getattr__ of the package
+            - function: Module-level __dir__ of the package
+            - list of str: __all__ of the package, i.e.: all exposed attribute names
+    """
+    attr_to_module = {attr: module for module, attrs in attributes.items() for attr in attrs}
+
+    def __getattr__(name):
+        module = attr_to_module.get(name, None)
+        if module is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package_name), name)
+        # Cache the attribute on the package, so that this is only called once per attribute
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(attr_to_module))
+
+    return __getattr__, __dir__, list(attr_to_module)
+
+
+class LazyRegistry(dict):
+    """
+    Class registry populated upon first lookup. Classes register themselves into it when their module is imported,
+    so that looking a class up (e.g.: by name from a config) requires all modules of its package to have been
+    imported. The first time any entry is looked up, all attributes of the package (its __all__) are loaded.
+    Inserting entries never triggers population, so that classes can register themselves while their package is
+    being loaded.
+    """
+
+    def __init__(self, package_name):
+        """
+        Args:
+            package_name (str): Absolute name of the package whose modules register classes into this registry
+        """
+        super().__init__()
+        self.package_name = package_name
+        self._populated = False
+
+    def populate(self):
+        """
+        Imports all modules of this registry's package, if not done already
+        """
+        if self._populated:
+            return
+        # Set first, since loading the package's modules may look this registry up again
+        self._populated = True
+        package = importlib.import_module(self.package_name)
+        for name in getattr(package, "__all__", []):
+            getattr(package, name)
+
+    def __getitem__(self, key):
+        self.populate()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self.populate()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self.populate()
+        return super().__iter__()
+
+    def __len__(self):
+        self.populate()
+        return super().__len__()
+
+    def __repr__(self):
+        self.populate()
+        return super().__repr__()
+
+    def get(self, key, default=None):
+        self.populate()
+        return super().get(key, default)
+
+    def keys(self):
+        self.populate()
+        return super().keys()
+
+    def values(self):
+        self.populate()
+        return super().values()
+
+    def items(self):
+        self.populate()
+        return super().items()
+
+
+def measure_import_time(module, n_trials=1):
+    """
+    Measures the wall-clock time of importing @module in fresh interpreters, i.e.: without any modules cached
+
+    Args:
+        module (str): Absolute name of the module to import
+        n_trials (int): No. of fresh interpreters to import @module in
+
+    Returns:
+        list of float: Import time of @module in each trial, in seconds
+    """
+    import subprocess
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    times = []
+    for _ in range(n_trials):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def get_import_time_report(module, top_k=20):
+    """
+    Imports @module in a fresh interpreter with python -X importtime, and lists the modules it (transitively) imports
+
+    Args:
+        module (str): Absolute name of the module to import
+        top_k (None or int): If specified, only the @top_k modules with the largest cumulative import time are listed
+
+    Returns:
+        list of 3-tuple: (name, self time, cumulative time) of each imported module, sorted by decreasing cumulative
+            time, with times in seconds
+    """
+    import subprocess
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True)
+    assert out.returncode == 0, f"Failed to import {module} after {time.perf_counter() - start:.2f}s:\n{out.stderr}"
+    entries = []
+    for line in out.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match is not None:
+            entries.append((match.group(4), int(match.group(1)) * 1e-6, int(match.group(2)) * 1e-6))
+    entries.sort(key=lambda entry: -entry[2])
+    return entries if top_k is None else entries[:top_k]
+
+
+def format_import_time_report(entries):
+    """
+    Args:
+        entries (list of 3-tuple): Imported modules as returned by get_import_time_report()
+
+    Returns:
+        str: Human-readable table of the imported modules, with times in milliseconds
+    """
+    lines = [f"{'module':<60} {'self (ms)':>10} {'cumulative (ms)':>16}"]
+    lines += [f"{name:<60} {self_time * 1e3:>10.1f} {cumulative * 1e3:>16.1f}"
+              for name, self_time, cumulative in entries]
+    return "\n".join(lines)
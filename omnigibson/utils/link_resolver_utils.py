@@ -0,0 +1,246 @@
+"""
+A set of utility functions for resolving PhysX body identifiers (prim paths, SdfPath integer handles and interned
+prim path ids) into the (object, link) they belong to, without any per-query string manipulation
+"""
+import numpy as np
+
+from omnigibson.utils.raycast_utils import PRIM_PATH_INTERNER
+
+
+# Memoized mapping from (contact sensor interface id, contact sensor body handle) to decoded body prim path
+_CONTACT_BODY_NAMES = dict()
+
+
+def _sdf_path_to_int(path):
+    # Lazily import pxr so that this module can be used without omni
+    from pxr import PhysicsSchemaTools
+    return PhysicsSchemaTools.sdfPathToInt(path)
+
+
+def decode_contact_body_name(cs, handle):
+    """
+    Decodes contact sensor body handle @handle into its prim path, memoizing the result so that every body is only
+    decoded once
+
+    Args:
+        cs (ContactSensorInterface): omni contact sensor interface that produced @handle
+        handle (int): Contact sensor body handle, e.g.: body0 / body1 from CsRawData
+
+    Returns:
+        str: Prim path of the body corresponding to @handle
+    """
+    key = (id(cs), handle)
+    name = _CONTACT_BODY_NAMES.get(key, None)
+    if name is None:
+        name = cs.decode_body_name(handle)
+        _CONTACT_BODY_NAMES[key] = name
+    return name
+
+
+def clear_contact_body_names():
+    """
+    Clears the memoized contact sensor body names. Should be called whenever bodies are removed from the stage, since
+    their handles may then be reused
+    """
+    _CONTACT_BODY_NAMES.clear()
+
+
+class RigidLinkResolver:
+    """
+    Resolves rigid bodies reported by PhysX into the (object, link) tuple they belong to.
+
+    Every link of an object is interned once when the object is added, and can then be resolved from any of:
+
+        - its absolute prim path, e.g.: from contact sensor data
+        - its SdfPath integer handle, e.g.: from contact report headers (actor0 / actor1)
+        - its interned prim path id, e.g.: from RaycastResults.rigid_body_ids
+
+    Integer handles and interned ids can also be resolved in batches from numpy arrays. Unknown bodies resolve to
+    (None, None). Objects stay resolvable until they are explicitly removed, including while they are parked in the
+    graveyard by transition rules.
+    """
+
+    def __init__(self, interner=PRIM_PATH_INTERNER, path_to_handle=None):
+        """
+        Args:
+            interner (PrimPathInterner): Interner used to assign prim path ids. Should be the same interner used by
+                the raycast backends, so that raycast results can be resolved directly by id
+            path_to_handle (None or function): Function mapping an absolute prim path to its integer handle, as
+                reported in contact report headers. None defaults to PhysicsSchemaTools.sdfPathToInt
+        """
+        self._interner = interner
+        self._path_to_handle = _sdf_path_to_int if path_to_handle is None else path_to_handle
+
+        # Maps from link prim path, integer handle, and interned id to (object, link)
+        self._entries_by_path = dict()
+        self._entries_by_handle = dict()
+        self._entries_by_id = dict()
+
+        # Maps object to list of (link prim path, integer handle, interned id) tuples owned by that object
+        self._keys_by_obj = dict()
+
+        # Lazily-generated arrays for batched resolution
+        self._sorted_handles = None
+        self._sorted_handle_objs = None
+        self._sorted_handle_links = None
+        self._id_objs = None
+        self._id_links = None
+
+    def _invalidate(self):
+        self._sorted_handles = None
+        self._sorted_handle_objs = None
+        self._sorted_handle_links = None
+        self._id_objs = None
+        self._id_links = None
+
+    def add_object(self, obj):
+        """
+        Interns all links of object @obj. If @obj was already added, its links are re-interned
+
+        Args:
+            obj (EntityPrim): Loaded object whose links should be resolvable
+        """
+        if obj in self._keys_by_obj:
+            self.remove_object(obj)
+        keys = []
+        for link in obj.links.values():
+            path = link.prim_path
+            handle = self._path_to_handle(path)
+            idx = self._interner.intern(path)
+            entry = (obj, link)
+            self._entries_by_path[path] = entry
+            self._entries_by_handle[handle] = entry
+            self._entries_by_id[idx] = entry
+            keys.append((path, handle, idx))
+        self._keys_by_obj[obj] = keys
+        self._invalidate()
+
+    def remove_object(self, obj):
+        """
+        Removes all links of object @obj, if it was added
+
+        Args:
+            obj (EntityPrim): Object whose links should no longer be resolvable
+        """
+        keys = self._keys_by_obj.pop(obj, None)
+        if keys is None:
+            return
+        for path, handle, idx in keys:
+            # Only remove entries that were not overridden by another object in the meantime
+            if self._entries_by_path.get(path, (None,))[0] is obj:
+                self._entries_by_path.pop(path)
+            if self._entries_by_handle.get(handle, (None,))[0] is obj:
+                self._entries_by_handle.pop(handle)
+            if self._entries_by_id.get(idx, (None,))[0] is obj:
+                self._entries_by_id.pop(idx)
+        self._invalidate()
+        # Contact sensor handles of removed bodies may be reused, so we also drop the decoded body names
+        clear_contact_body_names()
+
+    def clear(self):
+        """
+        Removes all objects from this resolver
+        """
+        self._entries_by_path.clear()
+        self._entries_by_handle.clear()
+        self._entries_by_id.clear()
+        self._keys_by_obj.clear()
+        self._invalidate()
+        clear_contact_body_names()
+
+    def resolve_path(self, path):
+        """
+        Args:
+            path (str): Absolute prim path of a rigid link
+
+        Returns:
+            2-tuple: (object, link) owning @path, or (None, None) if it is unknown
+        """
+        return self._entries_by_path.get(path, (None, None))
+
+    def resolve_handle(self, handle):
+        """
+        Args:
+            handle (int): SdfPath integer handle of a rigid link, e.g.: actor0 from a contact report header
+
+        Returns:
+            2-tuple: (object, link) owning @handle, or (None, None) if it is unknown
+        """
+        return self._entries_by_handle.get(handle, (None, None))
+
+    def resolve_id(self, idx):
+        """
+        Args:
+            idx (int): Interned prim path id of a rigid link, e.g.: an entry of RaycastResults.rigid_body_ids
+
+        Returns:
+            2-tuple: (object, link) owning @idx, or (None, None) if it is unknown
+        """
+        return self._entries_by_id.get(idx, (None, None))
+
+    def resolve_handles(self, handles):
+        """
+        Resolves a batch of SdfPath integer handles
+
+        Args:
+            handles (n-array): (N,) integer handles of rigid links
+
+        Returns:
+            2-tuple:
+                - n-array: (N,) object array of objects owning each handle, with None for unknown handles
+                - n-array: (N,) object array of links owning each handle, with None for unknown handles
+        """
+        if self._sorted_handles is None:
+            handles_sorted = sorted(self._entries_by_handle.keys())
+            self._sorted_handles = np.array(handles_sorted, dtype=np.uint64)
+            # Append a trailing None entry, which is used for all unknown handles
+            self._sorted_handle_objs = np.array([self._entries_by_handle[h][0] for h in handles_sorted] + [None],
+                                                dtype=object)
+            self._sorted_handle_links = np.array([self._entries_by_handle[h][1] for h in handles_sorted] + [None],
+                                                 dtype=object)
+        handles = np.asarray(handles, dtype=np.uint64).reshape(-1)
+        n_handles = len(self._sorted_handles)
+        idxs = np.searchsorted(self._sorted_handles, handles)
+        found = idxs < n_handles
+        found[found] = self._sorted_handles[idxs[found]] == handles[found]
+        idxs[~found] = n_handles
+        return self._sorted_handle_objs[idxs], self._sorted_handle_links[idxs]
+
+    def resolve_ids(self, ids):
+        """
+        Resolves a batch of interned prim path ids
+
+        Args:
+            ids (n-array): (N,) interned prim path ids of rigid links. Ids of -1 (i.e.: no hit) are allowed
+
+        Returns:
+            2-tuple:
+                - n-array: (N,) object array of objects owning each id, with None for unknown ids
+                - n-array: (N,) object array of links owning each id, with None for unknown ids
+        """
+        if self._id_objs is None or len(self._id_objs) <= len(self._interner):
+            # One entry per interned path, plus a trailing None entry which is used for all unknown ids
+            self._id_objs = np.full(len(self._interner) + 1, None, dtype=object)
+            self._id_links = np.full(len(self._interner) + 1, None, dtype=object)
+            for idx, (obj, link) in self._entries_by_id.items():
+                self._id_objs[idx] = obj
+                self._id_links[idx] = link
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        ids = np.where((ids < 0) | (ids >= len(self._id_objs) - 1), len(self._id_objs) - 1, ids)
+        return self._id_objs[ids], self._id_links[ids]
+
+    @property
+    def interner(self):
+        """
+        Returns:
+            PrimPathInterner: Interner used to assign prim path ids
+        """
+        return self._interner
+
+    @property
+    def n_links(self):
+        """
+        Returns:
+            int: Number of links currently resolvable
+        """
+        return len(self._entries_by_path)
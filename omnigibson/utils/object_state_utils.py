@@ -10,6 +10,7 @@ from omnigibson.macros import create_module_macros, Dict
 from omnigibson.object_states.aabb import AABB
 from omnigibson.object_states.contact_bodies import ContactBodies
 from omnigibson.utils import sampling_utils
+from omnigibson.utils.snapshot_utils import StateSnapshot, get_snapshot_scope
 import omnigibson.utils.transform_utils as T
 
 
@@ -35,6 +36,25 @@ m.INSIDE_RAY_CASTING_SAMPLING_PARAMS = Dict({
 })
 
 
+def create_sampling_snapshot(objA, objB, z_offset=0.05):
+    """
+    Captures the states of all objects that can be affected when sampling a kinematic state for @objA with respect to
+    @objB, i.e.: @objA, @objB, all objects near @objB and everything that stepping physics can change (see
+    get_snapshot_scope()), so that a failed sampling trial can be undone
+
+    Args:
+        objA (StatefulObject): Object whose state will be sampled
+        objB (StatefulObject): Object who is the reference point for @objA's state
+        z_offset (float): Z-offset applied to the sampled poses
+
+    Returns:
+        StateSnapshot: Snapshot of the states of all objects that can be affected by sampling
+    """
+    # @objA is placed on / in / under @objB, so anything it can collide with is within its extent of @objB's AABB
+    margin = np.max(objA.aabb_extent) + z_offset
+    return StateSnapshot(objs=get_snapshot_scope(objs=[objA, objB], margin=margin))
+
+
 def sample_kinematics(
     predicate,
     objA,
@@ -82,8 +102,8 @@ def sample_kinematics(
     objA.keep_still()
     objB.keep_still()
 
-    # Save the state of the simulator
-    state = og.sim.dump_state()
+    # Save the state of all objects that can be affected by sampling
+    snapshot = create_sampling_snapshot(objA=objA, objB=objB, z_offset=z_offset)
 
     # Attempt sampling
     for i in range(max_trials):
@@ -206,7 +226,7 @@ def sample_kinematics(
         if success:
             break
         else:
-            og.sim.load_state(state)
+            snapshot.restore()
 
     if success and not skip_falling:
         objA.set_position_orientation(pos, orientation)
@@ -0,0 +1,462 @@
+"""
+Asynchronous, double-buffered observation pipeline. Raw sensor buffers are snapshotted synchronously (e.g.: right after
+rendering), while the CPU post-processing of each modality runs on a worker pool, writing into preallocated output
+arrays. Callers receive a frame handle they can await, so that simulation stepping can overlap the processing of the
+previous frame's observations.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Default no. of worker threads post-processing modalities
+m.N_WORKERS = 4
+
+# Default no. of output buffers per modality, i.e.: max no. of frames that can be in flight at once
+m.N_BUFFERS = 2
+
+# Edges (in seconds) of the log-spaced bins of latency histograms
+m.LATENCY_HISTOGRAM_MIN = 1e-5
+m.LATENCY_HISTOGRAM_MAX = 10.0
+m.LATENCY_HISTOGRAM_N_BINS = 30
+
+
+class LatencyHistogram:
+    """
+    Thread-safe histogram of latencies, with log-spaced bins, that also tracks throughput
+    """
+
+    def __init__(self):
+        self.bin_edges = np.logspace(
+            np.log10(m.LATENCY_HISTOGRAM_MIN), np.log10(m.LATENCY_HISTOGRAM_MAX), m.LATENCY_HISTOGRAM_N_BINS + 1)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clears all recorded latencies
+        """
+        with self._lock:
+            # Out-of-range latencies are counted in the first / last bins
+            self.counts = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+            self.n = 0
+            self.total = 0.0
+            self.max = 0.0
+            self._first_t, self._last_t = None, None
+
+    def add(self, latency, t=None):
+        """
+        Records a single latency
+
+        Args:
+            latency (float): Latency to record, in seconds
+            t (None or float): time.perf_counter() time at which the latency was recorded, used to compute throughput.
+                If None, will use the current time
+        """
+        t = time.perf_counter() if t is None else t
+        idx = np.clip(np.searchsorted(self.bin_edges, latency, side="right") - 1, 0, len(self.counts) - 1)
+        with self._lock:
+            self.counts[idx] += 1
+            self.n += 1
+            self.total += latency
+            self.max = max(self.max, latency)
+            self._first_t = t - latency if self._first_t is None else min(self._first_t, t - latency)
+            self._last_t = t if self._last_t is None else max(self._last_t, t)
+
+    @property
+    def mean(self):
+        """
+        Returns:
+            float: Mean latency, in seconds
+        """
+        return self.total / max(self.n, 1)
+
+    def percentile(self, q):
+        """
+        Args:
+            q (float): Percentile to compute, in [0, 100]
+
+        Returns:
+            float: Upper edge of the bin containing the @q-th percentile latency, in seconds
+        """
+        if self.n == 0:
+            return 0.0
+        idx = np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.n)
+        return self.bin_edges[min(idx + 1, len(self.counts))]
+
+    @property
+    def throughput(self):
+        """
+        Returns:
+            float: No. of recorded latencies per second, between the start of the first and the end of the last one
+        """
+        if self.n == 0 or self._last_t == self._first_t:
+            return 0.0
+        return self.n / (self._last_t - self._first_t)
+
+
+class ModalityProcessor:
+    """
+    CPU post-processing of a single modality's raw buffer, optionally writing into preallocated output arrays
+    """
+
+    def __init__(self, fcn, shape=None, dtype=None):
+        """
+        Args:
+            fcn (function): Post-processing function. Signature:
+
+                obs = fcn(raw, out)
+
+                where @raw is the modality's raw buffer, @out is a preallocated output array of shape @shape and dtype
+                @dtype (or None if no shape is specified), and @obs is the processed observation, which should be @out
+                itself if it has been written to
+            shape (None or tuple): If specified, shape of the processed observation, for which output arrays are
+                preallocated
+            dtype (None or type): dtype of the preallocated output arrays. Only used if @shape is specified
+        """
+        self.fcn = fcn
+        self.shape = shape
+        self.dtype = dtype
+
+    def allocate(self):
+        """
+        Returns:
+            None or n-array: Newly allocated output array, or None if this processor has no fixed output shape
+        """
+        return None if self.shape is None else np.zeros(self.shape, dtype=self.dtype)
+
+
+def copy_into(raw, out):
+    """
+    Default post-processing: copies @raw into @out if shapes match, otherwise returns a copy of @raw
+
+    Args:
+        raw (any): Raw buffer
+        out (None or n-array): Preallocated output array
+
+    Returns:
+        any: Processed observation
+    """
+    if out is not None and isinstance(raw, np.ndarray) and raw.shape == out.shape:
+        np.copyto(out, raw, casting="unsafe")
+        return out
+    return raw.copy() if isinstance(raw, np.ndarray) else raw
+
+
+class ObservationFrame:
+    """
+    Handle to a single frame of observations being processed asynchronously. All observations of a frame stem from
+    the same raw snapshot, and are written into output buffers owned by this frame only until it is recycled, i.e.:
+    until @n_buffers more frames have been submitted to the pipeline it came from
+    """
+
+    def __init__(self, frame_id, futures=None, obs=None):
+        """
+        Args:
+            frame_id (int): Monotonically increasing id of this frame
+            futures (None or dict): Maps modality names to the futures of their processed observations
+            obs (None or dict): Maps modality names to already processed observations
+        """
+        self.frame_id = frame_id
+        self._futures = dict() if futures is None else futures
+        self._obs = dict() if obs is None else obs
+
+    @classmethod
+    def from_obs(cls, obs, frame_id=-1):
+        """
+        Args:
+            obs (dict): Already processed observations
+            frame_id (int): Id of the frame
+
+        Returns:
+            ObservationFrame: Completed frame wrapping @obs
+        """
+        return cls(frame_id=frame_id, obs=obs)
+
+    def done(self):
+        """
+        Returns:
+            bool: Whether all modalities of this frame have been processed
+        """
+        return all(future.done() for future in self._futures.values())
+
+    def result(self, timeout=None):
+        """
+        Waits until all modalities of this frame have been processed
+
+        Args:
+            timeout (None or float): Max time to wait per modality, in seconds. If None, waits indefinitely
+
+        Returns:
+            dict: Keyword-mapped observations of this frame. Note that arrays may be views into output buffers that
+                are overwritten once this frame is recycled, so they should be copied if they need to be kept longer
+        """
+        for modality, future in self._futures.items():
+            self._obs[modality] = future.result(timeout=timeout)
+        self._futures = dict()
+        return self._obs
+
+
+class CompositeObservationFrame:
+    """
+    Handle to the frames of multiple sensors, e.g.: all sensors of a robot, whose observations are flattened into a
+    single dict once awaited
+    """
+
+    def __init__(self, frames, obs=None):
+        """
+        Args:
+            frames (dict): Maps prefixes to ObservationFrame (or CompositeObservationFrame) handles. Observations of
+                each frame are mapped to "{prefix}_{modality}"
+            obs (None or dict): Additional, already computed observations
+        """
+        self.frames = frames
+        self._obs = dict() if obs is None else obs
+
+    def done(self):
+        """
+        Returns:
+            bool: Whether all frames have been processed
+        """
+        return all(frame.done() for frame in self.frames.values())
+
+    def result(self, timeout=None):
+        """
+        Args:
+            timeout (None or float): Max time to wait per modality, in seconds. If None, waits indefinitely
+
+        Returns:
+            dict: Keyword-mapped observations of all frames
+        """
+        obs = dict()
+        for prefix, frame in self.frames.items():
+            for modality, value in frame.result(timeout=timeout).items():
+                obs[f"{prefix}_{modality}"] = value
+        obs.update(self._obs)
+        return obs
+
+
+class RawBufferSource:
+    """
+    Source of raw sensor buffers. Snapshots are taken synchronously, and must not be modified by the source
+    afterwards, since they are post-processed asynchronously
+    """
+
+    def snapshot(self, modalities):
+        """
+        Args:
+            modalities (list of str): Modalities to snapshot
+
+        Returns:
+            dict: Maps each modality in @modalities to its raw buffer
+        """
+        raise NotImplementedError
+
+
+def _copy_buffer(buffer):
+    """
+    Args:
+        buffer (any): Raw buffer, or tuple of raw buffers
+
+    Returns:
+        any: @buffer, with all of its arrays copied
+    """
+    if isinstance(buffer, np.ndarray):
+        return buffer.copy()
+    if isinstance(buffer, tuple):
+        return tuple(_copy_buffer(buf) for buf in buffer)
+    return buffer
+
+
+class FunctionRawBufferSource(RawBufferSource):
+    """
+    Source of raw buffers grabbed by an arbitrary function, e.g.: reading a sensor's render products. Arrays are copied
+    so that they stay valid even if the underlying buffers are overwritten by the next render
+    """
+
+    def __init__(self, fcn):
+        """
+        Args:
+            fcn (function): Function grabbing the raw buffers. Signature:
+
+                raw = fcn(modalities)
+
+                where @modalities is a list of modality names and @raw maps each of them to its raw buffer
+        """
+        self.fcn = fcn
+
+    def snapshot(self, modalities):
+        return {modality: _copy_buffer(buffer) for modality, buffer in self.fcn(modalities).items()}
+
+
+class MockRawBufferSource(RawBufferSource):
+    """
+    Headless source of synthetic raw vision buffers, for testing and benchmarking. Random buffers are generated once
+    per modality, and each snapshot copies one of them, like reading back a render product. The id of each snapshot is
+    written into the first element of every buffer, so that mixed frames can be detected
+    """
+
+    def __init__(self, image_height=128, image_width=128, n_distinct=4, seed=0):
+        """
+        Args:
+            image_height (int): Height of generated images, in pixels
+            image_width (int): Width of generated images, in pixels
+            n_distinct (int): No. of distinct random buffers generated per modality, cycled through by snapshots
+            seed (int): Seed of the random generator
+        """
+        self.image_height = image_height
+        self.image_width = image_width
+        self.n_distinct = n_distinct
+        self.n_snapshots = 0
+        self._rng = np.random.default_rng(seed)
+        self._buffers = dict()
+
+    def _generate(self, modality):
+        h, w, rng = self.image_height, self.image_width, self._rng
+        generators = dict(
+            rgb=lambda: rng.integers(0, 256, (h, w, 4), dtype=np.uint8),
+            depth=lambda: rng.random((h, w), dtype=np.float32),
+            depth_linear=lambda: rng.random((h, w), dtype=np.float32) * 10.0,
+            normal=lambda: rng.uniform(-1.0, 1.0, (h, w, 3)).astype(np.float32),
+            seg_semantic=lambda: rng.integers(0, 64, (h, w), dtype=np.uint32),
+            seg_instance=lambda: rng.integers(0, 1024, (h, w), dtype=np.uint32),
+            flow=lambda: rng.normal(size=(h, w, 3)).astype(np.float32),
+        )
+        return [generators[modality]() for _ in range(self.n_distinct)]
+
+    def get_snapshot(self, snapshot_id, modalities):
+        """
+        Reproduces the raw buffers of a past snapshot, e.g.: to verify its processed observations
+
+        Args:
+            snapshot_id (int): Id of the snapshot, i.e.: the no. of snapshots taken before it
+            modalities (list of str): Modalities to reproduce
+
+        Returns:
+            dict: Maps each modality in @modalities to its raw buffer
+        """
+        raw = dict()
+        for modality in modalities:
+            if modality not in self._buffers:
+                self._buffers[modality] = self._generate(modality)
+            buffer = self._buffers[modality][snapshot_id % self.n_distinct].copy()
+            buffer.reshape(-1)[0] = snapshot_id % 256 if buffer.dtype == np.uint8 else snapshot_id
+            raw[modality] = buffer
+        return raw
+
+    def snapshot(self, modalities):
+        raw = self.get_snapshot(snapshot_id=self.n_snapshots, modalities=modalities)
+        self.n_snapshots += 1
+        return raw
+
+
+class AsyncObservationPipeline:
+    """
+    Pipeline that snapshots raw buffers from a RawBufferSource on the calling thread, and post-processes each modality
+    on a worker pool into preallocated, multi-buffered output arrays.
+
+    Frames are assigned output buffers round-robin. Submitting a frame blocks until the frame that previously used its
+    buffers has been fully processed, so the outputs of different frames are never mixed, and at most @n_buffers
+    frames are in flight at once
+    """
+
+    def __init__(self, source, processors, n_workers=None, n_buffers=None, executor=None):
+        """
+        Args:
+            source (RawBufferSource): Source of the raw buffers
+            processors (dict): Maps modality names to the ModalityProcessor post-processing them. Modalities without
+                a processor are copied as-is
+            n_workers (None or int): No. of worker threads. If None, will use m.N_WORKERS. Only used if @executor
+                is not specified
+            n_buffers (None or int): No. of output buffers per modality. If None, will use m.N_BUFFERS
+            executor (None or concurrent.futures.Executor): If specified, executor to share with other pipelines.
+                Otherwise, a new thread pool is created and owned by this pipeline
+        """
+        self.source = source
+        self.processors = dict(processors)
+        self.n_buffers = m.N_BUFFERS if n_buffers is None else n_buffers
+        self._owns_executor = executor is None
+        self._executor = ThreadPoolExecutor(
+            max_workers=m.N_WORKERS if n_workers is None else n_workers,
+            thread_name_prefix="obs_pipeline",
+        ) if executor is None else executor
+
+        self._next_frame_id = 0
+        self._slots = [dict() for _ in range(self.n_buffers)]       # Output buffers of each slot, per modality
+        self._slot_frames = [None] * self.n_buffers                 # Frame that last used each slot
+        self.latencies = dict()                                     # Maps modality names to LatencyHistogram
+        self.frame_latencies = LatencyHistogram()
+
+    def _process(self, modality, raw, out, submit_t, frame_state):
+        processor = self.processors.get(modality, None)
+        obs = copy_into(raw, out) if processor is None else processor.fcn(raw, out)
+        t = time.perf_counter()
+        self.latencies[modality].add(t - submit_t, t=t)
+        with frame_state["lock"]:
+            frame_state["n_remaining"] -= 1
+            if frame_state["n_remaining"] == 0:
+                self.frame_latencies.add(t - submit_t, t=t)
+        return obs
+
+    def submit(self, modalities):
+        """
+        Snapshots the raw buffers of @modalities, and schedules their post-processing
+
+        Args:
+            modalities (list of str): Modalities to process
+
+        Returns:
+            ObservationFrame: Handle to the frame being processed
+        """
+        frame_id = self._next_frame_id
+        self._next_frame_id += 1
+        slot_idx = frame_id % self.n_buffers
+
+        # Make sure the frame that last used this slot's buffers is done with them
+        previous_frame = self._slot_frames[slot_idx]
+        if previous_frame is not None:
+            previous_frame.result()
+
+        # Snapshot synchronously, then process asynchronously
+        raw = self.source.snapshot(modalities)
+        submit_t = time.perf_counter()
+        slot = self._slots[slot_idx]
+        frame_state = dict(lock=threading.Lock(), n_remaining=len(raw))
+        futures = dict()
+        for modality, buffer in raw.items():
+            if modality not in slot:
+                processor = self.processors.get(modality, None)
+                slot[modality] = None if processor is None else processor.allocate()
+            if modality not in self.latencies:
+                self.latencies[modality] = LatencyHistogram()
+            futures[modality] = self._executor.submit(
+                self._process, modality, buffer, slot[modality], submit_t, frame_state)
+
+        frame = ObservationFrame(frame_id=frame_id, futures=futures)
+        self._slot_frames[slot_idx] = frame
+        return frame
+
+    def reset_stats(self):
+        """
+        Clears all latency histograms
+        """
+        for histogram in self.latencies.values():
+            histogram.reset()
+        self.frame_latencies.reset()
+
+    def shutdown(self):
+        """
+        Waits for all in-flight frames, and shuts down the worker pool if it is owned by this pipeline
+        """
+        for frame in self._slot_frames:
+            if frame is not None:
+                frame.result()
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
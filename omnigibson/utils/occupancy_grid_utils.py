@@ -0,0 +1,139 @@
+"""
+Helper utility functions for rasterizing 2D range scans into egocentric occupancy grids
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from omnigibson.utils.constants import OccupancyGridState
+
+
+# Pixel values of each occupancy grid state in the uint8 grid being rasterized
+UNKNOWN_VALUE = int(OccupancyGridState.UNKNOWN * 2.0)
+FREESPACE_VALUE = int(OccupancyGridState.FREESPACE * 2.0)
+OBSTACLES_VALUE = int(OccupancyGridState.OBSTACLES * 2.0)
+
+
+def get_beam_directions(horizontal_fov, horizontal_resolution):
+    """
+    Args:
+        horizontal_fov (float): Horizontal field of view of the scan, in degrees
+        horizontal_resolution (float): Degrees in between each horizontal scan hit
+
+    Returns:
+        (N, 3) array: (x,y,z) unit vector of each beam of the scan, in the scan sensor's frame
+    """
+    angles = np.arange(
+        -np.radians(horizontal_fov / 2),
+        np.radians(horizontal_fov / 2),
+        np.radians(horizontal_resolution),
+    )
+    return np.stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)], axis=1)
+
+
+@lru_cache(maxsize=None)
+def get_disk_offsets(radius):
+    """
+    Args:
+        radius (int): Radius of the filled disk, in pixels
+
+    Returns:
+        (K, 2) array: (x,y) pixel offsets from the center of all pixels covered by a filled disk of radius @radius, as
+            drawn by cv2.circle(). Read-only
+    """
+    size = 2 * radius + 3
+    canvas = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(img=canvas, center=(radius + 1, radius + 1), radius=radius, color=1, thickness=-1)
+    rows, cols = np.nonzero(canvas)
+    offsets = np.stack([cols, rows], axis=1).astype(np.int64) - (radius + 1)
+    offsets.flags.writeable = False
+    return offsets
+
+
+def stamp_disks(grid, centers, radius, value):
+    """
+    Stamps filled disks onto @grid in place, matching cv2.circle(..., thickness=-1) called once per center
+
+    Args:
+        grid (2D-array): Image to stamp the disks onto
+        centers ((M, 2) int array): (x,y) pixel center of each disk. Disks may lie partially or fully out of @grid
+        radius (int): Radius of each disk, in pixels
+        value (int): Value to set all pixels covered by any disk to
+    """
+    pixels = (np.asarray(centers, dtype=np.int64)[:, None, :] + get_disk_offsets(radius)[None, :, :]).reshape(-1, 2)
+    height, width = grid.shape[:2]
+    in_bounds = (pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)
+    pixels = pixels[in_bounds]
+    grid[pixels[:, 1], pixels[:, 0]] = value
+
+
+class OccupancyGridRasterizer:
+    """
+    Rasterizes 2D scans, expressed in the egocentric frame of the grid, into an occupancy grid. All scan-independent
+    parts of the grid (its unknown-valued background and the always-free inner disk) are precomputed once.
+
+    For each scan, obstacle disks are stamped at every hit (but not at the scan's origin), and the polygon spanned by
+    the scan's origin and hits is marked as free space. When multiple scans are rasterized at once, e.g.: accumulated over time, the free space of
+    all past scans is marked first, followed by the obstacles of all scans, and finally the free space of the current
+    scan, so that the current scan always takes precedence
+    """
+
+    def __init__(self, resolution, grid_range, inner_radius, obstacle_radius=2):
+        """
+        Args:
+            resolution (int): Height == width of the occupancy grid, in pixels
+            grid_range (float): Range of the occupancy grid, in meters
+            inner_radius (int): Radius of the inner disk of the grid that is assumed to be free space, in pixels
+            obstacle_radius (int): Radius of the obstacle disk stamped at each scan hit, in pixels
+        """
+        self.resolution = resolution
+        self.grid_range = grid_range
+        self.inner_radius = inner_radius
+        self.obstacle_radius = obstacle_radius
+
+        # Precompute the background and the inner free space mask
+        self._background = np.full((resolution, resolution), UNKNOWN_VALUE, dtype=np.uint8)
+        inner = np.zeros((resolution, resolution), dtype=np.uint8)
+        cv2.circle(img=inner, center=(resolution // 2, resolution // 2), radius=inner_radius, color=1, thickness=-1)
+        self._inner_mask = inner.astype(bool)
+
+    def to_grid(self, points):
+        """
+        Args:
+            points ((N, 2) array): (x,y) points in the egocentric frame of the grid, in meters
+
+        Returns:
+            (N, 2) int32 array: (x,y) pixel of each point in the grid, with the y-axis flipped
+        """
+        points = np.array(points, dtype=float)
+        points[:, 1] *= -1
+        return (points / self.grid_range * self.resolution + (self.resolution / 2)).astype(np.int32)
+
+    def rasterize(self, scans):
+        """
+        Args:
+            scans (list of 2-tuple): Scans to rasterize, ordered from oldest to current. Each scan is a tuple
+                (origin, hits), where origin is the (x,y) location the scan originates from and hits is a (N, 2) array
+                of the (x,y) locations hit by the scan, both expressed in the egocentric frame of the grid, in meters
+
+        Returns:
+            2D-array: (resolution, resolution)-sized uint8 array of the occupancy grid, with values
+                2 * OccupancyGridState
+        """
+        grid = self._background.copy()
+        polygons = []
+        for origin, hits in scans:
+            origin = np.reshape(origin, (1, 2))
+            polygons.append(self.to_grid(np.concatenate([origin, hits, origin], axis=0)))
+
+        # Free space of past scans, then obstacles at the hits of all scans, then free space of the current scan. Scan
+        # origins are the sensor's past and current locations, and so are not obstacles
+        for polygon in polygons[:-1]:
+            cv2.fillPoly(img=grid, pts=polygon.reshape((1, -1, 1, 2)), color=FREESPACE_VALUE, lineType=1)
+        stamp_disks(grid=grid, centers=np.concatenate([polygon[1:-1] for polygon in polygons], axis=0),
+                    radius=self.obstacle_radius, value=OBSTACLES_VALUE)
+        cv2.fillPoly(img=grid, pts=polygons[-1].reshape((1, -1, 1, 2)), color=FREESPACE_VALUE, lineType=1)
+        grid[self._inner_mask] = FREESPACE_VALUE
+
+        return grid
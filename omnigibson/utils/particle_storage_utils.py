@@ -0,0 +1,382 @@
+"""
+Array-backed storage for macro particles. Instead of one prim per particle, all particles of a system are stored in
+contiguous arrays, so that particles can be added, removed, transformed and serialized in bulk
+"""
+import numpy as np
+
+import omnigibson.utils.batch_transform_utils as BT
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Initial no. of particles the arrays are allocated for. Capacity is doubled whenever it is exceeded
+m.INITIAL_CAPACITY = 64
+
+
+class MacroParticleStorage:
+    """
+    Contiguous storage of the unique ids, local poses, scales, attachment groups and attachment links of a set of
+    particles. Each particle's pose is expressed in the frame of the link it is attached to, and scaled by that link's
+    scale, or in the world frame if it is not attached to any link.
+
+    Particles are stored in insertion order, and removing particles preserves the relative order of the remaining ones.
+    Groups and links are interned into integer ids, where -1 means that a particle belongs to no group / link.
+    """
+
+    def __init__(self, initial_capacity=None):
+        """
+        Args:
+            initial_capacity (None or int): No. of particles to initially allocate the arrays for. If None, will
+                use m.INITIAL_CAPACITY
+        """
+        self._n = 0
+        self._allocate(m.INITIAL_CAPACITY if initial_capacity is None else initial_capacity)
+
+        # Interned groups and links
+        self._groups = dict()
+        self._next_group_id = 0
+        self._links = []
+        self._link_to_id = dict()
+
+        # Lazily built mapping from particle ids to their indices
+        self._idn_to_idx = None
+
+    def _allocate(self, capacity):
+        """
+        (Re-)allocates the arrays with capacity @capacity, keeping the current particles
+
+        Args:
+            capacity (int): No. of particles to allocate the arrays for
+        """
+        capacity = max(int(capacity), 1)
+        arrays = dict(
+            _idns=np.zeros(capacity, dtype=np.int64),
+            _positions=np.zeros((capacity, 3)),
+            _orientations=np.zeros((capacity, 4)),
+            _scales=np.ones((capacity, 3)),
+            _group_ids=np.full(capacity, -1, dtype=np.int32),
+            _link_ids=np.full(capacity, -1, dtype=np.int32),
+        )
+        for attr, arr in arrays.items():
+            if self._n > 0:
+                arr[:self._n] = getattr(self, attr)[:self._n]
+            setattr(self, attr, arr)
+
+    @property
+    def n_particles(self):
+        """
+        Returns:
+            int: No. of particles in this storage
+        """
+        return self._n
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def idns(self):
+        """
+        Returns:
+            n-array: (N,) unique id of each particle. Read-only view
+        """
+        return self._view(self._idns)
+
+    @property
+    def positions(self):
+        """
+        Returns:
+            n-array: (N, 3) (x,y,z) position of each particle in its link's (scaled) frame. Read-only view
+        """
+        return self._view(self._positions)
+
+    @property
+    def orientations(self):
+        """
+        Returns:
+            n-array: (N, 4) (x,y,z,w) quaternion orientation of each particle in its link's frame. Read-only view
+        """
+        return self._view(self._orientations)
+
+    @property
+    def scales(self):
+        """
+        Returns:
+            n-array: (N, 3) (x,y,z) scale of each particle in its link's frame. Read-only view
+        """
+        return self._view(self._scales)
+
+    @property
+    def group_ids(self):
+        """
+        Returns:
+            n-array: (N,) id of the group each particle belongs to, or -1. Read-only view
+        """
+        return self._view(self._group_ids)
+
+    @property
+    def link_ids(self):
+        """
+        Returns:
+            n-array: (N,) id of the link each particle is attached to, or -1. Read-only view
+        """
+        return self._view(self._link_ids)
+
+    def _view(self, arr):
+        view = arr[:self._n]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def groups(self):
+        """
+        Returns:
+            dict: Maps each group name to its id, in creation order
+        """
+        return dict(self._groups)
+
+    @property
+    def links(self):
+        """
+        Returns:
+            list: Interned links, where the link with id i is links[i]
+        """
+        return list(self._links)
+
+    def add_group(self, name):
+        """
+        Args:
+            name (str): Name of the group to add
+
+        Returns:
+            int: Id of the newly added group. Ids of removed groups are never reused
+        """
+        assert name not in self._groups, f"Group {name} already exists!"
+        self._groups[name] = self._next_group_id
+        self._next_group_id += 1
+        return self._groups[name]
+
+    def remove_group(self, name):
+        """
+        Removes group @name and all of its particles
+
+        Args:
+            name (str): Name of the group to remove
+        """
+        self.remove(self.get_group_indices(name))
+        self._groups.pop(name)
+
+    def get_group_id(self, name):
+        """
+        Args:
+            name (None or str): Name of the group
+
+        Returns:
+            int: Id of group @name, or -1 if @name is None
+        """
+        return -1 if name is None else self._groups[name]
+
+    def get_group_indices(self, name):
+        """
+        Args:
+            name (str): Name of the group
+
+        Returns:
+            n-array: Indices of the particles in group @name, in storage order
+        """
+        return np.flatnonzero(self.group_ids == self._groups[name])
+
+    def get_link_ids(self, links):
+        """
+        Interns @links, i.e.: assigns a unique id to each link the first time it is seen
+
+        Args:
+            links (list of None or any): Links to intern, where None means no link
+
+        Returns:
+            n-array: Id of each link in @links, where None maps to -1
+        """
+        link_ids = np.empty(len(links), dtype=np.int32)
+        for i, link in enumerate(links):
+            if link is None:
+                link_ids[i] = -1
+                continue
+            link_id = self._link_to_id.get(link)
+            if link_id is None:
+                link_id = len(self._links)
+                self._links.append(link)
+                self._link_to_id[link] = link_id
+            link_ids[i] = link_id
+        return link_ids
+
+    def add(self, idns, positions, orientations=None, scales=None, group=None, links=None):
+        """
+        Adds particles to this storage
+
+        Args:
+            idns (n-array): (N,) unique id of each particle. Should not already exist in this storage
+            positions (n-array): (N, 3) (x,y,z) position of each particle in its link's (scaled) frame
+            orientations (None or n-array): (N, 4) (x,y,z,w) quaternion orientation of each particle in its link's
+                frame. If not specified, all will be set to canonical orientation (0, 0, 0, 1)
+            scales (None or n-array): (N, 3) (x,y,z) scale of each particle. If not specified, all will be set to 1
+            group (None or str): Name of the group all particles belong to, if any
+            links (None or list): Link each particle is attached to, where None means no link. If not specified, no
+                particle is attached to any link
+
+        Returns:
+            n-array: (N,) indices of the added particles
+        """
+        idns = np.asarray(idns, dtype=np.int64).reshape(-1)
+        n_new = len(idns)
+        if self._n + n_new > len(self._idns):
+            self._allocate(max(2 * len(self._idns), self._n + n_new))
+
+        idxs = np.arange(self._n, self._n + n_new)
+        self._idns[idxs] = idns
+        self._positions[idxs] = np.asarray(positions).reshape(n_new, 3)
+        self._orientations[idxs] = [0, 0, 0, 1.0] if orientations is None else \
+            np.asarray(orientations).reshape(n_new, 4)
+        self._scales[idxs] = 1.0 if scales is None else np.asarray(scales).reshape(n_new, 3)
+        self._group_ids[idxs] = self.get_group_id(group)
+        self._link_ids[idxs] = -1 if links is None else self.get_link_ids(links)
+        self._n += n_new
+
+        if self._idn_to_idx is not None:
+            self._idn_to_idx.update(zip(idns.tolist(), idxs.tolist()))
+            assert len(self._idn_to_idx) == self._n, "Cannot add particles with ids that already exist!"
+
+        return idxs
+
+    def remove(self, idxs):
+        """
+        Removes particles from this storage, preserving the relative order of the remaining particles
+
+        Args:
+            idxs (n-array): Indices of the particles to remove
+        """
+        idxs = np.asarray(idxs, dtype=int).reshape(-1)
+        if len(idxs) == 0:
+            return
+        keep = np.ones(self._n, dtype=bool)
+        keep[idxs] = False
+        n_keep = int(keep.sum())
+        for arr in (self._idns, self._positions, self._orientations, self._scales, self._group_ids, self._link_ids):
+            arr[:n_keep] = arr[:self._n][keep]
+        self._n = n_keep
+        self._idn_to_idx = None
+
+    def clear(self):
+        """
+        Removes all particles and groups from this storage. Interned links are kept
+        """
+        self._n = 0
+        self._groups = dict()
+        self._idn_to_idx = None
+
+    def get_indices(self, idns):
+        """
+        Args:
+            idns (n-array): (N,) unique ids of particles in this storage
+
+        Returns:
+            n-array: (N,) index of each particle
+        """
+        if self._idn_to_idx is None:
+            self._idn_to_idx = dict(zip(self.idns.tolist(), range(self._n)))
+        return np.array([self._idn_to_idx[idn] for idn in np.asarray(idns).reshape(-1).tolist()], dtype=int)
+
+    def set_local_poses(self, idxs, positions=None, orientations=None):
+        """
+        Args:
+            idxs (n-array): (N,) indices of the particles to modify
+            positions (None or n-array): If specified, (N, 3) (x,y,z) positions in the particles' link frames
+            orientations (None or n-array): If specified, (N, 4) (x,y,z,w) quaternion orientations in the particles'
+                link frames
+        """
+        if positions is not None:
+            self._positions[:self._n][idxs] = positions
+        if orientations is not None:
+            self._orientations[:self._n][idxs] = orientations
+
+    def set_scales(self, idxs, scales):
+        """
+        Args:
+            idxs (n-array): (N,) indices of the particles to modify
+            scales (n-array): (N, 3) (x,y,z) scales of the particles
+        """
+        self._scales[:self._n][idxs] = scales
+
+    def get_link_transforms(self, link_ids):
+        """
+        Args:
+            link_ids (n-array): (N,) link ids, where -1 means the world frame
+
+        Returns:
+            3-tuple:
+                - n-array: (N, 3) (x,y,z) world position of each link
+                - n-array: (N, 4) (x,y,z,w) world quaternion orientation of each link
+                - n-array: (N, 3) (x,y,z) scale of each link
+        """
+        link_ids = np.asarray(link_ids, dtype=int)
+        # Query each unique link only once
+        unique_ids, inverse = np.unique(link_ids, return_inverse=True)
+        link_positions, link_orientations, link_scales = np.zeros((len(unique_ids), 3)), \
+            np.tile([0, 0, 0, 1.0], (len(unique_ids), 1)), np.ones((len(unique_ids), 3))
+        for i, link_id in enumerate(unique_ids.tolist()):
+            if link_id >= 0:
+                link = self._links[link_id]
+                link_positions[i], link_orientations[i] = link.get_position_orientation()
+                link_scales[i] = link.scale
+        return link_positions[inverse], link_orientations[inverse], link_scales[inverse]
+
+    def get_world_transforms(self, idxs=None, link_transforms=None):
+        """
+        Args:
+            idxs (None or n-array): (N,) indices of the particles to query. If None, all particles are queried
+            link_transforms (None or 3-tuple): If specified, the transforms of the links the queried particles are
+                attached to, as returned by get_link_transforms(). Otherwise, they are queried
+
+        Returns:
+            3-tuple:
+                - n-array: (N, 3) (x,y,z) world position of each particle
+                - n-array: (N, 4) (x,y,z,w) world quaternion orientation of each particle
+                - n-array: (N, 3) (x,y,z) scale of each particle, multiplied by the scale of its link
+        """
+        idxs = slice(None) if idxs is None else idxs
+        link_positions, link_orientations, link_scales = self.get_link_transforms(self.link_ids[idxs]) \
+            if link_transforms is None else link_transforms
+        positions, orientations = BT.pose_transform(
+            link_positions, link_orientations, link_scales * self.positions[idxs], self.orientations[idxs])
+        return positions, orientations, self.scales[idxs] * link_scales
+
+    def get_world_poses(self, idxs=None):
+        """
+        Args:
+            idxs (None or n-array): (N,) indices of the particles to query. If None, all particles are queried
+
+        Returns:
+            2-tuple:
+                - n-array: (N, 3) (x,y,z) world position of each particle
+                - n-array: (N, 4) (x,y,z,w) world quaternion orientation of each particle
+        """
+        return self.get_world_transforms(idxs=idxs)[:2]
+
+    def world_to_local(self, link_ids, positions, orientations):
+        """
+        Converts world poses into poses in the (scaled) frames of the links @link_ids
+
+        Args:
+            link_ids (n-array): (N,) link ids, where -1 means the world frame
+            positions (n-array): (N, 3) (x,y,z) world positions
+            orientations (n-array): (N, 4) (x,y,z,w) world quaternion orientations
+
+        Returns:
+            2-tuple:
+                - n-array: (N, 3) (x,y,z) positions in the link frames
+                - n-array: (N, 4) (x,y,z,w) quaternion orientations in the link frames
+        """
+        link_positions, link_orientations, link_scales = self.get_link_transforms(link_ids)
+        local_positions, local_orientations = BT.relative_pose_transform(
+            positions, orientations, link_positions, link_orientations)
+        return local_positions / link_scales, local_orientations
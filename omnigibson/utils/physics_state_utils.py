@@ -0,0 +1,326 @@
+"""
+Tracking of the simulation's physical state, and per-step snapshots of articulations' physical states shared among
+all of their consumers.
+
+Nothing in this module depends on omni: the dynamic control interface is only accessed through the prims' own handles,
+so that snapshot caching can be verified headless.
+"""
+import numpy as np
+
+import omnigibson as og
+from omnigibson.utils.spatial_utils import m as spatial_macros
+
+
+# Counter of explicit writes to the physical state (poses, velocities, joint states) of any prim. Together with the
+# simulator's physics step index, this determines whether per-step physical state snapshots are still valid
+_PHYSICS_STATE_VERSION = 0
+
+# Prim paths of all prims that were explicitly moved since the scene's spatial index was last refreshed. Only tracked
+# if the scene maintains a spatial index
+_MOVED_PRIM_PATHS = set()
+
+
+def mark_physics_state_dirty(prim_path=None):
+    """
+    Invalidates all per-step physical state snapshots. Should be called whenever the physical state of any prim is
+    explicitly set, or the simulation is stepped outside of the simulator's step() call
+
+    Args:
+        prim_path (None or str): If specified, prim path of the prim that was explicitly moved, e.g.: by setting its
+            pose or joint positions. It is kept track of until collected via pop_moved_prim_paths(), so that the
+            scene's spatial index only needs to refresh the moved objects
+    """
+    global _PHYSICS_STATE_VERSION
+    _PHYSICS_STATE_VERSION += 1
+    if prim_path is not None and spatial_macros.USE_SCENE_INDEX:
+        _MOVED_PRIM_PATHS.add(prim_path)
+
+
+def pop_moved_prim_paths():
+    """
+    Returns:
+        set of str: Prim paths of all prims that were explicitly moved (see mark_physics_state_dirty()) since the last
+            call to this function
+    """
+    moved_prim_paths = set(_MOVED_PRIM_PATHS)
+    _MOVED_PRIM_PATHS.clear()
+    return moved_prim_paths
+
+
+def get_physics_state_key():
+    """
+    Returns:
+        2-tuple: Key identifying the current physical state of the simulation, composed of the simulator's physics step
+            index and the number of explicit physical state writes so far. Per-step physical state snapshots are
+            valid for as long as this key does not change
+    """
+    return og.sim.current_time_step_index, _PHYSICS_STATE_VERSION
+
+
+class ArticulationState:
+    """
+    Read-only snapshot of an articulation's physical state, backed by a single flat array with the following layout:
+
+        [root position (3), root orientation (4), root linear velocity (3), root angular velocity (3),
+         joint positions (n), joint velocities (n), joint efforts (n)]
+
+    where n is the articulation's number of DOFs. All quantities are expressed in the world frame.
+    """
+
+    ROOT_STATE_SIZE = 13
+
+    def __init__(self, buffer, n_dof):
+        """
+        Args:
+            buffer (n-array): (ArticulationState.size(n_dof),) array holding the snapshot values. Note that this
+                array is not copied, so it may be a slice of a larger array shared by multiple articulations
+            n_dof (int): Number of DOFs of the articulation
+        """
+        self._n_dof = n_dof
+        self._array = self._read_only(buffer)
+        self._root_position = self._read_only(buffer[0:3])
+        self._root_orientation = self._read_only(buffer[3:7])
+        self._root_linear_velocity = self._read_only(buffer[7:10])
+        self._root_angular_velocity = self._read_only(buffer[10:13])
+        start = self.ROOT_STATE_SIZE
+        self._joint_positions = self._read_only(buffer[start:start + n_dof])
+        self._joint_velocities = self._read_only(buffer[start + n_dof:start + 2 * n_dof])
+        self._joint_efforts = self._read_only(buffer[start + 2 * n_dof:start + 3 * n_dof])
+
+    @staticmethod
+    def _read_only(arr):
+        view = arr.view()
+        view.flags.writeable = False
+        return view
+
+    @classmethod
+    def size(cls, n_dof):
+        """
+        Args:
+            n_dof (int): Number of DOFs of the articulation
+
+        Returns:
+            int: Size of the flat array backing the snapshot of an articulation with @n_dof DOFs
+        """
+        return cls.ROOT_STATE_SIZE + 3 * n_dof
+
+    @property
+    def n_dof(self):
+        return self._n_dof
+
+    @property
+    def array(self):
+        """
+        Returns:
+            n-array: Read-only view of the flat array backing this snapshot
+        """
+        return self._array
+
+    @property
+    def root_position(self):
+        return self._root_position
+
+    @property
+    def root_orientation(self):
+        return self._root_orientation
+
+    @property
+    def root_linear_velocity(self):
+        return self._root_linear_velocity
+
+    @property
+    def root_angular_velocity(self):
+        return self._root_angular_velocity
+
+    @property
+    def joint_positions(self):
+        return self._joint_positions
+
+    @property
+    def joint_velocities(self):
+        return self._joint_velocities
+
+    @property
+    def joint_efforts(self):
+        return self._joint_efforts
+
+
+class ArticulationStateBuffer:
+    """
+    Preallocated flat array holding the articulation state snapshots of a fixed set of entity prims, where each prim's
+    snapshot occupies one contiguous slice (see ArticulationState for the layout of each slice). Calling update()
+    refreshes every stale snapshot in place, so the whole array can be consumed at once, e.g.: as an observation.
+    """
+
+    def __init__(self, prims):
+        """
+        Args:
+            prims (list of EntityPrim): Initialized entity prims whose snapshots should be stored in this buffer
+        """
+        self._prims = list(prims)
+        sizes = [prim.articulation_state_size for prim in self._prims]
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+        self._array = np.zeros(self._offsets[-1])
+        self._slices = []
+        for prim, start, end in zip(self._prims, self._offsets[:-1], self._offsets[1:]):
+            self._slices.append(self._array[start:end])
+            prim.set_articulation_state_buffer(self._slices[-1])
+
+    def is_valid(self, prims):
+        """
+        Args:
+            prims (list of EntityPrim): Entity prims whose snapshots should be stored in this buffer
+
+        Returns:
+            bool: Whether this buffer holds exactly the snapshots of @prims, in order, i.e.: none of them was added,
+                removed or re-assigned a different buffer since this buffer was created
+        """
+        return len(prims) == len(self._prims) and all(
+            prim is own_prim and prim._articulation_state_buffer is buffer
+            for prim, own_prim, buffer in zip(prims, self._prims, self._slices)
+        )
+
+    def update(self):
+        """
+        Refreshes the snapshots of all prims in this buffer, if they are stale
+
+        Returns:
+            n-array: Read-only view of the flat array holding all snapshots
+        """
+        for prim in self._prims:
+            prim.get_articulation_state()
+        return self.array
+
+    def get_slice(self, prim):
+        """
+        Args:
+            prim (EntityPrim): Prim stored in this buffer
+
+        Returns:
+            slice: Slice of the array returned by update() corresponding to @prim's snapshot
+        """
+        idx = self._prims.index(prim)
+        return slice(self._offsets[idx], self._offsets[idx + 1])
+
+    @property
+    def prims(self):
+        return tuple(self._prims)
+
+    @property
+    def array(self):
+        """
+        Returns:
+            n-array: Read-only view of the flat array holding all snapshots
+        """
+        view = self._array.view()
+        view.flags.writeable = False
+        return view
+
+
+class ArticulationStateMixin:
+    """
+    Adds per-step articulation state snapshots to an articulated prim. Inheriting classes must set the following
+    attributes:
+
+        _dc: dynamic control interface
+        _handle: articulation handle
+        _root_handle: root rigid body handle
+        _n_dof (int): no. of DOFs of the articulation
+        _articulation_state, _articulation_state_key, _articulation_state_buffer: initially None
+
+    and implement _articulation_state_accessible and _dof_states_accessible, as well as get_position_orientation(),
+    get_linear_velocity() and get_angular_velocity() to read the root state whenever the snapshot is not accessible.
+    """
+
+    # Flags passed to the dynamic control interface's get_articulation_dof_states() to read all DOF states at once
+    _ALL_DOF_STATES = None
+
+    @property
+    def _articulation_state_accessible(self):
+        """
+        Returns:
+            bool: Whether this entity's root link and DOF states can be read directly from the physics backend, in which
+                case they can be bundled into a single shared articulation state snapshot
+        """
+        raise NotImplementedError()
+
+    @property
+    def _dof_states_accessible(self):
+        """
+        Returns:
+            bool: Whether this entity's DOF states can be read from the physics backend
+        """
+        raise NotImplementedError()
+
+    @property
+    def articulation_state_size(self):
+        """
+        Returns:
+            int: Size of the flat array backing this entity's articulation state snapshot
+        """
+        return ArticulationState.size(n_dof=self._n_dof)
+
+    def set_articulation_state_buffer(self, buffer):
+        """
+        Sets the array in which this entity's articulation state snapshots are written, e.g.: a slice of a
+        scene-wide array shared by multiple entities
+
+        Args:
+            buffer (None or n-array): (articulation_state_size,) array to write snapshots into. None results in
+                this entity allocating its own array
+        """
+        assert buffer is None or buffer.shape == (self.articulation_state_size,), \
+            f"Articulation state buffer must have shape ({self.articulation_state_size},), got {buffer.shape}!"
+        self._articulation_state_buffer = buffer
+        self._articulation_state = None
+        self._articulation_state_key = None
+
+    def invalidate_articulation_state(self):
+        """
+        Marks this entity's articulation state snapshot as stale, so that it is re-fetched on the next access
+        """
+        self._articulation_state_key = None
+
+    def get_articulation_state(self):
+        """
+        Grabs a snapshot of this entity's root link pose and velocities and all of its DOF states. While the simulator
+        is running, the snapshot is fetched from the physics backend with a single call per quantity and shared among
+        all consumers until physics is stepped or any physics state is set, so that e.g.: proprioception, controllers
+        and state dumping do not each query the backend separately.
+
+        Returns:
+            ArticulationState: Read-only snapshot of this entity's articulation state. Note that the snapshot's arrays
+                are overwritten in place once it is refreshed, so they should be copied if they need to be kept
+        """
+        accessible = self._articulation_state_accessible
+        key = get_physics_state_key()
+        if accessible and self._articulation_state is not None and key == self._articulation_state_key:
+            return self._articulation_state
+
+        # Refresh the snapshot in place
+        if self._articulation_state_buffer is None:
+            self._articulation_state_buffer = np.zeros(self.articulation_state_size)
+        if self._articulation_state is None:
+            self._articulation_state = ArticulationState(buffer=self._articulation_state_buffer, n_dof=self._n_dof)
+        buffer = self._articulation_state_buffer
+        start = ArticulationState.ROOT_STATE_SIZE
+        if accessible:
+            pose = self._dc.get_rigid_body_pose(self._root_handle)
+            buffer[0:3] = pose.p
+            buffer[3:7] = pose.r
+            buffer[7:10] = self._dc.get_rigid_body_linear_velocity(self._root_handle)
+            buffer[10:13] = self._dc.get_rigid_body_angular_velocity(self._root_handle)
+        else:
+            buffer[0:3], buffer[3:7] = self.get_position_orientation()
+            buffer[7:10] = self.get_linear_velocity()
+            buffer[10:13] = self.get_angular_velocity()
+        if self._dof_states_accessible:
+            dof_states = self._dc.get_articulation_dof_states(self._handle, self._ALL_DOF_STATES)
+            buffer[start:start + self._n_dof] = dof_states["pos"]
+            buffer[start + self._n_dof:start + 2 * self._n_dof] = dof_states["vel"]
+            buffer[start + 2 * self._n_dof:start + 3 * self._n_dof] = dof_states["effort"]
+
+        # Only share the snapshot if it was read directly from the physics backend
+        self._articulation_state_key = key if accessible else None
+
+        return self._articulation_state
@@ -0,0 +1,293 @@
+"""
+Lightweight, toggleable instrumentation for profiling the phases of the simulator step. Timers are nested, so that
+each one is keyed by its path within the currently active timers, e.g.: "step/non_physics/object_states/Temperature".
+When disabled, entering a timer costs a single attribute check.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether the global profiler is enabled upon startup
+m.ENABLED = os.getenv("OMNIGIBSON_PROFILE", "False").lower() in {"true", "1", "t"}
+
+# No. of most recent durations kept per timer to compute rolling percentiles
+m.WINDOW_SIZE = 1000
+
+# Max no. of most recent timer events kept for exporting a Chrome trace
+m.MAX_TRACE_EVENTS = 100000
+
+
+class TimerStats:
+    """
+    Statistics of all completed runs of a single timer
+    """
+
+    def __init__(self, window_size=m.WINDOW_SIZE):
+        """
+        Args:
+            window_size (int): No. of most recent durations kept to compute rolling percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = 0.0
+        self.memory_delta = 0
+        self.durations = deque(maxlen=window_size)
+
+    def add(self, duration, memory_delta=0):
+        """
+        Args:
+            duration (float): Duration of the run, in seconds
+            memory_delta (int): Change in traced memory during the run, in bytes
+        """
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+        self.memory_delta += memory_delta
+        self.durations.append(duration)
+
+    @property
+    def mean(self):
+        """
+        Returns:
+            float: Mean duration over all runs, in seconds
+        """
+        return self.total / max(self.count, 1)
+
+    def percentile(self, q):
+        """
+        Args:
+            q (float): Percentile to compute, in [0, 100]
+
+        Returns:
+            float: @q-th percentile of the most recent durations, in seconds
+        """
+        return float(np.percentile(self.durations, q)) if len(self.durations) > 0 else 0.0
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Keyword-mapped statistics, with durations in seconds and memory deltas in bytes
+        """
+        return dict(
+            count=self.count,
+            total=self.total,
+            mean=self.mean,
+            min=self.min if self.count > 0 else 0.0,
+            max=self.max,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+            memory_delta=self.memory_delta,
+        )
+
+
+class _NullTimer:
+    """
+    Timer returned while profiling is disabled, doing nothing
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """
+    Timer of a single run, recording its duration under its path within the active timers of the current thread
+    """
+    __slots__ = ("_profiler", "_name", "_path", "_start", "_memory")
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        stack = self._profiler._get_stack()
+        self._path = f"{stack[-1]}/{self._name}" if len(stack) > 0 else self._name
+        stack.append(self._path)
+        self._memory = tracemalloc.get_traced_memory()[0] if self._profiler.track_memory else 0
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        end = time.perf_counter()
+        memory_delta = tracemalloc.get_traced_memory()[0] - self._memory if self._profiler.track_memory else 0
+        self._profiler._get_stack().pop()
+        self._profiler._record(self._name, self._path, self._start, end, memory_delta)
+        return False
+
+
+class Profiler:
+    """
+    Collects nested timers, keeping per-timer call counts, durations, rolling percentiles and (optionally) traced
+    memory deltas, as well as a bounded log of timer events that can be exported as a Chrome trace
+    (chrome://tracing or https://ui.perfetto.dev)
+    """
+
+    def __init__(self, enabled=False, track_memory=False):
+        """
+        Args:
+            enabled (bool): Whether to start profiling right away
+            track_memory (bool): Whether to also trace memory deltas of each timer with tracemalloc. Note that this
+                significantly slows down all Python allocations while enabled
+        """
+        self.enabled = False
+        self.track_memory = False
+        self._started_tracemalloc = False
+        self._local = threading.local()
+        self.reset()
+        if enabled:
+            self.enable(track_memory=track_memory)
+
+    def enable(self, track_memory=False):
+        """
+        Enables profiling
+
+        Args:
+            track_memory (bool): Whether to also trace memory deltas of each timer with tracemalloc
+        """
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.track_memory = track_memory
+        self.enabled = True
+
+    def disable(self):
+        """
+        Disables profiling. Any collected statistics are kept until reset() is called
+        """
+        self.enabled = False
+        self.track_memory = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        """
+        Clears all collected statistics and trace events
+        """
+        self._stats = dict()
+        self._events = deque(maxlen=m.MAX_TRACE_EVENTS)
+        self._t0 = time.perf_counter()
+
+    def timer(self, name):
+        """
+        Times the enclosed block, nested within the currently active timers, e.g.:
+
+            with profiler.timer("physics"):
+                ...
+
+        Args:
+            name (str): Name of the timer. Should not contain "/"
+
+        Returns:
+            context manager: Timer of the enclosed block, doing nothing if profiling is disabled
+        """
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def _get_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name, path, start, end, memory_delta):
+        stats = self._stats.get(path, None)
+        if stats is None:
+            stats = self._stats[path] = TimerStats()
+        stats.add(end - start, memory_delta)
+        self._events.append((name, path, start, end, threading.get_ident(), memory_delta))
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict: Maps the path of each timer to its TimerStats
+        """
+        return self._stats
+
+    def summary(self):
+        """
+        Returns:
+            dict: Maps the path of each timer to its keyword-mapped statistics, see TimerStats.to_dict()
+        """
+        return {path: stats.to_dict() for path, stats in self._stats.items()}
+
+    def report(self, sort_by="total"):
+        """
+        Args:
+            sort_by (str): Statistic to sort timers by within the same parent, e.g.: "total" or "mean". Timers are
+                always listed after their parent
+
+        Returns:
+            str: Human-readable table of the statistics of all timers, with durations in milliseconds
+        """
+        summary = self.summary()
+        show_memory = any(stats.memory_delta != 0 for stats in self._stats.values())
+
+        def sort_key(path):
+            # Sort by each ancestor's statistic in descending order, so that timers are listed within their parent
+            parts = path.split("/")
+            return [(-summary.get("/".join(parts[:i + 1]), {}).get(sort_by, 0.0), part) for i, part in enumerate(parts)]
+
+        lines = [f"{'timer':<60} {'count':>8} {'total':>10} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}"
+                 + (f" {'mem (KB)':>10}" if show_memory else "")]
+        for path in sorted(summary, key=sort_key):
+            s = summary[path]
+            name = "  " * path.count("/") + path.rsplit("/", 1)[-1]
+            line = f"{name:<60} {s['count']:>8} {s['total'] * 1e3:>10.3f} " + " ".join(
+                f"{s[key] * 1e3:>9.3f}" for key in ("mean", "p50", "p99", "max"))
+            if show_memory:
+                line += f" {s['memory_delta'] / 1e3:>10.1f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def export_json(self, fpath):
+        """
+        Exports the statistics of all timers as JSON
+
+        Args:
+            fpath (str): Path of the JSON file to write
+        """
+        with open(fpath, "w") as f:
+            json.dump(self.summary(), f, indent=4)
+
+    def export_chrome_trace(self, fpath):
+        """
+        Exports the most recent timer events in the Chrome trace event format
+
+        Args:
+            fpath (str): Path of the JSON file to write
+        """
+        pid = os.getpid()
+        events = [
+            dict(name=name, cat=path.split("/", 1)[0], ph="X", pid=pid, tid=tid,
+                 ts=(start - self._t0) * 1e6, dur=(end - start) * 1e6,
+                 args=dict(path=path, memory_delta=memory_delta))
+            for name, path, start, end, tid, memory_delta in self._events
+        ]
+        with open(fpath, "w") as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit="ms"), f)
+
+
+# Global profiler instrumenting the simulator step
+PROFILER = Profiler(enabled=m.ENABLED)
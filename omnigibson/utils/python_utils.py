@@ -4,7 +4,7 @@ A set of utility functions for general python usage
 import inspect
 from abc import ABCMeta
 from copy import deepcopy
-from collections import Iterable
+from collections.abc import Iterable
 from functools import wraps
 from importlib import import_module
 
@@ -399,8 +399,10 @@ class Registerable:
         # print(f"registry: {cls._cls_registry}", cls.__name__ not in cls._cls_registry)
         # print(f"do not register: {cls._do_not_register_classes}", cls.__name__ not in cls._do_not_register_classes)
         # input()
-        if cls.__name__ not in cls._cls_registry and cls.__name__ not in cls._do_not_register_classes:
-            cls._cls_registry[cls.__name__] = cls
+        # Note: setdefault does not trigger the population of lazy registries, since this is called while their
+        # classes are being imported
+        if cls.__name__ not in cls._do_not_register_classes:
+            cls._cls_registry.setdefault(cls.__name__, cls)
 
     @classproperty
     def _do_not_register_classes(cls):
@@ -0,0 +1,1117 @@
+"""
+Batched ray-casting utilities.
+
+Rays are cast through a pluggable backend (see RaycastBackend), and the results are returned as a RaycastResults
+object wrapping contiguous numpy arrays instead of one Python dictionary per hit. Rigid body and collision prim paths
+are interned into integer ids so that downstream consumers can filter and group hits with vectorized numpy ops.
+
+Two backends are provided:
+
+    - PhysXRaycastBackend: queries omni's PhysX scene query interface (or any object exposing the same
+        raycast_closest / raycast_all API, e.g.: a mock for headless testing)
+    - MeshRaycastBackend: queries a vectorized scene representation composed of per-link triangle BVHs that are
+        refit from the link poses, and can therefore run entirely on CPU without omni. Every scene keeps one up to
+        date with its objects' collision meshes, which is used by default if m.USE_MESH_BACKEND is set
+"""
+import numpy as np
+
+import omnigibson as og
+from omnigibson.macros import create_module_macros
+import omnigibson.utils.batch_transform_utils as BT
+import omnigibson.utils.transform_utils as T
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether batched raycasts default to the current scene's MeshRaycastBackend instead of PhysX's scene queries
+m.USE_MESH_BACKEND = False
+
+# Number of triangles stored in each leaf of a mesh BVH
+m.BVH_LEAF_SIZE = 16
+
+# Maximum number of children of each internal BVH node, and number of meshes stored in each leaf of the top-level BVH
+m.BVH_BRANCHING = 4
+
+# Maximum number of (ray, triangle) pairs tested at once by the mesh backend. Bounds peak memory usage
+m.MAX_RAY_TRIANGLE_PAIRS = 2 ** 20
+
+# Numerical tolerance used for ray / triangle and ray / box intersection tests
+m.RAY_EPS = 1e-9
+
+
+# Structured dtype used to store a single ray hit
+RAY_HIT_DTYPE = np.dtype([
+    ("hit", np.bool_),
+    ("position", np.float64, (3,)),
+    ("normal", np.float64, (3,)),
+    ("distance", np.float64),
+    ("rigid_body", np.int32),
+    ("collision", np.int32),
+])
+
+
+class PrimPathInterner:
+    """
+    Bidirectional mapping between absolute prim paths and compact integer ids. Ids are assigned in insertion order
+    and are never reused, so they remain valid for as long as the interner is alive. Id -1 is reserved for "no path".
+    """
+
+    def __init__(self):
+        self._ids = dict()
+        self._paths = []
+        # Lazily-generated numpy array of paths, used for batched reverse lookups
+        self._paths_array = None
+
+    def intern(self, path):
+        """
+        Args:
+            path (None or str): Absolute prim path to intern
+
+        Returns:
+            int: Id corresponding to @path (-1 if @path is None)
+        """
+        if path is None:
+            return -1
+        idx = self._ids.get(path, None)
+        if idx is None:
+            idx = len(self._paths)
+            self._ids[path] = idx
+            self._paths.append(path)
+            self._paths_array = None
+        return idx
+
+    def intern_batch(self, paths):
+        """
+        Args:
+            paths (list of str): Absolute prim paths to intern
+
+        Returns:
+            n-array: Ids corresponding to @paths
+        """
+        return np.array([self.intern(path) for path in paths], dtype=np.int32)
+
+    def get_id(self, path, default=-1):
+        """
+        Args:
+            path (str): Absolute prim path to look up
+            default (int): Value to return if @path has never been interned
+
+        Returns:
+            int: Id corresponding to @path, without interning it
+        """
+        return self._ids.get(path, default)
+
+    def get_path(self, idx):
+        """
+        Args:
+            idx (int): Id to look up
+
+        Returns:
+            None or str: Prim path corresponding to @idx (None if @idx is -1)
+        """
+        return None if idx < 0 else self._paths[idx]
+
+    def get_paths(self, ids):
+        """
+        Args:
+            ids (n-array): Ids to look up
+
+        Returns:
+            n-array: Object array of prim paths corresponding to @ids, with None for ids that are -1
+        """
+        if self._paths_array is None:
+            self._paths_array = np.array(self._paths + [None], dtype=object)
+        # -1 maps to the trailing None entry
+        return self._paths_array[np.asarray(ids, dtype=np.int64)]
+
+    def __len__(self):
+        return len(self._paths)
+
+
+# Interner shared by all backends by default, so that ids are comparable across queries
+PRIM_PATH_INTERNER = PrimPathInterner()
+
+
+class RaycastResults:
+    """
+    Results from a batched raycast. All per-hit information is stored in the structured array @hits
+    (of dtype RAY_HIT_DTYPE), where entry i corresponds to ray @ray_indices[i].
+
+    If only the closest hits were requested, there is exactly one entry per ray (with "hit" = False if that ray did not
+    hit anything) and @ray_indices is simply arange(n_rays). Otherwise, there is one entry per hit encountered, sorted
+    by ray index and then by distance, and rays that hit nothing have no entries.
+    """
+
+    def __init__(self, hits, ray_indices, n_rays, only_closest, interner=PRIM_PATH_INTERNER):
+        """
+        Args:
+            hits (n-array): Structured array of dtype RAY_HIT_DTYPE
+            ray_indices (n-array): Ray index corresponding to each entry in @hits
+            n_rays (int): Total number of rays cast
+            only_closest (bool): Whether @hits only contains the closest hit for each ray
+            interner (PrimPathInterner): Interner used to map rigid body / collision ids back to prim paths
+        """
+        self.hits = hits
+        self.ray_indices = ray_indices
+        self.n_rays = n_rays
+        self.only_closest = only_closest
+        self.interner = interner
+
+    @classmethod
+    def empty(cls, n_rays, only_closest, interner=PRIM_PATH_INTERNER):
+        """
+        Creates a results object with no hits for @n_rays rays
+
+        Args:
+            n_rays (int): Number of rays cast
+            only_closest (bool): Whether these results should be in closest-hit form
+            interner (PrimPathInterner): Interner used to map ids back to prim paths
+
+        Returns:
+            RaycastResults: Empty results
+        """
+        n = n_rays if only_closest else 0
+        hits = np.zeros(n, dtype=RAY_HIT_DTYPE)
+        hits["rigid_body"] = -1
+        hits["collision"] = -1
+        return cls(hits=hits, ray_indices=np.arange(n), n_rays=n_rays, only_closest=only_closest, interner=interner)
+
+    def __len__(self):
+        return len(self.hits)
+
+    @property
+    def hit(self):
+        """
+        Returns:
+            n-array: Whether each entry is a valid hit
+        """
+        return self.hits["hit"]
+
+    @property
+    def positions(self):
+        """
+        Returns:
+            (n, 3)-array: (x,y,z) global hit positions. Zero for entries that did not hit anything
+        """
+        return self.hits["position"]
+
+    @property
+    def normals(self):
+        """
+        Returns:
+            (n, 3)-array: (x,y,z) normals of the faces hit. Zero for entries that did not hit anything
+        """
+        return self.hits["normal"]
+
+    @property
+    def distances(self):
+        """
+        Returns:
+            n-array: Distance from each ray's start point at which the hit occurred
+        """
+        return self.hits["distance"]
+
+    @property
+    def rigid_body_ids(self):
+        """
+        Returns:
+            n-array: Interned rigid body ids hit (-1 for no hit)
+        """
+        return self.hits["rigid_body"]
+
+    @property
+    def collision_ids(self):
+        """
+        Returns:
+            n-array: Interned collision geom ids hit (-1 for no hit)
+        """
+        return self.hits["collision"]
+
+    @property
+    def rigid_bodies(self):
+        """
+        Returns:
+            n-array: Object array of absolute USD paths to the rigid bodies hit (None for no hit)
+        """
+        return self.interner.get_paths(self.rigid_body_ids)
+
+    @property
+    def collisions(self):
+        """
+        Returns:
+            n-array: Object array of absolute USD paths to the collision geoms hit (None for no hit)
+        """
+        return self.interner.get_paths(self.collision_ids)
+
+    def closest(self):
+        """
+        Returns:
+            RaycastResults: Results reduced to only the closest hit for each ray
+        """
+        if self.only_closest:
+            return self
+        closest = RaycastResults.empty(n_rays=self.n_rays, only_closest=True, interner=self.interner)
+        if len(self.hits) > 0:
+            # Entries are sorted by (ray, distance), so the first entry for each ray is its closest hit
+            rays, first_idxs = np.unique(self.ray_indices, return_index=True)
+            closest.hits[rays] = self.hits[first_idxs]
+        return closest
+
+    def to_dicts(self):
+        """
+        Converts these results into the legacy per-hit dictionary format returned by raytest / raytest_batch
+
+        Returns:
+            list of dict or list of list of dict: If these are closest-hit results, one dict per ray. Otherwise, one
+                (possibly empty) list of dicts per ray. See raytest_batch for the dictionary keys
+        """
+        rigid_bodies, collisions = self.rigid_bodies, self.collisions
+        dicts = [
+            {
+                "hit": True,
+                "position": hit["position"].copy(),
+                "normal": hit["normal"].copy(),
+                "distance": float(hit["distance"]),
+                "collision": collision,
+                "rigidBody": rigid_body,
+            } if hit["hit"] else {"hit": False}
+            for hit, rigid_body, collision in zip(self.hits, rigid_bodies, collisions)
+        ]
+        if self.only_closest:
+            return dicts
+        per_ray = [[] for _ in range(self.n_rays)]
+        for ray_idx, hit_dict in zip(self.ray_indices, dicts):
+            per_ray[ray_idx].append(hit_dict)
+        return per_ray
+
+
+class RaycastBackend:
+    """
+    Base class for a batched raycast backend. Subclasses must implement _cast.
+    """
+
+    def __init__(self, interner=PRIM_PATH_INTERNER):
+        """
+        Args:
+            interner (PrimPathInterner): Interner used to map rigid body / collision paths to ids
+        """
+        self.interner = interner
+
+    def cast(self, origins, directions, distances, only_closest=True, ignore_bodies=None, ignore_collisions=None):
+        """
+        Casts a batch of rays
+
+        Args:
+            origins ((n, 3)-array): (x,y,z) global start locations of the rays
+            directions ((n, 3)-array): (x,y,z) normalized global directions of the rays
+            distances (n-array): Maximum distance to cast each ray
+            only_closest (bool): Whether we report only the closest hit for each ray or all hits
+            ignore_bodies (None or list of str): If specified, absolute USD paths to rigid bodies whose collisions
+                should be ignored
+            ignore_collisions (None or list of str): If specified, absolute USD paths to collision geoms whose
+                collisions should be ignored
+
+        Returns:
+            RaycastResults: Results for all rays
+        """
+        if len(origins) == 0:
+            return RaycastResults.empty(n_rays=0, only_closest=only_closest, interner=self.interner)
+        return self._cast(
+            origins=origins,
+            directions=directions,
+            distances=distances,
+            only_closest=only_closest,
+            ignore_bodies=set() if ignore_bodies is None else set(ignore_bodies),
+            ignore_collisions=set() if ignore_collisions is None else set(ignore_collisions),
+        )
+
+    def _cast(self, origins, directions, distances, only_closest, ignore_bodies, ignore_collisions):
+        """
+        Casts a non-empty batch of rays. Arguments are the same as for self.cast, except @ignore_bodies and
+        @ignore_collisions are always sets
+
+        Returns:
+            RaycastResults: Results for all rays
+        """
+        raise NotImplementedError()
+
+
+class PhysXRaycastBackend(RaycastBackend):
+    """
+    Backend that queries PhysX's scene query interface. The interface only exposes per-ray queries, so rays are still
+    issued one at a time, but all numpy <-> Python conversions are done once for the whole batch, and hits are
+    collected as raw tuples and written into the structured results array with a single assignment.
+    """
+
+    def __init__(self, scene_query_interface=None, interner=PRIM_PATH_INTERNER):
+        """
+        Args:
+            scene_query_interface (None or object): Object exposing PhysX's raycast_closest(origin, dir, distance) and
+                raycast_all(origin, dir, distance, reportFn) API. If None, omni's PhysX scene query interface will be
+                used. This can be used to inject a mock interface for headless testing
+            interner (PrimPathInterner): Interner used to map rigid body / collision paths to ids
+        """
+        super().__init__(interner=interner)
+        self._sqi = scene_query_interface
+
+    @property
+    def scene_query_interface(self):
+        """
+        Returns:
+            object: PhysX scene query interface used by this backend
+        """
+        if self._sqi is None:
+            # Import here so that this module can be used without omni
+            from omni.physx import get_physx_scene_query_interface
+            self._sqi = get_physx_scene_query_interface()
+        return self._sqi
+
+    def _cast(self, origins, directions, distances, only_closest, ignore_bodies, ignore_collisions):
+        sqi = self.scene_query_interface
+        intern = self.interner.intern
+        n_rays = len(origins)
+        rays = zip(origins.tolist(), directions.tolist(), distances.tolist())
+        hit_tuples, ray_indices = [], []
+
+        # For efficiency's sake, we handle special case of no ignore_bodies, ignore_collisions, and closest_hit
+        if only_closest and len(ignore_bodies) == 0 and len(ignore_collisions) == 0:
+            for i, (origin, direction, distance) in enumerate(rays):
+                hit = sqi.raycast_closest(origin=origin, dir=direction, distance=distance)
+                if hit["hit"]:
+                    hit_tuples.append((
+                        True, hit["position"], hit["normal"], hit["distance"],
+                        intern(hit["rigidBody"]), intern(hit["collision"]),
+                    ))
+                    ray_indices.append(i)
+
+        # Otherwise, collect all hits per ray as raw tuples and filter them
+        else:
+            for i, (origin, direction, distance) in enumerate(rays):
+                ray_hits = []
+
+                def callback(hit):
+                    # Only add to hits if we're not ignoring this body or collision
+                    if hit.rigid_body not in ignore_bodies and hit.collision not in ignore_collisions:
+                        ray_hits.append((hit.distance, hit.position, hit.normal, hit.rigid_body, hit.collision))
+                    # We always want to continue traversing to collect all hits
+                    return True
+
+                sqi.raycast_all(origin=origin, dir=direction, distance=distance, reportFn=callback)
+                ray_hits.sort(key=lambda ray_hit: ray_hit[0])
+                if only_closest:
+                    ray_hits = ray_hits[:1]
+                for dist, position, normal, rigid_body, collision in ray_hits:
+                    hit_tuples.append((True, position, normal, dist, intern(rigid_body), intern(collision)))
+                    ray_indices.append(i)
+
+        hits = np.array(hit_tuples, dtype=RAY_HIT_DTYPE)
+        ray_indices = np.array(ray_indices, dtype=np.int64)
+        if only_closest:
+            results = RaycastResults.empty(n_rays=n_rays, only_closest=True, interner=self.interner)
+            results.hits[ray_indices] = hits
+            return results
+        return RaycastResults(
+            hits=hits, ray_indices=ray_indices, n_rays=n_rays, only_closest=False, interner=self.interner,
+        )
+
+
+def build_bvh(lower, upper, leaf_size, branching=None):
+    """
+    Builds a bounding volume hierarchy over a set of axis-aligned bounding boxes. Items are recursively split in half
+    along the longest axis of their centroid bounds until fixed-size leaves remain, so that each leaf is spatially
+    compact. Consecutive nodes are then grouped bottom-up into parent nodes until a single root node remains.
+
+    Args:
+        lower ((n, 3)-array): (x,y,z) lower corners of the items' AABBs
+        upper ((n, 3)-array): (x,y,z) upper corners of the items' AABBs
+        leaf_size (int): Maximum number of items per leaf
+        branching (None or int): Maximum number of children per internal node. None defaults to m.BVH_BRANCHING
+
+    Returns:
+        2-tuple:
+            - n-array: Order of the items, such that each leaf covers a contiguous range of reordered items
+            - dict: Node arrays "lower", "upper" (AABB corners), "first", "count" (range of children for internal
+                nodes, or of reordered items for leaves) and "is_leaf", and the index of the "root" node
+    """
+    branching = m.BVH_BRANCHING if branching is None else branching
+    n_items = len(lower)
+    assert n_items > 0, "Cannot build a BVH over no items!"
+
+    # Sort items spatially. Splits always occur at multiples of the leaf size, so that every leaf but the last is full
+    centroids = (lower + upper) / 2.0
+    order = np.arange(n_items)
+    ranges = [(0, n_items)]
+    while len(ranges) > 0:
+        start, end = ranges.pop()
+        if end - start <= leaf_size:
+            continue
+        idxs = order[start:end]
+        axis = np.argmax(np.ptp(centroids[idxs], axis=0))
+        order[start:end] = idxs[np.argsort(centroids[idxs, axis], kind="stable")]
+        mid = start + max(leaf_size, (end - start) // (2 * leaf_size) * leaf_size)
+        ranges += [(start, mid), (mid, end)]
+
+    # Leaves come first, followed by each level of internal nodes, with the root last
+    firsts = [np.arange(0, n_items, leaf_size)]
+    counts = [np.minimum(leaf_size, n_items - firsts[0])]
+    lowers = [np.minimum.reduceat(lower[order], firsts[0], axis=0)]
+    uppers = [np.maximum.reduceat(upper[order], firsts[0], axis=0)]
+    level_start = 0
+    while len(firsts[-1]) > 1:
+        n_children = len(firsts[-1])
+        child_starts = np.arange(0, n_children, branching)
+        firsts.append(level_start + child_starts)
+        counts.append(np.minimum(branching, n_children - child_starts))
+        lowers.append(np.minimum.reduceat(lowers[-1], child_starts, axis=0))
+        uppers.append(np.maximum.reduceat(uppers[-1], child_starts, axis=0))
+        level_start += n_children
+    is_leaf = np.zeros(level_start + 1, dtype=bool)
+    is_leaf[:len(firsts[0])] = True
+
+    return order, {
+        "lower": np.concatenate(lowers),
+        "upper": np.concatenate(uppers),
+        "first": np.concatenate(firsts),
+        "count": np.concatenate(counts),
+        "is_leaf": is_leaf,
+        "root": level_start,
+    }
+
+
+class MeshBVH:
+    """
+    Bounding volume hierarchy over a static triangle mesh, expressed in the mesh's own (link) frame. See build_bvh for
+    how the hierarchy is built.
+    """
+
+    def __init__(self, vertices, faces, leaf_size=None):
+        """
+        Args:
+            vertices ((V, 3)-array): (x,y,z) vertex positions in the link frame
+            faces ((F, 3)-array): Vertex indices for each triangle
+            leaf_size (None or int): Number of triangles per leaf. None defaults to m.BVH_LEAF_SIZE
+        """
+        leaf_size = m.BVH_LEAF_SIZE if leaf_size is None else leaf_size
+        triangles = np.asarray(vertices, dtype=np.float64)[np.asarray(faces, dtype=np.int64)]
+        assert len(triangles) > 0, "Cannot build a BVH over an empty mesh!"
+
+        # Build the hierarchy, and store triangles in leaf order
+        order, self.nodes = build_bvh(lower=triangles.min(axis=1), upper=triangles.max(axis=1), leaf_size=leaf_size)
+        triangles = triangles[order]
+
+        # Precompute edges and normals used by the intersection test
+        self.v0 = triangles[:, 0]
+        self.e1 = triangles[:, 1] - triangles[:, 0]
+        self.e2 = triangles[:, 2] - triangles[:, 0]
+        normals = np.cross(self.e1, self.e2)
+        self.normals = normals / np.maximum(np.linalg.norm(normals, axis=-1, keepdims=True), m.RAY_EPS)
+
+        # Root bounds
+        self.lower = self.nodes["lower"][self.nodes["root"]]
+        self.upper = self.nodes["upper"][self.nodes["root"]]
+
+    @property
+    def n_triangles(self):
+        """
+        Returns:
+            int: Number of triangles in this mesh
+        """
+        return len(self.v0)
+
+    @property
+    def n_nodes(self):
+        """
+        Returns:
+            int: Number of nodes in this mesh's BVH
+        """
+        return len(self.nodes["is_leaf"])
+
+
+def _inverse_directions(directions):
+    """
+    Returns:
+        (n, 3)-array: Inverse of each ray direction, with near-zero components clamped so that it is always finite
+    """
+    return 1.0 / np.where(np.abs(directions) < m.RAY_EPS, m.RAY_EPS, directions)
+
+
+def _slab_test(origins, inv_directions, max_distances, lower, upper):
+    """
+    Slab test between rays and axis-aligned bounding boxes, broadcasting all inputs against each other
+
+    Returns:
+        n-array: Whether each ray intersects its box within its maximum distance
+    """
+    # Reduce over the axes one at a time, which is much faster than reducing over a trailing axis of size 3
+    t_near, t_far = -np.inf, np.inf
+    for axis in range(3):
+        t0 = (lower[..., axis] - origins[..., axis]) * inv_directions[..., axis]
+        t1 = (upper[..., axis] - origins[..., axis]) * inv_directions[..., axis]
+        t_near = np.maximum(t_near, np.minimum(t0, t1))
+        t_far = np.minimum(t_far, np.maximum(t0, t1))
+    return (t_near <= t_far) & (t_far >= 0.0) & (t_near <= max_distances)
+
+
+def ray_aabb_intersect(origins, directions, max_distances, lower, upper):
+    """
+    Vectorized slab test between every ray and every axis-aligned bounding box
+
+    Args:
+        origins ((n, 3)-array): (x,y,z) ray origins
+        directions ((n, 3)-array): (x,y,z) ray directions
+        max_distances (n-array): Maximum distance along each ray
+        lower ((k, 3)-array): (x,y,z) lower corners of the boxes
+        upper ((k, 3)-array): (x,y,z) upper corners of the boxes
+
+    Returns:
+        (n, k)-array: Whether ray i intersects box j within its maximum distance
+    """
+    return _slab_test(
+        origins[:, None, :], _inverse_directions(directions)[:, None, :], max_distances[:, None],
+        lower[None, :, :], upper[None, :, :],
+    )
+
+
+def ray_aabb_intersect_pairs(origins, directions, max_distances, lower, upper):
+    """
+    Vectorized slab test between paired rays and axis-aligned bounding boxes
+
+    Args:
+        origins ((k, 3)-array): (x,y,z) ray origins
+        directions ((k, 3)-array): (x,y,z) ray directions
+        max_distances (k-array): Maximum distance along each ray
+        lower ((k, 3)-array): (x,y,z) lower corners of the box paired with each ray
+        upper ((k, 3)-array): (x,y,z) upper corners of the box paired with each ray
+
+    Returns:
+        k-array: Whether ray i intersects box i within its maximum distance
+    """
+    return _slab_test(origins, _inverse_directions(directions), max_distances, lower, upper)
+
+
+def _cross(a, b):
+    """
+    Row-wise cross product of two (k, 3)-arrays. Avoids np.cross's per-call overhead, which dominates small batches
+    """
+    a0, a1, a2 = a.T
+    b0, b1, b2 = b.T
+    return np.stack((a1 * b2 - a2 * b1, a2 * b0 - a0 * b2, a0 * b1 - a1 * b0), axis=-1)
+
+
+def ray_triangle_intersect_pairs(origins, directions, v0, e1, e2):
+    """
+    Moller-Trumbore intersection for paired rays and triangles
+
+    Args:
+        origins ((k, 3)-array): Ray origins
+        directions ((k, 3)-array): Ray directions
+        v0 ((k, 3)-array): First vertex of the triangle paired with each ray
+        e1 ((k, 3)-array): Edge from the first to the second vertex of each triangle
+        e2 ((k, 3)-array): Edge from the first to the third vertex of each triangle
+
+    Returns:
+        k-array: Distance along each ray to its paired triangle (inf if there is no intersection)
+    """
+    p = _cross(directions, e2)
+    det = np.einsum("ij,ij->i", e1, p)
+    valid = np.abs(det) > m.RAY_EPS
+    inv_det = np.where(valid, 1.0 / np.where(valid, det, 1.0), 0.0)
+    s = origins - v0
+    u = np.einsum("ij,ij->i", s, p) * inv_det
+    q = _cross(s, e1)
+    v = np.einsum("ij,ij->i", directions, q) * inv_det
+    t = np.einsum("ij,ij->i", e2, q) * inv_det
+    valid &= (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+    return np.where(valid, t, np.inf)
+
+
+def _expand_ranges(starts, counts):
+    """
+    Expands index ranges into their elements
+
+    Args:
+        starts (n-array): First index of each range
+        counts (n-array): Number of indices in each range
+
+    Returns:
+        2-tuple:
+            - k-array: Range that each element belongs to
+            - k-array: Index of each element
+    """
+    owners = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, starts[owners] + offsets
+
+
+def _iter_chunks(counts, max_total):
+    """
+    Splits a sequence of items into consecutive chunks whose summed @counts do not exceed @max_total, unless a single
+    item already exceeds it
+
+    Args:
+        counts (n-array): Cost of each item
+        max_total (int): Maximum summed cost per chunk
+
+    Returns:
+        generator: Slices over the items, one per chunk
+    """
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        base = ends[start - 1] if start > 0 else 0
+        end = max(int(np.searchsorted(ends, base + max_total, side="right")), start + 1)
+        yield slice(start, end)
+        start = end
+
+
+def traverse_bvh(origins, directions, max_distances, roots, nodes):
+    """
+    Traverses a (stacked) bounding volume hierarchy with a batch of rays, breadth-first, with all (ray, node) pairs
+    at the same depth tested at once
+
+    Args:
+        origins ((n, 3)-array): (x,y,z) ray origins, in the frame of the nodes they are tested against
+        directions ((n, 3)-array): (x,y,z) ray directions, in the frame of the nodes they are tested against
+        max_distances (n-array): Maximum distance along each ray
+        roots (n-array): Index of the root node each ray starts at
+        nodes (dict): Node arrays, as returned by build_bvh
+
+    Returns:
+        2-tuple:
+            - k-array: Ray index of each (ray, leaf) pair whose leaf AABB the ray intersects
+            - k-array: Leaf index of each such pair
+    """
+    inv_directions = _inverse_directions(directions)
+    rays, node_idxs = np.arange(len(roots)), np.asarray(roots)
+    leaf_rays, leaf_idxs = [], []
+    while len(rays) > 0:
+        hit = _slab_test(
+            origins[rays], inv_directions[rays], max_distances[rays],
+            nodes["lower"][node_idxs], nodes["upper"][node_idxs],
+        )
+        rays, node_idxs = rays[hit], node_idxs[hit]
+        is_leaf = nodes["is_leaf"][node_idxs]
+        leaf_rays.append(rays[is_leaf])
+        leaf_idxs.append(node_idxs[is_leaf])
+        # Descend into the children of all internal nodes hit
+        rays, node_idxs = rays[~is_leaf], node_idxs[~is_leaf]
+        owners, node_idxs = _expand_ranges(nodes["first"][node_idxs], nodes["count"][node_idxs])
+        rays = rays[owners]
+    return np.concatenate(leaf_rays), np.concatenate(leaf_idxs)
+
+
+class MeshRaycastBackend(RaycastBackend):
+    """
+    CPU backend that casts rays against a vectorized scene representation. Each collision mesh is stored as a MeshBVH
+    in its rigid body's frame, and all meshes are stacked into contiguous triangle and node arrays, so that moving a
+    body only requires updating its pose (the "refit" step), after which its world-frame AABB is recomputed and a
+    top-level BVH over all meshes' world AABBs is rebuilt.
+
+    Queries traverse the top-level BVH with all rays at once to find candidate (ray, mesh) pairs, then transform each
+    pair's ray into its mesh's frame and traverse that mesh's BVH, with all meshes handled in the same numpy ops.
+
+    Rigid links added via add_rigid_prim are refit lazily from the simulator whenever rays are cast after the physical
+    state of the simulation has changed. Each scene owns one such backend, which is populated as objects are
+    initialized, and is used by default for batched raycasts if m.USE_MESH_BACKEND is set.
+    """
+
+    def __init__(self, interner=PRIM_PATH_INTERNER):
+        super().__init__(interner=interner)
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all meshes from this backend's scene
+        """
+        # Per-mesh information, aligned by index
+        self._bvhs = []
+        self._rigid_body_ids = np.zeros(0, dtype=np.int32)
+        self._collision_ids = np.zeros(0, dtype=np.int32)
+        self._positions = np.zeros((0, 3))
+        self._orientations = np.zeros((0, 4))
+        # Maps rigid body path to its RigidPrim, if registered via add_rigid_prim
+        self._links = dict()
+        # Physics state key at which the registered links were last refit
+        self._refit_key = None
+        # Cached stacked geometry, regenerated whenever the set of meshes changes
+        self._geometry = None
+        # Cached stacked poses and top-level BVH, regenerated whenever the set of meshes or their poses change
+        self._poses = None
+
+    @property
+    def n_meshes(self):
+        """
+        Returns:
+            int: Number of collision meshes tracked by this backend
+        """
+        return len(self._bvhs)
+
+    def has_rigid_body(self, rigid_body):
+        """
+        Args:
+            rigid_body (str): Absolute USD path to a rigid body
+
+        Returns:
+            bool: Whether @rigid_body has been added to this backend via add_rigid_prim
+        """
+        return rigid_body in self._links
+
+    def add_mesh(self, rigid_body, collision, vertices, faces, position=None, orientation=None):
+        """
+        Adds a triangle mesh to this backend's scene
+
+        Args:
+            rigid_body (str): Absolute USD path to the rigid body owning this mesh
+            collision (str): Absolute USD path to the collision geom corresponding to this mesh
+            vertices ((V, 3)-array): (x,y,z) vertex positions, expressed in the rigid body frame
+            faces ((F, 3)-array): Vertex indices for each triangle
+            position (None or 3-array): (x,y,z) global position of the rigid body. None defaults to the origin
+            orientation (None or 4-array): (x,y,z,w) global orientation of the rigid body. None defaults to identity
+        """
+        self._bvhs.append(MeshBVH(vertices=vertices, faces=faces))
+        self._rigid_body_ids = np.append(self._rigid_body_ids, np.int32(self.interner.intern(rigid_body)))
+        self._collision_ids = np.append(self._collision_ids, np.int32(self.interner.intern(collision)))
+        position = np.zeros(3) if position is None else position
+        orientation = np.array([0, 0, 0, 1.0]) if orientation is None else orientation
+        self._positions = np.concatenate([self._positions, np.reshape(position, (1, 3))])
+        self._orientations = np.concatenate([self._orientations, np.reshape(orientation, (1, 4))])
+        self._geometry = None
+        self._poses = None
+
+    def add_rigid_prim(self, link):
+        """
+        Adds all triangle collision meshes owned by RigidPrim @link to this backend's scene. The link's poses will
+        subsequently be refreshed whenever self.refit() is called
+
+        Args:
+            link (RigidPrim): Rigid link whose collision meshes should be added
+        """
+        # Import here to avoid requiring omni for the rest of this module
+        from omnigibson.utils.usd_utils import mesh_prim_to_trimesh_mesh
+
+        link_pos, link_quat = link.get_position_orientation()
+        for collision_mesh in link.collision_meshes.values():
+            if collision_mesh.prim.GetPrimTypeInfo().GetTypeName() != "Mesh":
+                continue
+            mesh = mesh_prim_to_trimesh_mesh(collision_mesh.prim)
+            if len(mesh.faces) == 0:
+                continue
+            # Express the mesh vertices in the link frame
+            mesh_pos, mesh_quat = collision_mesh.get_position_orientation()
+            world_vertices = (T.quat2mat(mesh_quat) @ (mesh.vertices * collision_mesh.get_world_scale()).T).T + mesh_pos
+            link_vertices = (world_vertices - link_pos) @ T.quat2mat(link_quat)
+            self.add_mesh(
+                rigid_body=link.prim_path,
+                collision=collision_mesh.prim_path,
+                vertices=link_vertices,
+                faces=mesh.faces,
+                position=link_pos,
+                orientation=link_quat,
+            )
+        self._links[link.prim_path] = link
+
+    def remove_rigid_bodies(self, rigid_bodies):
+        """
+        Removes all meshes owned by @rigid_bodies from this backend's scene
+
+        Args:
+            rigid_bodies (list of str): Absolute USD paths to the rigid bodies to remove
+        """
+        keep = ~np.isin(self._rigid_body_ids, self._get_ids(rigid_bodies))
+        self._bvhs = [bvh for bvh, keep_bvh in zip(self._bvhs, keep) if keep_bvh]
+        for attr in ("_rigid_body_ids", "_collision_ids", "_positions", "_orientations"):
+            setattr(self, attr, getattr(self, attr)[keep])
+        for rigid_body in rigid_bodies:
+            self._links.pop(rigid_body, None)
+        self._geometry = None
+        self._poses = None
+
+    def set_rigid_body_poses(self, rigid_bodies, positions, orientations):
+        """
+        Updates the global poses of the requested rigid bodies
+
+        Args:
+            rigid_bodies (list of str): Absolute USD paths to the rigid bodies to update
+            positions ((n, 3)-array): (x,y,z) global positions of the rigid bodies
+            orientations ((n, 4)-array): (x,y,z,w) global orientations of the rigid bodies
+        """
+        body_ids = np.array([self.interner.get_id(rigid_body) for rigid_body in rigid_bodies], dtype=np.int32)
+        if len(body_ids) == 0 or self.n_meshes == 0:
+            return
+        # Match every mesh to the pose of its rigid body, if requested
+        order = np.argsort(body_ids, kind="stable")
+        idxs = np.minimum(np.searchsorted(body_ids[order], self._rigid_body_ids), len(body_ids) - 1)
+        matched = body_ids[order][idxs] == self._rigid_body_ids
+        self._positions[matched] = np.asarray(positions, dtype=np.float64).reshape(-1, 3)[order][idxs[matched]]
+        self._orientations[matched] = np.asarray(orientations, dtype=np.float64).reshape(-1, 4)[order][idxs[matched]]
+        self._poses = None
+
+    def refit(self):
+        """
+        Refreshes the poses of all rigid bodies added via add_rigid_prim from the simulator
+        """
+        poses = [link.get_position_orientation() for link in self._links.values()]
+        if len(poses) > 0:
+            self.set_rigid_body_poses(
+                rigid_bodies=list(self._links.keys()),
+                positions=[pose[0] for pose in poses],
+                orientations=[pose[1] for pose in poses],
+            )
+
+    def _refit_if_stale(self):
+        """
+        Refits all rigid bodies added via add_rigid_prim if the physical state of the simulation has changed since
+        they were last refit
+        """
+        # Import here to avoid requiring omni for the rest of this module
+        from omnigibson.utils.sim_utils import get_physics_state_key
+
+        key = (self.n_meshes, get_physics_state_key())
+        if key != self._refit_key:
+            self.refit()
+            self._refit_key = key
+
+    def _get_ids(self, paths):
+        """
+        Looks up the interned ids of @paths without interning any new paths
+
+        Args:
+            paths (iterable of str): Absolute prim paths to look up
+
+        Returns:
+            n-array: Ids corresponding to @paths, skipping any paths that have never been interned
+        """
+        ids = [self.interner.get_id(path) for path in paths]
+        return np.array([idx for idx in ids if idx >= 0], dtype=np.int32)
+
+    def _get_geometry(self):
+        """
+        Returns:
+            dict: Stacked geometry of all meshes: triangle arrays ("v0", "e1", "e2", "normals"), node arrays ("nodes",
+                in the format returned by build_bvh, with leaves indexing into the triangle arrays), each mesh's
+                root node ("roots") and local root AABB corners ("lower", "upper")
+        """
+        if self._geometry is None:
+            n_tris = np.array([bvh.n_triangles for bvh in self._bvhs])
+            n_nodes = np.array([bvh.n_nodes for bvh in self._bvhs])
+            tri_offsets, node_offsets = np.cumsum(n_tris) - n_tris, np.cumsum(n_nodes) - n_nodes
+            # Leaves index triangles, while internal nodes index other nodes
+            firsts = [bvh.nodes["first"] + np.where(bvh.nodes["is_leaf"], tri_offset, node_offset)
+                      for bvh, tri_offset, node_offset in zip(self._bvhs, tri_offsets, node_offsets)]
+            self._geometry = {
+                "v0": np.concatenate([bvh.v0 for bvh in self._bvhs]),
+                "e1": np.concatenate([bvh.e1 for bvh in self._bvhs]),
+                "e2": np.concatenate([bvh.e2 for bvh in self._bvhs]),
+                "normals": np.concatenate([bvh.normals for bvh in self._bvhs]),
+                "nodes": {
+                    "lower": np.concatenate([bvh.nodes["lower"] for bvh in self._bvhs]),
+                    "upper": np.concatenate([bvh.nodes["upper"] for bvh in self._bvhs]),
+                    "first": np.concatenate(firsts),
+                    "count": np.concatenate([bvh.nodes["count"] for bvh in self._bvhs]),
+                    "is_leaf": np.concatenate([bvh.nodes["is_leaf"] for bvh in self._bvhs]),
+                },
+                "roots": np.array([bvh.nodes["root"] for bvh in self._bvhs]) + node_offsets,
+                "lower": np.array([bvh.lower for bvh in self._bvhs]),
+                "upper": np.array([bvh.upper for bvh in self._bvhs]),
+            }
+        return self._geometry
+
+    def _get_poses(self):
+        """
+        Returns:
+            dict: Stacked per-mesh global positions, (n, 3, 3) rotation matrices, global AABB lower / upper corners,
+                and a top-level BVH over the global AABBs ("nodes", in the format returned by build_bvh, with leaves
+                indexing into "mesh_order")
+        """
+        if self._poses is None:
+            geometry = self._get_geometry()
+            rotations = BT.quat2mat(self._orientations)
+            # Transform the corners of each local AABB to get a (conservative) global AABB
+            corner_selector = np.array(np.meshgrid([0, 1], [0, 1], [0, 1], indexing="ij")).reshape(3, 8).T
+            corners = np.where(corner_selector[None], geometry["upper"][:, None], geometry["lower"][:, None])
+            corners = np.einsum("nij,nkj->nki", rotations, corners) + self._positions[:, None]
+            lower, upper = corners.min(axis=1), corners.max(axis=1)
+            mesh_order, nodes = build_bvh(lower=lower, upper=upper, leaf_size=m.BVH_BRANCHING)
+            self._poses = {
+                "positions": self._positions,
+                "rotations": rotations,
+                "lower": lower,
+                "upper": upper,
+                "mesh_order": mesh_order,
+                "nodes": nodes,
+            }
+        return self._poses
+
+    def _intersect_pairs(self, origins, directions, distances, rays, meshes):
+        """
+        Intersects candidate (ray, mesh) pairs
+
+        Args:
+            origins ((n, 3)-array): (x,y,z) global ray origins
+            directions ((n, 3)-array): (x,y,z) normalized global ray directions
+            distances (n-array): Maximum distance along each ray
+            rays (k-array): Ray index of each pair
+            meshes (k-array): Mesh index of each pair
+
+        Returns:
+            4-tuple: Ray index, mesh index, distance and (x,y,z) global unit normal of the closest hit of each pair that
+                hit its mesh
+        """
+        geometry, poses = self._get_geometry(), self._get_poses()
+        rotations = poses["rotations"][meshes]
+        # Express each ray in its paired mesh's frame
+        local_origins = np.einsum("kji,kj->ki", rotations, origins[rays] - poses["positions"][meshes])
+        local_directions = np.einsum("kji,kj->ki", rotations, directions[rays])
+        max_distances = distances[rays]
+
+        # Find the leaves of each pair's mesh that its ray intersects
+        pairs, leaves = traverse_bvh(
+            local_origins, local_directions, max_distances, roots=geometry["roots"][meshes], nodes=geometry["nodes"])
+
+        # Expand the leaves into their (pair, triangle) candidates, and test them in bounded-size chunks
+        best_t = np.full(len(rays), np.inf)
+        best_tri = np.full(len(rays), -1, dtype=np.int64)
+        leaf_firsts, leaf_counts = geometry["nodes"]["first"][leaves], geometry["nodes"]["count"][leaves]
+        for chunk in _iter_chunks(leaf_counts, m.MAX_RAY_TRIANGLE_PAIRS):
+            leaf_idxs, tris = _expand_ranges(leaf_firsts[chunk], leaf_counts[chunk])
+            tri_pairs = pairs[chunk][leaf_idxs]
+            t = ray_triangle_intersect_pairs(
+                local_origins[tri_pairs], local_directions[tri_pairs],
+                geometry["v0"][tris], geometry["e1"][tris], geometry["e2"][tris],
+            )
+            valid = t <= max_distances[tri_pairs]
+            tri_pairs, tris, t = tri_pairs[valid], tris[valid], t[valid]
+            # Keep the closest triangle for each pair
+            order = np.lexsort((t, tri_pairs))
+            tri_pairs, tris, t = tri_pairs[order], tris[order], t[order]
+            first = np.ones(len(tri_pairs), dtype=bool)
+            first[1:] = tri_pairs[1:] != tri_pairs[:-1]
+            tri_pairs, tris, t = tri_pairs[first], tris[first], t[first]
+            closer = t < best_t[tri_pairs]
+            best_t[tri_pairs[closer]] = t[closer]
+            best_tri[tri_pairs[closer]] = tris[closer]
+
+        hit = best_tri >= 0
+        normals = np.einsum("kij,kj->ki", rotations[hit], geometry["normals"][best_tri[hit]])
+        return rays[hit], meshes[hit], best_t[hit], normals
+
+    def _cast(self, origins, directions, distances, only_closest, ignore_bodies, ignore_collisions):
+        n_rays = len(origins)
+        if len(self._links) > 0:
+            self._refit_if_stale()
+        if self.n_meshes == 0:
+            return RaycastResults.empty(n_rays=n_rays, only_closest=only_closest, interner=self.interner)
+        active = np.ones(self.n_meshes, dtype=bool)
+        if len(ignore_bodies) > 0:
+            active &= ~np.isin(self._rigid_body_ids, self._get_ids(ignore_bodies))
+        if len(ignore_collisions) > 0:
+            active &= ~np.isin(self._collision_ids, self._get_ids(ignore_collisions))
+
+        # Broadphase: find the candidate (ray, mesh) pairs via the top-level BVH, skipping any ignored meshes
+        poses = self._get_poses()
+        rays, leaves = traverse_bvh(
+            origins, directions, distances, roots=np.full(n_rays, poses["nodes"]["root"]), nodes=poses["nodes"])
+        owners, items = _expand_ranges(poses["nodes"]["first"][leaves], poses["nodes"]["count"][leaves])
+        rays, meshes = rays[owners], poses["mesh_order"][items]
+        candidates = active[meshes] & ray_aabb_intersect_pairs(
+            origins[rays], directions[rays], distances[rays], poses["lower"][meshes], poses["upper"][meshes])
+        rays, meshes = rays[candidates], meshes[candidates]
+
+        # Narrowphase on all candidate pairs at once, in bounded-size chunks
+        hit_rays, hit_meshes, hit_ts, hit_normals = [], [], [], []
+        for chunk in _iter_chunks(np.full(len(rays), m.BVH_LEAF_SIZE), m.MAX_RAY_TRIANGLE_PAIRS):
+            for arr, vals in zip((hit_rays, hit_meshes, hit_ts, hit_normals), self._intersect_pairs(
+                    origins, directions, distances, rays[chunk], meshes[chunk])):
+                arr.append(vals)
+
+        if len(hit_rays) == 0:
+            return RaycastResults.empty(n_rays=n_rays, only_closest=only_closest, interner=self.interner)
+
+        rays, meshes, ts, normals = (np.concatenate(arr) for arr in (hit_rays, hit_meshes, hit_ts, hit_normals))
+        # Sort by ray, then by distance
+        order = np.lexsort((ts, rays))
+        rays, meshes, ts, normals = rays[order], meshes[order], ts[order], normals[order]
+        # Normals always face back towards the ray origin
+        flip = np.einsum("ij,ij->i", normals, directions[rays]) > 0
+        normals[flip] *= -1.0
+
+        hits = np.zeros(len(rays), dtype=RAY_HIT_DTYPE)
+        hits["hit"] = True
+        hits["position"] = origins[rays] + directions[rays] * ts[:, None]
+        hits["normal"] = normals
+        hits["distance"] = ts
+        hits["rigid_body"] = self._rigid_body_ids[meshes]
+        hits["collision"] = self._collision_ids[meshes]
+        results = RaycastResults(hits=hits, ray_indices=rays, n_rays=n_rays, only_closest=False, interner=self.interner)
+
+        return results.closest() if only_closest else results
+
+
+# Backend explicitly set to be used by default for all batched raycasts, if any
+_DEFAULT_BACKEND = None
+
+# Backend querying omni's PhysX scene query interface. Lazily created upon first use
+_PHYSX_BACKEND = None
+
+
+def get_raycast_backend():
+    """
+    Returns:
+        RaycastBackend: Backend used by default for batched raycasts. If none has been set, this is the current
+            scene's MeshRaycastBackend if m.USE_MESH_BACKEND is set, and otherwise a PhysXRaycastBackend
+    """
+    global _PHYSX_BACKEND
+    if _DEFAULT_BACKEND is not None:
+        return _DEFAULT_BACKEND
+    if m.USE_MESH_BACKEND and og.sim is not None and og.sim.scene is not None:
+        return og.sim.scene.raycast_backend
+    if _PHYSX_BACKEND is None:
+        _PHYSX_BACKEND = PhysXRaycastBackend()
+    return _PHYSX_BACKEND
+
+
+def set_raycast_backend(backend):
+    """
+    Sets the backend used by default for batched raycasts
+
+    Args:
+        backend (None or RaycastBackend): Backend to use. None resets to the default backend (see get_raycast_backend)
+    """
+    global _DEFAULT_BACKEND
+    _DEFAULT_BACKEND = backend
+
+
+def raycast_batch(start_points, end_points, only_closest=True, ignore_bodies=None, ignore_collisions=None,
+                  backend=None):
+    """
+    Computes raytest collisions for a set of rays cast from @start_points to @end_points.
+
+    Args:
+        start_points ((n, 3)-array): (x,y,z) global start locations of the rays
+        end_points ((n, 3)-array): (x,y,z) global end locations of the rays
+        only_closest (bool): Whether we report the first (closest) hit from each ray or grab all hits
+        ignore_bodies (None or list of str): If specified, specifies absolute USD paths to rigid bodies
+            whose collisions should be ignored
+        ignore_collisions (None or list of str): If specified, specifies absolute USD paths to collision geoms
+            whose collisions should be ignored
+        backend (None or RaycastBackend): Backend to use. None defaults to get_raycast_backend()
+
+    Returns:
+        RaycastResults: Results for all rays
+    """
+    start_points = np.asarray(start_points, dtype=np.float64).reshape(-1, 3)
+    end_points = np.asarray(end_points, dtype=np.float64).reshape(-1, 3)
+    assert start_points.shape == end_points.shape, "Start and end points must have the same shape!"
+    point_diffs = end_points - start_points
+    distances = np.linalg.norm(point_diffs, axis=-1)
+    directions = point_diffs / np.maximum(distances, m.RAY_EPS)[:, None]
+    backend = get_raycast_backend() if backend is None else backend
+    return backend.cast(
+        origins=start_points,
+        directions=directions,
+        distances=distances,
+        only_closest=only_closest,
+        ignore_bodies=ignore_bodies,
+        ignore_collisions=ignore_collisions,
+    )
@@ -4,7 +4,7 @@ A set of utility functions for registering and tracking objects
 import logging
 from inspect import isclass
 import numpy as np
-from collections import Iterable
+from collections.abc import Iterable
 from omnigibson.macros import create_module_macros
 from omnigibson.utils.python_utils import Serializable, SerializableNonInstance, UniquelyNamed
 
@@ -40,7 +40,12 @@ class Registry(UniquelyNamed):
         > object.name in registry
         > object in registry
 
-        If the latter, note that default_key attribute will automatically be used to search for the object
+        If the former, note that default_key attribute will automatically be used to search for the object. If the
+        latter, membership is checked by the object's identity in O(1)
+
+    Objects are stored by identity, and each object remembers the attribute values it is stored under. Adding,
+    removing, and re-keying (via update() or update_object()) an object therefore only touches that object's entries
+    in each mapping, instead of rebuilding the mappings from scratch.
     """
     def __init__(
             self,
@@ -90,9 +95,20 @@ class Registry(UniquelyNamed):
             f"Unique keys: {self.unique_keys}, group keys: {self.group_keys}"
 
         # Create the dicts programmatically
-        for k in self.unique_keys.union(self.group_keys):
+        self._all_keys = frozenset(self.unique_keys.union(self.group_keys))
+        for k in self._all_keys:
             self.__setattr__(f"_objects_by_{k}", dict())
 
+        # Registered objects, keyed by identity, and the attribute values under which each object is currently stored,
+        # so that objects can be removed or re-keyed without recomputing any mappings from scratch
+        self._objects = dict()
+        self._obj_attrs = dict()
+        self._objects_view = None
+
+        # Lookup counters
+        self._n_lookup_hits = 0
+        self._n_lookup_misses = 0
+
         # Run super init
         super().__init__()
 
@@ -110,12 +126,20 @@ class Registry(UniquelyNamed):
         # Make sure that obj is of the correct class type
         assert any([isinstance(obj, class_type) or issubclass(obj, class_type) for class_type in self.class_types]), \
             f"Added object must be either an instance or subclass of one of the following classes: {self.class_types}!"
+        # Objects are stored by identity, so re-adding an already registered object simply refreshes its mappings
+        if self.object_is_registered(obj):
+            self.update_object(obj=obj)
+            return
+        self._objects[id(obj)] = obj
+        self._obj_attrs[id(obj)] = dict()
+        self._objects_view = None
         self._add(obj=obj, keys=self.all_keys)
 
     def _add(self, obj, keys=None):
         """
         Same as self.add, but allows for selective @keys for adding this object to. Useful for internal things,
-        such as internal updating of mappings
+        such as internal updating of mappings. Assumes @obj is already registered and is not currently stored
+        under any of @keys
 
         Args:
             obj (any): Instance to add to this registry
@@ -123,30 +147,64 @@ class Registry(UniquelyNamed):
                 None is default, which corresponds to all keys
         """
         keys = self.all_keys if keys is None else keys
+        obj_attrs = self._obj_attrs[id(obj)]
         for k in keys:
-            obj_attr = self._get_obj_attr(obj=obj, attr=k)
-            # Standardize input as a list
-            obj_attr = obj_attr if \
-                isinstance(obj_attr, Iterable) and not isinstance(obj_attr, str) else [obj_attr]
-
-            # Loop over all values in this attribute and add to all mappings
-            for attr in obj_attr:
-                mapping = self.get_dict(k)
-                if k in self.unique_keys:
-                    # Handle unique case
-                    if attr in mapping:
-                        logging.warning(f"Instance identifier '{k}' should be unique for adding to this registry mapping! Existing {k}: {attr}")
-                        # Special case for "name" attribute, which should ALWAYS be unique
-                        if k == "name":
-                            logging.error(f"For name attribute, objects MUST be unique. Exiting.")
-                            exit(-1)
-                    mapping[attr] = obj
-                else:
-                    # Not unique case
-                    # Possibly initialize list
-                    if attr not in mapping:
-                        mapping[attr] = set()
-                    mapping[attr].add(obj)
+            obj_attrs[k] = self._get_obj_attr_values(obj=obj, attr=k)
+            self._add_to_mapping(obj=obj, key=k, values=obj_attrs[k])
+
+    def _add_to_mapping(self, obj, key, values):
+        """
+        Adds @obj to the mapping corresponding to @key under all of @values
+
+        Args:
+            obj (any): Instance to add
+            key (str): Key whose mapping should be updated
+            values (tuple): All values of @obj's @key attribute
+        """
+        mapping = self.get_dict(key)
+        if key in self.unique_keys:
+            for attr in values:
+                # Handle unique case
+                if attr in mapping and mapping[attr] is not obj:
+                    logging.warning(f"Instance identifier '{key}' should be unique for adding to this registry mapping! Existing {key}: {attr}")
+                    # Special case for "name" attribute, which should ALWAYS be unique
+                    if key == "name":
+                        logging.error(f"For name attribute, objects MUST be unique. Exiting.")
+                        exit(-1)
+                mapping[attr] = obj
+        else:
+            for attr in values:
+                # Not unique case
+                # Possibly initialize set
+                if attr not in mapping:
+                    mapping[attr] = set()
+                mapping[attr].add(obj)
+
+    def _remove_from_mapping(self, obj, key, values):
+        """
+        Removes @obj from the mapping corresponding to @key under all of @values
+
+        Args:
+            obj (any): Instance to remove
+            key (str): Key whose mapping should be updated
+            values (tuple): All values under which @obj is currently stored in this mapping
+        """
+        mapping = self.get_dict(key)
+        if key in self.unique_keys:
+            for attr in values:
+                # Handle unique case -- only pop the value if it still maps to this object, since it may have been
+                # overridden by a different object with the same identifier
+                if mapping.get(attr) is obj:
+                    mapping.pop(attr)
+        else:
+            for attr in values:
+                # Not unique case
+                # We remove the object from the resulting set, and prune the set if it is now empty
+                group = mapping.get(attr)
+                if group is not None:
+                    group.discard(obj)
+                    if len(group) == 0:
+                        mapping.pop(attr)
 
     def remove(self, obj):
         """
@@ -155,45 +213,45 @@ class Registry(UniquelyNamed):
         Args:
             obj (any): Instance to remove from this registry
         """
-        # Iterate over all keys
-        for k in self.all_keys:
-            # Grab the attribute from the object
-            obj_attr = self._get_obj_attr(obj=obj, attr=k)
-            # Standardize input as a list
-            obj_attr = obj_attr if \
-                isinstance(obj_attr, Iterable) and not isinstance(obj_attr, str) else [obj_attr]
-
-            # Loop over all values in this attribute and remove them from all mappings
-            for attr in obj_attr:
-                mapping = self.get_dict(k)
-                if k in self.unique_keys:
-                    # Handle unique case -- in this case, we just directly pop the value from the dictionary
-                    mapping.pop(attr)
-                else:
-                    # Not unique case
-                    # We remove a value from the resulting set
-                    mapping[attr].remove(obj)
-
-    def update(self, keys=None):
+        # We remove the object under the values it was stored with, which may differ from its current attributes
+        obj_attrs = self._obj_attrs.pop(id(obj))
+        self._objects.pop(id(obj))
+        self._objects_view = None
+        for k, values in obj_attrs.items():
+            self._remove_from_mapping(obj=obj, key=k, values=values)
+
+    def update_object(self, obj, keys=None):
         """
-        Updates this registry, refreshing all internal mappings in case an object's value was updated
+        Re-keys a single registered object @obj, in case any of its attribute values were updated. Only mappings whose
+        values actually changed are modified
 
         Args:
+            obj (any): Registered instance to re-key
             keys (None or str or set or list of str): Which object keys to update. None is default, which corresponds
                 to all keys
         """
-        objects = self.objects
         keys = self.all_keys if keys is None else \
-            (keys if type(keys) in {tuple, list} else [keys])
-
-        # Delete and re-create all keys mappings
+            (keys if type(keys) in {tuple, list, set} else [keys])
+        obj_attrs = self._obj_attrs[id(obj)]
         for k in keys:
-            self.__delattr__(f"_objects_by_{k}")
-            self.__setattr__(f"_objects_by_{k}", dict())
+            old_values = obj_attrs.get(k, ())
+            new_values = self._get_obj_attr_values(obj=obj, attr=k)
+            if new_values == old_values:
+                continue
+            self._remove_from_mapping(obj=obj, key=k, values=old_values)
+            self._add_to_mapping(obj=obj, key=k, values=new_values)
+            obj_attrs[k] = new_values
 
-            # Iterate over all objects and re-populate the mappings
-            for obj in objects:
-                self._add(obj=obj, keys=[k])
+    def update(self, keys=None):
+        """
+        Updates this registry, refreshing all internal mappings in case an object's value was updated
+
+        Args:
+            keys (None or str or set or list of str): Which object keys to update. None is default, which corresponds
+                to all keys
+        """
+        for obj in self.objects:
+            self.update_object(obj=obj, keys=keys)
 
     def object_is_registered(self, obj):
         """
@@ -202,7 +260,7 @@ class Registry(UniquelyNamed):
         Args:
             obj (any): Instance to check if it is internally registered
         """
-        return obj in self.objects
+        return self._objects.get(id(obj)) is obj
 
     def get_dict(self, key):
         """
@@ -241,24 +299,44 @@ class Registry(UniquelyNamed):
         Return:
             any: Attribute @k of @obj
         """
-        # We try to grab the object's attribute, and if it fails we fallback to the default value
+        # We try to grab the object's attribute, and if it doesn't exist we fallback to the default value. Any other
+        # error raised while computing the attribute is propagated
         try:
             val = getattr(obj, attr)
 
-        except:
+        except AttributeError:
             val = self.default_value
 
         return val
 
+    def _get_obj_attr_values(self, obj, attr):
+        """
+        Grabs all values of object @obj's attribute @attr that it should be stored under. If the attribute is an
+        iterable (that is not a string), the object is stored under each of its values
+
+        Args:
+            obj (any): Object to grab attribute values from
+            attr (str): String name of the attribute to grab
+
+        Return:
+            tuple: All values of attribute @attr of @obj
+        """
+        obj_attr = self._get_obj_attr(obj=obj, attr=attr)
+        # Standardize input as a tuple
+        return tuple(obj_attr) if isinstance(obj_attr, Iterable) and not isinstance(obj_attr, str) else (obj_attr,)
+
     @property
     def objects(self):
         """
-        Get the objects in this registry
+        Get the objects in this registry. Note that the returned tuple is cached until the next object is added or
+        removed
 
         Returns:
-            list of any: Instances owned by this registry
+            tuple of any: Instances owned by this registry, in the order in which they were added
         """
-        return list(self.get_dict(self.default_key).values())
+        if self._objects_view is None:
+            self._objects_view = tuple(self._objects.values())
+        return self._objects_view
 
     @property
     def all_keys(self):
@@ -266,7 +344,23 @@ class Registry(UniquelyNamed):
         Returns:
             set of str: All object keys that are valid identification methods to index object(s)
         """
-        return self.unique_keys.union(self.group_keys)
+        return self._all_keys
+
+    @property
+    def lookup_stats(self):
+        """
+        Returns:
+            dict: Keyword-mapped counts of lookups into this registry via __call__ since creation or the last call to
+                reset_lookup_stats(), with keys "hits" and "misses"
+        """
+        return dict(hits=self._n_lookup_hits, misses=self._n_lookup_misses)
+
+    def reset_lookup_stats(self):
+        """
+        Resets the lookup hit / miss counters
+        """
+        self._n_lookup_hits = 0
+        self._n_lookup_misses = 0
 
     def __call__(self, key, value, default_val=None):
         """
@@ -282,17 +376,25 @@ class Registry(UniquelyNamed):
             any or set of any: requested unique object if @key is one of unique_keys, else a set if
                 @key is one of group_keys
         """
-        assert key in self.all_keys,\
+        assert key in self._all_keys,\
             f"Invalid key requested! Valid options are: {self.all_keys}, got: {key}"
 
-        return self.get_dict(key).get(value, default_val)
+        val = self.get_dict(key).get(value, m.DOES_NOT_EXIST)
+        if val is m.DOES_NOT_EXIST:
+            self._n_lookup_misses += 1
+            return default_val
+        self._n_lookup_hits += 1
+        return val
 
     def __contains__(self, obj):
         # Instance can be either a string (default key) OR the object itself
         if isinstance(obj, str):
-            obj = self(self.default_key, obj)
+            return obj in self.get_dict(self.default_key)
         return self.object_is_registered(obj=obj)
 
+    def __len__(self):
+        return len(self._objects)
+
 
 class SerializableRegistry(Registry, Serializable):
     """
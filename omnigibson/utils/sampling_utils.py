@@ -13,6 +13,7 @@ from omni.physx import get_physx_scene_query_interface
 import omnigibson as og
 from omnigibson.macros import create_module_macros
 import omnigibson.utils.transform_utils as T
+from omnigibson.utils.raycast_utils import raycast_batch
 
 
 # Create settings for this module
@@ -249,6 +250,9 @@ def raytest_batch(start_points, end_points, only_closest=True, ignore_bodies=Non
     """
     Computes raytest collisions for a set of rays cast from @start_points to @end_points.
 
+    NOTE: This returns the legacy per-hit dictionary format. Performance-sensitive callers should use
+    omnigibson.utils.raycast_utils.raycast_batch directly, which returns array-based RaycastResults
+
     Args:
         start_points (list of 3-array): Array of start locations to cast rays, where each is (x,y,z) global
             start location of the ray
@@ -274,18 +278,13 @@ def raytest_batch(start_points, end_points, only_closest=True, ignore_bodies=Non
 
             Note that only "hit" = False exists in the dict if no hit was found
     """
-    # For now, we do a naive for loop over individual raytests until a better API comes out
-    results = []
-    for start_point, end_point in zip(start_points, end_points):
-        results.append(raytest(
-            start_point=start_point,
-            end_point=end_point,
-            only_closest=only_closest,
-            ignore_bodies=ignore_bodies,
-            ignore_collisions=ignore_collisions,
-        ))
-
-    return results
+    return raycast_batch(
+        start_points=start_points,
+        end_points=end_points,
+        only_closest=only_closest,
+        ignore_bodies=ignore_bodies,
+        ignore_collisions=ignore_collisions,
+    ).to_dicts()
 
 
 def raytest(
@@ -745,7 +744,7 @@ def sample_cuboid_on_object(
                 destinations = np.array([end_pos])
 
             # Time to cast the rays.
-            cast_results = raytest_batch(start_points=sources, end_points=destinations)
+            cast_results = raycast_batch(start_points=sources, end_points=destinations)
 
             # Check whether sufficient number of rays hit the object
             hits = check_rays_hit_object(
@@ -758,21 +757,15 @@ def sample_cuboid_on_object(
             if not hits[center_idx]:
                 continue
 
-            filtered_cast_results = []
-            filtered_center_idx = None
-            for idx, hit in enumerate(hits):
-                if hit:
-                    filtered_cast_results.append(cast_results[idx])
-                    if idx == center_idx:
-                        filtered_center_idx = len(filtered_cast_results) - 1
+            # The center ray's index within the filtered hits is the number of valid hits preceding it
+            filtered_center_idx = int(np.sum(hits[:center_idx]))
 
             # Process the hit positions and normals.
-            hit_positions = np.array([ray_res["position"] for ray_res in filtered_cast_results])
-            hit_normals = np.array([ray_res["normal"] for ray_res in filtered_cast_results])
+            hit_positions = cast_results.positions[hits]
+            hit_normals = cast_results.normals[hits]
             hit_normals /= np.linalg.norm(hit_normals, axis=1, keepdims=True)
 
-            assert filtered_center_idx is not None
-            hit_link = filtered_cast_results[filtered_center_idx]["rigidBody"]
+            hit_link = cast_results.interner.get_path(cast_results.rigid_body_ids[center_idx])
             center_hit_pos = hit_positions[filtered_center_idx]
             center_hit_normal = hit_normals[filtered_center_idx]
 
@@ -811,7 +804,7 @@ def sample_cuboid_on_object(
                     continue
 
                 # Get projection of the base onto the plane, fit a rotation, and compute the new center hit / corners.
-                hit_positions = np.array([ray_res.get("position", np.zeros(3)) for ray_res in cast_results])
+                hit_positions = cast_results.positions
                 projected_hits = get_projection_onto_plane(hit_positions, plane_centroid, plane_normal)
                 padding = cuboid_bottom_padding * plane_normal
                 projected_hits += padding
@@ -951,7 +944,7 @@ def check_rays_hit_object(cast_results, threshold, refusal_log, body_names=None,
     Checks whether rays hit a specific object, as specified by a list of @body_names
 
     Args:
-        cast_results (list of dict): Output from raycast_batch.
+        cast_results (RaycastResults): Closest-hit output from raycast_batch.
         threshold (float): Relative ratio in [0, 1] specifying proportion of rays from @cast_results are
             required to hit @body_names to count as the object being hit
         refusal_log (list of str): Logging array for adding debug logs
@@ -961,18 +954,16 @@ def check_rays_hit_object(cast_results, threshold, refusal_log, body_names=None,
             specified, then any valid hit will be accepted
 
     Returns:
-        None or list of bool: Individual T/F for each ray -- whether it hit the object or not
+        None or n-array: Individual T/F for each ray -- whether it hit the object or not
     """
-    body_names = None if body_names is None else set(body_names)
-    ray_hits = [
-        ray_res["hit"] and
-        (body_names is None or ray_res["rigidBody"] in body_names) and
-        (ignore_body_names is None or ray_res["rigidBody"] not in ignore_body_names)
-        for ray_res in cast_results
-    ]
-    if sum(ray_hits) / len(cast_results) < threshold:
+    ray_hits = cast_results.hit.copy()
+    if body_names is not None:
+        ray_hits &= np.isin(cast_results.rigid_body_ids, cast_results.interner.intern_batch(body_names))
+    if ignore_body_names is not None:
+        ray_hits &= ~np.isin(cast_results.rigid_body_ids, cast_results.interner.intern_batch(ignore_body_names))
+    if np.sum(ray_hits) / len(cast_results) < threshold:
         if og.debug_sampling:
-            refusal_log.append(f"{sum(ray_hits)} / {len(cast_results)} < {threshold} hits: {[ray_res['rigidBody'] for ray_res in cast_results if ray_res['hit']]}")
+            refusal_log.append(f"{np.sum(ray_hits)} / {len(cast_results)} < {threshold} hits: {list(cast_results.rigid_bodies[cast_results.hit])}")
 
         return None
 
@@ -1083,10 +1074,10 @@ def check_cuboid_empty(hit_normal, bottom_corner_positions, this_cuboid_dimensio
 
     # Combine all these pairs, cast the rays, and make sure the rays don't hit anything.
     all_pairs = np.array(top_to_bottom_pairs + bottom_pairs + top_pairs)
-    check_cast_results = raytest_batch(start_points=all_pairs[:, 0, :], end_points=all_pairs[:, 1, :], ignore_bodies=ignore_body_names)
-    if any(ray["hit"] for ray in check_cast_results):
+    check_cast_results = raycast_batch(start_points=all_pairs[:, 0, :], end_points=all_pairs[:, 1, :], ignore_bodies=ignore_body_names)
+    if np.any(check_cast_results.hit):
         if og.debug_sampling:
-            refusal_log.append("check ray info: %r" % (check_cast_results))
+            refusal_log.append("check ray info: %r" % (check_cast_results.to_dicts()))
 
         return False
 
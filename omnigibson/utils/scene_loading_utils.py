@@ -0,0 +1,291 @@
+"""
+Pipelined loading of the objects of a scene file. The CPU- and I/O-heavy preparation of each object (resolving and
+checking its asset paths, decrypting its asset into the decrypted asset cache and reading its supporting surface
+height maps) runs on a thread or process pool, while the stage-mutating import of each prepared object stays on the
+main thread. Objects are imported in scene file order as soon as they are prepared, so that preparing later objects
+overlaps with importing earlier ones.
+"""
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from copy import deepcopy
+from functools import lru_cache
+
+from omnigibson.macros import create_module_macros
+from omnigibson.utils.lazy_import_utils import lazy_import
+
+cv2 = lazy_import("cv2")
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether scenes load the objects of their scene files through the loading pipeline, instead of preparing and
+# importing each object one after another
+m.ENABLED = True
+
+# Default no. of workers preparing objects. 0 prepares all objects on the main thread, right before importing them
+m.N_WORKERS = min(8, os.cpu_count() or 1)
+
+# Default kind of workers preparing objects, either "thread" or "process"
+m.EXECUTOR = "thread"
+
+# Max no. of objects being prepared or waiting to be imported at once, which bounds the memory held by prepared objects
+m.MAX_IN_FLIGHT = 64
+
+# Whether an object failing to be prepared or imported aborts loading the scene. If False, failing objects are skipped
+# and reported in the loading results instead
+m.RAISE_ON_FAILURE = True
+
+# Min interval between progress log messages, in seconds
+m.PROGRESS_INTERVAL = 2.0
+
+# Max no. of models whose height maps are kept in memory by each process, so that scenes with many instances of the
+# same model only read its height maps once
+m.HEIGHT_MAP_CACHE_SIZE = 256
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+# Value of PrimType.CLOTH, without importing omnigibson.utils.constants on workers
+_CLOTH_PRIM_TYPE = 1
+
+
+def get_height_map_path(usd_path, predicate, link_name, index):
+    """
+    Args:
+        usd_path (str): Path to the (unencrypted) USD file of a dataset object
+        predicate (str): Kinematic predicate of the supporting surface, e.g.: "onTop"
+        link_name (str): Name of the link with the supporting surface
+        index (int): Index of the supporting surface within the link
+
+    Returns:
+        str: Normalized path to the birds-eye view height map image of the supporting surface
+    """
+    return os.path.normpath(os.path.join(
+        os.path.dirname(usd_path), "..", "misc", "height_maps_per_link", predicate, link_name, f"{index}.png"))
+
+
+def read_height_maps(usd_path):
+    """
+    Reads all supporting surface height maps of a dataset object
+
+    Args:
+        usd_path (str): Path to the (unencrypted) USD file of a dataset object
+
+    Returns:
+        dict: Maps the path of each height map (see get_height_map_path()) to its grayscale image. Shared by all
+            objects of the same model, so it should not be modified
+    """
+    return _read_height_maps(os.path.normpath(usd_path))
+
+
+@lru_cache(maxsize=m.HEIGHT_MAP_CACHE_SIZE)
+def _read_height_maps(usd_path):
+    height_maps = dict()
+    root = os.path.normpath(os.path.join(os.path.dirname(usd_path), "..", "misc", "height_maps_per_link"))
+    if not os.path.isdir(root):
+        return height_maps
+    for dirpath, _, fnames in os.walk(root):
+        for fname in fnames:
+            if fname.endswith(".png"):
+                path = os.path.join(dirpath, fname)
+                height_maps[path] = cv2.imread(path, 0)
+    return height_maps
+
+
+def prepare_object(name, init_info, dataset_path, key_path=None, use_asset_cache=False):
+    """
+    Prepares an object of a scene file for being imported, without touching the stage. Safe to run on worker
+    threads or processes
+
+    Args:
+        name (str): Name of the object
+        init_info (dict): Init info of the object, as stored in the scene file
+        dataset_path (str): Path to the OmniGibson dataset, i.e.: og.og_dataset_path
+        key_path (None or str): Path to the key of the encrypted assets, i.e.: og.key_path. Only needed if
+            @use_asset_cache is set
+        use_asset_cache (bool): Whether the object's encrypted asset should be decrypted into the decrypted asset
+            cache, so that loading it on the main thread is a cache hit
+
+    Returns:
+        dict: Prepared object, with keys:
+            - name: @name
+            - init_info: Copy of @init_info, to create the object from
+            - usd_path: None or resolved path to the object's USD file, if it is a dataset object
+            - height_maps: None or supporting surface height maps of the object, see read_height_maps()
+            - timings: Time spent in each preparation phase, in seconds
+    """
+    timings = dict()
+    start = time.perf_counter()
+    init_info = deepcopy(init_info)
+    args = init_info["args"]
+
+    # Resolve the asset of dataset objects the same way DatasetObject does, and make sure it exists
+    usd_path = args.get("usd_path", None)
+    if usd_path is None and args.get("model", None) is not None:
+        category, model = args.get("category", "object"), args["model"]
+        usd_path = os.path.join(dataset_path, "objects", category, model, "usd", f"{model}.usd")
+        if args.get("prim_type", None) == _CLOTH_PRIM_TYPE:
+            usd_path = usd_path[:-4] + "_cloth.usd"
+    encrypted_path = None if usd_path is None else usd_path.replace(".usd", ".encrypted.usd")
+    if usd_path is not None and not os.path.exists(usd_path) and not os.path.exists(encrypted_path):
+        raise FileNotFoundError(f"Asset of object {name} does not exist: {usd_path}")
+    timings["resolve"] = time.perf_counter() - start
+
+    # Decrypt the asset into the cache
+    start = time.perf_counter()
+    if use_asset_cache and encrypted_path is not None and os.path.exists(encrypted_path):
+        from omnigibson.utils.asset_cache_utils import get_decrypted_asset_cache
+        get_decrypted_asset_cache().get(encrypted_path, key_path=key_path, suffix=".usd")
+    timings["decrypt"] = time.perf_counter() - start
+
+    # Read supporting surface height maps
+    start = time.perf_counter()
+    height_maps = None if usd_path is None else read_height_maps(usd_path)
+    timings["height_maps"] = time.perf_counter() - start
+
+    return dict(name=name, init_info=init_info, usd_path=usd_path, height_maps=height_maps, timings=timings)
+
+
+class SceneLoadingPipeline:
+    """
+    Prepares objects on a worker pool and imports them on the calling thread, in their original order
+    """
+
+    def __init__(
+            self,
+            prepare_fn,
+            n_workers=None,
+            executor=None,
+            max_in_flight=None,
+            raise_on_failure=None,
+            progress_fn=None,
+    ):
+        """
+        Args:
+            prepare_fn (function): Function preparing an object, called as prepare_fn(name, init_info) on a worker
+                and returning the prepared object, e.g.: a functools.partial of prepare_object(). Must be picklable
+                if @executor is "process"
+            n_workers (None or int): No. of workers. 0 prepares each object on the calling thread right before
+                importing it. Default is m.N_WORKERS
+            executor (None or str): Kind of workers, either "thread" or "process". Default is m.EXECUTOR
+            max_in_flight (None or int): Max no. of objects being prepared or waiting to be imported at once.
+                Default is m.MAX_IN_FLIGHT
+            raise_on_failure (None or bool): Whether a failing object aborts loading, instead of being skipped.
+                Default is m.RAISE_ON_FAILURE
+            progress_fn (None or function): Function called after each object is processed, as
+                progress_fn(n_done, n_total, name). Default periodically logs the progress
+        """
+        self.prepare_fn = prepare_fn
+        self.n_workers = m.N_WORKERS if n_workers is None else n_workers
+        self.executor = m.EXECUTOR if executor is None else executor
+        assert self.executor in EXECUTORS, f"Invalid executor: {self.executor}, valid options are: {set(EXECUTORS)}"
+        self.max_in_flight = m.MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.raise_on_failure = m.RAISE_ON_FAILURE if raise_on_failure is None else raise_on_failure
+        self.progress_fn = self._log_progress if progress_fn is None else progress_fn
+        self._last_progress_t = None
+
+    def _log_progress(self, n_done, n_total, name):
+        now = time.perf_counter()
+        if self._last_progress_t is None or n_done == n_total or now - self._last_progress_t >= m.PROGRESS_INTERVAL:
+            self._last_progress_t = now
+            logging.info(f"Loaded {n_done} / {n_total} scene objects (last: {name})")
+
+    def run(self, objects_info, import_fn):
+        """
+        Prepares and imports all objects of @objects_info
+
+        Args:
+            objects_info (list of 2-tuple): (name, init_info) of each object to load, in import order
+            import_fn (function): Function importing a prepared object on the calling thread, called as
+                import_fn(name, prepared) with the output of the prepare function. If it raises, it must not leave
+                a partially imported object behind
+
+        Returns:
+            dict: Loading results, with keys:
+                - loaded: Names of the successfully loaded objects, in import order
+                - failures: Maps the name of each failed object to its error message
+                - timings: Time spent in each phase, in seconds. "wait" and "import" are spent on the calling thread,
+                    the preparation phases (e.g.: "resolve", "decrypt", "height_maps") are summed over all workers,
+                    and "total" is the wall-clock time of the whole run
+        """
+        self._last_progress_t = None
+        n_total = len(objects_info)
+        results = dict(loaded=[], failures=dict(), timings={"wait": 0.0, "import": 0.0})
+        timings = results["timings"]
+        start_total = time.perf_counter()
+
+        def process(name, get_prepared):
+            start = time.perf_counter()
+            try:
+                prepared = get_prepared()
+            except Exception as e:
+                self._fail(results, name, "prepare", e)
+                return
+            finally:
+                timings["wait"] += time.perf_counter() - start
+            for phase, duration in prepared.get("timings", dict()).items():
+                timings[phase] = timings.get(phase, 0.0) + duration
+            start = time.perf_counter()
+            try:
+                import_fn(name, prepared)
+                results["loaded"].append(name)
+            except Exception as e:
+                self._fail(results, name, "import", e)
+            finally:
+                timings["import"] += time.perf_counter() - start
+
+        if self.n_workers == 0:
+            for i, (name, init_info) in enumerate(objects_info):
+                process(name, lambda: self.prepare_fn(name, init_info))
+                self.progress_fn(i + 1, n_total, name)
+        else:
+            with EXECUTORS[self.executor](max_workers=self.n_workers) as pool:
+                # Keep a bounded window of in-flight objects, and import them in their original order
+                pending = deque()
+                items = iter(objects_info)
+                n_done = 0
+                while True:
+                    while len(pending) < self.max_in_flight:
+                        item = next(items, None)
+                        if item is None:
+                            break
+                        pending.append((item[0], pool.submit(self.prepare_fn, *item)))
+                    if len(pending) == 0:
+                        break
+                    name, future = pending.popleft()
+                    try:
+                        process(name, future.result)
+                    except BaseException:
+                        for _, other in pending:
+                            other.cancel()
+                        raise
+                    n_done += 1
+                    self.progress_fn(n_done, n_total, name)
+
+        timings["total"] = time.perf_counter() - start_total
+        if len(results["failures"]) > 0:
+            logging.warning(f"Failed to load {len(results['failures'])} / {n_total} scene objects: "
+                            f"{sorted(results['failures'])}")
+        return results
+
+    def _fail(self, results, name, phase, error):
+        if self.raise_on_failure:
+            raise error
+        logging.warning(f"Failed to {phase} scene object {name}, skipping it: {error!r}")
+        results["failures"][name] = f"{phase}: {error!r}"
+
+
+def format_loading_timings(timings):
+    """
+    Args:
+        timings (dict): Loading timings, as returned in the results of SceneLoadingPipeline.run()
+
+    Returns:
+        str: Human-readable table of the timings, in milliseconds
+    """
+    lines = [f"{'phase':<16} {'time (ms)':>12}"]
+    lines += [f"{phase:<16} {duration * 1e3:>12.1f}" for phase, duration in timings.items()]
+    return "\n".join(lines)
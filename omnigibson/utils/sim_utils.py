@@ -5,6 +5,8 @@ import logging
 import omnigibson as og
 import omnigibson.utils.transform_utils as T
 from omnigibson.utils.usd_utils import BoundingBoxAPI
+from omnigibson.utils.snapshot_utils import StateSnapshot, get_snapshot_scope
+from omnigibson.utils.physics_state_utils import get_physics_state_key, mark_physics_state_dirty, pop_moved_prim_paths
 from omni.physx import get_physx_simulation_interface
 from omni.isaac.core.utils.prims import is_prim_ancestral, get_prim_type_name, is_prim_no_delete
 
@@ -298,8 +300,12 @@ def test_valid_pose(obj, pos, quat=None, z_offset=None):
     # Make sure sim is playing
     assert og.sim.is_playing(), "Cannot test valid pose while sim is not playing!"
 
-    # Store state before checking object position
-    state = og.sim.scene.dump_state(serialized=False)
+    # Store the state of all objects that can be affected before checking object position
+    half_extent = np.max(obj.aabb_extent) + (0.0 if z_offset is None else abs(z_offset))
+    snapshot = StateSnapshot(objs=get_snapshot_scope(
+        objs=[obj],
+        aabbs=[(np.array(pos) - half_extent, np.array(pos) + half_extent)],
+    ))
 
     # Set the pose of the object
     place_base_pose(obj, pos, quat, z_offset)
@@ -315,7 +321,7 @@ def test_valid_pose(obj, pos, quat=None, z_offset=None):
     in_collision = check_collision(prims=obj, step_physics=True)
 
     # Restore state after checking the collision
-    og.sim.load_state(state, serialized=False)
+    snapshot.restore()
 
     # Valid if there are no collisions
     return not in_collision
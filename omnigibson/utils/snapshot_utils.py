@@ -0,0 +1,198 @@
+"""
+A set of utility functions and classes for taking compact, binary snapshots of the states of (subsets of) objects and
+cheaply restoring them, e.g.: to undo the changes made during a sampling trial
+"""
+import numpy as np
+
+import omnigibson as og
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether sampling snapshots should be scoped to the objects that can be affected by the sampled object, instead of
+# covering the entire scene
+m.USE_SCOPED_SNAPSHOTS = True
+
+
+class StateSnapshot:
+    """
+    Snapshot of the serialized states of a fixed set of Serializable objects, stored in a single flat float64 buffer.
+    Each object's state occupies one contiguous slice of the buffer, whose layout is computed once when the snapshot
+    is first captured (and only recomputed if any object's state size changes).
+
+    Restoring a snapshot only loads the states of the objects whose current state differs from the captured one, so
+    that restoring after modifying a few objects is proportional to the no. of objects in the snapshot, and not to the
+    cost of setting all of their states.
+    """
+
+    def __init__(self, objs):
+        """
+        Args:
+            objs (list of Serializable): Objects whose states should be captured. Should be unique
+        """
+        self._objs = tuple(objs)
+        self._sizes = None
+        self._slices = None
+        self._buffer = None
+
+        # Capture the initial states
+        self.capture()
+
+    def _dump_states(self, objs):
+        return [obj.dump_state(serialized=True) for obj in objs]
+
+    def capture(self, objs=None):
+        """
+        Captures the current states of the objects in this snapshot
+
+        Args:
+            objs (None or list of Serializable): If specified, only the states of these objects (which must be part of
+                this snapshot) are captured. Default is None, which captures all objects' states
+        """
+        objs = self._objs if objs is None else objs
+        states = self._dump_states(objs)
+
+        # (Re-)compute the layout if this is the first capture or any state size changed
+        if self._slices is None or any(len(state) != self._sizes[obj] for obj, state in zip(objs, states)):
+            if objs is not self._objs:
+                # We need the states of all objects to recompute the layout
+                objs, states = self._objs, self._dump_states(self._objs)
+            self._sizes = {obj: len(state) for obj, state in zip(objs, states)}
+            offsets = np.concatenate([[0], np.cumsum([len(state) for state in states])]).astype(int)
+            self._slices = {
+                obj: slice(int(start), int(end)) for obj, start, end in zip(objs, offsets[:-1], offsets[1:])
+            }
+            self._buffer = np.zeros(offsets[-1])
+
+        for obj, state in zip(objs, states):
+            self._buffer[self._slices[obj]] = state
+
+    def restore(self, objs=None, only_changed=True):
+        """
+        Restores the captured states of the objects in this snapshot
+
+        Args:
+            objs (None or list of Serializable): If specified, only the states of these objects (which must be part of
+                this snapshot) are restored. Default is None, which restores all objects' states
+            only_changed (bool): If True, only objects whose current state differs from the captured one are restored.
+                Otherwise, all objects are restored
+
+        Returns:
+            list of Serializable: Objects whose states were restored
+        """
+        restored = []
+        for obj in (self._objs if objs is None else objs):
+            state = self._buffer[self._slices[obj]]
+            if only_changed:
+                current_state = obj.dump_state(serialized=True)
+                if len(current_state) == len(state) and np.array_equal(current_state, state):
+                    continue
+            obj.load_state(state.copy(), serialized=True)
+            restored.append(obj)
+        return restored
+
+    def get_state(self, obj):
+        """
+        Args:
+            obj (Serializable): Object in this snapshot
+
+        Returns:
+            n-array: Read-only view of the captured serialized state of @obj
+        """
+        state = self._buffer[self._slices[obj]]
+        state.flags.writeable = False
+        return state
+
+    def tobytes(self):
+        """
+        Returns:
+            bytes: Raw contents of the flat buffer holding all captured states, in the order of self.objects
+        """
+        return self._buffer.tobytes()
+
+    @property
+    def objects(self):
+        """
+        Returns:
+            tuple of Serializable: Objects whose states are captured in this snapshot
+        """
+        return self._objs
+
+    @property
+    def layout(self):
+        """
+        Returns:
+            dict: Maps each object in this snapshot to the slice of the flat buffer holding its state
+        """
+        return dict(self._slices)
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+            int: Size of the flat buffer holding all captured states, in bytes
+        """
+        return self._buffer.nbytes
+
+
+def is_awake(obj):
+    """
+    Args:
+        obj (BaseObject): Object to check
+
+    Returns:
+        bool: Whether @obj is a dynamic object that is currently moving, i.e.: whose state can change whenever physics
+            is stepped, regardless of where other objects are moved to
+    """
+    if obj.kinematic_only:
+        return False
+    if np.any(obj.get_linear_velocity() != 0) or np.any(obj.get_angular_velocity() != 0):
+        return True
+    return obj.n_dof > 0 and np.any(obj.get_joint_velocities() != 0)
+
+
+def get_snapshot_scope(objs, aabbs=None, margin=0.0):
+    """
+    Finds all objects in the current scene whose state can be affected when @objs are moved around within @aabbs for a
+    few physics steps, i.e.: @objs themselves and all objects overlapping their current AABBs or @aabbs, based on the
+    scene's spatial index. Since stepping physics advances the entire scene, all awake objects (see is_awake()) and all
+    systems are included as well, wherever they are. Objects that are not (yet) covered by the spatial index are always
+    included.
+
+    If scoped snapshots are disabled, or the scene has no spatial index, all scene objects and systems are returned.
+
+    Args:
+        objs (list of BaseObject): Objects that will be moved
+        aabbs (None or list of 2-tuple): If specified, (lower, upper) corners of additional regions where @objs
+            will be moved to
+        margin (float): Margin by which all AABBs are inflated before querying the spatial index
+
+    Returns:
+        list of Serializable: Objects and systems that should be captured in a snapshot in order to undo moving @objs
+    """
+    scene = og.sim.scene
+    if not m.USE_SCOPED_SNAPSHOTS or scene.spatial_index is None or len(scene.spatial_index) == 0:
+        return list(scene.objects) + list(scene.systems)
+
+    spatial_index = scene.spatial_index
+    scope = dict.fromkeys(objs)
+    aabbs = [obj.aabb for obj in objs] + ([] if aabbs is None else list(aabbs))
+    lowers = np.array([lower for lower, _ in aabbs]) - margin
+    uppers = np.array([upper for _, upper in aabbs]) + margin
+    for keys in spatial_index.query_aabb(lowers, uppers):
+        scope.update(dict.fromkeys(spatial_index.get_owners(keys)))
+    # Only look for objects missing from the spatial index if not all registered links are covered by it
+    if len(spatial_index) < scene.link_resolver.n_links:
+        for obj in scene.objects:
+            if obj not in scope and any(link.prim_path not in spatial_index for link in obj.links.values()):
+                scope[obj] = None
+    # Stepping physics moves awake objects and particles anywhere in the scene, and the spatial index is only
+    # refreshed once per simulator step, so these cannot be scoped by location
+    for obj in scene.objects:
+        if obj not in scope and is_awake(obj):
+            scope[obj] = None
+    scope.update(dict.fromkeys(scene.systems))
+
+    return list(scope.keys())
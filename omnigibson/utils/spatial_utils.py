@@ -0,0 +1,359 @@
+"""
+Spatial indexing utilities for answering "which entries are near X" queries without scanning every object.
+
+The SpatialIndex here is a dynamic uniform grid (spatial hash) over axis-aligned bounding boxes. Entries are keyed by
+arbitrary hashable keys (e.g.: link prim paths) and can optionally be associated with an owner (e.g.: the object owning
+the link). It is pure numpy, and so can be used and tested without omni.
+"""
+from collections import defaultdict
+
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Whether scenes maintain a spatial index over all objects' links, refreshed every simulator step. If set, object
+# states such as NextTo and Temperature use it to prune candidate objects
+m.USE_SCENE_INDEX = False
+
+# Default edge length (in meters) of each grid cell
+m.DEFAULT_CELL_SIZE = 0.5
+
+# Entries spanning more than this many cells (e.g.: floors, walls) are not hashed into the grid, and are instead tested
+# against every query directly
+m.MAX_CELLS_PER_ENTRY = 64
+
+
+def aabb_distance(points, lowers, uppers):
+    """
+    Computes the euclidean distance from each point to each axis-aligned bounding box (zero if inside)
+
+    Args:
+        points ((n, 3)-array): (x,y,z) query points
+        lowers ((k, 3)-array): (x,y,z) lower corners of the boxes
+        uppers ((k, 3)-array): (x,y,z) upper corners of the boxes
+
+    Returns:
+        (n, k)-array: Distance from point i to box j
+    """
+    points = points[:, None, :]
+    delta = np.maximum(np.maximum(lowers[None] - points, points - uppers[None]), 0.0)
+    return np.linalg.norm(delta, axis=-1)
+
+
+class SpatialIndex:
+    """
+    Dynamic uniform-grid index over axis-aligned bounding boxes.
+
+    Each entry is hashed into every grid cell its AABB overlaps. Updating an entry only touches the grid if the set of
+    cells it overlaps changes, so entries that move slightly (or not at all) between steps are cheap to update. Queries
+    gather candidates from the overlapped cells and then filter them exactly with vectorized numpy tests.
+
+    All query results are deterministic: entries are returned in the order they were first added to the index.
+    """
+
+    def __init__(self, cell_size=m.DEFAULT_CELL_SIZE, max_cells_per_entry=m.MAX_CELLS_PER_ENTRY):
+        """
+        Args:
+            cell_size (float): Edge length (in meters) of each grid cell
+            max_cells_per_entry (int): Entries spanning more than this many cells are kept in a separate list that is
+                tested against every query, instead of being hashed into the grid
+        """
+        self.cell_size = cell_size
+        self.max_cells_per_entry = max_cells_per_entry
+
+        # Contiguous per-slot storage, grown geometrically as needed
+        self._lowers = np.zeros((0, 3))
+        self._uppers = np.zeros((0, 3))
+        self._orders = np.zeros(0, dtype=np.int64)
+        self._keys = []
+        self._owners = []
+        self._free_slots = []
+        self._slot_by_key = dict()
+        self._order_counter = 0
+
+        # Grid mapping cell coordinates to the set of slots overlapping that cell, and each slot's current cell range
+        self._grid = defaultdict(set)
+        self._cell_ranges = dict()
+        self._oversized = set()
+
+    def __len__(self):
+        return len(self._slot_by_key)
+
+    def __contains__(self, key):
+        return key in self._slot_by_key
+
+    @property
+    def keys(self):
+        """
+        Returns:
+            list: All keys in this index, in insertion order
+        """
+        slots = sorted(self._slot_by_key.values(), key=lambda slot: self._orders[slot])
+        return [self._keys[slot] for slot in slots]
+
+    def get_aabb(self, key):
+        """
+        Args:
+            key (hashable): Key of the entry to look up
+
+        Returns:
+            2-tuple:
+                - 3-array: (x,y,z) lower corner of the entry's AABB
+                - 3-array: (x,y,z) upper corner of the entry's AABB
+        """
+        slot = self._slot_by_key[key]
+        return self._lowers[slot].copy(), self._uppers[slot].copy()
+
+    def get_owner(self, key):
+        """
+        Args:
+            key (hashable): Key of the entry to look up
+
+        Returns:
+            any: Owner associated with the entry
+        """
+        return self._owners[self._slot_by_key[key]]
+
+    def _allocate_slot(self):
+        if len(self._free_slots) > 0:
+            return self._free_slots.pop()
+        slot = len(self._keys)
+        if slot >= len(self._lowers):
+            capacity = max(16, 2 * len(self._lowers))
+            self._lowers = np.resize(self._lowers, (capacity, 3))
+            self._uppers = np.resize(self._uppers, (capacity, 3))
+            self._orders = np.resize(self._orders, capacity)
+        self._keys.append(None)
+        self._owners.append(None)
+        return slot
+
+    def _cell_range(self, lower, upper):
+        return (
+            tuple(np.floor(lower / self.cell_size).astype(int)),
+            tuple(np.floor(upper / self.cell_size).astype(int)),
+        )
+
+    @staticmethod
+    def _iter_cells(cell_range):
+        (x0, y0, z0), (x1, y1, z1) = cell_range
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for z in range(z0, z1 + 1):
+                    yield x, y, z
+
+    @staticmethod
+    def _n_cells(cell_range):
+        lower, upper = cell_range
+        return int(np.prod(np.array(upper) - np.array(lower) + 1))
+
+    def _unhash(self, slot):
+        cell_range = self._cell_ranges.pop(slot, None)
+        if cell_range is None:
+            self._oversized.discard(slot)
+            return
+        for cell in self._iter_cells(cell_range):
+            cell_slots = self._grid[cell]
+            cell_slots.discard(slot)
+            if len(cell_slots) == 0:
+                del self._grid[cell]
+
+    def _hash(self, slot):
+        cell_range = self._cell_range(self._lowers[slot], self._uppers[slot])
+        if self._n_cells(cell_range) > self.max_cells_per_entry:
+            self._oversized.add(slot)
+            return
+        self._cell_ranges[slot] = cell_range
+        for cell in self._iter_cells(cell_range):
+            self._grid[cell].add(slot)
+
+    def add(self, key, lower, upper, owner=None):
+        """
+        Adds a new entry to this index
+
+        Args:
+            key (hashable): Unique key for this entry
+            lower (3-array): (x,y,z) lower corner of the entry's AABB
+            upper (3-array): (x,y,z) upper corner of the entry's AABB
+            owner (any): Optional owner to associate with this entry, e.g.: the object owning a link
+        """
+        assert key not in self._slot_by_key, f"Key {key} already exists in this spatial index!"
+        slot = self._allocate_slot()
+        self._keys[slot] = key
+        self._owners[slot] = owner
+        self._lowers[slot] = lower
+        self._uppers[slot] = upper
+        self._orders[slot] = self._order_counter
+        self._order_counter += 1
+        self._slot_by_key[key] = slot
+        self._hash(slot)
+
+    def remove(self, key):
+        """
+        Removes an entry from this index
+
+        Args:
+            key (hashable): Key of the entry to remove
+        """
+        slot = self._slot_by_key.pop(key)
+        self._unhash(slot)
+        self._keys[slot] = None
+        self._owners[slot] = None
+        self._free_slots.append(slot)
+
+    def remove_owner(self, owner):
+        """
+        Removes all entries associated with @owner from this index
+
+        Args:
+            owner (any): Owner whose entries should be removed
+        """
+        for key in [key for key, slot in self._slot_by_key.items() if self._owners[slot] is owner]:
+            self.remove(key)
+
+    def update(self, keys, lowers, uppers):
+        """
+        Updates the AABBs of existing entries. Entries whose overlapped cells do not change do not touch the grid
+
+        Args:
+            keys (list of hashable): Keys of the entries to update
+            lowers ((n, 3)-array): (x,y,z) new lower corners of the entries' AABBs
+            uppers ((n, 3)-array): (x,y,z) new upper corners of the entries' AABBs
+        """
+        if len(keys) == 0:
+            return
+        slots = np.array([self._slot_by_key[key] for key in keys], dtype=np.int64)
+        lowers, uppers = np.asarray(lowers, dtype=np.float64), np.asarray(uppers, dtype=np.float64)
+        old_cell_lowers = np.floor(self._lowers[slots] / self.cell_size)
+        old_cell_uppers = np.floor(self._uppers[slots] / self.cell_size)
+        self._lowers[slots] = lowers
+        self._uppers[slots] = uppers
+        # Only rehash the entries whose cell range changed
+        changed = np.any(np.floor(lowers / self.cell_size) != old_cell_lowers, axis=-1) | \
+            np.any(np.floor(uppers / self.cell_size) != old_cell_uppers, axis=-1)
+        for slot in slots[changed]:
+            self._unhash(slot)
+            self._hash(slot)
+
+    def _candidates(self, lower, upper):
+        """
+        Args:
+            lower (3-array): (x,y,z) lower corner of the query region
+            upper (3-array): (x,y,z) upper corner of the query region
+
+        Returns:
+            n-array: Slots of entries that possibly overlap the query region
+        """
+        cell_range = self._cell_range(lower, upper)
+        candidates = set(self._oversized)
+        if self._n_cells(cell_range) > len(self._grid):
+            # Cheaper to iterate over occupied cells than over the query region's cells
+            (x0, y0, z0), (x1, y1, z1) = cell_range
+            for (x, y, z), cell_slots in self._grid.items():
+                if x0 <= x <= x1 and y0 <= y <= y1 and z0 <= z <= z1:
+                    candidates |= cell_slots
+        else:
+            for cell in self._iter_cells(cell_range):
+                cell_slots = self._grid.get(cell, None)
+                if cell_slots is not None:
+                    candidates |= cell_slots
+        return np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+
+    def _sorted_keys(self, slots):
+        slots = slots[np.argsort(self._orders[slots], kind="stable")]
+        return [self._keys[slot] for slot in slots]
+
+    def query_aabb(self, lowers, uppers):
+        """
+        Finds all entries whose AABBs overlap each query AABB
+
+        Args:
+            lowers ((n, 3)-array): (x,y,z) lower corners of the query AABBs
+            uppers ((n, 3)-array): (x,y,z) upper corners of the query AABBs
+
+        Returns:
+            list of list: For each query, the keys of all overlapping entries, in insertion order
+        """
+        lowers = np.asarray(lowers, dtype=np.float64).reshape(-1, 3)
+        uppers = np.asarray(uppers, dtype=np.float64).reshape(-1, 3)
+        results = []
+        for lower, upper in zip(lowers, uppers):
+            slots = self._candidates(lower, upper)
+            overlap = np.all((self._lowers[slots] <= upper) & (self._uppers[slots] >= lower), axis=-1)
+            results.append(self._sorted_keys(slots[overlap]))
+        return results
+
+    def query_radius(self, points, radius):
+        """
+        Finds all entries whose AABBs are within @radius of each query point
+
+        Args:
+            points ((n, 3)-array): (x,y,z) query points
+            radius (float or n-array): Query radius, either shared or per-point
+
+        Returns:
+            list of list: For each query, the keys of all entries within range, in insertion order
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radius, dtype=np.float64), (len(points),))
+        results = []
+        for point, rad in zip(points, radii):
+            slots = self._candidates(point - rad, point + rad)
+            dist = aabb_distance(point[None], self._lowers[slots], self._uppers[slots])[0]
+            results.append(self._sorted_keys(slots[dist <= rad]))
+        return results
+
+    def query_knn(self, points, k):
+        """
+        Finds the @k entries whose AABBs are closest to each query point. Ties are broken by insertion order
+
+        Args:
+            points ((n, 3)-array): (x,y,z) query points
+            k (int): Number of neighbors to find
+
+        Returns:
+            2-tuple:
+                - list of list: For each query, the keys of the (up to) @k nearest entries, sorted by distance
+                - list of n-array: For each query, the corresponding distances
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        all_keys, all_dists = [], []
+        k = min(k, len(self))
+        for point in points:
+            if k == 0:
+                all_keys.append([])
+                all_dists.append(np.zeros(0))
+                continue
+            # Grow the search radius until at least k entries are found within it, at which point the k nearest are
+            # guaranteed to be among the candidates, since all non-candidates are farther than the radius. Once all
+            # entries are candidates, the k nearest are among them regardless of the radius
+            rad = self.cell_size
+            while True:
+                slots = self._candidates(point - rad, point + rad)
+                dist = aabb_distance(point[None], self._lowers[slots], self._uppers[slots])[0]
+                if np.sum(dist <= rad) >= k or len(slots) == len(self):
+                    break
+                rad *= 2.0
+            order = np.lexsort((self._orders[slots], dist))[:k]
+            all_keys.append([self._keys[slot] for slot in slots[order]])
+            all_dists.append(dist[order])
+        return all_keys, all_dists
+
+    def get_owners(self, keys):
+        """
+        Args:
+            keys (list of hashable): Keys to look up
+
+        Returns:
+            list: Unique owners of the entries in @keys, in order of first appearance
+        """
+        return list(dict.fromkeys(self._owners[self._slot_by_key[key]] for key in keys))
+
+    def clear(self):
+        """
+        Removes all entries from this index
+        """
+        self.__init__(cell_size=self.cell_size, max_cells_per_entry=self.max_cells_per_entry)
@@ -0,0 +1,107 @@
+"""
+Vectorized kernels for scene-wide heat transfer between objects and heat sources.
+
+All functions in this module operate on contiguous numpy arrays and do not depend on omni, so that they can be
+evaluated (and verified) headless. The Temperature object state gathers the per-object quantities into these arrays
+once per simulator step and writes the results back to the individual states.
+"""
+import numpy as np
+
+
+def points_in_aabbs(points, lowers, uppers):
+    """
+    Computes pairwise containment of points in world-coordinate frame aligned bounding boxes. Boundaries are inclusive,
+    matching BoundingBoxAPI.aabb_contains_point
+
+    Args:
+        points (n-array): (N, 3) (x,y,z) positions in world-coordinates
+        lowers (n-array): (M, 3) start (x,y,z) corners of the bounding boxes
+        uppers (n-array): (M, 3) end (x,y,z) corners of the bounding boxes
+
+    Returns:
+        n-array: (N, M) boolean array, where entry (i, j) is True if point i is contained in bounding box j
+    """
+    points = np.asarray(points, dtype=float)[:, None, :]
+    return np.all((np.asarray(lowers)[None] <= points) & (points <= np.asarray(uppers)[None]), axis=-1)
+
+
+def compute_heat_source_contacts(
+    positions,
+    source_positions,
+    source_distance_thresholds,
+    source_owner_idxs,
+    inside_mask=None,
+):
+    """
+    Computes which objects are affected by which heat sources.
+
+    A heat source with a valid position affects every object whose position lies within its distance threshold. A heat
+    source without a position (i.e.: a row of NaNs in @source_positions) instead affects every object that is inside
+    of it, as specified by @inside_mask. A heat source never affects the object it belongs to.
+
+    Args:
+        positions (n-array): (N, 3) (x,y,z) positions of the heated objects
+        source_positions (n-array): (H, 3) (x,y,z) positions of the heat sources. Rows filled with NaN denote heat
+            sources that require the heated object to be inside of them
+        source_distance_thresholds (n-array): (H,) distance thresholds of the heat sources
+        source_owner_idxs (n-array): (H,) index of the heated object that owns each heat source, or -1 if the heat
+            source does not belong to any of the heated objects
+        inside_mask (None or n-array): (N, H) boolean array, where entry (i, j) is True if object i is inside heat
+            source j. Only entries for heat sources without a position are read. None is equivalent to all False
+
+    Returns:
+        n-array: (N, H) boolean array, where entry (i, j) is True if object i is affected by heat source j
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    source_positions = np.asarray(source_positions, dtype=float).reshape(-1, 3)
+    n_objs, n_sources = len(positions), len(source_positions)
+
+    has_position = ~np.any(np.isnan(source_positions), axis=-1)
+    dists = np.linalg.norm(positions[:, None, :] - source_positions[None, :, :], axis=-1)
+    with np.errstate(invalid="ignore"):
+        affected = dists <= np.asarray(source_distance_thresholds, dtype=float)[None]
+    if inside_mask is None:
+        inside_mask = np.zeros((n_objs, n_sources), dtype=bool)
+    affected = np.where(has_position[None], affected, inside_mask)
+    affected &= np.asarray(source_owner_idxs)[None] != np.arange(n_objs)[:, None]
+    return affected
+
+
+def compute_temperatures(
+    temperatures,
+    affected,
+    source_temperatures,
+    source_heating_rates,
+    dt,
+    ambient_temperature,
+    decay_speed,
+):
+    """
+    Computes the temperatures of all heated objects after one step.
+
+    Every affecting heat source moves the object's temperature towards its own temperature, with all contributions
+    computed with respect to the object's temperature at the start of the step. Objects not affected by any heat
+    source instead decay towards @ambient_temperature.
+
+    Args:
+        temperatures (n-array): (N,) current temperatures of the heated objects
+        affected (n-array): (N, H) boolean array, where entry (i, j) is True if object i is affected by heat source j,
+            e.g.: as computed by compute_heat_source_contacts()
+        source_temperatures (n-array): (H,) temperatures of the heat sources
+        source_heating_rates (n-array): (H,) fraction of the temperature difference with each heat source that is
+            received per second
+        dt (float): duration of the step, in seconds
+        ambient_temperature (float): temperature towards which unaffected objects decay
+        decay_speed (float): fraction of the temperature difference with @ambient_temperature that is decayed per
+            second
+
+    Returns:
+        n-array: (N,) updated temperatures of the heated objects
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    affected = np.asarray(affected, dtype=bool).reshape(len(temperatures), -1)
+    deltas = (np.asarray(source_temperatures, dtype=float)[None] - temperatures[:, None]) * \
+        np.asarray(source_heating_rates, dtype=float)[None] * dt
+    heating = np.sum(np.where(affected, deltas, 0.0), axis=-1)
+    decay = (ambient_temperature - temperatures) * decay_speed * dt
+    return temperatures + np.where(np.any(affected, axis=-1), heating, decay)
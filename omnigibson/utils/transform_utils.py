@@ -7,7 +7,11 @@ NOTE: convention for quaternions is (x, y, z, w)
 import math
 
 import numpy as np
-from scipy.spatial.transform import Rotation as R
+
+from omnigibson.utils.lazy_import_utils import lazy_import
+
+# scipy.spatial takes longer to import than the rest of this module, so it is only imported upon first use
+spatial_transform = lazy_import("scipy.spatial.transform")
 
 PI = np.pi
 EPS = np.finfo(float).eps * 4.0
@@ -391,7 +395,7 @@ def mat2quat(rmat):
         np.array: (x,y,z,w) float quaternion angles
     """
     M = np.asarray(rmat).astype(np.float32)[:3, :3]
-    return R.from_matrix(M).as_quat()
+    return spatial_transform.Rotation.from_matrix(M).as_quat()
 
 
 def vec2quat(vec, up=(0, 0, 1.0)):
@@ -429,7 +433,7 @@ def euler2mat(euler):
     euler = np.asarray(euler, dtype=np.float64)
     assert euler.shape[-1] == 3, "Invalid shaped euler {}".format(euler)
 
-    return R.from_euler("xyz", euler).as_matrix()
+    return spatial_transform.Rotation.from_euler("xyz", euler).as_matrix()
 
 
 def mat2euler(rmat):
@@ -443,7 +447,7 @@ def mat2euler(rmat):
         np.array: (r,p,y) converted euler angles in radian vec3 float
     """
     M = np.array(rmat, dtype=np.float32, copy=False)[:3, :3]
-    return R.from_matrix(M).as_euler("xyz")
+    return spatial_transform.Rotation.from_matrix(M).as_euler("xyz")
 
 
 def pose2mat(pose):
@@ -474,7 +478,7 @@ def quat2mat(quaternion):
     Returns:
         np.array: 3x3 rotation matrix
     """
-    return R.from_quat(quaternion).as_matrix()
+    return spatial_transform.Rotation.from_quat(quaternion).as_matrix()
 
 
 def quat2axisangle(quat):
@@ -488,7 +492,7 @@ def quat2axisangle(quat):
     Returns:
         np.array: (ax,ay,az) axis-angle exponential coordinates
     """
-    return R.from_quat(quat).as_rotvec()
+    return spatial_transform.Rotation.from_quat(quat).as_rotvec()
 
 
 def axisangle2quat(vec):
@@ -509,7 +513,7 @@ def axisangle2quat(vec):
         return np.array([0.0, 0.0, 0.0, 1.0])
 
     # otherwise convert like normal
-    return R.from_rotvec(vec).as_quat()
+    return spatial_transform.Rotation.from_rotvec(vec).as_quat()
 
 
 def euler2quat(euler):
@@ -525,7 +529,7 @@ def euler2quat(euler):
     Raises:
         AssertionError: [Invalid input shape]
     """
-    return R.from_euler("xyz", euler).as_quat()
+    return spatial_transform.Rotation.from_euler("xyz", euler).as_quat()
 
 
 def quat2euler(quat):
@@ -541,7 +545,7 @@ def quat2euler(quat):
     Raises:
         AssertionError: [Invalid input shape]
     """
-    return R.from_quat(quat).as_euler("xyz")
+    return spatial_transform.Rotation.from_quat(quat).as_euler("xyz")
 
 
 def pose_in_A_to_pose_in_B(pose_A, pose_A_in_B):
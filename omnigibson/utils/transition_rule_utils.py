@@ -0,0 +1,515 @@
+"""
+Framework for matching transition rules against the objects in a scene: object filters, the base transition rules and
+the TransitionRuleEngine. It only accesses objects through their attributes and states, and does not depend on omni,
+so that rule matching can be tested headless. The concrete transition rules are defined in omnigibson.transition_rules.
+"""
+from abc import ABCMeta, abstractmethod
+from collections import namedtuple
+import itertools
+import time
+
+from omnigibson.utils.profiling_utils import PROFILER
+
+# Tuple of attributes of objects created in transitions.
+_attrs_fields = ["category", "model", "name", "scale", "obj", "pos", "orn"]
+ObjectAttrs = namedtuple(
+    "ObjectAttrs", _attrs_fields, defaults=(None,) * len(_attrs_fields))
+
+# Tuple of lists of objects to be added or removed returned from transitions.
+TransitionResults = namedtuple(
+    "TransitionResults", ["add", "remove"], defaults=([], []))
+
+
+class BaseFilter(metaclass=ABCMeta):
+    """Defines a filter to apply to objects."""
+    # Class global variable for maintaining cached state
+    # Maps tuple of unique filter inputs to cached output value (T / F)
+    state = None
+
+    @classmethod
+    def __new__(cls, *args, **kwargs):
+        """
+        Initializes the cached state for this filter if it doesn't already exist
+        """
+        if cls.state is None:
+            cls.state = dict()
+
+        return super(BaseFilter, cls).__new__(cls)
+
+    @classmethod
+    def update(cls):
+        """
+        Updates the internal state by checking the filter status on all filter inputs
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __call__(self, obj):
+        """Returns true if the given object passes the filter."""
+        return False
+
+    @property
+    def is_static(self):
+        """
+        Returns:
+            bool: Whether this filter's output for a given object never changes during the object's lifetime, e.g.:
+                because it only depends on the object's category or abilities. Static filters are only evaluated once
+                per object, when the object is added to the scene
+        """
+        return False
+
+    def static_prefilter(self, obj):
+        """
+        Checks whether the given object can ever pass this filter. This should only depend on properties of @obj
+        which never change during its lifetime, and may only return False if @self(obj) would always return False.
+        For static filters, this should be equivalent to @self(obj)
+
+        Args:
+            obj (BaseObject): Object to check
+
+        Returns:
+            bool: False if @obj can never pass this filter, else True
+        """
+        return True
+
+
+class CategoryFilter(BaseFilter):
+    """Filter for object categories."""
+
+    def __init__(self, category):
+        self.category = category
+
+    def __call__(self, obj):
+        return obj.category == self.category
+
+    @property
+    def is_static(self):
+        return True
+
+    def static_prefilter(self, obj):
+        return self(obj)
+
+
+class StateFilter(BaseFilter):
+    """Filter for object states."""
+
+    def __init__(self, state_type, state_value):
+        self.state_type = state_type
+        self.state_value = state_value
+
+    def __call__(self, obj):
+        if self.state_type not in obj.states:
+            return False
+        return obj.states[self.state_type].get_value() == self.state_value
+
+    def static_prefilter(self, obj):
+        return self.state_type in obj.states
+
+
+class AbilityFilter(BaseFilter):
+    """Filter for object abilities."""
+
+    def __init__(self, ability):
+        self.ability = ability
+
+    def __call__(self, obj):
+        return self.ability in obj._abilities
+
+    @property
+    def is_static(self):
+        return True
+
+    def static_prefilter(self, obj):
+        return self(obj)
+
+
+class OrFilter(BaseFilter):
+    """Logical-or of a set of filters."""
+
+    def __init__(self, filters):
+        self.filters = filters
+
+    def __call__(self, obj):
+        return any(f(obj) for f in self.filters)
+
+    @property
+    def is_static(self):
+        return all(f.is_static for f in self.filters)
+
+    def static_prefilter(self, obj):
+        return any(f.static_prefilter(obj) for f in self.filters)
+
+
+class AndFilter(BaseFilter):
+    """Logical-and of a set of filters."""
+
+    def __init__(self, filters):
+        self.filters = filters
+
+    def __call__(self, obj):
+        return all(f(obj) for f in self.filters)
+
+    @property
+    def is_static(self):
+        return all(f.is_static for f in self.filters)
+
+    def static_prefilter(self, obj):
+        return all(f.static_prefilter(obj) for f in self.filters)
+
+
+class BaseTransitionRule(metaclass=ABCMeta):
+    """
+    Defines a set of categories of objects and how to transition their states.
+    """
+
+    @abstractmethod
+    def __init__(self, individual_filters=None, group_filters=None):
+        """
+        TransitionRule ctor.
+
+        Args:
+            individual_filters (None or dict): Individual object filters that this filter cares about.
+                For each name, filter key-value pair, the global transition rule step will produce tuples of valid
+                filtered objects such that the cross product over all individual filter outputs occur.
+                For example, if the individual filters are:
+
+                    {"apple": CategoryFilter("apple"), "knife": CategoryFilter("knife")},
+
+                the transition rule step will produce all 2-tuples of valid (apple, knife) combinations:
+
+                    {"apple": apple_i, "knife": knife_j}
+
+                based on the current instances of each object type in the scene and pass them to @self.condition as the
+                @individual_objects entry.
+                If None is specified, then no filter will be applied
+
+            group_filters (None or dict): Group object filters that this filter cares about. For each name, filter
+                key-value pair, the global transition rule step will produce a single dictionary of valid filtered
+                objects.
+                For example, if the group filters are:
+
+                    {"apple": CategoryFilter("apple"), "knife": CategoryFilter("knife")},
+
+                the transition rule step will produce the following dictionary:
+
+                    {"apple": [apple0, apple1, ...], "knife": [knife0, knife1, ...]}
+
+                based on the current instances of each object type in the scene and pass them to @self.condition
+                as the @group_objects entry.
+                If None is specified, then no filter will be applied
+        """
+        # Make sure at least one set of filters is specified -- in general, there should never be a rule
+        # where no filter is specified
+        assert not (individual_filters is None and group_filters is None),\
+            "At least one of individual_filters or group_filters must be specified!"
+
+        # Store the filters
+        self.individual_filters = dict() if individual_filters is None else individual_filters
+        self.group_filters = dict() if group_filters is None else group_filters
+
+    def process(self, individual_objects, group_objects):
+        """
+        Processes this transition rule at the current simulator step. If @condition evaluates to True, then
+        @transition will be executed.
+
+        Args:
+            individual_objects (dict): Dictionary mapping corresponding keys from @individual_filters to individual
+                object instances where the filter is satisfied. Note: if @self.individual_filters is None or no values
+                satisfy the filter, then this will be an empty dictionary
+            group_objects (dict): Dictionary mapping corresponding keys from @group_filters to a list of individual
+                object instances where the filter is satisfied. Note: if @self.group_filters is None or no values
+                satisfy the filter, then this will be an empty dictionary
+
+        Returns:
+            2-tuple:
+                - bool: Whether @self.condition is met
+                - None or TransitionResults: Output from @self.transition (None if it was never executed)
+        """
+        should_transition = self.condition(individual_objects=individual_objects, group_objects=group_objects)
+        return should_transition, \
+            self.transition(individual_objects=individual_objects, group_objects=group_objects) \
+            if should_transition else None
+
+    def get_candidate_tuples(self, individual_candidates):
+        """
+        Generates the combinations of individual objects to process with this rule at the current simulator step. By
+        default, this is the cartesian product over all individual filter outputs. Subclasses may override this to
+        prune combinations that can never satisfy @self.condition before the full product is formed.
+
+        Args:
+            individual_candidates (dict): Dictionary mapping each key from @individual_filters to the list of objects
+                that currently satisfy that filter
+
+        Returns:
+            iterable of dict: Each entry maps the keys from @individual_filters to individual object instances, and
+                will be passed to @self.process as the @individual_objects entry
+        """
+        fnames = list(individual_candidates.keys())
+        for obj_tuple in itertools.product(*individual_candidates.values()):
+            yield dict(zip(fnames, obj_tuple))
+
+    @property
+    def requires_individual_filters(self):
+        """
+        Returns:
+            bool: Whether this transition rule requires any specific filters
+        """
+        return len(self.individual_filters) > 0
+
+    @property
+    def requires_group_filters(self):
+        """
+        Returns:
+            bool: Whether this transition rule requires any group filters
+        """
+        return len(self.group_filters) > 0
+
+    @abstractmethod
+    def condition(self, individual_objects, group_objects):
+        """
+        Returns True if the rule applies to the object tuple.
+
+        Args:
+            individual_objects (dict): Dictionary mapping corresponding keys from @individual_filters to individual
+                object instances where the filter is satisfied. Note: if @self.individual_filters is None or no values
+                satisfy the filter, then this will be an empty dictionary
+            group_objects (dict): Dictionary mapping corresponding keys from @group_filters to a list of individual
+                object instances where the filter is satisfied. Note: if @self.group_filters is None or no values
+                satisfy the filter, then this will be an empty dictionary
+
+        Returns:
+            bool: Whether the condition is met or not
+        """
+        pass
+
+    @abstractmethod
+    def transition(self, individual_objects, group_objects):
+        """
+        Rule to apply for each set of objects satisfying the condition.
+
+        Args:
+            individual_objects (dict): Dictionary mapping corresponding keys from @individual_filters to individual
+                object instances where the filter is satisfied. Note: if @self.individual_filters is None or no values
+                satisfy the filter, then this will be an empty dictionary
+            group_objects (dict): Dictionary mapping corresponding keys from @group_filters to a list of individual
+                object instances where the filter is satisfied. Note: if @self.group_filters is None or no values
+                satisfy the filter, then this will be an empty dictionary
+
+        Returns:
+            TransitionResults: results from the executed transition
+        """
+        pass
+
+
+class GenericTransitionRule(BaseTransitionRule):
+    """
+    A generic transition rule template used typically for simple rules.
+    """
+
+    def __init__(self, individual_filters, group_filters, condition_fn, transition_fn):
+        super(GenericTransitionRule, self).__init__(individual_filters, group_filters)
+        self.condition_fn = condition_fn
+        self.transition_fn = transition_fn
+
+    def condition(self, individual_objects, group_objects):
+        return self.condition_fn(individual_objects, group_objects)
+
+    def transition(self, individual_objects, group_objects):
+        return self.transition_fn(individual_objects, group_objects)
+
+
+class TransitionRuleEngine:
+    """
+    Matches a set of transition rules against the objects in the current scene and processes them.
+
+    Instead of evaluating every filter on every object at every simulator step, the engine keeps one index of candidate
+    objects per filter, containing the objects that pass the filter's static prefilter (e.g.: category or ability
+    checks). These indexes are only updated when objects are added to or removed from the scene. At every step, only
+    dynamic filters (e.g.: StateFilter) are re-evaluated, and only on their indexed candidates. Their outputs are read
+    through the object states' own per-step cache, so each state is computed at most once per step. Each rule then
+    only processes the combinations generated by its get_candidate_tuples(), which may prune the product before it is
+    formed.
+
+    Combinations are processed at every step, even if the filter outputs did not change since the previous step. Rule
+    conditions also depend on states that no filter captures (e.g.: contacts, containment or fluid amounts), and on
+    the rules' own internal state, so an unchanged combination may still meet its condition at a later step.
+
+    All filter outputs are snapshotted before any rule is processed, so that transitions applied by one rule do not
+    change the candidates of the rules processed after it within the same step. Rules whose filters do not match any
+    object, including rules without any filters, are not processed.
+    """
+
+    def __init__(self, rules):
+        """
+        Args:
+            rules (iterable of BaseTransitionRule): Transition rules to apply
+        """
+        self._rules = tuple(rules)
+
+        # Names under which each rule is profiled, distinguishing rules of the same class by their index
+        self._rule_names = tuple(f"{i}_{rule.__class__.__name__}" for i, rule in enumerate(self._rules))
+
+        # Maps each filter used by any rule to its candidate objects. We use dicts as insertion-ordered sets, so that
+        # candidates are always visited in the order in which they were added to the scene
+        self._candidates = dict()
+        for rule in self._rules:
+            for f in itertools.chain(rule.individual_filters.values(), rule.group_filters.values()):
+                self._candidates[f] = dict()
+
+        # Per-rule matching statistics from the most recent step
+        self._stats = {rule: self._empty_stats(rule) for rule in self._rules}
+
+    @staticmethod
+    def _empty_stats(rule):
+        return dict(
+            n_candidates={fname: 0 for fname in itertools.chain(rule.individual_filters, rule.group_filters)},
+            n_tuples=0,
+            n_transitions=0,
+            match_time=0.0,
+            process_time=0.0,
+        )
+
+    def add_object(self, obj):
+        """
+        Adds an object to the candidate indexes of all filters it may pass
+
+        Args:
+            obj (BaseObject): Object that was added to the scene
+        """
+        for f, candidates in self._candidates.items():
+            if f.static_prefilter(obj):
+                candidates[obj] = None
+
+    def remove_object(self, obj):
+        """
+        Removes an object from all candidate indexes
+
+        Args:
+            obj (BaseObject): Object that was removed from the scene
+        """
+        for candidates in self._candidates.values():
+            candidates.pop(obj, None)
+
+    def clear(self):
+        """
+        Removes all objects from all candidate indexes
+        """
+        for candidates in self._candidates.values():
+            candidates.clear()
+        self._stats = {rule: self._empty_stats(rule) for rule in self._rules}
+
+    def get_candidates(self, f):
+        """
+        Args:
+            f (BaseFilter): Filter used by any of this engine's rules
+
+        Returns:
+            list of BaseObject: All objects in the scene that currently pass filter @f
+        """
+        candidates = self._candidates[f]
+        return list(candidates) if f.is_static else [obj for obj in candidates if f(obj)]
+
+    def _step_rule(self, rule, candidates, added_obj_attrs, removed_objs):
+        """
+        Matches and processes a single transition rule at the current simulator step
+
+        Args:
+            rule (BaseTransitionRule): Rule to process
+            candidates (dict): Maps each filter used by any rule to the list of objects passing it at the start of
+                this step, e.g.: as computed by get_candidates()
+            added_obj_attrs (list of ObjectAttrs): Attributes of objects to be added to the scene, extended in place
+            removed_objs (list of BaseObject): Objects to be removed from the scene, extended in place
+        """
+        stats = self._empty_stats(rule)
+        self._stats[rule] = stats
+        start = time.perf_counter()
+
+        # Skip any rule that has no objects
+        for fname, f in itertools.chain(rule.individual_filters.items(), rule.group_filters.items()):
+            stats["n_candidates"][fname] = len(candidates[f])
+        if not any(n > 0 for n in stats["n_candidates"].values()):
+            stats["match_time"] = time.perf_counter() - start
+            return
+
+        # Skip any rule that has no group filter outputs if it requires group filters. Note that only
+        # non-empty filter outputs are included in @group_objects
+        group_objects = dict()
+        if rule.requires_group_filters:
+            group_objects = {fname: candidates[f] for fname, f in rule.group_filters.items() if len(candidates[f]) > 0}
+            if len(group_objects) == 0:
+                stats["match_time"] = time.perf_counter() - start
+                return
+
+        # Skip any rule that is missing an individual filter output if it requires individual filters.
+        # Otherwise, process each candidate combination of individual objects
+        if rule.requires_individual_filters:
+            individual_candidates = {fname: candidates[f] for fname, f in rule.individual_filters.items()}
+            if any(len(objs) == 0 for objs in individual_candidates.values()):
+                stats["match_time"] = time.perf_counter() - start
+                return
+            individual_objects_iter = rule.get_candidate_tuples(individual_candidates)
+        else:
+            # We try the transition rule once, since there's no cartesian cross product of combinations from the
+            # individual filters we need to handle
+            individual_objects_iter = (dict(),)
+
+        # Candidate combinations are generated lazily, so any time spent generating them is counted as matching
+        # time while any time spent inside rule.process() is counted as processing time
+        process_time = 0.0
+        for individual_objects in individual_objects_iter:
+            stats["n_tuples"] += 1
+            process_start = time.perf_counter()
+            did_transition, transition_output = rule.process(
+                individual_objects=individual_objects, group_objects=group_objects)
+            process_time += time.perf_counter() - process_start
+            if did_transition:
+                stats["n_transitions"] += 1
+            if transition_output is not None:
+                # Transition output is a TransitionResults object
+                added_obj_attrs.extend(transition_output.add)
+                removed_objs.extend(transition_output.remove)
+        stats["process_time"] = process_time
+        stats["match_time"] = time.perf_counter() - start - process_time
+
+    def step(self):
+        """
+        Processes all transition rules at the current simulator step
+
+        Returns:
+            2-tuple:
+                - list of ObjectAttrs: Attributes of all objects to be added to the scene
+                - list of BaseObject: All objects to be removed from the scene
+        """
+        # Evaluate all filters before processing any rule, so that every rule is matched against the scene as it was
+        # at the start of this step
+        with PROFILER.timer("filters"):
+            candidates = {f: self.get_candidates(f) for f in self._candidates}
+
+        added_obj_attrs = []
+        removed_objs = []
+        for rule, rule_name in zip(self._rules, self._rule_names):
+            with PROFILER.timer(rule_name):
+                self._step_rule(rule, candidates, added_obj_attrs, removed_objs)
+
+        return added_obj_attrs, removed_objs
+
+    @property
+    def rules(self):
+        """
+        Returns:
+            tuple of BaseTransitionRule: Transition rules applied by this engine
+        """
+        return self._rules
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            dict: Maps each rule to a dictionary of matching statistics from the most recent step, with keys:
+                - n_candidates: dict mapping each filter name to its no. of candidate objects
+                - n_tuples: no. of candidate combinations processed
+                - n_transitions: no. of combinations whose condition was met
+                - match_time: time spent matching candidates, in seconds
+                - process_time: time spent in the rule's condition and transition, in seconds
+        """
+        return self._stats
@@ -0,0 +1,371 @@
+"""
+A set of utility functions and classes for building 8-connected traversability graphs from traversability maps with
+numpy / scipy, caching them on disk, and planning shortest paths on them
+"""
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+from omnigibson.utils.lazy_import_utils import lazy_import
+
+# scipy is only imported upon first use, so that e.g.: importing omnigibson.maps stays cheap
+ndimage = lazy_import("scipy.ndimage")
+spatial = lazy_import("scipy.spatial")
+sparse = lazy_import("scipy.sparse")
+csgraph = lazy_import("scipy.sparse.csgraph")
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Version of the on-disk traversability graph cache format. Bump whenever the format or graph semantics change
+m.GRAPH_CACHE_VERSION = 1
+
+# No. of shortest path trees (one per target node) to keep cached per graph
+m.PATH_CACHE_SIZE = 4
+
+# 8-connected neighborhood, as (row, col) offsets. Since nodes are indexed in row-major order, each node's neighbors
+# are sorted by node index when visited in this order
+_NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+_NEIGHBOR_WEIGHTS = np.array([np.sqrt(d_row ** 2 + d_col ** 2) for d_row, d_col in _NEIGHBOR_OFFSETS])
+
+
+def build_trav_adjacency(mask):
+    """
+    Builds the symmetric, 8-connected adjacency matrix over all traversable pixels of @mask, where each edge is
+    weighted by the euclidean distance between its pixels (in pixels). The CSR arrays are filled in directly, without
+    building and sorting an intermediate COO matrix
+
+    Args:
+        mask ((H, W)-array): Boolean traversability mask
+
+    Returns:
+        3-tuple:
+            - (H, W)-array: Grid mapping each pixel to its node index, or -1 if it is not traversable
+            - (N, 2)-array: (row, col) pixel of each node, in row-major order
+            - csr_matrix: (N, N) symmetric adjacency matrix, with int32 indices and float64 weights
+    """
+    rows, cols = np.nonzero(mask)
+    n_nodes = len(rows)
+    node_grid = np.full(mask.shape, -1, dtype=np.int32)
+    node_grid[rows, cols] = np.arange(n_nodes, dtype=np.int32)
+
+    # Look up all neighbors of each node at once, padding the grid so that out-of-map neighbors are invalid
+    padded_grid = np.pad(node_grid, 1, constant_values=-1)
+    neighbors = np.empty((n_nodes, len(_NEIGHBOR_OFFSETS)), dtype=np.int32)
+    for i, (d_row, d_col) in enumerate(_NEIGHBOR_OFFSETS):
+        neighbors[:, i] = padded_grid[rows + 1 + d_row, cols + 1 + d_col]
+    valid = neighbors >= 0
+
+    indptr = np.zeros(n_nodes + 1, dtype=np.int32)
+    np.cumsum(np.count_nonzero(valid, axis=1), out=indptr[1:])
+    adjacency = sparse.csr_matrix(
+        (np.broadcast_to(_NEIGHBOR_WEIGHTS, valid.shape)[valid], neighbors[valid], indptr),
+        shape=(n_nodes, n_nodes),
+    )
+
+    return node_grid, np.stack([rows, cols], axis=1).astype(np.int32), adjacency
+
+
+def get_largest_component_mask(mask):
+    """
+    Finds the largest 8-connected component of traversability mask @mask. Ties are broken in favor of the component
+    containing the first traversable pixel in row-major order
+
+    Args:
+        mask ((H, W)-array): Boolean traversability mask
+
+    Returns:
+        (H, W)-array: Boolean mask of the pixels belonging to the largest connected component
+    """
+    # Components are labeled in row-major order of their first pixel, starting from 1
+    labels, n_components = ndimage.label(mask, structure=np.ones((3, 3), dtype=bool))
+    if n_components == 0:
+        return np.zeros(mask.shape, dtype=bool)
+    sizes = np.bincount(labels.reshape(-1))
+    sizes[0] = 0
+    return labels == np.argmax(sizes)
+
+
+def get_trav_graph_cache_key(trav_map):
+    """
+    Args:
+        trav_map ((H, W)-array): Traversability map (after resizing and erosion) the graph is built from
+
+    Returns:
+        str: Hash identifying the traversability graph built from @trav_map, including the cache format version
+    """
+    hasher = hashlib.sha1()
+    hasher.update(f"v{m.GRAPH_CACHE_VERSION}:{trav_map.shape}".encode())
+    hasher.update(np.ascontiguousarray(trav_map > 0).tobytes())
+    return hasher.hexdigest()[:16]
+
+
+class TraversabilityGraph:
+    """
+    8-connected traversability graph over the pixels of a traversability mask, stored as a CSR adjacency matrix.
+
+    Shortest paths are computed with Dijkstra's algorithm on the adjacency matrix. Since the graph is undirected, the
+    shortest path tree rooted at a target node serves queries from any source to that target, so the most recently used
+    trees (and their distances) are cached. After the first query towards a target, path queries only walk the tree and
+    distance queries are a single lookup.
+
+    Pixels that are not nodes are snapped to their closest node using a KD-tree over all nodes, without ever modifying
+    the graph, so that memory stays bounded no matter how many queries are answered.
+    """
+
+    def __init__(self, mask):
+        """
+        Args:
+            mask ((H, W)-array): Boolean mask of traversable pixels, each of which becomes a node
+        """
+        self._mask = np.array(mask, dtype=bool)
+        self._node_grid, self._nodes, self._adjacency = build_trav_adjacency(self._mask)
+        self._kdtree = None
+        self._path_trees = OrderedDict()
+
+    @classmethod
+    def from_trav_map(cls, trav_map, cache_dir=None, cache_prefix="floor_trav"):
+        """
+        Builds the traversability graph over the largest connected component of @trav_map, loading it from (and
+        saving it to) a compact on-disk cache if @cache_dir is specified
+
+        Args:
+            trav_map ((H, W)-array): Traversability map, where pixels > 0 are traversable
+            cache_dir (None or str): If specified, directory holding cached graphs
+            cache_prefix (str): Prefix for the cached graph's file name
+
+        Returns:
+            TraversabilityGraph: Graph over the largest connected component of @trav_map
+        """
+        cache_file = None if cache_dir is None else \
+            os.path.join(cache_dir, f"{cache_prefix}_graph_{get_trav_graph_cache_key(trav_map)}.npz")
+
+        if cache_file is not None and os.path.isfile(cache_file):
+            logging.info("Loading traversable graph")
+            cached = np.load(cache_file)
+            if int(cached["version"]) == m.GRAPH_CACHE_VERSION and tuple(cached["shape"]) == trav_map.shape:
+                n_pixels = trav_map.shape[0] * trav_map.shape[1]
+                return cls(np.unpackbits(cached["mask"], count=n_pixels).astype(bool).reshape(trav_map.shape))
+
+        logging.info("Building traversable graph")
+        lcc_mask = get_largest_component_mask(trav_map > 0)
+        if cache_file is not None:
+            try:
+                np.savez_compressed(
+                    cache_file,
+                    version=np.array(m.GRAPH_CACHE_VERSION),
+                    shape=np.array(trav_map.shape),
+                    mask=np.packbits(lcc_mask.reshape(-1)),
+                )
+            except OSError as e:
+                logging.warning(f"Could not save traversable graph cache to {cache_file}: {e}")
+
+        return cls(lcc_mask)
+
+    @property
+    def mask(self):
+        """
+        Returns:
+            (H, W)-array: Boolean mask of the pixels that are nodes of this graph
+        """
+        return self._mask
+
+    @property
+    def nodes(self):
+        """
+        Returns:
+            (N, 2)-array: (row, col) pixel of each node, in row-major order
+        """
+        return self._nodes
+
+    @property
+    def n_nodes(self):
+        return len(self._nodes)
+
+    @property
+    def adjacency(self):
+        """
+        Returns:
+            csr_matrix: (N, N) symmetric adjacency matrix, weighted by the euclidean distance between nodes in pixels
+        """
+        return self._adjacency
+
+    def get_node(self, map_xy):
+        """
+        Args:
+            map_xy (2-array): (row, col) pixel in map reference frame
+
+        Returns:
+            int: Index of the node at @map_xy, or -1 if it is not a node
+        """
+        row, col = int(map_xy[0]), int(map_xy[1])
+        if not (0 <= row < self._node_grid.shape[0] and 0 <= col < self._node_grid.shape[1]):
+            return -1
+        return int(self._node_grid[row, col])
+
+    def has_node(self, map_xy):
+        """
+        Args:
+            map_xy (2-array): (row, col) pixel in map reference frame
+
+        Returns:
+            bool: Whether @map_xy is a node of this graph
+        """
+        return self.get_node(map_xy) >= 0
+
+    def get_nodes(self, map_xys):
+        """
+        Args:
+            map_xys ((N, 2)-array): (row, col) pixels in map reference frame
+
+        Returns:
+            n-array: (N,) index of the node at each pixel, or -1 if it is not a node
+        """
+        map_xys = np.asarray(map_xys, dtype=int).reshape(-1, 2)
+        nodes = np.full(len(map_xys), -1, dtype=int)
+        in_map = np.all((map_xys >= 0) & (map_xys < self._node_grid.shape), axis=1)
+        nodes[in_map] = self._node_grid[map_xys[in_map, 0], map_xys[in_map, 1]]
+        return nodes
+
+    def get_closest_nodes(self, map_xys):
+        """
+        Args:
+            map_xys ((N, 2)-array): (row, col) pixels in map reference frame
+
+        Returns:
+            2-tuple:
+                - n-array: (N,) index of the node closest to each pixel
+                - n-array: (N,) distance between each pixel and its closest node, in pixels
+        """
+        map_xys = np.asarray(map_xys, dtype=int).reshape(-1, 2)
+        nodes = self.get_nodes(map_xys)
+        dists = np.zeros(len(map_xys))
+        off_graph = nodes < 0
+        if np.any(off_graph):
+            if self._kdtree is None:
+                self._kdtree = spatial.cKDTree(self._nodes)
+            dists[off_graph], nodes[off_graph] = self._kdtree.query(map_xys[off_graph])
+        return nodes, dists
+
+    def get_closest_node(self, map_xy):
+        """
+        Args:
+            map_xy (2-array): (row, col) pixel in map reference frame
+
+        Returns:
+            int: Index of the node closest to @map_xy
+        """
+        return int(self.get_closest_nodes(map_xy)[0][0])
+
+    def _get_path_tree(self, target):
+        """
+        Args:
+            target (int): Index of the target node
+
+        Returns:
+            2-tuple:
+                - n-array: (N,) shortest path distance from each node to @target, in pixels
+                - n-array: (N,) next node along the shortest path from each node to @target
+        """
+        tree = self._path_trees.pop(target, None)
+        if tree is None:
+            tree = csgraph.dijkstra(self._adjacency, directed=True, indices=target, return_predecessors=True)
+        self._path_trees[target] = tree
+        while len(self._path_trees) > m.PATH_CACHE_SIZE:
+            self._path_trees.popitem(last=False)
+        return tree
+
+    def get_shortest_path(self, source_map, target_map):
+        """
+        Computes the shortest path between two pixels. Pixels that are not nodes of this graph are connected to their
+        closest node with a straight segment
+
+        Args:
+            source_map (2-array): (row, col) source pixel in map reference frame
+            target_map (2-array): (row, col) target pixel in map reference frame
+
+        Returns:
+            (K, 2)-array: (row, col) pixels along the path, including @source_map and @target_map
+        """
+        source_map, target_map = np.asarray(source_map, dtype=int), np.asarray(target_map, dtype=int)
+        source, target = self.get_closest_node(source_map), self.get_closest_node(target_map)
+
+        # Walk the shortest path tree rooted at the target from the source
+        _, tree = self._get_path_tree(target)
+        path = [source]
+        while path[-1] != target:
+            if tree[path[-1]] < 0:
+                raise ValueError(f"No path exists between {source_map} and {target_map}!")
+            path.append(tree[path[-1]])
+        path = self._nodes[path]
+
+        # Possibly add the off-graph endpoints
+        if not self.has_node(source_map):
+            path = np.concatenate([source_map[None], path], axis=0)
+        if not self.has_node(target_map):
+            path = np.concatenate([path, target_map[None]], axis=0)
+
+        return path
+
+    def get_shortest_paths(self, source_maps, target_maps):
+        """
+        Batched version of get_shortest_path(). Queries sharing the same target share a single shortest path tree
+
+        Args:
+            source_maps ((N, 2)-array): (row, col) source pixels in map reference frame
+            target_maps ((N, 2)-array): (row, col) target pixels in map reference frame
+
+        Returns:
+            list of (K, 2)-array: (row, col) pixels along each path, including its source and target pixels
+        """
+        source_maps = np.asarray(source_maps, dtype=int).reshape(-1, 2)
+        target_maps = np.asarray(target_maps, dtype=int).reshape(-1, 2)
+        # Group queries by target, so that each tree only needs to be computed once even if the cache is too small
+        targets = self.get_closest_nodes(target_maps)[0]
+        paths = [None] * len(source_maps)
+        for i in np.argsort(targets, kind="stable"):
+            paths[i] = self.get_shortest_path(source_maps[i], target_maps[i])
+        return paths
+
+    def get_geodesic_distances(self, source_maps, target_maps):
+        """
+        Computes the lengths of the shortest paths between pairs of pixels, without building the paths themselves.
+        Pixels that are not nodes of this graph are connected to their closest node with a straight segment
+
+        Args:
+            source_maps ((N, 2)-array): (row, col) source pixels in map reference frame
+            target_maps ((N, 2)-array): (row, col) target pixels in map reference frame
+
+        Returns:
+            n-array: (N,) length of each shortest path, in pixels
+        """
+        sources, source_dists = self.get_closest_nodes(source_maps)
+        targets, target_dists = self.get_closest_nodes(target_maps)
+        dists = source_dists + target_dists
+        # Answer all queries sharing the same target at once
+        for target in np.unique(targets):
+            idxs = np.flatnonzero(targets == target)
+            dists[idxs] += self._get_path_tree(target)[0][sources[idxs]]
+        return dists
+
+    def get_geodesic_distance(self, source_map, target_map):
+        """
+        Args:
+            source_map (2-array): (row, col) source pixel in map reference frame
+            target_map (2-array): (row, col) target pixel in map reference frame
+
+        Returns:
+            float: Length of the shortest path between @source_map and @target_map, in pixels
+        """
+        return float(self.get_geodesic_distances(source_map, target_map)[0])
+
+    def clear_cache(self):
+        """
+        Clears all cached shortest path trees
+        """
+        self._path_trees.clear()
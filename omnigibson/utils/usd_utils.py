@@ -24,6 +24,7 @@ import omnigibson as og
 from omnigibson.macros import gm
 from omnigibson.utils.constants import JointType, PRIMITIVE_MESH_TYPES
 from omnigibson.utils.python_utils import assert_valid_key
+from omnigibson.utils.collision_group_utils import CollisionGroupRegistry
 from omnigibson.utils.ui_utils import suppress_logging
 import omnigibson.utils.transform_utils as T
 
@@ -203,12 +204,88 @@ def create_joint(prim_path, joint_type, body0=None, body1=None, enabled=True, st
     return joint_prim
 
 
+class UsdCollisionGroupBackend:
+    """
+    Backend of CollisionGroupRegistry authoring each collision group as a UsdPhysics.CollisionGroup prim on the current
+    stage
+    """
+
+    def __init__(self, root_path="/World"):
+        """
+        Args:
+            root_path (str): Prim path under which the collision group prims are created
+        """
+        self.root_path = root_path
+        self._groups = dict()
+
+    def get_group_path(self, name):
+        """
+        Args:
+            name (str): Name of the collision group
+
+        Returns:
+            str: Prim path of the collision group @name
+        """
+        return f"{self.root_path}/collisionGroup_{name}"
+
+    def define_group(self, name):
+        self._groups[name] = UsdPhysics.CollisionGroup.Define(get_current_stage(), self.get_group_path(name))
+
+    def undefine_group(self, name):
+        self._groups.pop(name)
+        get_current_stage().RemovePrim(self.get_group_path(name))
+
+    def add_member(self, name, prim_path):
+        self._groups[name].GetCollidersCollectionAPI().GetIncludesRel().AddTarget(prim_path)
+
+    def remove_member(self, name, prim_path):
+        self._groups[name].GetCollidersCollectionAPI().GetIncludesRel().RemoveTarget(prim_path)
+
+    def add_filtered_group(self, name, other):
+        self._groups[name].GetFilteredGroupsRel().AddTarget(self.get_group_path(other))
+
+    def remove_filtered_group(self, name, other):
+        self._groups[name].GetFilteredGroupsRel().RemoveTarget(self.get_group_path(other))
+
+
 class CollisionAPI:
     """
     Class containing class methods to facilitate collision handling, e.g. collision groups
     """
     ACTIVE_COLLISION_GROUPS = {}
 
+    # Registry of the collision groups authored on the current stage, created upon first use. The simulator always
+    # inverts collision group filtering, see Simulator._set_physics_engine_settings()
+    COLLISION_GROUP_REGISTRY = None
+
+    @classmethod
+    def get_collision_group_registry(cls):
+        """
+        Returns:
+            CollisionGroupRegistry: Registry of the collision groups authored on the current stage, whose groups,
+                members and group-level filters are mirrored to UsdPhysics.CollisionGroup prims
+        """
+        if cls.COLLISION_GROUP_REGISTRY is None:
+            cls.COLLISION_GROUP_REGISTRY = CollisionGroupRegistry(
+                backend=UsdCollisionGroupBackend(), invert_filter=True)
+        return cls.COLLISION_GROUP_REGISTRY
+
+    @classmethod
+    def is_collision_filtered(cls, prim_a, prim_b):
+        """
+        Checks whether collisions between two prims are filtered, either by a filtered pair between them (see
+        XFormPrim.add_filtered_collision_pair()) or by their collision groups
+
+        Args:
+            prim_a (XFormPrim): First prim, e.g.: a link
+            prim_b (XFormPrim): Second prim
+
+        Returns:
+            bool: Whether collisions between @prim_a and @prim_b are filtered
+        """
+        return prim_a.has_filtered_collision_pair(prim_b) or \
+            cls.get_collision_group_registry().is_filtered(prim_a.prim_path, prim_b.prim_path)
+
     @classmethod
     def add_to_collision_group(cls, col_group, prim_path, create_if_not_exist=False):
         """
@@ -244,6 +321,8 @@ class CollisionAPI:
         Clears the internal state of this CollisionAPI
         """
         cls.ACTIVE_COLLISION_GROUPS = {}
+        # The collision group prims are cleared together with the stage
+        cls.COLLISION_GROUP_REGISTRY = None
 
 
 class BoundingBoxAPI:
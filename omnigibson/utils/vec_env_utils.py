@@ -0,0 +1,779 @@
+"""
+Vectorized environments, stepping multiple environments in parallel worker processes. Each worker owns its own
+simulator and environment, and writes its observations, rewards and dones into shared memory buffers that are laid out
+once from the observation space, so that only small commands and info dicts are pickled over the worker pipes.
+"""
+import logging
+import mmap
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+import traceback
+from collections import OrderedDict
+from functools import partial
+
+import gym
+import numpy as np
+
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Start method of worker processes. Forking is unsafe once omniverse has been launched in the parent process
+m.START_METHOD = "spawn"
+
+# Alignment (in bytes) of each array within a shared memory buffer
+m.BUFFER_ALIGNMENT = 64
+
+# Directory of the files backing the shared memory buffers. A memory-backed filesystem avoids writing them to disk.
+# None uses the default temporary directory
+m.BUFFER_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Default max no. of times each worker may be restarted after crashing before an error is raised
+m.MAX_WORKER_RESTARTS = 3
+
+# Supported ways of exchanging observations, rewards and dones with the workers
+TRANSPORTS = {"shared_memory", "pipe"}
+
+
+def get_space_layout(space, prefix=()):
+    """
+    Flattens a (possibly nested) gym space into its leaf spaces
+
+    Args:
+        space (gym.spaces.Space): Space to flatten. Dict and Tuple spaces are recursed into, while all other spaces
+            must have a fixed shape and dtype
+        prefix (tuple): Key path of @space within its parent space
+
+    Returns:
+        list of 3-tuple: (key path, shape, dtype) of each leaf space within @space, where key path is a tuple of the
+            nested keys / indices leading to that leaf
+    """
+    if isinstance(space, gym.spaces.Dict):
+        subspaces = space.spaces.items()
+    elif isinstance(space, gym.spaces.Tuple):
+        subspaces = enumerate(space.spaces)
+    else:
+        assert space.shape is not None and space.dtype is not None, \
+            f"Cannot lay out space {space} in shared memory, since it does not have a fixed shape and dtype!"
+        return [(tuple(prefix), tuple(space.shape), np.dtype(space.dtype))]
+
+    layout = []
+    for key, subspace in subspaces:
+        layout += get_space_layout(subspace, prefix=(*prefix, key))
+    return layout
+
+
+def _get_nested(value, path):
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _set_nested(value, path, leaf):
+    if len(path) == 0:
+        return leaf
+    value = dict() if value is None else value
+    nested = value
+    for key in path[:-1]:
+        nested = nested.setdefault(key, dict())
+    nested[path[-1]] = leaf
+    return value
+
+
+class SharedArrayBuffer:
+    """
+    Batch of nested arrays for @n_envs environments stored within a single shared memory block, so that worker
+    processes can write their results in place. The block is a memory-mapped file, which unlike
+    multiprocessing.shared_memory is also available before Python 3.8. Pickling the buffer (e.g.: sending it to a
+    worker) only transfers its layout and the path of its file, which is mapped when unpickled
+    """
+
+    def __init__(self, layout, n_envs, path=None):
+        """
+        Args:
+            layout (list of 3-tuple): (key path, shape, dtype) of each array, e.g.: from get_space_layout()
+            n_envs (int): No. of environments, i.e.: size of the leading dimension of each array
+            path (None or str): If specified, path of the file of an existing shared memory block to attach to.
+                Otherwise, a new file is created in m.BUFFER_DIR, which is removed when this buffer is closed
+        """
+        self.layout = [(tuple(path), tuple(shape), np.dtype(dtype)) for path, shape, dtype in layout]
+        self.n_envs = n_envs
+
+        # Align each array within the block
+        offsets, size = [], 0
+        for _, shape, dtype in self.layout:
+            size = -(-size // m.BUFFER_ALIGNMENT) * m.BUFFER_ALIGNMENT
+            offsets.append(size)
+            size += n_envs * int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+
+        self._owner = path is None
+        self._size = max(size, 1)
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="omnigibson_vec_env_", dir=m.BUFFER_DIR)
+            os.ftruncate(fd, self._size)
+        else:
+            fd = os.open(path, os.O_RDWR)
+        try:
+            self._mmap = mmap.mmap(fd, self._size)
+        finally:
+            os.close(fd)
+        self._path = path
+        self.arrays = OrderedDict(
+            (key_path, np.ndarray((n_envs, *shape), dtype=dtype, buffer=self._mmap, offset=offset))
+            for (key_path, shape, dtype), offset in zip(self.layout, offsets)
+        )
+
+    def __getstate__(self):
+        return dict(layout=self.layout, n_envs=self.n_envs, path=self.path)
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def path(self):
+        """
+        Returns:
+            str: Path of the file backing this buffer
+        """
+        return self._path
+
+    @property
+    def nbytes(self):
+        """
+        Returns:
+            int: Size of the shared memory block backing this buffer, in bytes
+        """
+        return self._size
+
+    def write(self, index, value):
+        """
+        Writes the nested arrays of a single environment in place
+
+        Args:
+            index (int): Index of the environment to write
+            value (dict or np.array): Nested arrays to write, matching the layout of this buffer
+        """
+        for path, array in self.arrays.items():
+            array[index] = _get_nested(value, path)
+
+    def read(self, index=None, copy=True):
+        """
+        Args:
+            index (None or int): If specified, index of the environment to read. Otherwise, all environments are read
+            copy (bool): Whether to return copies, or views into shared memory that are overwritten by later writes
+
+        Returns:
+            dict or np.array: Nested arrays, matching the layout of this buffer. Arrays are batched along their
+                leading dimension if @index is None
+        """
+        value = None
+        for path, array in self.arrays.items():
+            array = array if index is None else array[index]
+            value = _set_nested(value, path, np.array(array) if copy else array)
+        return value
+
+    def close(self):
+        """
+        Detaches from the shared memory block, and removes its file if it was created by this buffer
+        """
+        self.arrays = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views into the block are still referenced; it is freed once they are garbage collected
+            pass
+        if self._owner:
+            os.remove(self._path)
+            self._owner = False
+
+
+def _seed_global(seed):
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+
+def _worker(index, pipe, parent_pipe, env_fn, seed, auto_reset):
+    """
+    Main loop of a worker process, owning a single environment created by @env_fn. Runs commands received over @pipe
+    until closed, writing results into shared memory buffers once they have been attached
+    """
+    parent_pipe.close()
+    env, buffers = None, None
+    try:
+        # Seed global RNGs before creating the environment, so that e.g.: scene sampling is seeded as well
+        _seed_global(seed)
+        env = env_fn()
+        if seed is not None and hasattr(env, "seed"):
+            env.seed(seed)
+        pipe.send(("ready", (env.observation_space, env.action_space)))
+
+        while True:
+            command, data = pipe.recv()
+            if command == "step":
+                obs, reward, done, info = env.step(data)
+                if done and auto_reset:
+                    if buffers is None:
+                        info["terminal_observation"] = obs
+                    else:
+                        buffers["final_obs"].write(index, obs)
+                    obs = env.reset()
+                if buffers is None:
+                    pipe.send(("ok", (obs, reward, done, info)))
+                else:
+                    buffers["obs"].write(index, obs)
+                    buffers["result"].write(index, {"reward": reward, "done": done})
+                    pipe.send(("ok", info))
+            elif command == "reset":
+                obs = env.reset()
+                if buffers is None:
+                    pipe.send(("ok", obs))
+                else:
+                    buffers["obs"].write(index, obs)
+                    pipe.send(("ok", None))
+            elif command == "attach":
+                buffers = data
+                pipe.send(("ok", None))
+            elif command == "seed":
+                _seed_global(data)
+                if hasattr(env, "seed"):
+                    env.seed(data)
+                pipe.send(("ok", None))
+            elif command == "get_attr":
+                pipe.send(("ok", getattr(env, data)))
+            elif command == "set_attr":
+                setattr(env, *data)
+                pipe.send(("ok", None))
+            elif command == "call":
+                name, args, kwargs = data
+                pipe.send(("ok", getattr(env, name)(*args, **kwargs)))
+            elif command == "close":
+                break
+            else:
+                raise ValueError(f"Invalid worker command: {command}")
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        try:
+            pipe.send(("error", traceback.format_exc()))
+        except (BrokenPipeError, EOFError):
+            pass
+    finally:
+        if buffers is not None:
+            for buffer in buffers.values():
+                buffer.close()
+        if env is not None:
+            env.close()
+        pipe.close()
+
+
+def create_environment(configs, **kwargs):
+    """
+    Creates an Environment. Meant to be called within a worker process, where importing omnigibson launches that
+    worker's own simulator
+
+    Args:
+        configs (str or dict or list of str or dict): config_file path(s) or raw config dictionaries
+        kwargs (dict): Any additional keyword arguments to pass to the Environment constructor
+
+    Returns:
+        Environment: Created environment
+    """
+    from omnigibson.envs import Environment
+    return Environment(configs=configs, **kwargs)
+
+
+class WorkerError(RuntimeError):
+    """
+    Raised when a worker of a VectorEnvironment has failed more often than it may be restarted
+    """
+    pass
+
+
+class VectorEnvironment:
+    """
+    Vectorized environment, stepping one environment per worker process in parallel. Observations are returned
+    batched along their leading dimension, nested like the observation space of a single environment.
+
+    Workers that crash (raise an exception, exit, or time out) are restarted in isolation: the other workers are
+    unaffected, and the restarted worker's environment is reset and reported as done for the current step, with
+    info["worker_restarted"] set
+    """
+
+    def __init__(
+        self,
+        env_fns,
+        auto_reset=True,
+        transport="shared_memory",
+        seed=None,
+        copy_obs=True,
+        timeout=None,
+        max_restarts=m.MAX_WORKER_RESTARTS,
+        start_method=m.START_METHOD,
+    ):
+        """
+        Args:
+            env_fns (list of callable): Picklable functions creating each environment, e.g.:
+                functools.partial(create_environment, configs=...). Each is called within its own worker process
+            auto_reset (bool): Whether to automatically reset each environment once its episode is done. The final
+                observation of the episode is then stored in info["terminal_observation"]
+            transport (str): How observations, rewards and dones are exchanged with the workers. Valid options are
+                {"shared_memory", "pipe"}, where "pipe" pickles them over the worker pipes
+            seed (None or int): If specified, base seed of the workers, where worker i is seeded with @seed + i
+            copy_obs (bool): Whether returned observations are copied out of shared memory. If False, they are views
+                that are overwritten by the next step or reset
+            timeout (None or float): If specified, max time (in seconds) to wait for a worker to complete a command
+                before it is considered crashed
+            max_restarts (int): Max no. of times each worker may be restarted after crashing
+            start_method (str): Multiprocessing start method of the worker processes
+        """
+        assert transport in TRANSPORTS, f"Invalid transport: {transport}, valid options are: {TRANSPORTS}"
+        self.num_envs = len(env_fns)
+        self._env_fns = list(env_fns)
+        self._auto_reset = auto_reset
+        self._transport = transport
+        self._copy_obs = copy_obs
+        self._timeout = timeout
+        self._max_restarts = max_restarts
+        self._ctx = mp.get_context(start_method)
+
+        # Per-worker state
+        self._seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        self._n_restarts = [0] * self.num_envs
+        self._processes = [None] * self.num_envs
+        self._pipes = [None] * self.num_envs
+
+        self._buffers = None
+        self._waiting = False
+        self._closed = False
+
+        # Launch all workers at once, so that their environments are created in parallel
+        for i in range(self.num_envs):
+            self._start_worker(i)
+        spaces = [self._recv(i, expected="ready") for i in range(self.num_envs)]
+        self.observation_space, self.action_space = spaces[0]
+        for i, (observation_space, action_space) in enumerate(spaces):
+            assert observation_space == self.observation_space and action_space == self.action_space, \
+                f"Spaces of environment {i} do not match those of environment 0!"
+
+        # Lay out the shared memory buffers from the observation space and hand them out to the workers
+        if transport == "shared_memory":
+            obs_layout = get_space_layout(self.observation_space)
+            self._buffers = dict(
+                obs=SharedArrayBuffer(layout=obs_layout, n_envs=self.num_envs),
+                final_obs=SharedArrayBuffer(layout=obs_layout, n_envs=self.num_envs),
+                result=SharedArrayBuffer(
+                    layout=[(("reward",), (), np.float64), (("done",), (), np.bool_)], n_envs=self.num_envs),
+            )
+            for i in range(self.num_envs):
+                self._pipes[i].send(("attach", self._buffers))
+            for i in range(self.num_envs):
+                self._recv(i)
+
+    @classmethod
+    def from_configs(cls, num_envs, configs, env_kwargs=None, **kwargs):
+        """
+        Creates a vectorized environment of @num_envs Environments, each owning its own simulator
+
+        Args:
+            num_envs (int): No. of environments
+            configs (str or dict or list of str or dict): config_file path(s) or raw config dictionaries, shared by
+                all environments
+            env_kwargs (None or dict): Any additional keyword arguments to pass to each Environment constructor
+            kwargs (dict): Any additional keyword arguments to pass to the VectorEnvironment constructor
+
+        Returns:
+            VectorEnvironment: Created vectorized environment
+        """
+        env_fn = partial(create_environment, configs=configs, **({} if env_kwargs is None else env_kwargs))
+        return cls(env_fns=[env_fn] * num_envs, **kwargs)
+
+    def _start_worker(self, index):
+        parent_pipe, worker_pipe = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker,
+            args=(index, worker_pipe, parent_pipe, self._env_fns[index], self._seeds[index], self._auto_reset),
+            daemon=True,
+        )
+        process.start()
+        worker_pipe.close()
+        self._processes[index], self._pipes[index] = process, parent_pipe
+
+    def _stop_worker(self, index):
+        process, pipe = self._processes[index], self._pipes[index]
+        if process.is_alive():
+            process.kill()
+        process.join()
+        pipe.close()
+
+    def _recv(self, index, expected="ok"):
+        """
+        Receives the reply of worker @index
+
+        Returns:
+            any: Data of the reply
+
+        Raises:
+            WorkerError: If the worker crashed, independently of whether it may be restarted
+        """
+        pipe = self._pipes[index]
+        try:
+            # The initial ready message is not subject to the timeout, since creating environments may take long
+            if expected == "ok" and self._timeout is not None and not pipe.poll(self._timeout):
+                raise WorkerError(f"Worker {index} timed out after {self._timeout} seconds")
+            status, data = pipe.recv()
+        except (EOFError, ConnectionResetError, BrokenPipeError):
+            self._processes[index].join(timeout=1.0)
+            raise WorkerError(f"Worker {index} exited with code {self._processes[index].exitcode}")
+        if status == "error":
+            raise WorkerError(f"Worker {index} raised an exception:\n{data}")
+        assert status == expected, f"Expected {expected} reply from worker {index}, got {status}!"
+        return data
+
+    def _restart_worker(self, index, error):
+        """
+        Restarts crashed worker @index and resets its environment, until it succeeds or its restarts are exhausted
+
+        Args:
+            error (WorkerError): Error the worker crashed with
+
+        Returns:
+            any: Reply of the worker to being reset
+        """
+        while True:
+            self._stop_worker(index)
+            if self._n_restarts[index] >= self._max_restarts:
+                raise WorkerError(f"Worker {index} failed after {self._n_restarts[index]} restarts") from error
+            self._n_restarts[index] += 1
+            logging.warning(f"Restarting worker {index} ({self._n_restarts[index]} / {self._max_restarts}): {error}")
+
+            # Seed the restarted worker differently, so that it does not replay its past episodes
+            if self._seeds[index] is not None:
+                self._seeds[index] += self.num_envs
+            self._start_worker(index)
+            try:
+                self._recv(index, expected="ready")
+                if self._buffers is not None:
+                    self._pipes[index].send(("attach", self._buffers))
+                    self._recv(index)
+                self._pipes[index].send(("reset", None))
+                return self._recv(index)
+            except WorkerError as e:
+                error = e
+
+    def _get_obs(self, pipe_obs):
+        if self._buffers is None:
+            return self._stack(pipe_obs)
+        return self._buffers["obs"].read(copy=self._copy_obs)
+
+    def _stack(self, values):
+        value = None
+        for path, _, _ in get_space_layout(self.observation_space):
+            value = _set_nested(value, path, np.stack([_get_nested(v, path) for v in values]))
+        return value
+
+    def step_async(self, actions):
+        """
+        Sends actions to all environments without waiting for them to be stepped. Must be followed by step_wait()
+
+        Args:
+            actions (n-array or list): Action of each environment, indexed along the leading dimension
+        """
+        assert not self._waiting, "Cannot call step_async() before step_wait() of the previous step!"
+        for i, pipe in enumerate(self._pipes):
+            try:
+                pipe.send(("step", actions[i]))
+            except (BrokenPipeError, ConnectionResetError):
+                # The crash is detected and handled when receiving the reply
+                pass
+        self._waiting = True
+
+    def step_wait(self):
+        """
+        Waits for all environments to be stepped
+
+        Returns:
+            4-tuple:
+                - dict or np.array: batched next observations
+                - (n_envs,)-array: reward of each environment
+                - (n_envs,)-array: whether the episode of each environment is done
+                - list of dict: info of each environment
+        """
+        assert self._waiting, "Cannot call step_wait() without calling step_async() first!"
+        self._waiting = False
+        rewards, dones = np.zeros(self.num_envs), np.zeros(self.num_envs, dtype=bool)
+        infos, pipe_obs, restarted = [None] * self.num_envs, [None] * self.num_envs, []
+        for i in range(self.num_envs):
+            try:
+                reply = self._recv(i)
+            except WorkerError as e:
+                pipe_obs[i] = self._restart_worker(i, e)
+                infos[i] = {"worker_restarted": True, "worker_error": str(e)}
+                restarted.append(i)
+                continue
+            if self._buffers is None:
+                pipe_obs[i], rewards[i], dones[i], infos[i] = reply
+            else:
+                infos[i] = reply
+
+        if self._buffers is not None:
+            results = self._buffers["result"].arrays
+            rewards[:], dones[:] = results[("reward",)], results[("done",)]
+            if self._auto_reset:
+                for i in np.nonzero(dones)[0]:
+                    if i not in restarted:
+                        infos[i]["terminal_observation"] = self._buffers["final_obs"].read(index=i, copy=True)
+
+        # Report restarted environments as done, with the observation of their reset
+        rewards[restarted], dones[restarted] = 0.0, True
+
+        return self._get_obs(pipe_obs), rewards, dones, infos
+
+    def step(self, actions):
+        """
+        Steps all environments in parallel
+
+        Args:
+            actions (n-array or list): Action of each environment, indexed along the leading dimension
+
+        Returns:
+            4-tuple: Batched next observations, rewards, dones and infos, see step_wait()
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def reset(self):
+        """
+        Resets all environments in parallel
+
+        Returns:
+            dict or np.array: batched observations
+        """
+        assert not self._waiting, "Cannot reset while waiting for step_wait()!"
+        for pipe in self._pipes:
+            try:
+                pipe.send(("reset", None))
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        pipe_obs = [None] * self.num_envs
+        for i in range(self.num_envs):
+            try:
+                pipe_obs[i] = self._recv(i)
+            except WorkerError as e:
+                pipe_obs[i] = self._restart_worker(i, e)
+        return self._get_obs(pipe_obs)
+
+    def seed(self, seed):
+        """
+        Reseeds all environments, where environment i is seeded with @seed + i. Takes effect from their next reset
+
+        Args:
+            seed (int): Base seed
+        """
+        self._seeds = [seed + i for i in range(self.num_envs)]
+        self._call_all("seed", self._seeds)
+
+    def _call_all(self, command, data, indices=None):
+        indices = range(self.num_envs) if indices is None else indices
+        for i, value in zip(indices, data):
+            self._pipes[i].send((command, value))
+        return [self._recv(i) for i in indices]
+
+    def get_attr(self, name, indices=None):
+        """
+        Args:
+            name (str): Name of the attribute to get from each environment
+            indices (None or list of int): If specified, indices of the environments to get the attribute from
+
+        Returns:
+            list: Value of the attribute in each environment
+        """
+        indices = range(self.num_envs) if indices is None else indices
+        return self._call_all("get_attr", [name] * len(indices), indices=indices)
+
+    def set_attr(self, name, value, indices=None):
+        """
+        Args:
+            name (str): Name of the attribute to set in each environment
+            value (any): Value to set
+            indices (None or list of int): If specified, indices of the environments to set the attribute in
+        """
+        indices = range(self.num_envs) if indices is None else indices
+        self._call_all("set_attr", [(name, value)] * len(indices), indices=indices)
+
+    def env_method(self, name, *args, indices=None, **kwargs):
+        """
+        Args:
+            name (str): Name of the method to call in each environment
+            args (tuple): Positional arguments of the method
+            indices (None or list of int): If specified, indices of the environments to call the method in
+            kwargs (dict): Keyword arguments of the method
+
+        Returns:
+            list: Return value of the method in each environment
+        """
+        indices = range(self.num_envs) if indices is None else indices
+        return self._call_all("call", [(name, args, kwargs)] * len(indices), indices=indices)
+
+    @property
+    def n_restarts(self):
+        """
+        Returns:
+            list of int: No. of times each worker has been restarted
+        """
+        return list(self._n_restarts)
+
+    def close(self):
+        """
+        Closes all environments, shuts down their worker processes and frees the shared memory buffers
+        """
+        if self._closed:
+            return
+        if self._waiting:
+            for i in range(self.num_envs):
+                try:
+                    self._recv(i)
+                except WorkerError:
+                    pass
+        for pipe in self._pipes:
+            try:
+                pipe.send(("close", None))
+            except (AttributeError, BrokenPipeError, ConnectionResetError, OSError):
+                pass
+        for i, process in enumerate(self._processes):
+            if process is not None:
+                process.join(timeout=10.0)
+                self._stop_worker(i)
+        if self._buffers is not None:
+            for buffer in self._buffers.values():
+                buffer.close()
+        self._closed = True
+
+    def __del__(self):
+        if hasattr(self, "_closed"):
+            self.close()
+
+
+class FakeEnvironment(gym.Env):
+    """
+    Lightweight stand-in for Environment that does not require omniverse, with observations nested like those of a
+    single robot and a task, and a simulated physics step time. Useful to test and benchmark vectorized environments
+    headless. Note that when used with VectorEnvironment, OMNIGIBSON_NO_OMNIVERSE must be set so that importing
+    omnigibson in the workers does not launch a simulator.
+
+    The no. of steps taken within the current episode and the episode index are written into the first two entries of
+    the proprioception observation, and the seed into the first entry of the task observation
+    """
+
+    def __init__(
+        self,
+        image_height=128,
+        image_width=128,
+        proprio_dim=32,
+        task_obs_dim=8,
+        action_dim=11,
+        episode_length=100,
+        step_time=0.0,
+        crash_step=None,
+        seed=None,
+    ):
+        """
+        Args:
+            image_height (int): Height of the rgb and depth observations, in pixels
+            image_width (int): Width of the rgb and depth observations, in pixels
+            proprio_dim (int): Dimension of the proprioception observation
+            task_obs_dim (int): Dimension of the task observation
+            action_dim (int): Dimension of the action space
+            episode_length (int): No. of steps after which each episode is done
+            step_time (float): Simulated physics step time, in seconds. The process sleeps, e.g.: like it would while
+                waiting on the GPU
+            crash_step (None or int): If specified, total no. of steps after which the process exits abruptly, to
+                emulate a simulator crash
+            seed (None or int): Seed of the random observations and rewards
+        """
+        super().__init__()
+        self.image_height = image_height
+        self.image_width = image_width
+        self.episode_length = episode_length
+        self.step_time = step_time
+        self.crash_step = crash_step
+
+        self.observation_space = gym.spaces.Dict({
+            "robot0": gym.spaces.Dict({
+                "rgb": gym.spaces.Box(low=0, high=255, shape=(image_height, image_width, 3), dtype=np.uint8),
+                "depth": gym.spaces.Box(low=0.0, high=np.inf, shape=(image_height, image_width), dtype=np.float32),
+                "proprio": gym.spaces.Box(low=-np.inf, high=np.inf, shape=(proprio_dim,), dtype=np.float32),
+            }),
+            "task": gym.spaces.Dict({
+                "low_dim": gym.spaces.Box(low=-np.inf, high=np.inf, shape=(task_obs_dim,), dtype=np.float32),
+            }),
+        })
+        self.action_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(action_dim,), dtype=np.float32)
+
+        self._current_step = 0
+        self._current_episode = 0
+        self._total_steps = 0
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """
+        Args:
+            seed (None or int): Seed of the random observations and rewards
+        """
+        self._seed = seed
+        rng = np.random.default_rng(seed)
+        self._rng = rng
+        # Pool of random images, since rendering cost is not what is being emulated
+        self._images = [
+            (rng.integers(0, 256, (self.image_height, self.image_width, 3), dtype=np.uint8),
+             rng.uniform(0.0, 10.0, (self.image_height, self.image_width)).astype(np.float32))
+            for _ in range(4)
+        ]
+
+    def get_obs(self):
+        """
+        Returns:
+            dict: Keyword-mapped observations, nested like the observation space
+        """
+        rgb, depth = self._images[self._current_step % len(self._images)]
+        proprio = self._rng.normal(size=self.observation_space["robot0"]["proprio"].shape).astype(np.float32)
+        proprio[:2] = self._current_step, self._current_episode
+        task = np.zeros(self.observation_space["task"]["low_dim"].shape, dtype=np.float32)
+        task[0] = -1 if self._seed is None else self._seed
+        return {"robot0": {"rgb": rgb.copy(), "depth": depth.copy(), "proprio": proprio}, "task": {"low_dim": task}}
+
+    def step(self, action):
+        """
+        Args:
+            action (n-array): Action to apply
+
+        Returns:
+            4-tuple: Next observation, reward, done and info, following the same convention as Environment.step()
+        """
+        if self.step_time > 0:
+            time.sleep(self.step_time)
+        self._total_steps += 1
+        if self.crash_step is not None and self._total_steps >= self.crash_step:
+            os._exit(1)
+
+        self._current_step += 1
+        reward = -0.01 * float(np.square(action).sum()) + self._rng.normal()
+        done = self._current_step >= self.episode_length
+        return self.get_obs(), reward, done, {"episode_length": self._current_step}
+
+    def reset(self):
+        """
+        Returns:
+            dict: Observation at the start of the new episode
+        """
+        self._current_step = 0
+        self._current_episode += 1
+        return self.get_obs()
+
+    def close(self):
+        pass
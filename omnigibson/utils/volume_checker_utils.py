@@ -0,0 +1,318 @@
+"""
+Precompiled, memory-bounded checking of which points lie within the container volumes of a link.
+
+Each container volume's parameters (primitive dimensions or convex hull half-spaces, and its pose and scale
+relative to the link) are compiled once. The link's own transform is cached, and only recomputed once the link
+has moved. Points are checked in fixed-size chunks, so that the memory used does not grow with the number of
+points times the number of convex hull faces.
+"""
+import numpy as np
+
+import omnigibson.utils.batch_transform_utils as BT
+from omnigibson.macros import create_module_macros
+
+
+# Create settings for this module
+m = create_module_macros(module_path=__file__)
+
+# Upper bound (in bytes) on the intermediate arrays allocated for each chunk of points being checked
+m.MAX_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Whether to skip the exact checks for points outside of the link-frame AABB enclosing all container volumes
+m.USE_AABB_PREFILTER = True
+
+# No. of decimals convex hull planes are rounded to when merging coplanar faces into a single half-space
+m.HALF_SPACE_DECIMALS = 9
+
+# Supported container volume types
+VOLUME_TYPES = {"Cube", "Sphere", "Cylinder", "Cone", "Mesh"}
+
+
+def get_chunk_size(bytes_per_point, max_chunk_bytes=None):
+    """
+    Args:
+        bytes_per_point (int): No. of bytes allocated per point when checking a chunk of points
+        max_chunk_bytes (None or int): Upper bound (in bytes) on the memory allocated per chunk. If None, will use
+            m.MAX_CHUNK_BYTES
+
+    Returns:
+        int: No. of points to check per chunk
+    """
+    max_chunk_bytes = m.MAX_CHUNK_BYTES if max_chunk_bytes is None else max_chunk_bytes
+    return max(1, int(max_chunk_bytes // bytes_per_point))
+
+
+def get_convex_hull_half_spaces(face_centroids, face_normals, decimals=None):
+    """
+    Compiles the faces of a convex hull into the half-spaces (n . p < d) whose intersection is the hull's interior.
+    Coplanar faces, e.g.: the triangles composing a single polygonal face, are merged into a single half-space
+
+    Args:
+        face_centroids ((D, 3) array): (x,y,z) location of the centroid of each face
+        face_normals ((D, 3) array): (x,y,z) normalized outward direction vector of each face
+        decimals (None or int): No. of decimals planes are rounded to when merging coplanar faces. If None, will use
+            m.HALF_SPACE_DECIMALS
+
+    Returns:
+        2-tuple:
+            - (H, 3) array: (x,y,z) normal of each half-space
+            - (H,) array: offset of each half-space
+    """
+    face_normals = np.asarray(face_normals, dtype=float)
+    offsets = np.einsum("ij,ij->i", np.asarray(face_centroids, dtype=float), face_normals)
+    planes = np.concatenate([face_normals, offsets[:, None]], axis=1)
+    decimals = m.HALF_SPACE_DECIMALS if decimals is None else decimals
+    _, idxs = np.unique(np.round(planes, decimals), axis=0, return_index=True)
+    planes = planes[np.sort(idxs)]
+    return planes[:, :3], planes[:, 3]
+
+
+def check_points_in_half_spaces(normals, offsets, points, max_chunk_bytes=None):
+    """
+    Checks which points lie within all half-spaces (n . p < d), in chunks of points bounded by @max_chunk_bytes
+
+    Args:
+        normals ((H, 3) array): (x,y,z) normal of each half-space
+        offsets ((H,) array): offset of each half-space
+        points ((N, 3) array): (x,y,z) points to check, expressed in the same frame as the half-spaces
+        max_chunk_bytes (None or int): Upper bound (in bytes) on the memory allocated per chunk. If None, will use
+            m.MAX_CHUNK_BYTES
+
+    Returns:
+        (N,) array: boolean numpy array specifying whether each point lies in all half-spaces
+    """
+    n_points = len(points)
+    in_range = np.ones(n_points, dtype=bool)
+    chunk_size = get_chunk_size(bytes_per_point=9 * len(offsets), max_chunk_bytes=max_chunk_bytes)
+    for start in range(0, n_points, chunk_size):
+        chunk = points[start:start + chunk_size]
+        in_range[start:start + chunk_size] = np.all(chunk @ normals.T < offsets, axis=-1)
+    return in_range
+
+
+class ContainerVolume:
+    """
+    A single container volume, with its type-specific parameters and its pose and scale relative to the (scaled)
+    frame of the link it belongs to compiled once
+    """
+
+    def __init__(self, volume_type, pos, quat, scale, size=None, half_spaces=None, vertices=None, raw_volume=None):
+        """
+        Args:
+            volume_type (str): Type of the volume. Must be one of VOLUME_TYPES
+            pos (3-array): (x,y,z) location of the volume in the link frame
+            quat (4-array): (x,y,z,w) quaternion orientation of the volume in the link frame
+            scale (3-array): (x,y,z) local scale of the volume
+            size (None or float or 2-array): Dimensions of the volume, specified in its local frame. Should be the
+                side length for "Cube", the radius for "Sphere", and (radius, height) for "Cylinder" and "Cone"
+            half_spaces (None or 2-tuple): Only used for "Mesh". (normals, offsets) of the half-spaces composing the
+                convex hull, expressed in its local frame. See get_convex_hull_half_spaces()
+            vertices (None or (V, 3) array): Only used for "Mesh". (x,y,z) vertices of the mesh in its local frame,
+                used to compute its bounding box
+            raw_volume (None or float): Only used for "Mesh". Volume of the mesh in its local frame
+        """
+        assert volume_type in VOLUME_TYPES, f"Cannot create volume checker for volume of type: {volume_type}"
+        self.volume_type = volume_type
+        self.size = size
+        self.pos = np.array(pos, dtype=float)
+        self.quat = np.array(quat, dtype=float)
+        self.scale = np.array(scale, dtype=float)
+
+        # Link frame --> local frame is p_local = p_link @ A + b
+        rot = BT.quat2mat(self.quat)
+        self._A = rot / self.scale.reshape(1, 3)
+        self._b = -self.pos @ self._A
+
+        if volume_type == "Mesh":
+            assert half_spaces is not None and vertices is not None and raw_volume is not None, \
+                "half_spaces, vertices and raw_volume must be specified for Mesh volumes!"
+            self._normals, self._offsets = (np.asarray(arr, dtype=float) for arr in half_spaces)
+            local_extents = np.array([np.min(vertices, axis=0), np.max(vertices, axis=0)])
+        else:
+            self._normals, self._offsets = None, None
+            if volume_type == "Cube":
+                half_extent = np.ones(3) * size / 2.0
+                raw_volume = size ** 3
+            elif volume_type == "Sphere":
+                half_extent = np.ones(3) * size
+                raw_volume = 4 / 3 * np.pi * (size ** 3)
+            else:
+                radius, height = size
+                half_extent = np.array([radius, radius, height / 2.0])
+                raw_volume = np.pi * (radius ** 2) * height / (3.0 if volume_type == "Cone" else 1.0)
+            local_extents = np.array([-half_extent, half_extent])
+        self.volume = raw_volume * np.prod(self.scale)
+
+        # Bounding box in the link frame, enclosing the local bounding box's corners
+        corners = np.stack(np.meshgrid(*local_extents.T, indexing="ij"), axis=-1).reshape(-1, 3)
+        corners = (corners * self.scale.reshape(1, 3)) @ rot.T + self.pos
+        self.aabb = np.array([np.min(corners, axis=0), np.max(corners, axis=0)])
+
+    @property
+    def n_half_spaces(self):
+        """
+        Returns:
+            int: No. of half-spaces checked per point, or 0 if this is not a "Mesh" volume
+        """
+        return 0 if self._offsets is None else len(self._offsets)
+
+    def check_points(self, points):
+        """
+        Checks which points lie within this volume. Note that this allocates memory proportional to
+        len(@points) * max(3, n_half_spaces), so @points should already be chunked
+
+        Args:
+            points ((N, 3) array): (x,y,z) points to check, expressed in the (scaled) link frame
+
+        Returns:
+            (N,) array: boolean numpy array specifying whether each point lies in this volume
+        """
+        points = points @ self._A + self._b
+        if self.volume_type == "Mesh":
+            return np.all(points @ self._normals.T < self._offsets, axis=-1)
+        elif self.volume_type == "Cube":
+            return np.all(np.abs(points) < self.size / 2.0, axis=-1)
+        elif self.volume_type == "Sphere":
+            return np.linalg.norm(points, axis=-1) < self.size
+
+        radius, height = self.size
+        in_height = np.abs(points[:, -1]) < height / 2.0
+        xy_norm = np.linalg.norm(points[:, :-1], axis=-1)
+        if self.volume_type == "Cylinder":
+            return in_height & (xy_norm < radius)
+        return in_height & (xy_norm < radius * (1 - (points[:, -1] + height / 2.0) / height))
+
+
+class PointsInVolumeChecker:
+    """
+    Callable checking which of a group of points (in global coordinates) are contained within any of a link's
+    container volumes.
+
+    The link's transform is cached together with the key returned by @get_cache_key, and only re-queried once that
+    key changes. It is only recomputed if the re-queried pose or scale differs from the cached one
+    """
+
+    def __init__(
+            self,
+            volumes,
+            get_link_pose,
+            get_link_scale,
+            get_volume_scale=None,
+            get_cache_key=None,
+            use_aabb_prefilter=None,
+            max_chunk_bytes=None,
+    ):
+        """
+        Args:
+            volumes (list of ContainerVolume): Container volumes to check, expressed in the link frame
+            get_link_pose (function): Returns the link's global (pos, quat) pose. Signature:
+
+                pos, quat = get_link_pose()
+
+            get_link_scale (function): Returns the (x,y,z) scale of the link frame, i.e.: the scale the volumes'
+                poses are expressed in. Signature:
+
+                scale = get_link_scale()
+
+            get_volume_scale (None or function): Returns the (x,y,z) global scale of the link, used to convert the
+                volumes into global scale in calculate_volume(). If None, will use @get_link_scale. Signature:
+
+                scale = get_volume_scale()
+
+            get_cache_key (None or function): Returns a hashable key that does not change for as long as the link's
+                pose and scale do not change, e.g.: the simulator's physics state key. If None, the link's pose
+                and scale are re-queried on every check. Signature:
+
+                key = get_cache_key()
+
+            use_aabb_prefilter (None or bool): Whether to skip the exact checks for points outside of the link-frame
+                AABB enclosing all volumes. If None, will use m.USE_AABB_PREFILTER
+            max_chunk_bytes (None or int): Upper bound (in bytes) on the memory allocated per chunk of points. If
+                None, will use m.MAX_CHUNK_BYTES
+        """
+        self.volumes = list(volumes)
+        self._get_link_pose = get_link_pose
+        self._get_link_scale = get_link_scale
+        self._get_volume_scale = get_link_scale if get_volume_scale is None else get_volume_scale
+        self._get_cache_key = get_cache_key
+        self.use_aabb_prefilter = m.USE_AABB_PREFILTER if use_aabb_prefilter is None else use_aabb_prefilter
+        self.max_chunk_bytes = m.MAX_CHUNK_BYTES if max_chunk_bytes is None else max_chunk_bytes
+
+        # Volumes are checked in chunks sized by the largest per-point allocation of any volume
+        bytes_per_point = 8 * (max([3] + [volume.n_half_spaces for volume in self.volumes]) + 9)
+        self._chunk_size = get_chunk_size(bytes_per_point=bytes_per_point, max_chunk_bytes=self.max_chunk_bytes)
+        self.aabb = None if len(self.volumes) == 0 else np.array([
+            np.min([volume.aabb[0] for volume in self.volumes], axis=0),
+            np.max([volume.aabb[1] for volume in self.volumes], axis=0),
+        ])
+        self._raw_volume = np.sum([volume.volume for volume in self.volumes])
+
+        # Cached link transform
+        self._cache_key = None
+        self._link_pose = None
+        self._link_scale = None
+        self._A = None
+        self._b = None
+
+    def refresh(self):
+        """
+        Re-queries the link's pose and scale, recomputing the cached link transform if either of them changed
+        """
+        pos, quat = self._get_link_pose()
+        pos, quat = np.array(pos, dtype=float), np.array(quat, dtype=float)
+        scale = np.array(self._get_link_scale(), dtype=float) * np.ones(3)
+        if self._link_pose is not None and np.array_equal(pos, self._link_pose[0]) and \
+                np.array_equal(quat, self._link_pose[1]) and np.array_equal(scale, self._link_scale):
+            return
+
+        # Global frame --> link frame is p_link = p @ A + b
+        self._link_pose, self._link_scale = (pos, quat), scale
+        self._A = BT.quat2mat(quat) / scale.reshape(1, 3)
+        self._b = -pos @ self._A
+
+    def _update_link_transform(self):
+        key = None if self._get_cache_key is None else self._get_cache_key()
+        if key is None or self._A is None or key != self._cache_key:
+            self.refresh()
+            self._cache_key = key
+
+    def __call__(self, particle_positions):
+        """
+        Args:
+            particle_positions ((N, 3) array): (x,y,z) positions to check, in global coordinates
+
+        Returns:
+            (N,) array: boolean numpy array specifying whether each point lies in any of the volumes
+        """
+        particle_positions = np.asarray(particle_positions, dtype=float).reshape(-1, 3)
+        n_particles = len(particle_positions)
+        in_volumes = np.zeros(n_particles, dtype=bool)
+        if n_particles == 0 or len(self.volumes) == 0:
+            return in_volumes
+
+        self._update_link_transform()
+        for start in range(0, n_particles, self._chunk_size):
+            chunk = particle_positions[start:start + self._chunk_size] @ self._A + self._b
+            in_chunk = in_volumes[start:start + self._chunk_size]
+            idxs = None
+            if self.use_aabb_prefilter:
+                idxs = np.flatnonzero(np.all((self.aabb[0] <= chunk) & (chunk <= self.aabb[1]), axis=-1))
+                chunk = chunk[idxs]
+            in_any = np.zeros(len(chunk), dtype=bool)
+            for volume in self.volumes:
+                in_any |= volume.check_points(chunk)
+            if idxs is None:
+                in_chunk[:] = in_any
+            else:
+                in_chunk[idxs] = in_any
+
+        return in_volumes
+
+    def calculate_volume(self):
+        """
+        Returns:
+            float: Total volume being checked (expressed in global scale) aggregated across all volumes
+
+        NOTE: Assumes all volumes are strictly disjoint, since the volumes are summed
+        """
+        return self._raw_volume * np.prod(self._get_volume_scale())
@@ -1,2 +1,6 @@
-from omnigibson.wrappers.wrapper_base import BaseWrapper
-from omnigibson.wrappers.log_wrapper import LogWrapper
+from omnigibson.utils.lazy_import_utils import attach_lazy_attributes
+
+__getattr__, __dir__, __all__ = attach_lazy_attributes(__name__, {
+    ".wrapper_base": ["BaseWrapper"],
+    ".log_wrapper": ["LogWrapper"],
+})
@@ -0,0 +1,118 @@
+"""
+Script to benchmark reading a robot's articulation state every step, with and without shared articulation state
+snapshots.
+
+Every step, a random action is applied and the robot's root pose and velocities, joint states and full state dump are
+read, as e.g.: proprioception, controllers and state serialization would. The no. of physics backend (dynamic control)
+read calls per step is counted by wrapping the robot's and all of its links' and joints' backend interfaces. Also checks
+that the values read with and without snapshots are equal after every step.
+"""
+
+import time
+from collections import defaultdict
+
+import numpy as np
+
+import omnigibson as og
+from omnigibson.prims import entity_prim
+from omnigibson.robots.fetch import Fetch
+from omnigibson.scenes.scene_base import Scene
+
+
+# Params to be set as needed.
+N_STEPS = 200         # No. of steps to time for each setting.
+N_READS_PER_STEP = 3  # No. of times the full set of state getters is called per step, e.g.: by different consumers.
+
+
+class _CountingInterface:
+    """
+    Wraps a dynamic control interface and counts the no. of calls of each of its getter methods
+    """
+
+    def __init__(self, dc, counts):
+        self._dc = dc
+        self._counts = counts
+
+    def __getattr__(self, name):
+        attr = getattr(self._dc, name)
+        if not name.startswith("get_") or not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self._counts[name] += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+def _read_state(robot):
+    pos, ori = robot.get_position_orientation()
+    return dict(
+        pos=pos,
+        ori=ori,
+        lin_vel=robot.get_linear_velocity(),
+        ang_vel=robot.get_angular_velocity(),
+        joint_pos=robot.get_joint_positions(),
+        joint_vel=robot.get_joint_velocities(),
+        joint_effort=robot.get_joint_efforts(),
+    )
+
+
+def _check_values(robot):
+    # Read the same physics step with and without snapshots
+    states, dumps = dict(), dict()
+    for cached in (True, False):
+        entity_prim.m.CACHE_ARTICULATION_STATES = cached
+        states[cached] = _read_state(robot)
+        dumps[cached] = robot.dump_state(serialized=True)
+    for name, value in states[True].items():
+        assert np.allclose(value, states[False][name]), f"Cached {name} differs from the backend's {name}!"
+    assert dumps[True].shape == dumps[False].shape and np.allclose(dumps[True], dumps[False]), \
+        "Cached state dump differs from the backend's state dump!"
+
+
+def main():
+    scene = Scene()
+    og.sim.import_scene(scene)
+    robot = Fetch(prim_path="/World/robot", name="robot", obs_modalities=[])
+    og.sim.import_object(robot)
+    og.sim.play()
+    og.sim.step()
+
+    # Wrap all backend interfaces owned by the robot
+    counts = defaultdict(int)
+    for prim in [robot] + list(robot.links.values()) + list(robot.joints.values()):
+        prim._dc = _CountingInterface(prim._dc, counts)
+
+    # Check values first
+    for _ in range(N_STEPS // 10):
+        robot.apply_action(robot.action_space.sample())
+        og.sim.step()
+        _check_values(robot)
+
+    print(f"{'cached':>8} {'step (ms)':>10} {'reads (ms)':>11} {'dc calls / step':>16}")
+    for cached in (False, True):
+        entity_prim.m.CACHE_ARTICULATION_STATES = cached
+        counts.clear()
+        step_times, read_times = [], []
+        for _ in range(N_STEPS):
+            robot.apply_action(robot.action_space.sample())
+            start = time.perf_counter()
+            og.sim.step()
+            step_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for _ in range(N_READS_PER_STEP):
+                _read_state(robot)
+            robot.dump_state(serialized=True)
+            read_times.append(time.perf_counter() - start)
+        print(f"{str(cached):>8} {np.mean(step_times) * 1e3:>10.2f} {np.mean(read_times) * 1e3:>11.2f} "
+              f"{sum(counts.values()) / N_STEPS:>16.1f}")
+        for name, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"    {name}: {count / N_STEPS:.1f}")
+
+    print("All checks passed")
+    og.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Script to benchmark loading a scene's encrypted assets with a cold and a warm decrypted asset cache, headless on CPU.
+
+A synthetic Fernet key and synthetic encrypted model files stand in for the OmniGibson dataset. Loading a scene
+decrypts (or looks up) the asset of each object instance and reads it back, as USD would. Compares decrypting every
+instance into a fresh temporary file (the uncached behavior of DatasetObject._load) against a cold cache, a warm cache
+within the same process, a warm cache in a fresh process and several processes concurrently loading the scene from a
+cold cache. The cache's correctness is covered by tests/test_asset_cache_utils.py.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+from cryptography.fernet import Fernet
+
+from omnigibson.utils.asset_cache_utils import DecryptedAssetCache
+
+
+# Params to be set as needed.
+N_MODELS = 20                  # No. of distinct synthetic models.
+MODEL_SIZE = 2 * 1024 ** 2     # Size of each decrypted model, in bytes.
+N_INSTANCES = 200              # No. of object instances in the synthetic scene.
+N_PROCESSES = 4                # No. of processes concurrently loading the scene from the same cache.
+SEED = 0                       # Random seed.
+
+
+def _make_dataset(root):
+    rng = np.random.default_rng(SEED)
+    key = Fernet.generate_key()
+    key_path = os.path.join(root, "synthetic.key")
+    with open(key_path, "wb") as f:
+        f.write(key)
+    fernet = Fernet(key)
+    models = dict()
+    for i in range(N_MODELS):
+        contents = rng.integers(0, 256, MODEL_SIZE, dtype=np.uint8).tobytes()
+        path = os.path.join(root, f"model{i}.encrypted.usd")
+        with open(path, "wb") as f:
+            f.write(fernet.encrypt(contents))
+        models[path] = contents
+    instances = [list(models)[i] for i in rng.integers(0, N_MODELS, N_INSTANCES)]
+    return key_path, models, instances
+
+
+def _load_uncached(key_path, instances):
+    # Mirrors DatasetObject._load without the cache
+    with open(key_path, "rb") as f:
+        fernet = Fernet(f.read())
+    for encrypted_path in instances:
+        with tempfile.NamedTemporaryFile(suffix=".usd") as fp:
+            with open(encrypted_path, "rb") as f:
+                fp.write(fernet.decrypt(f.read()))
+            fp.flush()
+            with open(fp.name, "rb") as f:
+                f.read()
+
+
+def _load_cached(cache, key_path, instances):
+    paths = []
+    for encrypted_path in instances:
+        path = cache.get(encrypted_path, key_path=key_path, suffix=".usd")
+        with open(path, "rb") as f:
+            f.read()
+        paths.append(path)
+    return paths
+
+
+def _timed(fcn, *args):
+    start = time.perf_counter()
+    out = fcn(*args)
+    return time.perf_counter() - start, out
+
+
+def _load_in_process(cache_dir, key_path, instances):
+    cache = DecryptedAssetCache(cache_dir=cache_dir)
+    duration, _ = _timed(_load_cached, cache, key_path, instances)
+    return duration, cache.stats
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        key_path, models, instances = _make_dataset(root)
+        n_bytes = sum(len(models[path]) for path in instances)
+        print(f"Scene: {N_INSTANCES} instances of {N_MODELS} models, {n_bytes / 1024 ** 2:.0f} MB of decrypted assets")
+
+        uncached, _ = _timed(_load_uncached, key_path, instances)
+        cache_dir = os.path.join(root, "cache")
+        cache = DecryptedAssetCache(cache_dir=cache_dir)
+        cold, _ = _timed(_load_cached, cache, key_path, instances)
+        cold_stats = cache.stats
+        warm, _ = _timed(_load_cached, cache, key_path, instances)
+        fresh, fresh_stats = _load_in_process(cache_dir, key_path, instances)
+
+        print(f"{'load':>24} {'time (s)':>10} {'speedup':>8}")
+        for name, duration in (("uncached", uncached), ("cold cache", cold), ("warm cache", warm),
+                               ("warm cache, new process", fresh)):
+            print(f"{name:>24} {duration:>10.3f} {uncached / duration:>8.2f}")
+        print(f"cold cache stats: {cold_stats}")
+        print(f"warm cache stats (new process): {fresh_stats}")
+
+        shared_dir = os.path.join(root, "shared_cache")
+        with multiprocessing.get_context("spawn").Pool(N_PROCESSES) as pool:
+            results = pool.starmap(_load_in_process, [(shared_dir, key_path, instances[i::N_PROCESSES])
+                                                      for i in range(N_PROCESSES)])
+        duration = max(duration for duration, _ in results)
+        print(f"{N_PROCESSES} concurrent processes, cold cache: {duration:.3f} s, "
+              f"{sum(stats['misses'] for _, stats in results)} misses, {sum(stats['hits'] for _, stats in results)} hits")
+
+
+if __name__ == "__main__":
+    main()
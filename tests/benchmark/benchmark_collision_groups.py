@@ -0,0 +1,161 @@
+"""
+Script to benchmark collision group filtering against pairwise collision filters between fixed objects, with a mocked
+stage, headless on CPU.
+
+Each synthetic object has a root link and a few other links, and a fraction of them have a fixed base. Compares
+filtering collisions between every pair of fixed root links (the previous behavior of
+Scene._load_objects_from_scene_file, which authors a quadratic no. of filtered pair relationship targets) against a
+single shared collision group of fixed root links, in terms of authored relationship targets and load time. That both
+approaches filter exactly the same link pairs is covered by tests/test_collision_group_utils.py.
+"""
+
+import os
+import time
+from itertools import combinations
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.collision_group_utils import CollisionGroupRegistry, update_fixed_base_collision_group
+
+
+# Params to be set as needed.
+N_OBJECTS = (100, 500, 1000, 2000)     # No. of objects in each synthetic scene.
+FIXED_FRACTION = 0.6                   # Fraction of objects with a fixed base.
+MAX_LINKS = 4                          # Max no. of links per object.
+SEED = 0                               # Random seed.
+
+
+class MockStage:
+    """
+    Stand-in for the USD stage, holding the relationship targets authored on each prim
+    """
+
+    def __init__(self):
+        self.relationships = dict()
+
+    def add_target(self, prim_path, rel, target):
+        # Dicts keep insertion order, as USD relationship targets do
+        self.relationships.setdefault((prim_path, rel), dict())[target] = None
+
+    def remove_target(self, prim_path, rel, target):
+        self.relationships.get((prim_path, rel), dict()).pop(target, None)
+
+    def get_targets(self, prim_path, rel):
+        return list(self.relationships.get((prim_path, rel), dict()))
+
+    def remove_prim(self, prim_path):
+        for key in [key for key in self.relationships if key[0] == prim_path]:
+            self.relationships.pop(key)
+
+    @property
+    def n_targets(self):
+        return sum(len(targets) for targets in self.relationships.values())
+
+
+class MockLink:
+    """
+    Stand-in for a RigidPrim, with XFormPrim's filtered collision pair API
+    """
+
+    def __init__(self, stage, prim_path):
+        self.stage = stage
+        self.prim_path = prim_path
+
+    def add_filtered_collision_pair(self, prim):
+        self.stage.add_target(self.prim_path, "physics:filteredPairs", prim.prim_path)
+        self.stage.add_target(prim.prim_path, "physics:filteredPairs", self.prim_path)
+
+    def remove_filtered_collision_pair(self, prim):
+        self.stage.remove_target(self.prim_path, "physics:filteredPairs", prim.prim_path)
+        self.stage.remove_target(prim.prim_path, "physics:filteredPairs", self.prim_path)
+
+    def has_filtered_collision_pair(self, prim):
+        return prim.prim_path in self.stage.get_targets(self.prim_path, "physics:filteredPairs")
+
+
+class MockObject:
+    def __init__(self, stage, name, n_links, fixed_base):
+        self.name = name
+        self.fixed_base = fixed_base
+        self.links = {f"link{i}": MockLink(stage, f"/World/{name}/link{i}") for i in range(n_links)}
+        self.root_link = self.links["link0"]
+
+
+class MockCollisionGroupBackend:
+    """
+    Mirrors UsdCollisionGroupBackend on the mocked stage
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.groups = set()
+
+    @staticmethod
+    def get_group_path(name):
+        return f"/World/collisionGroup_{name}"
+
+    def define_group(self, name):
+        self.groups.add(name)
+
+    def undefine_group(self, name):
+        self.groups.remove(name)
+        self.stage.remove_prim(self.get_group_path(name))
+
+    def add_member(self, name, prim_path):
+        self.stage.add_target(self.get_group_path(name), "collection:colliders:includes", prim_path)
+
+    def remove_member(self, name, prim_path):
+        self.stage.remove_target(self.get_group_path(name), "collection:colliders:includes", prim_path)
+
+    def add_filtered_group(self, name, other):
+        self.stage.add_target(self.get_group_path(name), "physics:filteredGroups", self.get_group_path(other))
+
+    def remove_filtered_group(self, name, other):
+        self.stage.remove_target(self.get_group_path(name), "physics:filteredGroups", self.get_group_path(other))
+
+
+def _make_objects(stage, n_objects, rng):
+    return [MockObject(stage, f"obj{i}", n_links=int(rng.integers(1, MAX_LINKS + 1)),
+                       fixed_base=bool(rng.random() < FIXED_FRACTION)) for i in range(n_objects)]
+
+
+def _load_pairwise(objects):
+    # Mirrors the previous Scene._load_objects_from_scene_file
+    fixed_objs = [obj for obj in objects if obj.fixed_base]
+    for obj_a, obj_b in combinations(fixed_objs, 2):
+        obj_a.root_link.add_filtered_collision_pair(obj_b.root_link)
+
+
+def _load_groups(registry, objects):
+    # Mirrors Scene._load_objects_from_scene_file
+    for obj in objects:
+        update_fixed_base_collision_group(registry, obj.root_link.prim_path, obj.fixed_base)
+
+
+def main():
+    print(f"{'objects':>8} {'fixed':>6} {'pairwise targets':>17} {'group targets':>14} "
+          f"{'pairwise (ms)':>14} {'groups (ms)':>12} {'speedup':>8}")
+    for n_objects in N_OBJECTS:
+        pairwise_stage, group_stage = MockStage(), MockStage()
+        pairwise_objects = _make_objects(pairwise_stage, n_objects, np.random.default_rng(SEED + n_objects))
+        group_objects = _make_objects(group_stage, n_objects, np.random.default_rng(SEED + n_objects))
+        registry = CollisionGroupRegistry(backend=MockCollisionGroupBackend(group_stage))
+
+        start = time.perf_counter()
+        _load_pairwise(pairwise_objects)
+        pairwise_time = time.perf_counter() - start
+        start = time.perf_counter()
+        _load_groups(registry, group_objects)
+        group_time = time.perf_counter() - start
+
+        n_fixed = sum(obj.fixed_base for obj in group_objects)
+        assert pairwise_stage.n_targets == n_fixed * (n_fixed - 1)
+        assert group_stage.n_targets == registry.n_relationship_targets == n_fixed
+        print(f"{n_objects:>8} {n_fixed:>6} {pairwise_stage.n_targets:>17} {group_stage.n_targets:>14} "
+              f"{pairwise_time * 1e3:>14.1f} {group_time * 1e3:>12.2f} {pairwise_time / group_time:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Script to benchmark and verify vectorized control deployment on the included robot models.
+
+For each robot, random actions are converted into controls, which are deployed both joint by joint and with one
+articulation-wide call per control type. The resulting position targets, velocity targets and efforts must be
+bit-identical. Reports the mean time per apply_action() call for both paths.
+"""
+
+import time
+
+import numpy as np
+
+import omnigibson as og
+from omnigibson.robots.fetch import Fetch
+from omnigibson.robots.locobot import Locobot
+from omnigibson.robots.tiago import Tiago
+from omnigibson.robots.turtlebot import Turtlebot
+from omnigibson.scenes.scene_base import Scene
+from omnigibson.utils import control_deployment_utils
+
+
+# Params to be set as needed.
+ROBOTS = (Fetch, Tiago, Locobot, Turtlebot)
+N_STEPS = 200         # No. of steps to verify and time for each robot and path.
+
+
+def _deployed_values(robot):
+    return (
+        np.array(robot._dc.get_articulation_dof_position_targets(robot.handle)),
+        np.array(robot._dc.get_articulation_dof_velocity_targets(robot.handle)),
+        np.array(robot._dc.get_articulation_dof_efforts(robot.handle)),
+    )
+
+
+def _deploy(robot, control, control_type, vectorized):
+    control_deployment_utils.m.VECTORIZE_CONTROL = vectorized
+    robot.deploy_control(control=control.copy(), control_type=control_type.copy(), indices=None, normalized=False)
+    return _deployed_values(robot)
+
+
+def benchmark_robot(robot_cls):
+    robot = robot_cls(prim_path=f"/World/{robot_cls.__name__}", name=robot_cls.__name__.lower(), obs_modalities=[])
+    og.sim.import_object(robot)
+    og.sim.step()
+
+    # Verify that both paths deploy the same values
+    for _ in range(N_STEPS):
+        control, control_type = robot._actions_to_control(action=robot.action_space.sample())
+        legacy = _deploy(robot, control, control_type, vectorized=False)
+        vectorized = _deploy(robot, control, control_type, vectorized=True)
+        for name, a, b in zip(("position targets", "velocity targets", "efforts"), legacy, vectorized):
+            assert np.array_equal(a, b), f"{robot_cls.__name__}: vectorized {name} differ from legacy {name}!"
+        og.sim.step()
+
+    # Time apply_action() for both paths
+    times = dict()
+    for vectorized in (False, True):
+        control_deployment_utils.m.VECTORIZE_CONTROL = vectorized
+        actions = [robot.action_space.sample() for _ in range(N_STEPS)]
+        start = time.perf_counter()
+        for action in actions:
+            robot.apply_action(action)
+        times[vectorized] = (time.perf_counter() - start) / N_STEPS
+    print(f"{robot_cls.__name__:>10} {robot.n_dof:>6} {times[False] * 1e6:>12.1f} {times[True] * 1e6:>16.1f}")
+
+    og.sim.remove_object(robot)
+
+
+def main():
+    scene = Scene()
+    og.sim.import_scene(scene)
+    og.sim.play()
+
+    print(f"{'robot':>10} {'n_dof':>6} {'legacy (us)':>12} {'vectorized (us)':>16}")
+    for robot_cls in ROBOTS:
+        benchmark_robot(robot_cls)
+
+    og.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Script to check the dataset index and benchmark category / model discovery against listing the dataset directories,
+headless on CPU.
+
+A synthetic dataset tree stands in for the OmniGibson dataset. Compares the legacy discovery (listing directories and
+reading metadata files on every query, as asset_utils did) against building the index from scratch, loading it from
+disk and querying it. Also checks that the index matches the legacy results and that it is rebuilt whenever the
+dataset is modified.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.dataset_index_utils import DatasetIndex
+
+
+# Params to be set as needed.
+N_CATEGORIES = 200             # No. of synthetic categories.
+N_MODELS_PER_CATEGORY = 50     # No. of synthetic models per category.
+SLICEABLE_FRACTION = 0.1       # Fraction of categories whose models are whole sliceable objects.
+N_LOOKUPS = 10000              # No. of random model path lookups.
+SEED = 0                       # Random seed.
+
+
+def _make_dataset(root):
+    rng = np.random.default_rng(SEED)
+    os.makedirs(os.path.join(root, "metadata"))
+    categories = [f"category{i}" for i in range(N_CATEGORIES)]
+    with open(os.path.join(root, "metadata", "categories.txt"), "w") as f:
+        f.write("\n".join(categories) + "\n")
+    with open(os.path.join(root, "metadata", "avg_category_specs.json"), "w") as f:
+        json.dump({category: dict(size=rng.random(3).tolist(), mass=float(rng.random()), enable_ag=True)
+                   for category in categories}, f)
+    for category in categories:
+        sliceable = rng.random() < SLICEABLE_FRACTION
+        for j in range(N_MODELS_PER_CATEGORY):
+            model = f"model{j}"
+            model_path = os.path.join(root, "objects", category, model)
+            os.makedirs(os.path.join(model_path, "misc"))
+            os.makedirs(os.path.join(model_path, "usd"))
+            open(os.path.join(model_path, "usd", f"{model}.encrypted.usd"), "w").close()
+            metadata = dict(base_link_offset=rng.random(3).tolist(), bbox_size=rng.random(3).tolist())
+            if sliceable and j % 2 == 0:
+                metadata["object_parts"] = {"part0": dict(category=category, model=f"model{j + 1}")}
+            with open(os.path.join(model_path, "misc", "metadata.json"), "w") as f:
+                json.dump(metadata, f)
+    return categories
+
+
+def _legacy_categories(root):
+    objects_path = os.path.join(root, "objects")
+    return sorted([f for f in os.listdir(objects_path) if not f.startswith(".")])
+
+
+def _legacy_model_path(root, category, model):
+    category_path = os.path.join(root, "objects", category)
+    assert category in os.listdir(os.path.join(root, "objects"))
+    assert model in os.listdir(category_path)
+    return os.path.join(category_path, model)
+
+
+def _legacy_sliceable_wholes(root, category):
+    models = []
+    for model in os.listdir(os.path.join(root, "objects", category)):
+        with open(os.path.join(_legacy_model_path(root, category, model), "misc", "metadata.json")) as f:
+            metadata = json.load(f)
+        if "object_parts" in metadata:
+            models.append(model)
+    return models
+
+
+def _legacy_all_model_paths(root):
+    objects_path = os.path.join(root, "objects")
+    return [os.path.join(objects_path, category, model) for category in os.listdir(objects_path)
+            for model in os.listdir(os.path.join(objects_path, category))]
+
+
+def _timed(fcn, *args):
+    start = time.perf_counter()
+    out = fcn(*args)
+    return time.perf_counter() - start, out
+
+
+def _load_in_new_process(root, cache_dir):
+    # Timed in a fresh interpreter, so that nothing is cached in memory
+    code = (f"import os, time; os.environ['OMNIGIBSON_NO_OMNIVERSE'] = '1'\n"
+            f"from omnigibson.utils.dataset_index_utils import DatasetIndex\n"
+            f"start = time.perf_counter(); index = DatasetIndex.load({root!r}, cache_dir={cache_dir!r})\n"
+            f"print(time.perf_counter() - start, index.n_models)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    duration, n_models = out.stdout.strip().splitlines()[-1].split()
+    return float(duration), int(n_models)
+
+
+def _run_queries(lookups, model_path_fn, sliceable_fn, categories_fn, all_models_fn, categories):
+    results = dict()
+    results["categories"], out = _timed(categories_fn)
+    results["model paths"], _ = _timed(lambda: [model_path_fn(category, model) for category, model in lookups])
+    results["sliceable wholes"], wholes = _timed(lambda: {category: sorted(sliceable_fn(category))
+                                                           for category in categories})
+    results["all models"], all_models = _timed(all_models_fn)
+    return results, (out, wholes, sorted(all_models))
+
+
+def main():
+    rng = np.random.default_rng(SEED)
+    with tempfile.TemporaryDirectory() as root:
+        dataset_path = os.path.join(root, "dataset")
+        cache_dir = os.path.join(root, "index")
+        start = time.perf_counter()
+        categories = _make_dataset(dataset_path)
+        n_models = N_CATEGORIES * N_MODELS_PER_CATEGORY
+        print(f"Dataset: {N_CATEGORIES} categories, {n_models} models, generated in "
+              f"{time.perf_counter() - start:.1f}s")
+        lookups = [(categories[i], f"model{j}") for i, j in zip(rng.integers(0, N_CATEGORIES, N_LOOKUPS),
+                                                               rng.integers(0, N_MODELS_PER_CATEGORY, N_LOOKUPS))]
+
+        # Legacy discovery
+        legacy, legacy_out = _run_queries(
+            lookups, lambda c, mdl: _legacy_model_path(dataset_path, c, mdl),
+            lambda c: _legacy_sliceable_wholes(dataset_path, c), lambda: _legacy_categories(dataset_path),
+            lambda: _legacy_all_model_paths(dataset_path), categories)
+
+        # Index, built from scratch, then loaded from disk
+        build, index = _timed(DatasetIndex.load, dataset_path, cache_dir)
+        load, loaded = _timed(DatasetIndex.load, dataset_path, cache_dir)
+        load_new_process, n_loaded = _load_in_new_process(dataset_path, cache_dir)
+        validate, _ = _timed(DatasetIndex.get_signature, dataset_path)
+        index_size = os.path.getsize(DatasetIndex.get_index_path(dataset_path, cache_dir=cache_dir))
+        indexed, indexed_out = _run_queries(
+            lookups, loaded.get_model_path,
+            lambda c: [mdl for _, mdl in loaded.find_models(categories=c, has_fields=["object_parts"])],
+            lambda: loaded.categories, lambda: [loaded.get_model_path(*key) for key in loaded.find_models()],
+            categories)
+
+        print(f"\n{'index':>28} {'time (ms)':>10}")
+        for name, duration in (("build (cold)", build), ("load from disk (warm)", load),
+                               ("load in new process", load_new_process), ("validate", validate)):
+            print(f"{name:>28} {duration * 1e3:>10.1f}")
+        print(f"{'size on disk (KB)':>28} {index_size / 1024:>10.1f}")
+        print(f"\n{'query':>28} {'legacy (ms)':>12} {'index (ms)':>12} {'speedup':>8}")
+        for name in legacy:
+            print(f"{name:>28} {legacy[name] * 1e3:>12.2f} {indexed[name] * 1e3:>12.2f} "
+                  f"{legacy[name] / max(indexed[name], 1e-9):>8.1f}")
+        total_legacy, total_indexed = sum(legacy.values()), sum(indexed.values()) + load
+        print(f"{'total (incl. warm load)':>28} {total_legacy * 1e3:>12.2f} {total_indexed * 1e3:>12.2f} "
+              f"{total_legacy / total_indexed:>8.1f}")
+
+        # Correctness
+        assert indexed_out == legacy_out, "The index does not match the legacy discovery!"
+        assert index.n_models == loaded.n_models == n_loaded == n_models
+        assert loaded.category_ids == categories and set(loaded.avg_category_specs) == set(categories)
+        assert loaded.get_usd_files(*lookups[0]) == [f"{lookups[0][1]}.encrypted.usd"]
+        parts = loaded.find_models(lacks_fields=["object_parts"])
+        assert len(parts) + sum(len(models) for models in legacy_out[1].values()) == n_models
+        abilities = {category: ({"sliceable": {}} if len(legacy_out[1][category]) > 0 else {})
+                     for category in categories}
+        ability_index = DatasetIndex.load(dataset_path, cache_dir=cache_dir, category_abilities_fn=abilities.get)
+        sliceable = ability_index.get_categories_with_ability("sliceable")
+        assert sliceable == {category for category, models in legacy_out[1].items() if len(models) > 0}
+        assert {c for c, _ in ability_index.find_models(ability="sliceable")} == sliceable
+
+        # Invalidation upon adding a model, adding a category and (with file validation) editing metadata
+        os.makedirs(os.path.join(dataset_path, "objects", categories[0], "new_model"))
+        assert DatasetIndex.load(dataset_path, cache_dir).has_model(categories[0], "new_model"), \
+            "The index was not rebuilt after adding a model!"
+        os.makedirs(os.path.join(dataset_path, "objects", "new_category"))
+        assert DatasetIndex.load(dataset_path, cache_dir).has_category("new_category"), \
+            "The index was not rebuilt after adding a category!"
+        DatasetIndex.load(dataset_path, cache_dir, validation_mode="files")
+        metadata_path = os.path.join(dataset_path, "objects", categories[1], "model0", "misc", "metadata.json")
+        with open(metadata_path, "w") as f:
+            json.dump(dict(edited=True), f)
+        files_index = DatasetIndex.load(dataset_path, cache_dir, validation_mode="files")
+        assert files_index.get_model_metadata(categories[1], "model0") == dict(edited=True), \
+            "The index was not rebuilt after editing metadata!"
+        print("All checks passed")
+
+
+if __name__ == "__main__":
+    main()
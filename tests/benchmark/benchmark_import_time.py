@@ -0,0 +1,68 @@
+"""
+Script to check the import time budget of lightweight entry points of omnigibson, headless on CPU.
+
+Each module is imported in fresh interpreters (without omniverse), and its median import time must stay within its
+budget. Additionally checks that heavy third-party modules are not imported as a side effect, and prints the modules
+dominating the import time of each entry point.
+"""
+
+import os
+import sys
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.lazy_import_utils import format_import_time_report, get_import_time_report, measure_import_time
+
+
+# Params to be set as needed.
+BUDGETS = {                                   # Max median import time of each module, in seconds.
+    "omnigibson": 0.15,
+    "omnigibson.utils.transform_utils": 0.3,
+    "omnigibson.maps": 0.15,
+}
+FORBIDDEN_MODULES = (                         # Heavy modules that none of the above may import.
+    "scipy.spatial", "scipy.sparse", "cv2", "PIL", "yaml", "asyncio", "omnigibson.maps.traversable_map",
+)
+N_TRIALS = 5                                  # No. of fresh interpreters to import each module in.
+TOP_K = 15                                    # No. of slowest modules to report per entry point.
+
+
+def check_import_times():
+    """
+    Measures the import time of each module in BUDGETS, and checks it against its budget and FORBIDDEN_MODULES
+
+    Returns:
+        list of str: Description of each failed check
+    """
+    print(f"{'module':<40} {'median (ms)':>12} {'max (ms)':>10} {'budget (ms)':>12}")
+    failures = []
+    for module, budget in BUDGETS.items():
+        times = measure_import_time(module, n_trials=N_TRIALS)
+        median = float(np.median(times))
+        print(f"{module:<40} {median * 1e3:>12.1f} {max(times) * 1e3:>10.1f} {budget * 1e3:>12.1f}")
+        if median > budget:
+            failures.append(f"Importing {module} took {median * 1e3:.1f} ms, over its budget of {budget * 1e3:.1f} ms")
+
+        imported = {name for name, _, _ in get_import_time_report(module, top_k=None)}
+        forbidden = sorted(name for name in FORBIDDEN_MODULES if name in imported)
+        if len(forbidden) > 0:
+            failures.append(f"Importing {module} also imports {forbidden}")
+    return failures
+
+
+def main():
+    failures = check_import_times()
+
+    for module in BUDGETS:
+        print(f"\nSlowest modules imported by {module}:")
+        print(format_import_time_report(get_import_time_report(module, top_k=TOP_K)))
+
+    if len(failures) > 0:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
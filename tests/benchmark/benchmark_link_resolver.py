@@ -0,0 +1,99 @@
+"""
+Script to benchmark resolving synthetic contact pairs into objects, headless on CPU.
+
+Compares the legacy path, which converts each integer handle into a prim path string, strips the link name and looks
+up the object prim path in the registry, against the RigidLinkResolver, both per handle and batched.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.link_resolver_utils import RigidLinkResolver
+from omnigibson.utils.raycast_utils import PrimPathInterner
+from omnigibson.utils.registry_utils import Registry
+
+
+# Params to be set as needed.
+N_OBJS = 1000             # No. of objects in the synthetic scene.
+N_LINKS_PER_OBJ = 5       # No. of links per object.
+N_CONTACT_PAIRS = 1000000  # No. of synthetic contact pairs to resolve.
+UNKNOWN_FRACTION = 0.05   # Fraction of handles that do not belong to any registered object (e.g.: the ground plane).
+
+
+class _Link:
+    def __init__(self, prim_path):
+        self.prim_path = prim_path
+
+
+class _Obj:
+    def __init__(self, idx):
+        self.name = f"obj{idx}"
+        self.prim_path = f"/World/obj{idx}"
+        self.links = {f"link{i}": _Link(f"{self.prim_path}/link{i}") for i in range(N_LINKS_PER_OBJ)}
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    # Mimic SdfPath integer handles with random 64-bit integers
+    path_to_handle, handle_to_path = dict(), dict()
+
+    def sdf_path_to_int(path):
+        if path not in path_to_handle:
+            handle = int(rng.integers(0, 2 ** 63))
+            path_to_handle[path] = handle
+            handle_to_path[handle] = path
+        return path_to_handle[path]
+
+    registry = Registry(name="benchmark_object_registry", unique_keys=["prim_path"])
+    resolver = RigidLinkResolver(interner=PrimPathInterner(), path_to_handle=sdf_path_to_int)
+    objs = [_Obj(i) for i in range(N_OBJS)]
+    for obj in objs:
+        registry.add(obj)
+        resolver.add_object(obj)
+    for i in range(int(N_OBJS * N_LINKS_PER_OBJ * UNKNOWN_FRACTION)):
+        sdf_path_to_int(f"/World/ground_plane/geom{i}")
+
+    all_handles = np.array(list(handle_to_path.keys()), dtype=np.uint64)
+    actors = rng.choice(all_handles, size=(N_CONTACT_PAIRS, 2))
+    actor_list = [(int(a0), int(a1)) for a0, a1 in actors]
+
+    def legacy():
+        results = []
+        for a0, a1 in actor_list:
+            actor0, actor1 = handle_to_path[a0], handle_to_path[a1]
+            results.append((
+                registry("prim_path", "/".join(actor0.split("/")[:-1])),
+                registry("prim_path", "/".join(actor1.split("/")[:-1])),
+            ))
+        return results
+
+    def per_handle():
+        return [(resolver.resolve_handle(a0)[0], resolver.resolve_handle(a1)[0]) for a0, a1 in actor_list]
+
+    def batched():
+        objs0, _ = resolver.resolve_handles(actors[:, 0])
+        objs1, _ = resolver.resolve_handles(actors[:, 1])
+        return objs0, objs1
+
+    print(f"{'method':>12} {'time (s)':>10} {'pairs/s':>14}")
+    results = dict()
+    for name, fcn in (("legacy", legacy), ("per handle", per_handle), ("batched", batched)):
+        start = time.perf_counter()
+        results[name] = fcn()
+        duration = time.perf_counter() - start
+        print(f"{name:>12} {duration:>10.3f} {N_CONTACT_PAIRS / duration:>14.0f}")
+
+    # Make sure all methods agree
+    legacy_objs = np.array(results["legacy"], dtype=object)
+    assert all(a is b for a, b in zip(legacy_objs.flat, np.array(results["per handle"], dtype=object).flat))
+    assert all(a is b for a, b in zip(legacy_objs[:, 0], results["batched"][0]))
+    assert all(a is b for a, b in zip(legacy_objs[:, 1], results["batched"][1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Script to benchmark macro particle storage operations vs. no. of particles, headless on CPU.
+
+Compares the array-backed MacroParticleStorage against the legacy per-particle layout, where each particle is an
+individual object holding its own local pose and scale, tracked in per-system and per-group dicts, and where world
+poses are computed one particle at a time with 4x4 matrices. Simulator prims are not involved in either case, so
+the legacy timings are lower bounds. Benchmarked operations are: adding particles to groups, computing all world
+poses, dumping + serializing all particle poses, and removing half of the particles.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+from scipy.spatial.transform import Rotation as R
+
+import omnigibson.utils.transform_utils as T
+from omnigibson.utils.particle_storage_utils import MacroParticleStorage
+
+
+# Params to be set as needed.
+N_PARTICLES = (1000, 10000, 100000)  # No. of particles to benchmark.
+N_GROUPS = 10                        # No. of attachment groups the particles are split into.
+N_LINKS_PER_GROUP = 4                # No. of links per group object the particles are attached to.
+MAX_LEGACY_PARTICLES = 100000        # Largest no. of particles to also benchmark the legacy layout with.
+
+
+class _Link:
+    def __init__(self, rng):
+        self.position = rng.normal(size=3)
+        self.orientation = R.random(random_state=rng.integers(1 << 31)).as_quat()
+        self.scale = rng.uniform(0.5, 2.0, 3)
+        self.prim_path = f"/World/obj/link{rng.integers(1 << 31)}"
+
+    def get_position_orientation(self):
+        return self.position, self.orientation
+
+
+class _LegacyParticle:
+    def __init__(self, name, local_pos, local_quat, scale):
+        self.name = name
+        self.local_pos, self.local_quat, self.scale = local_pos, local_quat, scale
+
+    def get_local_pose(self):
+        return self.local_pos, self.local_quat
+
+
+def _legacy_add(particles, group_particles, particles_info, group, links, positions, orientations, scales, start_idn):
+    for i, (link, pos, quat, scale) in enumerate(zip(links, positions, orientations, scales)):
+        # Global to local, one particle at a time
+        local_mat = np.linalg.inv(T.pose2mat(link.get_position_orientation())) @ T.pose2mat((pos, quat))
+        local_pos, local_quat = T.mat2pose(local_mat)
+        name = f"DustParticle{start_idn + i}"
+        particle = _LegacyParticle(name, local_pos / link.scale, local_quat, scale)
+        particles[name] = particle
+        group_particles[group][name] = particle
+        particles_info[name] = dict(link=link, group=group)
+
+
+def _legacy_world_poses(particles, particles_info):
+    poses = []
+    for name, particle in particles.items():
+        parent_link = particles_info[name]["link"]
+        local_pos, local_quat = particle.get_local_pose()
+        local_mat = T.pose2mat((parent_link.scale * local_pos, local_quat))
+        poses.append(T.mat2pose(T.pose2mat(parent_link.get_position_orientation()) @ local_mat))
+    return np.array([pos for pos, _ in poses])
+
+
+def _legacy_serialize(particles):
+    poses = [particle.get_local_pose() for particle in particles.values()]
+    scales = [particle.scale for particle in particles.values()]
+    return np.concatenate([*[np.concatenate(pose) for pose in poses], *scales]).astype(float)
+
+
+def _legacy_remove(particles, group_particles, particles_info, names):
+    for name in names:
+        particles.pop(name)
+        group_particles[particles_info.pop(name)["group"]].pop(name)
+
+
+def _time(fcn):
+    start = time.perf_counter()
+    result = fcn()
+    return result, time.perf_counter() - start
+
+
+def benchmark(rng, n_particles):
+    links = [_Link(rng) for _ in range(N_GROUPS * N_LINKS_PER_GROUP)]
+    n_per_group = n_particles // N_GROUPS
+    positions = rng.normal(size=(N_GROUPS, n_per_group, 3))
+    orientations = R.random(N_GROUPS * n_per_group, random_state=0).as_quat().reshape(N_GROUPS, n_per_group, 4)
+    scales = rng.uniform(0.5, 1.5, (N_GROUPS, n_per_group, 3))
+    group_links = [[links[g * N_LINKS_PER_GROUP + i % N_LINKS_PER_GROUP] for i in range(n_per_group)]
+                   for g in range(N_GROUPS)]
+
+    # Array-backed storage
+    storage = MacroParticleStorage()
+
+    def add():
+        for g in range(N_GROUPS):
+            storage.add_group(f"group{g}")
+            link_ids = storage.get_link_ids(group_links[g])
+            local_positions, local_orientations = storage.world_to_local(link_ids, positions[g], orientations[g])
+            storage.add(np.arange(g * n_per_group, (g + 1) * n_per_group), local_positions, local_orientations,
+                        scales[g], group=f"group{g}", links=group_links[g])
+
+    def serialize():
+        idxs = np.concatenate([storage.get_group_indices(group) for group in storage.groups])
+        return np.concatenate([
+            np.concatenate([storage.positions[idxs], storage.orientations[idxs]], axis=1).flatten(),
+            storage.scales[idxs].flatten(),
+        ])
+
+    times = dict()
+    _, times["add"] = _time(add)
+    world_positions, times["world poses"] = _time(lambda: storage.get_world_poses()[0])
+    state, times["serialize"] = _time(serialize)
+    _, times["remove half"] = _time(lambda: storage.remove(np.arange(0, storage.n_particles, 2)))
+    assert np.allclose(world_positions, positions.reshape(-1, 3)), "World poses differ from added poses!"
+
+    # Legacy per-particle layout
+    legacy_times = None
+    if n_particles <= MAX_LEGACY_PARTICLES:
+        particles, group_particles, particles_info = dict(), {f"group{g}": dict() for g in range(N_GROUPS)}, dict()
+
+        def legacy_add():
+            for g in range(N_GROUPS):
+                _legacy_add(particles, group_particles, particles_info, f"group{g}", group_links[g], positions[g],
+                            orientations[g], scales[g], g * n_per_group)
+
+        legacy_times = dict()
+        _, legacy_times["add"] = _time(legacy_add)
+        legacy_world_positions, legacy_times["world poses"] = _time(
+            lambda: _legacy_world_poses(particles, particles_info))
+        legacy_state, legacy_times["serialize"] = _time(lambda: _legacy_serialize(particles))
+        _, legacy_times["remove half"] = _time(lambda: _legacy_remove(
+            particles, group_particles, particles_info, list(particles.keys())[::2]))
+        assert np.allclose(world_positions, legacy_world_positions, atol=1e-5), \
+            "World poses differ from legacy world poses!"
+        # Quaternions are only equal up to sign
+        poses, legacy_poses = state[:7 * n_particles].reshape(-1, 7), legacy_state[:7 * n_particles].reshape(-1, 7)
+        assert np.allclose(poses[:, :3], legacy_poses[:, :3], atol=1e-5) and \
+            np.allclose(np.abs(np.sum(poses[:, 3:] * legacy_poses[:, 3:], axis=1)), 1.0) and \
+            np.allclose(state[7 * n_particles:], legacy_state[7 * n_particles:]), \
+            "Serialized state differs from legacy serialized state!"
+
+    for name, duration in times.items():
+        legacy_str = f"{'-':>12} {'-':>8}" if legacy_times is None else \
+            f"{legacy_times[name] * 1e3:>12.1f} {legacy_times[name] / duration:>7.0f}x"
+        print(f"{n_particles:>11} {name:>12} {duration * 1e3:>11.2f} {legacy_str}")
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    # Warm up any JIT-compiled batched transforms
+    storage = MacroParticleStorage()
+    links = [_Link(rng)] * 1000
+    local_positions, local_orientations = storage.world_to_local(
+        storage.get_link_ids(links), np.zeros((1000, 3)), np.tile([0, 0, 0, 1.0], (1000, 1)))
+    storage.add(np.arange(1000), local_positions, local_orientations, links=links)
+    storage.get_world_poses()
+
+    print(f"{'n_particles':>11} {'operation':>12} {'arrays (ms)':>11} {'legacy (ms)':>12} {'speedup':>8}")
+    for n_particles in N_PARTICLES:
+        benchmark(rng, n_particles)
+
+
+if __name__ == "__main__":
+    main()
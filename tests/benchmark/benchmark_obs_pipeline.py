@@ -0,0 +1,159 @@
+"""
+Script to benchmark the asynchronous vision observation pipeline against synchronous processing, headless on CPU.
+
+Raw buffers are generated by a MockRawBufferSource, and post-processed per modality with typical CPU work (type
+conversions, depth linearization, segmentation remapping, normal normalization). Each control step simulates a
+physics step, then requests the observations of the current frame, and consumes the observations of the previous
+frame. In the synchronous case, processing blocks the step, whereas in the asynchronous case it overlaps with the next
+physics step. A strided sample of every frame's observations is compared against synchronously processing the same
+raw snapshot after the run, so that mixed frames are detected. Reports steps per second and per-modality latency
+histograms, where async latencies are measured from the end of the snapshot to the end of processing.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.obs_pipeline_utils import AsyncObservationPipeline, MockRawBufferSource, ModalityProcessor
+
+
+# Params to be set as needed.
+IMAGE_SIZE = 512                 # Height == width of the generated images, in pixels.
+MODALITIES = ("rgb", "depth", "depth_linear", "normal", "seg_semantic", "seg_instance")
+N_STEPS = 100                    # No. of control steps to run.
+PHYSICS_STEP_TIME = 0.01         # Simulated physics step time, in seconds (the GIL is released, like the simulator).
+N_WORKERS = 4                    # No. of worker threads.
+NEAR, FAR = 0.01, 100.0          # Clipping range used to linearize depth.
+SAMPLE_STRIDE = 8                # Stride of the pixels of each frame kept to verify it against its raw snapshot.
+
+
+def _create_processors():
+    h = w = IMAGE_SIZE
+    rng = np.random.default_rng(0)
+    semantic_lut = rng.integers(0, 32, 64).astype(np.uint32)
+    instance_lut = rng.permutation(1024).astype(np.uint32)
+
+    def rgb(raw, out):
+        np.divide(raw[..., :3], 255.0, out=out, dtype=np.float32)
+        return out
+
+    def depth(raw, out):
+        # Linearize normalized depth into meters
+        np.divide(NEAR * FAR, FAR - raw * (FAR - NEAR), out=out)
+        return out
+
+    def depth_linear(raw, out):
+        np.clip(raw, NEAR, FAR, out=out)
+        return out
+
+    def normal(raw, out):
+        np.divide(raw, np.linalg.norm(raw, axis=-1, keepdims=True) + 1e-8, out=out)
+        return out
+
+    def seg(lut):
+        def process(raw, out):
+            np.take(lut, raw, out=out, mode="wrap")
+            return out
+        return process
+
+    return dict(
+        rgb=ModalityProcessor(fcn=rgb, shape=(h, w, 3), dtype=np.float32),
+        depth=ModalityProcessor(fcn=depth, shape=(h, w), dtype=np.float32),
+        depth_linear=ModalityProcessor(fcn=depth_linear, shape=(h, w), dtype=np.float32),
+        normal=ModalityProcessor(fcn=normal, shape=(h, w, 3), dtype=np.float32),
+        seg_semantic=ModalityProcessor(fcn=seg(semantic_lut), shape=(h, w), dtype=np.uint32),
+        seg_instance=ModalityProcessor(fcn=seg(instance_lut), shape=(h, w), dtype=np.uint32),
+    )
+
+
+def _process_sync(processors, raw):
+    return {modality: processors[modality].fcn(buffer, processors[modality].allocate())
+            for modality, buffer in raw.items()}
+
+
+def _sample(obs):
+    # Strided sample of each observation, including the first element holding the snapshot id
+    return {modality: value[::SAMPLE_STRIDE, ::SAMPLE_STRIDE].copy() for modality, value in obs.items()}
+
+
+def _verify(processors, source, frame_id, sample):
+    expected = _sample(_process_sync(processors, source.get_snapshot(frame_id, MODALITIES)))
+    assert sample.keys() == expected.keys()
+    for modality, value in sample.items():
+        assert np.array_equal(value, expected[modality]), f"Frame {frame_id} mixed up for modality {modality}!"
+
+
+def run_sync(processors):
+    source = MockRawBufferSource(IMAGE_SIZE, IMAGE_SIZE)
+    latencies = {modality: [] for modality in MODALITIES}
+    samples = []
+    start = time.perf_counter()
+    for step in range(N_STEPS):
+        time.sleep(PHYSICS_STEP_TIME)
+        raw = source.snapshot(MODALITIES)
+        obs = dict()
+        for modality, buffer in raw.items():
+            t = time.perf_counter()
+            obs[modality] = processors[modality].fcn(buffer, processors[modality].allocate())
+            latencies[modality].append(time.perf_counter() - t)
+        samples.append(_sample(obs))
+    rate = N_STEPS / (time.perf_counter() - start)
+
+    for frame_id, sample in enumerate(samples):
+        _verify(processors, source, frame_id, sample)
+    return rate, latencies
+
+
+def run_async(processors):
+    source = MockRawBufferSource(IMAGE_SIZE, IMAGE_SIZE)
+    pipeline = AsyncObservationPipeline(source=source, processors=processors, n_workers=N_WORKERS)
+    results = []
+    start = time.perf_counter()
+    previous_frame = None
+    for step in range(N_STEPS + 1):
+        if step < N_STEPS:
+            time.sleep(PHYSICS_STEP_TIME)
+            frame = pipeline.submit(MODALITIES)
+        # Consume the previous frame while the current one is being processed
+        if previous_frame is not None:
+            results.append((previous_frame.frame_id, _sample(previous_frame.result())))
+        previous_frame = frame if step < N_STEPS else None
+    rate = N_STEPS / (time.perf_counter() - start)
+    pipeline.shutdown()
+
+    assert [frame_id for frame_id, _ in results] == list(range(N_STEPS)), "Frames were returned out of order!"
+    for frame_id, sample in results:
+        _verify(processors, source, frame_id, sample)
+    return rate, pipeline
+
+
+def main():
+    processors = _create_processors()
+    sync_rate, sync_latencies = run_sync(processors)
+    async_rate, pipeline = run_async(processors)
+
+    print(f"image size: {IMAGE_SIZE}, physics step: {PHYSICS_STEP_TIME * 1e3:.1f} ms, n_workers: {N_WORKERS}")
+    print(f"steps / s: sync {sync_rate:.1f}, async {async_rate:.1f} ({async_rate / sync_rate:.2f}x), "
+          f"no observations {1.0 / PHYSICS_STEP_TIME:.1f}")
+    print(f"{'modality':>13} {'sync mean (ms)':>15} {'async mean (ms)':>16} {'async p50 (ms)':>15} "
+          f"{'async p99 (ms)':>15} {'async (obs / s)':>16}")
+    for modality in MODALITIES:
+        histogram = pipeline.latencies[modality]
+        print(f"{modality:>13} {np.mean(sync_latencies[modality]) * 1e3:>15.2f} {histogram.mean * 1e3:>16.2f} "
+              f"{histogram.percentile(50) * 1e3:>15.2f} {histogram.percentile(99) * 1e3:>15.2f} "
+              f"{histogram.throughput:>16.1f}")
+    histogram = pipeline.frame_latencies
+    print(f"{'frame':>13} {sum(np.mean(v) for v in sync_latencies.values()) * 1e3:>15.2f} "
+          f"{histogram.mean * 1e3:>16.2f} {histogram.percentile(50) * 1e3:>15.2f} "
+          f"{histogram.percentile(99) * 1e3:>15.2f} {histogram.throughput:>16.1f}")
+    print("async frame latency histogram (ms):")
+    for lower, upper, count in zip(histogram.bin_edges[:-1], histogram.bin_edges[1:], histogram.counts):
+        if count > 0:
+            print(f"  [{lower * 1e3:>8.3f}, {upper * 1e3:>8.3f}) {'#' * int(np.ceil(count * 50 / N_STEPS))} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Script to benchmark rasterizing 2D LiDAR scans into local occupancy grids vs. grid resolution, headless on CPU.
+
+Compares the vectorized pipeline of ScanSensor (cached beam directions, one precomputed-kernel stamp of all obstacle
+disks, precomputed inner free space mask) against the legacy pipeline, which builds the beam directions with a list
+comprehension and draws one cv2.circle per scan hit. Also reports the throughput of accumulating multiple scans into a
+rolling egocentric grid. That both pipelines produce equal grids pixel for pixel is covered by
+tests/test_occupancy_grid_utils.py.
+"""
+
+import os
+import time
+from collections import deque
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import cv2
+import numpy as np
+from scipy.spatial.transform import Rotation as R
+
+import omnigibson.utils.transform_utils as T
+from omnigibson.utils.constants import OccupancyGridState
+from omnigibson.utils.occupancy_grid_utils import OccupancyGridRasterizer, get_beam_directions
+
+
+# Params to be set as needed.
+GRID_RESOLUTIONS = (64, 128, 256, 512)   # Occupancy grid resolutions (in pixels per side) to benchmark.
+GRID_RANGE = 5.0                          # Range of the occupancy grid, in meters.
+INNER_RADIUS = 0.5                        # Radius of the inner free space of the grid, in meters.
+MIN_RANGE, MAX_RANGE = 0.05, 10.0         # Min / max range of the LiDAR, in meters.
+HORIZONTAL_FOV = 360.0                    # Horizontal field of view of the LiDAR, in degrees.
+HORIZONTAL_RESOLUTION = 0.5               # Degrees in between each horizontal scan hit.
+N_ACCUMULATED_SCANS = 5                   # No. of scans to accumulate into the rolling grid.
+N_GRIDS = 200                             # No. of grids to generate per resolution.
+
+
+def _legacy_grid(scan, pos, ori, base_pos, base_ori, resolution, inner_radius):
+    # Replicates the legacy ScanSensor.get_local_occupancy_grid, with (x,y,z,w) quaternions
+    angles = np.arange(-np.radians(HORIZONTAL_FOV / 2), np.radians(HORIZONTAL_FOV / 2),
+                       np.radians(HORIZONTAL_RESOLUTION))
+    unit_vector_laser = np.array([[np.cos(ang), np.sin(ang), 0.0] for ang in angles])
+    scan_laser = unit_vector_laser * (scan * (MAX_RANGE - MIN_RANGE) + MIN_RANGE)
+    scan_world = T.quat2mat(ori).dot(scan_laser.T).T + pos
+    scan_local = T.quat2mat(base_ori).T.dot((scan_world - base_pos).T).T
+    scan_local = scan_local[:, :2]
+    scan_local = np.concatenate([np.array([[0, 0]]), scan_local, np.array([[0, 0]])], axis=0)
+    scan_local[:, 1] *= -1
+    occupancy_grid = np.zeros((resolution, resolution)).astype(np.uint8)
+    occupancy_grid.fill(int(OccupancyGridState.UNKNOWN * 2.0))
+    scan_local_in_map = scan_local / GRID_RANGE * resolution + (resolution / 2)
+    scan_local_in_map = scan_local_in_map.reshape((1, -1, 1, 2)).astype(np.int32)
+    for i in range(scan_local_in_map.shape[1]):
+        cv2.circle(img=occupancy_grid, center=(scan_local_in_map[0, i, 0, 0], scan_local_in_map[0, i, 0, 1]),
+                   radius=2, color=int(OccupancyGridState.OBSTACLES * 2.0), thickness=-1)
+    cv2.fillPoly(img=occupancy_grid, pts=scan_local_in_map, color=int(OccupancyGridState.FREESPACE * 2.0), lineType=1)
+    cv2.circle(img=occupancy_grid, center=(resolution // 2, resolution // 2), radius=inner_radius,
+               color=int(OccupancyGridState.FREESPACE * 2.0), thickness=-1)
+    return occupancy_grid[:, :, None].astype(np.float32) / 2.0
+
+
+class _VectorizedGrid:
+    # Mirrors ScanSensor.get_local_occupancy_grid
+    def __init__(self, resolution, inner_radius, n_scans):
+        self.rasterizer = OccupancyGridRasterizer(resolution=resolution, grid_range=GRID_RANGE,
+                                                  inner_radius=inner_radius)
+        self.beam_directions = get_beam_directions(HORIZONTAL_FOV, HORIZONTAL_RESOLUTION)
+        self.scan_history = deque(maxlen=n_scans)
+
+    def __call__(self, scan, pos, ori, base_pos, base_ori):
+        scan_laser = self.beam_directions * (scan * (MAX_RANGE - MIN_RANGE) + MIN_RANGE)
+        scan_world = T.quat2mat(ori).dot(scan_laser.T).T + pos
+        self.scan_history.append((np.array(base_pos), scan_world))
+        base_rot_inv = T.quat2mat(base_ori).T
+        scans_local = [
+            (np.zeros(2) if i == len(self.scan_history) - 1 else base_rot_inv.dot(origin_world - base_pos)[:2],
+             base_rot_inv.dot((hits_world - base_pos).T).T[:, :2])
+            for i, (origin_world, hits_world) in enumerate(self.scan_history)
+        ]
+        return self.rasterizer.rasterize(scans=scans_local)[:, :, None].astype(np.float32) / 2.0
+
+
+def _random_inputs(rng, n_rays):
+    # Random (n_rays, 1) scans with some beams not hitting anything, and a base that moves and turns a bit every step
+    scans = np.clip(rng.uniform(0.0, 1.2, (N_GRIDS, n_rays, 1)), 0.0, 1.0)
+    base_xy = np.cumsum(rng.normal(0, 0.05, (N_GRIDS, 2)), axis=0)
+    base_yaw = np.cumsum(rng.normal(0, 0.05, N_GRIDS))
+    base_pos = np.concatenate([base_xy, np.full((N_GRIDS, 1), 0.1)], axis=1)
+    base_ori = R.from_euler("z", base_yaw[:, None]).as_quat()
+    # Sensor mounted 0.2 m in front of the base, slightly tilted
+    mount_pos, mount_ori = np.array([0.2, 0.0, 0.3]), R.from_euler("xyz", [0.01, -0.02, 0.1]).as_quat()
+    poses = [T.pose_transform(base_pos[i], base_ori[i], mount_pos, mount_ori) for i in range(N_GRIDS)]
+    return scans, [pose[0] for pose in poses], [pose[1] for pose in poses], base_pos, base_ori
+
+
+def _time(fcn, inputs):
+    start = time.perf_counter()
+    grids = [fcn(*args) for args in zip(*inputs)]
+    return grids, N_GRIDS / (time.perf_counter() - start)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    n_rays = len(get_beam_directions(HORIZONTAL_FOV, HORIZONTAL_RESOLUTION))
+
+    print(f"n_rays: {n_rays}, n_grids: {N_GRIDS}")
+    print(f"{'resolution':>10} {'legacy (grids / s)':>19} {'vectorized (grids / s)':>23} {'speedup':>8} "
+          f"{f'{N_ACCUMULATED_SCANS} scans (grids / s)':>22}")
+    for resolution in GRID_RESOLUTIONS:
+        inputs = _random_inputs(rng, n_rays)
+        inner_radius = int(INNER_RADIUS * resolution / GRID_RANGE)
+        _, legacy_rate = _time(
+            lambda *args: _legacy_grid(*args, resolution=resolution, inner_radius=inner_radius), inputs)
+        _, rate = _time(_VectorizedGrid(resolution, inner_radius, n_scans=1), inputs)
+        _, accumulated_rate = _time(_VectorizedGrid(resolution, inner_radius, n_scans=N_ACCUMULATED_SCANS), inputs)
+
+        print(f"{resolution:>10} {legacy_rate:>19.0f} {rate:>23.0f} {rate / legacy_rate:>7.1f}x "
+              f"{accumulated_rate:>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
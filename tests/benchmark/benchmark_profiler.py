@@ -0,0 +1,181 @@
+"""
+Script to check the nesting and benchmark the overhead of the simulator step profiler, headless on CPU.
+
+A mocked simulator replicates the phases of Simulator.step (physics, omni update, non-physics step with system caching,
+per-state updates, system updates and visual updates, and transition rules), each doing a small amount of numpy work
+and instrumented with the same timers. Checks that all timers are nested under their phase with the expected call
+counts, that exported Chrome trace events nest within their parents, and that memory deltas are traced. Reports the
+cost per timer and per step with the profiler disabled and enabled, and fails if they exceed the given bounds.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.profiling_utils import Profiler
+
+
+# Params to be set as needed.
+N_STEPS = 200                    # No. of mocked simulator steps to run.
+N_SYSTEMS = 3                    # No. of mocked particle systems.
+N_STATE_TYPES = 12               # No. of mocked object state types requiring updates.
+N_RULES = 6                      # No. of mocked transition rules.
+WORK_SIZE = 20000                # Size of the array each mocked update sorts (~5 ms per step).
+N_TIMER_CALLS = 200000           # No. of empty timers to enter to measure the cost per timer.
+MAX_DISABLED_TIMER_COST = 1e-6   # Max cost of a timer with the profiler disabled, in seconds.
+MAX_ENABLED_TIMER_COST = 2e-5    # Max cost of a timer with the profiler enabled, in seconds.
+MAX_DISABLED_OVERHEAD = 0.01     # Max relative slowdown of a step with the profiler disabled.
+
+
+class _MockSimulator:
+    # Mirrors the structure and timers of Simulator.step
+    def __init__(self, profiler, instrumented=True):
+        self.profiler = profiler
+        self.instrumented = instrumented
+        self.systems = [f"system{i}" for i in range(N_SYSTEMS)]
+        self.state_types = [f"State{i}" for i in range(N_STATE_TYPES)]
+        self.rule_names = [f"{i}_Rule" for i in range(N_RULES)]
+        self.data = np.random.default_rng(0).random(WORK_SIZE)
+        self.retained = []
+
+    def timer(self, name):
+        return self.profiler.timer(name)
+
+    def _work(self):
+        return float(np.sort(self.data).sum())
+
+    def _run(self, name, fcn):
+        if self.instrumented:
+            with self.timer(name):
+                fcn()
+        else:
+            fcn()
+
+    def _non_physics_step(self):
+        self._run("spatial_index", self._work)
+        self._run("system_cache", lambda: [self._run(system, self._work) for system in self.systems])
+
+        def update_states():
+            for state_type in self.state_types:
+                self._run(state_type, self._work)
+            # Retain some memory, as e.g.: a cache would
+            self.retained.append(np.ones(1000))
+        self._run("object_states", update_states)
+        self._run("system_update", lambda: [self._run(system, self._work) for system in self.systems])
+        self._run("update_visuals", self._work)
+
+    def step(self):
+        def step():
+            self._run("physics", lambda: [self._work() for _ in range(4)])
+            self._run("omni_update", self._work)
+            self._run("non_physics", self._non_physics_step)
+            self._run("transition_rules", lambda: [self._run(name, self._work) for name in self.rule_names])
+        self._run("step", step)
+
+    @property
+    def expected_counts(self):
+        paths = ["step", "step/physics", "step/omni_update", "step/non_physics", "step/transition_rules"]
+        paths += [f"step/non_physics/{phase}" for phase in
+                  ("spatial_index", "system_cache", "object_states", "system_update", "update_visuals")]
+        paths += [f"step/non_physics/{phase}/{system}" for phase in ("system_cache", "system_update")
+                  for system in self.systems]
+        paths += [f"step/non_physics/object_states/{state_type}" for state_type in self.state_types]
+        paths += [f"step/transition_rules/{name}" for name in self.rule_names]
+        return {path: N_STEPS for path in paths}
+
+    @property
+    def n_timers_per_step(self):
+        return len(self.expected_counts)
+
+
+def _time_steps(sim):
+    start = time.perf_counter()
+    for _ in range(N_STEPS):
+        sim.step()
+    return (time.perf_counter() - start) / N_STEPS
+
+
+def _time_timer(profiler):
+    start = time.perf_counter()
+    for _ in range(N_TIMER_CALLS):
+        with profiler.timer("timer"):
+            pass
+    duration = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(N_TIMER_CALLS):
+        pass
+    return (duration - (time.perf_counter() - start)) / N_TIMER_CALLS
+
+
+def _verify_nesting(profiler, sim):
+    counts = {path: stats.count for path, stats in profiler.stats.items()}
+    assert counts == sim.expected_counts, "Timers are not nested as expected!"
+    for path, stats in profiler.stats.items():
+        children = [s.total for p, s in profiler.stats.items() if p.rsplit("/", 1)[0] == path and p != path]
+        assert sum(children) <= stats.total, f"Children of timer {path} took longer than the timer itself!"
+
+    # Each exported trace event lies within the event of its parent
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fpath = os.path.join(tmp_dir, "trace.json")
+        profiler.export_chrome_trace(fpath)
+        with open(fpath, "r") as f:
+            events = json.load(f)["traceEvents"]
+    assert len(events) == N_STEPS * sim.n_timers_per_step
+    active = []
+    for event in sorted(events, key=lambda e: (e["ts"], -e["dur"])):
+        while len(active) > 0 and event["ts"] >= active[-1]["ts"] + active[-1]["dur"]:
+            active.pop()
+        parent_path = event["args"]["path"].rsplit("/", 1)[0] if "/" in event["args"]["path"] else None
+        assert (active[-1]["args"]["path"] if len(active) > 0 else None) == parent_path, \
+            f"Trace event {event['args']['path']} is not nested within its parent!"
+        active.append(event)
+
+
+def main():
+    profiler = Profiler()
+    baseline = _time_steps(_MockSimulator(profiler, instrumented=False))
+    sim = _MockSimulator(profiler)
+
+    # Disabled: no statistics are collected
+    disabled_timer_cost = _time_timer(profiler)
+    disabled = _time_steps(sim)
+    assert len(profiler.stats) == 0
+
+    # Enabled
+    profiler.enable()
+    enabled = _time_steps(sim)
+    _verify_nesting(profiler, sim)
+    enabled_timer_cost = _time_timer(profiler)
+    profiler.disable()
+    profiler.reset()
+
+    # Enabled, with memory tracking
+    profiler.enable(track_memory=True)
+    sim.retained.clear()
+    tracked = _time_steps(sim)
+    memory_delta = profiler.stats["step/non_physics/object_states"].memory_delta
+    assert memory_delta >= N_STEPS * np.ones(1000).nbytes, "Retained memory was not traced!"
+    profiler.disable()
+
+    disabled_overhead = sim.n_timers_per_step * disabled_timer_cost / baseline
+    print(f"timers per step: {sim.n_timers_per_step}, uninstrumented step: {baseline * 1e3:.3f} ms")
+    print(f"{'profiler':>18} {'step (ms)':>10} {'per timer (us)':>15}")
+    print(f"{'disabled':>18} {disabled * 1e3:>10.3f} {disabled_timer_cost * 1e6:>15.3f}")
+    print(f"{'enabled':>18} {enabled * 1e3:>10.3f} {enabled_timer_cost * 1e6:>15.3f}")
+    print(f"{'enabled + memory':>18} {tracked * 1e3:>10.3f} {'-':>15}")
+    print(f"estimated disabled overhead per step: {disabled_overhead * 100:.3f} %, "
+          f"traced memory retained by object states: {memory_delta / 1e6:.2f} MB")
+    print(profiler.report())
+
+    assert disabled_timer_cost <= MAX_DISABLED_TIMER_COST, "Disabled timers are too slow!"
+    assert enabled_timer_cost <= MAX_ENABLED_TIMER_COST, "Enabled timers are too slow!"
+    assert disabled_overhead <= MAX_DISABLED_OVERHEAD, "Disabled profiler slows down the step too much!"
+
+
+if __name__ == "__main__":
+    main()
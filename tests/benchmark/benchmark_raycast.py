@@ -0,0 +1,152 @@
+"""
+Script to benchmark batched raycasting throughput vs. no. of rays, headless on CPU.
+
+Compares the legacy per-ray dictionary path against the array-based raycast_batch API, using both a mocked PhysX
+scene query interface and the mesh BVH backend. All paths query the same synthetic scene of spheres: the mocked
+interface intersects each ray with the analytic spheres, while the mesh backend intersects the rays with their
+tessellations. Also checks that all paths agree on which spheres are hit and where, and that ignored bodies are not
+interned.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import trimesh
+
+from omnigibson.utils.raycast_utils import MeshRaycastBackend, PhysXRaycastBackend, PRIM_PATH_INTERNER, raycast_batch
+
+
+# Params to be set as needed.
+RAY_COUNTS = (10, 100, 1000, 10000)  # No. of rays to cast per batch.
+N_OBJS = 100                         # No. of objects in the synthetic scene.
+RADIUS = 0.2                         # Radius of each object.
+N_REPS = 5                           # No. of repetitions per measurement.
+TOLERANCE = 0.01                     # Max distance between analytic and tessellated hits.
+
+
+class _MockHit:
+    def __init__(self, hit):
+        self.distance = hit["distance"]
+        self.position = hit["position"]
+        self.normal = hit["normal"]
+        self.rigid_body = hit["rigidBody"]
+        self.collision = hit["collision"]
+
+
+class MockSceneQueryInterface:
+    """
+    Mimics omni's PhysX scene query interface by intersecting rays with a set of analytic spheres
+    """
+
+    def __init__(self, centers, radius):
+        self.centers = centers
+        self.radius = radius
+
+    def _intersect(self, origin, dir, distance):
+        origin, dir = np.asarray(origin), np.asarray(dir)
+        offsets = origin - self.centers
+        b = offsets @ dir
+        disc = b ** 2 - (np.sum(offsets ** 2, axis=-1) - self.radius ** 2)
+        with np.errstate(invalid="ignore"):
+            t = -b - np.sqrt(disc)
+        hit = (disc >= 0) & (t >= 0) & (t <= distance)
+        hits = []
+        for i in np.nonzero(hit)[0]:
+            position = origin + dir * t[i]
+            hits.append({"hit": True, "position": position, "normal": (position - self.centers[i]) / self.radius,
+                         "distance": t[i], "rigidBody": f"/World/obj{i}/base_link",
+                         "collision": f"/World/obj{i}/base_link/collisions"})
+        return sorted(hits, key=lambda hit: hit["distance"])
+
+    def raycast_closest(self, origin, dir, distance):
+        hits = self._intersect(origin=origin, dir=dir, distance=distance)
+        return hits[0] if len(hits) > 0 else {"hit": False}
+
+    def raycast_all(self, origin, dir, distance, reportFn):
+        for hit in self._intersect(origin=origin, dir=dir, distance=distance):
+            reportFn(_MockHit(hit))
+
+
+def _legacy_raytest_batch(sqi, start_points, end_points):
+    # Replicates the original per-ray loop, building one dictionary per hit
+    results = []
+    for start_point, end_point in zip(start_points, end_points):
+        point_diff = end_point - start_point
+        distance = np.linalg.norm(point_diff)
+        results.append(sqi.raycast_closest(origin=start_point, dir=point_diff / distance, distance=distance))
+    return results
+
+
+def _time(fcn):
+    times = []
+    for _ in range(N_REPS):
+        start = time.perf_counter()
+        fcn()
+        times.append(time.perf_counter() - start)
+    return np.median(times)
+
+
+def _check_results(legacy, physx, mesh):
+    # The PhysX backend reproduces the legacy results exactly
+    assert np.array_equal(physx.hit, [hit["hit"] for hit in legacy])
+    assert all(body == hit.get("rigidBody", None) for body, hit in zip(physx.rigid_bodies, legacy))
+    assert np.allclose(physx.distances[physx.hit], [hit["distance"] for hit in legacy if hit["hit"]])
+
+    # The mesh backend hits the same spheres, up to their tessellation. Rays grazing a sphere (or the intersection of
+    # two overlapping spheres) may hit a different sphere in each
+    both = physx.hit & mesh.hit
+    assert np.mean(physx.hit != mesh.hit) < 0.02, "Mesh backend disagrees with PhysX on which rays hit!"
+    assert np.mean(physx.rigid_body_ids[both] != mesh.rigid_body_ids[both]) < 0.02
+    same = both & (physx.rigid_body_ids == mesh.rigid_body_ids)
+    assert np.mean(np.abs(physx.distances[same] - mesh.distances[same]) > TOLERANCE) < 0.02
+    assert np.mean(np.sum(physx.normals[same] * mesh.normals[same], axis=-1) < 0.9) < 0.02
+
+
+def main():
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-5, 5, size=(N_OBJS, 3))
+    sqi = MockSceneQueryInterface(centers=centers, radius=RADIUS)
+    physx_backend = PhysXRaycastBackend(scene_query_interface=sqi)
+
+    mesh_backend = MeshRaycastBackend()
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=RADIUS)
+    for i, pos in enumerate(centers):
+        mesh_backend.add_mesh(
+            rigid_body=f"/World/obj{i}/base_link",
+            collision=f"/World/obj{i}/base_link/collisions",
+            vertices=sphere.vertices,
+            faces=sphere.faces,
+            position=pos,
+            orientation=rng.normal(size=4),
+        )
+
+    print(f"{'n_rays':>8} {'legacy (s)':>12} {'physx batch (s)':>16} {'mesh batch (s)':>15} {'hits':>6}")
+    for n_rays in RAY_COUNTS:
+        starts = rng.uniform(-5, 5, size=(n_rays, 3))
+        starts[:, 2] = 5.0
+        ends = starts.copy()
+        ends[:, 2] = -5.0
+
+        legacy_results = _legacy_raytest_batch(sqi, starts, ends)
+        physx_results = raycast_batch(starts, ends, backend=physx_backend)
+        mesh_results = raycast_batch(starts, ends, backend=mesh_backend)
+        _check_results(legacy_results, physx_results, mesh_results)
+
+        legacy = _time(lambda: _legacy_raytest_batch(sqi, starts, ends))
+        physx = _time(lambda: raycast_batch(starts, ends, backend=physx_backend))
+        mesh = _time(lambda: raycast_batch(starts, ends, backend=mesh_backend))
+        print(f"{n_rays:>8} {legacy:>12.5f} {physx:>16.5f} {mesh:>15.5f} {np.sum(mesh_results.hit):>6}")
+
+    # Ignoring bodies never seen before does not grow the shared interner
+    n_interned = len(PRIM_PATH_INTERNER)
+    raycast_batch(starts, ends, ignore_bodies=[f"/World/unknown{i}" for i in range(10)], backend=mesh_backend)
+    assert len(PRIM_PATH_INTERNER) == n_interned, "Ignored bodies were interned!"
+
+    print("All checks passed")
+
+
+if __name__ == "__main__":
+    main()
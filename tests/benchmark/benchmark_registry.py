@@ -0,0 +1,81 @@
+"""
+Script to stress test registry operations with a large no. of entries, headless on CPU.
+
+Imports entries, looks them up, re-keys a fraction of them (as happens when physics handles are refreshed), and
+removes them again, verifying the internal mappings along the way.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.registry_utils import Registry
+
+
+# Params to be set as needed.
+N_ENTRIES = 50000     # No. of entries to add to the registry.
+REKEY_FRACTION = 0.1  # Fraction of entries whose unique and group keys change before each re-key.
+N_CATEGORIES = 100    # No. of distinct values of the group key.
+N_LOOKUPS = 100000    # No. of lookups to time.
+
+
+class _Entry:
+    def __init__(self, idx):
+        self.name = f"entry{idx}"
+        self.prim_path = f"/World/entry{idx}"
+        self.handle = idx
+        self.category = f"category{idx % N_CATEGORIES}"
+        self.in_rooms = [f"room{idx % 7}", f"room{idx % 11}"]
+
+
+def _timed(label, fcn, n_ops):
+    start = time.perf_counter()
+    fcn()
+    duration = time.perf_counter() - start
+    print(f"{label:>24} {duration:>10.4f} s {n_ops / duration:>14.0f} ops/s")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    registry = Registry(
+        name="benchmark_registry",
+        class_types=_Entry,
+        default_key="name",
+        unique_keys=["prim_path", "handle"],
+        group_keys=["category", "in_rooms"],
+    )
+    entries = [_Entry(i) for i in range(N_ENTRIES)]
+
+    print(f"{'operation':>24} {'time':>12} {'throughput':>18}")
+    _timed("add", lambda: [registry.add(entry) for entry in entries], N_ENTRIES)
+    assert len(registry.objects) == N_ENTRIES
+
+    names = [entries[i].name for i in rng.integers(0, N_ENTRIES, size=N_LOOKUPS)]
+    _timed("unique lookup", lambda: [registry("name", name) for name in names], N_LOOKUPS)
+    _timed("membership", lambda: [entry in registry for entry in entries], N_ENTRIES)
+    _timed("objects view", lambda: [registry.objects for _ in range(N_LOOKUPS)], N_LOOKUPS)
+
+    # Change the handles and categories of a fraction of the entries, then re-key the whole registry
+    changed = rng.choice(N_ENTRIES, size=int(N_ENTRIES * REKEY_FRACTION), replace=False)
+    for i in changed:
+        entries[i].handle += N_ENTRIES
+        entries[i].category = f"category{(i + 1) % N_CATEGORIES}"
+    _timed("re-key (all keys)", lambda: registry.update(), N_ENTRIES)
+    _timed("re-key (no changes)", lambda: registry.update(keys="handle"), N_ENTRIES)
+    for i in changed:
+        assert registry("handle", entries[i].handle) is entries[i]
+        assert entries[i] in registry("category", entries[i].category)
+    assert len(registry.get_dict("handle")) == N_ENTRIES
+    print(f"lookup stats: {registry.lookup_stats}")
+
+    _timed("remove", lambda: [registry.remove(entry) for entry in entries], N_ENTRIES)
+    assert len(registry.objects) == 0
+    for key in registry.all_keys:
+        assert len(registry.get_dict(key)) == 0, f"Stale entries left in mapping for key {key}!"
+
+
+if __name__ == "__main__":
+    main()
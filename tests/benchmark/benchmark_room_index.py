@@ -0,0 +1,146 @@
+"""
+Script to benchmark room segmentation map loading, point sampling and point lookup, headless on CPU.
+
+Synthetic room segmentation maps are written to a temporary scene directory and loaded with SegmentationMap, which
+builds (and caches) its room index. Loading, sampling random points by room type / instance and looking up the room
+types / instances of points are compared against the legacy implementation, which scans the whole map with np.where
+for each room. Lookups of both implementations must agree, and sampled points must lie in the requested rooms.
+"""
+
+import os
+import tempfile
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+DATASET_DIR = tempfile.TemporaryDirectory()
+os.environ["OMNIGIBSON_DATASET_PATH"] = DATASET_DIR.name
+
+import numpy as np
+from PIL import Image
+
+from omnigibson.maps.segmentation_map import SegmentationMap
+
+
+# Params to be set as needed.
+IMG_SIZE = 3000                   # Resolution (in pixels per side) of the synthetic segmentation images, at 0.01 m.
+MAP_RESOLUTIONS = (0.1, 0.02)     # Map resolutions to benchmark.
+N_ROOMS_PER_SIDE = 6              # No. of rooms per side of the synthetic layout.
+N_ROOM_CATEGORIES = 10            # No. of room categories.
+N_SAMPLES = 1000                  # No. of random points to sample per room type / instance.
+N_LOOKUPS = 100000                # No. of random points to look up.
+
+
+def _write_synthetic_scene(rng):
+    scene_dir = os.path.join(DATASET_DIR.name, "scene")
+    os.makedirs(os.path.join(scene_dir, "layout"), exist_ok=True)
+    os.makedirs(os.path.join(DATASET_DIR.name, "metadata"), exist_ok=True)
+    with open(os.path.join(DATASET_DIR.name, "metadata", "room_categories.txt"), "w") as f:
+        f.write("\n".join(f"room_category_{i}" for i in range(N_ROOM_CATEGORIES)))
+
+    # Grid of rooms with random boundaries, separated by walls
+    bounds = [np.sort(rng.choice(np.arange(50, IMG_SIZE - 50), N_ROOMS_PER_SIDE - 1, replace=False))
+              for _ in range(2)]
+    rows, cols = np.searchsorted(bounds[0], np.arange(IMG_SIZE)), np.searchsorted(bounds[1], np.arange(IMG_SIZE))
+    img_ins = (rows[:, None] * N_ROOMS_PER_SIDE + cols[None, :] + 1).astype(np.uint8)
+    img_sem = rng.integers(1, N_ROOM_CATEGORIES + 1, N_ROOMS_PER_SIDE ** 2 + 1).astype(np.uint8)[img_ins]
+    for bound in bounds[0]:
+        img_ins[bound - 5:bound + 5], img_sem[bound - 5:bound + 5] = 0, 0
+    for bound in bounds[1]:
+        img_ins[:, bound - 5:bound + 5], img_sem[:, bound - 5:bound + 5] = 0, 0
+    Image.fromarray(img_ins).save(os.path.join(scene_dir, "layout", "floor_insseg_0.png"))
+    Image.fromarray(img_sem).save(os.path.join(scene_dir, "layout", "floor_semseg_0.png"))
+    return scene_dir
+
+
+def _legacy_load(seg_map):
+    # Replicates the per-instance scan of SegmentationMap._load_map before indexing
+    img_ins, img_sem = seg_map.room_ins_map, seg_map.room_sem_map
+    sem_id_to_ins_id = {}
+    for ins_id in np.delete(np.unique(img_ins), 0):
+        x, y = np.where(img_ins == ins_id)
+        sem_id_to_ins_id.setdefault(img_sem[x[0], y[0]], []).append(ins_id)
+    return sem_id_to_ins_id
+
+
+def _legacy_sample(seg_map, seg, room_id):
+    valid_idx = np.array(np.where(seg == room_id))
+    x, y = seg_map.map_to_world(valid_idx[:, np.random.randint(valid_idx.shape[1])])
+    return np.array([x, y, 0.0])
+
+
+def _legacy_lookup(seg_map, seg, names, xy):
+    x, y = seg_map.world_to_map(xy)
+    if x < 0 or x >= seg.shape[0] or y < 0 or y >= seg.shape[1]:
+        return None
+    room_id = seg[x, y]
+    return None if room_id == 0 else names[room_id]
+
+
+def _to_pixel(seg_map, point):
+    # Rounds instead of truncating, to exactly invert map_to_world()
+    return tuple(np.round(np.flip(point[:2]) / seg_map.map_resolution + seg_map.map_size / 2.0).astype(int))
+
+
+def _time(fcn):
+    start = time.perf_counter()
+    result = fcn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    scene_dir = _write_synthetic_scene(rng)
+    half_extent = IMG_SIZE * 0.01 / 2
+
+    print(f"{'resolution':>10} {'map size':>9} {'operation':>22} {'legacy (ms)':>12} {'indexed (ms)':>13} "
+          f"{'speedup':>8}")
+    for map_resolution in MAP_RESOLUTIONS:
+        seg_map, cold_load = _time(lambda: SegmentationMap(scene_dir=scene_dir, map_resolution=map_resolution))
+        _, warm_load = _time(lambda: SegmentationMap(scene_dir=scene_dir, map_resolution=map_resolution))
+        _, legacy_load = _time(lambda: _legacy_load(seg_map))
+
+        room_types = list(seg_map.room_sem_name_to_sem_id.keys())
+        room_instances = list(seg_map.room_ins_name_to_ins_id.keys())
+        _, legacy_type = _time(lambda: [_legacy_sample(seg_map, seg_map.room_sem_map, seg_map.room_sem_name_to_sem_id[t])
+                                        for t in room_types for _ in range(N_SAMPLES)])
+        _, legacy_ins = _time(lambda: [_legacy_sample(seg_map, seg_map.room_ins_map, seg_map.room_ins_name_to_ins_id[r])
+                                       for r in room_instances for _ in range(N_SAMPLES)])
+        types, indexed_type = _time(lambda: [(t, seg_map.get_random_point_by_room_type(t)[1])
+                                             for t in room_types for _ in range(N_SAMPLES)])
+        instances, indexed_ins = _time(lambda: [(r, seg_map.get_random_point_by_room_instance(r)[1])
+                                                for r in room_instances for _ in range(N_SAMPLES)])
+
+        points = rng.uniform(-half_extent * 1.1, half_extent * 1.1, (N_LOOKUPS, 2))
+        legacy_types, legacy_lookup = _time(lambda: [
+            _legacy_lookup(seg_map, seg_map.room_sem_map, seg_map.room_sem_id_to_sem_name, xy) for xy in points])
+        legacy_instances, _ = _time(lambda: [
+            _legacy_lookup(seg_map, seg_map.room_ins_map, seg_map.room_ins_id_to_ins_name, xy) for xy in points])
+        batched_types, batched_lookup = _time(lambda: seg_map.get_room_type_by_point(points))
+        batched_instances = seg_map.get_room_instance_by_point(points)
+
+        # Verify
+        assert batched_types == legacy_types, "Batched room type lookup differs from legacy lookup!"
+        assert batched_instances == legacy_instances, "Batched room instance lookup differs from legacy lookup!"
+        assert all(seg_map.room_sem_map[_to_pixel(seg_map, point)] == seg_map.room_sem_name_to_sem_id[t]
+                   for t, point in types)
+        assert all(seg_map.room_ins_map[_to_pixel(seg_map, point)] == seg_map.room_ins_name_to_ins_id[r]
+                   for r, point in instances)
+        assert {k: sorted(v) for k, v in _legacy_load(seg_map).items()} == \
+            {seg_map.room_sem_name_to_sem_id[k]: sorted(seg_map.room_ins_name_to_ins_id[n] for n in v)
+             for k, v in seg_map.room_sem_name_to_ins_name.items()}
+
+        prefix = f"{map_resolution:>10} {seg_map.map_size:>9}"
+        for name, legacy, indexed in (
+            ("load (cold / warm)", legacy_load, f"{cold_load * 1e3:.1f} / {warm_load * 1e3:.1f}"),
+            ("sample by type", legacy_type, indexed_type),
+            ("sample by instance", legacy_ins, indexed_ins),
+            (f"{N_LOOKUPS} lookups", legacy_lookup, batched_lookup),
+        ):
+            if isinstance(indexed, str):
+                print(f"{prefix} {name:>22} {legacy * 1e3:>12.1f} {indexed:>13} {'-':>8}")
+            else:
+                print(f"{prefix} {name:>22} {legacy * 1e3:>12.1f} {indexed * 1e3:>13.1f} {legacy / indexed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Script to benchmark OnTop sampling trial throughput vs. no. of objects in the scene.
+
+Compares restoring failed sampling trials from a snapshot of the entire scene against a snapshot scoped to the objects
+near the sampled object's target, both of which only restore the objects whose state actually changed. Also reports
+the cost of capturing and restoring each snapshot, and checks that restoring a snapshot after a failed trial restores
+the state of the entire scene, including objects falling far away from the sampled object.
+"""
+
+import time
+
+import numpy as np
+
+import omnigibson as og
+from omnigibson.objects.primitive_object import PrimitiveObject
+from omnigibson.object_states import OnTop
+from omnigibson.scenes.scene_base import Scene
+from omnigibson.utils import snapshot_utils
+from omnigibson.utils.object_state_utils import create_sampling_snapshot
+from omnigibson.utils.snapshot_utils import StateSnapshot
+
+
+# Params to be set as needed.
+OBJ_COUNTS = (10, 100, 1000)  # Total no. of clutter objects in the scene.
+N_TRIALS = 20                 # No. of OnTop sampling calls to time for each setting.
+GRID_SPACING = 0.5            # Spacing between clutter objects, in meters.
+N_PHYSICS_STEPS = 2           # No. of physics steps taken during each checked failed trial, as sample_kinematics does.
+
+
+def _create_obj(idx, size, position):
+    obj = PrimitiveObject(
+        prim_path=f"/World/obj{idx}",
+        primitive_type="Cube",
+        name=f"obj{idx}",
+        category="clutter",
+        scale=size,
+    )
+    og.sim.import_object(obj)
+    obj.set_position(position)
+    return obj
+
+
+def _check_restore(apple, table, faller):
+    # Emulate a failed sampling trial, which steps physics while the apple is moved around, and undo it
+    faller.set_position(np.array([10.0, 10.0, 5.0]))
+    og.sim.step_physics()
+    state = og.sim.scene.dump_state(serialized=True)
+    snapshot = create_sampling_snapshot(objA=apple, objB=table)
+    assert faller in snapshot.objects, "A falling object was left out of the snapshot!"
+    for position in (np.array([200, 200, 200]), np.array([0, 0, 0.6])):
+        apple.set_position(position)
+        apple.keep_still()
+        for _ in range(N_PHYSICS_STEPS):
+            og.sim.step_physics()
+    snapshot.restore()
+    restored_state = og.sim.scene.dump_state(serialized=True)
+    assert len(restored_state) == len(state) and np.allclose(restored_state, state, atol=1e-5), \
+        "Restoring the snapshot did not restore the state of the scene!"
+
+
+def main():
+    scene = Scene(floor_plane_visible=True)
+    og.sim.import_scene(scene)
+    og.sim.play()
+
+    # The table to sample on sits at the origin, and the clutter is placed on a grid around it
+    table = _create_obj(idx="table", size=np.array([1.0, 1.0, 0.5]), position=np.array([0, 0, 0.25]))
+    apple = _create_obj(idx="apple", size=0.1, position=np.array([0, 0, 2.0]))
+    faller = _create_obj(idx="faller", size=0.1, position=np.array([10.0, 10.0, 5.0]))
+    clutter = []
+
+    # Clutter fills a square grid around the table, keeping the cells around the table free
+    side = int(np.ceil(np.sqrt(max(OBJ_COUNTS) + 9)))
+    cells = [(x, y) for x in range(-(side // 2), side - side // 2) for y in range(-(side // 2), side - side // 2)
+             if abs(x) > 1 or abs(y) > 1]
+
+    print(f"{'n_objs':>8} {'scope':>8} {'n_scoped':>9} {'capture (ms)':>13} {'restore (ms)':>13} {'trials/s':>9}")
+    for n_objs in OBJ_COUNTS:
+        while len(clutter) < n_objs:
+            x, y = cells[len(clutter)]
+            clutter.append(_create_obj(
+                idx=len(clutter), size=0.1, position=np.array([x * GRID_SPACING, y * GRID_SPACING, 0.05])))
+        for _ in range(10):
+            og.sim.step()
+
+        for scoped in (False, True):
+            snapshot_utils.m.USE_SCOPED_SNAPSHOTS = scoped
+            _check_restore(apple, table, faller)
+            objs = snapshot_utils.get_snapshot_scope(objs=[apple, table], margin=0.2)
+            start = time.perf_counter()
+            snapshot = StateSnapshot(objs=objs)
+            capture = time.perf_counter() - start
+            apple.set_position(np.array([0, 0, 2.0]))
+            start = time.perf_counter()
+            snapshot.restore()
+            restore = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(N_TRIALS):
+                apple.states[OnTop].set_value(table, True, use_ray_casting_method=True)
+            trials_per_s = N_TRIALS / (time.perf_counter() - start)
+            print(f"{n_objs:>8} {str(scoped):>8} {len(objs):>9} {capture * 1e3:>13.2f} {restore * 1e3:>13.2f} "
+                  f"{trials_per_s:>9.2f}")
+
+    print("All checks passed")
+    og.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Script to check the scene loading pipeline and benchmark loading synthetic scene files with a mocked stage, headless
+on CPU.
+
+A synthetic dataset (encrypted model assets and supporting surface height maps) and synthetic scene files stand in
+for the OmniGibson dataset and scenes. Importing an object into the mocked stage reads its decrypted asset back, as
+USD would, and must happen on the main thread. Compares preparing and importing each object one after another (the
+previous behavior of Scene._load_objects_from_scene_file) against pipelined loading on thread and process pools, each
+starting from a cold decrypted asset cache. Also checks object ordering, failure isolation (including objects failing
+after being added to the stage, which must be removed again) and the prepared outputs.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from functools import partial
+
+TMP_DIR = tempfile.mkdtemp()
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+os.environ["OMNIGIBSON_ASSET_CACHE_DIR"] = os.path.join(TMP_DIR, "cache")
+
+import cv2
+import numpy as np
+from cryptography.fernet import Fernet
+
+import omnigibson.utils.scene_loading_utils as scene_loading_utils
+from omnigibson.utils.asset_cache_utils import get_decrypted_asset_cache
+from omnigibson.utils.scene_loading_utils import SceneLoadingPipeline, format_loading_timings, \
+    get_height_map_path, prepare_object
+
+
+# Params to be set as needed.
+SCENE_SIZES = (100, 500, 2000)         # No. of objects in each synthetic scene file.
+N_MODELS = 100                         # No. of distinct synthetic models.
+MODEL_SIZE = 256 * 1024                # Size of each decrypted model, in bytes.
+SURFACE_FRACTION = 0.3                 # Fraction of models with supporting surface height maps.
+N_HEIGHT_MAPS = 4                      # No. of height maps of each model with supporting surfaces.
+HEIGHT_MAP_SIZE = 128                  # Side of each height map image, in pixels.
+CONFIGS = {                            # Name: (executor, no. of workers) of each loading configuration.
+    "serial": ("thread", 0),
+    "threads": ("thread", 4),
+    "processes": ("process", 4),
+}
+SEED = 0                               # Random seed.
+
+
+def _make_dataset(root):
+    rng = np.random.default_rng(SEED)
+    key = Fernet.generate_key()
+    key_path = os.path.join(root, "synthetic.key")
+    with open(key_path, "wb") as f:
+        f.write(key)
+    fernet = Fernet(key)
+    models = []
+    for i in range(N_MODELS):
+        category, model = f"category{i % 10}", f"model{i}"
+        usd_dir = os.path.join(root, "dataset", "objects", category, model, "usd")
+        os.makedirs(usd_dir)
+        with open(os.path.join(usd_dir, f"{model}.encrypted.usd"), "wb") as f:
+            f.write(fernet.encrypt(rng.integers(0, 256, MODEL_SIZE, dtype=np.uint8).tobytes()))
+        if rng.random() < SURFACE_FRACTION:
+            for j in range(N_HEIGHT_MAPS):
+                path = get_height_map_path(os.path.join(usd_dir, f"{model}.usd"), "onTop", f"link{j % 2}", j // 2)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                cv2.imwrite(path, (rng.random((HEIGHT_MAP_SIZE, HEIGHT_MAP_SIZE)) > 0.5).astype(np.uint8) * 255)
+        models.append((category, model))
+    return key_path, models
+
+
+def _make_scene_file(root, models, n_objects, missing=(), no_state=()):
+    rng = np.random.default_rng(SEED + n_objects)
+    init_info, init_state = dict(), dict()
+    for i in range(n_objects):
+        category, model = models[rng.integers(0, len(models))]
+        name = f"{category}_{i}"
+        if i in missing:
+            model = "missing_model"
+        init_info[name] = dict(class_module="omnigibson.objects.dataset_object", class_name="DatasetObject",
+                               args=dict(prim_path=f"/World/{name}", name=name, category=category, model=model))
+        if i not in no_state:
+            init_state[name] = dict(root_link=dict(pos=rng.random(3).tolist(), ori=[0, 0, 0, 1.0]))
+    scene_file = os.path.join(root, f"scene_{n_objects}.json")
+    with open(scene_file, "w") as f:
+        json.dump(dict(objects_info=dict(init_info=init_info), state=dict(object_registry=init_state)), f)
+    return scene_file
+
+
+class MockStage:
+    """
+    Stand-in for the USD stage, which may only be modified from the main thread
+    """
+
+    def __init__(self):
+        self.prims = dict()
+
+    def import_object(self, name, prepared, init_state, key_path):
+        assert threading.current_thread() is threading.main_thread(), "The stage was modified from a worker!"
+        # Load the asset from the cache, as DatasetObject._load does, and read it back as USD would
+        usd_path = prepared["usd_path"]
+        path = get_decrypted_asset_cache().get(usd_path.replace(".usd", ".encrypted.usd"), key_path=key_path,
+                                               suffix=".usd")
+        with open(path, "rb") as f:
+            checksum = zlib.crc32(f.read())
+        prim_path = f"/World/{name}"
+        self.prims[prim_path] = dict(checksum=checksum, n_height_maps=len(prepared["height_maps"]))
+        # Set the init pose, removing the object again if this fails, as Scene._load_objects_from_scene_file does
+        try:
+            self.prims[prim_path]["pose"] = init_state[name]["root_link"]
+        except Exception:
+            self.prims.pop(prim_path)
+            raise
+
+
+def _load_scene(scene_file, dataset_path, key_path, executor, n_workers, progress_fn=None, raise_on_failure=None):
+    # Mirrors Scene._load_objects_from_scene_file
+    start = time.perf_counter()
+    with open(scene_file, "r") as f:
+        scene_info = json.load(f)
+    init_info = scene_info["objects_info"]["init_info"]
+    init_state = scene_info["state"]["object_registry"]
+    parse_time = time.perf_counter() - start
+
+    stage = MockStage()
+    pipeline = SceneLoadingPipeline(
+        prepare_fn=partial(prepare_object, dataset_path=dataset_path, key_path=key_path, use_asset_cache=True),
+        n_workers=n_workers,
+        executor=executor,
+        raise_on_failure=raise_on_failure,
+        progress_fn=progress_fn if progress_fn is not None else (lambda n_done, n_total, name: None),
+    )
+    results = pipeline.run(
+        objects_info=list(init_info.items()),
+        import_fn=lambda name, prepared: stage.import_object(name, prepared, init_state, key_path),
+    )
+    results["timings"]["parse"] = parse_time
+    return stage, results
+
+
+def _check_prepared(dataset_path, key_path, models):
+    for category, model in models:
+        prepared = prepare_object("obj", dict(args=dict(category=category, model=model)), dataset_path=dataset_path,
+                                  key_path=key_path, use_asset_cache=True)
+        usd_path = os.path.join(dataset_path, "objects", category, model, "usd", f"{model}.usd")
+        assert prepared["usd_path"] == usd_path
+        for path, image in prepared["height_maps"].items():
+            assert np.array_equal(image, cv2.imread(path, 0))
+        expected = {get_height_map_path(usd_path, "onTop", f"link{j % 2}", j // 2) for j in range(N_HEIGHT_MAPS)}
+        assert set(prepared["height_maps"]) in (set(), expected), "Height maps are not keyed by their load paths!"
+
+
+def _check_failures(root, dataset_path, key_path, models):
+    scene_file = _make_scene_file(root, models, n_objects=20, missing={3, 7}, no_state={11})
+    with open(scene_file, "r") as f:
+        names = list(json.load(f)["objects_info"]["init_info"])
+    missing = {names[3], names[7], names[11]}
+    progress = []
+    for executor, n_workers in CONFIGS.values():
+        progress.clear()
+        stage, results = _load_scene(scene_file, dataset_path, key_path, executor, n_workers, raise_on_failure=False,
+                                     progress_fn=lambda n_done, n_total, name: progress.append((n_done, n_total)))
+        assert set(results["failures"]) == missing, "Failures were not isolated to the broken objects!"
+        assert results["loaded"] == [name for name in names if name not in missing], "Objects were reordered!"
+        assert list(stage.prims) == [f"/World/{name}" for name in results["loaded"]], \
+            "Partially imported objects were left in the stage!"
+        assert progress == [(i + 1, len(names)) for i in range(len(names))]
+        try:
+            # Failing objects abort loading by default
+            _load_scene(scene_file, dataset_path, key_path, executor, n_workers)
+            raise AssertionError("Loading should have raised upon the first broken object!")
+        except FileNotFoundError:
+            pass
+
+
+def main():
+    root = TMP_DIR
+    key_path, models = _make_dataset(root)
+    dataset_path = os.path.join(root, "dataset")
+    cache = get_decrypted_asset_cache()
+    print(f"Dataset: {N_MODELS} models of {MODEL_SIZE // 1024} KB, {int(SURFACE_FRACTION * 100)}% with "
+          f"{N_HEIGHT_MAPS} height maps")
+
+    print(f"\n{'objects':>8} {'config':>10} {'total (s)':>10} {'wait (s)':>9} {'import (s)':>11} {'speedup':>8}")
+    last_timings = dict()
+    for n_objects in SCENE_SIZES:
+        scene_file = _make_scene_file(root, models, n_objects)
+        reference, serial_time = None, None
+        for name, (executor, n_workers) in CONFIGS.items():
+            # Each configuration starts from cold caches
+            cache.clear()
+            scene_loading_utils._read_height_maps.cache_clear()
+            stage, results = _load_scene(scene_file, dataset_path, key_path, executor, n_workers)
+            timings = results["timings"]
+            serial_time = timings["total"] if serial_time is None else serial_time
+            print(f"{n_objects:>8} {name:>10} {timings['total']:>10.3f} {timings['wait']:>9.3f} "
+                  f"{timings['import']:>11.3f} {serial_time / timings['total']:>8.2f}")
+            assert len(results["failures"]) == 0
+            if reference is None:
+                reference = stage.prims
+            assert list(stage.prims.items()) == list(reference.items()), f"{name} loaded a different stage!"
+            last_timings[name] = timings
+
+    for name, timings in last_timings.items():
+        print(f"\nLoad time breakdown ({name}, {SCENE_SIZES[-1]} objects):")
+        print(format_loading_timings(timings))
+
+    _check_prepared(dataset_path, key_path, models)
+    _check_failures(root, dataset_path, key_path, models)
+    cache.clear()
+    print("All checks passed")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR)
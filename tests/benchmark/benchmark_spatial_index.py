@@ -0,0 +1,84 @@
+"""
+Script to benchmark spatial index query cost vs. no. of objects, headless on CPU.
+
+Objects are scattered with constant density, so the no. of true neighbors per query stays roughly constant while the
+scene grows. The spatial index query cost should therefore grow sub-linearly, whereas a brute-force scan grows linearly.
+The same holds for refreshing a fixed no. of moving objects (e.g.: the awake objects of a scene), while refreshing all
+objects grows linearly. Fails if any query or the partial refresh does not scale sub-linearly.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.spatial_utils import SpatialIndex, aabb_distance
+
+
+# Params to be set as needed.
+OBJ_COUNTS = (100, 1000, 10000, 100000)
+OBJS_PER_CUBIC_METER = 2.0  # Constant object density as the scene grows.
+N_QUERIES = 200             # No. of queries per measurement.
+QUERY_RADIUS = 1.0          # Radius used for radius queries.
+KNN_K = 8                   # No. of neighbors used for k-nearest queries.
+N_MOVED = 100               # No. of objects moved in a partial refresh.
+MAX_SCALING_EXPONENT = 0.5  # Max exponent of the cost growth vs. the growth of the no. of objects.
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'n_objs':>8} {'update (ms)':>12} {'partial (ms)':>13} {'radius (us/q)':>14} {'aabb (us/q)':>12} "
+          f"{'knn (us/q)':>11} {'brute (us/q)':>13}")
+    all_timings = []
+    for n_objs in OBJ_COUNTS:
+        half_extent = 0.5 * (n_objs / OBJS_PER_CUBIC_METER) ** (1 / 3)
+        centers = rng.uniform(-half_extent, half_extent, size=(n_objs, 3))
+        half_sizes = rng.uniform(0.05, 0.3, size=(n_objs, 3))
+        lowers, uppers = centers - half_sizes, centers + half_sizes
+
+        index = SpatialIndex()
+        for i in range(n_objs):
+            index.add(key=i, lower=lowers[i], upper=uppers[i])
+
+        # Simulate a physics step where every object moves slightly
+        offsets = rng.normal(scale=0.01, size=(n_objs, 3))
+        start = time.perf_counter()
+        index.update(keys=list(range(n_objs)), lowers=lowers + offsets, uppers=uppers + offsets)
+        update_time = time.perf_counter() - start
+
+        # Simulate a physics step where only a few objects move
+        moved = rng.choice(n_objs, size=N_MOVED, replace=False)
+        start = time.perf_counter()
+        index.update(keys=moved.tolist(), lowers=lowers[moved], uppers=uppers[moved])
+        partial_update_time = time.perf_counter() - start
+
+        queries = rng.uniform(-half_extent, half_extent, size=(N_QUERIES, 3))
+        timings = [partial_update_time * 1e3]
+        for fcn in (
+            lambda: index.query_radius(queries, QUERY_RADIUS),
+            lambda: index.query_aabb(queries - QUERY_RADIUS, queries + QUERY_RADIUS),
+            lambda: index.query_knn(queries, KNN_K),
+            lambda: [np.nonzero(aabb_distance(q[None], lowers, uppers)[0] <= QUERY_RADIUS)[0] for q in queries],
+        ):
+            start = time.perf_counter()
+            fcn()
+            timings.append((time.perf_counter() - start) / N_QUERIES * 1e6)
+
+        print(f"{n_objs:>8} {update_time * 1e3:>12.2f} {timings[0]:>13.2f} {timings[1]:>14.1f} {timings[2]:>12.1f} "
+              f"{timings[3]:>11.1f} {timings[4]:>13.1f}")
+        all_timings.append(timings)
+
+    # Compare the costs for the smallest and the largest no. of objects, except for the brute-force scan
+    max_ratio = (OBJ_COUNTS[-1] / OBJ_COUNTS[0]) ** MAX_SCALING_EXPONENT
+    for name, first, last in zip(("partial", "radius", "aabb", "knn"), all_timings[0], all_timings[-1]):
+        assert last / first <= max_ratio, \
+            f"{name} cost grew {last / first:.1f}x from {OBJ_COUNTS[0]} to {OBJ_COUNTS[-1]} objects, " \
+            f"more than the allowed {max_ratio:.1f}x!"
+
+    print("All checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Declarative benchmark cases run by run_benchmarks.py.
+
+"mock" cases exercise the pure-Python / numpy hot paths (registry, object states, serialization, particles, transforms,
+maps, sensors) on mocked scene objects, and run headless on any machine. "omni" cases step a launched simulator with
+varying no. of objects, scenes and sensor configurations, and additionally report the time spent in each phase of the
+simulator step as metrics.
+"""
+
+import time
+
+import numpy as np
+
+
+# Shared params to be set as needed.
+OBJ_COUNTS = (100, 1000, 10000)          # No. of mocked objects.
+PARTICLE_COUNTS = (1000, 10000, 100000)  # No. of mocked particles.
+POINT_COUNTS = (1000, 10000)             # No. of points checked against container volumes.
+MAP_SIZES = (256, 512)                   # Traversability map resolutions (in pixels per side).
+N_QUERIES = 100                          # No. of lookups / path queries per call.
+IMPORT_MODULES = ("omnigibson", "omnigibson.utils.transform_utils", "omnigibson.maps")  # Modules to import fresh.
+SIM_OBJ_COUNTS = (0, 100, 400)           # No. of objects in the simulated scene.
+SIM_SCENES = ("Rs_int",)                 # Interactive scenes to step.
+SENSOR_RESOLUTIONS = (128, 512)          # Height == width of vision sensor images, in pixels.
+SENSOR_MODALITIES = ("rgb", "rgb+depth+seg_instance")
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Mock backend
+# ---------------------------------------------------------------------------------------------------------------------
+
+class _MockEntry:
+    def __init__(self, idx):
+        self.name = f"obj{idx}"
+        self.prim_path = f"/World/obj{idx}"
+        self.handle = idx
+        self.category = f"category{idx % 100}"
+
+
+def _setup_registry(n_objs):
+    from omnigibson.utils.registry_utils import Registry
+    registry = Registry(name="benchmark_registry", class_types=_MockEntry, default_key="name",
+                        unique_keys=["prim_path", "handle"], group_keys=["category"])
+    entries = [_MockEntry(i) for i in range(n_objs)]
+    for entry in entries:
+        registry.add(entry)
+    names = [entries[i].name for i in np.random.default_rng(0).integers(0, n_objs, N_QUERIES)]
+    return registry, entries, names
+
+
+def _teardown_registry(state):
+    # Release the registry's globally unique name, so that the next parameter combination can reuse it
+    state[0].remove_names()
+
+
+def _registry_lookup(state):
+    registry, _, names = state
+    for name in names:
+        registry("name", name)
+        registry("category", "category0")
+
+
+def _registry_update(state):
+    registry, entries, _ = state
+    # Refresh all handles, as after the simulator is played
+    for entry in entries:
+        entry.handle = -entry.handle - 1
+    registry.update(keys="handle")
+
+
+def _setup_snapshot(n_objs):
+    from omnigibson.utils.python_utils import Serializable
+    from omnigibson.utils.snapshot_utils import StateSnapshot
+
+    class MockObject(Serializable):
+        # Serializes like an object with a root link pose, velocities and a few joints
+        def __init__(self):
+            self.state = np.zeros(3 + 4 + 6 + 8)
+
+        @property
+        def state_size(self):
+            return len(self.state)
+
+        def _dump_state(self):
+            return dict(state=self.state.copy())
+
+        def _load_state(self, state):
+            self.state[:] = state["state"]
+
+        def _serialize(self, state):
+            return state["state"]
+
+        def _deserialize(self, state):
+            return dict(state=state[:self.state_size]), self.state_size
+
+    objs = [MockObject() for _ in range(n_objs)]
+    return objs, StateSnapshot(objs=objs)
+
+
+def _snapshot_capture_restore(state):
+    objs, snapshot = state
+    snapshot.capture()
+    # Perturb a few objects, as a failed sampling trial would
+    for obj in objs[:10]:
+        obj.state += 1.0
+    snapshot.restore()
+
+
+def _setup_temperature(n_objs):
+    rng = np.random.default_rng(0)
+    n_sources = max(1, n_objs // 5)
+    positions = rng.uniform(-3.0, 3.0, (n_objs, 3))
+    half_sizes = rng.uniform(0.05, 0.5, (n_objs, 3))
+    owners = rng.choice(n_objs, n_sources, replace=False)
+    source_positions = positions[owners] + rng.normal(scale=0.05, size=(n_sources, 3))
+    source_positions[rng.random(n_sources) < 0.5] = np.nan
+    return dict(
+        temperatures=rng.uniform(0.0, 300.0, n_objs), positions=positions, lowers=positions - half_sizes,
+        uppers=positions + half_sizes, owners=owners, source_positions=source_positions,
+        source_temperatures=rng.uniform(-20.0, 1000.0, n_sources),
+        source_heating_rates=rng.uniform(0.01, 0.1, n_sources),
+        source_distance_thresholds=rng.uniform(0.1, 1.5, n_sources),
+    )
+
+
+def _temperature_update(scene):
+    # Mirrors Temperature.batch_update
+    import omnigibson.utils.thermal_utils as TU
+    owners = scene["owners"]
+    inside_mask = TU.points_in_aabbs(scene["positions"], scene["lowers"][owners], scene["uppers"][owners])
+    affected = TU.compute_heat_source_contacts(
+        positions=scene["positions"], source_positions=scene["source_positions"],
+        source_distance_thresholds=scene["source_distance_thresholds"], source_owner_idxs=owners,
+        inside_mask=inside_mask & np.isnan(scene["source_positions"][:, 0])[None],
+    )
+    scene["temperatures"] = TU.compute_temperatures(
+        temperatures=scene["temperatures"], affected=affected, source_temperatures=scene["source_temperatures"],
+        source_heating_rates=scene["source_heating_rates"], dt=1 / 60.0, ambient_temperature=23.0, decay_speed=0.02,
+    )
+
+
+class _MockLink:
+    def __init__(self, rng):
+        self.position = rng.normal(size=3)
+        self.orientation = rng.normal(size=4)
+        self.orientation /= np.linalg.norm(self.orientation)
+        self.scale = np.ones(3)
+
+    def get_position_orientation(self):
+        return self.position, self.orientation
+
+
+def _setup_particles(n_particles):
+    from omnigibson.utils.particle_storage_utils import MacroParticleStorage
+    rng = np.random.default_rng(0)
+    links = [_MockLink(rng) for _ in range(50)]
+    storage = MacroParticleStorage()
+    storage.add_group("group")
+    storage.add(idns=np.arange(n_particles), positions=rng.normal(size=(n_particles, 3)), group="group",
+                links=[links[i] for i in rng.integers(0, len(links), n_particles)])
+    return storage
+
+
+def _setup_poses(n_poses):
+    rng = np.random.default_rng(0)
+    quats = rng.normal(size=(2, n_poses, 4))
+    quats /= np.linalg.norm(quats, axis=-1, keepdims=True)
+    return rng.normal(size=(n_poses, 3)), quats[0], rng.normal(size=(n_poses, 3)), quats[1]
+
+
+def _pose_transform(poses):
+    import omnigibson.utils.batch_transform_utils as BT
+    BT.pose_transform(*poses)
+    BT.quat2mat(poses[1])
+
+
+def _setup_trav_graph(map_size):
+    from omnigibson.utils.trav_graph_utils import TraversabilityGraph, get_largest_component_mask
+    rng = np.random.default_rng(0)
+    mask = np.ones((map_size, map_size), dtype=bool)
+    for _ in range(map_size // 2):
+        (row, col), (height, width) = rng.integers(0, map_size, 2), rng.integers(2, map_size // 20 + 3, 2)
+        mask[row:row + height, col:col + width] = False
+    graph = TraversabilityGraph(get_largest_component_mask(mask))
+    nodes = graph.nodes
+    sources = nodes[rng.integers(0, len(nodes), N_QUERIES)]
+    targets = nodes[rng.integers(0, len(nodes), 4)][rng.integers(0, 4, N_QUERIES)]
+    return graph, sources, targets
+
+
+def _trav_graph_build(state):
+    from omnigibson.utils.trav_graph_utils import TraversabilityGraph
+    TraversabilityGraph(state[0].mask)
+
+
+def _trav_graph_queries(state):
+    graph, sources, targets = state
+    graph.clear_cache()
+    graph.get_shortest_paths(sources, targets)
+
+
+def _setup_occupancy_grid(resolution, horizontal_resolution):
+    from omnigibson.utils.occupancy_grid_utils import OccupancyGridRasterizer, get_beam_directions
+    rng = np.random.default_rng(0)
+    directions = get_beam_directions(360.0, horizontal_resolution)
+    hits = directions[:, :2] * rng.uniform(0.05, 10.0, (len(directions), 1))
+    return OccupancyGridRasterizer(resolution=resolution, grid_range=5.0, inner_radius=resolution // 10), hits
+
+
+def _occupancy_grid_rasterize(state):
+    rasterizer, hits = state
+    rasterizer.rasterize(scans=[(np.zeros(2), hits)])
+
+
+def _setup_volume_checker(n_points):
+    import trimesh
+    from omnigibson.utils.volume_checker_utils import ContainerVolume, PointsInVolumeChecker, \
+        get_convex_hull_half_spaces
+    rng = np.random.default_rng(0)
+    mesh = trimesh.creation.icosphere(subdivisions=3, radius=0.5)
+    identity = dict(pos=np.zeros(3), quat=np.array([0, 0, 0, 1.0]), scale=np.ones(3))
+    volumes = [
+        ContainerVolume("Mesh", **identity, vertices=mesh.vertices, raw_volume=mesh.volume,
+                        half_spaces=get_convex_hull_half_spaces(mesh.vertices[mesh.faces].mean(axis=1),
+                                                                mesh.face_normals)),
+        ContainerVolume("Cylinder", **identity, size=np.array([0.3, 0.8])),
+    ]
+    link = _MockLink(rng)
+    checker = PointsInVolumeChecker(volumes=volumes, get_link_pose=link.get_position_orientation,
+                                    get_link_scale=lambda: link.scale, get_cache_key=lambda: 0)
+    return checker, link.position + rng.uniform(-1.0, 1.0, (n_points, 3))
+
+
+def _volume_checker(state):
+    checker, points = state
+    return dict(fraction_inside=float(np.mean(checker(points))))
+
+
+def _import_time(module):
+    # The import_time metric excludes the startup of the fresh interpreter
+    from omnigibson.utils.lazy_import_utils import measure_import_time
+    return dict(import_time=measure_import_time(module)[0])
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Omni backend
+# ---------------------------------------------------------------------------------------------------------------------
+
+_PHASES = ("physics", "omni_update", "non_physics", "transition_rules")
+
+
+def _enable_step_profiler():
+    from omnigibson.utils.profiling_utils import PROFILER
+    PROFILER.reset()
+    PROFILER.enable()
+
+
+def _sim_step(state):
+    # Steps the simulator, reporting the time spent in each phase of the step (in seconds) as metrics
+    import omnigibson as og
+    from omnigibson.utils.profiling_utils import PROFILER
+    robot = state.get("robot", None) if isinstance(state, dict) else None
+    if robot is not None:
+        robot.apply_action(robot.action_space.sample())
+    og.sim.step()
+    return {phase: PROFILER.stats[f"step/{phase}"].durations[-1] for phase in _PHASES
+            if f"step/{phase}" in PROFILER.stats}
+
+
+def _teardown_sim(state):
+    import omnigibson as og
+    from omnigibson.utils.profiling_utils import PROFILER
+    PROFILER.disable()
+    og.sim.clear()
+
+
+def _setup_sim_objects(n_objs):
+    # Stack of small spheres, replacing the former benchmark_object_count.py
+    import omnigibson as og
+    from omnigibson.objects.primitive_object import PrimitiveObject
+    from omnigibson.scenes.scene_base import Scene
+    og.sim.clear()
+    og.sim.import_scene(Scene(floor_plane_visible=True))
+    og.sim.play()
+    for i in range(n_objs):
+        obj = PrimitiveObject(prim_path=f"/World/obj{i}", primitive_type="Sphere", name=f"obj{i}", scale=0.05,
+                              visual_only=False)
+        og.sim.import_object(obj=obj, auto_initialize=False)
+        obj.set_position(position=np.array([0, 0, 0.5 + (i % 20) * 0.05 * 2.25]))
+    # Take a step to initialize the new objects (done in _non_physics_step())
+    og.sim.step()
+    _enable_step_profiler()
+    return dict()
+
+
+def _setup_sim_interactive_scene(scene, robot):
+    # Interactive scene, optionally with a randomly acting robot, replacing the former benchmark_interactive_scene.py
+    import omnigibson as og
+    from omnigibson.robots.turtlebot import Turtlebot
+    from omnigibson.scenes.interactive_traversable_scene import InteractiveTraversableScene
+    og.sim.clear()
+    og.sim.import_scene(InteractiveTraversableScene(scene))
+    turtlebot = None
+    if robot:
+        turtlebot = Turtlebot(prim_path="/World/robot", name="agent")
+        og.sim.import_object(turtlebot, auto_initialize=True)
+    og.sim.play()
+    og.sim.step()
+    _enable_step_profiler()
+    return dict(robot=turtlebot)
+
+
+def _setup_vision_sensor(resolution, modalities):
+    import omnigibson as og
+    from omnigibson.scenes.interactive_traversable_scene import InteractiveTraversableScene
+    from omnigibson.sensors.vision_sensor import VisionSensor
+    og.sim.clear()
+    og.sim.import_scene(InteractiveTraversableScene(SIM_SCENES[0]))
+    sensor = VisionSensor(prim_path="/World/benchmark_camera", name="benchmark_camera",
+                          modalities=modalities.split("+"), image_height=resolution, image_width=resolution)
+    sensor.load(simulator=og.sim)
+    sensor.initialize()
+    sensor.set_position_orientation(np.array([0, 0, 1.5]), np.array([0, 0, 0, 1.0]))
+    og.sim.play()
+    og.sim.step()
+    _enable_step_profiler()
+    return dict(sensor=sensor)
+
+
+def _vision_sensor_obs(state):
+    metrics = _sim_step(state)
+    start = time.perf_counter()
+    state["sensor"].get_obs()
+    metrics["get_obs"] = time.perf_counter() - start
+    return metrics
+
+
+def get_cases():
+    """
+    Returns:
+        list of BenchmarkCase: All benchmark cases
+    """
+    from omnigibson.utils.benchmark_utils import BenchmarkCase
+    return [
+        BenchmarkCase("registry_lookup", _registry_lookup, setup=_setup_registry, teardown=_teardown_registry,
+                      params=dict(n_objs=OBJ_COUNTS), number=10,
+                      description=f"{N_QUERIES} unique and group key lookups"),
+        BenchmarkCase("registry_update", _registry_update, setup=_setup_registry, teardown=_teardown_registry,
+                      params=dict(n_objs=OBJ_COUNTS), description="Re-keying all handles"),
+        BenchmarkCase("temperature_update", _temperature_update, setup=_setup_temperature,
+                      params=dict(n_objs=OBJ_COUNTS[:2]), description="Vectorized Temperature state update"),
+        BenchmarkCase("snapshot_capture_restore", _snapshot_capture_restore, setup=_setup_snapshot,
+                      params=dict(n_objs=OBJ_COUNTS), description="Serializing and partially restoring object states"),
+        BenchmarkCase("particle_world_poses", lambda storage: storage.get_world_poses(), setup=_setup_particles,
+                      params=dict(n_particles=PARTICLE_COUNTS), description="Macro particle world poses"),
+        BenchmarkCase("batch_pose_transform", _pose_transform, setup=_setup_poses,
+                      params=dict(n_poses=PARTICLE_COUNTS), description="Batched pose composition and quat2mat"),
+        BenchmarkCase("trav_graph_build", _trav_graph_build, setup=_setup_trav_graph, params=dict(map_size=MAP_SIZES),
+                      repeat=3, description="Traversability graph construction"),
+        BenchmarkCase("trav_graph_queries", _trav_graph_queries, setup=_setup_trav_graph,
+                      params=dict(map_size=MAP_SIZES), description=f"{N_QUERIES} shortest paths towards 4 goals"),
+        BenchmarkCase("occupancy_grid", _occupancy_grid_rasterize, setup=_setup_occupancy_grid,
+                      params=dict(resolution=(128, 256), horizontal_resolution=(0.5, 1.0)), number=10,
+                      description="ScanSensor occupancy grid rasterization"),
+        BenchmarkCase("volume_checker", _volume_checker, setup=_setup_volume_checker,
+                      params=dict(n_points=POINT_COUNTS), description="Points in container volumes"),
+        BenchmarkCase("import_time", _import_time, setup=lambda module: module, params=dict(module=IMPORT_MODULES),
+                      warmup=0, description="Importing a module in a fresh interpreter"),
+        BenchmarkCase("sim_step_objects", _sim_step, setup=_setup_sim_objects, teardown=_teardown_sim,
+                      params=dict(n_objs=SIM_OBJ_COUNTS), backend="omni", warmup=10, repeat=30),
+        BenchmarkCase("sim_step_interactive_scene", _sim_step, setup=_setup_sim_interactive_scene,
+                      teardown=_teardown_sim, params=dict(scene=SIM_SCENES, robot=(False, True)), backend="omni",
+                      warmup=10, repeat=100),
+        BenchmarkCase("vision_sensor_obs", _vision_sensor_obs, setup=_setup_vision_sensor, teardown=_teardown_sim,
+                      params=dict(resolution=SENSOR_RESOLUTIONS, modalities=SENSOR_MODALITIES), backend="omni",
+                      warmup=5, repeat=30),
+    ]
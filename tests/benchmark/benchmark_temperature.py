@@ -0,0 +1,258 @@
+"""
+Script to benchmark Temperature updates vs. no. of objects.
+
+Compares the legacy per-object loop over all heat sources against Temperature.batch_update on randomized synthetic
+scenes, and verifies that both produce the same temperatures. Objects and their object states are mocked, so that only
+the temperature update itself is measured. Roughly half of the heat sources are distance-based, and the other half
+require the heated object to be inside of them. Some objects are on fire, and the first updated object catches fire
+during the step, which the other objects only see when heat source activity is evaluated in the legacy order. The
+batched update is measured both without and with a spatial index over the objects' AABBs to prune heat sources' range.
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import omnigibson as og
+from omnigibson.object_states.aabb import AABB
+from omnigibson.object_states.heat_source_or_sink import HeatSourceOrSink
+from omnigibson.object_states.inside import Inside
+from omnigibson.object_states.on_fire import OnFire
+from omnigibson.object_states.temperature import Temperature, m
+from omnigibson.utils.spatial_utils import SpatialIndex
+import omnigibson.utils.transform_utils as T
+
+
+# Params to be set as needed.
+OBJ_COUNTS = (10, 100, 1000)
+HEAT_SOURCE_FRACTION = 0.2   # Fraction of objects that are also heat sources.
+ON_FIRE_FRACTION = 0.25      # Fraction of heat sources that are fires.
+IGNITION_TEMPERATURE = 200.0
+SCENE_HALF_EXTENT = 3.0      # Objects are scattered uniformly in a cube with this half extent, in meters.
+DT = 1 / 60.0                # Rendering dt, in seconds.
+N_REPS = 3                   # No. of repetitions per measurement.
+
+
+class MockSim:
+    """
+    Stands in for og.sim, exposing only what Temperature updates read. Object state values are cached per step
+    """
+
+    def __init__(self, scene):
+        self.current_time_step_index = 0
+        self.scene = scene
+
+    def get_rendering_dt(self):
+        return DT
+
+
+class MockScene:
+    """
+    Stands in for the scene, optionally with an up to date spatial index over the objects' AABBs
+    """
+
+    def __init__(self, heat_source_objs):
+        self.heat_source_objs = heat_source_objs
+        self.spatial_index = None
+
+    def index_objects(self, objs):
+        self.spatial_index = SpatialIndex()
+        for obj in objs:
+            self.spatial_index.add(obj.name, *obj.states[AABB].get_value(), owner=obj)
+
+    @property
+    def spatial_index_is_up_to_date(self):
+        return self.spatial_index is not None
+
+    def get_objects_with_state_recursive(self, state):
+        return self.heat_source_objs
+
+    def get_objects_in_aabb(self, lower, upper):
+        return self.spatial_index.get_owners(self.spatial_index.query_aabb(lower, upper)[0])
+
+    def get_objects_within_radius(self, position, radius):
+        return self.spatial_index.get_owners(self.spatial_index.query_radius(position, radius)[0])
+
+
+class MockObject:
+    def __init__(self, name):
+        self.name = name
+        self.states = dict()
+
+
+class MockAABB:
+    def __init__(self, lower, upper):
+        self.value = (lower, upper)
+
+    def get_value(self):
+        return self.value
+
+
+class MockInside:
+    """
+    Checks the AABB center test of Inside, and stands in for its adjacency part with a random lookup table
+    """
+
+    def __init__(self, obj, adjacency):
+        self.obj = obj
+        self.adjacency = adjacency
+
+    def get_value(self, other):
+        lower, upper = other.states[AABB].get_value()
+        position = np.mean(self.obj.states[AABB].get_value(), axis=0)
+        return bool(np.all(lower <= position) and np.all(position <= upper) and self.adjacency[other.name])
+
+
+class MockHeatSource:
+    def __init__(self, obj, temperature, heating_rate, distance_threshold, link_position, active=True):
+        self.obj = obj
+        self.temperature = temperature
+        self.heating_rate = heating_rate
+        self.distance_threshold = distance_threshold
+        self.link_position = link_position
+        self.active = active
+
+    def get_link_position(self):
+        return self.link_position
+
+    def get_value(self):
+        return self.active
+
+
+class MockOnFire(MockHeatSource):
+    """
+    On fire once the object's temperature reaches the ignition temperature. As with all object states, the value is
+    computed the first time it is queried in a step, and cached for the rest of the step
+    """
+
+    def __init__(self, sim, obj, **kwargs):
+        super().__init__(obj=obj, **kwargs)
+        self.sim = sim
+        self.cache = None
+
+    def get_value(self):
+        if self.cache is None or self.cache[0] != self.sim.current_time_step_index:
+            self.cache = (self.sim.current_time_step_index,
+                          self.obj.states[Temperature].value >= IGNITION_TEMPERATURE)
+        return self.cache[1]
+
+
+def _random_scene(n_objs, seed, use_index=False):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-SCENE_HALF_EXTENT, SCENE_HALF_EXTENT, size=(n_objs, 3))
+    half_sizes = rng.uniform(0.05, 0.5, size=(n_objs, 3))
+    temperatures = rng.uniform(0.0, 300.0, size=n_objs)
+    objs = [MockObject(name=f"obj{i}") for i in range(n_objs)]
+    n_sources = max(2, int(n_objs * HEAT_SOURCE_FRACTION))
+    source_idxs = np.concatenate([[0, 1], rng.choice(np.arange(2, n_objs), size=n_sources - 2, replace=False)])
+    scene = MockScene(heat_source_objs=[objs[i] for i in sorted(source_idxs)])
+    sim = MockSim(scene=scene)
+
+    # The first object is just below its ignition temperature and heats up: it catches fire during the step, after
+    # it has been updated. The second object owns a hot heat source right at the first object's center
+    temperatures[0] = IGNITION_TEMPERATURE - 0.01
+    for i, obj in enumerate(objs):
+        obj.states[AABB] = MockAABB(centers[i] - half_sizes[i], centers[i] + half_sizes[i])
+        obj.states[Inside] = MockInside(obj, adjacency={other.name: rng.random() < 0.5 for other in objs})
+        obj.states[Temperature] = SimpleNamespace(obj=obj, value=temperatures[i])
+    for k, i in enumerate(source_idxs):
+        on_fire = k == 0 or (k > 1 and rng.random() < ON_FIRE_FRACTION)
+        requires_inside = k > 1 and not on_fire and rng.random() < 0.5
+        kwargs = dict(
+            obj=objs[i],
+            temperature=1000.0 if k < 2 else rng.uniform(-20.0, 1000.0),
+            heating_rate=rng.uniform(0.01, 0.1),
+            distance_threshold=2 * SCENE_HALF_EXTENT if k == 0 else rng.uniform(0.1, 1.5),
+            link_position=None if on_fire or requires_inside else centers[i] + rng.normal(scale=0.05, size=3),
+        )
+        if k == 1:
+            kwargs.update(link_position=centers[0], distance_threshold=0.1, heating_rate=1.0)
+        if on_fire:
+            objs[i].states[OnFire] = MockOnFire(sim=sim, **kwargs)
+        else:
+            objs[i].states[HeatSourceOrSink] = MockHeatSource(active=k == 1 or rng.random() < 0.8, **kwargs)
+    if use_index:
+        scene.index_objects(objs)
+    return sim, [obj.states[Temperature] for obj in objs]
+
+
+def _legacy_update(sim, states):
+    # Replicates Temperature._update before vectorization, one object at a time
+    for state in states:
+        new_temperature = state.value
+        affected_by_heat_source = False
+        for obj2 in sim.scene.get_objects_with_state_recursive(HeatSourceOrSink):
+            if obj2 == state.obj:
+                continue
+            heat_source = obj2.states.get(OnFire, obj2.states.get(HeatSourceOrSink, None))
+            if heat_source.get_value():
+                heat_source_position = heat_source.get_link_position()
+                if OnFire in obj2.states and heat_source_position is None:
+                    aabb_lower, aabb_upper = obj2.states[AABB].get_value()
+                    heat_source_position = (aabb_lower + aabb_upper) / 2.0
+                if heat_source_position is not None:
+                    aabb_lower, aabb_upper = state.obj.states[AABB].get_value()
+                    position = (aabb_lower + aabb_upper) / 2.0
+                    dist = T.l2_distance(heat_source_position, position)
+                    if dist > heat_source.distance_threshold:
+                        continue
+                else:
+                    if not state.obj.states[Inside].get_value(obj2):
+                        continue
+                new_temperature += (heat_source.temperature - state.value) * heat_source.heating_rate * DT
+                affected_by_heat_source = True
+        if not affected_by_heat_source:
+            new_temperature += (m.DEFAULT_TEMPERATURE - state.value) * m.TEMPERATURE_DECAY_SPEED * DT
+        state.value = new_temperature
+
+
+def _batch_update(sim, states):
+    og_sim, og.sim = og.sim, sim
+    try:
+        Temperature.batch_update(states)
+    finally:
+        og.sim = og_sim
+
+
+def _step(update, sim, states):
+    sim.current_time_step_index += 1
+    update(sim, states)
+    return np.array([state.value for state in states])
+
+
+def _time(update, sim, states):
+    times = []
+    for _ in range(N_REPS):
+        start = time.perf_counter()
+        _step(update, sim, states)
+        times.append(time.perf_counter() - start)
+    return np.min(times)
+
+
+def main():
+    print(f"{'n_objs':>8} {'legacy (ms)':>12} {'batch (ms)':>11} {'indexed (ms)':>13} {'max abs diff':>13}")
+    for n_objs in OBJ_COUNTS:
+        legacy_scene = _random_scene(n_objs, seed=n_objs)
+        batch_scene = _random_scene(n_objs, seed=n_objs)
+        indexed_scene = _random_scene(n_objs, seed=n_objs, use_index=True)
+        first_on_fire = legacy_scene[1][0].obj.states[OnFire]
+        for _ in range(3):
+            legacy_temperatures = _step(_legacy_update, *legacy_scene)
+            diff = 0.0
+            for scene in (batch_scene, indexed_scene):
+                diff = max(diff, np.max(np.abs(legacy_temperatures - _step(_batch_update, *scene))))
+            assert diff < 1e-9, f"Batched temperatures differ from legacy temperatures by {diff}!"
+        assert first_on_fire.get_value(), "The first object did not catch fire!"
+
+        legacy = _time(_legacy_update, *legacy_scene)
+        batch = _time(_batch_update, *batch_scene)
+        indexed = _time(_batch_update, *indexed_scene)
+        print(f"{n_objs:>8} {legacy * 1e3:>12.2f} {batch * 1e3:>11.2f} {indexed * 1e3:>13.2f} {diff:>13.2e}")
+
+    print("All checks passed")
+    og.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Script to benchmark single vs. batched transform utility throughput vs. batch size, headless on CPU.
+
+For each function, "single" calls the per-pose function in transform_utils in a Python loop over the batch, while
+"batched" calls the corresponding function in batch_transform_utils once on the whole batch (with numba kernels if
+numba is installed, and with pure numpy otherwise). Also checks that both produce the same results, up to the float32
+precision transform_utils composes poses with.
+"""
+
+import os
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+import omnigibson.utils.batch_transform_utils as BT
+import omnigibson.utils.transform_utils as T
+
+
+# Params to be set as needed.
+BATCH_SIZES = (1, 10, 100, 1000, 10000, 100000)
+MAX_SINGLE_BATCH_SIZE = 10000   # Skip the (slow) per-pose loop above this batch size.
+N_REPS = 3                      # No. of repetitions per measurement.
+
+
+def _time(fcn):
+    # Warm up once (this also triggers any JIT compilation), then take the best of N_REPS
+    fcn()
+    times = []
+    for _ in range(N_REPS):
+        start = time.perf_counter()
+        fcn()
+        times.append(time.perf_counter() - start)
+    return np.min(times)
+
+
+def _random_poses(rng, n):
+    pos = rng.normal(size=(n, 3))
+    quat = rng.normal(size=(n, 4))
+    return pos, quat / np.linalg.norm(quat, axis=-1, keepdims=True)
+
+
+def _check(name, single_out, batched_out):
+    # Batched functions return arrays (or tuples of arrays) with the batch as leading dimension
+    batched_outs = batched_out if isinstance(batched_out, tuple) else (batched_out,)
+    for i, batched in enumerate(batched_outs):
+        expected = np.array([out[i] if isinstance(batched_out, tuple) else out for out in single_out])
+        if batched.ndim == 2 and batched.shape[-1] == 4:
+            # Quaternions q and -q represent the same rotation
+            batched = batched * np.where(np.sum(batched * expected, axis=-1, keepdims=True) < 0.0, -1.0, 1.0)
+        assert np.allclose(batched, expected, atol=1e-5), f"Batched {name} differs from single {name}!"
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"numba enabled: {BT.numba_enabled()}")
+    print(f"{'function':>24} {'batch':>8} {'single (poses/s)':>18} {'batched (poses/s)':>18}")
+    for n in BATCH_SIZES:
+        pos0, quat0 = _random_poses(rng, n)
+        pos1, quat1 = _random_poses(rng, n)
+        mats = BT.quat2mat(quat0)
+        poses0, poses1 = BT.pose2mat(pos0, quat0), BT.pose2mat(pos1, quat1)
+        cases = {
+            "quat_multiply": (
+                lambda: [T.quat_multiply(a, b) for a, b in zip(quat1, quat0)],
+                lambda: BT.quat_multiply(quat1, quat0),
+            ),
+            "quat2mat": (
+                lambda: [T.quat2mat(q) for q in quat0],
+                lambda: BT.quat2mat(quat0),
+            ),
+            "mat2quat": (
+                lambda: [T.mat2quat(mat) for mat in mats],
+                lambda: BT.mat2quat(mats),
+            ),
+            "quat_slerp": (
+                lambda: [T.quat_slerp(a, b, 0.3) for a, b in zip(quat0, quat1)],
+                lambda: BT.quat_slerp(quat0, quat1, 0.3),
+            ),
+            "pose_transform": (
+                lambda: [T.pose_transform(a, b, c, d) for a, b, c, d in zip(pos1, quat1, pos0, quat0)],
+                lambda: BT.pose_transform(pos1, quat1, pos0, quat0),
+            ),
+            "relative_pose_transform": (
+                lambda: [T.relative_pose_transform(a, b, c, d) for a, b, c, d in zip(pos1, quat1, pos0, quat0)],
+                lambda: BT.relative_pose_transform(pos1, quat1, pos0, quat0),
+            ),
+            "pose_in_A_to_pose_in_B": (
+                lambda: [T.pose_in_A_to_pose_in_B(a, b) for a, b in zip(poses0, poses1)],
+                lambda: BT.pose_in_A_to_pose_in_B(poses0, poses1),
+            ),
+            "vel_in_A_to_vel_in_B": (
+                lambda: [T.vel_in_A_to_vel_in_B(a, b, c) for a, b, c in zip(pos0, pos1, poses0)],
+                lambda: BT.vel_in_A_to_vel_in_B(pos0, pos1, poses0),
+            ),
+            "get_pose_error": (
+                lambda: [T.get_pose_error(a, b) for a, b in zip(poses1, poses0)],
+                lambda: BT.get_pose_error(poses1, poses0),
+            ),
+        }
+        for name, (single_fcn, batched_fcn) in cases.items():
+            single = f"{'-':>18}"
+            if n <= MAX_SINGLE_BATCH_SIZE:
+                _check(name, single_fcn(), batched_fcn())
+                single = f"{n / _time(single_fcn):>18.0f}"
+            print(f"{name:>24} {n:>8} {single} {n / _time(batched_fcn):>18.0f}")
+    print("All checks passed")
+
+
+if __name__ == "__main__":
+    main()
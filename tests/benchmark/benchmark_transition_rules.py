@@ -0,0 +1,160 @@
+"""
+Script to benchmark transition rule matching cost vs. no. of objects in the scene.
+
+Compares the legacy matching loop, which evaluates every filter on every object and processes the full cartesian
+product over the individual filter outputs, against the indexed TransitionRuleEngine. The scene contains sliceable,
+slicer, container and ingredient objects. Checks that both match the same objects with every filter and trigger the
+same transitions, and that the engine never processes more combinations than the legacy loop.
+"""
+
+import itertools
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from omnigibson import app, Simulator
+from omnigibson.objects.primitive_object import PrimitiveObject
+from omnigibson.object_states import Open
+from omnigibson.scenes.scene_base import Scene
+from omnigibson.transition_rules import (
+    AndFilter,
+    CategoryFilter,
+    GenericTransitionRule,
+    SlicingRule,
+    StateFilter,
+    TransitionRuleEngine,
+)
+
+
+# Params to be set as needed.
+OBJ_COUNTS = (100, 200, 400, 800)  # Total no. of objects in the scene.
+N_SLICERS = 10                     # No. of slicer objects, included in the total no. of objects.
+N_CONTAINERS = 10                  # No. of container objects, included in the total no. of objects.
+N_STEPS = 10                       # No. of steps to time for each no. of objects.
+
+
+def _make_rules():
+    return (
+        SlicingRule(),
+        # Open containers with at least one ingredient, which never triggers
+        GenericTransitionRule(
+            individual_filters={"container": AndFilter([CategoryFilter("container"), StateFilter(Open, True)])},
+            group_filters={"ingredient": CategoryFilter("ingredient")},
+            condition_fn=lambda individual_objects, group_objects: False,
+            transition_fn=lambda individual_objects, group_objects: None,
+        ),
+    )
+
+
+def _legacy_step(objs, rules):
+    # Replicates the matching loop of Simulator._transition_rule_step before indexing. Returns the no. of processed
+    # combinations and transitions, and the filter outputs of each rule
+    obj_dict = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for obj in objs:
+        for rule in rules:
+            for fname, f in rule.individual_filters.items():
+                if f(obj):
+                    obj_dict[rule]["individual"][fname].append(obj)
+            for fname, f in rule.group_filters.items():
+                if f(obj):
+                    obj_dict[rule]["group"][fname].append(obj)
+    n_tuples, n_transitions = 0, 0
+    for rule in rules:
+        if rule not in obj_dict:
+            continue
+        group_f_objs = dict()
+        if rule.requires_group_filters:
+            group_f_objs = obj_dict[rule]["group"]
+            if len(group_f_objs) == 0:
+                continue
+        if rule.requires_individual_filters:
+            individual_f_objs = obj_dict[rule]["individual"]
+            if not all(fname in individual_f_objs for fname in rule.individual_filters.keys()):
+                continue
+            for obj_tuple in itertools.product(*list(individual_f_objs.values())):
+                individual_objects = {fname: obj for fname, obj in zip(individual_f_objs.keys(), obj_tuple)}
+                n_transitions += rule.process(individual_objects=individual_objects, group_objects=group_f_objs)[0]
+                n_tuples += 1
+        else:
+            n_transitions += rule.process(individual_objects=dict(), group_objects=group_f_objs)[0]
+            n_tuples += 1
+    return n_tuples, n_transitions, obj_dict
+
+
+def _create_obj(sim, idx, category, abilities):
+    obj = PrimitiveObject(
+        prim_path=f"/World/obj{idx}",
+        primitive_type="Cube",
+        name=f"obj{idx}",
+        category=category,
+        abilities=abilities,
+        scale=0.05,
+    )
+    sim.import_object(obj)
+    obj.set_position(np.array([(idx % 30) * 0.2, (idx // 30) * 0.2, 0.05]))
+    return obj
+
+
+def main():
+    sim = Simulator()
+    scene = Scene(floor_plane_visible=True)
+    sim.import_scene(scene)
+    sim.play()
+
+    rules = _make_rules()
+    engine = TransitionRuleEngine(rules=rules)
+    objs = []
+    print(f"{'n_objs':>8} {'legacy (ms)':>12} {'legacy tuples':>14} {'engine (ms)':>12} {'engine tuples':>14}")
+    for n_objs in OBJ_COUNTS:
+        while len(objs) < n_objs:
+            idx = len(objs)
+            if idx < N_SLICERS:
+                obj = _create_obj(sim, idx, "knife", {"slicer": {}})
+            elif idx < N_SLICERS + N_CONTAINERS:
+                obj = _create_obj(sim, idx, "container", {"openable": {}})
+            elif idx % 2 == 0:
+                obj = _create_obj(sim, idx, "apple", {"sliceable": {}})
+            else:
+                obj = _create_obj(sim, idx, "ingredient", {})
+            engine.add_object(obj)
+            objs.append(obj)
+
+        # Take a step to initialize the new objects
+        sim.step()
+
+        legacy_times, engine_times = [], []
+        for _ in range(N_STEPS):
+            sim.step()
+            start = time.perf_counter()
+            legacy_tuples, legacy_transitions, legacy_outputs = _legacy_step(objs, rules)
+            legacy_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            engine.step()
+            engine_times.append(time.perf_counter() - start)
+
+            # Both match the same objects with each filter, in the same order, and trigger the same transitions
+            for rule in rules:
+                for kind, filters in (("individual", rule.individual_filters), ("group", rule.group_filters)):
+                    for fname, f in filters.items():
+                        assert engine.get_candidates(f) == legacy_outputs[rule][kind][fname], \
+                            f"Engine candidates of {rule.__class__.__name__} filter {fname} differ from legacy!"
+            engine_tuples = sum(stats["n_tuples"] for stats in engine.stats.values())
+            engine_transitions = sum(stats["n_transitions"] for stats in engine.stats.values())
+            assert engine_transitions == legacy_transitions, \
+                f"Engine triggered {engine_transitions} transitions, legacy triggered {legacy_transitions}!"
+            assert engine_tuples <= legacy_tuples, \
+                f"Engine processed {engine_tuples} combinations, more than the legacy {legacy_tuples}!"
+
+        print(f"{n_objs:>8} {np.mean(legacy_times) * 1e3:>12.2f} {legacy_tuples:>14} "
+              f"{np.mean(engine_times) * 1e3:>12.2f} {engine_tuples:>14}")
+        for rule, stats in engine.stats.items():
+            print(f"    {rule.__class__.__name__}: candidates {stats['n_candidates']}, "
+                  f"match {stats['match_time'] * 1e3:.2f} ms, process {stats['process_time'] * 1e3:.2f} ms")
+
+    print("All checks passed")
+    app.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Script to benchmark traversability graph construction vs. map resolution, headless on CPU.
+
+Builds the graph over the largest connected component of synthetic traversability maps with the vectorized
+numpy / scipy implementation and reports build time and peak memory. On smaller maps, also builds the graph with the
+legacy networkx implementation for comparison. That both graphs are equivalent is covered by
+tests/test_trav_graph_utils.py.
+"""
+
+import os
+import time
+import tracemalloc
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import networkx as nx
+import numpy as np
+
+import omnigibson.utils.transform_utils as T
+from omnigibson.utils.trav_graph_utils import TraversabilityGraph, get_largest_component_mask
+
+
+# Params to be set as needed.
+MAP_SIZES = (500, 1000, 2000, 4000)  # Map resolutions (in pixels per side) to benchmark.
+MAX_LEGACY_MAP_SIZE = 500            # Largest map resolution to also build with networkx.
+N_OBSTACLES_PER_MPIXEL = 400         # No. of random rectangular obstacles per million pixels.
+
+
+def _synthetic_trav_map(rng, map_size):
+    trav_map = np.full((map_size, map_size), 255, dtype=np.uint8)
+    n_obstacles = max(1, int(N_OBSTACLES_PER_MPIXEL * map_size ** 2 / 1e6))
+    for _ in range(n_obstacles):
+        (row, col), (height, width) = rng.integers(0, map_size, 2), rng.integers(5, 50, 2)
+        trav_map[row:row + height, col:col + width] = 0
+    # Walls splitting off a few smaller components
+    trav_map[map_size // 3, :] = 0
+    trav_map[:, map_size // 4] = 0
+    return trav_map
+
+
+def _legacy_graph(trav_map):
+    # Replicates TraversableMap.build_trav_graph before vectorization
+    map_size = trav_map.shape[0]
+    g = nx.Graph()
+    for i in range(map_size):
+        for j in range(map_size):
+            if trav_map[i, j] == 0:
+                continue
+            g.add_node((i, j))
+            neighbors = [(i - 1, j - 1), (i, j - 1), (i + 1, j - 1), (i - 1, j)]
+            for n in neighbors:
+                if 0 <= n[0] < map_size and 0 <= n[1] < map_size and trav_map[n[0], n[1]] > 0:
+                    g.add_edge(n, (i, j), weight=T.l2_distance(n, (i, j)))
+    largest_cc = max(nx.connected_components(g), key=len)
+    return g.subgraph(largest_cc).copy()
+
+
+def _measure(fcn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fcn()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'map size':>9} {'n_nodes':>10} {'build (s)':>10} {'peak (MB)':>10} {'legacy (s)':>11} "
+          f"{'legacy peak (MB)':>17}")
+    for map_size in MAP_SIZES:
+        trav_map = _synthetic_trav_map(rng, map_size)
+        graph, duration, peak = _measure(lambda: TraversabilityGraph(get_largest_component_mask(trav_map > 0)))
+        legacy_str = f"{'-':>11} {'-':>17}"
+        if map_size <= MAX_LEGACY_MAP_SIZE:
+            _, legacy_duration, legacy_peak = _measure(lambda: _legacy_graph(trav_map))
+            legacy_str = f"{legacy_duration:>11.2f} {legacy_peak / 1e6:>17.1f}"
+        print(f"{map_size:>9} {graph.n_nodes:>10} {duration:>10.2f} {peak / 1e6:>10.1f} {legacy_str}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Script to benchmark shortest path and geodesic distance queries on a traversability graph, headless on CPU.
+
+Mimics the access pattern of navigation tasks: many queries from random (possibly off-graph) start pixels towards a
+small set of goals. Reports queries per second for path queries, distance-only queries and batched distance queries,
+verifies that distances match the lengths of the corresponding paths, and tracks the traced memory after every chunk of
+queries to show that it stays bounded by the shortest path tree cache, since queries never modify the graph.
+"""
+
+import os
+import time
+import tracemalloc
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.trav_graph_utils import TraversabilityGraph, get_largest_component_mask
+
+
+# Params to be set as needed.
+MAP_SIZE = 1000             # Map resolution (in pixels per side).
+N_OBSTACLES = 400           # No. of random rectangular obstacles.
+N_GOALS = 4                 # No. of distinct goals queried, e.g.: one per episode.
+N_QUERIES = 100000          # No. of distance queries to run for each query type.
+N_PATH_QUERIES = 10000      # No. of (slower) path queries to run.
+N_CHUNKS = 10               # No. of chunks after which memory usage is reported.
+N_VERIFY = 200              # No. of queries whose distance is compared against the corresponding path length.
+
+
+def _synthetic_trav_map(rng):
+    trav_map = np.full((MAP_SIZE, MAP_SIZE), 255, dtype=np.uint8)
+    for _ in range(N_OBSTACLES):
+        (row, col), (height, width) = rng.integers(0, MAP_SIZE, 2), rng.integers(5, 50, 2)
+        trav_map[row:row + height, col:col + width] = 0
+    return trav_map
+
+
+def _run(graph, name, n_queries, fcn, sources, targets, batched=False):
+    graph.clear_cache()
+    tracemalloc.start()
+    chunk = n_queries // N_CHUNKS
+    currents = []
+    start = time.perf_counter()
+    for i in range(N_CHUNKS):
+        idxs = slice(i * chunk, (i + 1) * chunk)
+        if batched:
+            fcn(sources[idxs], targets[idxs])
+        else:
+            for source, target in zip(sources[idxs], targets[idxs]):
+                fcn(source, target)
+        currents.append(tracemalloc.get_traced_memory()[0])
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:>18} {n_queries:>9} {n_queries / duration:>12.0f} {currents[0] / 1e6:>17.1f} "
+          f"{currents[-1] / 1e6:>16.1f} {peak / 1e6:>10.1f}")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    graph = TraversabilityGraph(get_largest_component_mask(_synthetic_trav_map(rng) > 0))
+
+    # Sources anywhere in the map (snapped to the graph if needed), goals on the graph
+    sources = rng.integers(0, MAP_SIZE, (N_QUERIES, 2))
+    goals = graph.nodes[rng.integers(0, graph.n_nodes, N_GOALS)]
+    targets = goals[np.sort(rng.integers(0, N_GOALS, N_QUERIES))]
+
+    # Distance queries must match the length of the corresponding paths
+    dists = graph.get_geodesic_distances(sources[:N_VERIFY], targets[:N_VERIFY])
+    for source, target, dist in zip(sources[:N_VERIFY], targets[:N_VERIFY], dists):
+        path = graph.get_shortest_path(source, target)
+        assert np.isclose(dist, np.sum(np.linalg.norm(np.diff(path, axis=0), axis=1)))
+        assert np.isclose(dist, graph.get_geodesic_distance(source, target))
+
+    print(f"map size: {MAP_SIZE}, n_nodes: {graph.n_nodes}, n_goals: {N_GOALS}")
+    print(f"{'query':>18} {'n':>9} {'queries / s':>12} {'first chunk (MB)':>17} {'last chunk (MB)':>16} "
+          f"{'peak (MB)':>10}")
+    _run(graph, "path", N_PATH_QUERIES, graph.get_shortest_path, sources, targets)
+    _run(graph, "distance", N_QUERIES, graph.get_geodesic_distance, sources, targets)
+    _run(graph, "batched distance", N_QUERIES, graph.get_geodesic_distances, sources, targets, batched=True)
+
+
+if __name__ == "__main__":
+    main()
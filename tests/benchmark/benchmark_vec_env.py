@@ -0,0 +1,84 @@
+"""
+Script to benchmark the throughput of vectorized environments vs. no. of workers, headless on CPU.
+
+Each worker process owns a FakeEnvironment, which emulates the physics step time of a simulator and returns rgb, depth
+and low-dimensional observations nested like those of Environment. Compares exchanging observations, rewards and dones
+through shared memory buffers against pickling them over the worker pipes. Observations are checked against the step
+counters and seeds stamped into them by each worker. Also checks that a crashing worker is restarted in isolation.
+"""
+
+import os
+import time
+from functools import partial
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.vec_env_utils import FakeEnvironment, VectorEnvironment
+
+
+# Params to be set as needed.
+N_WORKERS = (1, 2, 4, 8)         # No. of worker processes to benchmark.
+IMAGE_SIZE = 256                 # Height == width of the rgb and depth observations, in pixels.
+STEP_TIME = 0.01                 # Simulated physics step time of each environment, in seconds.
+EPISODE_LENGTH = 50              # No. of steps per episode, after which environments are automatically reset.
+N_STEPS = 200                    # No. of vectorized steps to run per configuration.
+SEED = 0                         # Base seed of the workers.
+CRASH_STEP = 20                  # Step after which the worker of the crash isolation check exits abruptly.
+
+
+def _env_fns(n_workers, crash_step=None):
+    return [partial(FakeEnvironment, image_height=IMAGE_SIZE, image_width=IMAGE_SIZE, episode_length=EPISODE_LENGTH,
+                    step_time=STEP_TIME, crash_step=crash_step if i == 0 else None) for i in range(n_workers)]
+
+
+def _verify(obs, step, n_workers):
+    # Each environment has taken @step steps since its last reset, and is seeded with SEED + its index
+    assert np.all(obs["robot0"]["proprio"][:, 0] == step % EPISODE_LENGTH), "Observations are out of sync!"
+    assert np.array_equal(obs["task"]["low_dim"][:, 0], SEED + np.arange(n_workers)), "Observations are mixed up!"
+    assert obs["robot0"]["rgb"].shape == (n_workers, IMAGE_SIZE, IMAGE_SIZE, 3)
+
+
+def _time(env):
+    actions = np.zeros((env.num_envs, *env.action_space.shape), dtype=env.action_space.dtype)
+    obs = env.reset()
+    _verify(obs, 0, env.num_envs)
+    start = time.perf_counter()
+    for step in range(1, N_STEPS + 1):
+        obs, rewards, dones, infos = env.step(actions)
+        _verify(obs, step, env.num_envs)
+        assert np.all(dones == (step % EPISODE_LENGTH == 0))
+        assert all(("terminal_observation" in info) == done for info, done in zip(infos, dones))
+    return N_STEPS * env.num_envs / (time.perf_counter() - start)
+
+
+def main():
+    obs_bytes = sum(space.dtype.itemsize * np.prod(space.shape) for space in (
+        FakeEnvironment(image_height=IMAGE_SIZE, image_width=IMAGE_SIZE).observation_space["robot0"].spaces.values()))
+    print(f"image size: {IMAGE_SIZE}, observation size: {obs_bytes / 1e6:.2f} MB, "
+          f"simulated step time: {STEP_TIME * 1e3:.1f} ms, single env upper bound: {1.0 / STEP_TIME:.1f} steps / s")
+    print(f"{'n_workers':>9} {'pipe (steps / s)':>17} {'shared memory (steps / s)':>26} {'speedup':>8}")
+    for n_workers in N_WORKERS:
+        rates = dict()
+        for transport in ("pipe", "shared_memory"):
+            env = VectorEnvironment(env_fns=_env_fns(n_workers), transport=transport, seed=SEED)
+            rates[transport] = _time(env)
+            env.close()
+        print(f"{n_workers:>9} {rates['pipe']:>17.1f} {rates['shared_memory']:>26.1f} "
+              f"{rates['shared_memory'] / rates['pipe']:>7.2f}x")
+
+    # A crashing worker is restarted and reported as done, while the other workers keep stepping
+    env = VectorEnvironment(env_fns=_env_fns(2, crash_step=CRASH_STEP), seed=SEED, max_restarts=1)
+    env.reset()
+    actions = np.zeros((env.num_envs, *env.action_space.shape))
+    for step in range(1, CRASH_STEP + 1):
+        obs, rewards, dones, infos = env.step(actions)
+    assert dones[0] and infos[0]["worker_restarted"] and not dones[1] and env.n_restarts == [1, 0]
+    assert obs["robot0"]["proprio"][0, 0] == 0 and obs["robot0"]["proprio"][1, 0] == CRASH_STEP % EPISODE_LENGTH
+    env.close()
+    print(f"crashed worker restarted after step {CRASH_STEP}, restarts: {env.n_restarts}")
+
+
+if __name__ == "__main__":
+    main()
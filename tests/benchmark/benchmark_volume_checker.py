@@ -0,0 +1,168 @@
+"""
+Script to benchmark checking which points lie within a container link's volumes vs. no. of points, headless on CPU.
+
+Compares the precompiled PointsInVolumeChecker against the legacy checker functions, which tile (N, faces, 3) arrays
+for convex hull meshes and transform points with 4x4 matrices for every volume. The container is composed of a convex
+hull mesh and one of each primitive volume type, attached to a randomly posed link. Both checkers must agree on all
+points, except for points within floating point error of a volume's boundary. Reports the time and the traced peak
+memory of each checker, with and without the AABB prefilter, as well as how often the link's pose is queried.
+"""
+
+import os
+import time
+import tracemalloc
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import trimesh
+from scipy.spatial.transform import Rotation as R
+
+import omnigibson.utils.transform_utils as T
+from omnigibson.utils.volume_checker_utils import ContainerVolume, PointsInVolumeChecker, get_convex_hull_half_spaces
+
+
+# Params to be set as needed.
+N_POINTS = (1000, 10000, 100000)     # No. of points to benchmark.
+MESH_SUBDIVISIONS = 3                # Subdivisions of the icosphere convex hull mesh (3 -> 1280 faces).
+MAX_CHUNK_BYTES = 16 * 1024 * 1024   # Memory ceiling per chunk of points for the precompiled checker.
+N_STEPS = 100                        # No. of simulated steps, each checking points twice, to count link pose queries.
+MAX_LEGACY_POINTS = 10000            # Largest no. of points to also run the (~150 KB / point) legacy checker with.
+MAX_MISMATCH_RATIO = 1e-4            # Max ratio of points the checkers may disagree on due to floating point error.
+
+
+class _Link:
+    def __init__(self, rng):
+        self.position = rng.normal(size=3)
+        self.orientation = R.random(random_state=rng.integers(1 << 31)).as_quat()
+        self.scale = np.array([1.2, 1.2, 1.2])
+        self.n_pose_queries = 0
+
+    def get_position_orientation(self):
+        self.n_pose_queries += 1
+        return self.position, self.orientation
+
+
+def _legacy_in_frame(pos, quat, scale, points):
+    # Replicates geometry_utils.get_particle_positions_in_frame
+    origin_in_new_frame = T.pose_inv(T.pose2mat((pos, quat)))
+    positions_tensor = np.tile(np.eye(4).reshape(1, 4, 4), (len(points), 1, 1))
+    positions_tensor[:, :3, 3] = points
+    return (origin_in_new_frame @ positions_tensor)[:, :3, 3] / scale.reshape(1, 3)
+
+
+def _legacy_check(volume, mesh, points):
+    # Replicates the legacy geometry_utils.check_points_in_[...] functions
+    points = _legacy_in_frame(volume.pos, volume.quat, volume.scale, points)
+    if volume.volume_type == "Mesh":
+        centroids, normals = mesh.vertices[mesh.faces].mean(axis=1), mesh.face_normals
+        D, N = len(centroids), len(points)
+        mesh_points = np.tile(centroids.reshape(1, D, 3), (N, 1, 1))
+        mesh_normals = np.tile(normals.reshape(1, D, 3), (N, 1, 1))
+        points = np.tile(points.reshape(N, 1, 3), (1, D, 1))
+        return (((points - mesh_points) * mesh_normals).sum(axis=-1) < 0).sum(axis=-1) == D
+    elif volume.volume_type == "Cube":
+        return ((-volume.size / 2.0 < points) & (points < volume.size / 2.0)).sum(axis=-1) == 3
+    elif volume.volume_type == "Sphere":
+        return np.linalg.norm(points, axis=-1) < volume.size
+    radius, height = volume.size
+    in_height = (-height / 2.0 < points[:, -1]) & (points[:, -1] < height / 2.0)
+    if volume.volume_type == "Cylinder":
+        return in_height & (np.linalg.norm(points[:, :-1], axis=-1) < radius)
+    in_radius = np.linalg.norm(points[:, :-1], axis=-1) < (radius * (1 - (points[:, -1] + height / 2.0) / height))
+    return in_height & in_radius
+
+
+def _legacy_checker(volumes, meshes, link):
+    # @meshes holds the trimesh mesh of each "Mesh" volume, and None for primitive volumes
+    def check_points_in_volumes(points):
+        link_pos, link_quat = link.get_position_orientation()
+        points = _legacy_in_frame(link_pos, link_quat, link.scale, points)
+        in_volumes = np.zeros(len(points)).astype(bool)
+        for volume, mesh in zip(volumes, meshes):
+            in_volumes |= _legacy_check(volume, mesh, points)
+        return in_volumes
+    return check_points_in_volumes
+
+
+def _create_volumes(rng, mesh):
+    def pose(offset):
+        return dict(pos=np.array(offset) + rng.uniform(-0.05, 0.05, 3),
+                    quat=R.random(random_state=rng.integers(1 << 31)).as_quat(), scale=rng.uniform(0.5, 1.5, 3))
+
+    return [
+        ContainerVolume("Mesh", **pose([0, 0, 0]), half_spaces=get_convex_hull_half_spaces(
+            mesh.vertices[mesh.faces].mean(axis=1), mesh.face_normals), vertices=mesh.vertices, raw_volume=mesh.volume),
+        ContainerVolume("Cube", **pose([1, 0, 0]), size=0.6),
+        ContainerVolume("Sphere", **pose([-1, 0, 0]), size=0.4),
+        ContainerVolume("Cylinder", **pose([0, 1, 0]), size=np.array([0.3, 0.8])),
+        ContainerVolume("Cone", **pose([0, -1, 0]), size=np.array([0.4, 0.6])),
+    ]
+
+
+def _measure(fcn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fcn()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def main():
+    rng = np.random.default_rng(0)
+    mesh = trimesh.creation.icosphere(subdivisions=MESH_SUBDIVISIONS, radius=0.5)
+    link = _Link(rng)
+    volumes = _create_volumes(rng, mesh)
+    legacy = _legacy_checker(volumes, [mesh] + [None] * (len(volumes) - 1), link)
+    checkers = {
+        f"compiled{suffix}": PointsInVolumeChecker(
+            volumes=volumes,
+            get_link_pose=link.get_position_orientation,
+            get_link_scale=lambda: link.scale,
+            get_cache_key=lambda: 0,
+            use_aabb_prefilter=use_aabb_prefilter,
+            max_chunk_bytes=MAX_CHUNK_BYTES,
+        ) for suffix, use_aabb_prefilter in (("", False), (" + aabb", True))
+    }
+
+    print(f"n_faces: {len(mesh.faces)}, n_half_spaces: {volumes[0].n_half_spaces}, "
+          f"max chunk: {MAX_CHUNK_BYTES / 1e6:.1f} MB")
+    print(f"{'n_points':>9} {'checker':>16} {'time (ms)':>10} {'peak (MB)':>10} {'speedup':>8} {'mismatches':>11}")
+    for n_points in N_POINTS:
+        # Points in the world-frame bounding box of the container, and within a larger region around it
+        link_aabb = checkers["compiled"].aabb * link.scale
+        corners = np.stack(np.meshgrid(*link_aabb.T, indexing="ij"), axis=-1).reshape(-1, 3)
+        corners = corners @ T.quat2mat(link.orientation).T + link.position
+        extent = np.array([corners.min(axis=0), corners.max(axis=0)])
+        points = rng.uniform(extent[0] - 0.2, extent[1] + 0.2, (n_points, 3))
+
+        in_reference, legacy_time = None, None
+        if n_points <= MAX_LEGACY_POINTS:
+            in_reference, legacy_time, legacy_peak = _measure(lambda: legacy(points))
+            print(f"{n_points:>9} {'legacy':>16} {legacy_time * 1e3:>10.1f} {legacy_peak / 1e6:>10.1f} {'-':>8} "
+                  f"{'-':>11}")
+        for name, checker in checkers.items():
+            in_compiled, duration, peak = _measure(lambda: checker(points))
+            # Without legacy results, the prefiltered checker is compared against the non-prefiltered one
+            in_reference = in_compiled if in_reference is None else in_reference
+            n_mismatches = int(np.sum(in_compiled != in_reference))
+            assert n_mismatches <= MAX_MISMATCH_RATIO * n_points, f"{name} checker differs from reference checker!"
+            speedup = f"{'-':>8}" if legacy_time is None else f"{legacy_time / duration:>7.1f}x"
+            print(f"{n_points:>9} {name:>16} {duration * 1e3:>10.1f} {peak / 1e6:>10.1f} {speedup} {n_mismatches:>11}")
+        print(f"{'':>9} {'(points inside)':>16} {int(in_reference.sum()):>10}")
+
+    # The link pose is only queried once per physics step, however many times points are checked in that step
+    checker, link.n_pose_queries = checkers["compiled"], 0
+    for step in range(N_STEPS):
+        checker._get_cache_key = lambda: step + 1
+        checker(points[:10])
+        checker(points[:10])
+    assert link.n_pose_queries == N_STEPS
+    print(f"link pose queries over {N_STEPS} steps with 2 checks each: compiled {link.n_pose_queries}, "
+          f"legacy {2 * N_STEPS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Script to run the benchmark cases of benchmark_suite.py, write their results to JSON and optionally compare them
+against baseline results (--baseline). Exits with a non-zero code if any case errored, regressed beyond its tolerance,
+or is in the baseline but was not run successfully, so that it can gate CI.
+
+Mock cases run headless on any machine, e.g.:
+
+    python tests/benchmark/run_benchmarks.py --backend mock --output results.json
+
+while omni cases require omniverse, e.g.: --backend omni or --backend all.
+
+Times are only comparable between identical environments. If the machine, Python or package versions differ from the
+baseline's metadata, a warning is printed and regressions do not fail the run, unless --strict is set. No baseline is
+stored in the repository: CI generates one on its own runner with --update-baseline, e.g.: from the target branch,
+and passes it to the runs to compare with --baseline.
+"""
+
+import argparse
+import os
+import re
+import sys
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run OmniGibson benchmarks and compare them against a baseline")
+    parser.add_argument("--backend", type=str, default="mock", choices=["mock", "omni", "all"],
+                        help="Backend of the cases to run. Omniverse is only launched for omni / all")
+    parser.add_argument("--filter", type=str, default=None, help="Regex that case ids must match to be run")
+    parser.add_argument("--warmup", type=int, default=None, help="Overrides the no. of warmup runs of all cases")
+    parser.add_argument("--repeat", type=int, default=None, help="Overrides the no. of repetitions of all cases")
+    parser.add_argument("--output", type=str, default="benchmark_results.json", help="Path of the results JSON")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Path of the baseline results JSON to compare to. If not set, no comparison is made")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Max relative slowdown with respect to the baseline before a case has regressed")
+    parser.add_argument("--statistic", type=str, default=None, choices=["median", "mean", "min"],
+                        help="Statistic of the repetition times to compare against the baseline")
+    parser.add_argument("--strict", action="store_true",
+                        help="If set, regressions fail the run even if the environment differs from the baseline's")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="If set, overwrites --baseline with the results instead of comparing against it")
+    parser.add_argument("--list", action="store_true", help="If set, only lists the ids of the selected cases")
+    args = parser.parse_args()
+
+    # Only launch omniverse if omni cases are requested
+    if args.backend == "mock":
+        os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+    import omnigibson.utils.benchmark_utils as BU
+    from benchmark_suite import get_cases
+
+    cases = get_cases()
+    backends = {"mock", "omni"} if args.backend == "all" else {args.backend}
+    if args.list:
+        for case in cases:
+            if case.backend in backends:
+                for case_id, _ in case.expand():
+                    print(f"{case_id:<60} {case.backend:>5}  {case.description or ''}")
+        return 0
+
+    results = BU.run_benchmarks(cases=cases, backends=backends, name_filter=args.filter, warmup=args.warmup,
+                                repeat=args.repeat)
+    BU.save_results(results, args.output)
+    print(f"Wrote results of {len(results['results'])} cases to {os.path.abspath(args.output)}")
+    failed = any(result["status"] == "error" for result in results["results"].values())
+
+    if args.baseline:
+        if args.update_baseline or not os.path.exists(args.baseline):
+            BU.save_results(results, args.baseline)
+            print(f"Wrote baseline to {os.path.abspath(args.baseline)}")
+        else:
+            baseline = BU.load_results(args.baseline)
+            # Cases excluded by the backend or the filter are not missing
+            baseline["results"] = {case_id: result for case_id, result in baseline["results"].items()
+                                   if result["backend"] in backends and
+                                   (args.filter is None or re.search(args.filter, case_id) is not None)}
+            comparisons = BU.compare_to_baseline(results, baseline, tolerance=args.tolerance,
+                                                 statistic=args.statistic)
+            print(BU.format_comparisons(comparisons))
+            failing_statuses = {"regression", "missing"}
+            mismatches = BU.get_metadata_mismatches(results["metadata"], baseline["metadata"])
+            if len(mismatches) > 0 and not args.strict:
+                print("WARNING: The environment differs from the baseline's, so times are not comparable and "
+                      "regressions are ignored:")
+                for key, (current, reference) in mismatches.items():
+                    print(f"    {key}: {current} (baseline: {reference})")
+                failing_statuses = {"missing"}
+            failed |= any(comparison["status"] in failing_statuses for comparison in comparisons)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import os
+from collections import Counter
+from types import SimpleNamespace
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+import omnigibson as og
+from omnigibson.utils.physics_state_utils import (
+    ArticulationState,
+    ArticulationStateBuffer,
+    ArticulationStateMixin,
+    mark_physics_state_dirty,
+)
+
+N_STEPS = 5
+N_READS = 4
+
+
+class CountingDC:
+    """
+    Stands in for the dynamic control interface, returning states that depend on the simulator's current step and
+    counting the no. of calls of each of its getter methods
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.counts = Counter()
+
+    def _value(self, handle, size, offset):
+        return np.arange(size) + 100 * handle + 1000 * self.sim.current_time_step_index + offset
+
+    def is_simulating(self):
+        return True
+
+    def get_rigid_body_pose(self, handle):
+        self.counts["get_rigid_body_pose"] += 1
+        return SimpleNamespace(p=self._value(handle, 3, 0), r=self._value(handle, 4, 10))
+
+    def get_rigid_body_linear_velocity(self, handle):
+        self.counts["get_rigid_body_linear_velocity"] += 1
+        return self._value(handle, 3, 20)
+
+    def get_rigid_body_angular_velocity(self, handle):
+        self.counts["get_rigid_body_angular_velocity"] += 1
+        return self._value(handle, 3, 30)
+
+    def get_articulation_dof_states(self, handle, flags):
+        assert flags == FakeArticulation._ALL_DOF_STATES
+        self.counts["get_articulation_dof_states"] += 1
+        n_dof = handle
+        return dict(pos=self._value(handle, n_dof, 40), vel=self._value(handle, n_dof, 50),
+                    effort=self._value(handle, n_dof, 60))
+
+
+class FakeArticulation(ArticulationStateMixin):
+    """
+    Articulation whose handle is also its no. of DOFs. When the snapshot is not accessible, the root state is read
+    from the backend by each getter, as EntityPrim does through its root link
+    """
+
+    _ALL_DOF_STATES = "all"
+
+    def __init__(self, dc, n_dof, accessible=True):
+        self._dc = dc
+        self._handle = n_dof
+        self._root_handle = n_dof
+        self._n_dof = n_dof
+        self._articulation_state = None
+        self._articulation_state_key = None
+        self._articulation_state_buffer = None
+        self.accessible = accessible
+
+    @property
+    def _articulation_state_accessible(self):
+        return self.accessible and self._dc.is_simulating()
+
+    @property
+    def _dof_states_accessible(self):
+        return self._n_dof > 0
+
+    def get_position_orientation(self):
+        pose = self._dc.get_rigid_body_pose(self._root_handle)
+        return pose.p, pose.r
+
+    def get_linear_velocity(self):
+        return self._dc.get_rigid_body_linear_velocity(self._root_handle)
+
+    def get_angular_velocity(self):
+        return self._dc.get_rigid_body_angular_velocity(self._root_handle)
+
+    def expected_state(self):
+        pose = self._dc.get_rigid_body_pose(self._root_handle)
+        dof_states = self._dc.get_articulation_dof_states(self._handle, self._ALL_DOF_STATES)
+        return np.concatenate([pose.p, pose.r, self._dc.get_rigid_body_linear_velocity(self._root_handle),
+                               self._dc.get_rigid_body_angular_velocity(self._root_handle), dof_states["pos"],
+                               dof_states["vel"], dof_states["effort"]])
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    sim = SimpleNamespace(current_time_step_index=0)
+    monkeypatch.setattr(og, "sim", sim, raising=False)
+    return sim
+
+
+@pytest.fixture
+def dc(sim):
+    return CountingDC(sim)
+
+
+def _calls_per_step(sim, dc, read):
+    dc.counts.clear()
+    for _ in range(N_STEPS):
+        sim.current_time_step_index += 1
+        for _ in range(N_READS):
+            read()
+    return {name: count / N_STEPS for name, count in dc.counts.items()}
+
+
+def test_snapshot_is_fetched_once_per_step(sim, dc):
+    articulation = FakeArticulation(dc, n_dof=3)
+    assert _calls_per_step(sim, dc, articulation.get_articulation_state) == dict(
+        get_rigid_body_pose=1, get_rigid_body_linear_velocity=1, get_rigid_body_angular_velocity=1,
+        get_articulation_dof_states=1,
+    )
+
+    # The snapshot holds the current step's state, and is read-only
+    state = articulation.get_articulation_state()
+    assert state.array.shape == (ArticulationState.size(n_dof=3),)
+    assert np.array_equal(state.array, articulation.expected_state())
+    assert np.array_equal(state.joint_velocities, dc.get_articulation_dof_states(3, "all")["vel"])
+    with pytest.raises(ValueError):
+        state.joint_positions[0] = 0.0
+
+
+def test_explicit_writes_invalidate_snapshot(sim, dc):
+    articulation = FakeArticulation(dc, n_dof=2)
+    articulation.get_articulation_state()
+    dc.counts.clear()
+    articulation.get_articulation_state()
+    assert sum(dc.counts.values()) == 0
+
+    # Any explicit physical state write, or invalidating the snapshot, results in a refresh in place
+    state = articulation.get_articulation_state()
+    for invalidate in (mark_physics_state_dirty, articulation.invalidate_articulation_state):
+        invalidate()
+        assert articulation.get_articulation_state() is state
+        assert dc.counts["get_articulation_dof_states"] == 1
+        dc.counts.clear()
+
+
+def test_inaccessible_snapshot_is_not_shared(sim, dc):
+    articulation = FakeArticulation(dc, n_dof=2, accessible=False)
+    calls_per_step = _calls_per_step(sim, dc, articulation.get_articulation_state)
+    assert calls_per_step == dict(
+        get_rigid_body_pose=N_READS, get_rigid_body_linear_velocity=N_READS, get_rigid_body_angular_velocity=N_READS,
+        get_articulation_dof_states=N_READS,
+    )
+    assert np.array_equal(articulation.get_articulation_state().array, articulation.expected_state())
+
+
+def test_buffer_is_refreshed_once_per_step(sim, dc):
+    articulations = [FakeArticulation(dc, n_dof=n_dof) for n_dof in (3, 0, 5)]
+    buffer = ArticulationStateBuffer(prims=articulations)
+    assert buffer.is_valid(articulations) and not buffer.is_valid(articulations[:2])
+
+    # Each articulation only fetches its DOF states if it has any
+    calls_per_step = _calls_per_step(sim, dc, buffer.update)
+    assert calls_per_step["get_rigid_body_pose"] == len(articulations)
+    assert calls_per_step["get_articulation_dof_states"] == len(articulations) - 1
+
+    # All snapshots are written into their slice of the shared array
+    array = buffer.update()
+    for articulation in articulations:
+        assert np.array_equal(array[buffer.get_slice(articulation)], articulation.expected_state())
+        assert np.shares_memory(articulation.get_articulation_state().array, buffer.array)
+    with pytest.raises(ValueError):
+        array[0] = 0.0
+
+    # The buffer becomes invalid once an articulation writes into its own array
+    articulations[1].set_articulation_state_buffer(None)
+    assert not buffer.is_valid(articulations)
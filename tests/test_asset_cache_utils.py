@@ -0,0 +1,154 @@
+import importlib
+import multiprocessing
+import os
+import stat
+import time
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+from omnigibson.utils import asset_cache_utils
+from omnigibson.utils.asset_cache_utils import DecryptedAssetCache
+
+N_MODELS = 4
+MODEL_SIZE = 1024
+N_PROCESSES = 3
+
+
+def xor_decrypt(encrypted, key):
+    # Stands in for Fernet, so that decrypted contents depend on the key
+    return bytes(b ^ key[i % len(key)] for i, b in enumerate(encrypted))
+
+
+def _cache(cache_dir, **kwargs):
+    return DecryptedAssetCache(cache_dir=str(cache_dir), decrypt_fn=xor_decrypt, **kwargs)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(0)
+    key = b"synthetic-key"
+    key_path = str(tmp_path / "synthetic.key")
+    with open(key_path, "wb") as f:
+        f.write(key)
+    models = dict()
+    for i in range(N_MODELS):
+        contents = rng.integers(0, 256, MODEL_SIZE, dtype=np.uint8).tobytes()
+        path = str(tmp_path / f"model{i}.encrypted.usd")
+        with open(path, "wb") as f:
+            f.write(xor_decrypt(contents, key))
+        models[path] = contents
+    return key_path, models
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _load_in_process(cache_dir, key_path, encrypted_paths):
+    cache = _cache(cache_dir)
+    for encrypted_path in encrypted_paths:
+        cache.get(encrypted_path, key_path=key_path)
+    return cache.stats
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("OMNIGIBSON_ASSET_CACHE", raising=False)
+    assert not importlib.reload(asset_cache_utils).m.ENABLED
+    monkeypatch.setenv("OMNIGIBSON_ASSET_CACHE", "1")
+    assert importlib.reload(asset_cache_utils).m.ENABLED
+    monkeypatch.delenv("OMNIGIBSON_ASSET_CACHE")
+    importlib.reload(asset_cache_utils)
+
+
+def test_hits_and_misses(dataset, tmp_path):
+    key_path, models = dataset
+    cache = _cache(tmp_path / "cache")
+    instances = list(models) * 3
+    paths = [cache.get(encrypted_path, key_path=key_path) for encrypted_path in instances]
+    for encrypted_path, path in zip(instances, paths):
+        assert _read(path) == models[encrypted_path]
+        assert path.endswith(".usd")
+    assert cache.stats["misses"] == N_MODELS and cache.stats["hits"] == 2 * N_MODELS
+    assert cache.stats["bytes_decrypted"] == N_MODELS * MODEL_SIZE
+    assert cache.n_entries == N_MODELS and cache.size == N_MODELS * MODEL_SIZE
+
+    # Other instances sharing the cache directory, e.g.: in new processes, only hit
+    stats = _load_in_process(tmp_path / "cache", key_path, instances)
+    assert stats["misses"] == 0 and stats["hits"] == len(instances) and stats["hit_rate"] == 1.0
+
+
+def test_entries_are_keyed_by_contents_and_key(dataset, tmp_path):
+    key_path, models = dataset
+    cache = _cache(tmp_path / "cache")
+    encrypted_path = list(models)[0]
+    path = cache.get(encrypted_path, key_path=key_path)
+
+    # A different key maps to a different entry
+    assert cache.get_digest(encrypted_path, b"other-key") != cache.get_digest(encrypted_path, _read(key_path))
+    assert cache.get(encrypted_path, key=b"other-key") != path
+
+    # Touching the file hits the same entry, while modifying its contents adds a new one
+    os.utime(encrypted_path, ns=(time.time_ns(), time.time_ns() + 1000))
+    assert cache.get(encrypted_path, key_path=key_path) == path
+    with open(encrypted_path, "wb") as f:
+        f.write(xor_decrypt(b"new contents", _read(key_path)))
+    new_path = cache.get(encrypted_path, key_path=key_path)
+    assert new_path != path and _read(new_path) == b"new contents"
+
+
+def test_permissions(dataset, tmp_path):
+    key_path, models = dataset
+    cache_dir = tmp_path / "cache"
+    cache = _cache(cache_dir)
+    path = cache.get(list(models)[0], key_path=key_path)
+    assert stat.S_IMODE(os.stat(path).st_mode) & 0o077 == 0
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+    # Pre-existing directories accessible by other users are restricted
+    os.chmod(cache_dir, 0o755)
+    _cache(cache_dir)
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+
+
+def test_lru_eviction(dataset, tmp_path):
+    key_path, models = dataset
+    cache = _cache(tmp_path / "cache", max_size=None)
+    encrypted_paths = list(models)
+    paths = [cache.get(encrypted_path, key_path=key_path) for encrypted_path in encrypted_paths]
+    # Use the first model again, so that the second one is the least recently used
+    time.sleep(0.01)
+    cache.get(encrypted_paths[0], key_path=key_path)
+    assert cache.evict(max_size=(N_MODELS - 1) * MODEL_SIZE, grace_period=0.0) == MODEL_SIZE
+    assert not os.path.exists(paths[1]) and all(os.path.exists(path) for path in paths[:1] + paths[2:])
+
+    # Recently used entries are never evicted
+    assert cache.evict(max_size=0) == 0
+    cache.clear()
+    assert cache.n_entries == 0 and cache.stats["evictions"] == N_MODELS
+
+    # Exceeding the size limit evicts older entries upon a miss, but never the new entry
+    cache = _cache(tmp_path / "limited_cache", max_size=2 * MODEL_SIZE)
+    asset_cache_utils.m.EVICTION_GRACE_PERIOD, grace_period = 0.0, asset_cache_utils.m.EVICTION_GRACE_PERIOD
+    try:
+        paths = [cache.get(encrypted_path, key_path=key_path) for encrypted_path in encrypted_paths]
+    finally:
+        asset_cache_utils.m.EVICTION_GRACE_PERIOD = grace_period
+    assert cache.n_entries == 2 and os.path.exists(paths[-1])
+
+
+def test_concurrent_processes(dataset, tmp_path):
+    key_path, models = dataset
+    cache_dir = tmp_path / "cache"
+    # Every process loads every model, which is still only decrypted once
+    with multiprocessing.get_context("spawn").Pool(N_PROCESSES) as pool:
+        stats = pool.starmap(_load_in_process, [(str(cache_dir), key_path, list(models))] * N_PROCESSES)
+    assert sum(s["misses"] for s in stats) == N_MODELS
+    assert sum(s["hits"] for s in stats) == (N_PROCESSES - 1) * N_MODELS
+    assert not any(name.startswith(".tmp-") for name in os.listdir(cache_dir))
+    cache = _cache(cache_dir)
+    for encrypted_path, contents in models.items():
+        assert _read(cache.get(encrypted_path, key_path=key_path)) == contents
@@ -0,0 +1,165 @@
+import os
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+import omnigibson.utils.batch_transform_utils as BT
+import omnigibson.utils.transform_utils as T
+
+N = 50
+# Flattened batch sizes of at least NUMBA_MIN_BATCH_SIZE run the numba kernels, smaller ones the numpy kernels
+BACKENDS = {"numpy": dict(ENABLE_NUMBA=False), "numba": dict(ENABLE_NUMBA=True, NUMBA_MIN_BATCH_SIZE=1)}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request, monkeypatch):
+    if request.param == "numba" and BT.numba is None:
+        pytest.skip("numba is not installed")
+    for name, value in BACKENDS[request.param].items():
+        monkeypatch.setattr(BT.m, name, value)
+    return request.param
+
+
+def _random_poses(rng, shape=(N,)):
+    pos = rng.normal(size=shape + (3,))
+    quat = BT.unit_vector(rng.normal(size=shape + (4,)))
+    return BT.pose2mat(pos, quat)
+
+
+def _random_pos_quats(rng, n=N):
+    return rng.normal(size=(n, 3)), BT.unit_vector(rng.normal(size=(n, 4)))
+
+
+def _assert_same_rotations(quats, expected, atol=1e-8):
+    # Quaternions q and -q represent the same rotation
+    quats, expected = np.asarray(quats), np.asarray(expected)
+    assert quats.shape == expected.shape
+    sign = np.where(np.sum(quats * expected, axis=-1, keepdims=True) < 0.0, -1.0, 1.0)
+    assert np.allclose(quats * sign, expected, atol=atol)
+
+
+def test_quat_multiply_matches_single(backend):
+    rng = np.random.default_rng(3)
+    _, quat0 = _random_pos_quats(rng)
+    _, quat1 = _random_pos_quats(rng)
+    assert np.allclose(BT.quat_multiply(quat1, quat0), [T.quat_multiply(a, b) for a, b in zip(quat1, quat0)])
+    # Leading dimensions broadcast
+    assert np.allclose(BT.quat_multiply(quat1[0], quat0.reshape(5, 10, 4)).reshape(N, 4),
+                       [T.quat_multiply(quat1[0], b) for b in quat0])
+
+
+def test_pose_transforms_match_single(backend):
+    rng = np.random.default_rng(4)
+    pos0, quat0 = _random_pos_quats(rng)
+    pos1, quat1 = _random_pos_quats(rng)
+    for batched, single in ((BT.pose_transform, T.pose_transform),
+                            (BT.relative_pose_transform, T.relative_pose_transform)):
+        # The single versions compose poses through float32 matrices
+        pos, quat = batched(pos1, quat1, pos0, quat0)
+        expected = [single(a, b, c, d) for a, b, c, d in zip(pos1, quat1, pos0, quat0)]
+        assert np.allclose(pos, [e[0] for e in expected], atol=1e-5)
+        _assert_same_rotations(quat, [e[1] for e in expected], atol=1e-5)
+
+    # Leading dimensions broadcast
+    pos, quat = BT.pose_transform(pos1[0], quat1[0], pos0.reshape(5, 10, 3), quat0.reshape(5, 10, 4))
+    expected = [T.pose_transform(pos1[0], quat1[0], c, d) for c, d in zip(pos0, quat0)]
+    assert np.allclose(pos.reshape(N, 3), [e[0] for e in expected], atol=1e-5)
+    _assert_same_rotations(quat.reshape(N, 4), [e[1] for e in expected], atol=1e-5)
+
+
+def test_rotation_conversions_match_single(backend):
+    rng = np.random.default_rng(5)
+    _, quats = _random_pos_quats(rng)
+    mats = BT.quat2mat(quats)
+    assert np.allclose(mats, [T.quat2mat(q) for q in quats])
+    assert np.allclose(BT.mat2quat(mats), [T.mat2quat(mat) for mat in mats])
+    _assert_same_rotations(BT.mat2quat(mats), quats)
+    # Homogeneous matrices are accepted as well
+    assert np.allclose(BT.mat2quat(BT.pose2mat(np.zeros(3), quats)), BT.mat2quat(mats))
+
+
+def test_quat_slerp_matches_single(backend):
+    rng = np.random.default_rng(6)
+    _, quat0 = _random_pos_quats(rng)
+    _, quat1 = _random_pos_quats(rng)
+    # Include identical and opposite quaternions, which are degenerate cases
+    quat1[:2] = quat0[:2]
+    quat1[2] = -quat0[2]
+    for fraction in (0.0, 0.3, 1.0):
+        for shortestpath in (True, False):
+            assert np.allclose(BT.quat_slerp(quat0, quat1, fraction, shortestpath=shortestpath),
+                               [T.quat_slerp(a, b, fraction, shortestpath=shortestpath) for a, b in zip(quat0, quat1)])
+    fractions = rng.uniform(size=N)
+    assert np.allclose(BT.quat_slerp(quat0, quat1, fractions),
+                       [T.quat_slerp(a, b, f) for a, b, f in zip(quat0, quat1, fractions)])
+
+
+def test_numba_kernels_are_dispatched(monkeypatch):
+    if BT.numba is None:
+        pytest.skip("numba is not installed")
+    calls = []
+    kernel = BT._pose_transform_nb
+    monkeypatch.setattr(BT, "_pose_transform_nb", lambda *args: calls.append(len(args[0])) or kernel(*args))
+    rng = np.random.default_rng(7)
+    pos, quat = _random_pos_quats(rng, n=BT.m.NUMBA_MIN_BATCH_SIZE)
+
+    # Batches smaller than NUMBA_MIN_BATCH_SIZE, or with numba disabled, use the numpy kernels
+    BT.pose_transform(pos[1:], quat[1:], pos[1:], quat[1:])
+    monkeypatch.setattr(BT.m, "ENABLE_NUMBA", False)
+    BT.pose_transform(pos, quat, pos, quat)
+    assert calls == []
+    monkeypatch.setattr(BT.m, "ENABLE_NUMBA", True)
+    BT.pose_transform(pos, quat, pos, quat)
+    assert calls == [len(pos)]
+
+
+def test_pose_conversions_match_single():
+    rng = np.random.default_rng(0)
+    poses_A, poses_A_in_B = _random_poses(rng), _random_poses(rng)
+    assert np.allclose(BT.make_pose(poses_A[:, :3, 3], poses_A[:, :3, :3]), poses_A)
+    assert np.allclose(BT.pose_in_A_to_pose_in_B(poses_A, poses_A_in_B),
+                       [T.pose_in_A_to_pose_in_B(a, b) for a, b in zip(poses_A, poses_A_in_B)])
+    assert np.allclose(BT.matrix_inverse(poses_A), [T.matrix_inverse(a) for a in poses_A])
+    assert np.allclose(BT.get_pose_error(poses_A, poses_A_in_B),
+                       [T.get_pose_error(a, b) for a, b in zip(poses_A, poses_A_in_B)])
+
+    # Leading dimensions broadcast
+    pose_A_in_B = poses_A_in_B[0]
+    assert np.allclose(BT.pose_in_A_to_pose_in_B(poses_A.reshape(5, 10, 4, 4), pose_A_in_B).reshape(N, 4, 4),
+                       [T.pose_in_A_to_pose_in_B(a, pose_A_in_B) for a in poses_A])
+    assert BT.get_pose_error(poses_A.reshape(5, 10, 4, 4), pose_A_in_B).shape == (5, 10, 6)
+
+
+def test_vel_and_force_transforms_match_single():
+    rng = np.random.default_rng(1)
+    poses_A_in_B = _random_poses(rng)
+    lin, ang = rng.normal(size=(N, 3)), rng.normal(size=(N, 3))
+    for batched, single in ((BT.vel_in_A_to_vel_in_B, T.vel_in_A_to_vel_in_B),
+                            (BT.force_in_A_to_force_in_B, T.force_in_A_to_force_in_B)):
+        expected = [single(a, b, c) for a, b, c in zip(lin, ang, poses_A_in_B)]
+        lin_B, ang_B = batched(lin, ang, poses_A_in_B)
+        assert np.allclose(lin_B, [e[0] for e in expected])
+        assert np.allclose(ang_B, [e[1] for e in expected])
+
+
+def test_quat_sampling_and_conversions_match_single():
+    rng = np.random.default_rng(2)
+    rand = rng.uniform(size=(N, 3))
+    quats = BT.random_quat(rand)
+    assert np.allclose(quats, [T.random_quat(r) for r in rand], atol=1e-6)
+    assert np.allclose(np.linalg.norm(quats, axis=-1), 1.0)
+    assert BT.random_quat(shape=(4, 5)).shape == (4, 5, 4)
+
+    # The x-axis is rotated onto each vector, and the y-axis stays orthogonal to the up direction
+    vecs = rng.normal(size=(N, 3))
+    rots = BT.quat2mat(BT.vec2quat(vecs))
+    assert np.allclose(rots[..., 0], BT.unit_vector(vecs))
+    assert np.allclose(rots[..., 2, 1], 0.0)
+
+    # Vectors orthogonal to the up direction match the single version exactly
+    vecs[:, 2] = 0.0
+    for quat, expected in zip(BT.vec2quat(vecs), [T.vec2quat(v) for v in vecs]):
+        # Quaternions q and -q represent the same rotation
+        assert np.allclose(quat, expected) or np.allclose(quat, -expected)
@@ -0,0 +1,29 @@
+import os
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import omnigibson.utils.benchmark_utils as BU
+
+
+def _results(metadata, times):
+    results = {case_id: dict(name=case_id, status="ok", tolerance=None, median=time) for case_id, time in times.items()}
+    return dict(metadata=metadata, results=results)
+
+
+def test_metadata_mismatches():
+    metadata = dict(hostname="a", machine="x86_64", processor="", cpu_count=8, python="3.7.16",
+                    packages=dict(numpy="1.21.0"))
+    # Host names and unlisted keys do not affect comparability
+    assert BU.get_metadata_mismatches(metadata, dict(metadata, hostname="b", timestamp="now")) == dict()
+    assert BU.get_metadata_mismatches(metadata, dict(metadata, cpu_count=1, packages=dict(numpy="2.4.6"))) == \
+        dict(cpu_count=(8, 1), packages=(dict(numpy="1.21.0"), dict(numpy="2.4.6")))
+    assert BU.get_metadata_mismatches(metadata, dict(), keys=["python"]) == dict(python=("3.7.16", None))
+
+
+def test_compare_to_baseline():
+    baseline = _results(dict(), dict(same=1.0, slower=1.0, faster=1.0, missing=1.0))
+    results = _results(dict(), dict(same=1.1, slower=1.3, faster=0.5, new=1.0))
+    statuses = {c["id"]: c["status"] for c in BU.compare_to_baseline(results, baseline, tolerance=0.25)}
+    assert statuses == dict(same="ok", slower="regression", faster="improvement", new="new", missing="missing")
+    statuses = {c["id"]: c["status"] for c in BU.compare_to_baseline(results, baseline, tolerances=dict(slower=0.5))}
+    assert statuses["slower"] == "ok"
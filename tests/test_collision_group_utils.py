@@ -0,0 +1,128 @@
+import os
+import sys
+from itertools import combinations
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmark"))
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+from benchmark_collision_groups import MockCollisionGroupBackend, MockStage, _load_groups, _load_pairwise, _make_objects
+from omnigibson.utils.collision_group_utils import CollisionGroupRegistry, FIXED_BASE_COLLISION_GROUP, \
+    update_fixed_base_collision_group
+
+N_OBJECTS = 40
+N_UPDATES = 200
+SEED = 0
+
+
+def _check_semantics(objects, registry, present):
+    # Every pair of links (and of their nested collision meshes) is filtered the same way by both approaches
+    links = [link for obj in objects if obj.name in present for link in obj.links.values()]
+    for link_a, link_b in combinations(links, 2):
+        pairwise = link_a.has_filtered_collision_pair(link_b)
+        assert pairwise == link_b.has_filtered_collision_pair(link_a)
+        assert registry.is_filtered(link_a.prim_path, link_b.prim_path) == pairwise
+        assert registry.is_filtered(f"{link_a.prim_path}/collisions", f"{link_b.prim_path}/collisions") == pairwise
+
+
+def _check_backend(stage, registry):
+    # The authored groups match the registry
+    if not registry.has_group(FIXED_BASE_COLLISION_GROUP):
+        assert stage.n_targets == 0
+        return
+    group_path = MockCollisionGroupBackend.get_group_path(FIXED_BASE_COLLISION_GROUP)
+    assert set(stage.get_targets(group_path, "collection:colliders:includes")) == \
+        registry.get_members(FIXED_BASE_COLLISION_GROUP)
+    # With inverted filtering, the fixed root links group lists the groups it collides with, i.e.: none
+    assert stage.get_targets(group_path, "physics:filteredGroups") == ([] if registry.invert_filter else [group_path])
+    assert stage.n_targets == registry.n_relationship_targets
+
+
+@pytest.mark.parametrize("invert_filter", [True, False])
+def test_group_filters_match_pairwise_filters_on_load(invert_filter):
+    pairwise_stage, group_stage = MockStage(), MockStage()
+    pairwise_objects = _make_objects(pairwise_stage, N_OBJECTS, np.random.default_rng(SEED))
+    group_objects = _make_objects(group_stage, N_OBJECTS, np.random.default_rng(SEED))
+    registry = CollisionGroupRegistry(backend=MockCollisionGroupBackend(group_stage), invert_filter=invert_filter)
+    _load_pairwise(pairwise_objects)
+    _load_groups(registry, group_objects)
+
+    _check_semantics(pairwise_objects, registry, present={obj.name for obj in pairwise_objects})
+    _check_backend(group_stage, registry)
+    n_fixed = sum(obj.fixed_base for obj in group_objects)
+    # Pairwise filters author a quadratic no. of relationship targets, while the group authors one per fixed object
+    assert pairwise_stage.n_targets == n_fixed * (n_fixed - 1)
+    assert group_stage.n_targets == n_fixed + (0 if invert_filter else 1)
+
+
+@pytest.mark.parametrize("invert_filter", [True, False])
+def test_group_filters_match_pairwise_filters_through_updates(invert_filter):
+    rng = np.random.default_rng(SEED)
+    pairwise_stage, group_stage = MockStage(), MockStage()
+    pairwise_objects = _make_objects(pairwise_stage, N_OBJECTS, np.random.default_rng(SEED))
+    group_objects = _make_objects(group_stage, N_OBJECTS, np.random.default_rng(SEED))
+    registry = CollisionGroupRegistry(backend=MockCollisionGroupBackend(group_stage), invert_filter=invert_filter)
+    present = set()
+
+    def update_pairwise(obj, fixed):
+        # Incremental version of the pairwise filters, between the root links of all present fixed objects
+        for other in pairwise_objects:
+            if other is not obj and other.name in present and other.fixed_base:
+                if fixed:
+                    obj.root_link.add_filtered_collision_pair(other.root_link)
+                else:
+                    obj.root_link.remove_filtered_collision_pair(other.root_link)
+
+    # Random sequence of objects being added, removed, or changing whether they belong to the group
+    for step in range(N_UPDATES):
+        i = int(rng.integers(0, N_OBJECTS))
+        pairwise_obj, group_obj = pairwise_objects[i], group_objects[i]
+        action = "add" if pairwise_obj.name not in present else ("remove" if rng.random() < 0.3 else "toggle")
+        if action == "toggle":
+            update_pairwise(pairwise_obj, fixed=False)
+            pairwise_obj.fixed_base = group_obj.fixed_base = not pairwise_obj.fixed_base
+        if action in {"add", "toggle"}:
+            present.add(pairwise_obj.name)
+            update_pairwise(pairwise_obj, fixed=pairwise_obj.fixed_base)
+            update_fixed_base_collision_group(registry, group_obj.root_link.prim_path, group_obj.fixed_base)
+        else:
+            update_pairwise(pairwise_obj, fixed=False)
+            present.remove(pairwise_obj.name)
+            update_fixed_base_collision_group(registry, group_obj.root_link.prim_path, False)
+        if step % 20 == 0 or step == N_UPDATES - 1:
+            members = registry.get_members(FIXED_BASE_COLLISION_GROUP) \
+                if registry.has_group(FIXED_BASE_COLLISION_GROUP) else set()
+            for obj in group_objects:
+                assert (obj.root_link.prim_path in members) == (obj.name in present and obj.fixed_base)
+            # Compare on the pairwise objects, whose links hold the pairwise filters
+            _check_semantics(pairwise_objects, registry, present)
+            _check_backend(group_stage, registry)
+
+    # Removing the group restores collisions between all links
+    registry.clear()
+    assert group_stage.n_targets == 0 and not registry.is_filtered("/World/obj0/link0", "/World/obj1/link0")
+
+
+@pytest.mark.parametrize("invert_filter", [True, False])
+def test_group_level_filters(invert_filter):
+    stage = MockStage()
+    registry = CollisionGroupRegistry(backend=MockCollisionGroupBackend(stage), invert_filter=invert_filter)
+    for name in ("a", "b", "c"):
+        registry.create_group(name)
+    registry.add_member("a", "/World/x")
+    registry.add_member("b", "/World/y")
+    registry.add_member("c", "/World/z")
+    registry.set_groups_filtered("a", "b", True)
+    assert registry.is_filtered("/World/x/link", "/World/y") and not registry.is_filtered("/World/x", "/World/z")
+    # Prims without groups collide with everything
+    assert not registry.is_filtered("/World/x", "/World/w")
+    assert stage.n_targets == registry.n_relationship_targets
+
+    registry.remove_group("b")
+    assert not registry.is_filtered("/World/x", "/World/y") and stage.n_targets == registry.n_relationship_targets
+    registry.set_groups_filtered("a", "c", True)
+    registry.set_groups_filtered("a", "c", False)
+    assert stage.n_targets == registry.n_relationship_targets
@@ -0,0 +1,255 @@
+import os
+from collections import Counter
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+from omnigibson.controllers.controller_base import ControlType
+from omnigibson.utils import control_deployment_utils
+from omnigibson.utils.control_deployment_utils import ControlDeploymentMixin
+
+P, V, E = ControlType.POSITION, ControlType.VELOCITY, ControlType.EFFORT
+
+# Default controllers of the included robots, mapping each controller to its DOF indices and motor type, as configured
+# by the robot classes. Fetch and Tiago control their trunk with the (left) arm controller, and Tiago's base only
+# controls its x, y and yaw joints, leaving the other three base joints uncontrolled
+ROBOT_CONTROLLERS = {
+    "Fetch": (14, {
+        "base": ([0, 1], "velocity"),                              # DifferentialDriveController
+        "camera": ([3, 5], "velocity"),                            # JointController
+        "arm_0": ([2, 4, 6, 7, 8, 9, 10, 11], "velocity"),         # InverseKinematicsController
+        "gripper_0": ([12, 13], "position"),                       # MultiFingerGripperController
+    }),
+    "Tiago": (27, {
+        "base": ([0, 1, 5], "velocity"),                           # JointController
+        "camera": ([9, 12], "velocity"),                           # JointController
+        "arm_left": ([6, 7, 10, 13, 15, 17, 19, 21], "velocity"),  # InverseKinematicsController
+        "arm_right": ([8, 11, 14, 16, 18, 20, 22], "velocity"),    # InverseKinematicsController
+        "gripper_left": ([23, 24], "position"),                    # MultiFingerGripperController
+        "gripper_right": ([25, 26], "position"),                   # MultiFingerGripperController
+    }),
+    "Locobot": (2, {
+        "base": ([1, 0], "velocity"),                              # DifferentialDriveController
+    }),
+    "Turtlebot": (2, {
+        "base": ([0, 1], "velocity"),                              # DifferentialDriveController
+    }),
+}
+
+
+class MockDynamicControl:
+    """
+    Stand-in for the dynamic control interface of a single articulation, counting all calls made to it
+    """
+
+    def __init__(self, n_dof, rng):
+        self.calls = Counter()
+        self.position_targets = np.zeros(n_dof, dtype=np.float32)
+        self.velocity_targets = np.zeros(n_dof, dtype=np.float32)
+        # Efforts commanded to each DOF, and the (different) efforts measured on each DOF
+        self.commanded_efforts = np.zeros(n_dof, dtype=np.float32)
+        self.measured_efforts = rng.uniform(-10.0, 10.0, n_dof).astype(np.float32)
+
+    def __getattr__(self, name):
+        raise AssertionError(f"Unexpected dynamic control call: {name}")
+
+    def _count(self, name):
+        self.calls[name] += 1
+
+    def set_dof_position_target(self, dof_handle, value):
+        self._count("set_dof_position_target")
+        self.position_targets[dof_handle] = value
+
+    def set_dof_velocity_target(self, dof_handle, value):
+        self._count("set_dof_velocity_target")
+        self.velocity_targets[dof_handle] = value
+
+    def set_dof_effort(self, dof_handle, value):
+        self._count("set_dof_effort")
+        self.commanded_efforts[dof_handle] = value
+
+    def get_articulation_dof_position_targets(self, handle):
+        self._count("get_articulation_dof_position_targets")
+        return self.position_targets.copy()
+
+    def get_articulation_dof_velocity_targets(self, handle):
+        self._count("get_articulation_dof_velocity_targets")
+        return self.velocity_targets.copy()
+
+    def get_articulation_dof_efforts(self, handle):
+        self._count("get_articulation_dof_efforts")
+        return self.measured_efforts.copy()
+
+    def set_articulation_dof_position_targets(self, handle, values):
+        self._count("set_articulation_dof_position_targets")
+        self.position_targets[:] = values
+
+    def set_articulation_dof_velocity_targets(self, handle, values):
+        self._count("set_articulation_dof_velocity_targets")
+        self.velocity_targets[:] = values
+
+    def set_articulation_dof_efforts(self, handle, values):
+        self._count("set_articulation_dof_efforts")
+        self.commanded_efforts[:] = values
+
+
+class MockJoint:
+    """
+    Mirrors the target and effort setters of JointPrim, on DOFs whose handles are their articulation DOF indices
+    """
+
+    def __init__(self, name, dc, dof_handles, control_type):
+        self.name = name
+        self._dc = dc
+        self._dof_handles = list(dof_handles)
+        self.n_dof = len(self._dof_handles)
+        self.control_type = control_type
+
+    def set_pos(self, pos, normalized=False, target=False):
+        for dof_handle, p in zip(self._dof_handles, np.atleast_1d(pos)):
+            self._dc.set_dof_position_target(dof_handle, p)
+
+    def set_vel(self, vel, normalized=False, target=False):
+        for dof_handle, v in zip(self._dof_handles, np.atleast_1d(vel)):
+            self._dc.set_dof_velocity_target(dof_handle, v)
+
+    def set_effort(self, effort, normalized=False):
+        for dof_handle, e in zip(self._dof_handles, np.atleast_1d(effort)):
+            self._dc.set_dof_effort(dof_handle, e)
+
+
+class MockArticulatedObject(ControlDeploymentMixin):
+    """
+    Articulated object deploying control on top of a mocked articulation whose DOF order differs from the object's DOF
+    order
+    """
+
+    _articulation_handle_valid = True
+
+    def __init__(self, joint_types, seed=0):
+        rng = np.random.default_rng(seed)
+        n_dof = sum(n for n, _ in joint_types)
+        self._dc = MockDynamicControl(n_dof=n_dof, rng=rng)
+        self._handle = 1
+        self._dof_to_articulation_idx = rng.permutation(n_dof)
+        self._joints = dict()
+        self._dof_to_joints = dict()
+        idx = 0
+        for i, (joint_n_dof, control_type) in enumerate(joint_types):
+            dof_idx = list(range(idx, idx + joint_n_dof))
+            joint = MockJoint(f"joint{i}", self._dc, self._dof_to_articulation_idx[dof_idx], control_type)
+            self._joints[joint.name] = joint
+            self._dof_to_joints.update({j: joint for j in dof_idx})
+            idx += joint_n_dof
+        self.n_dof = n_dof
+        self._control_groups = None
+        self._control_groups_types = None
+        self._effort_joint_groups = None
+
+    @property
+    def control_type(self):
+        return np.concatenate([[joint.control_type] * joint.n_dof for joint in self._joints.values()])
+
+
+def _robot_control_type(robot_name):
+    # Uncontrolled DOFs are effort-controlled, as set up by ControllableObject when loading its controllers
+    n_dof, controllers = ROBOT_CONTROLLERS[robot_name]
+    control_type = np.array([E] * n_dof)
+    for dof_idx, motor_type in controllers.values():
+        control_type[dof_idx] = ControlType.get_type(motor_type)
+    return control_type
+
+
+def _deploy(obj, control, vectorized, monkeypatch, **kwargs):
+    monkeypatch.setattr(control_deployment_utils.m, "VECTORIZE_CONTROL", vectorized)
+    obj._dc.calls.clear()
+    obj.deploy_control(control=control, control_type=obj.control_type, **kwargs)
+    return dict(obj._dc.calls)
+
+
+def _check_deployment_matches(joint_types, expected_calls, monkeypatch):
+    legacy_obj = MockArticulatedObject(joint_types)
+    vectorized_obj = MockArticulatedObject(joint_types)
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        control = rng.uniform(-1.0, 1.0, legacy_obj.n_dof)
+        legacy_calls = _deploy(legacy_obj, control, vectorized=False, monkeypatch=monkeypatch)
+        vectorized_calls = _deploy(vectorized_obj, control, vectorized=True, monkeypatch=monkeypatch)
+
+        # Joint by joint, every DOF is written with its own call
+        assert sum(legacy_calls.values()) == legacy_obj.n_dof
+        assert vectorized_calls == expected_calls
+
+        # Both paths write exactly the same targets and efforts, in articulation order
+        articulation_control = np.zeros(legacy_obj.n_dof, dtype=np.float32)
+        articulation_control[legacy_obj._dof_to_articulation_idx] = control
+        control_type = np.zeros(legacy_obj.n_dof, dtype=int)
+        control_type[legacy_obj._dof_to_articulation_idx] = legacy_obj.control_type
+        for obj in (legacy_obj, vectorized_obj):
+            for ctrl_type, values in ((P, obj._dc.position_targets), (V, obj._dc.velocity_targets),
+                                      (E, obj._dc.commanded_efforts)):
+                controlled = control_type == ctrl_type
+                assert np.array_equal(values[controlled], articulation_control[controlled])
+                # DOFs controlled otherwise are never written to
+                assert np.all(values[~controlled] == 0.0)
+        assert np.array_equal(legacy_obj._dc.position_targets, vectorized_obj._dc.position_targets)
+        assert np.array_equal(legacy_obj._dc.velocity_targets, vectorized_obj._dc.velocity_targets)
+        assert np.array_equal(legacy_obj._dc.commanded_efforts, vectorized_obj._dc.commanded_efforts)
+
+
+@pytest.mark.parametrize("joint_types, expected_calls", [
+    (
+        [(1, P), (2, P), (1, P)],
+        {"set_articulation_dof_position_targets": 1},
+    ),
+    (
+        [(2, E), (1, E)],
+        {"set_articulation_dof_efforts": 1},
+    ),
+    (
+        [(1, P), (2, V), (1, E), (1, P), (1, E)],
+        {"get_articulation_dof_position_targets": 1, "set_articulation_dof_position_targets": 1,
+         "get_articulation_dof_velocity_targets": 1, "set_articulation_dof_velocity_targets": 1,
+         "set_dof_effort": 2},
+    ),
+])
+def test_vectorized_control_matches_per_joint_control(joint_types, expected_calls, monkeypatch):
+    _check_deployment_matches(joint_types, expected_calls, monkeypatch)
+
+
+@pytest.mark.parametrize("robot_name, expected_calls", [
+    (
+        "Fetch",
+        {"get_articulation_dof_position_targets": 1, "set_articulation_dof_position_targets": 1,
+         "get_articulation_dof_velocity_targets": 1, "set_articulation_dof_velocity_targets": 1},
+    ),
+    (
+        "Tiago",
+        {"get_articulation_dof_position_targets": 1, "set_articulation_dof_position_targets": 1,
+         "get_articulation_dof_velocity_targets": 1, "set_articulation_dof_velocity_targets": 1,
+         "set_dof_effort": 3},
+    ),
+    ("Locobot", {"set_articulation_dof_velocity_targets": 1}),
+    ("Turtlebot", {"set_articulation_dof_velocity_targets": 1}),
+])
+def test_vectorized_control_matches_per_joint_control_on_robots(robot_name, expected_calls, monkeypatch):
+    joint_types = [(1, control_type) for control_type in _robot_control_type(robot_name)]
+    _check_deployment_matches(joint_types, expected_calls, monkeypatch)
+
+
+def test_indexed_or_normalized_control_is_deployed_per_joint(monkeypatch):
+    obj = MockArticulatedObject([(1, P), (2, V), (1, E)])
+    n_calls = _deploy(obj, np.ones(obj.n_dof), vectorized=True, monkeypatch=monkeypatch, normalized=True)
+    assert sum(n_calls.values()) == obj.n_dof
+    n_calls = _deploy(obj, np.ones(obj.n_dof), vectorized=True, monkeypatch=monkeypatch, indices=np.arange(obj.n_dof))
+    assert sum(n_calls.values()) == obj.n_dof
+
+
+def test_partial_effort_group_does_not_write_measured_efforts(monkeypatch):
+    obj = MockArticulatedObject([(1, P), (1, E), (2, P)])
+    _deploy(obj, np.ones(obj.n_dof), vectorized=True, monkeypatch=monkeypatch)
+    assert obj._dc.calls["get_articulation_dof_efforts"] == 0
+    assert obj._dc.calls["set_articulation_dof_efforts"] == 0
+    assert np.count_nonzero(obj._dc.commanded_efforts) == 1
@@ -0,0 +1,120 @@
+import json
+import os
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import pytest
+
+from omnigibson.utils import dataset_index_utils
+from omnigibson.utils.dataset_index_utils import DatasetIndex
+
+ABILITIES = {"apple": {"sliceable": dict()}, "table": dict()}
+
+
+def _write_model(dataset_path, category, model, metadata=None):
+    model_path = os.path.join(dataset_path, "objects", category, model)
+    os.makedirs(os.path.join(model_path, "usd"))
+    open(os.path.join(model_path, "usd", f"{model}.usd"), "w").close()
+    if metadata is not None:
+        os.makedirs(os.path.join(model_path, "misc"))
+        with open(os.path.join(model_path, "misc", "metadata.json"), "w") as f:
+            json.dump(metadata, f)
+    return model_path
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    dataset_path = str(tmp_path / "dataset")
+    _write_model(dataset_path, "apple", "a1", metadata={"bbox_size": [0.1, 0.1, 0.1], "meta_links": {}})
+    _write_model(dataset_path, "apple", "a0", metadata={"bbox_size": [0.2, 0.2, 0.2]})
+    _write_model(dataset_path, "table", "t0")
+    os.makedirs(os.path.join(dataset_path, "objects", ".hidden"))
+    os.makedirs(os.path.join(dataset_path, "metadata"))
+    with open(os.path.join(dataset_path, "metadata", "categories.txt"), "w") as f:
+        f.write("apple\ntable\n")
+    return dataset_path
+
+
+def _load(dataset_path, tmp_path, **kwargs):
+    return DatasetIndex.load(dataset_path, cache_dir=str(tmp_path / "cache"),
+                             category_abilities_fn=lambda category: ABILITIES[category], **kwargs)
+
+
+def test_find_models(dataset_path, tmp_path):
+    index = _load(dataset_path, tmp_path)
+    assert index.categories == ["apple", "table"]
+    assert index.n_models == 3
+    assert index.get_models("apple") == ["a0", "a1"]
+    assert index.get_usd_files("apple", "a1") == ["a1.usd"]
+    assert index.get_model_metadata("table", "t0") is None
+    assert index.category_ids == ["apple", "table"]
+    assert index.avg_category_specs is None
+
+    assert index.find_models() == [("apple", "a0"), ("apple", "a1"), ("table", "t0")]
+    assert index.find_models(categories="table") == [("table", "t0")]
+    assert index.find_models(categories=["table", "missing"]) == [("table", "t0")]
+    assert index.find_models(ability="sliceable") == [("apple", "a0"), ("apple", "a1")]
+    assert index.find_models(has_fields=["bbox_size"]) == [("apple", "a0"), ("apple", "a1")]
+    assert index.find_models(has_fields=["bbox_size", "meta_links"]) == [("apple", "a1")]
+    assert index.find_models(lacks_fields=["meta_links"]) == [("apple", "a0"), ("table", "t0")]
+    assert index.find_models(filter_fn=lambda category, model, metadata: model.endswith("0")) == \
+        [("apple", "a0"), ("table", "t0")]
+
+
+def test_index_invalidation(dataset_path, tmp_path, monkeypatch):
+    index_path = DatasetIndex.get_index_path(dataset_path, cache_dir=str(tmp_path / "cache"))
+    _load(dataset_path, tmp_path)
+    assert os.path.exists(index_path)
+
+    # An unchanged dataset is loaded from disk without scanning it
+    scan = DatasetIndex.scan
+    n_scans = [0]
+
+    def counting_scan(path):
+        n_scans[0] += 1
+        return scan(path)
+
+    monkeypatch.setattr(DatasetIndex, "scan", staticmethod(counting_scan))
+    assert _load(dataset_path, tmp_path).n_models == 3
+    assert n_scans[0] == 0
+
+    # Adding a model changes its category directory
+    _write_model(dataset_path, "table", "t1")
+    _bump_mtime(os.path.join(dataset_path, "objects", "table"))
+    assert _load(dataset_path, tmp_path).get_models("table") == ["t0", "t1"]
+    assert n_scans[0] == 1
+
+    # Editing a model's metadata is only detected when validating individual files
+    metadata_path = os.path.join(dataset_path, "objects", "apple", "a0", "misc", "metadata.json")
+    with open(metadata_path, "w") as f:
+        json.dump({"bbox_size": [0.3, 0.3, 0.3]}, f)
+    _bump_mtime(metadata_path)
+    assert _load(dataset_path, tmp_path).get_model_metadata("apple", "a0") == {"bbox_size": [0.2, 0.2, 0.2]}
+    assert _load(dataset_path, tmp_path, validation_mode="files").get_model_metadata("apple", "a0") == \
+        {"bbox_size": [0.3, 0.3, 0.3]}
+    assert n_scans[0] == 2
+
+    # Indices stored with another format version are rebuilt
+    monkeypatch.setattr(dataset_index_utils.m, "INDEX_VERSION", dataset_index_utils.m.INDEX_VERSION + 1)
+    _load(dataset_path, tmp_path)
+    assert n_scans[0] == 3
+
+    # Corrupted indices are rebuilt
+    with open(index_path, "wb") as f:
+        f.write(b"corrupted")
+    assert _load(dataset_path, tmp_path).n_models == 4
+    assert n_scans[0] == 4
+
+
+def test_save_failure_is_not_fatal(dataset_path, tmp_path, caplog):
+    # The cache directory cannot be created below a regular file
+    cache_file = tmp_path / "cache"
+    cache_file.write_text("")
+    index = _load(dataset_path, tmp_path)
+    assert index.n_models == 3
+    assert "Could not save dataset index" in caplog.text
@@ -0,0 +1,11 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmark"))
+
+import benchmark_import_time
+
+
+def test_import_time_budgets():
+    failures = benchmark_import_time.check_import_times()
+    assert len(failures) == 0, "\n".join(failures)
@@ -0,0 +1,82 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmark"))
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmark_occupancy_grid import HORIZONTAL_FOV, HORIZONTAL_RESOLUTION, _VectorizedGrid, _legacy_grid, \
+    _random_inputs
+from omnigibson.utils.constants import OccupancyGridState
+from omnigibson.utils.occupancy_grid_utils import FREESPACE_VALUE, OBSTACLES_VALUE, UNKNOWN_VALUE, \
+    OccupancyGridRasterizer, get_beam_directions, stamp_disks
+
+RESOLUTION = 128
+GRID_RANGE = 5.0
+INNER_RADIUS = int(0.5 * RESOLUTION / GRID_RANGE)
+N_GRIDS = 20
+N_ACCUMULATED_SCANS = 5
+
+
+def _circle_scan(radius, center=(0.0, 0.0)):
+    return np.array(center) + get_beam_directions(360.0, 1.0)[:, :2] * radius
+
+
+def test_stamp_disks_matches_cv2():
+    rng = np.random.default_rng(0)
+    centers = rng.integers(-5, RESOLUTION + 5, size=(200, 2))
+    grid = np.zeros((RESOLUTION, RESOLUTION), dtype=np.uint8)
+    stamp_disks(grid=grid, centers=centers, radius=2, value=7)
+    expected = np.zeros_like(grid)
+    for x, y in centers:
+        cv2.circle(img=expected, center=(int(x), int(y)), radius=2, color=7, thickness=-1)
+    assert np.array_equal(grid, expected)
+
+
+def test_single_scan():
+    rasterizer = OccupancyGridRasterizer(resolution=RESOLUTION, grid_range=GRID_RANGE, inner_radius=INNER_RADIUS)
+    hits = _circle_scan(2.0)
+    grid = rasterizer.rasterize(scans=[(np.zeros(2), hits)])
+    center = RESOLUTION // 2
+    assert grid[center, center] == FREESPACE_VALUE
+    assert grid[0, 0] == UNKNOWN_VALUE
+    # Hits lie on the boundary of the free space polygon, with obstacles right beyond them
+    for direction in get_beam_directions(360.0, 30.0)[:, :2]:
+        x, y = rasterizer.to_grid((direction * 2.05)[None])[0]
+        assert grid[y, x] == OBSTACLES_VALUE
+
+
+def test_past_scan_origins_are_not_obstacles():
+    rasterizer = OccupancyGridRasterizer(resolution=RESOLUTION, grid_range=GRID_RANGE, inner_radius=INNER_RADIUS)
+    # A past origin far outside the current scan keeps its past free space, and no obstacle is stamped there
+    past_origin = np.array([0.0, 2.0])
+    scans = [(past_origin, _circle_scan(0.4, center=past_origin)), (np.zeros(2), _circle_scan(1.0))]
+    grid = rasterizer.rasterize(scans=scans)
+    x, y = rasterizer.to_grid(past_origin[None])[0]
+    assert grid[y, x] == FREESPACE_VALUE, "A past scan origin was marked as an obstacle!"
+    # Hits of the past scan are still obstacles
+    x, y = rasterizer.to_grid(past_origin[None] + np.array([[0.0, 0.45]]))[0]
+    assert grid[y, x] == OBSTACLES_VALUE
+
+
+@pytest.mark.parametrize("resolution", [64, 128, 256])
+def test_grids_match_legacy(resolution):
+    rng = np.random.default_rng(resolution)
+    n_rays = len(get_beam_directions(HORIZONTAL_FOV, HORIZONTAL_RESOLUTION))
+    inputs = [inp[:N_GRIDS] for inp in _random_inputs(rng, n_rays)]
+    inner_radius = int(0.5 * resolution / GRID_RANGE)
+    vectorized = _VectorizedGrid(resolution, inner_radius, n_scans=1)
+    accumulated = _VectorizedGrid(resolution, inner_radius, n_scans=N_ACCUMULATED_SCANS)
+    for args in zip(*inputs):
+        legacy_grid = _legacy_grid(*args, resolution=resolution, inner_radius=inner_radius)
+        grid = vectorized(*args)
+        assert grid.dtype == legacy_grid.dtype and np.array_equal(grid, legacy_grid)
+
+        # The current scan takes precedence: pixels observed by it are unchanged by accumulation
+        accumulated_grid = accumulated(*args)
+        observed = grid != OccupancyGridState.UNKNOWN
+        assert np.array_equal(grid[observed], accumulated_grid[observed])
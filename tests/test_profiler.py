@@ -0,0 +1,11 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmark"))
+
+import benchmark_profiler
+
+
+def test_profiler_nesting_and_overhead():
+    # Checks the nesting of all timers, the exported trace and memory tracking, and bounds the profiler's overhead
+    benchmark_profiler.main()
@@ -0,0 +1,206 @@
+import os
+from types import SimpleNamespace
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+import trimesh
+
+import omnigibson as og
+import omnigibson.utils.transform_utils as T
+from omnigibson.utils import raycast_utils
+from omnigibson.utils.raycast_utils import MeshRaycastBackend, PhysXRaycastBackend, PrimPathInterner, \
+    get_raycast_backend, raycast_batch
+
+N_OBJS = 12
+N_RAYS = 300
+
+
+def _make_scene(interner, seed=0):
+    rng = np.random.default_rng(seed)
+    meshes = [trimesh.creation.icosphere(subdivisions=2, radius=0.3), trimesh.creation.box(extents=(0.8, 0.2, 0.5))]
+    backend = MeshRaycastBackend(interner=interner)
+    objs = []
+    for i in range(N_OBJS):
+        mesh = meshes[i % len(meshes)]
+        pos, quat = rng.uniform(-1.5, 1.5, 3), T.random_quat(rng.uniform(size=3))
+        body, collision = f"/World/obj{i}/base_link", f"/World/obj{i}/base_link/collisions"
+        backend.add_mesh(rigid_body=body, collision=collision, vertices=mesh.vertices, faces=mesh.faces,
+                         position=pos, orientation=quat)
+        objs.append((body, collision, mesh, pos, quat))
+    return backend, objs
+
+
+def _make_rays(seed=1):
+    rng = np.random.default_rng(seed)
+    starts = rng.uniform(-3.0, 3.0, (N_RAYS, 3))
+    ends = rng.uniform(-3.0, 3.0, (N_RAYS, 3))
+    return starts, ends
+
+
+def _brute_force(objs, starts, ends, ignore=()):
+    # Closest hit of every ray against every triangle of every object, in the world frame
+    directions = ends - starts
+    lengths = np.linalg.norm(directions, axis=-1)
+    directions = directions / lengths[:, None]
+    hits = [[] for _ in range(len(starts))]
+    for body, collision, mesh, pos, quat in objs:
+        if body in ignore or collision in ignore:
+            continue
+        triangles = (mesh.triangles @ T.quat2mat(quat).T) + pos
+        v0, e1, e2 = triangles[:, 0], triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+        for i, (origin, direction) in enumerate(zip(starts, directions)):
+            p = np.cross(direction, e2)
+            det = np.einsum("ij,ij->i", e1, p)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                s = origin - v0
+                u = np.einsum("ij,ij->i", s, p) / det
+                q = np.cross(s, e1)
+                v = (q @ direction) / det
+                t = np.einsum("ij,ij->i", e2, q) / det
+            valid = (np.abs(det) > 1e-9) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= lengths[i])
+            if np.any(valid):
+                hits[i].append((t[valid].min(), body))
+    return [sorted(ray_hits) for ray_hits in hits]
+
+
+def _check_all_hits(results, expected):
+    assert not results.only_closest
+    for i, ray_hits in enumerate(expected):
+        idxs = np.nonzero(results.ray_indices == i)[0]
+        assert len(idxs) == len(ray_hits)
+        assert np.allclose(results.distances[idxs], [t for t, _ in ray_hits])
+        assert list(results.rigid_bodies[idxs]) == [body for _, body in ray_hits]
+
+
+def test_mesh_backend_matches_brute_force(monkeypatch):
+    interner = PrimPathInterner()
+    backend, objs = _make_scene(interner)
+    starts, ends = _make_rays()
+    expected = _brute_force(objs, starts, ends)
+    assert sum(len(ray_hits) > 0 for ray_hits in expected) > N_RAYS // 10
+
+    closest = raycast_batch(starts, ends, backend=backend)
+    assert np.array_equal(closest.hit, [len(ray_hits) > 0 for ray_hits in expected])
+    assert np.allclose(closest.distances[closest.hit], [ray_hits[0][0] for ray_hits in expected if ray_hits])
+    assert list(closest.rigid_bodies[closest.hit]) == [ray_hits[0][1] for ray_hits in expected if ray_hits]
+    assert np.allclose(closest.positions[closest.hit], starts[closest.hit] + (
+        ends - starts)[closest.hit] / np.linalg.norm(ends - starts, axis=-1)[closest.hit, None] *
+        closest.distances[closest.hit, None])
+    # Normals are unit length and face back towards the ray origins
+    normals = closest.normals[closest.hit]
+    assert np.allclose(np.linalg.norm(normals, axis=-1), 1.0)
+    assert np.all(np.einsum("ij,ij->i", normals, (ends - starts)[closest.hit]) <= 0)
+
+    _check_all_hits(raycast_batch(starts, ends, only_closest=False, backend=backend), expected)
+
+    # Bounding the no. of pairs tested at once does not change the results
+    monkeypatch.setattr(raycast_utils.m, "MAX_RAY_TRIANGLE_PAIRS", 64)
+    _check_all_hits(raycast_batch(starts, ends, only_closest=False, backend=backend), expected)
+
+
+def test_mesh_backend_ignores_without_interning():
+    interner = PrimPathInterner()
+    backend, objs = _make_scene(interner)
+    starts, ends = _make_rays()
+    n_interned = len(interner)
+    ignore_bodies = [objs[0][0], "/World/unknown/base_link"]
+    ignore_collisions = [objs[1][1], "/World/unknown/base_link/collisions"]
+    results = raycast_batch(starts, ends, only_closest=False, ignore_bodies=ignore_bodies,
+                            ignore_collisions=ignore_collisions, backend=backend)
+    assert len(interner) == n_interned, "Ignored prim paths were interned!"
+    _check_all_hits(results, _brute_force(objs, starts, ends, ignore=ignore_bodies + ignore_collisions))
+
+
+def test_mesh_backend_pose_updates_and_removal():
+    interner = PrimPathInterner()
+    backend, objs = _make_scene(interner)
+    starts, ends = _make_rays()
+
+    # Move half of the objects, and remove a few of them
+    rng = np.random.default_rng(2)
+    moved = []
+    for body, collision, mesh, pos, quat in objs:
+        if rng.uniform() < 0.5:
+            pos, quat = rng.uniform(-1.5, 1.5, 3), T.random_quat(rng.uniform(size=3))
+        moved.append((body, collision, mesh, pos, quat))
+    backend.set_rigid_body_poses(
+        rigid_bodies=[obj[0] for obj in moved][::-1],
+        positions=[obj[3] for obj in moved][::-1],
+        orientations=[obj[4] for obj in moved][::-1],
+    )
+    backend.remove_rigid_bodies([moved[2][0], moved[5][0]])
+    assert backend.n_meshes == N_OBJS - 2
+    remaining = [obj for i, obj in enumerate(moved) if i not in (2, 5)]
+    _check_all_hits(raycast_batch(starts, ends, only_closest=False, backend=backend),
+                    _brute_force(remaining, starts, ends))
+
+
+class MockHit:
+    def __init__(self, distance, body):
+        self.distance = distance
+        self.position = np.array([distance, 0.0, 0.0])
+        self.normal = np.array([-1.0, 0.0, 0.0])
+        self.rigid_body = body
+        self.collision = f"{body}/collisions"
+
+
+class MockSceneQueryInterface:
+    """
+    Mimics omni's PhysX scene query interface, reporting a fixed set of hits (in random order) for every ray
+    """
+
+    def __init__(self, hits):
+        self.hits = hits
+        self.n_queries = 0
+
+    def _hits(self, distance):
+        self.n_queries += 1
+        return [MockHit(t, body) for t, body in self.hits if t <= distance]
+
+    def raycast_closest(self, origin, dir, distance):
+        hits = sorted(self._hits(distance), key=lambda hit: hit.distance)
+        if len(hits) == 0:
+            return {"hit": False}
+        return {"hit": True, "position": hits[0].position, "normal": hits[0].normal, "distance": hits[0].distance,
+                "rigidBody": hits[0].rigid_body, "collision": hits[0].collision}
+
+    def raycast_all(self, origin, dir, distance, reportFn):
+        for hit in self._hits(distance):
+            reportFn(hit)
+
+
+def test_physx_backend():
+    interner = PrimPathInterner()
+    sqi = MockSceneQueryInterface(hits=[(2.0, "/World/b"), (0.5, "/World/a"), (1.0, "/World/c")])
+    backend = PhysXRaycastBackend(scene_query_interface=sqi, interner=interner)
+    starts = np.zeros((4, 3))
+    ends = np.array([[0.1, 0, 0], [0.7, 0, 0], [1.5, 0, 0], [3.0, 0, 0]])
+
+    closest = raycast_batch(starts, ends, backend=backend)
+    assert sqi.n_queries == len(starts)
+    assert list(closest.hit) == [False, True, True, True]
+    assert list(closest.rigid_bodies) == [None, "/World/a", "/World/a", "/World/a"]
+    assert closest.to_dicts()[0] == {"hit": False}
+
+    results = raycast_batch(starts, ends, only_closest=False, backend=backend)
+    assert list(results.ray_indices) == [1, 2, 2, 3, 3, 3]
+    assert list(results.distances) == [0.5, 0.5, 1.0, 0.5, 1.0, 2.0]
+
+    n_interned = len(interner)
+    results = raycast_batch(starts, ends, ignore_bodies=["/World/a"], ignore_collisions=["/World/c/collisions"],
+                            backend=backend)
+    assert list(results.rigid_bodies) == [None, None, None, "/World/b"]
+    assert len(interner) == n_interned
+
+
+def test_default_backend(monkeypatch):
+    scene_backend = MeshRaycastBackend(interner=PrimPathInterner())
+    monkeypatch.setattr(og, "sim", SimpleNamespace(scene=SimpleNamespace(raycast_backend=scene_backend)),
+                        raising=False)
+    monkeypatch.setattr(raycast_utils, "_PHYSX_BACKEND", PhysXRaycastBackend(scene_query_interface=object()))
+    monkeypatch.setattr(raycast_utils.m, "USE_MESH_BACKEND", False)
+    assert isinstance(get_raycast_backend(), PhysXRaycastBackend)
+    monkeypatch.setattr(raycast_utils.m, "USE_MESH_BACKEND", True)
+    assert get_raycast_backend() is scene_backend
@@ -0,0 +1,122 @@
+import os
+from types import SimpleNamespace
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+import omnigibson as og
+from omnigibson.utils import snapshot_utils
+from omnigibson.utils.snapshot_utils import StateSnapshot, get_snapshot_scope
+from omnigibson.utils.spatial_utils import SpatialIndex
+
+
+class FakeObject:
+    """
+    Stand-in for a single-link object, whose serialized state is its position and linear velocity
+    """
+
+    def __init__(self, name, position, velocity=(0.0, 0.0, 0.0), kinematic_only=False):
+        self.name = name
+        self.position = np.array(position, dtype=np.float64)
+        self.velocity = np.array(velocity, dtype=np.float64)
+        self.kinematic_only = kinematic_only
+        self.n_dof = 0
+        self.links = {"base_link": SimpleNamespace(prim_path=f"/World/{name}/base_link")}
+
+    @property
+    def aabb(self):
+        return self.position - 0.1, self.position + 0.1
+
+    def get_linear_velocity(self):
+        return self.velocity
+
+    def get_angular_velocity(self):
+        return np.zeros(3)
+
+    def dump_state(self, serialized=False):
+        return np.concatenate([self.position, self.velocity])
+
+    def load_state(self, state, serialized=False):
+        self.position, self.velocity = state[:3].copy(), state[3:].copy()
+
+
+class FakeSystem:
+    def __init__(self, name, n_particles):
+        self.name = name
+        self.positions = np.zeros((n_particles, 3))
+
+    def dump_state(self, serialized=False):
+        return np.concatenate([[len(self.positions)], self.positions.flatten()])
+
+    def load_state(self, state, serialized=False):
+        self.positions = state[1:].reshape(-1, 3).copy()
+
+
+def _step_physics(scene, dt=0.1):
+    # Everything that is moving keeps moving, wherever it is
+    for obj in scene.objects:
+        if not obj.kinematic_only:
+            obj.position += obj.velocity * dt
+            obj.velocity[2] -= 9.81 * dt
+            if obj.position[2] <= 0.1:
+                obj.position[2], obj.velocity[:] = 0.1, 0.0
+    for system in scene.systems:
+        system.positions[:, 2] -= 0.01
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    objects = [
+        FakeObject("table", (0.0, 0.0, 0.1), kinematic_only=True),
+        FakeObject("apple", (0.0, 0.0, 1.0)),
+        FakeObject("resting", (0.3, 0.0, 0.1)),
+        FakeObject("far_resting", (20.0, 20.0, 0.1)),
+        FakeObject("far_falling", (-20.0, 20.0, 5.0), velocity=(0.0, 0.0, -1.0)),
+    ]
+    spatial_index = SpatialIndex()
+    for obj in objects:
+        lower, upper = obj.aabb
+        spatial_index.add(key=obj.links["base_link"].prim_path, lower=lower, upper=upper, owner=obj)
+    scene = SimpleNamespace(
+        objects=objects,
+        systems=[FakeSystem("water", n_particles=10)],
+        spatial_index=spatial_index,
+        link_resolver=SimpleNamespace(n_links=len(objects)),
+    )
+    monkeypatch.setattr(og, "sim", SimpleNamespace(scene=scene), raising=False)
+    monkeypatch.setattr(snapshot_utils.m, "USE_SCOPED_SNAPSHOTS", True)
+    return scene
+
+
+def _get(scene, name):
+    return next(obj for obj in scene.objects if obj.name == name)
+
+
+def test_scope_includes_awake_objects_and_systems(scene):
+    scope = get_snapshot_scope(objs=[_get(scene, "apple"), _get(scene, "table")], margin=0.5)
+    names = {getattr(obj, "name") for obj in scope}
+    assert {"apple", "table", "resting", "far_falling", "water"} <= names
+    assert "far_resting" not in names
+
+
+def test_restore_after_stepping_physics_restores_whole_scene(scene):
+    apple, table = _get(scene, "apple"), _get(scene, "table")
+    state = {obj: obj.dump_state() for obj in scene.objects + scene.systems}
+    snapshot = StateSnapshot(objs=get_snapshot_scope(objs=[apple, table], margin=0.5))
+
+    # A failed sampling trial moves the sampled object around and steps physics, which advances the entire scene
+    for position in ((200.0, 200.0, 200.0), (0.0, 0.0, 0.3)):
+        apple.position = np.array(position)
+        for _ in range(2):
+            _step_physics(scene)
+    snapshot.restore()
+
+    for obj, obj_state in state.items():
+        assert np.array_equal(obj.dump_state(), obj_state), f"{obj.name} was not restored!"
+
+
+def test_unscoped_snapshots_cover_objects_and_systems(scene, monkeypatch):
+    monkeypatch.setattr(snapshot_utils.m, "USE_SCOPED_SNAPSHOTS", False)
+    assert get_snapshot_scope(objs=[_get(scene, "apple")]) == scene.objects + scene.systems
@@ -0,0 +1,71 @@
+import os
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+
+from omnigibson.utils.spatial_utils import SpatialIndex, aabb_distance
+
+
+def _brute_force_knn(lowers, uppers, point, k):
+    dist = aabb_distance(np.asarray(point, dtype=np.float64)[None], lowers, uppers)[0]
+    order = np.lexsort((np.arange(len(dist)), dist))[:k]
+    return order.tolist(), dist[order]
+
+
+def test_knn_single_oversized_far_entry():
+    # An entry spanning too many cells to be hashed, far from the query point, must still be found
+    index = SpatialIndex(cell_size=0.5, max_cells_per_entry=8)
+    index.add(key="floor", lower=np.array([100.0, 100.0, 0.0]), upper=np.array([120.0, 120.0, 0.1]))
+    keys, dists = index.query_knn(np.zeros(3), 1)
+    assert keys[0] == ["floor"]
+    assert np.isclose(dists[0][0], np.linalg.norm([100.0, 100.0]))
+
+
+def test_knn_returns_k_when_all_entries_are_candidates():
+    index = SpatialIndex(cell_size=0.5, max_cells_per_entry=8)
+    index.add(key="near", lower=np.zeros(3), upper=np.full(3, 0.1))
+    index.add(key="far", lower=np.array([50.0, 0.0, 0.0]), upper=np.array([70.0, 20.0, 0.1]))
+    keys, dists = index.query_knn(np.zeros(3), 2)
+    assert keys[0] == ["near", "far"]
+    assert np.all(np.diff(dists[0]) >= 0)
+    # Asking for more entries than there are returns all of them
+    assert index.query_knn(np.zeros(3), 5)[0][0] == ["near", "far"]
+
+
+def test_knn_matches_brute_force():
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-10.0, 10.0, size=(300, 3))
+    half_sizes = rng.uniform(0.05, 0.3, size=(300, 3))
+    # A few oversized entries, e.g.: floors and walls
+    half_sizes[:5] *= 50.0
+    lowers, uppers = centers - half_sizes, centers + half_sizes
+    index = SpatialIndex(cell_size=0.5, max_cells_per_entry=64)
+    for i in range(len(centers)):
+        index.add(key=i, lower=lowers[i], upper=uppers[i])
+    for point in rng.uniform(-30.0, 30.0, size=(50, 3)):
+        for k in (1, 8, 300):
+            keys, dists = index.query_knn(point, k)
+            expected_keys, expected_dists = _brute_force_knn(lowers, uppers, point, k)
+            assert keys[0] == expected_keys
+            assert np.allclose(dists[0], expected_dists)
+
+
+def test_knn_owners_terminates_with_fewer_objects_than_k():
+    # Mirrors Scene.get_nearest_objects, which doubles the no. of queried links until k objects are found
+    index = SpatialIndex(cell_size=0.5, max_cells_per_entry=8)
+    for i in range(3):
+        for j in range(4):
+            index.add(key=(i, j), lower=np.full(3, 10.0 * i), upper=np.full(3, 10.0 * i + 0.1), owner=f"obj{i}")
+    index.add(key=("floor", 0), lower=np.array([-100.0, -100.0, -1.0]), upper=np.array([100.0, 100.0, -0.9]),
+              owner="floor")
+    k, n_total = 10, len(index)
+    n_links, n_queries = min(k, n_total), 0
+    while True:
+        n_queries += 1
+        objs = index.get_owners(index.query_knn(np.zeros(3), n_links)[0][0])
+        if len(objs) >= k or n_links >= n_total:
+            break
+        n_links = min(2 * n_links, n_total)
+    assert sorted(objs) == ["floor", "obj0", "obj1", "obj2"]
+    assert n_queries <= 2
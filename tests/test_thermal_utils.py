@@ -0,0 +1,204 @@
+import os
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+import omnigibson.utils.thermal_utils as TU
+
+SEEDS = (0, 1, 2, 3, 4)
+DT = 1 / 60.0
+AMBIENT_TEMPERATURE = 23.0
+DECAY_SPEED = 0.02
+IGNITION_TEMPERATURE = 200.0
+
+
+def _random_scene(seed, n_objs=30, n_sources=12):
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-2.0, 2.0, size=(n_objs, 3))
+    half_sizes = rng.uniform(0.2, 1.0, size=(n_sources, 3))
+    source_positions = rng.uniform(-2.0, 2.0, size=(n_sources, 3))
+    # Roughly half of the heat sources require the heated object to be inside of them. Their AABBs are centered at
+    # their own position, which is then replaced by NaNs
+    requires_inside = rng.random(n_sources) < 0.5
+    source_lowers, source_uppers = source_positions - half_sizes, source_positions + half_sizes
+    source_positions[requires_inside] = np.nan
+    # Inside additionally requires adjacency, which is stood in for by a random lookup table
+    inside_mask = TU.points_in_aabbs(positions, source_lowers, source_uppers) & (rng.random((n_objs, n_sources)) < 0.7)
+    # Heat sources either belong to one of the heated objects, or to none of them
+    owner_idxs = rng.integers(-1, n_objs, size=n_sources)
+    return dict(
+        temperatures=rng.uniform(-20.0, 300.0, size=n_objs),
+        positions=positions,
+        source_positions=source_positions,
+        source_distance_thresholds=rng.uniform(0.1, 2.0, size=n_sources),
+        source_owner_idxs=owner_idxs,
+        inside_mask=inside_mask,
+        source_temperatures=rng.uniform(-20.0, 1000.0, size=n_sources),
+        source_heating_rates=rng.uniform(0.01, 0.5, size=n_sources),
+    )
+
+
+def _reference_step(scene, is_active):
+    """
+    Updates one object at a time, as Temperature._update did before vectorization. Heat source activity is queried
+    through @is_active(j, temperatures) the first time an object other than the heat source's owner is updated, and
+    cached for the rest of the step
+    """
+    temperatures = scene["temperatures"].copy()
+    active = dict()
+    for i in range(len(temperatures)):
+        new_temperature = temperatures[i]
+        affected_by_heat_source = False
+        for j in range(len(scene["source_positions"])):
+            if scene["source_owner_idxs"][j] == i:
+                continue
+            if j not in active:
+                active[j] = is_active(j, temperatures)
+            if not active[j]:
+                continue
+            source_position = scene["source_positions"][j]
+            if np.any(np.isnan(source_position)):
+                if not scene["inside_mask"][i, j]:
+                    continue
+            elif np.linalg.norm(source_position - scene["positions"][i]) > scene["source_distance_thresholds"][j]:
+                continue
+            new_temperature += (scene["source_temperatures"][j] - temperatures[i]) * \
+                scene["source_heating_rates"][j] * DT
+            affected_by_heat_source = True
+        if not affected_by_heat_source:
+            new_temperature += (AMBIENT_TEMPERATURE - temperatures[i]) * DECAY_SPEED * DT
+        temperatures[i] = new_temperature
+    return temperatures
+
+
+def _batched_step(scene, is_active):
+    """
+    Updates all objects with the vectorized kernels, in the order of Temperature.batch_update: heat sources owned by
+    the first object are only evaluated after it has been updated
+    """
+    temperatures = scene["temperatures"].copy()
+    owner_idxs = scene["source_owner_idxs"]
+    active = np.zeros(len(owner_idxs), dtype=bool)
+
+    def update(start, stop):
+        affected = TU.compute_heat_source_contacts(
+            positions=scene["positions"][start:stop],
+            source_positions=scene["source_positions"],
+            source_distance_thresholds=scene["source_distance_thresholds"],
+            source_owner_idxs=owner_idxs - start,
+            inside_mask=scene["inside_mask"][start:stop],
+        )
+        temperatures[start:stop] = TU.compute_temperatures(
+            temperatures=temperatures[start:stop],
+            affected=affected & active[None],
+            source_temperatures=scene["source_temperatures"],
+            source_heating_rates=scene["source_heating_rates"],
+            dt=DT,
+            ambient_temperature=AMBIENT_TEMPERATURE,
+            decay_speed=DECAY_SPEED,
+        )
+
+    owned_by_first = owner_idxs == 0
+    for j in np.nonzero(~owned_by_first)[0]:
+        active[j] = is_active(j, temperatures)
+    update(0, 1)
+    for j in np.nonzero(owned_by_first)[0]:
+        active[j] = is_active(j, temperatures)
+    update(1, len(temperatures))
+    return temperatures
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_heat_source_contacts_match_reference(seed):
+    scene = _random_scene(seed)
+    affected = TU.compute_heat_source_contacts(
+        positions=scene["positions"],
+        source_positions=scene["source_positions"],
+        source_distance_thresholds=scene["source_distance_thresholds"],
+        source_owner_idxs=scene["source_owner_idxs"],
+        inside_mask=scene["inside_mask"],
+    )
+    n_objs, n_sources = scene["inside_mask"].shape
+    expected = np.zeros((n_objs, n_sources), dtype=bool)
+    for i in range(n_objs):
+        for j in range(n_sources):
+            if scene["source_owner_idxs"][j] == i:
+                continue
+            source_position = scene["source_positions"][j]
+            if np.any(np.isnan(source_position)):
+                expected[i, j] = scene["inside_mask"][i, j]
+            else:
+                dist = np.linalg.norm(source_position - scene["positions"][i])
+                expected[i, j] = dist <= scene["source_distance_thresholds"][j]
+    assert np.array_equal(affected, expected)
+    # Both kinds of heat sources affect some objects
+    has_position = ~np.any(np.isnan(scene["source_positions"]), axis=-1)
+    assert np.any(affected[:, has_position]) and np.any(affected[:, ~has_position])
+
+    # Without an inside mask, heat sources without a position affect nothing
+    affected = TU.compute_heat_source_contacts(
+        positions=scene["positions"],
+        source_positions=scene["source_positions"],
+        source_distance_thresholds=scene["source_distance_thresholds"],
+        source_owner_idxs=scene["source_owner_idxs"],
+    )
+    assert np.array_equal(affected, expected & has_position[None])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_temperatures_match_reference(seed):
+    scene = _random_scene(seed)
+    active = np.random.default_rng(seed).random(len(scene["source_owner_idxs"])) < 0.8
+    assert np.allclose(_batched_step(scene, lambda j, temperatures: active[j]),
+                       _reference_step(scene, lambda j, temperatures: active[j]), rtol=0.0, atol=1e-9)
+
+    # Unaffected objects only decay towards the ambient temperature
+    temperatures = TU.compute_temperatures(
+        temperatures=scene["temperatures"],
+        affected=np.zeros_like(scene["inside_mask"]),
+        source_temperatures=scene["source_temperatures"],
+        source_heating_rates=scene["source_heating_rates"],
+        dt=DT,
+        ambient_temperature=AMBIENT_TEMPERATURE,
+        decay_speed=DECAY_SPEED,
+    )
+    assert np.allclose(temperatures, scene["temperatures"] +
+                       (AMBIENT_TEMPERATURE - scene["temperatures"]) * DECAY_SPEED * DT)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_heat_sources_of_first_object_are_evaluated_after_its_update(seed):
+    scene = _random_scene(seed)
+    n_sources = len(scene["source_owner_idxs"])
+    # The first object is just below its ignition temperature, and is heated up by a hot heat source owned by the
+    # second object. Once on fire, its own heat source affects every other object
+    scene["temperatures"][0] = IGNITION_TEMPERATURE - 0.01
+    scene["source_owner_idxs"][:2] = [0, 1]
+    scene["source_positions"][:2] = [[0.0, 0.0, 0.0], scene["positions"][0]]
+    scene["source_distance_thresholds"][:2] = [100.0, 0.1]
+    scene["source_temperatures"][:2] = 1000.0
+    scene["source_heating_rates"][1] = 1.0
+    # Other heat sources owned by the first object are always active, and the remaining ones are fires igniting at the
+    # ignition temperature of their owner, or always active if they do not belong to any of the heated objects
+    fires = np.random.default_rng(seed).random(n_sources) < 0.5
+    fires[:2] = [True, False]
+
+    def is_active(j, temperatures):
+        owner_idx = scene["source_owner_idxs"][j]
+        if not fires[j] or owner_idx == -1:
+            return True
+        return temperatures[owner_idx] >= IGNITION_TEMPERATURE
+
+    new_temperatures = _batched_step(scene, is_active)
+    assert np.allclose(new_temperatures, _reference_step(scene, is_active), rtol=0.0, atol=1e-9)
+    # The first object caught fire during the step, which all other objects see
+    assert new_temperatures[0] >= IGNITION_TEMPERATURE
+    assert np.all(new_temperatures[1:] != scene["temperatures"][1:] +
+                  (AMBIENT_TEMPERATURE - scene["temperatures"][1:]) * DECAY_SPEED * DT)
+
+    # Evaluating all heat sources before updating any object misses the fire
+    initial_temperatures = scene["temperatures"].copy()
+    before_ignition = _reference_step(scene, lambda j, temperatures: is_active(j, initial_temperatures))
+    assert not np.allclose(new_temperatures[1:], before_ignition[1:])
@@ -0,0 +1,200 @@
+import os
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+from omnigibson.utils.transition_rule_utils import (
+    BaseFilter,
+    BaseTransitionRule,
+    CategoryFilter,
+    GenericTransitionRule,
+    StateFilter,
+    TransitionResults,
+    TransitionRuleEngine,
+)
+
+
+class Open:
+    """
+    Stand-in for the Open object state type, which StateFilter only uses as a key into the objects' states
+    """
+
+    def __init__(self, value):
+        self.value = value
+        self.n_evaluations = 0
+
+    def get_value(self):
+        self.n_evaluations += 1
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+
+
+class MockObject:
+    def __init__(self, name, category, is_open=None):
+        self.name = name
+        self.category = category
+        self.states = dict() if is_open is None else {Open: Open(is_open)}
+
+    def __repr__(self):
+        return self.name
+
+
+class CountingCategoryFilter(BaseFilter):
+    """
+    Dynamic filter on the object category, counting how often it is evaluated
+    """
+
+    def __init__(self, category):
+        self.category = category
+        self.n_calls = 0
+        self.n_prefilter_calls = 0
+
+    def __call__(self, obj):
+        self.n_calls += 1
+        return obj.category == self.category
+
+    def static_prefilter(self, obj):
+        self.n_prefilter_calls += 1
+        return obj.category == self.category
+
+
+class PairingRule(BaseTransitionRule):
+    """
+    Rule over (knife, apple) pairs that only generates the pairs with matching name suffixes
+    """
+
+    def __init__(self):
+        super().__init__(individual_filters={"knife": CategoryFilter("knife"), "apple": CategoryFilter("apple")})
+        self.processed = []
+
+    def get_candidate_tuples(self, individual_candidates):
+        for knife in individual_candidates["knife"]:
+            for apple in individual_candidates["apple"]:
+                if knife.name[-1] == apple.name[-1]:
+                    yield {"knife": knife, "apple": apple}
+
+    def condition(self, individual_objects, group_objects):
+        self.processed.append((individual_objects["knife"], individual_objects["apple"]))
+        return True
+
+    def transition(self, individual_objects, group_objects):
+        return TransitionResults(add=[], remove=[individual_objects["apple"]])
+
+
+def _open_rule():
+    # Opens every container
+    def transition(individual_objects, group_objects):
+        individual_objects["container"].states[Open].set_value(True)
+
+    return GenericTransitionRule(
+        individual_filters={"container": CategoryFilter("container")},
+        group_filters={},
+        condition_fn=lambda individual_objects, group_objects: True,
+        transition_fn=transition,
+    )
+
+
+def _recording_rule(processed, individual_filters, group_filters):
+    def condition(individual_objects, group_objects):
+        processed.append((dict(individual_objects), dict(group_objects)))
+        return False
+
+    return GenericTransitionRule(
+        individual_filters=individual_filters,
+        group_filters=group_filters,
+        condition_fn=condition,
+        transition_fn=lambda individual_objects, group_objects: None,
+    )
+
+
+def test_filters_are_snapshotted_before_transitions():
+    processed = []
+    engine = TransitionRuleEngine(rules=(
+        _open_rule(),
+        _recording_rule(processed, {"container": StateFilter(Open, True)}, {}),
+    ))
+    objs = [MockObject(f"container{i}", "container", is_open=False) for i in range(3)] + [MockObject("apple", "apple")]
+    for obj in objs:
+        engine.add_object(obj)
+
+    # Containers opened by the first rule only pass the second rule's filter at the next step
+    engine.step()
+    assert all(obj.states[Open].value for obj in objs[:3])
+    assert processed == []
+    stats = engine.stats[engine.rules[1]]
+    assert stats["n_candidates"] == {"container": 0} and stats["n_tuples"] == 0
+
+    engine.step()
+    assert [individual_objects["container"] for individual_objects, _ in processed] == objs[:3]
+
+
+def test_rules_without_matches_are_not_processed():
+    processed = []
+    engine = TransitionRuleEngine(rules=(
+        _recording_rule(processed, {}, {}),
+        _recording_rule(processed, {}, {"apple": CategoryFilter("apple")}),
+        _recording_rule(processed, {"knife": CategoryFilter("knife")}, {"apple": CategoryFilter("apple")}),
+    ))
+    engine.add_object(MockObject("container", "container"))
+    engine.step()
+    assert processed == []
+
+    # The last rule is still missing an individual filter output
+    apple = MockObject("apple", "apple")
+    engine.add_object(apple)
+    engine.step()
+    assert processed == [(dict(), {"apple": [apple]})]
+
+
+def test_filters_are_only_evaluated_on_candidates():
+    dynamic_filter = CountingCategoryFilter("apple")
+    state_filter = StateFilter(Open, True)
+    processed = []
+    engine = TransitionRuleEngine(rules=(
+        _recording_rule(processed, {"apple": dynamic_filter}, {}),
+        _recording_rule(processed, {"container": state_filter}, {}),
+    ))
+    apples = [MockObject(f"apple{i}", "apple") for i in range(3)]
+    containers = [MockObject(f"container{i}", "container", is_open=i == 0) for i in range(2)]
+    others = [MockObject(f"other{i}", "other") for i in range(20)]
+    for obj in apples + containers + others:
+        engine.add_object(obj)
+    assert dynamic_filter.n_prefilter_calls == len(apples) + len(containers) + len(others)
+
+    # Dynamic filters are evaluated once per step on the objects passing their static prefilter only
+    for _ in range(4):
+        engine.step()
+    assert dynamic_filter.n_calls == 4 * len(apples)
+    assert [container.states[Open].n_evaluations for container in containers] == [4, 4]
+    assert engine.get_candidates(state_filter) == containers[:1]
+
+    # Removed objects are no longer evaluated
+    engine.remove_object(apples[0])
+    engine.remove_object(containers[0])
+    processed.clear()
+    engine.step()
+    assert dynamic_filter.n_calls == 4 * len(apples) + 2
+    assert [individual_objects for individual_objects, _ in processed] == [{"apple": apples[1]}, {"apple": apples[2]}]
+
+    # Clearing the engine drops all candidates
+    engine.clear()
+    processed.clear()
+    engine.step()
+    assert processed == []
+
+
+def test_candidate_tuples_are_pruned():
+    rule = PairingRule()
+    engine = TransitionRuleEngine(rules=(rule,))
+    knives = [MockObject(f"knife{i}", "knife") for i in range(3)]
+    apples = [MockObject(f"apple{i}", "apple") for i in range(5)]
+    for obj in knives + apples:
+        engine.add_object(obj)
+
+    added, removed = engine.step()
+    assert rule.processed == [(knife, apple) for knife, apple in zip(knives, apples)]
+    assert added == [] and removed == apples[:3]
+    stats = engine.stats[rule]
+    assert stats["n_candidates"] == {"knife": 3, "apple": 5}
+    assert stats["n_tuples"] == 3 and stats["n_transitions"] == 3
@@ -0,0 +1,115 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmark"))
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import omnigibson.utils.transform_utils as T
+from benchmark_trav_graph import _legacy_graph
+from omnigibson.utils.trav_graph_utils import TraversabilityGraph, get_largest_component_mask
+
+SEEDS = (0, 1, 2)
+MAP_SIZE = 40
+N_OBSTACLES = 25
+N_PATH_QUERIES = 20
+
+
+def _small_trav_map(seed):
+    rng = np.random.default_rng(seed)
+    trav_map = np.full((MAP_SIZE, MAP_SIZE), 255, dtype=np.uint8)
+    for _ in range(N_OBSTACLES):
+        (row, col), (height, width) = rng.integers(0, MAP_SIZE, 2), rng.integers(1, 6, 2)
+        trav_map[row:row + height, col:col + width] = 0
+    # Walls splitting off a few smaller components
+    trav_map[MAP_SIZE // 3, :] = 0
+    trav_map[:, MAP_SIZE // 4] = 0
+    return trav_map
+
+
+def _legacy_shortest_path(legacy, source_map, target_map):
+    # Replicates TraversableMap.get_shortest_path before vectorization, which connected off-graph endpoints to their
+    # closest node. That used to permanently add them to the graph, so that an off-graph source could be connected
+    # straight to an off-graph target through obstacles: here, both are connected to their closest original node in a
+    # copy of the graph instead
+    g = legacy.copy()
+    nodes = np.array(legacy.nodes)
+    for map_xy in (target_map, source_map):
+        if not g.has_node(map_xy):
+            closest_node = tuple(nodes[np.argmin(np.linalg.norm(nodes - map_xy, axis=1))])
+            g.add_edge(closest_node, map_xy, weight=T.l2_distance(closest_node, map_xy))
+    return np.array(nx.astar_path(g, source_map, target_map, heuristic=T.l2_distance))
+
+
+def _path_length(path):
+    return np.sum(np.linalg.norm(np.diff(path, axis=0), axis=1))
+
+
+@pytest.fixture(params=SEEDS)
+def graphs(request):
+    trav_map = _small_trav_map(request.param)
+    graph = TraversabilityGraph(get_largest_component_mask(trav_map > 0))
+    return np.random.default_rng(request.param), trav_map, graph, _legacy_graph(trav_map)
+
+
+def test_nodes_and_edges_match_legacy(graphs):
+    _, _, graph, legacy = graphs
+    assert set(legacy.nodes) == set(map(tuple, graph.nodes.tolist()))
+
+    adjacency = graph.adjacency.tocoo()
+    edges = {(tuple(graph.nodes[i]), tuple(graph.nodes[j])): w for i, j, w in
+             zip(adjacency.row, adjacency.col, adjacency.data)}
+    assert len(edges) == 2 * legacy.number_of_edges()
+    for a, b, w in legacy.edges(data="weight"):
+        assert np.isclose(edges[(tuple(a), tuple(b))], w) and np.isclose(edges[(tuple(b), tuple(a))], w)
+
+
+def test_has_node_matches_legacy(graphs):
+    _, _, graph, legacy = graphs
+    # Every pixel of the map, and pixels just outside of it
+    for row in range(-1, MAP_SIZE + 1):
+        for col in range(-1, MAP_SIZE + 1):
+            assert graph.has_node((row, col)) == legacy.has_node((row, col))
+
+
+def test_shortest_paths_match_legacy(graphs):
+    rng, _, graph, legacy = graphs
+    nodes = list(legacy.nodes)
+    for _ in range(N_PATH_QUERIES):
+        source, target = (nodes[i] for i in rng.integers(0, len(nodes), 2))
+        path = graph.get_shortest_path(source, target)
+        expected = _legacy_shortest_path(legacy, source, target)
+        assert tuple(path[0]) == source and tuple(path[-1]) == target
+        assert np.isclose(_path_length(path), _path_length(expected))
+        assert np.isclose(graph.get_geodesic_distance(source, target), _path_length(expected))
+
+
+def test_off_graph_endpoints_match_legacy(graphs):
+    rng, trav_map, graph, legacy = graphs
+    nodes = np.array(legacy.nodes)
+    # Pixels outside of the largest component whose closest node is unique, so that both implementations connect
+    # them to the same node
+    off_graph = []
+    for row, col in np.argwhere(~graph.mask):
+        dists = np.linalg.norm(nodes - (row, col), axis=1)
+        if np.count_nonzero(np.isclose(dists, dists.min())) == 1:
+            off_graph.append((int(row), int(col)))
+    assert len(off_graph) > 0 and np.any([trav_map[xy] > 0 for xy in off_graph])
+
+    for _ in range(N_PATH_QUERIES):
+        source = off_graph[rng.integers(0, len(off_graph))]
+        target = off_graph[rng.integers(0, len(off_graph))] if rng.random() < 0.5 else \
+            tuple(nodes[rng.integers(0, len(nodes))])
+        path = graph.get_shortest_path(source, target)
+        expected = _legacy_shortest_path(legacy, source, target)
+        assert tuple(path[0]) == source and tuple(path[-1]) == target
+        # Off-graph endpoints are only connected to their closest node, never to each other
+        assert graph.has_node(path[1]) and tuple(path[1]) == tuple(expected[1])
+        assert np.isclose(_path_length(path), _path_length(expected))
+        assert np.isclose(graph.get_geodesic_distance(source, target), _path_length(expected))
+        # Queries never modify the graph
+        assert not graph.has_node(source)
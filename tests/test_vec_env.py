@@ -0,0 +1,94 @@
+import os
+import pickle
+from functools import partial
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+
+from omnigibson.utils.vec_env_utils import FakeEnvironment, SharedArrayBuffer, VectorEnvironment, WorkerError
+
+ENV_KWARGS = dict(image_height=8, image_width=8, proprio_dim=4, task_obs_dim=2, action_dim=3)
+
+
+def _make_vec_env(n_envs=2, env_kwargs=None, **kwargs):
+    env_fns = [partial(FakeEnvironment, **ENV_KWARGS, **(env_kwargs or dict())) for _ in range(n_envs)]
+    return VectorEnvironment(env_fns=env_fns, **kwargs)
+
+
+def _actions(vec_env):
+    return np.zeros((vec_env.num_envs,) + vec_env.action_space.shape, dtype=np.float32)
+
+
+def test_shared_array_buffer_is_shared_through_pickling():
+    layout = [(("a",), (2,), np.float32), (("b", "c"), (), np.bool_)]
+    buffer = SharedArrayBuffer(layout=layout, n_envs=3)
+    attached = pickle.loads(pickle.dumps(buffer))
+    attached.write(1, {"a": np.array([1.0, 2.0]), "b": {"c": True}})
+    value = buffer.read()
+    assert np.array_equal(value["a"], [[0.0, 0.0], [1.0, 2.0], [0.0, 0.0]])
+    assert np.array_equal(value["b"]["c"], [False, True, False])
+    attached.close()
+    buffer.close()
+    assert not os.path.exists(buffer.path)
+
+
+@pytest.mark.parametrize("transport", ["shared_memory", "pipe"])
+def test_auto_reset(transport):
+    vec_env = _make_vec_env(env_kwargs=dict(episode_length=3), transport=transport)
+    try:
+        obs = vec_env.reset()
+        assert obs["robot0"]["rgb"].shape == (2, 8, 8, 3)
+        assert np.all(obs["robot0"]["proprio"][:, :2] == [0, 1])
+        for step in range(1, 4):
+            obs, rewards, dones, infos = vec_env.step(_actions(vec_env))
+            assert rewards.shape == (2,)
+            assert np.all(dones == (step == 3))
+        # The final observation of the episode is kept, and the environments are already reset
+        for info in infos:
+            assert np.all(info["terminal_observation"]["robot0"]["proprio"][:2] == [3, 1])
+        assert np.all(obs["robot0"]["proprio"][:, :2] == [0, 2])
+    finally:
+        vec_env.close()
+
+
+def test_seeding():
+    vec_envs = [_make_vec_env(seed=10) for _ in range(2)]
+    try:
+        obs = [vec_env.reset() for vec_env in vec_envs]
+        assert np.all(obs[0]["task"]["low_dim"][:, 0] == [10, 11])
+        # Identically seeded environments produce identical observations
+        for key in ("rgb", "depth", "proprio"):
+            assert np.array_equal(obs[0]["robot0"][key], obs[1]["robot0"][key])
+        assert not np.array_equal(obs[0]["robot0"]["rgb"][0], obs[0]["robot0"]["rgb"][1])
+
+        vec_envs[0].seed(100)
+        assert np.all(vec_envs[0].reset()["task"]["low_dim"][:, 0] == [100, 101])
+        assert vec_envs[0].get_attr("_seed") == [100, 101]
+    finally:
+        for vec_env in vec_envs:
+            vec_env.close()
+
+
+def test_restart_crashed_worker():
+    env_fns = [partial(FakeEnvironment, **ENV_KWARGS), partial(FakeEnvironment, **ENV_KWARGS, crash_step=2)]
+    vec_env = VectorEnvironment(env_fns=env_fns, seed=0, max_restarts=1)
+    try:
+        vec_env.reset()
+        vec_env.step(_actions(vec_env))
+
+        # The crashed worker is restarted and reset with a new seed, while the other worker is unaffected
+        obs, rewards, dones, infos = vec_env.step(_actions(vec_env))
+        assert infos[1]["worker_restarted"] and dones[1] and rewards[1] == 0.0
+        assert "worker_restarted" not in infos[0] and not dones[0]
+        assert vec_env.n_restarts == [0, 1]
+        assert np.all(obs["robot0"]["proprio"][:, 0] == [2, 0])
+        assert np.all(obs["task"]["low_dim"][:, 0] == [0, 3])
+
+        # Once its restarts are exhausted, the next crash is raised
+        vec_env.step(_actions(vec_env))
+        with pytest.raises(WorkerError):
+            vec_env.step(_actions(vec_env))
+    finally:
+        vec_env.close()
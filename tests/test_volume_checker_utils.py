@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmark"))
+
+os.environ["OMNIGIBSON_NO_OMNIVERSE"] = "1"
+
+import numpy as np
+import pytest
+import trimesh
+from scipy.spatial.transform import Rotation as R
+
+import omnigibson.utils.transform_utils as T
+from benchmark_volume_checker import _Link, _create_volumes, _legacy_checker
+from omnigibson.utils.volume_checker_utils import ContainerVolume, PointsInVolumeChecker, get_convex_hull_half_spaces
+
+N_POINTS = 5000
+MAX_CHUNK_BYTES = 64 * 1024
+VOLUME_TYPES = ("Mesh", "Cube", "Sphere", "Cylinder", "Cone")
+
+
+def _mesh_volume(rng, mesh, offset):
+    return ContainerVolume(
+        "Mesh",
+        pos=np.array(offset) + rng.uniform(-0.05, 0.05, 3),
+        quat=R.random(random_state=rng.integers(1 << 31)).as_quat(),
+        scale=rng.uniform(0.5, 1.5, 3),
+        half_spaces=get_convex_hull_half_spaces(mesh.vertices[mesh.faces].mean(axis=1), mesh.face_normals),
+        vertices=mesh.vertices,
+        raw_volume=mesh.volume,
+    )
+
+
+def _checker(volumes, link, use_aabb_prefilter):
+    return PointsInVolumeChecker(
+        volumes=volumes,
+        get_link_pose=link.get_position_orientation,
+        get_link_scale=lambda: link.scale,
+        use_aabb_prefilter=use_aabb_prefilter,
+        max_chunk_bytes=MAX_CHUNK_BYTES,
+    )
+
+
+def _sample_points(rng, checker, link):
+    # Points in the world-frame bounding box of the volumes, and within a larger region around it
+    link_aabb = checker.aabb * link.scale
+    corners = np.stack(np.meshgrid(*link_aabb.T, indexing="ij"), axis=-1).reshape(-1, 3)
+    corners = corners @ T.quat2mat(link.orientation).T + link.position
+    return rng.uniform(corners.min(axis=0) - 0.2, corners.max(axis=0) + 0.2, (N_POINTS, 3))
+
+
+@pytest.mark.parametrize("use_aabb_prefilter", [False, True])
+@pytest.mark.parametrize("volume_type", VOLUME_TYPES)
+def test_primitive_volumes_match_legacy(volume_type, use_aabb_prefilter):
+    rng = np.random.default_rng(VOLUME_TYPES.index(volume_type))
+    mesh = trimesh.creation.icosphere(subdivisions=2, radius=0.5)
+    link = _Link(rng)
+    volume = next(volume for volume in _create_volumes(rng, mesh) if volume.volume_type == volume_type)
+    checker = _checker([volume], link, use_aabb_prefilter)
+    points = _sample_points(rng, checker, link)
+
+    in_volumes = checker(points)
+    expected = _legacy_checker([volume], [mesh], link)(points)
+    assert np.array_equal(in_volumes, expected)
+    assert 0 < np.sum(expected) < N_POINTS
+
+
+@pytest.mark.parametrize("use_aabb_prefilter", [False, True])
+def test_all_volumes_match_legacy(use_aabb_prefilter):
+    rng = np.random.default_rng(0)
+    mesh = trimesh.creation.icosphere(subdivisions=2, radius=0.5)
+    link = _Link(rng)
+    volumes = _create_volumes(rng, mesh)
+    checker = _checker(volumes, link, use_aabb_prefilter)
+    points = _sample_points(rng, checker, link)
+    assert np.array_equal(checker(points), _legacy_checker(volumes, [mesh] + [None] * (len(volumes) - 1), link)(points))
+
+
+@pytest.mark.parametrize("use_aabb_prefilter", [False, True])
+def test_multiple_convex_hull_meshes(use_aabb_prefilter):
+    rng = np.random.default_rng(1)
+    meshes = [
+        trimesh.creation.icosphere(subdivisions=2, radius=0.5),
+        trimesh.creation.box(extents=(0.6, 0.4, 0.8)),
+        trimesh.creation.cylinder(radius=0.3, height=0.5, sections=16),
+    ]
+    link = _Link(rng)
+    volumes = [_mesh_volume(rng, mesh, offset) for mesh, offset in zip(meshes, ([0, 0, 0], [1.2, 0, 0], [-1.2, 0, 0]))]
+    checker = _checker(volumes, link, use_aabb_prefilter)
+    points = _sample_points(rng, checker, link)
+
+    # Each volume is checked against its own mesh
+    in_volumes = checker(points)
+    expected = _legacy_checker(volumes, meshes, link)(points)
+    assert np.array_equal(in_volumes, expected)
+    for volume in volumes:
+        assert np.any(in_volumes & _checker([volume], link, use_aabb_prefilter)(points))
+
+    # The legacy checker late-bound the faces of the last mesh into every mesh volume's checker
+    late_bound = _legacy_checker(volumes, [meshes[-1]] * len(meshes), link)(points)
+    assert not np.array_equal(in_volumes, late_bound)